@@ -0,0 +1,6 @@
+"""
+Бенчмарки горячих путей торговли (python -m benchmarks.run).
+
+Кейсы гоняют записанную (или синтетическую) сессию через реальные
+компоненты с мок-клиентом биржи и сравнивают медианы с benchmarks/baseline.json.
+"""
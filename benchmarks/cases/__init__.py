@@ -0,0 +1,11 @@
+"""Кейсы бенчмарков: импорт модулей регистрирует их через @bench."""
+
+from . import (  # noqa: F401
+    bench_data,
+    bench_exits,
+    bench_filters,
+    bench_indicators,
+    bench_recording,
+    bench_signals,
+    bench_ticker,
+)
@@ -0,0 +1,108 @@
+"""CandleBuffer / DataRegistry: запись свечей, обновление market data, чтение."""
+
+from datetime import datetime
+
+from src.models import OHLCV
+from src.strategies.scalping.futures.core.candle_buffer import CandleBuffer
+
+from ..fixtures import populated_registry
+from ..harness import BenchCall, BenchContext, bench
+
+_SYMBOLS = 20
+
+
+@bench("data.candle_buffer.add", "data")
+async def candle_buffer_add(ctx: BenchContext) -> BenchCall:
+    candles = ctx.session.candles[ctx.session.symbols[0]]["1m"]
+    buffer = CandleBuffer(max_size=200)
+
+    async def run():
+        for candle in candles:
+            await buffer.add_candle(candle)
+
+    return BenchCall(run, ops=len(candles), unit="candle")
+
+
+@bench("data.registry.update_last_candle", "data")
+async def registry_update_last_candle(ctx: BenchContext) -> BenchCall:
+    symbols = ctx.session.subset(_SYMBOLS)
+    registry = await populated_registry(ctx, symbols)
+    prices = [ctx.session.last_price(symbol) for symbol in symbols]
+
+    async def run():
+        for symbol, price in zip(symbols, prices):
+            await registry.update_last_candle(
+                symbol=symbol,
+                timeframe="1m",
+                high=price * 1.001,
+                low=price * 0.999,
+                close=price,
+                volume=10.0,
+            )
+
+    return BenchCall(run, ops=len(symbols), unit="candle")
+
+
+@bench("data.registry.add_candle", "data")
+async def registry_add_candle(ctx: BenchContext) -> BenchCall:
+    symbols = ctx.session.subset(_SYMBOLS)
+    registry = await populated_registry(ctx, symbols)
+    state = {"ts": int(datetime.now().timestamp()) // 60 * 60}
+
+    async def run():
+        state["ts"] += 60
+        for symbol in symbols:
+            price = ctx.session.last_price(symbol)
+            await registry.add_candle(
+                symbol,
+                "1m",
+                OHLCV(
+                    timestamp=state["ts"],
+                    symbol=symbol,
+                    open=price,
+                    high=price,
+                    low=price,
+                    close=price,
+                    volume=1.0,
+                ),
+            )
+
+    return BenchCall(run, ops=len(symbols), unit="candle")
+
+
+@bench("data.registry.update_market_data", "data")
+async def registry_update_market_data(ctx: BenchContext) -> BenchCall:
+    symbols = ctx.session.subset(_SYMBOLS)
+    registry = await populated_registry(ctx, symbols)
+    frames = ctx.session.tickers[: len(symbols) * 20]
+
+    async def run():
+        for frame in frames:
+            ticker = frame["data"][0]
+            price = float(ticker["last"])
+            await registry.update_market_data(
+                ticker["instId"].replace("-SWAP", ""),
+                {
+                    "price": price,
+                    "last_price": price,
+                    "best_bid": float(ticker["bidPx"]),
+                    "best_ask": float(ticker["askPx"]),
+                    "updated_at": datetime.now(),
+                    "source": "WEBSOCKET",
+                },
+            )
+
+    return BenchCall(run, ops=len(frames), unit="tick")
+
+
+@bench("data.registry.get_candles", "data")
+async def registry_get_candles(ctx: BenchContext) -> BenchCall:
+    symbols = ctx.session.subset(_SYMBOLS)
+    registry = await populated_registry(ctx, symbols)
+
+    async def run():
+        for symbol in symbols:
+            await registry.get_candles(symbol, "1m")
+            await registry.get_candles(symbol, "5m")
+
+    return BenchCall(run, ops=len(symbols) * 2, unit="read")
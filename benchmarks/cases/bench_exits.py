@@ -0,0 +1,101 @@
+"""Выходы: TrailingStopLoss.update на потоке цен и ExitAnalyzer.analyze_position."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from src.strategies.scalping.futures.core.position_registry import PositionRegistry
+from src.strategies.scalping.futures.indicators.atr_provider import ATRProvider
+from src.strategies.scalping.futures.indicators.trailing_stop_loss import (
+    TrailingStopLoss,
+)
+from src.strategies.scalping.futures.positions.exit_analyzer import ExitAnalyzer
+
+from ..fixtures import (
+    config_for,
+    parameter_stack,
+    populated_registry,
+    refresh_market_data,
+)
+from ..harness import BenchCall, BenchContext, bench
+
+
+def _prices(ctx: BenchContext, symbol: str):
+    return [
+        float(frame["data"][0]["last"])
+        for frame in ctx.session.tickers
+        if frame["data"][0]["instId"] == f"{symbol}-SWAP"
+    ]
+
+
+@bench("exits.trailing_stop_loss.update", "exits")
+async def trailing_stop_loss_update(ctx: BenchContext) -> BenchCall:
+    symbol = ctx.session.symbols[0]
+    prices = _prices(ctx, symbol)
+
+    def run():
+        tsl = TrailingStopLoss(
+            initial_trail=0.025,
+            max_trail=0.05,
+            min_trail=0.01,
+            leverage=5.0,
+            breakeven_trigger=0.008,
+        )
+        tsl.initialize(entry_price=prices[0], side="long", symbol=symbol)
+        for price in prices:
+            tsl.update(price)
+
+    return BenchCall(run, ops=len(prices), unit="tick")
+
+
+@bench("exits.exit_analyzer.analyze_position", "exits")
+async def exit_analyzer_analyze_position(ctx: BenchContext) -> BenchCall:
+    symbols = ctx.session.subset(5)
+    registry = await populated_registry(ctx, symbols)
+    position_registry = PositionRegistry()
+    entry_time = datetime.now(timezone.utc) - timedelta(minutes=12)
+    active_positions = {}
+    for i, symbol in enumerate(symbols):
+        price = ctx.session.last_price(symbol)
+        side = "long" if i % 2 == 0 else "short"
+        position = {
+            "symbol": symbol,
+            "instId": f"{symbol}-SWAP",
+            "side": side,
+            "position_side": side,
+            "pos": "1" if side == "long" else "-1",
+            "size": 1.0,
+            "entry_price": price * (0.998 if side == "long" else 1.002),
+            "avgPx": str(price),
+            "markPx": str(price),
+            "margin": price / 5.0,
+            "leverage": 5,
+            "entry_time": entry_time,
+            "regime": "ranging",
+        }
+        active_positions[symbol] = position
+        await position_registry.register_position(symbol, position)
+        await registry.update_regime(symbol, "ranging")
+        await registry.update_indicators(symbol, {"atr": price * 0.002, "adx": 18.0})
+
+    config_manager, _, parameter_provider = parameter_stack(
+        ctx, config_for(ctx, symbols), registry
+    )
+    analyzer = ExitAnalyzer(
+        position_registry=position_registry,
+        data_registry=registry,
+        exit_decision_logger=None,
+        orchestrator=SimpleNamespace(active_positions=active_positions),
+        config_manager=config_manager,
+        signal_generator=None,
+        signal_locks_ref={},
+        parameter_provider=parameter_provider,
+    )
+    if hasattr(analyzer, "set_atr_provider"):
+        analyzer.set_atr_provider(ATRProvider(data_registry=registry))
+
+    async def run():
+        await refresh_market_data(ctx, registry, symbols)
+        await asyncio.gather(*(analyzer.analyze_position(s) for s in symbols))
+
+    return BenchCall(run, ops=len(symbols), unit="position")
@@ -0,0 +1,45 @@
+"""FilterManager.apply_all_filters на фильтрах, настроенных генератором."""
+
+from ..fixtures import refresh_market_data, signal_generator
+from ..harness import BenchCall, BenchContext, bench
+
+_SYMBOLS = 5
+
+
+@bench("filters.apply_all_filters", "filters", repeats=20)
+async def apply_all_filters(ctx: BenchContext) -> BenchCall:
+    symbols = ctx.session.subset(_SYMBOLS)
+    generator, registry = await signal_generator(ctx, symbols)
+    inputs = []
+    for i, symbol in enumerate(symbols):
+        market_data = await generator._get_market_data(symbol)
+        if market_data is None:
+            raise RuntimeError(f"нет market data для {symbol}")
+        price = ctx.session.last_price(symbol)
+        inputs.append(
+            (
+                symbol,
+                {
+                    "symbol": symbol,
+                    "side": "buy" if i % 2 == 0 else "sell",
+                    "type": "rsi_oversold" if i % 2 == 0 else "rsi_overbought",
+                    "strength": 0.8,
+                    "price": price,
+                    "confidence": 0.7,
+                },
+                market_data,
+            )
+        )
+
+    async def run():
+        await refresh_market_data(ctx, registry, symbols)
+        for symbol, signal, market_data in inputs:
+            await generator.filter_manager.apply_all_filters(
+                symbol=symbol,
+                signal=dict(signal),
+                market_data=market_data,
+                current_positions={},
+                regime="ranging",
+            )
+
+    return BenchCall(run, ops=len(inputs), unit="signal")
@@ -0,0 +1,62 @@
+"""Индикаторы: классические (src.indicators), FastADX, ATR провайдер по свечам."""
+
+from src.indicators import (
+    MACD,
+    RSI,
+    BollingerBands,
+    ExponentialMovingAverage,
+    TALibATR,
+    TALibEMA,
+    TALibRSI,
+)
+from src.strategies.scalping.futures.indicators.fast_adx import FastADX
+
+from ..harness import BenchCall, BenchContext, bench
+
+
+def _series(ctx: BenchContext):
+    candles = ctx.session.candles[ctx.session.symbols[0]]["1m"][-200:]
+    return (
+        [c.close for c in candles],
+        [c.high for c in candles],
+        [c.low for c in candles],
+    )
+
+
+def _closes_case(name, factory):
+    @bench(f"indicators.{name}", "indicators", repeats=50)
+    async def setup(ctx: BenchContext) -> BenchCall:
+        closes, _, _ = _series(ctx)
+        indicator = factory()
+        return BenchCall(lambda: indicator.calculate(closes), unit="calc")
+
+    return setup
+
+
+rsi = _closes_case("rsi", lambda: RSI(14))
+ema = _closes_case("ema", lambda: ExponentialMovingAverage(21))
+macd = _closes_case("macd", lambda: MACD())
+bollinger = _closes_case("bollinger", lambda: BollingerBands())
+talib_rsi = _closes_case("talib_rsi", lambda: TALibRSI(14))
+talib_ema = _closes_case("talib_ema", lambda: TALibEMA(21))
+
+
+@bench("indicators.talib_atr", "indicators", repeats=50)
+async def talib_atr(ctx: BenchContext) -> BenchCall:
+    closes, highs, lows = _series(ctx)
+    indicator = TALibATR(14)
+    return BenchCall(lambda: indicator.calculate(highs, lows, closes), unit="calc")
+
+
+@bench("indicators.fast_adx.update", "indicators", repeats=50)
+async def fast_adx_update(ctx: BenchContext) -> BenchCall:
+    closes, highs, lows = _series(ctx)
+    rows = list(zip(highs, lows, closes))
+
+    def run():
+        adx = FastADX(period=9, threshold=20.0)
+        for high, low, close in rows:
+            adx.update(high, low, close)
+        adx.get_adx_value()
+
+    return BenchCall(run, ops=len(rows), unit="bar")
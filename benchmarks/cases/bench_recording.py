@@ -0,0 +1,27 @@
+"""FrameRecorder.record: накладные расходы записи кадра в listener WebSocket."""
+
+import json
+import tempfile
+
+from src.strategies.scalping.futures.recording import FrameRecorder
+
+from ..harness import BenchCall, BenchContext, bench
+
+
+@bench("recording.frame_recorder.record", "recording")
+async def frame_recorder_record(ctx: BenchContext) -> BenchCall:
+    frames = [(json.dumps(frame), frame) for frame in ctx.session.tickers[:2000]]
+    directory = tempfile.TemporaryDirectory(prefix="bench_ws_recording_")
+    recorder = FrameRecorder(directory.name, session="bench")
+    recorder.start()
+    record = recorder.record
+
+    def run():
+        for raw, data in frames:
+            record("public", raw, data)
+
+    def teardown():
+        recorder.close()
+        directory.cleanup()
+
+    return BenchCall(run, ops=len(frames), unit="frame", teardown=teardown)
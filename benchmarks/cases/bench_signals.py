@@ -0,0 +1,24 @@
+"""FuturesSignalGenerator.generate_signals: один цикл на 5/20/50 символов."""
+
+from ..fixtures import refresh_market_data, signal_generator
+from ..harness import BenchCall, BenchContext, bench
+
+
+def _cycle_case(symbol_count: int):
+    @bench(f"signals.generate_signals.{symbol_count}", "signals", repeats=10)
+    async def setup(ctx: BenchContext) -> BenchCall:
+        symbols = ctx.session.subset(symbol_count)
+        generator, registry = await signal_generator(ctx, symbols)
+
+        async def run():
+            await refresh_market_data(ctx, registry, symbols)
+            await generator.generate_signals(current_positions={})
+
+        return BenchCall(run, ops=1, unit="cycle")
+
+    return setup
+
+
+cycle_5 = _cycle_case(5)
+cycle_20 = _cycle_case(20)
+cycle_50 = _cycle_case(50)
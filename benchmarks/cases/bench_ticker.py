@@ -0,0 +1,75 @@
+"""WebSocketCoordinator.handle_ticker_data: тикеры в секунду на записанном потоке."""
+
+from types import SimpleNamespace
+
+from src.strategies.scalping.futures.coordinators.websocket_coordinator import (
+    WebSocketCoordinator,
+)
+from src.strategies.scalping.futures.indicators.fast_adx import FastADX
+
+from ..fixtures import populated_registry
+from ..harness import BenchCall, BenchContext, bench
+
+_SYMBOLS = 20
+
+
+async def _coordinator(ctx: BenchContext, symbols, active_positions):
+    registry = await populated_registry(ctx, symbols)
+    coordinator = WebSocketCoordinator(
+        ws_manager=None,
+        private_ws_manager=None,
+        scalping_config=SimpleNamespace(
+            symbols=symbols,
+            # Бенчмарк меряет стоимость обработки, а не долю сброшенных тиков
+            tick_admission={"enabled": False},
+        ),
+        active_positions_ref=active_positions,
+        fast_adx=FastADX(period=9, threshold=20.0),
+        data_registry=registry,
+    )
+    coordinator._use_kline_candles = True
+    return coordinator
+
+
+def _frames(ctx: BenchContext, symbols):
+    wanted = set(symbols)
+    return [
+        frame
+        for frame in ctx.session.tickers
+        if frame["data"][0]["instId"].replace("-SWAP", "") in wanted
+    ][: len(symbols) * 50]
+
+
+@bench("ticker.handle_ticker_data.no_position", "ticker")
+async def ticker_no_position(ctx: BenchContext) -> BenchCall:
+    symbols = ctx.session.subset(_SYMBOLS)
+    coordinator = await _coordinator(ctx, symbols, {})
+    frames = _frames(ctx, symbols)
+
+    async def run():
+        for frame in frames:
+            await coordinator.handle_ticker_data(frame["data"][0]["instId"], frame)
+
+    return BenchCall(run, ops=len(frames), unit="tick")
+
+
+@bench("ticker.handle_ticker_data.with_position", "ticker")
+async def ticker_with_position(ctx: BenchContext) -> BenchCall:
+    symbols = ctx.session.subset(_SYMBOLS)
+    positions = {
+        symbol: {"symbol": symbol, "side": "long", "size": 1.0} for symbol in symbols
+    }
+    coordinator = await _coordinator(ctx, symbols, positions)
+    tsl_updates = []
+
+    async def update_trailing_sl(symbol, price):
+        tsl_updates.append(price)
+
+    coordinator.update_trailing_sl_callback = update_trailing_sl
+    frames = _frames(ctx, symbols)
+
+    async def run():
+        for frame in frames:
+            await coordinator.handle_ticker_data(frame["data"][0]["instId"], frame)
+
+    return BenchCall(run, ops=len(frames), unit="tick")
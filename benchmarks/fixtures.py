@@ -0,0 +1,110 @@
+"""
+Общие фикстуры кейсов: конфиг на N символов и заполненный DataRegistry.
+"""
+
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import List
+
+from src.models import OHLCV
+from src.strategies.scalping.futures.config.config_manager import ConfigManager
+from src.strategies.scalping.futures.config.parameter_provider import ParameterProvider
+from src.strategies.scalping.futures.core.data_registry import DataRegistry
+from src.strategies.scalping.futures.parameters import ParameterOrchestrator
+from src.strategies.scalping.futures.signal_generator import FuturesSignalGenerator
+
+from .harness import BenchContext
+from .market_session import MockFuturesClient
+
+
+def config_for(ctx: BenchContext, symbols: List[str]):
+    """Копия config_futures.yaml с заданным набором символов."""
+    config = ctx.config.model_copy(deep=True)
+    config.scalping.symbols = list(symbols)
+    config.trading.symbols = list(symbols)
+    return config
+
+
+def shifted_to_now(candles: List[OHLCV]) -> List[OHLCV]:
+    """Сдвинуть свечи записи так, чтобы последняя была текущей (не STALE)."""
+    if not candles:
+        return candles
+    shift = int(time.time()) // 60 * 60 - candles[-1].timestamp
+    return [replace(c, timestamp=c.timestamp + shift) for c in candles]
+
+
+async def populated_registry(ctx: BenchContext, symbols: List[str]) -> DataRegistry:
+    """DataRegistry со свечами 1m/5m сессии и свежими WS market data."""
+    registry = DataRegistry()
+    for symbol in symbols:
+        for timeframe, candles in ctx.session.candles[symbol].items():
+            await registry.initialize_candles(
+                symbol,
+                timeframe,
+                shifted_to_now(candles),
+                max_size=max(200, len(candles)),
+            )
+        price = ctx.session.last_price(symbol)
+        await registry.update_market_data(
+            symbol,
+            {
+                "price": price,
+                "last_price": price,
+                "best_bid": price * 0.9999,
+                "best_ask": price * 1.0001,
+                "updated_at": datetime.now(),
+                "source": "WEBSOCKET",
+            },
+        )
+    return registry
+
+
+async def refresh_market_data(
+    ctx: BenchContext, registry: DataRegistry, symbols: List[str]
+) -> None:
+    """Освежить updated_at, чтобы проверки свежести WS не уводили в REST fallback."""
+    now = datetime.now()
+    for symbol in symbols:
+        await registry.update_market_data(
+            symbol, {"updated_at": now, "source": "WEBSOCKET"}
+        )
+
+
+def parameter_stack(ctx: BenchContext, config, registry, regime_manager=None):
+    """ConfigManager + ParameterOrchestrator + ParameterProvider, как в orchestrator."""
+    config_manager = ConfigManager(config, raw_config_dict=ctx.options["raw_config"])
+    parameter_orchestrator = ParameterOrchestrator(
+        config_manager=config_manager,
+        data_registry=registry,
+        regime_manager=regime_manager,
+    )
+    parameter_provider = ParameterProvider(
+        config_manager=config_manager,
+        regime_manager=regime_manager,
+        data_registry=registry,
+        parameter_orchestrator=parameter_orchestrator,
+        strict_mode=True,
+    )
+    return config_manager, parameter_orchestrator, parameter_provider
+
+
+async def signal_generator(ctx: BenchContext, symbols: List[str]):
+    """FuturesSignalGenerator на мок-клиенте поверх заполненного DataRegistry."""
+    registry = await populated_registry(ctx, symbols)
+    generator = FuturesSignalGenerator(
+        config_for(ctx, symbols), client=MockFuturesClient(ctx.session)
+    )
+    # Порядок связывания - как в FuturesScalpingOrchestrator
+    config_manager = ConfigManager(
+        generator.config, raw_config_dict=ctx.options["raw_config"]
+    )
+    generator.set_data_registry(registry)
+    generator.set_config_manager(config_manager)
+    # Без ohlcv_data, как в orchestrator: режимы читают свечи из DataRegistry
+    await generator.initialize()
+    _, parameter_orchestrator, _ = parameter_stack(
+        ctx, generator.config, registry, generator.regime_manager
+    )
+    generator.set_parameter_orchestrator(parameter_orchestrator)
+    return generator, registry
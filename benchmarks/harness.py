@@ -0,0 +1,220 @@
+"""
+Харнесс бенчмарков: регистрация кейсов, замер, сравнение с baseline.
+
+Кейс - функция setup(ctx), которая готовит компоненты и возвращает
+BenchCall (синхронный или async callable + сколько операций делает один
+вызов). Замер: прогрев, затем repeats вызовов, метрики - медиана и p95 на
+операцию. Результат - JSON, который сравнивается с сохраненным baseline
+по порогу относительного замедления.
+"""
+
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+RESULTS_VERSION = 1
+
+
+@dataclass
+class BenchCall:
+    """Что замеряем: fn() выполняет ops операций (тиков, сигналов, свечей)."""
+
+    fn: Callable[[], Union[Any, Awaitable[Any]]]
+    ops: int = 1
+    unit: str = "op"
+    teardown: Optional[Callable[[], Any]] = None
+
+
+@dataclass
+class BenchCase:
+    name: str
+    group: str
+    setup: Callable[["BenchContext"], Awaitable[BenchCall]]
+    repeats: int = 30
+    warmup: int = 3
+
+
+@dataclass
+class BenchResult:
+    name: str
+    group: str
+    unit: str
+    ops: int
+    repeats: int
+    median_us: float
+    p95_us: float
+    ops_per_sec: float
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "group": self.group,
+            "unit": self.unit,
+            "ops": self.ops,
+            "repeats": self.repeats,
+            "median_us": round(self.median_us, 3),
+            "p95_us": round(self.p95_us, 3),
+            "ops_per_sec": round(self.ops_per_sec, 1),
+            "error": self.error,
+        }
+
+
+@dataclass
+class BenchContext:
+    """Общие данные кейсов: записанная сессия, конфиг, параметры запуска."""
+
+    session: Any
+    config: Any = None
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+_REGISTRY: List[BenchCase] = []
+
+
+def bench(name: str, group: str, repeats: int = 30, warmup: int = 3):
+    """Декоратор регистрации кейса: @bench("ticker.handle", "ticker")."""
+
+    def decorator(setup):
+        _REGISTRY.append(BenchCase(name, group, setup, repeats, warmup))
+        return setup
+
+    return decorator
+
+
+def registered_cases() -> List[BenchCase]:
+    return list(_REGISTRY)
+
+
+async def _call(fn) -> None:
+    result = fn()
+    if asyncio.iscoroutine(result):
+        await result
+
+
+async def run_case(
+    case: BenchCase, ctx: BenchContext, repeats: Optional[int] = None
+) -> BenchResult:
+    """Замерить один кейс. Ошибка setup/вызова попадает в result.error."""
+    repeats = repeats or case.repeats
+    try:
+        call = await case.setup(ctx)
+    except Exception as e:
+        return BenchResult(
+            case.name, case.group, "op", 0, 0, 0.0, 0.0, 0.0, f"setup: {e!r}"
+        )
+    # Мусор от setup и предыдущих кейсов не должен попадать в замер (как в timeit)
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(case.warmup):
+            await _call(call.fn)
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            await _call(call.fn)
+            samples.append(time.perf_counter() - started)
+    except Exception as e:
+        return BenchResult(
+            case.name, case.group, call.unit, call.ops, 0, 0.0, 0.0, 0.0, repr(e)
+        )
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        if call.teardown:
+            await _call(call.teardown)
+
+    per_op = sorted(sample / call.ops for sample in samples)
+    median = statistics.median(per_op)
+    p95 = per_op[min(len(per_op) - 1, int(len(per_op) * 0.95))]
+    return BenchResult(
+        name=case.name,
+        group=case.group,
+        unit=call.unit,
+        ops=call.ops,
+        repeats=repeats,
+        median_us=median * 1e6,
+        p95_us=p95 * 1e6,
+        ops_per_sec=1.0 / median if median > 0 else 0.0,
+    )
+
+
+def results_document(results: List[BenchResult], meta: Dict[str, Any]) -> dict:
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "meta": meta,
+        "results": {result.name: result.as_dict() for result in results},
+    }
+
+
+def write_results(path: Path, document: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(document, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+    )
+
+
+def load_results(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    threshold: float,
+    thresholds: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Сравнить медианы с baseline.
+
+    Args:
+        threshold: Допустимое относительное замедление (0.25 = +25%)
+        thresholds: Переопределения порога по имени кейса
+
+    Returns:
+        Строки сравнения: name, baseline_us, current_us, change, status
+        (ok / regression / improved / new / error)
+    """
+    thresholds = thresholds or {}
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        limit = float(thresholds.get(name, threshold))
+        base = base_results.get(name)
+        row = {
+            "name": name,
+            "baseline_us": base.get("median_us") if base else None,
+            "current_us": result.get("median_us"),
+            "change": None,
+            "threshold": limit,
+        }
+        if result.get("error"):
+            row["status"] = "error"
+        elif not base or not base.get("median_us"):
+            row["status"] = "new"
+        else:
+            change = result["median_us"] / base["median_us"] - 1.0
+            row["change"] = round(change, 4)
+            if change > limit:
+                row["status"] = "regression"
+            elif change < -limit:
+                row["status"] = "improved"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
@@ -0,0 +1,384 @@
+"""
+Рыночная сессия для бенчмарков: свечи 1m/5m и поток тикеров в формате OKX.
+
+Источник - запись WS-кадров (каталог сессии FrameRecorder либо JSONL/JSONL.gz
+с {"ts", "channel", "inst_id", "payload"} на строку) или детерминированная
+синтетическая сессия (случайное блуждание со сменой трендовых и боковых
+участков), если записи нет.
+"""
+
+import gzip
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.models import OHLCV
+from src.strategies.scalping.futures.recording import RecordingReader
+
+# Символы и опорные цены для сессий на 5/20/50 символов
+SYMBOL_POOL = (
+    ("BTC-USDT", 65000.0),
+    ("ETH-USDT", 3200.0),
+    ("SOL-USDT", 150.0),
+    ("XRP-USDT", 0.55),
+    ("DOGE-USDT", 0.15),
+    ("ADA-USDT", 0.45),
+    ("AVAX-USDT", 35.0),
+    ("LINK-USDT", 15.0),
+    ("DOT-USDT", 7.0),
+    ("TRX-USDT", 0.12),
+    ("LTC-USDT", 80.0),
+    ("BCH-USDT", 450.0),
+    ("NEAR-USDT", 6.0),
+    ("ATOM-USDT", 9.0),
+    ("APT-USDT", 9.5),
+    ("ARB-USDT", 1.1),
+    ("OP-USDT", 2.5),
+    ("FIL-USDT", 6.0),
+    ("ETC-USDT", 27.0),
+    ("UNI-USDT", 8.0),
+    ("SUI-USDT", 1.2),
+    ("TON-USDT", 6.5),
+    ("INJ-USDT", 25.0),
+    ("TIA-USDT", 10.0),
+    ("SEI-USDT", 0.5),
+    ("AAVE-USDT", 95.0),
+    ("MKR-USDT", 2500.0),
+    ("ICP-USDT", 12.0),
+    ("STX-USDT", 2.0),
+    ("IMX-USDT", 2.1),
+    ("HBAR-USDT", 0.1),
+    ("XLM-USDT", 0.11),
+    ("ALGO-USDT", 0.18),
+    ("SAND-USDT", 0.45),
+    ("MANA-USDT", 0.45),
+    ("AXS-USDT", 7.5),
+    ("GALA-USDT", 0.04),
+    ("CRV-USDT", 0.5),
+    ("LDO-USDT", 2.0),
+    ("RUNE-USDT", 5.5),
+    ("FTM-USDT", 0.7),
+    ("EGLD-USDT", 40.0),
+    ("THETA-USDT", 2.0),
+    ("CFX-USDT", 0.2),
+    ("WLD-USDT", 5.0),
+    ("PEPE-USDT", 0.00001),
+    ("SHIB-USDT", 0.00002),
+    ("ORDI-USDT", 40.0),
+    ("JUP-USDT", 1.0),
+    ("PYTH-USDT", 0.5),
+)
+
+
+# Длительность бара OKX в минутах (для MockFuturesClient.get_candles)
+_BAR_MINUTES = {"1m": 1, "5m": 5, "15m": 15, "1H": 60, "4H": 240, "1D": 1440}
+
+
+class MarketSession:
+    """Свечи и тикеры по символам; тикеры - в порядке поступления."""
+
+    def __init__(self):
+        self.symbols: List[str] = []
+        self.candles: Dict[str, Dict[str, List[OHLCV]]] = {}
+        self.tickers: List[Dict[str, Any]] = []
+        self.source = "synthetic"
+
+    def subset(self, count: int) -> List[str]:
+        return self.symbols[:count]
+
+    def last_price(self, symbol: str) -> float:
+        return self.candles[symbol]["1m"][-1].close
+
+
+def _aggregate(candles: List[OHLCV], size: int) -> List[OHLCV]:
+    result = []
+    for start in range(0, len(candles) - size + 1, size):
+        chunk = candles[start : start + size]
+        result.append(
+            OHLCV(
+                timestamp=chunk[0].timestamp,
+                symbol=chunk[0].symbol,
+                open=chunk[0].open,
+                high=max(c.high for c in chunk),
+                low=min(c.low for c in chunk),
+                close=chunk[-1].close,
+                volume=sum(c.volume for c in chunk),
+                timeframe=f"{size}m",
+            )
+        )
+    return result
+
+
+def synthetic_session(
+    symbol_count: int = 50,
+    minutes: int = 300,
+    tick_minutes: int = 10,
+    ticks_per_minute: int = 30,
+    seed: int = 20260101,
+) -> MarketSession:
+    """
+    Детерминированная сессия: minutes свечей 1m на символ и поток тикеров
+    за последние tick_minutes минут (ticks_per_minute тикеров в минуту).
+    """
+    rng = random.Random(seed)
+    session = MarketSession()
+    start_ts = 1_767_225_600  # 2026-01-01 00:00 UTC
+    tick_streams: Dict[str, List[Dict[str, Any]]] = {}
+    for symbol, base in SYMBOL_POOL[:symbol_count]:
+        price = base
+        candles = []
+        drift = 0.0
+        for minute in range(minutes):
+            if minute % 45 == 0:
+                # Смена участка: тренд вверх/вниз или боковик
+                drift = rng.choice((-1.0, 0.0, 0.0, 1.0)) * 0.0004
+            open_price = price
+            close = max(price * (1 + drift + rng.gauss(0, 0.0012)), base * 0.01)
+            high = max(open_price, close) * (1 + abs(rng.gauss(0, 0.0006)))
+            low = min(open_price, close) * (1 - abs(rng.gauss(0, 0.0006)))
+            candles.append(
+                OHLCV(
+                    timestamp=start_ts + minute * 60,
+                    symbol=symbol,
+                    open=open_price,
+                    high=high,
+                    low=low,
+                    close=close,
+                    volume=rng.uniform(500, 5000),
+                    timeframe="1m",
+                )
+            )
+            price = close
+        session.symbols.append(symbol)
+        session.candles[symbol] = {"1m": candles, "5m": _aggregate(candles, 5)}
+
+        stream = []
+        last_ts = start_ts + minutes * 60
+        for i in range(tick_minutes * ticks_per_minute):
+            price *= 1 + rng.gauss(0, 0.0003)
+            spread = price * 0.0001
+            stream.append(
+                _ticker_frame(
+                    symbol,
+                    price,
+                    price - spread,
+                    price + spread,
+                    (last_ts + i * 60 / ticks_per_minute) * 1000,
+                )
+            )
+        tick_streams[symbol] = stream
+
+    # Тикеры символов чередуются, как в одном WS-потоке
+    for i in range(tick_minutes * ticks_per_minute):
+        for symbol in session.symbols:
+            session.tickers.append(tick_streams[symbol][i])
+    return session
+
+
+def _ticker_frame(symbol, last, bid, ask, ts_ms) -> Dict[str, Any]:
+    inst_id = f"{symbol}-SWAP"
+    return {
+        "arg": {"channel": "tickers", "instId": inst_id},
+        "data": [
+            {
+                "instId": inst_id,
+                "last": f"{last:.8g}",
+                "bidPx": f"{bid:.8g}",
+                "askPx": f"{ask:.8g}",
+                "vol24h": "125000",
+                "volCcy24h": "98000000",
+                "high24h": f"{last * 1.02:.8g}",
+                "low24h": f"{last * 0.98:.8g}",
+                "open24h": f"{last * 0.995:.8g}",
+                "ts": str(int(ts_ms)),
+            }
+        ],
+    }
+
+
+def _recorded_frames(path: Path) -> Iterable[tuple]:
+    """(channel, inst_id, payload) из каталога FrameRecorder или JSONL-файла."""
+    if path.is_dir():
+        for frame in RecordingReader(path).frames(sources=["public"]):
+            yield frame.channel, frame.inst_id, frame.payload
+        return
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as lines:
+        for line in lines:
+            if not line.strip():
+                continue
+            frame = json.loads(line)
+            payload = frame.get("payload") or {}
+            arg = payload.get("arg", {})
+            yield (
+                frame.get("channel") or arg.get("channel"),
+                frame.get("inst_id") or arg.get("instId", ""),
+                payload,
+            )
+
+
+def load_recording(path: Path, symbols: Optional[List[str]] = None) -> MarketSession:
+    """Собрать сессию из записи WS-кадров (закрытые свечи + тикеры)."""
+    session = MarketSession()
+    session.source = str(path)
+    candles: Dict[str, Dict[str, Dict[int, OHLCV]]] = {}
+    for channel, inst_id, payload in _recorded_frames(Path(path)):
+        symbol = inst_id.replace("-SWAP", "")
+        if not symbol or (symbols and symbol not in symbols):
+            continue
+        if channel == "tickers":
+            session.tickers.append(payload)
+        elif channel in ("candle1m", "candle5m"):
+            timeframe = channel.replace("candle", "")
+            for row in payload.get("data", []):
+                ts = int(float(row[0]) / 1000)
+                candles.setdefault(symbol, {}).setdefault(timeframe, {})[ts] = OHLCV(
+                    timestamp=ts,
+                    symbol=symbol,
+                    open=float(row[1]),
+                    high=float(row[2]),
+                    low=float(row[3]),
+                    close=float(row[4]),
+                    volume=float(row[5]),
+                    timeframe=timeframe,
+                )
+    for symbol, by_tf in candles.items():
+        one_minute = [by_tf["1m"][ts] for ts in sorted(by_tf.get("1m", {}))]
+        if not one_minute:
+            continue
+        five_minute = [by_tf["5m"][ts] for ts in sorted(by_tf.get("5m", {}))]
+        session.symbols.append(symbol)
+        session.candles[symbol] = {
+            "1m": one_minute,
+            "5m": five_minute or _aggregate(one_minute, 5),
+        }
+    return session
+
+
+class MockFuturesClient:
+    """
+    Клиент биржи для бенчмарков: без сети, считает вызовы.
+
+    Известные методы возвращают правдоподобные данные сессии, остальные -
+    пустой dict (см. calls - какие REST-вызовы делает горячий путь).
+    """
+
+    def __init__(self, session: MarketSession, balance: float = 1000.0):
+        self.session = session
+        self.balance = balance
+        self.calls: Dict[str, int] = {}
+
+    def _count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    async def get_balance(self, *args, **kwargs) -> float:
+        self._count("get_balance")
+        return self.balance
+
+    async def get_positions(self, *args, **kwargs) -> list:
+        self._count("get_positions")
+        return []
+
+    async def get_ticker(self, symbol: str, *args, **kwargs) -> dict:
+        self._count("get_ticker")
+        price = self.session.last_price(symbol.replace("-SWAP", ""))
+        return {"last": price, "bidPx": price * 0.9999, "askPx": price * 1.0001}
+
+    async def get_candles(
+        self, symbol: str, timeframe: str = "1m", limit: int = 100
+    ) -> List[OHLCV]:
+        """
+        Свечи из сессии; старшие таймфреймы, которых нет в записи (1D для
+        pivot), достраиваются назад от первой свечи с фиксированным диапазоном.
+        """
+        self._count("get_candles")
+        minutes = _BAR_MINUTES.get(timeframe, 1)
+        one_minute = self.session.candles[symbol.replace("-SWAP", "")]["1m"]
+        candles = _aggregate(one_minute, minutes) if minutes > 1 else one_minute
+        missing = limit - len(candles)
+        if missing > 0:
+            first = candles[0] if candles else one_minute[0]
+            price = first.open
+            padding = []
+            for i in range(missing, 0, -1):
+                swing = 1 + 0.002 * ((i % 5) - 2)
+                padding.append(
+                    OHLCV(
+                        timestamp=first.timestamp - i * minutes * 60,
+                        symbol=first.symbol,
+                        open=price,
+                        high=price * 1.01,
+                        low=price * 0.99,
+                        close=price * swing,
+                        volume=first.volume * minutes,
+                        timeframe=timeframe,
+                    )
+                )
+            candles = padding + list(candles)
+        return list(candles[-limit:])
+
+    async def get_price_limits(self, symbol: str, *args, **kwargs) -> dict:
+        self._count("get_price_limits")
+        price = self.session.last_price(symbol.replace("-SWAP", ""))
+        return {
+            "best_bid": price * 0.9999,
+            "best_ask": price * 1.0001,
+            "current_price": price,
+            "max_buy_price": price * 1.05,
+            "min_sell_price": price * 0.95,
+        }
+
+    async def _make_request(self, method: str, path: str, *args, **kwargs) -> dict:
+        """
+        Сырые REST-вызовы фильтров: funding, стакан и тикер по цене сессии,
+        остальное - пустой ответ.
+        """
+        self._count(f"{method} {path}")
+        params = kwargs.get("params") or {}
+        inst_id = params.get("instId", "")
+        symbol = inst_id.replace("-SWAP", "")
+        if path == "/api/v5/public/funding-rate":
+            data = [
+                {
+                    "instId": inst_id,
+                    "fundingRate": "0.0001",
+                    "nextFundingRate": "0.0001",
+                    "fundingTime": "0",
+                }
+            ]
+        elif path == "/api/v5/market/books" and symbol in self.session.candles:
+            price = self.session.last_price(symbol)
+            depth = int(params.get("sz", 20))
+            size = f"{50000.0 / price:.8g}"
+            data = [
+                {
+                    "bids": [
+                        [f"{price * (1 - 0.0001 * (i + 1)):.8g}", size, "0", "3"]
+                        for i in range(depth)
+                    ],
+                    "asks": [
+                        [f"{price * (1 + 0.0001 * (i + 1)):.8g}", size, "0", "3"]
+                        for i in range(depth)
+                    ],
+                    "ts": "0",
+                }
+            ]
+        elif path == "/api/v5/market/ticker" and symbol in self.session.candles:
+            price = self.session.last_price(symbol)
+            data = _ticker_frame(symbol, price, price * 0.9999, price * 1.0001, 0)[
+                "data"
+            ]
+        else:
+            data = []
+        return {"code": "0", "data": data}
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        async def _stub(*args, **kwargs):
+            self._count(name)
+            return {}
+
+        return _stub
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Прогон бенчмарков горячих путей и сравнение с baseline.
+
+Запуск из корня репозитория:
+    python -m benchmarks.run                       # все кейсы, сравнение с baseline
+    python -m benchmarks.run --filter signals      # только кейсы по regex
+    python -m benchmarks.run --recording logs/futures/ws_recording/20260101_120000
+    python -m benchmarks.run --update-baseline     # перезаписать baseline
+
+Код выхода 1 - есть регрессия выше порога или кейс упал с ошибкой.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+
+import yaml
+from loguru import logger
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks import cases  # noqa: E402,F401
+from benchmarks.harness import (  # noqa: E402
+    BenchContext,
+    compare,
+    load_results,
+    registered_cases,
+    results_document,
+    run_case,
+    write_results,
+)
+from benchmarks.market_session import load_recording, synthetic_session  # noqa: E402
+from src.config import BotConfig  # noqa: E402
+
+CONFIG_PATH = project_root / "config" / "config_futures.yaml"
+BASELINE_PATH = project_root / "benchmarks" / "baseline.json"
+OUTPUT_PATH = project_root / "benchmarks" / "results" / "latest.json"
+
+
+def _print_table(rows) -> None:
+    print(f"{'case':45} {'baseline us':>12} {'current us':>12} {'change':>8}  status")
+    for row in rows:
+        base = f"{row['baseline_us']:.2f}" if row["baseline_us"] else "-"
+        current = f"{row['current_us']:.2f}" if row["current_us"] else "-"
+        change = f"{row['change'] * 100:+.1f}%" if row["change"] is not None else "-"
+        print(f"{row['name']:45} {base:>12} {current:>12} {change:>8}  {row['status']}")
+
+
+async def _run(args) -> int:
+    if args.recording:
+        session = load_recording(Path(args.recording))
+        if not session.symbols:
+            print(f"В записи {args.recording} нет закрытых свечей 1m")
+            return 2
+    else:
+        session = synthetic_session()
+    with open(args.config, "r", encoding="utf-8") as f:
+        raw_config = yaml.safe_load(f)
+    ctx = BenchContext(
+        session=session,
+        config=BotConfig.load_from_file(str(args.config)),
+        options={"raw_config": raw_config},
+    )
+
+    pattern = re.compile(args.filter) if args.filter else None
+    results = []
+    for case in registered_cases():
+        if pattern and not pattern.search(case.name):
+            continue
+        result = await run_case(case, ctx, repeats=args.repeat)
+        if result.error:
+            print(f"{case.name:45} ERROR {result.error}")
+        else:
+            print(
+                f"{case.name:45} {result.median_us:12.2f} us/{result.unit}"
+                f"  p95 {result.p95_us:10.2f}  {result.ops_per_sec:12.1f} {result.unit}/s"
+            )
+        results.append(result)
+
+    document = results_document(
+        results,
+        {"session": session.source, "symbols": len(session.symbols)},
+    )
+    write_results(Path(args.output), document)
+    print(f"\nРезультаты: {args.output}")
+
+    baseline = load_results(Path(args.baseline))
+    if args.update_baseline:
+        # Пороги по кейсам задаются руками в baseline и переживают обновление
+        if baseline and baseline.get("thresholds"):
+            document["thresholds"] = baseline["thresholds"]
+        write_results(Path(args.baseline), document)
+        print(f"Baseline обновлен: {args.baseline}")
+        return 1 if any(r.error for r in results) else 0
+
+    if baseline is None:
+        print(f"Baseline {args.baseline} не найден, сравнение пропущено")
+        return 1 if any(r.error for r in results) else 0
+
+    thresholds = baseline.get("thresholds", {})
+    rows = compare(document, baseline, args.threshold, thresholds)
+    print()
+    _print_table(rows)
+    failed = [row for row in rows if row["status"] in ("regression", "error")]
+    if failed:
+        print(f"\n❌ Регрессий/ошибок: {len(failed)}")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--filter", help="regex по имени кейса")
+    parser.add_argument(
+        "--repeat", type=int, help="число замеров (вместо дефолта кейса)"
+    )
+    parser.add_argument(
+        "--recording",
+        help="запись WS-кадров: каталог сессии FrameRecorder или jsonl / jsonl.gz",
+    )
+    parser.add_argument("--config", default=str(CONFIG_PATH))
+    parser.add_argument("--output", default=str(OUTPUT_PATH))
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="допустимое замедление медианы относительно baseline (0.25 = +25%%)",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--log-level",
+        default="ERROR",
+        help="уровень loguru во время прогона (логи пишут в stderr и искажают замер)",
+    )
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    sys.exit(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
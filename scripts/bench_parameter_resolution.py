@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк разрешения параметров: скомпилированные таблицы vs пересборка на каждый вызов.
+
+Один "цикл" = то, что торговый цикл запрашивает на символ:
+resolve_bundle (signal/exit/order/risk/patterns) + get_trailing_sl_params
++ get_adaptive_risk_params.
+
+Запуск: python scripts/bench_parameter_resolution.py [--iterations 2000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import yaml
+from loguru import logger
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import BotConfig  # noqa: E402
+from src.strategies.scalping.futures.config.config_manager import (  # noqa: E402
+    ConfigManager,
+)
+from src.strategies.scalping.futures.parameters import (  # noqa: E402
+    ParameterOrchestrator,
+)
+
+CONFIG_PATH = project_root / "config" / "config_futures.yaml"
+
+
+class _Tick:
+    price = 100.0
+
+
+class _MarketData:
+    current_tick = _Tick()
+    ohlcv_data = []
+
+
+def _run_cycle(orchestrator, config_manager, symbols, regimes, balance):
+    for symbol in symbols:
+        for regime in regimes:
+            orchestrator.resolve_bundle(
+                symbol=symbol,
+                regime=regime,
+                market_data=_MarketData,
+                balance=balance,
+            )
+            config_manager.get_trailing_sl_params(regime)
+            config_manager.get_adaptive_risk_params(balance, regime, symbol)
+
+
+def _measure(label, iterations, compiled, orchestrator, config_manager, **kwargs):
+    table = orchestrator.compiled
+    if not compiled:
+        orchestrator._compiled = None
+    started = time.perf_counter()
+    for _ in range(iterations):
+        if not compiled:
+            config_manager.invalidate_compiled_params()
+        _run_cycle(orchestrator, config_manager, **kwargs)
+    elapsed = time.perf_counter() - started
+    orchestrator._compiled = table
+    per_cycle_us = elapsed / iterations * 1e6
+    print(f"{label:<10} {per_cycle_us:10.1f} µs/цикл")
+    return per_cycle_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--balance", type=float, default=900.0)
+    args = parser.parse_args()
+
+    logger.remove()
+    config = BotConfig.load_from_file(str(CONFIG_PATH))
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        raw_config = yaml.safe_load(f)
+
+    config_manager = ConfigManager(config, raw_config_dict=raw_config)
+    orchestrator = ParameterOrchestrator(config_manager=config_manager)
+    orchestrator.atr_provider.get_atr = lambda symbol: 1.0
+    table = orchestrator.compiled
+    print(f"📦 Скомпилировано: {table.summary()}")
+
+    kwargs = dict(
+        symbols=table.symbols,
+        regimes=table.regimes,
+        balance=args.balance,
+    )
+    slow = _measure(
+        "per-call", args.iterations, False, orchestrator, config_manager, **kwargs
+    )
+    fast = _measure(
+        "compiled", args.iterations, True, orchestrator, config_manager, **kwargs
+    )
+    print(f"⚡ Ускорение: x{slow / fast:.2f} ({slow - fast:.1f} µs экономии на цикл)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк представления сигнала: dict vs Signal (__slots__).
+
+Один "цикл" повторяет путь сигнала по пайплайну для каждого символа:
+генерация -> FilterManager (regime, filters_passed) -> _adapt_signal_for_futures
+(copy + 3 ключа) -> ранжирование -> SignalCoordinator/Executor (.get-пробы)
+-> строка CSV. Память считается через tracemalloc: пик за цикл и объем
+сигналов, которые остаются живыми (история сигналов).
+
+Запуск: python scripts/bench_signal_model.py [--cycles 200] [--symbols 10]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.signals.signal_model import Signal  # noqa: E402
+
+_PROBES = (
+    "symbol",
+    "side",
+    "strength",
+    "price",
+    "confidence",
+    "regime",
+    "type",
+    "is_impulse",
+    "impulse_relax",
+    "leverage_adjusted_strength",
+    "tp_percent",
+    "sl_percent",
+)
+
+
+def _make_dict(symbol, i):
+    return {
+        "symbol": symbol,
+        "side": "buy" if i % 2 else "sell",
+        "type": "rsi_oversold",
+        "strength": 0.5 + i * 0.01,
+        "price": 100.0 + i,
+        "timestamp": datetime.now(timezone.utc),
+        "indicator_value": 28.0,
+        "confidence": 0.7,
+        "has_conflict": False,
+    }
+
+
+def _make_signal(symbol, i):
+    return Signal(
+        symbol=symbol,
+        side="buy" if i % 2 else "sell",
+        type="rsi_oversold",
+        strength=0.5 + i * 0.01,
+        price=100.0 + i,
+        timestamp=datetime.now(timezone.utc),
+        indicator_value=28.0,
+        confidence=0.7,
+        has_conflict=False,
+    )
+
+
+def _run_cycle(make, symbols, per_symbol):
+    ranked = []
+    for symbol in symbols:
+        for i in range(per_symbol):
+            signal = make(symbol, i)
+            signal["regime"] = "ranging"
+            if "filters_passed" not in signal:
+                signal["filters_passed"] = []
+            for name in ("ADX", "MTF", "Correlation"):
+                signal["filters_passed"].append(name)
+            futures_signal = signal.copy()
+            futures_signal["leverage_adjusted_strength"] = signal["strength"]
+            futures_signal["margin_required"] = True
+            futures_signal["liquidation_risk"] = 0.1
+            ranked.append(futures_signal)
+    ranked.sort(key=lambda s: s.get("strength", 0.0), reverse=True)
+    rows = []
+    for signal in ranked:
+        for key in _PROBES:
+            signal.get(key)
+        rows.append(
+            (
+                signal.get("symbol", ""),
+                signal.get("side", ""),
+                f"{signal.get('price', 0.0):.8f}",
+                f"{signal.get('strength', 0.0):.4f}",
+                ",".join(signal.get("filters_passed") or []),
+            )
+        )
+    return ranked
+
+
+def _measure(label, make, cycles, symbols, per_symbol):
+    # Время - без tracemalloc (он сам замедляет аллокации)
+    started = time.perf_counter()
+    for _ in range(cycles):
+        _run_cycle(make, symbols, per_symbol)
+    elapsed = time.perf_counter() - started
+
+    history = []
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    peak_delta = 0
+    for _ in range(cycles):
+        cycle_base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        history.extend(_run_cycle(make, symbols, per_symbol))
+        _, peak = tracemalloc.get_traced_memory()
+        peak_delta = max(peak_delta, peak - cycle_base)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    live = len(history)
+    print(
+        f"{label:<8} {elapsed / cycles * 1e6:9.1f} µs/цикл  "
+        f"пик {peak_delta / 1024:8.1f} KiB/цикл  "
+        f"{(current - base) / live:7.1f} байт/живой сигнал"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--per-symbol", type=int, default=4)
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}-USDT" for i in range(args.symbols)]
+    print(
+        f"Циклов: {args.cycles}, символов: {args.symbols}, "
+        f"сигналов на символ: {args.per_symbol}"
+    )
+    _measure("dict", _make_dict, args.cycles, symbols, args.per_symbol)
+    _measure("Signal", _make_signal, args.cycles, symbols, args.per_symbol)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import hashlib
 import hmac
 import json
 import time
+import uuid
 from datetime import datetime
 from typing import Any, Dict, Optional
 
@@ -15,6 +16,11 @@ from loguru import logger
 from src.connection_quality_monitor import ConnectionQualityMonitor
 from src.models import OHLCV
 
+# Торговые операции, создающие ордера: нужен clOrdId для защиты от дубликатов
+_PLACE_OPS = frozenset({"order", "batch-orders"})
+# OKX: "Order does not exist" при запросе ордера по clOrdId
+_ORDER_NOT_FOUND_CODE = "51603"
+
 
 def round_to_step(value: float, step: float) -> float:
     """
@@ -190,6 +196,18 @@ class OKXFuturesClient:
         )
         self.circuit_cooldown_seconds = 120  # Пауза при открытом circuit (2 минуты)
 
+        # Торговля через Private WebSocket (place/cancel/amend/batch) с fallback на REST.
+        # Транспорт подключается через set_ws_trading() (PrivateWebSocketManager).
+        self.ws_trading = None
+        self.ws_trading_timeout: float = 2.0
+        self.ws_trading_stats: Dict[str, int] = {
+            "ws_ok": 0,
+            "ws_rejected": 0,
+            "ws_timeout": 0,
+            "ws_recovered_by_clordid": 0,
+            "rest_fallback": 0,
+        }
+
     async def close(self):
         """Graceful client/session shutdown."""
         try:
@@ -234,6 +252,168 @@ class OKXFuturesClient:
             self.session = aiohttp.ClientSession(connector=connector)
             self._session_created_at = time.time()
 
+    # ---------- WebSocket trading ----------
+    def set_ws_trading(self, transport, request_timeout: float = 2.0) -> None:
+        """
+        Подключить WebSocket-транспорт для торговых операций.
+
+        Args:
+            transport: Объект с методами is_ready() и send_request(op, args, timeout)
+                (PrivateWebSocketManager). None - отключить WS торговлю.
+            request_timeout: Таймаут ожидания ответа на WS запрос (секунды)
+        """
+        self.ws_trading = transport
+        self.ws_trading_timeout = float(request_timeout)
+        logger.info(
+            f"OKXFuturesClient: WS торговля {'включена' if transport else 'выключена'} "
+            f"(timeout={self.ws_trading_timeout:.1f}s)"
+        )
+
+    def _ws_trading_ready(self) -> bool:
+        transport = self.ws_trading
+        if transport is None:
+            return False
+        try:
+            return bool(transport.is_ready())
+        except Exception:
+            return False
+
+    async def _submit_trade(
+        self,
+        ws_op: str,
+        ws_args: list,
+        endpoint: str,
+        rest_data: Any,
+        symbol: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Торговый запрос: сначала Private WebSocket, при сбое транспорта - REST.
+
+        Отказ биржи (code != "0", кроме протокольных 60xxx) окончателен и
+        пробрасывается как RuntimeError - так же, как в _make_request.
+        Каждому размещаемому ордеру (order/batch-orders) присваивается clOrdId.
+        Если WS запрос ушел, но ответа нет (таймаут/разрыв), ордера сначала ищутся
+        на бирже по clOrdId: REST повторяет только те, которых там точно нет, а
+        при невозможности проверить запрос не повторяется (RuntimeError).
+        """
+        placing = ws_op in _PLACE_OPS
+        if placing:
+            self._ensure_cl_ord_ids(ws_args)
+        if self._ws_trading_ready():
+            try:
+                resp = await self.ws_trading.send_request(
+                    ws_op, ws_args, timeout=self.ws_trading_timeout
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                unconfirmed = isinstance(e, asyncio.TimeoutError) or bool(
+                    getattr(e, "request_sent", False)
+                )
+                if unconfirmed:
+                    self.ws_trading_stats["ws_timeout"] += 1
+                    logger.warning(
+                        f"⏱️ WS {ws_op}: нет ответа ({e or 'timeout'}, "
+                        f"{self.ws_trading_timeout:.1f}s), fallback на REST"
+                    )
+                    if placing:
+                        recovered = await self._recover_unconfirmed_orders(
+                            ws_op, ws_args, symbol
+                        )
+                        if recovered is not None:
+                            return recovered
+                else:
+                    logger.debug(f"WS {ws_op} недоступен ({e}), fallback на REST")
+            else:
+                code = str(resp.get("code", ""))
+                if code == "0":
+                    self.ws_trading_stats["ws_ok"] += 1
+                    return resp
+                if not code.startswith("60"):
+                    self.ws_trading_stats["ws_rejected"] += 1
+                    logger.error(f"OKX WS trade error: {resp}")
+                    raise RuntimeError(resp)
+                logger.warning(f"⚠️ WS {ws_op} протокольная ошибка {code}: {resp}")
+            self.ws_trading_stats["rest_fallback"] += 1
+        return await self._make_request("POST", endpoint, data=rest_data)
+
+    @staticmethod
+    def _ensure_cl_ord_ids(args: list) -> None:
+        """Присвоить clOrdId ордерам без него (OKX: до 32 буквенно-цифровых)."""
+        for arg in args:
+            if not arg.get("clOrdId"):
+                arg["clOrdId"] = f"b{uuid.uuid4().hex[:31]}"
+
+    async def _recover_unconfirmed_orders(
+        self, ws_op: str, ws_args: list, symbol: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Проверка ордеров по clOrdId после WS запроса без ответа.
+
+        Returns:
+            Ответ в формате биржи, если все ордера уже приняты; None - если
+            ни одного нет на бирже и REST повтор безопасен.
+
+        Raises:
+            RuntimeError: Часть ордеров принята или проверка не удалась -
+                повтор через REST создал бы дубликат.
+        """
+        found = []
+        for arg in ws_args:
+            inst_id = str(arg.get("instId") or "")
+            order_symbol = inst_id.replace("-SWAP", "") or symbol
+            cl_ord_id = arg["clOrdId"]
+            try:
+                existing = await self._find_order_by_clordid(order_symbol, cl_ord_id)
+            except Exception as e:
+                logger.error(
+                    f"❌ WS {ws_op}: ордер {cl_ord_id} не подтвержден и не проверен "
+                    f"по clOrdId ({e}), повтор через REST отменен"
+                )
+                raise RuntimeError(
+                    f"WS {ws_op}: статус ордера {cl_ord_id} неизвестен: {e}"
+                ) from e
+            found.append((cl_ord_id, existing))
+
+        if not any(existing for _, existing in found):
+            return None
+        if not all(existing for _, existing in found):
+            missing = [cl_ord_id for cl_ord_id, existing in found if not existing]
+            raise RuntimeError(
+                f"WS {ws_op}: принята только часть ордеров, не найдены {missing}"
+            )
+        self.ws_trading_stats["ws_recovered_by_clordid"] += 1
+        logger.info(f"✅ WS {ws_op}: ордера найдены на бирже по clOrdId после таймаута")
+        return {
+            "code": "0",
+            "msg": "",
+            "data": [
+                {
+                    "ordId": existing.get("ordId", ""),
+                    "clOrdId": existing.get("clOrdId", cl_ord_id),
+                    "tag": existing.get("tag", ""),
+                    "sCode": "0",
+                    "sMsg": "",
+                }
+                for cl_ord_id, existing in found
+            ],
+        }
+
+    async def _find_order_by_clordid(
+        self, symbol: str, cl_ord_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Ордер по clOrdId; None - биржа ответила, что такого ордера нет.
+        Прочие ошибки (сеть, лимиты) пробрасываются: статус ордера неизвестен.
+        """
+        try:
+            orders = await self.get_order_by_clordid(symbol, cl_ord_id[:32])
+        except RuntimeError as e:
+            if _ORDER_NOT_FOUND_CODE in str(e):
+                return None
+            raise
+        return orders[0] if orders else None
+
     # ---------- HTTP internals ----------
     async def _make_request(
         self,
@@ -400,7 +580,7 @@ class OKXFuturesClient:
                         )
 
                     if resp_data.get("code") != "0":
-                        logger.error("OKX API error: %s", resp_data)
+                        logger.error(f"OKX API error: {resp_data}")
                         raise RuntimeError(resp_data)
 
                     # ✅ ЛОГИРОВАНИЕ КОМИССИИ: Если это ответ на размещение ордера, логируем комиссию
@@ -1490,7 +1670,13 @@ class OKXFuturesClient:
             payload["clOrdId"] = cl_ord_id[:32]  # Ограничиваем до 32 символов
 
         try:
-            return await self._make_request("POST", "/api/v5/trade/order", data=payload)
+            return await self._submit_trade(
+                "order",
+                [payload],
+                "/api/v5/trade/order",
+                payload,
+                symbol=symbol,
+            )
         except RuntimeError as e:
             error_text = str(e).lower()
             if "posside" in error_text and "posSide" in payload:
@@ -1499,8 +1685,12 @@ class OKXFuturesClient:
                 logger.warning(
                     f"⚠️ place_order: posSide rejected by OKX for {symbol}, retry without posSide"
                 )
-                return await self._make_request(
-                    "POST", "/api/v5/trade/order", data=payload_no_pos
+                return await self._submit_trade(
+                    "order",
+                    [payload_no_pos],
+                    "/api/v5/trade/order",
+                    payload_no_pos,
+                    symbol=symbol,
                 )
             raise
 
@@ -1563,7 +1753,8 @@ class OKXFuturesClient:
             symbol: Торговый символ (например, "BTC-USDT")
             side: Направление ("buy" или "sell")
             size: Размер позиции
-            trigger_price: Цена срабатывания (triggerPx)
+            trigger_price: Цена срабатывания (для conditional - slTriggerPx,
+                для trigger - triggerPx)
             order_price: Цена исполнения ("-1" для market order)
             order_type: Тип ордера ("conditional", "oco", "trigger")
             reduce_only: Только закрытие позиции (True для SL/TP)
@@ -1593,9 +1784,15 @@ class OKXFuturesClient:
             "side": side,
             "ordType": order_type,
             "sz": str(rounded_size),
-            "triggerPx": str(trigger_price),
-            "orderPx": order_price,
         }
+        if order_type == "conditional":
+            # Односторонний conditional - это SL: OKX ждет slTriggerPx/slOrdPx,
+            # triggerPx/orderPx относятся только к ordType=trigger
+            payload["slTriggerPx"] = str(trigger_price)
+            payload["slOrdPx"] = order_price
+        else:
+            payload["triggerPx"] = str(trigger_price)
+            payload["orderPx"] = order_price
 
         if reduce_only:
             payload["reduceOnly"] = "true"
@@ -1615,6 +1812,7 @@ class OKXFuturesClient:
         algo_id: str,
         new_trigger_price: Optional[float] = None,
         new_size: Optional[float] = None,
+        new_sl_trigger_price: Optional[float] = None,
     ) -> dict:
         """
         Изменение существующего algo order (для обновления SL при движении TSL).
@@ -1622,8 +1820,10 @@ class OKXFuturesClient:
         Args:
             symbol: Торговый символ
             algo_id: ID algo ордера (algoId)
-            new_trigger_price: Новая цена срабатывания (опционально)
+            new_trigger_price: Новая цена срабатывания TP (newTpTriggerPx)
             new_size: Новый размер (опционально)
+            new_sl_trigger_price: Новая цена срабатывания SL (newSlTriggerPx),
+                исполнение по рынку
 
         Returns:
             Ответ от биржи
@@ -1636,6 +1836,10 @@ class OKXFuturesClient:
         if new_trigger_price is not None:
             payload["newTpTriggerPx"] = str(new_trigger_price)
 
+        if new_sl_trigger_price is not None:
+            payload["newSlTriggerPx"] = str(new_sl_trigger_price)
+            payload["newSlOrdPx"] = "-1"
+
         if new_size is not None:
             # Определяем size_step для округления
             if "BTC" in symbol:
@@ -1656,7 +1860,7 @@ class OKXFuturesClient:
 
         logger.debug(
             f"Amending algo order: {symbol} algoId={algo_id} "
-            f"new_trigger={new_trigger_price}"
+            f"new_trigger={new_trigger_price}, new_sl_trigger={new_sl_trigger_price}"
         )
 
         return await self._make_request(
@@ -1716,10 +1920,40 @@ class OKXFuturesClient:
         )
 
     async def cancel_order(self, symbol: str, order_id: str) -> dict:
-        return await self._make_request(
-            "POST",
-            "/api/v5/trade/cancel-order",
-            data={"instId": f"{symbol}-SWAP", "ordId": order_id},
+        payload = {"instId": f"{symbol}-SWAP", "ordId": order_id}
+        return await self._submit_trade(
+            "cancel-order", [payload], "/api/v5/trade/cancel-order", payload
+        )
+
+    async def amend_order(
+        self,
+        symbol: str,
+        order_id: Optional[str] = None,
+        new_price: Optional[float] = None,
+        new_size: Optional[float] = None,
+        cl_ord_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Изменение цены/размера обычного (не algo) ордера.
+
+        Args:
+            symbol: Торговый символ (например, "BTC-USDT")
+            order_id: ID ордера (ordId); либо cl_ord_id
+            new_price: Новая цена (newPx)
+            new_size: Новый размер в контрактах (newSz)
+            cl_ord_id: Client order ID (clOrdId), если ordId неизвестен
+        """
+        payload: Dict[str, Any] = {"instId": f"{symbol}-SWAP"}
+        if order_id:
+            payload["ordId"] = str(order_id)
+        elif cl_ord_id:
+            payload["clOrdId"] = cl_ord_id[:32]
+        if new_price is not None:
+            payload["newPx"] = str(new_price)
+        if new_size is not None:
+            payload["newSz"] = str(new_size)
+        return await self._submit_trade(
+            "amend-order", [payload], "/api/v5/trade/amend-order", payload
         )
 
     async def get_positions(self, symbol: Optional[str] = None) -> list:
@@ -1747,6 +1981,12 @@ class OKXFuturesClient:
                 raise TimeoutError(f"orders-pending timeout: {e}")
             raise
 
+    async def get_order(self, symbol: str, order_id: str) -> list:
+        """Получение ордера по ordId (состояние, sz, accFillSz)"""
+        params = {"instId": f"{symbol}-SWAP", "ordId": order_id}
+        data = await self._make_request("GET", "/api/v5/trade/order", params=params)
+        return data.get("data", [])
+
     async def get_order_by_clordid(self, symbol: str, cl_ord_id: str) -> list:
         """Получение ордера по client order id (clOrdId)"""
         params = {"instId": f"{symbol}-SWAP", "clOrdId": cl_ord_id}
@@ -1811,6 +2051,9 @@ class OKXFuturesClient:
     # ---------- Batch ----------
     async def batch_amend_orders(self, amend_list: list) -> dict:
         """До 20 ордеров за 1 запрос (аналогично spot)"""
-        return await self._make_request(
-            "POST", "/api/v5/trade/amend-batch", data={"amendData": amend_list}
+        return await self._submit_trade(
+            "batch-amend-orders",
+            amend_list,
+            "/api/v5/trade/amend-batch",
+            {"amendData": amend_list},
         )
@@ -4,8 +4,9 @@ Correlation Manager
 Управляет расчетом корреляции между торговыми парами для избежания
 одновременных позиций в сильно коррелированных активах.
 
-Использует Pearson correlation для определения степени зависимости
-движения цен между парами.
+Использует корреляцию Пирсона лог-доходностей свечей (не уровней цен):
+ее значения заметно ниже ценовой корреляции трендовых рядов, пороги
+high_correlation_threshold заданы в этой шкале.
 """
 
 import time
@@ -13,11 +14,11 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 import aiohttp
-import numpy as np
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from src.clients.spot_client import OKXClient
+from src.filters.correlation_matrix import CorrelationCluster, RollingCorrelationMatrix
 from src.models import OHLCV
 
 
@@ -35,7 +36,7 @@ class CorrelationConfig(BaseModel):
         default=0.7,
         ge=0.5,
         le=1.0,
-        description="Порог высокой корреляции (>0.7 = сильная)",
+        description="Порог высокой корреляции лог-доходностей (>0.7 = сильная)",
     )
 
 
@@ -66,7 +67,9 @@ class CorrelationManager:
     Менеджер корреляций между торговыми парами.
 
     Рассчитывает и кэширует корреляции Пирсона между парами на основе
-    исторических данных цен закрытия.
+    доходностей цен закрытия. Все символы живут в одной скользящей матрице
+    (RollingCorrelationMatrix), выровненной по timestamp свечей: новая свеча
+    обновляет все пары сразу, запрос пары — O(1).
 
     Example:
         >>> config = CorrelationConfig(lookback_candles=100)
@@ -99,6 +102,9 @@ class CorrelationManager:
         # Кэш свечей: symbol -> (candles, timestamp)
         self._candles_cache: Dict[str, Tuple[List[OHLCV], float]] = {}
 
+        # Скользящая матрица корреляций по всем символам
+        self.matrix = RollingCorrelationMatrix(window=config.lookback_candles)
+
         logger.info(
             f"Correlation Manager initialized: {config.timeframe}, "
             f"lookback={config.lookback_candles}, threshold={config.high_correlation_threshold}"
@@ -147,35 +153,21 @@ class CorrelationManager:
                 logger.warning(f"Correlation: No candles for {pair1} or {pair2}")
                 return None
 
-            # Проверяем достаточно ли данных
-            min_candles = min(len(candles1), len(candles2))
-            if min_candles < 20:
+            # Новые свечи -> матрица (выравнивание по timestamp); последняя
+            # формирующаяся свеча учитывается и пересчитывается при обновлении
+            self.matrix.ingest_candles(pair1, candles1, include_last=True)
+            self.matrix.ingest_candles(pair2, candles2, include_last=True)
+
+            corr_data = self._from_matrix(pair1, pair2)
+            if corr_data is None:
                 logger.warning(
                     f"Correlation: Insufficient data for {pair1}/{pair2} "
-                    f"({min_candles} candles, need 20+)"
+                    f"({self.matrix.count} aligned returns, "
+                    f"need {self.matrix.min_periods}+)"
                 )
                 return None
-
-            # Синхронизируем по времени (берем последние N свечей)
-            sync_count = min(min_candles, self.config.lookback_candles)
-            prices1 = np.array([float(c.close) for c in candles1[-sync_count:]])
-            prices2 = np.array([float(c.close) for c in candles2[-sync_count:]])
-
-            # Рассчитываем корреляцию Пирсона
-            correlation = self._calculate_pearson_correlation(prices1, prices2)
-
-            # Создаем объект данных
-            corr_data = CorrelationData(
-                pair1=pair1,
-                pair2=pair2,
-                correlation=correlation,
-                calculated_at=time.time(),
-                candles_count=sync_count,
-            )
-
-            # Кэшируем результат
-            cache_key = (pair1, pair2)
-            self._correlation_cache[cache_key] = corr_data
+            correlation = corr_data.correlation
+            sync_count = corr_data.candles_count
 
             logger.info(
                 f"Correlation calculated: {pair1}/{pair2} = {correlation:.3f} "
@@ -212,10 +204,15 @@ class CorrelationManager:
         """
         correlations = {}
 
-        # Генерируем все уникальные пары
+        # Свечи каждого символа загружаются один раз, пары читаются из матрицы
+        for symbol in symbols:
+            candles = await self._get_candles(symbol)
+            if candles:
+                self.matrix.ingest_candles(symbol, candles, include_last=True)
+
         for i, pair1 in enumerate(symbols):
             for pair2 in symbols[i + 1 :]:
-                corr = await self.get_correlation(pair1, pair2)
+                corr = self._from_matrix(*sorted([pair1, pair2]))
                 if corr:
                     correlations[(pair1, pair2)] = corr
 
@@ -224,6 +221,42 @@ class CorrelationManager:
         )
         return correlations
 
+    def _from_matrix(self, pair1: str, pair2: str) -> Optional[CorrelationData]:
+        """CorrelationData из матрицы (pair1 < pair2) + запись в кэш."""
+        correlation = self.matrix.correlation(pair1, pair2)
+        if correlation is None:
+            return None
+        corr_data = CorrelationData(
+            pair1=pair1,
+            pair2=pair2,
+            correlation=correlation,
+            calculated_at=time.time(),
+            candles_count=self.matrix.count + 1,
+        )
+        self._correlation_cache[(pair1, pair2)] = corr_data
+        return corr_data
+
+    def get_correlated_exposure(
+        self,
+        symbol: str,
+        exposures: Dict[str, float],
+        threshold: Optional[float] = None,
+    ) -> CorrelationCluster:
+        """
+        Экспозиция открытых позиций, коррелированных с символом (для лимитов).
+
+        Args:
+            symbol: Символ для входа
+            exposures: symbol -> знаковая экспозиция (LONG > 0, SHORT < 0)
+            threshold: Порог корреляции (по умолчанию из конфига)
+
+        Returns:
+            CorrelationCluster (пустой, если в матрице мало данных)
+        """
+        if threshold is None:
+            threshold = self.config.high_correlation_threshold
+        return self.matrix.correlated_exposure(symbol, exposures, threshold)
+
     def get_highly_correlated_pairs(
         self, symbol: str, all_symbols: List[str], threshold: Optional[float] = None
     ) -> List[Tuple[str, float]]:
@@ -346,34 +379,6 @@ class CorrelationManager:
             logger.error(f"Error fetching candles for {symbol}: {e}")
             return []
 
-    def _calculate_pearson_correlation(
-        self, prices1: np.ndarray, prices2: np.ndarray
-    ) -> float:
-        """
-        Рассчитать корреляцию Пирсона между двумя массивами цен.
-
-        Args:
-            prices1: Массив цен первой пары
-            prices2: Массив цен второй пары
-
-        Returns:
-            float: Коэффициент корреляции (-1 to 1)
-        """
-        # Проверка на одинаковую длину
-        if len(prices1) != len(prices2):
-            raise ValueError("Price arrays must have the same length")
-
-        # Рассчитываем корреляцию
-        correlation_matrix = np.corrcoef(prices1, prices2)
-        correlation = correlation_matrix[0, 1]
-
-        # Обрабатываем NaN (если данные константны)
-        if np.isnan(correlation):
-            logger.warning("NaN correlation detected (constant prices?), returning 0")
-            return 0.0
-
-        return float(correlation)
-
     async def _fetch_candles_directly(
         self, symbol: str, timeframe: str, limit: int
     ) -> List[OHLCV]:
@@ -451,6 +456,7 @@ class CorrelationManager:
             # Очистка для конкретного символа
             if symbol in self._candles_cache:
                 del self._candles_cache[symbol]
+            self.matrix.remove_symbol(symbol)
 
             # Очистка корреляций связанных с этим символом
             keys_to_remove = [
@@ -464,6 +470,7 @@ class CorrelationManager:
             # Полная очистка
             self._correlation_cache.clear()
             self._candles_cache.clear()
+            self.matrix = RollingCorrelationMatrix(window=self.config.lookback_candles)
             logger.debug("Cleared all correlation cache")
 
     def get_cache_stats(self) -> Dict[str, int]:
@@ -476,5 +483,7 @@ class CorrelationManager:
         return {
             "correlations_cached": len(self._correlation_cache),
             "candles_cached": len(self._candles_cache),
+            "matrix_symbols": len(self.matrix.symbols),
+            "matrix_returns": self.matrix.count,
             "cache_ttl_seconds": self.config.cache_ttl_seconds,
         }
@@ -0,0 +1,432 @@
+"""
+Rolling Correlation Matrix
+
+Скользящая матрица корреляций Пирсона для всех пар символов.
+
+Хранит выровненные по timestamp лог-доходности всех символов в кольцевом
+буфере и поддерживает суммы Σx и Σxy (диагональ = Σx²), поэтому новая
+свеча обновляет всю матрицу за O(n²) без пересчета окна, а запрос пары — O(1).
+Последняя закоммиченная свеча может пересчитываться (формирующаяся свеча),
+а символ без свежих данных исключается, чтобы не останавливать остальные.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+@dataclass
+class CorrelationCluster:
+    """Коррелированный кластер символа с учетом экспозиции позиций"""
+
+    symbol: str
+    members: Dict[str, float] = field(default_factory=dict)  # symbol -> corr
+    weighted_exposure: float = 0.0  # Σ corr × signed exposure
+    gross_exposure: float = 0.0  # Σ |corr × exposure|
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+
+class RollingCorrelationMatrix:
+    """
+    Инкрементальная матрица корреляций по доходностям.
+
+    Свеча с timestamp t коммитится, когда close за t есть у всех символов;
+    пропуски у одного символа не сдвигают ряды остальных (в отличие от
+    "последних N свечей" каждого ряда). Символ, отставший от самого свежего
+    ряда на max_lag свечей, исключается из матрицы.
+
+    Example:
+        >>> matrix = RollingCorrelationMatrix(window=100)
+        >>> matrix.ingest_candles("BTC-USDT", btc_candles)
+        >>> matrix.ingest_candles("ETH-USDT", eth_candles)
+        >>> matrix.correlation("BTC-USDT", "ETH-USDT")
+    """
+
+    def __init__(
+        self,
+        window: int = 100,
+        min_periods: int = 20,
+        resync_every: Optional[int] = None,
+        max_lag: int = 5,
+    ):
+        """
+        Args:
+            window: Количество доходностей в окне
+            min_periods: Минимум доходностей для выдачи корреляции
+            resync_every: Каждые N свечей пересчитывать суммы с нуля
+                (гасит накопление ошибки float); по умолчанию = window
+            max_lag: Сколько свечей самого свежего символа ждать отстающий
+                символ, прежде чем исключить его (0 - не исключать)
+        """
+        self.window = int(window)
+        self.min_periods = int(min_periods)
+        self.resync_every = int(resync_every or window)
+        self.max_lag = int(max_lag)
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        # symbol -> {timestamp: close}, по возрастанию timestamp
+        self._closes: Dict[str, Dict[int, float]] = {}
+        self._history_limit = self.window * 2 + 2
+        self.stats = {
+            "bars": 0,
+            "rebuilds": 0,
+            "resyncs": 0,
+            "revisions": 0,
+            "stale_dropped": 0,
+        }
+        self._reset()
+
+    def _reset(self) -> None:
+        n = len(self.symbols)
+        self._returns = np.zeros((self.window, n))
+        self._pos = 0
+        self._count = 0
+        self._sum = np.zeros(n)
+        self._sum_xy = np.zeros((n, n))
+        self._corr = np.eye(n)
+        self._last_ts: Optional[int] = None
+        self._last_close: Optional[np.ndarray] = None
+        self._prev_close: Optional[np.ndarray] = None
+        self._since_resync = 0
+
+    # ==================== ВХОДНЫЕ ДАННЫЕ ====================
+
+    def add_symbol(self, symbol: str) -> bool:
+        """Зарегистрировать символ. Матрица перестраивается из буфера цен."""
+        if symbol in self._index:
+            return False
+        self._index[symbol] = len(self.symbols)
+        self.symbols.append(symbol)
+        self._closes.setdefault(symbol, {})
+        self._rebuild()
+        return True
+
+    def remove_symbol(self, symbol: str) -> bool:
+        """Убрать символ (например, без свежих данных — он держит горизонт)."""
+        if symbol not in self._index:
+            return False
+        self.symbols.remove(symbol)
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        self._closes.pop(symbol, None)
+        self._rebuild()
+        return True
+
+    def update(self, symbol: str, timestamp: int, close: float) -> int:
+        """Добавить close одного символа. Returns: сколько свечей закоммичено."""
+        self.add_symbol(symbol)
+        if not self._store(symbol, int(timestamp), float(close)):
+            return 0
+        return self._advance()
+
+    def ingest_candles(
+        self, symbol: str, candles: Iterable[Any], include_last: bool = False
+    ) -> int:
+        """
+        Добавить новые свечи символа (старые -> новые).
+
+        Последняя свеча по умолчанию пропускается: у DataRegistry/API она
+        обычно еще формируется. С include_last=True она учитывается, а ее
+        обновленный close пересчитывает последнюю доходность. Более старые
+        известные timestamp игнорируются, так что повторный вызов с тем же
+        списком — O(1).
+
+        Returns:
+            Количество закоммиченных выровненных свечей
+        """
+        candles = list(candles) if not isinstance(candles, list) else candles
+        if not include_last:
+            candles = candles[:-1]
+        if not candles:
+            return 0
+        # Символ без данных не регистрируем: иначе он блокирует выравнивание
+        self.add_symbol(symbol)
+
+        known = self._closes[symbol]
+        newest = next(reversed(known)) if known else None
+        start = len(candles)
+        while start > 0:
+            ts = int(self._field(candles[start - 1], "timestamp"))
+            if newest is not None and ts < newest:
+                break
+            start -= 1
+
+        added = False
+        for candle in candles[start:]:
+            added |= self._store(
+                symbol,
+                int(self._field(candle, "timestamp")),
+                float(self._field(candle, "close")),
+            )
+        return self._advance() if added else 0
+
+    @staticmethod
+    def _field(candle: Any, name: str) -> Any:
+        if isinstance(candle, dict):
+            return candle.get(name, 0)
+        return getattr(candle, name, 0)
+
+    def _store(self, symbol: str, timestamp: int, close: float) -> bool:
+        if close <= 0:
+            return False
+        closes = self._closes[symbol]
+        if closes:
+            newest = next(reversed(closes))
+            if timestamp < newest:
+                return False
+            if timestamp == newest:
+                # Формирующаяся свеча: обновляем close
+                if closes[newest] == close:
+                    return False
+                closes[newest] = close
+                return True
+        closes[timestamp] = close
+        while len(closes) > self._history_limit:
+            del closes[next(iter(closes))]
+        return True
+
+    # ==================== ИНКРЕМЕНТАЛЬНОЕ ОБНОВЛЕНИЕ ====================
+
+    def _pending_timestamps(self) -> List[int]:
+        """Timestamp после последнего коммита, которые есть у всех символов."""
+        if not self.symbols:
+            return []
+        series = [self._closes[s] for s in self.symbols]
+        if any(not closes for closes in series):
+            return []
+        horizon = min(next(reversed(closes)) for closes in series)
+        last_ts = self._last_ts
+        fresh: List[int] = []
+        # Идем с конца: смотрим только timestamp новее последнего коммита
+        for ts in reversed(min(series, key=len)):
+            if last_ts is not None and ts <= last_ts:
+                break
+            if ts <= horizon and all(ts in closes for closes in series):
+                fresh.append(ts)
+        fresh.reverse()
+        return fresh
+
+    def _advance(self) -> int:
+        if self._drop_stale():
+            return 0
+        revised = self._revise_last()
+        pending = self._pending_timestamps()
+        for ts in pending:
+            self._commit(ts)
+        if pending or revised:
+            self._refresh()
+        return len(pending)
+
+    def _drop_stale(self) -> bool:
+        """
+        Исключить символы, отставшие от самого свежего ряда на max_lag свечей:
+        без их close новые свечи не коммитятся и матрица замирает для всех.
+
+        Returns:
+            True если символы исключены (матрица перестроена)
+        """
+        if self.max_lag <= 0 or len(self.symbols) < 2:
+            return False
+        newest: Dict[str, int] = {}
+        for symbol in self.symbols:
+            closes = self._closes[symbol]
+            if not closes:
+                return False
+            newest[symbol] = next(reversed(closes))
+        horizon = min(newest.values())
+        leader = max(self.symbols, key=newest.__getitem__)
+        lag = 0
+        for ts in reversed(self._closes[leader]):
+            if ts <= horizon or lag >= self.max_lag:
+                break
+            lag += 1
+        if lag < self.max_lag:
+            return False
+
+        stale = [symbol for symbol in self.symbols if newest[symbol] == horizon]
+        for symbol in stale:
+            self.symbols.remove(symbol)
+            self._closes.pop(symbol, None)
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        self.stats["stale_dropped"] += len(stale)
+        logger.debug(
+            f"Correlation matrix: {', '.join(stale)} без свежих свечей "
+            f"({lag}+ свечей отставания) - исключены"
+        )
+        self._rebuild()
+        return True
+
+    def _revise_last(self) -> bool:
+        """Пересчитать доходность последней свечи, если ее close обновился."""
+        if self._last_ts is None or self._last_close is None:
+            return False
+        current = [self._closes[s].get(self._last_ts) for s in self.symbols]
+        if any(close is None for close in current):
+            return False
+        closes = np.array(current)
+        if np.array_equal(closes, self._last_close):
+            return False
+        if self._prev_close is not None and self._count > 0:
+            idx = (self._pos - 1) % self.window
+            old = self._returns[idx].copy()
+            new = np.log(closes / self._prev_close)
+            self._returns[idx] = new
+            self._sum += new - old
+            self._sum_xy += np.outer(new, new) - np.outer(old, old)
+        self._last_close = closes
+        self.stats["revisions"] += 1
+        return True
+
+    def _commit(self, timestamp: int) -> None:
+        closes = np.array([self._closes[s][timestamp] for s in self.symbols])
+        if self._last_close is not None:
+            self._push(np.log(closes / self._last_close))
+        self._prev_close = self._last_close
+        self._last_close = closes
+        self._last_ts = timestamp
+
+    def _push(self, returns: np.ndarray) -> None:
+        if self._count == self.window:
+            old = self._returns[self._pos]
+            self._sum -= old
+            self._sum_xy -= np.outer(old, old)
+        else:
+            self._count += 1
+        self._returns[self._pos] = returns
+        self._pos = (self._pos + 1) % self.window
+        self._sum += returns
+        self._sum_xy += np.outer(returns, returns)
+        self.stats["bars"] += 1
+
+        self._since_resync += 1
+        if self._since_resync >= self.resync_every:
+            active = self._active_returns()
+            self._sum = active.sum(axis=0)
+            self._sum_xy = active.T @ active
+            self._since_resync = 0
+            self.stats["resyncs"] += 1
+
+    def _active_returns(self) -> np.ndarray:
+        if self._count == self.window:
+            return self._returns
+        return self._returns[: self._count]
+
+    def _refresh(self) -> None:
+        """Корреляции из накопленных сумм: O(n²)."""
+        n = len(self.symbols)
+        if self._count < 2:
+            self._corr = np.eye(n)
+            return
+        cov = self._sum_xy - np.outer(self._sum, self._sum) / self._count
+        var = np.clip(np.diag(cov), 0.0, None)
+        denom = np.sqrt(np.outer(var, var))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.where(denom > 1e-18, cov / denom, 0.0)
+        self._corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(self._corr, 1.0)
+
+    def _rebuild(self) -> None:
+        """Полный пересчет из буфера цен (новый символ)."""
+        self._reset()
+        pending = self._pending_timestamps()[-(self.window + 1) :]
+        for ts in pending:
+            self._commit(ts)
+        self._refresh()
+        self.stats["rebuilds"] += 1
+        logger.debug(
+            f"Correlation matrix rebuilt: {len(self.symbols)} symbols, "
+            f"{self._count} returns"
+        )
+
+    # ==================== ЗАПРОСЫ ====================
+
+    @property
+    def count(self) -> int:
+        """Количество доходностей в окне"""
+        return self._count
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return self._last_ts
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.min_periods
+
+    def correlation(self, pair1: str, pair2: str) -> Optional[float]:
+        """O(1) корреляция пары или None (неизвестный символ / мало данных)."""
+        i = self._index.get(pair1)
+        j = self._index.get(pair2)
+        if i is None or j is None or not self.ready:
+            return None
+        return float(self._corr[i, j])
+
+    def row(self, symbol: str) -> Dict[str, float]:
+        """Корреляции символа со всеми остальными."""
+        i = self._index.get(symbol)
+        if i is None or not self.ready:
+            return {}
+        return {
+            other: float(self._corr[i, j])
+            for j, other in enumerate(self.symbols)
+            if j != i
+        }
+
+    def pairs(self) -> Dict[Tuple[str, str], float]:
+        """Все уникальные пары (pair1 < pair2 по алфавиту)."""
+        if not self.ready:
+            return {}
+        result = {}
+        for i, pair1 in enumerate(self.symbols):
+            for j in range(i + 1, len(self.symbols)):
+                key = tuple(sorted((pair1, self.symbols[j])))
+                result[key] = float(self._corr[i, j])
+        return result
+
+    def as_array(self) -> np.ndarray:
+        """Копия матрицы в порядке self.symbols."""
+        return self._corr.copy()
+
+    def correlated_exposure(
+        self,
+        symbol: str,
+        exposures: Dict[str, float],
+        threshold: float,
+    ) -> CorrelationCluster:
+        """
+        Кластер символа среди открытых позиций.
+
+        Args:
+            symbol: Символ, в который хотим войти
+            exposures: symbol -> знаковая экспозиция (USD; LONG > 0, SHORT < 0)
+            threshold: Порог |corr| для попадания в кластер
+
+        Returns:
+            CorrelationCluster: weighted_exposure > 0 — кластер уже нагружен
+            в LONG-сторону (для SHORT-входа это хедж), gross — без учета знака
+        """
+        cluster = CorrelationCluster(symbol=symbol)
+        i = self._index.get(symbol)
+        if i is None or not self.ready or not exposures:
+            return cluster
+
+        exposure = np.zeros(len(self.symbols))
+        for other, value in exposures.items():
+            j = self._index.get(other)
+            if j is not None and j != i:
+                exposure[j] = float(value)
+
+        row = self._corr[i]
+        mask = (np.abs(row) >= threshold) & (exposure != 0.0)
+        if not mask.any():
+            return cluster
+
+        weighted = row[mask] * exposure[mask]
+        cluster.members = {self.symbols[j]: float(row[j]) for j in np.flatnonzero(mask)}
+        cluster.weighted_exposure = float(weighted.sum())
+        cluster.gross_exposure = float(np.abs(weighted).sum())
+        return cluster
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Точка входа для Futures торговли в режиме шардинга по процессам.
+
+Главный процесс - market-data: одно публичное WebSocket-подключение на все
+символы, данные пишутся в MarketBus (shared memory). N процессов-воркеров -
+полноценные FuturesScalpingOrchestrator на своем наборе символов и своем
+суб-аккаунте с собственным Private WebSocket; рыночные данные они читают из
+шины. Воркер ведет все позиции своего аккаунта и сам считает лимиты, поэтому
+при workers > 1 у каждого воркера должен быть свой аккаунт - иначе запуск
+отклоняется.
+
+Конфиг (scalping.sharding в config_futures.yaml):
+    workers: 2
+    accounts: [okx, okx_sub1]   # ключи секции api, по одному на воркер
+    bus_name: scalp_md
+    poll_interval_ms: 5
+    weights: {BTC-USDT: 2.0}    # относительная стоимость символа
+    feed_stale_sec: 30          # тишина публичного WS -> переподключение
+    health_check_sec: 5
+    worker_restart_delay_sec: 5 # удваивается с каждым падением воркера
+    worker_restart_max_delay_sec: 300
+
+Запуск: python -m src.main_futures_sharded [--workers N]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Добавляем корневую папку проекта в путь
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger  # noqa: E402
+
+from src.config import BotConfig  # noqa: E402
+from src.strategies.scalping.futures.logging.logger_factory import (  # noqa: E402
+    LoggerFactory,
+)
+from src.strategies.scalping.futures.recording import FrameRecorder  # noqa: E402
+from src.strategies.scalping.futures.sharding import (  # noqa: E402
+    MarketBusWriter,
+    MarketDataFeed,
+    WorkerShard,
+    WorkerSupervisor,
+    check_accounts,
+    plan_shards,
+)
+
+DEFAULT_CONFIG_PATH = project_root / "config" / "config_futures.yaml"
+
+
+def _scalping_section(config: BotConfig, name: str) -> Dict[str, Any]:
+    section = getattr(config.scalping, name, {}) or {}
+    if not isinstance(section, dict):
+        section = dict(getattr(section, "__dict__", {}) or {})
+    return section
+
+
+def _sharding_config(config: BotConfig) -> Dict[str, Any]:
+    return _scalping_section(config, "sharding")
+
+
+def _recording_config(config: BotConfig) -> Dict[str, Any]:
+    return _scalping_section(config, "ws_recording")
+
+
+def _feed_channels(config: BotConfig) -> Tuple[bool, Optional[str]]:
+    """
+    Каналы сверх tickers/mark-price/свечей, нужные воркерам: trades (свечи
+    из сделок, order flow) и канал лучших цен для LimitOrderChaser.
+    """
+    trade_bars = _scalping_section(config, "trade_bars").get("enabled", True)
+    order_flow = _scalping_section(config, "signal_generator").get(
+        "order_flow_from_trades", True
+    )
+    chaser_cfg = _scalping_section(config, "order_chaser")
+    book_channel = (
+        str(chaser_cfg.get("book_channel", "bbo-tbt"))
+        if chaser_cfg.get("enabled", True)
+        else None
+    )
+    return bool(trade_bars or order_flow), book_channel
+
+
+def _recording_session(rec_cfg: Dict[str, Any], suffix: str) -> Dict[str, Any]:
+    """Отдельная сессия записи на процесс: процессы не пишут в один индекс."""
+    session = rec_cfg.get("session") or datetime.now().strftime("%Y%m%d_%H%M%S")
+    return {**rec_cfg, "session": f"{session}_{suffix}"}
+
+
+def apply_shard(
+    config: BotConfig, shard: WorkerShard, bus_name: str, poll_interval_ms: float
+) -> BotConfig:
+    """Сузить конфиг до символов и аккаунта воркера."""
+    if shard.account:
+        if shard.account not in config.api:
+            raise KeyError(f"Аккаунт {shard.account} не найден в секции api")
+        config.api["okx"] = config.api[shard.account]
+    config.trading.symbols = list(shard.symbols)
+    config.scalping.symbols = list(shard.symbols)
+    setattr(
+        config.scalping,
+        "sharding",
+        {
+            "role": "worker",
+            "bus_name": bus_name,
+            "poll_interval_ms": poll_interval_ms,
+            "shard_index": shard.index,
+        },
+    )
+    rec_cfg = _recording_config(config)
+    if rec_cfg.get("enabled", False):
+        setattr(
+            config.scalping,
+            "ws_recording",
+            _recording_session(rec_cfg, f"shard_{shard.index}"),
+        )
+    return config
+
+
+async def _run_worker(
+    config_path: str, shard: WorkerShard, bus_name: str, poll_interval_ms: float
+) -> None:
+    from src.strategies.scalping.futures.orchestrator import FuturesScalpingOrchestrator
+
+    config = apply_shard(
+        BotConfig.load_from_file(config_path), shard, bus_name, poll_interval_ms
+    )
+    logger.info(
+        f"🚀 Воркер #{shard.index}: символы={shard.symbols}, "
+        f"аккаунт={shard.account or 'okx'}"
+    )
+    orchestrator = FuturesScalpingOrchestrator(config)
+    try:
+        await orchestrator.start()
+    finally:
+        try:
+            await orchestrator.stop()
+        except Exception as e:
+            logger.debug(f"⚠️ Воркер #{shard.index}: ошибка при остановке: {e}")
+
+
+def worker_main(
+    config_path: str, shard: WorkerShard, bus_name: str, poll_interval_ms: float
+) -> None:
+    """Точка входа процесса-воркера (spawn)."""
+    LoggerFactory.setup_futures_logging(
+        log_dir=f"logs/futures/shard_{shard.index}", log_level="DEBUG"
+    )
+    try:
+        asyncio.run(_run_worker(config_path, shard, bus_name, poll_interval_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+async def main(config_path: Optional[str] = None, workers: Optional[int] = None):
+    """Процесс market-data: публичный WebSocket -> MarketBus + запуск воркеров."""
+    from src.strategies.scalping.futures.websocket_manager import (
+        FuturesWebSocketManager,
+    )
+
+    config_path = str(config_path or DEFAULT_CONFIG_PATH)
+    config = BotConfig.load_from_file(config_path)
+    sharding_cfg = _sharding_config(config)
+    workers = int(workers or sharding_cfg.get("workers", 2))
+    bus_name = str(sharding_cfg.get("bus_name", "scalp_md"))
+    poll_interval_ms = float(sharding_cfg.get("poll_interval_ms", 5.0))
+    symbols: List[str] = list(config.scalping.symbols)
+
+    shards = plan_shards(
+        symbols,
+        workers,
+        accounts=sharding_cfg.get("accounts") or None,
+        weights=sharding_cfg.get("weights") or None,
+    )
+    try:
+        check_accounts(shards, config.api)
+    except ValueError as e:
+        logger.error(f"❌ Шардированный запуск отклонен: {e}")
+        return
+    for shard in shards:
+        logger.info(
+            f"📋 Шард #{shard.index}: {', '.join(shard.symbols)} "
+            f"(вес={shard.weight:.1f}, аккаунт={shard.account or 'okx'})"
+        )
+
+    writer = MarketBusWriter(bus_name, symbols)
+    ws_url = (
+        "wss://wspap.okx.com:8443/ws/v5/public"
+        if config.get_okx_config().sandbox
+        else "wss://ws.okx.com:8443/ws/v5/public"
+    )
+    ws_manager = FuturesWebSocketManager(ws_url=ws_url)
+    recorder: Optional[FrameRecorder] = None
+    rec_cfg = _recording_config(config)
+    if rec_cfg.get("enabled", False):
+        recorder = FrameRecorder.from_config(_recording_session(rec_cfg, "market_data"))
+        recorder.start()
+        ws_manager.set_recorder(recorder)
+    trades, book_channel = _feed_channels(config)
+    feed = MarketDataFeed(
+        ws_manager, writer, symbols, trades=trades, book_channel=book_channel
+    )
+
+    ctx = multiprocessing.get_context("spawn")
+
+    def spawn(shard: WorkerShard):
+        process = ctx.Process(
+            target=worker_main,
+            args=(config_path, shard, bus_name, poll_interval_ms),
+            name=f"scalp-shard-{shard.index}",
+        )
+        process.start()
+        return process
+
+    supervisor = WorkerSupervisor(
+        shards,
+        spawn,
+        restart_delay=float(sharding_cfg.get("worker_restart_delay_sec", 5.0)),
+        max_restart_delay=float(
+            sharding_cfg.get("worker_restart_max_delay_sec", 300.0)
+        ),
+    )
+    health_check_sec = float(sharding_cfg.get("health_check_sec", 5.0))
+    feed_task: Optional[asyncio.Task] = None
+    try:
+        if not await feed.start():
+            return
+        # Единственный источник рыночных данных воркеров - следим за ним здесь
+        feed_task = asyncio.create_task(
+            feed.supervise(
+                stale_after=float(sharding_cfg.get("feed_stale_sec", 30.0)),
+                check_interval=health_check_sec,
+            )
+        )
+        supervisor.start()
+
+        last_report = 0.0
+        while not supervisor.all_finished():
+            await asyncio.sleep(health_check_sec)
+            supervisor.check()
+            if time.monotonic() - last_report >= 30:
+                last_report = time.monotonic()
+                logger.info(
+                    f"📊 MarketDataFeed: воркеров={supervisor.alive()}/"
+                    f"{len(supervisor.workers)} stats={feed.get_stats()} "
+                    f"supervisor={supervisor.stats}"
+                )
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.info("🛑 Остановка шардированного запуска...")
+    finally:
+        if feed_task:
+            feed_task.cancel()
+            await asyncio.gather(feed_task, return_exceptions=True)
+        processes = supervisor.processes()
+        # SIGINT -> asyncio.run воркера отменяет задачу и вызывает orchestrator.stop()
+        for process in processes:
+            if process.is_alive():
+                if os.name == "nt":
+                    process.terminate()
+                else:
+                    os.kill(process.pid, signal.SIGINT)
+        for process in processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+        await feed.stop()
+        writer.close()
+        if recorder:
+            recorder.close()
+        logger.info("✅ Шардированный Futures бот остановлен")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Futures бот: шардинг по процессам")
+    parser.add_argument("--config", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    LoggerFactory.setup_futures_logging(
+        log_dir="logs/futures/market_data", log_level="DEBUG"
+    )
+    asyncio.run(main(args.config, args.workers))
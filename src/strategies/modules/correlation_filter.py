@@ -36,7 +36,19 @@ class CorrelationFilterConfig(BaseModel):
         default=0.8,
         ge=0.5,
         le=1.0,
-        description="Порог высокой корреляции (>0.8 = предупреждение, не блок)",
+        description=(
+            "Порог высокой корреляции лог-доходностей "
+            "(>0.8 = предупреждение, не блок)"
+        ),
+    )
+
+    max_cluster_exposure: float = Field(
+        default=0.0,
+        ge=0.0,
+        description=(
+            "Лимит Σ corr × экспозиция кластера в сторону входа, в средних "
+            "позициях (блок; 0 = без лимита)"
+        ),
     )
 
     block_same_direction_only: bool = Field(
@@ -57,6 +69,10 @@ class CorrelationFilterResult(BaseModel):
     correlation_values: Dict[str, float] = Field(
         default_factory=dict, description="Значения корреляций"
     )
+    cluster_exposure: float = Field(
+        default=0.0,
+        description="Σ corr × экспозиция (USD, LONG > 0) коррелированных позиций",
+    )
 
 
 class CorrelationFilter:
@@ -129,6 +145,9 @@ class CorrelationFilter:
         old_threshold = self.config.correlation_threshold
         old_max = self.config.max_correlated_positions
 
+        # Параметры режимов ARM не содержат лимит кластера - сохраняем текущий
+        if "max_cluster_exposure" not in new_config.model_fields_set:
+            new_config.max_cluster_exposure = self.config.max_cluster_exposure
         self.config = new_config
 
         # Обновляем порог в CorrelationManager
@@ -218,17 +237,7 @@ class CorrelationFilter:
                     if self.config.block_same_direction_only:
                         # Блокируем только если направления совпадают
                         # ✅ ИСПРАВЛЕНИЕ: position может быть словарем (из API) или объектом Position
-                        if isinstance(position, dict):
-                            # Из API: "pos" > 0 = LONG, < 0 = SHORT
-                            pos_size = float(position.get("pos", "0"))
-                            position_direction = "LONG" if pos_size > 0 else "SHORT"
-                        else:
-                            # Объект Position
-                            position_direction = (
-                                "LONG"
-                                if position.side == PositionSide.LONG
-                                else "SHORT"
-                            )
+                        position_direction = self._position_direction(position)
                         if signal_side == position_direction:
                             correlated_positions.append(open_symbol)
                             logger.debug(
@@ -243,20 +252,57 @@ class CorrelationFilter:
                             f"{open_symbol} ({correlation_value:.2f})"
                         )
 
+            # Экспозиция коррелированного кластера (из матрицы корреляций, O(n))
+            exposures = {
+                open_symbol: self._position_exposure(position)
+                for open_symbol, position in current_positions.items()
+            }
+            cluster = self.correlation_manager.get_correlated_exposure(
+                symbol, exposures, threshold
+            )
+            if cluster.members:
+                logger.debug(
+                    f"Correlation Filter: {symbol} cluster {cluster.members}, "
+                    f"exposure={cluster.weighted_exposure:.2f} USD"
+                )
+                # Лимит кластера в средних позициях: не зависит от баланса,
+                # встречная экспозиция (хедж) его не нагружает
+                limit = self.config.max_cluster_exposure
+                sizes = [abs(value) for value in exposures.values() if value]
+                if limit > 0 and sizes:
+                    direction = 1.0 if signal_side == "LONG" else -1.0
+                    load = (
+                        direction * cluster.weighted_exposure * len(sizes) / sum(sizes)
+                    )
+                    if load >= limit:
+                        logger.warning(
+                            f"🚫 Correlation Filter BLOCKED (CLUSTER_EXPOSURE): {symbol} {signal_side}\n"
+                            f"   Cluster: {cluster.members}\n"
+                            f"   Exposure: {cluster.weighted_exposure:.2f} USD "
+                            f"= {load:.2f} поз. (лимит {limit:.2f})"
+                        )
+                        self._record_decision(blocked=True)
+                        return CorrelationFilterResult(
+                            allowed=False,
+                            blocked=True,
+                            reason=(
+                                f"Correlated cluster exposure {load:.2f} >= {limit:.2f} "
+                                f"positions: {list(cluster.members)}"
+                            ),
+                            correlated_positions=list(cluster.members),
+                            correlation_values=correlation_values,
+                            cluster_exposure=cluster.weighted_exposure,
+                        )
+
             # Проверяем лимит коррелированных позиций
             if len(correlated_positions) >= self.config.max_correlated_positions:
                 # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (08.01.2026): Проверяем противоположные направления (хедж)
                 # Если есть позиции в противоположном направлении → разрешаем (хеджирование)
                 opposite_positions = []
                 for pos_symbol in correlated_positions:
-                    pos = current_positions[pos_symbol]
-                    if isinstance(pos, dict):
-                        pos_size = float(pos.get("pos", "0"))
-                        pos_direction = "LONG" if pos_size > 0 else "SHORT"
-                    else:
-                        pos_direction = (
-                            "LONG" if pos.side == PositionSide.LONG else "SHORT"
-                        )
+                    pos_direction = self._position_direction(
+                        current_positions[pos_symbol]
+                    )
                     
                     if signal_side != pos_direction:
                         opposite_positions.append(pos_symbol)
@@ -289,6 +335,7 @@ class CorrelationFilter:
                     reason=f"WARNING: {len(correlated_positions)} correlated positions (soft limit, allowed)",
                     correlated_positions=correlated_positions,
                     correlation_values=correlation_values,
+                    cluster_exposure=cluster.weighted_exposure,
                 )
 
             # ✅ ИСПРАВЛЕНО (08.01.2026): ДОПОЛНИТЕЛЬНАЯ ЗАЩИТА - блокировать даже одну коррелированную позицию
@@ -308,6 +355,7 @@ class CorrelationFilter:
                     reason=f"Correlated with open positions: {correlated_positions}",
                     correlated_positions=correlated_positions,
                     correlation_values=correlation_values,
+                    cluster_exposure=cluster.weighted_exposure,
                 )
 
             # Разрешаем вход
@@ -329,6 +377,7 @@ class CorrelationFilter:
                 reason=f"Correlated positions: {len(correlated_positions)}/{self.config.max_correlated_positions} (threshold={threshold:.2f})",
                 correlated_positions=correlated_positions,
                 correlation_values=correlation_values,
+                cluster_exposure=cluster.weighted_exposure,
             )
 
         except Exception as e:
@@ -340,6 +389,39 @@ class CorrelationFilter:
                 reason=f"Error (fail-safe): {str(e)}",
             )
 
+    @staticmethod
+    def _position_direction(position) -> str:
+        """Направление позиции: "LONG" или "SHORT"."""
+        if isinstance(position, dict):
+            # Из API: в hedge-режиме posSide long/short и pos > 0,
+            # в net-режиме знак pos ("pos" > 0 = LONG, < 0 = SHORT)
+            pos_side = str(position.get("posSide") or "net").lower()
+            if pos_side in ("long", "short"):
+                return pos_side.upper()
+            pos_size = float(position.get("pos", "0") or 0)
+            return "LONG" if pos_size > 0 else "SHORT"
+        return "LONG" if position.side == PositionSide.LONG else "SHORT"
+
+    @classmethod
+    def _position_exposure(cls, position) -> float:
+        """Знаковая экспозиция позиции в USD (LONG > 0, SHORT < 0)."""
+        if isinstance(position, dict):
+            # Из API: notionalUsd по модулю, направление - posSide или знак pos
+            pos_size = float(position.get("pos", "0") or 0)
+            notional = abs(float(position.get("notionalUsd", "0") or 0))
+            if not notional:
+                price = float(position.get("markPx") or position.get("avgPx") or 0)
+                notional = abs(pos_size) * price
+            if not pos_size:
+                return 0.0
+            return (
+                notional if cls._position_direction(position) == "LONG" else -notional
+            )
+        market_value = abs(float(getattr(position, "market_value", 0.0) or 0.0))
+        if getattr(position, "side", None) == PositionSide.SHORT:
+            return -market_value
+        return market_value
+
     def _get_effective_threshold(self) -> float:
         """
         Возвращает актуальный порог корреляции с учетом временной релаксации.
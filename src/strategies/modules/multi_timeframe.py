@@ -14,7 +14,7 @@ Logic:
 """
 
 import time
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import aiohttp
 import numpy as np
@@ -22,6 +22,7 @@ from loguru import logger
 from pydantic import BaseModel, Field
 
 from src.models import OHLCV
+from src.utils.derived_cache import candles_dep
 
 
 class MTFConfig(BaseModel):
@@ -120,8 +121,14 @@ class MultiTimeframeFilter:
             structured_logger  # ✅ НОВОЕ: StructuredLogger для логирования
         )
 
-        # Кэш для свечей старшего таймфрейма
+        # Кэш для свечей старшего таймфрейма (TTL, только для свечей из API)
         self._candles_cache: Dict[str, tuple[List[OHLCV], float]] = {}
+        # EMA закрытых свечей DataRegistry: валидны до закрытия следующей свечи HTF
+        derived_cache = getattr(data_registry, "derived_cache", None)
+        self._trend_cache = (
+            derived_cache("mtf_trend", max_entries=128) if derived_cache else None
+        )
+        self._registry_candles: set = set()  # символы, чьи свечи пришли из DataRegistry
         self._fail_open_state: Dict[str, Dict[str, float]] = {}
 
         logger.info(
@@ -169,6 +176,19 @@ class MultiTimeframeFilter:
             ...     logger.warning(f"MTF blocked: {result.reason}")
         """
         try:
+            timeframe = self.config.confirmation_timeframe
+            trend_key = (
+                symbol,
+                timeframe,
+                self.config.ema_fast_period,
+                self.config.ema_slow_period,
+            )
+            deps = (candles_dep(symbol, timeframe),)
+            snapshot = (
+                self._trend_cache.versions.snapshot(deps)
+                if self._trend_cache is not None
+                else None
+            )
             # Получаем свечи старшего таймфрейма (с кэшированием)
             candles = await self._get_htf_candles(symbol)
 
@@ -185,8 +205,17 @@ class MultiTimeframeFilter:
                     htf_trend=None,
                 )
 
+            # Кэшируются только EMA закрытых свечей DataRegistry (у них есть
+            # версия); close формирующейся свечи применяется при каждой проверке
+            closed_emas = None
+            if self._trend_cache is not None and symbol in self._registry_candles:
+                closed_emas = self._trend_cache.get(trend_key)
+                if closed_emas is None:
+                    closed_emas = self._closed_emas(candles)
+                    self._trend_cache.put(trend_key, closed_emas, deps, snapshot)
+
             # Рассчитываем тренд на старшем ТФ
-            htf_trend = self._calculate_trend(candles)
+            htf_trend = self._calculate_trend(candles, closed_emas)
 
             # Логика подтверждения/блокировки
             if signal_side == "LONG":
@@ -343,9 +372,9 @@ class MultiTimeframeFilter:
                                 logger.debug(
                                     f"⚠️ Ошибка логирования использования свечей MTF: {e}"
                                 )
-                        # Кэшируем результат из DataRegistry
-                        if candles:
-                            self._candles_cache[symbol] = (candles, current_time)
+                        # Свечи DataRegistry не кэшируем по TTL: производный тренд
+                        # EMA закрытых свечей кэшируются в _trend_cache
+                        self._registry_candles.add(symbol)
                         return candles
                     else:
                         logger.info(  # ✅ ИЗМЕНЕНО: INFO вместо DEBUG для важного события
@@ -376,6 +405,7 @@ class MultiTimeframeFilter:
                     )
 
             # Fallback: запрашиваем через API
+            self._registry_candles.discard(symbol)
             # ✅ АДАПТАЦИЯ: Получаем свечи напрямую через публичный API (работает для futures и spot)
             if self.client and hasattr(self.client, "get_candles"):
                 # Если клиент поддерживает get_candles - используем его
@@ -405,12 +435,33 @@ class MultiTimeframeFilter:
             )
             return []
 
-    def _calculate_trend(self, candles: List[OHLCV]) -> str:
+    def _closed_emas(self, candles: List[OHLCV]) -> Tuple[float, float]:
+        """
+        EMA fast/slow по закрытым свечам (все, кроме последней - формирующейся).
+
+        Args:
+            candles: Список свечей OHLCV (не меньше двух)
+
+        Returns:
+            (EMA fast, EMA slow) на закрытии предпоследней свечи
+        """
+        closes = np.array([float(c.close) for c in candles[:-1]])
+        ema_fast = self._calculate_ema(closes, self.config.ema_fast_period)
+        ema_slow = self._calculate_ema(closes, self.config.ema_slow_period)
+        return float(ema_fast[-1]), float(ema_slow[-1])
+
+    def _calculate_trend(
+        self,
+        candles: List[OHLCV],
+        closed_emas: Optional[Tuple[float, float]] = None,
+    ) -> str:
         """
         Рассчитать тренд на основе EMA8 и EMA21.
 
         Args:
             candles: Список свечей OHLCV
+            closed_emas: EMA закрытых свечей из кэша (см. _closed_emas);
+                None - рассчитать по candles
 
         Returns:
             str: "BULLISH", "BEARISH" или "NEUTRAL"
@@ -418,17 +469,16 @@ class MultiTimeframeFilter:
         if len(candles) < self.config.ema_slow_period:
             return "NEUTRAL"
 
-        # Извлекаем цены закрытия
-        closes = np.array([float(c.close) for c in candles])
-
-        # Рассчитываем EMA
-        ema_fast = self._calculate_ema(closes, self.config.ema_fast_period)
-        ema_slow = self._calculate_ema(closes, self.config.ema_slow_period)
+        if closed_emas is None:
+            closed_emas = self._closed_emas(candles)
+        prev_ema_fast, prev_ema_slow = closed_emas
 
-        # Текущие значения (последняя свеча)
-        current_price = closes[-1]
-        current_ema_fast = ema_fast[-1]
-        current_ema_slow = ema_slow[-1]
+        # Текущие значения: EMA закрытых свечей + шаг по последней свече
+        current_price = float(candles[-1].close)
+        fast_mult = 2 / (self.config.ema_fast_period + 1)
+        slow_mult = 2 / (self.config.ema_slow_period + 1)
+        current_ema_fast = (current_price - prev_ema_fast) * fast_mult + prev_ema_fast
+        current_ema_slow = (current_price - prev_ema_slow) * slow_mult + prev_ema_slow
 
         logger.debug(
             f"MTF Trend: Price={current_price:.2f}, "
@@ -597,6 +647,9 @@ class MultiTimeframeFilter:
         else:
             self._candles_cache.clear()
             logger.debug("MTF: Весь кэш очищен")
+        if self._trend_cache is not None:
+            # Ключи тренда составные — проще сбросить кэш целиком
+            self._trend_cache.invalidate()
 
     def _should_fail_open(self, symbol: str) -> bool:
         if not getattr(self.config, "fail_open_enabled", False):
@@ -22,6 +22,7 @@ from src.clients.spot_client import OKXClient
 from src.indicators.advanced.pivot_calculator import (PivotCalculator,
                                                       PivotLevels)
 from src.models import OHLCV
+from src.utils.derived_cache import candles_dep
 
 
 class PivotPointsConfig(BaseModel):
@@ -94,8 +95,13 @@ class PivotPointsFilter:
         )
         self.calculator = PivotCalculator()
 
-        # Кэш уровней: symbol -> (PivotLevels, timestamp)
+        # Кэш уровней: symbol -> (PivotLevels, timestamp) — для уровней из API (TTL)
         self._levels_cache: Dict[str, tuple[PivotLevels, float]] = {}
+        # Уровни по дневным свечам DataRegistry: пересчет при новой свече или по TTL
+        derived_cache = getattr(data_registry, "derived_cache", None)
+        self._registry_levels = (
+            derived_cache("pivot_levels", max_entries=128) if derived_cache else None
+        )
 
         logger.info(
             f"Pivot Points Filter initialized: "
@@ -300,6 +306,17 @@ class PivotPointsFilter:
             PivotLevels или None
         """
         current_time = time.time()
+        timeframe = self.config.daily_timeframe
+        # Последняя дневная свеча формируется, а ее обновления не меняют версию
+        # candles_dep — TTL-корзина в ключе пересчитывает уровни не реже
+        # cache_ttl_seconds, как и прежний кэш
+        ttl_bucket = int(current_time // self.config.cache_ttl_seconds)
+        levels_key = (symbol, timeframe, self.config.use_last_n_days, ttl_bucket)
+
+        if self._registry_levels is not None:
+            cached_levels = self._registry_levels.get(levels_key)
+            if cached_levels is not None:
+                return cached_levels
 
         # Проверяем кэш
         if symbol in self._levels_cache:
@@ -317,6 +334,12 @@ class PivotPointsFilter:
         # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ: Попытка 0: Сначала пытаемся получить свечи из DataRegistry
         if self.data_registry:
             try:
+                deps = (candles_dep(symbol, timeframe),)
+                snapshot = (
+                    self._registry_levels.versions.snapshot(deps)
+                    if self._registry_levels is not None
+                    else None
+                )
                 daily_candles = await self.data_registry.get_candles(
                     symbol, self.config.daily_timeframe
                 )
@@ -330,7 +353,9 @@ class PivotPointsFilter:
                     levels = self.calculator.calculate_pivots(
                         daily_candles, self.config.use_last_n_days
                     )
-                    if levels:
+                    if levels and self._registry_levels is not None:
+                        self._registry_levels.put(levels_key, levels, deps, snapshot)
+                    elif levels:
                         self._levels_cache[symbol] = (levels, current_time)
                     return levels
                 else:
@@ -547,12 +572,15 @@ class PivotPointsFilter:
         else:
             self._levels_cache.clear()
             logger.debug("Cleared all pivot cache")
+        if self._registry_levels is not None:
+            self._registry_levels.invalidate()
 
     def get_stats(self) -> Dict:
         """Получить статистику фильтра"""
         return {
             "enabled": self.config.enabled,
-            "cached_symbols": len(self._levels_cache),
+            "cached_symbols": len(self._levels_cache)
+            + (len(self._registry_levels) if self._registry_levels is not None else 0),
             "tolerance": self.config.level_tolerance_percent,
             "bonus": self.config.score_bonus_near_level,
         }
@@ -46,6 +46,8 @@ class SlippageGuard:
         self.max_spread_percent = max_spread_percent
         self.order_timeout = order_timeout
         self.check_interval = check_interval
+        # ExecutionCostModel (futures): ожидаемое проскальзывание market по нашим fill'ам
+        self.execution_costs = None
 
         # Состояние мониторинга
         self.is_monitoring = False
@@ -552,6 +554,23 @@ class SlippageGuard:
                         f"Проскальзывание слишком большое: {slippage_analysis['slippage_percent']:.3f}%",
                     )
 
+            # Для market ордеров - проскальзывание, выученное по нашим исполнениям
+            if order_type == "market" and self.execution_costs is not None:
+                estimate = self.execution_costs.estimate(
+                    symbol,
+                    "buy" if side.lower() in ("buy", "long") else "sell",
+                    "market",
+                    notional=size * mid_price,
+                )
+                if estimate.slippage_bps is not None:
+                    expected_percent = estimate.slippage_bps / 100.0
+                    if expected_percent > self.max_slippage_percent:
+                        return (
+                            False,
+                            f"Ожидаемое проскальзывание слишком большое: "
+                            f"{expected_percent:.3f}% (по {estimate.samples} исполнениям)",
+                        )
+
             return True, "Ордер валиден"
 
         except Exception as e:
@@ -8,28 +8,52 @@
 - Эффективность сигналов
 """
 
-from collections import defaultdict
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 
 from loguru import logger
 
+from src.utils.window_metrics import WindowedMetrics
+
 
 class TradingStatistics:
     """Отслеживание статистики торговли для адаптации параметров"""
 
-    def __init__(self, lookback_hours: int = 24):
+    # Имена метрик в общем WindowedMetrics
+    TRADE_METRIC = "trade.pnl"
+    WIN_METRIC = "trade.win_pnl"
+    LOSS_METRIC = "trade.loss_pnl"
+    SIGNAL_METRIC = "signal.recorded"
+    SIGNAL_EXECUTED_METRIC = "signal.executed"
+    REVERSAL_METRIC = "reversal.price_change"
+
+    def __init__(
+        self,
+        lookback_hours: int = 24,
+        metrics_store: Optional[WindowedMetrics] = None,
+    ):
         """
         Инициализация модуля статистики
 
         Args:
             lookback_hours: Количество часов для анализа статистики
+            metrics_store: Общее хранилище оконных метрик (по умолчанию свое)
         """
         self.lookback_hours = lookback_hours
-        self.trades: List[Dict] = []
-        self.signals: List[Dict] = []
-        # ✅ НОВОЕ: Статистика разворотов
-        self.reversals: List[Dict] = []  # Список обнаруженных разворотов
+        # ✅ Вместо списков сделок/сигналов/разворотов - кольцевые бакеты:
+        # память ограничена, запросы O(бакетов) независимо от числа сделок
+        self.metrics = metrics_store or WindowedMetrics(
+            bucket_seconds=300, retention_seconds=lookback_hours * 3600
+        )
+        self._window_seconds = lookback_hours * 3600
+
+    def _query(self, metric: str, regime: Optional[str], symbol: Optional[str]):
+        return self.metrics.query(
+            metric,
+            self._window_seconds,
+            symbol=symbol or None,
+            regime=regime.lower() if regime else None,
+        )
 
     def record_trade(
         self,
@@ -59,25 +83,16 @@ class TradingStatistics:
             signal_strength: Сила сигнала (0-1)
             signal_type: Тип сигнала
         """
-        trade = {
+        labels = {
             "symbol": symbol,
-            "side": side,
-            "regime": regime.lower(),
-            "pnl": pnl,
-            "entry_price": entry_price,
-            "exit_price": exit_price,
-            "entry_time": entry_time,
-            "exit_time": exit_time,
-            "signal_strength": signal_strength,
+            "regime": (regime or "").lower(),
             "signal_type": signal_type,
-            "is_win": pnl > 0,
-            "duration_minutes": (exit_time - entry_time).total_seconds() / 60.0,
         }
-        self.trades.append(trade)
-
-        # Очищаем старые сделки
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=self.lookback_hours)
-        self.trades = [t for t in self.trades if t["entry_time"] >= cutoff_time]
+        # Окно считается по времени входа, как и раньше
+        if not self.metrics.record(self.TRADE_METRIC, pnl, ts=entry_time, **labels):
+            return
+        outcome = self.WIN_METRIC if pnl > 0 else self.LOSS_METRIC
+        self.metrics.record(outcome, pnl, ts=entry_time, **labels)
 
     def record_signal(
         self,
@@ -99,20 +114,14 @@ class TradingStatistics:
             signal_type: Тип сигнала
             was_executed: Был ли сигнал выполнен
         """
-        signal = {
+        labels = {
             "symbol": symbol,
-            "side": side,
-            "regime": regime.lower(),
-            "strength": strength,
+            "regime": (regime or "").lower(),
             "signal_type": signal_type,
-            "was_executed": was_executed,
-            "timestamp": datetime.now(timezone.utc),
         }
-        self.signals.append(signal)
-
-        # Очищаем старые сигналы
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=self.lookback_hours)
-        self.signals = [s for s in self.signals if s["timestamp"] >= cutoff_time]
+        self.metrics.record(self.SIGNAL_METRIC, strength, **labels)
+        if was_executed:
+            self.metrics.record(self.SIGNAL_EXECUTED_METRIC, strength, **labels)
 
     def record_reversal(
         self,
@@ -134,20 +143,13 @@ class TradingStatistics:
             max_price: Максимальная цена (для v_down)
             min_price: Минимальная цена (для v_up)
         """
-        reversal = {
-            "symbol": symbol,
-            "reversal_type": reversal_type,
-            "regime": regime.lower(),
-            "price_change": price_change,
-            "max_price": max_price,
-            "min_price": min_price,
-            "timestamp": datetime.now(timezone.utc),
-        }
-        self.reversals.append(reversal)
-
-        # Очищаем старые развороты
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=self.lookback_hours)
-        self.reversals = [r for r in self.reversals if r["timestamp"] >= cutoff_time]
+        self.metrics.record(
+            self.REVERSAL_METRIC,
+            price_change,
+            symbol=symbol,
+            regime=(regime or "").lower(),
+            reason=reversal_type,
+        )
 
     def get_reversal_stats(
         self, regime: Optional[str] = None, symbol: Optional[str] = None
@@ -162,48 +164,21 @@ class TradingStatistics:
         Returns:
             Словарь со статистикой разворотов
         """
-        if not self.reversals:
-            return {
-                "total_reversals": 0,
-                "v_down_count": 0,
-                "v_up_count": 0,
-                "avg_price_change": 0.0,
-            }
-
-        # Фильтруем по символу и режиму
-        filtered_reversals = self.reversals
-        if symbol:
-            filtered_reversals = [
-                r for r in filtered_reversals if r["symbol"] == symbol
-            ]
-        if regime:
-            filtered_reversals = [
-                r for r in filtered_reversals if r["regime"].lower() == regime.lower()
-            ]
-
-        if not filtered_reversals:
-            return {
-                "total_reversals": 0,
-                "v_down_count": 0,
-                "v_up_count": 0,
-                "avg_price_change": 0.0,
-            }
-
-        v_down_count = sum(
-            1 for r in filtered_reversals if r["reversal_type"] == "v_down"
-        )
-        v_up_count = sum(1 for r in filtered_reversals if r["reversal_type"] == "v_up")
-        avg_price_change = (
-            sum(r["price_change"] for r in filtered_reversals) / len(filtered_reversals)
-            if filtered_reversals
-            else 0.0
+        by_type = self.metrics.group_by(
+            self.REVERSAL_METRIC,
+            "reason",
+            self._window_seconds,
+            symbol=symbol or None,
+            regime=regime.lower() if regime else None,
         )
+        total = sum(agg.count for agg in by_type.values())
+        total_change = sum(agg.total for agg in by_type.values())
 
         return {
-            "total_reversals": len(filtered_reversals),
-            "v_down_count": v_down_count,
-            "v_up_count": v_up_count,
-            "avg_price_change": avg_price_change,
+            "total_reversals": total,
+            "v_down_count": by_type["v_down"].count if "v_down" in by_type else 0,
+            "v_up_count": by_type["v_up"].count if "v_up" in by_type else 0,
+            "avg_price_change": total_change / total if total else 0.0,
         }
 
     def get_win_rate(
@@ -219,23 +194,12 @@ class TradingStatistics:
         Returns:
             Win rate (0-1)
         """
-        if not self.trades:
+        total = self._query(self.TRADE_METRIC, regime, symbol).count
+        if not total:
             return 0.5  # Fallback: 50% если нет данных
 
-        # Фильтруем по символу и режиму
-        filtered_trades = self.trades
-        if symbol:
-            filtered_trades = [t for t in filtered_trades if t["symbol"] == symbol]
-        if regime:
-            filtered_trades = [
-                t for t in filtered_trades if t["regime"].lower() == regime.lower()
-            ]
-
-        if not filtered_trades:
-            return 0.5  # Fallback если нет данных
-
-        wins = sum(1 for t in filtered_trades if t["is_win"])
-        return wins / len(filtered_trades)
+        wins = self._query(self.WIN_METRIC, regime, symbol).count
+        return wins / total
 
     def get_avg_pnl(
         self, regime: Optional[str] = None, symbol: Optional[str] = None
@@ -250,24 +214,8 @@ class TradingStatistics:
         Returns:
             Tuple (avg_win, avg_loss)
         """
-        if not self.trades:
-            return (0.0, 0.0)
-
-        # Фильтруем по символу и режиму
-        filtered_trades = self.trades
-        if symbol:
-            filtered_trades = [t for t in filtered_trades if t["symbol"] == symbol]
-        if regime:
-            filtered_trades = [
-                t for t in filtered_trades if t["regime"].lower() == regime.lower()
-            ]
-        trades = filtered_trades
-
-        wins = [t["pnl"] for t in trades if t["is_win"]]
-        losses = [t["pnl"] for t in trades if not t["is_win"]]
-
-        avg_win = sum(wins) / len(wins) if wins else 0.0
-        avg_loss = sum(losses) / len(losses) if losses else 0.0
+        avg_win = self._query(self.WIN_METRIC, regime, symbol).mean
+        avg_loss = self._query(self.LOSS_METRIC, regime, symbol).mean
 
         return (avg_win, avg_loss)
 
@@ -284,14 +232,7 @@ class TradingStatistics:
         Returns:
             Количество сделок
         """
-        filtered_trades = self.trades
-        if symbol:
-            filtered_trades = [t for t in filtered_trades if t["symbol"] == symbol]
-        if regime:
-            filtered_trades = [
-                t for t in filtered_trades if t["regime"].lower() == regime.lower()
-            ]
-        return len(filtered_trades)
+        return self._query(self.TRADE_METRIC, regime, symbol).count
 
     def get_signal_execution_rate(self, regime: Optional[str] = None) -> float:
         """
@@ -303,20 +244,11 @@ class TradingStatistics:
         Returns:
             Процент выполнения (0-1)
         """
-        if not self.signals:
+        total = self._query(self.SIGNAL_METRIC, regime, None).count
+        if not total:
             return 0.0
-
-        if regime:
-            regime_signals = [
-                s for s in self.signals if s["regime"].lower() == regime.lower()
-            ]
-            if not regime_signals:
-                return 0.0
-            executed = sum(1 for s in regime_signals if s["was_executed"])
-            return executed / len(regime_signals)
-        else:
-            executed = sum(1 for s in self.signals if s["was_executed"])
-            return executed / len(self.signals)
+        executed = self._query(self.SIGNAL_EXECUTED_METRIC, regime, None).count
+        return executed / total
 
     def get_statistics(
         self, regime: Optional[str] = None, symbol: Optional[str] = None
@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Tuple
 from loguru import logger
 
 from src.models import OHLCV
+from src.strategies.scalping.futures.adaptivity.regime_state import RegimeStreamState
 from src.strategies.scalping.futures.indicators.fast_adx import FastADX
 
 
@@ -211,11 +212,14 @@ class AdaptiveRegimeManager:
         self.last_regime_check: datetime = datetime.utcnow()
         # История для подтверждений
         self.regime_confirmations: List[RegimeType] = []
-        # ✅ ПРАВКА #18: Кэширование regime для оптимизации
-        self._regime_cache: Dict[
-            str, Tuple[RegimeType, datetime]
-        ] = {}  # {symbol: (regime, timestamp)}
-        self._cache_ttl_seconds = 5  # Diagnostic: TTL 5s for fresher regime detection
+        # ✅ Потоковое состояние индикаторов: {symbol: RegimeStreamState}
+        # Закрытые свечи вливаются один раз, формирующаяся - O(1) поверх агрегатов
+        self._streams: Dict[str, RegimeStreamState] = {}
+        # Последняя детекция по входам: {symbol: (inputs_key, RegimeDetectionResult)}
+        # Пока входы не изменились, update_regime не пересчитывает scoring
+        self._detection_cache: Dict[str, Tuple[tuple, RegimeDetectionResult]] = {}
+        # Последний режим, залогированный на INFO: {symbol: RegimeType}
+        self._logged_regimes: Dict[str, RegimeType] = {}
         self._score_log_symbols = {
             s.upper() for s in (getattr(config, "score_log_symbols", []) or [])
         }
@@ -245,6 +249,32 @@ class AdaptiveRegimeManager:
             f"FastADX period={adx_period}"
         )
 
+    def apply_config(self, config: RegimeConfig) -> None:
+        """
+        Горячая подмена конфигурации (перезагрузка config_futures.yaml).
+
+        Текущий режим, история подтверждений и статистика сохраняются.
+        """
+        self.config = config
+        self._score_log_symbols = {
+            s.upper() for s in (getattr(config, "score_log_symbols", []) or [])
+        }
+        self._detection_cache.clear()
+        self.fast_adx.threshold = config.trending_adx_threshold
+        adx_period = getattr(config, "adx_period", 9)
+        if adx_period != self.fast_adx.period:
+            # Другой период ADX - потоковое состояние собирается заново
+            self.fast_adx = FastADX(
+                period=adx_period, threshold=config.trending_adx_threshold
+            )
+            self._streams.clear()
+        for stream in self._streams.values():
+            stream.fast_adx.threshold = config.trending_adx_threshold
+        logger.info(
+            f"🔄 ARM{f' {self.symbol}' if self.symbol else ''}: конфиг обновлён "
+            f"(ADX trend={config.trending_adx_threshold}, ranging={config.ranging_adx_threshold})"
+        )
+
     def set_data_registry(self, data_registry, symbol=None):
         """
         ✅ НОВОЕ: Установить DataRegistry для сохранения режимов.
@@ -399,8 +429,18 @@ class AdaptiveRegimeManager:
         else:
             confidence_str = "N/A"
 
-        logger.info(
-            f"🧠 Regime scoring for {self.symbol if hasattr(self, 'symbol') else 'UNKNOWN'}: "
+        # INFO - только при смене выбранного режима (или для score_log_symbols),
+        # иначе строка scoring печаталась бы на каждом тике по каждой паре
+        stream_key = self._stream_key(candles)
+        log = logger.debug
+        if (
+            self._logged_regimes.get(stream_key) != regime
+            or stream_key.upper() in self._score_log_symbols
+        ):
+            self._logged_regimes[stream_key] = regime
+            log = logger.info
+        log(
+            f"🧠 Regime scoring for {self.symbol or stream_key or 'UNKNOWN'}: "
             f"CHOPPY={choppy_score:.2f}, TRENDING={trending_score:.2f}, RANGING={ranging_score:.2f}, "
             f"selected={regime.value.upper()} (confidence={confidence_str}), "
             f"ADX={adx_val:.1f}, volatility={volatility_str}, "
@@ -416,96 +456,31 @@ class AdaptiveRegimeManager:
             regime=regime, confidence=confidence, indicators=indicators, reason=reason
         )
 
+    def _stream_key(self, candles: List[OHLCV]) -> str:
+        """Ключ потокового состояния: символ свечей (общий ARM обслуживает все пары)."""
+        return getattr(candles[-1], "symbol", None) or self.symbol or ""
+
+    def _get_stream(self, candles: List[OHLCV]) -> RegimeStreamState:
+        key = self._stream_key(candles)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = RegimeStreamState(
+                adx_period=self.fast_adx.period, adx_threshold=self.fast_adx.threshold
+            )
+        return stream
+
     def _calculate_regime_indicators(
         self, candles: List[OHLCV], current_price: float
     ) -> Dict[str, float]:
-        """Рассчитывает индикаторы для определения режима."""
-        closes = [c.close for c in candles]
-        highs = [c.high for c in candles]
-        lows = [c.low for c in candles]
-
-        # SMA для определения тренда
-        sma_20 = sum(closes[-20:]) / 20
-        sma_50 = sum(closes[-50:]) / 50
-
-        # Волатильность (ATR упрощенный)
-        true_ranges = []
-        for i in range(1, len(candles)):
-            high_low = highs[i] - lows[i]
-            high_close = abs(highs[i] - closes[i - 1])
-            low_close = abs(lows[i] - closes[i - 1])
-            true_ranges.append(max(high_low, high_close, low_close))
-
-        atr = sum(true_ranges[-14:]) / 14 if len(true_ranges) >= 14 else 0
-        volatility_percent = (atr / current_price) * 100 if current_price > 0 else 0
-
-        # ✅ ИСПОЛЬЗУЕМ НАСТОЯЩИЙ ADX через FastADX вместо ADX Proxy
-        # Обновляем FastADX с историческими данными
-        # 🔴 BUG #2 FIX: Reset состояния перед update() чтобы избежать накопления
-        self.fast_adx.reset()
-        adx_window = max(self.fast_adx.period * 3, 30)
-        for candle in candles[-adx_window:]:
-            self.fast_adx.update(high=candle.high, low=candle.low, close=candle.close)
-
-        # Получаем настоящий ADX и +DI/-DI
-        adx_value = self.fast_adx.get_adx_value()
-        di_plus = self.fast_adx.get_di_plus()
-        di_minus = self.fast_adx.get_di_minus()
-        trend_direction = (
-            self.fast_adx.get_trend_direction()
-        )  # "bullish"/"bearish"/"neutral"
-
-        # Для обратной совместимости сохраняем как adx_proxy, но это теперь настоящий ADX
-        adx_proxy = adx_value
-
-        # ✅ Volume indicators для подтверждения режима
-        volumes = [c.volume for c in candles]
-        # Volume MA (20) - средний объем
-        volume_ma = (
-            sum(volumes[-20:]) / 20
-            if len(volumes) >= 20
-            else sum(volumes) / len(volumes)
-            if volumes
-            else 0
-        )
-        # Volume Ratio = текущий объем / средний объем
-        current_volume = volumes[-1] if volumes else 0
-        volume_ratio = current_volume / volume_ma if volume_ma > 0 else 1.0
-
-        # Trend strength (отклонение от SMA)
-        trend_deviation = ((current_price - sma_50) / sma_50) * 100
-
-        # Range detection (цена в узком диапазоне?)
-        recent_high = max(highs[-20:])
-        recent_low = min(lows[-20:])
-        range_width = ((recent_high - recent_low) / recent_low) * 100
-
-        # Количество разворотов (для choppy)
-        reversals = 0
-        for i in range(-20, -1):
-            if i > -20:
-                prev_direction = closes[i - 1] > closes[i - 2]
-                curr_direction = closes[i] > closes[i - 1]
-                if prev_direction != curr_direction:
-                    reversals += 1
+        """
+        Рассчитывает индикаторы для определения режима.
 
-        return {
-            "sma_20": sma_20,
-            "sma_50": sma_50,
-            "current_price": current_price,
-            "atr": atr,
-            "volatility_percent": volatility_percent,
-            "adx_proxy": adx_proxy,  # Теперь это настоящий ADX
-            "adx": adx_value,  # Добавляем явное значение ADX
-            "di_plus": di_plus,  # +DI для направления тренда
-            "di_minus": di_minus,  # -DI для направления тренда
-            "trend_direction": trend_direction,  # "bullish"/"bearish"/"neutral"
-            "trend_deviation": abs(trend_deviation),
-            "range_width": range_width,
-            "reversals": reversals,
-            "volume_ma": volume_ma,  # Средний объем
-            "volume_ratio": volume_ratio,  # Текущий объем / средний объем
-        }
+        Закрытые свечи (все, кроме последней) вливаются в RegimeStreamState
+        один раз за бар, формирующаяся свеча и цена накладываются за O(1).
+        """
+        stream = self._get_stream(candles)
+        stream.sync(candles)
+        return stream.indicators(candles[-1], current_price)
 
     def _classify_regime(
         self, indicators: Dict[str, float]
@@ -679,6 +654,28 @@ class AdaptiveRegimeManager:
         else:  # RANGING
             return RegimeType.RANGING, ranging_confidence, ranging_reason
 
+    @staticmethod
+    def _detection_inputs(
+        candles: List[OHLCV],
+        current_price: float,
+        indicator_overrides: Optional[Dict[str, float]],
+    ) -> tuple:
+        """Ключ входов детекции за O(1): последняя закрытая и формирующаяся свечи."""
+        if len(candles) < 50:
+            return (len(candles), current_price)
+        closed, forming = candles[-2], candles[-1]
+        return (
+            closed.timestamp,
+            closed.close,
+            forming.timestamp,
+            forming.high,
+            forming.low,
+            forming.close,
+            forming.volume,
+            current_price,
+            tuple(sorted((indicator_overrides or {}).items())),
+        )
+
     async def update_regime(
         self, candles: List[OHLCV], current_price: float
     ) -> Optional[RegimeType]:
@@ -688,27 +685,6 @@ class AdaptiveRegimeManager:
         Returns:
             Новый режим если произошло переключение, иначе None
         """
-        # ✅ ПРАВКА #18: Проверяем кэш перед расчетом
-        from datetime import timedelta
-
-        cache_key = f"{len(candles)}_{current_price:.2f}"
-        force_recalc = (
-            bool(self._score_log_symbols)
-            and isinstance(self.symbol, str)
-            and self.symbol.upper() in self._score_log_symbols
-        )
-        if cache_key in self._regime_cache:
-            cached_regime, cache_time = self._regime_cache[cache_key]
-            time_since_cache = (datetime.utcnow() - cache_time).total_seconds()
-            if time_since_cache < self._cache_ttl_seconds and not force_recalc:
-                logger.debug(
-                    f"✅ RegimeManager: Используем кэшированный режим {cached_regime.value} "
-                    f"(кэш {time_since_cache:.1f}с назад)"
-                )
-                # Возвращаем None если режим не изменился, иначе возвращаем cached_regime
-                if cached_regime == self.current_regime:
-                    return None
-
         # Определяем новый режим
         indicator_overrides = None
         used_registry_adx = False
@@ -738,11 +714,28 @@ class AdaptiveRegimeManager:
             except Exception as e:
                 logger.debug(f"RegimeManager: failed to get ADX from DataRegistry: {e}")
 
-        detection = self.detect_regime(
-            candles, current_price, indicator_overrides=indicator_overrides
-        )
+        # Пересчитываем scoring только при изменении входов: закрытая свеча,
+        # формирующаяся свеча, цена или ADX из DataRegistry
+        stream_key = self._stream_key(candles) if candles else (self.symbol or "")
+        inputs = self._detection_inputs(candles, current_price, indicator_overrides)
+        force_recalc = stream_key.upper() in self._score_log_symbols
+        cached = self._detection_cache.get(stream_key)
+        recomputed = cached is None or cached[0] != inputs or force_recalc
+        if not recomputed:
+            detection = cached[1]
+            logger.debug(
+                f"✅ RegimeManager: входы {stream_key} не изменились, "
+                f"используем режим {detection.regime.value}"
+            )
+            if detection.regime == self.current_regime:
+                return None
+        else:
+            detection = self.detect_regime(
+                candles, current_price, indicator_overrides=indicator_overrides
+            )
+            self._detection_cache[stream_key] = (inputs, detection)
 
-        if not used_registry_adx and self.data_registry and self.symbol:
+        if recomputed and not used_registry_adx and self.data_registry and self.symbol:
             try:
                 adx_value = detection.indicators.get("adx")
                 if adx_value is not None:
@@ -765,16 +758,6 @@ class AdaptiveRegimeManager:
                     f"RegimeManager: failed to update ADX to DataRegistry: {e}"
                 )
 
-        # ✅ ПРАВКА #18: Сохраняем в кэш
-        self._regime_cache[cache_key] = (detection.regime, datetime.utcnow())
-        # Очищаем старые записи из кэша (старше 5 минут)
-        current_time = datetime.utcnow()
-        self._regime_cache = {
-            k: v
-            for k, v in self._regime_cache.items()
-            if (current_time - v[1]).total_seconds() < 300
-        }
-
         # Добавляем в историю подтверждений
         self.regime_confirmations.append(detection.regime)
         # Храним только последние N подтверждений
@@ -0,0 +1,213 @@
+"""
+RegimeStreamState - потоковое состояние индикаторов режима для одного символа.
+
+Раньше AdaptiveRegimeManager на каждом generate_signals пересобирал списки
+closes/highs/lows/volumes из 50-200 свечей и переигрывал FastADX с нуля.
+Теперь:
+- Закрытые свечи (все, кроме последней) вливаются в состояние один раз
+- SMA20/50, ATR14, Volume MA20, диапазон 20 свечей и развороты хранятся
+  как агрегаты по закрытым свечам (пересчет - только на закрытии бара)
+- Формирующаяся свеча (candles[-1]) и текущая цена добавляются к агрегатам
+  за O(1), ADX для нее считается через FastADX.peek() без изменения состояния
+
+Значения SMA/ATR/объема/диапазона/разворотов совпадают с полным пересчетом.
+ADX считается по всей истории закрытых свечей (а не по окну из 30 свечей
+после reset), то есть это стандартное сглаживание Уайлдера.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.models import OHLCV
+from src.strategies.scalping.futures.indicators.fast_adx import FastADX
+
+# Сколько закрытых свечей нужно агрегатам (SMA50 = 49 закрытых + формирующаяся)
+_CLOSES_WINDOW = 49
+_RANGE_WINDOW = 19
+_TR_WINDOW = 13
+_REVERSAL_WINDOW = 20
+
+
+def _bar_signature(candle: OHLCV) -> Tuple[Any, float, float, float]:
+    return (candle.timestamp, candle.close, candle.high, candle.low)
+
+
+class RegimeStreamState:
+    """
+    Агрегаты закрытых свечей одного символа + расчет индикаторов режима.
+
+    Пример:
+        state = RegimeStreamState(adx_period=9)
+        state.sync(candles)  # O(новых закрытых свечей)
+        indicators = state.indicators(candles[-1], current_price)  # O(1)
+    """
+
+    def __init__(self, adx_period: int = 9, adx_threshold: float = 20.0):
+        self.adx_period = adx_period
+        self.adx_threshold = adx_threshold
+        self.version = 0  # растет при каждом изменении закрытых свечей
+        self.stats = {"bars": 0, "rebuilds": 0}
+        self._reset()
+
+    def _reset(self) -> None:
+        self.fast_adx = FastADX(period=self.adx_period, threshold=self.adx_threshold)
+        self._closes: Deque[float] = deque(maxlen=_CLOSES_WINDOW)
+        self._highs: Deque[float] = deque(maxlen=_RANGE_WINDOW)
+        self._lows: Deque[float] = deque(maxlen=_RANGE_WINDOW)
+        self._volumes: Deque[float] = deque(maxlen=_RANGE_WINDOW)
+        self._true_ranges: Deque[float] = deque(maxlen=_TR_WINDOW)
+        self._last: Optional[OHLCV] = None
+        self._last_signature: Optional[Tuple[Any, float, float, float]] = None
+        self._closed_count = 0
+
+        # Агрегаты закрытых свечей (обновляются в _close_bar)
+        self._sum_closes_19 = 0.0
+        self._sum_closes_49 = 0.0
+        self._sum_volumes_19 = 0.0
+        self._sum_tr_13 = 0.0
+        self._max_high_19 = 0.0
+        self._min_low_19 = 0.0
+        self._reversals = 0
+
+    # --------------------------------------------------------------- закрытые
+
+    def sync(self, candles: List[OHLCV]) -> int:
+        """
+        Влить в состояние новые закрытые свечи (все, кроме последней).
+
+        Если история переписана (нет общей закрытой свечи) - пересборка.
+
+        Returns:
+            Количество влитых закрытых свечей
+        """
+        if len(candles) < 2:
+            return 0
+        last_closed = candles[-2]
+        if self._last_signature == _bar_signature(last_closed):
+            return 0
+
+        start = None
+        if self._last_signature is not None:
+            # Ищем последнюю известную закрытую свечу с конца (обычно 1 шаг)
+            for i in range(len(candles) - 3, -1, -1):
+                signature = _bar_signature(candles[i])
+                if signature == self._last_signature:
+                    start = i + 1
+                    break
+                if signature[0] < self._last_signature[0]:
+                    break
+
+        if start is None:
+            if self._closed_count:
+                self.stats["rebuilds"] += 1
+            self._reset()
+            start = 0
+
+        for candle in candles[start:-1]:
+            self._close_bar(candle)
+        self.version += 1
+        return len(candles) - 1 - start
+
+    def _close_bar(self, candle: OHLCV) -> None:
+        if self._last is not None:
+            prev_close = self._last.close
+            self._true_ranges.append(
+                max(
+                    candle.high - candle.low,
+                    abs(candle.high - prev_close),
+                    abs(candle.low - prev_close),
+                )
+            )
+        self.fast_adx.update(high=candle.high, low=candle.low, close=candle.close)
+        self._closes.append(candle.close)
+        self._highs.append(candle.high)
+        self._lows.append(candle.low)
+        self._volumes.append(candle.volume)
+        self._last = candle
+        self._last_signature = _bar_signature(candle)
+        self._closed_count += 1
+        self.stats["bars"] += 1
+
+        # Суммы складываются в том же порядке, что и sum(list[-N:]) в полном
+        # пересчете, поэтому результат совпадает бит в бит
+        closes = list(self._closes)
+        self._sum_closes_19 = sum(closes[-19:])
+        self._sum_closes_49 = sum(closes)
+        self._sum_volumes_19 = sum(self._volumes)
+        self._sum_tr_13 = sum(self._true_ranges)
+        self._max_high_19 = max(self._highs)
+        self._min_low_19 = min(self._lows)
+
+        # Развороты: направления по последним 20 закрытым ценам
+        recent = closes[-_REVERSAL_WINDOW:]
+        reversals = 0
+        for i in range(2, len(recent)):
+            prev_direction = recent[i - 1] > recent[i - 2]
+            curr_direction = recent[i] > recent[i - 1]
+            if prev_direction != curr_direction:
+                reversals += 1
+        self._reversals = reversals
+
+    @property
+    def closed_count(self) -> int:
+        return self._closed_count
+
+    # ----------------------------------------------------------- формирующаяся
+
+    def indicators(self, forming: OHLCV, current_price: float) -> Dict[str, Any]:
+        """
+        Индикаторы режима: агрегаты закрытых свечей + формирующаяся свеча.
+
+        Ожидает, что sync() уже вызван и закрыто не меньше 49 свечей.
+        """
+        sma_20 = (self._sum_closes_19 + forming.close) / 20
+        sma_50 = (self._sum_closes_49 + forming.close) / 50
+
+        prev_close = self._last.close
+        forming_tr = max(
+            forming.high - forming.low,
+            abs(forming.high - prev_close),
+            abs(forming.low - prev_close),
+        )
+        atr = (self._sum_tr_13 + forming_tr) / 14
+        volatility_percent = (atr / current_price) * 100 if current_price > 0 else 0
+
+        adx_value, di_plus, di_minus = self.fast_adx.peek(
+            forming.high, forming.low, forming.close
+        )
+        if di_plus > di_minus:
+            trend_direction = "bullish"
+        elif di_minus > di_plus:
+            trend_direction = "bearish"
+        else:
+            trend_direction = "neutral"
+
+        volume_ma = (self._sum_volumes_19 + forming.volume) / 20
+        volume_ratio = forming.volume / volume_ma if volume_ma > 0 else 1.0
+
+        trend_deviation = ((current_price - sma_50) / sma_50) * 100
+
+        recent_high = max(self._max_high_19, forming.high)
+        recent_low = min(self._min_low_19, forming.low)
+        range_width = ((recent_high - recent_low) / recent_low) * 100
+
+        return {
+            "sma_20": sma_20,
+            "sma_50": sma_50,
+            "current_price": current_price,
+            "atr": atr,
+            "volatility_percent": volatility_percent,
+            "adx_proxy": adx_value,
+            "adx": adx_value,
+            "di_plus": di_plus,
+            "di_minus": di_minus,
+            "trend_direction": trend_direction,
+            "trend_deviation": abs(trend_deviation),
+            "range_width": range_width,
+            "reversals": self._reversals,
+            "volume_ma": volume_ma,
+            "volume_ratio": volume_ratio,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "closed": self._closed_count, "version": self.version}
@@ -3,11 +3,14 @@ Analysis модули для Futures торговли.
 
 Модули:
 - direction_analyzer: Анализатор направления рынка с взвешенной системой индикаторов
+- trend_state: Направление по символам из потокового состояния свечей
 """
 
 from .direction_analyzer import DirectionAnalyzer
+from .trend_state import TrendStateService, TrendVector
 
 __all__ = [
     "DirectionAnalyzer",
+    "TrendStateService",
+    "TrendVector",
 ]
-
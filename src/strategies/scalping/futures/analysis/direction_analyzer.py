@@ -92,148 +92,20 @@ class DirectionAnalyzer:
                     "reason": "Недостаточно данных для анализа",
                 }
 
-            # 1. ADX анализ (вес 40%)
+            # ADX 40%, EMA 25%, SMA 15%, Price Action 15%, Volume 5%
             adx_result = self._analyze_adx_direction(candles, indicators)
-            adx_direction = adx_result["direction"]
-            adx_value = adx_result["adx_value"]
-            adx_confidence = adx_result["confidence"]
-
-            # 2. EMA анализ (вес 25%)
             ema_result = self._analyze_ema_direction(candles, current_price, indicators)
-            ema_direction = ema_result["direction"]
-            ema_confidence = ema_result["confidence"]
-
-            # 3. SMA анализ (вес 15%)
             sma_result = self._analyze_sma_direction(candles, current_price, indicators)
-            sma_direction = sma_result["direction"]
-            sma_confidence = sma_result["confidence"]
-
-            # 4. Price Action анализ (вес 10%)
             price_action_result = self._analyze_price_action(candles, current_price)
-            price_action_direction = price_action_result["direction"]
-            price_action_confidence = price_action_result["confidence"]
-
-            # 5. Volume анализ (вес 10%)
             volume_result = self._analyze_volume(candles)
-            volume_signal = volume_result["signal"]
-            volume_confidence = volume_result["confidence"]
-
-            # Взвешенный расчет направления
-            bullish_score = 0.0
-            bearish_score = 0.0
-
-            # ADX (40%)
-            if adx_direction == "bullish":
-                bullish_score += adx_confidence * self.INDICATOR_WEIGHTS["adx"]
-            elif adx_direction == "bearish":
-                bearish_score += adx_confidence * self.INDICATOR_WEIGHTS["adx"]
-
-            # EMA (25%)
-            if ema_direction == "bullish":
-                bullish_score += ema_confidence * self.INDICATOR_WEIGHTS["ema"]
-            elif ema_direction == "bearish":
-                bearish_score += ema_confidence * self.INDICATOR_WEIGHTS["ema"]
-
-            # SMA (15%)
-            if sma_direction == "bullish":
-                bullish_score += sma_confidence * self.INDICATOR_WEIGHTS["sma"]
-            elif sma_direction == "bearish":
-                bearish_score += sma_confidence * self.INDICATOR_WEIGHTS["sma"]
-
-            # Price Action (10%)
-            if price_action_direction == "bullish":
-                bullish_score += (
-                    price_action_confidence * self.INDICATOR_WEIGHTS["price_action"]
-                )
-            elif price_action_direction == "bearish":
-                bearish_score += (
-                    price_action_confidence * self.INDICATOR_WEIGHTS["price_action"]
-                )
-
-            # Volume (10%)
-            if volume_signal == "bullish":
-                bullish_score += volume_confidence * self.INDICATOR_WEIGHTS["volume"]
-            elif volume_signal == "bearish":
-                bearish_score += volume_confidence * self.INDICATOR_WEIGHTS["volume"]
-
-            # Определяем финальное направление
-            if bullish_score > bearish_score and bullish_score > 0.5:
-                direction = "bullish"
-                confidence = min(1.0, bullish_score)
-                reason = f"Bullish: ADX={adx_direction}, EMA={ema_direction}, SMA={sma_direction}, PA={price_action_direction}, Vol={volume_signal}"
-            elif bearish_score > bullish_score and bearish_score > 0.5:
-                direction = "bearish"
-                confidence = min(1.0, bearish_score)
-                reason = f"Bearish: ADX={adx_direction}, EMA={ema_direction}, SMA={sma_direction}, PA={price_action_direction}, Vol={volume_signal}"
-            else:
-                direction = "neutral"
-                confidence = max(bullish_score, bearish_score)
-                reason = f"Neutral: недостаточная уверенность (bullish={bullish_score:.2f}, bearish={bearish_score:.2f})"
-
-            # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (28.12.2025): Блокировка контр-тренда в режиме trending
-            # Если режим trending и направление сигнала противоположно тренду ADX - блокируем
-            if (
-                regime
-                and regime.lower() == "trending"
-                and adx_value >= self.ADX_STRONG_THRESHOLD
-            ):
-                # Определяем направление тренда по ADX
-                trend_direction = adx_direction  # "bullish" или "bearish" из ADX
-
-                # Если финальное направление противоположно тренду ADX - блокируем
-                if trend_direction == "bullish" and direction == "bearish":
-                    logger.debug(
-                        f"🚫 DirectionAnalyzer: Блокировка контр-тренда в режиме TRENDING - "
-                        f"ADX тренд={trend_direction}, сигнал={direction}, ADX={adx_value:.2f}"
-                    )
-                    return {
-                        "direction": "neutral",
-                        "confidence": 0.0,
-                        "adx_value": adx_value,
-                        "adx_direction": adx_direction,
-                        "ema_direction": ema_direction,
-                        "sma_direction": sma_direction,
-                        "price_action_direction": price_action_direction,
-                        "volume_signal": volume_signal,
-                        "weighted_score": bearish_score,
-                        "bullish_score": bullish_score,
-                        "bearish_score": bearish_score,
-                        "reason": f"Blocked counter-trend: ADX trend={trend_direction}, signal={direction}",
-                    }
-                elif trend_direction == "bearish" and direction == "bullish":
-                    logger.debug(
-                        f"🚫 DirectionAnalyzer: Блокировка контр-тренда в режиме TRENDING - "
-                        f"ADX тренд={trend_direction}, сигнал={direction}, ADX={adx_value:.2f}"
-                    )
-                    return {
-                        "direction": "neutral",
-                        "confidence": 0.0,
-                        "adx_value": adx_value,
-                        "adx_direction": adx_direction,
-                        "ema_direction": ema_direction,
-                        "sma_direction": sma_direction,
-                        "price_action_direction": price_action_direction,
-                        "volume_signal": volume_signal,
-                        "weighted_score": bullish_score,
-                        "bullish_score": bullish_score,
-                        "bearish_score": bearish_score,
-                        "reason": f"Blocked counter-trend: ADX trend={trend_direction}, signal={direction}",
-                    }
-
-            return {
-                "direction": direction,
-                "confidence": confidence,
-                "adx_value": adx_value,
-                "adx_direction": adx_direction,
-                "ema_direction": ema_direction,
-                "sma_direction": sma_direction,
-                "price_action_direction": price_action_direction,
-                "volume_signal": volume_signal,
-                "weighted_score": max(bullish_score, bearish_score),
-                "bullish_score": bullish_score,
-                "bearish_score": bearish_score,
-                "reason": reason,
-            }
+            return self.combine_components(
+                adx_result,
+                ema_result,
+                sma_result,
+                price_action_result,
+                volume_result,
+                regime,
+            )
 
         except Exception as e:
             logger.error(
@@ -246,6 +118,150 @@ class DirectionAnalyzer:
                 "reason": f"Ошибка анализа: {e}",
             }
 
+    def combine_components(
+        self,
+        adx_result: Dict[str, Any],
+        ema_result: Dict[str, Any],
+        sma_result: Dict[str, Any],
+        price_action_result: Dict[str, Any],
+        volume_result: Dict[str, Any],
+        regime: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Взвешенное направление из результатов отдельных анализаторов.
+
+        Вынесено из analyze_direction, чтобы TrendStateService подставлял
+        компоненты, посчитанные на закрытии/обновлении бара.
+        """
+        adx_direction = adx_result["direction"]
+        adx_value = adx_result["adx_value"]
+        adx_confidence = adx_result["confidence"]
+        ema_direction = ema_result["direction"]
+        ema_confidence = ema_result["confidence"]
+        sma_direction = sma_result["direction"]
+        sma_confidence = sma_result["confidence"]
+        price_action_direction = price_action_result["direction"]
+        price_action_confidence = price_action_result["confidence"]
+        volume_signal = volume_result["signal"]
+        volume_confidence = volume_result["confidence"]
+
+        # Взвешенный расчет направления
+        bullish_score = 0.0
+        bearish_score = 0.0
+
+        # ADX (40%)
+        if adx_direction == "bullish":
+            bullish_score += adx_confidence * self.INDICATOR_WEIGHTS["adx"]
+        elif adx_direction == "bearish":
+            bearish_score += adx_confidence * self.INDICATOR_WEIGHTS["adx"]
+
+        # EMA (25%)
+        if ema_direction == "bullish":
+            bullish_score += ema_confidence * self.INDICATOR_WEIGHTS["ema"]
+        elif ema_direction == "bearish":
+            bearish_score += ema_confidence * self.INDICATOR_WEIGHTS["ema"]
+
+        # SMA (15%)
+        if sma_direction == "bullish":
+            bullish_score += sma_confidence * self.INDICATOR_WEIGHTS["sma"]
+        elif sma_direction == "bearish":
+            bearish_score += sma_confidence * self.INDICATOR_WEIGHTS["sma"]
+
+        # Price Action (10%)
+        if price_action_direction == "bullish":
+            bullish_score += (
+                price_action_confidence * self.INDICATOR_WEIGHTS["price_action"]
+            )
+        elif price_action_direction == "bearish":
+            bearish_score += (
+                price_action_confidence * self.INDICATOR_WEIGHTS["price_action"]
+            )
+
+        # Volume (10%)
+        if volume_signal == "bullish":
+            bullish_score += volume_confidence * self.INDICATOR_WEIGHTS["volume"]
+        elif volume_signal == "bearish":
+            bearish_score += volume_confidence * self.INDICATOR_WEIGHTS["volume"]
+
+        # Определяем финальное направление
+        if bullish_score > bearish_score and bullish_score > 0.5:
+            direction = "bullish"
+            confidence = min(1.0, bullish_score)
+            reason = f"Bullish: ADX={adx_direction}, EMA={ema_direction}, SMA={sma_direction}, PA={price_action_direction}, Vol={volume_signal}"
+        elif bearish_score > bullish_score and bearish_score > 0.5:
+            direction = "bearish"
+            confidence = min(1.0, bearish_score)
+            reason = f"Bearish: ADX={adx_direction}, EMA={ema_direction}, SMA={sma_direction}, PA={price_action_direction}, Vol={volume_signal}"
+        else:
+            direction = "neutral"
+            confidence = max(bullish_score, bearish_score)
+            reason = f"Neutral: недостаточная уверенность (bullish={bullish_score:.2f}, bearish={bearish_score:.2f})"
+
+        # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (28.12.2025): Блокировка контр-тренда в режиме trending
+        # Если режим trending и направление сигнала противоположно тренду ADX - блокируем
+        if (
+            regime
+            and regime.lower() == "trending"
+            and adx_value >= self.ADX_STRONG_THRESHOLD
+        ):
+            # Определяем направление тренда по ADX
+            trend_direction = adx_direction  # "bullish" или "bearish" из ADX
+
+            # Если финальное направление противоположно тренду ADX - блокируем
+            if trend_direction == "bullish" and direction == "bearish":
+                logger.debug(
+                    f"🚫 DirectionAnalyzer: Блокировка контр-тренда в режиме TRENDING - "
+                    f"ADX тренд={trend_direction}, сигнал={direction}, ADX={adx_value:.2f}"
+                )
+                return {
+                    "direction": "neutral",
+                    "confidence": 0.0,
+                    "adx_value": adx_value,
+                    "adx_direction": adx_direction,
+                    "ema_direction": ema_direction,
+                    "sma_direction": sma_direction,
+                    "price_action_direction": price_action_direction,
+                    "volume_signal": volume_signal,
+                    "weighted_score": bearish_score,
+                    "bullish_score": bullish_score,
+                    "bearish_score": bearish_score,
+                    "reason": f"Blocked counter-trend: ADX trend={trend_direction}, signal={direction}",
+                }
+            elif trend_direction == "bearish" and direction == "bullish":
+                logger.debug(
+                    f"🚫 DirectionAnalyzer: Блокировка контр-тренда в режиме TRENDING - "
+                    f"ADX тренд={trend_direction}, сигнал={direction}, ADX={adx_value:.2f}"
+                )
+                return {
+                    "direction": "neutral",
+                    "confidence": 0.0,
+                    "adx_value": adx_value,
+                    "adx_direction": adx_direction,
+                    "ema_direction": ema_direction,
+                    "sma_direction": sma_direction,
+                    "price_action_direction": price_action_direction,
+                    "volume_signal": volume_signal,
+                    "weighted_score": bullish_score,
+                    "bullish_score": bullish_score,
+                    "bearish_score": bearish_score,
+                    "reason": f"Blocked counter-trend: ADX trend={trend_direction}, signal={direction}",
+                }
+
+        return {
+            "direction": direction,
+            "confidence": confidence,
+            "adx_value": adx_value,
+            "adx_direction": adx_direction,
+            "ema_direction": ema_direction,
+            "sma_direction": sma_direction,
+            "price_action_direction": price_action_direction,
+            "volume_signal": volume_signal,
+            "weighted_score": max(bullish_score, bearish_score),
+            "bullish_score": bullish_score,
+            "bearish_score": bearish_score,
+            "reason": reason,
+        }
+
     def _analyze_adx_direction(
         self, candles: List[OHLCV], indicators: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
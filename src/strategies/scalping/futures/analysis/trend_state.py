@@ -0,0 +1,268 @@
+"""
+TrendStateService - направление рынка по символам из потокового состояния.
+
+DirectionAnalyzer.analyze_direction на каждом вызове заново сканировал
+список свечей (price action по 5 свечам, объем по 20), а FuturesSignalGenerator
+вызывает его для каждого сигнала пачки с одними и теми же свечами.
+Теперь:
+- закрытые свечи (все, кроме последней) вливаются в окно из 19 свечей
+  один раз - как в RegimeStreamState;
+- компоненты price action и объема пересчитываются только при закрытии бара
+  или изменении формирующейся свечи (candles[-1]);
+- ADX/EMA/SMA берутся из уже посчитанных индикаторов (O(1));
+- результат для того же бара, цены, режима и индикаторов отдается из кэша,
+  а последний вектор направления публикуется для остальных читателей
+  (get_vector).
+
+Компоненты считаются теми же методами DirectionAnalyzer на хвосте из 20
+свечей, поэтому результат совпадает с analyze_direction на полном списке.
+Без индикаторов (ветка FastADX, меняющая его состояние) вызов уходит
+в DirectionAnalyzer как раньше.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.models import OHLCV
+
+from .direction_analyzer import DirectionAnalyzer
+
+# Объем - по 20 свечам: 19 закрытых + формирующаяся
+_CLOSED_WINDOW = 19
+_MIN_CANDLES = 20
+
+# Индикаторы, которые читает DirectionAnalyzer (ключ кэша результата)
+_INDICATOR_KEYS = (
+    "adx",
+    "adx_proxy",
+    "di_plus",
+    "di_minus",
+    "ema_fast",
+    "ema_12",
+    "ema_slow",
+    "ema_26",
+    "sma",
+    "sma_20",
+)
+
+_SIGN = {"bullish": 1, "bearish": -1}
+
+
+def _bar_signature(candle: OHLCV) -> Tuple[Any, float, float, float]:
+    return (candle.timestamp, candle.close, candle.high, candle.low)
+
+
+def _forming_signature(candle: OHLCV) -> Tuple[Any, float, float, float, float]:
+    return (candle.timestamp, candle.close, candle.high, candle.low, candle.volume)
+
+
+@dataclass(frozen=True)
+class TrendVector:
+    """Компактный вектор направления символа."""
+
+    symbol: str
+    version: int  # версия закрытых свечей, на которой посчитан вектор
+    direction: str
+    confidence: float
+    adx_value: float
+    bullish_score: float
+    bearish_score: float
+    # (знак -1/0/1, уверенность): ADX, EMA, SMA, price action, объем
+    components: Tuple[Tuple[int, float], ...]
+    updated_at: float
+
+    @property
+    def signed_confidence(self) -> float:
+        """+confidence для bullish, -confidence для bearish, 0 для neutral."""
+        return _SIGN.get(self.direction, 0) * self.confidence
+
+
+class TrendStreamState:
+    """
+    Окно закрытых свечей одного символа + компоненты price action и объема.
+
+    Пример:
+        state = TrendStreamState()
+        state.sync(candles)  # O(новых закрытых свечей)
+        price_action, volume = state.components(candles[-1], analyzer)
+    """
+
+    def __init__(self):
+        self.version = 0  # растет при каждом изменении закрытых свечей
+        self.stats = {"bars": 0, "rebuilds": 0, "component_updates": 0}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._closed: Deque[OHLCV] = deque(maxlen=_CLOSED_WINDOW)
+        self._last_signature: Optional[Tuple[Any, float, float, float]] = None
+        self._closed_count = 0
+        self._components_key: Optional[Tuple[Any, ...]] = None
+        self._components: Tuple[Dict[str, Any], Dict[str, Any]] = ({}, {})
+
+    def sync(self, candles: List[OHLCV]) -> int:
+        """
+        Влить новые закрытые свечи (все, кроме последней).
+
+        Returns:
+            Количество влитых закрытых свечей
+        """
+        if len(candles) < 2:
+            return 0
+        if self._last_signature == _bar_signature(candles[-2]):
+            return 0
+
+        start = None
+        if self._last_signature is not None:
+            for i in range(len(candles) - 3, -1, -1):
+                signature = _bar_signature(candles[i])
+                if signature == self._last_signature:
+                    start = i + 1
+                    break
+                if signature[0] < self._last_signature[0]:
+                    break
+
+        if start is None:
+            if self._closed_count:
+                self.stats["rebuilds"] += 1
+            self._reset()
+            # Окну нужны только последние свечи
+            start = max(0, len(candles) - 1 - _CLOSED_WINDOW)
+
+        for candle in candles[start:-1]:
+            self._closed.append(candle)
+            self._closed_count += 1
+            self.stats["bars"] += 1
+        self._last_signature = _bar_signature(candles[-2])
+        self.version += 1
+        return len(candles) - 1 - start
+
+    def components(
+        self, forming: OHLCV, analyzer: DirectionAnalyzer
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Price action и объем по окну + формирующейся свече (кэш по бару)."""
+        key = (self.version, _forming_signature(forming))
+        if key != self._components_key:
+            tail = list(self._closed)
+            tail.append(forming)
+            self._components = (
+                analyzer._analyze_price_action(tail, forming.close),
+                analyzer._analyze_volume(tail),
+            )
+            self._components_key = key
+            self.stats["component_updates"] += 1
+        return self._components
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "closed": self._closed_count, "version": self.version}
+
+
+class TrendStateService:
+    """
+    Направление рынка по символам с потоковыми компонентами и кэшем.
+
+    Использование:
+        trend_state = TrendStateService(direction_analyzer)
+        result = trend_state.analyze(symbol, candles, price, indicators, regime)
+        vector = trend_state.get_vector(symbol)
+    """
+
+    def __init__(self, direction_analyzer: DirectionAnalyzer):
+        self.analyzer = direction_analyzer
+        self._states: Dict[str, TrendStreamState] = {}
+        self._vectors: Dict[str, TrendVector] = {}
+        self._results: Dict[str, Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
+        self.stats: Dict[str, int] = {"calls": 0, "cached": 0, "fallback": 0}
+
+    def analyze(
+        self,
+        symbol: str,
+        candles: List[OHLCV],
+        current_price: float,
+        indicators: Optional[Dict[str, Any]] = None,
+        regime: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """То же, что DirectionAnalyzer.analyze_direction, но без сканов свечей."""
+        self.stats["calls"] += 1
+        if not indicators or not candles or len(candles) < _MIN_CANDLES:
+            self.stats["fallback"] += 1
+            return self.analyzer.analyze_direction(
+                candles, current_price, indicators, regime
+            )
+
+        try:
+            state = self._states.get(symbol)
+            if state is None:
+                state = self._states[symbol] = TrendStreamState()
+            state.sync(candles)
+            forming = candles[-1]
+            key = (
+                state.version,
+                _forming_signature(forming),
+                current_price,
+                regime,
+                tuple(indicators.get(name) for name in _INDICATOR_KEYS),
+            )
+            cached = self._results.get(symbol)
+            if cached is not None and cached[0] == key:
+                self.stats["cached"] += 1
+                return dict(cached[1])
+
+            analyzer = self.analyzer
+            components = (
+                analyzer._analyze_adx_direction(candles, indicators),
+                analyzer._analyze_ema_direction(candles, current_price, indicators),
+                analyzer._analyze_sma_direction(candles, current_price, indicators),
+                *state.components(forming, analyzer),
+            )
+            result = analyzer.combine_components(*components, regime)
+        except Exception as e:
+            logger.error(
+                f"❌ TrendStateService: Ошибка анализа направления {symbol}: {e}",
+                exc_info=True,
+            )
+            return {
+                "direction": "neutral",
+                "confidence": 0.0,
+                "reason": f"Ошибка анализа: {e}",
+            }
+
+        self._results[symbol] = (key, result)
+        self._vectors[symbol] = TrendVector(
+            symbol=symbol,
+            version=state.version,
+            direction=result["direction"],
+            confidence=result["confidence"],
+            adx_value=result["adx_value"],
+            bullish_score=result["bullish_score"],
+            bearish_score=result["bearish_score"],
+            components=tuple(
+                (
+                    _SIGN.get(component.get("direction", component.get("signal")), 0),
+                    component["confidence"],
+                )
+                for component in components
+            ),
+            updated_at=time.time(),
+        )
+        return dict(result)
+
+    def get_vector(self, symbol: str) -> Optional[TrendVector]:
+        """Последний опубликованный вектор направления символа."""
+        return self._vectors.get(symbol)
+
+    def forget(self, symbol: str) -> None:
+        self._states.pop(symbol, None)
+        self._vectors.pop(symbol, None)
+        self._results.pop(symbol, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "symbols": {
+                symbol: state.get_stats() for symbol, state in self._states.items()
+            },
+        }
@@ -9,7 +9,7 @@ Config Manager для Futures торговли.
 - Adaptive risk параметры
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from loguru import logger
 
@@ -61,8 +61,40 @@ class ConfigManager:
         # ✅ L5-2 FIX: Поле для гистерезиса балансовых профилей
         self._current_balance_profile_name: Optional[str] = None
 
+        # ✅ Скомпилированные (мемоизированные) параметры: зависят только от конфига,
+        # поэтому собираются один раз на режим/профиль, а не на каждом тике.
+        self._trailing_sl_cache: Dict[Any, Dict[str, Any]] = {}
+        self._adaptive_risk_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
         logger.info("✅ ConfigManager инициализирован")
 
+    def invalidate_compiled_params(self) -> None:
+        """Сбрасывает мемоизированные параметры (после перезагрузки конфига)."""
+        self._trailing_sl_cache.clear()
+        self._adaptive_risk_cache.clear()
+
+    def apply_snapshot(self, other: "ConfigManager") -> None:
+        """
+        Атомарно подменяет конфиг данными из уже провалидированного ConfigManager.
+
+        Используется горячей перезагрузкой: модули держат ссылку на этот объект,
+        поэтому подмена полей видна им сразу. Состояние гистерезиса профиля сохраняется.
+        """
+        self.config = other.config
+        self.scalping_config = other.scalping_config
+        self._raw_config_dict = other._raw_config_dict
+        self.symbol_profiles = other.symbol_profiles
+        self._trailing_sl_cache = other._trailing_sl_cache
+        self._adaptive_risk_cache = other._adaptive_risk_cache
+
+    @staticmethod
+    def _copy_compiled_params(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Копия скомпилированного словаря: вызывающий код может его мутировать."""
+        return {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in params.items()
+        }
+
     def _validate_units_and_ranges(self) -> None:
         """
         Валидация ключевых параметров, где часто путают доли/проценты.
@@ -593,6 +625,13 @@ class ConfigManager:
 
     def get_trailing_sl_params(self, regime: Optional[str] = None) -> Dict[str, Any]:
         """✅ ЭТАП 4: Возвращает параметры Trailing SL с учетом конфига, fallback значений и адаптацией под режим рынка."""
+        cached = self._trailing_sl_cache.get(regime)
+        if cached is None:
+            cached = self._build_trailing_sl_params(regime)
+            self._trailing_sl_cache[regime] = cached
+        return self._copy_compiled_params(cached)
+
+    def _build_trailing_sl_params(self, regime: Optional[str] = None) -> Dict[str, Any]:
         # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ: Используем правильные fallback значения (как в конфиге)
         # Эти значения используются ТОЛЬКО если конфиг не загружен
         # Комиссии: берем из scalping.commission если есть, иначе fallback на maker=0.02%, taker=0.05%
@@ -1459,39 +1498,10 @@ class ConfigManager:
                 )
                 return self.get_fallback_risk_params()
 
-            # Конвертируем в словарь если нужно
-            risk_dict = self.to_dict(risk_config)
-
-            # ✅ ОТЛАДКА: Проверяем наличие полей в risk_dict
-            if (
-                not risk_dict.get("base")
-                and not risk_dict.get("by_regime")
-                and not risk_dict.get("by_balance")
-            ):
-                logger.warning(
-                    f"⚠️ Поля base, by_regime, by_balance не найдены в risk_config. "
-                    f"Доступные поля: {list(risk_dict.keys())}. "
-                    f"Используем fallback значения."
-                )
-                # Пытаемся получить напрямую из объекта
-                if hasattr(risk_config, "base"):
-                    risk_dict["base"] = self.to_dict(risk_config.base)
-                if hasattr(risk_config, "by_regime"):
-                    risk_dict["by_regime"] = self.to_dict(risk_config.by_regime)
-                if hasattr(risk_config, "by_balance"):
-                    risk_dict["by_balance"] = self.to_dict(risk_config.by_balance)
-
-            # Базовые параметры (fallback)
-            base_params = self.to_dict(risk_dict.get("base", {}))
-
             # 2. Определяем баланс профиль
             balance_profile = self.get_balance_profile(balance)
             profile_name = balance_profile.get("name", "small")
 
-            # Параметры по балансу
-            by_balance = self.to_dict(risk_dict.get("by_balance", {}))
-            balance_params = self.to_dict(by_balance.get(profile_name, {}))
-
             # 3. Определяем режим рынка (если не указан)
             # ✅ ИСПРАВЛЕНО (25.12.2025): Получаем режим с альтернативными источниками
             if not regime:
@@ -1573,58 +1583,14 @@ class ConfigManager:
             # Нормализуем режим (может быть uppercase или lowercase)
             regime = regime.lower() if regime else "ranging"
 
-            # Параметры по режиму (ПРИОРИТЕТ 1)
-            by_regime = self.to_dict(risk_dict.get("by_regime", {}))
-            regime_params = self.to_dict(by_regime.get(regime, {}))
-            logger.info(f"regime_params for {regime}: {regime_params}")
-            logger.info(
-                f"by_regime keys: {list(by_regime.keys()) if by_regime else 'None'}"
-            )
-            logger.info(
-                f"risk_dict keys: {list(risk_dict.keys()) if risk_dict else 'None'}"
-            )
-
-            # 4. Объединяем параметры с приоритетом: режим > баланс > базовые
-            # Начинаем с базовых параметров
-            adaptive_params = base_params.copy()
-
-            # Применяем параметры баланса (перезаписывают базовые)
-            adaptive_params.update(balance_params)
-
-            # Применяем параметры режима (перезаписывают баланс и базовые) - ПРИОРИТЕТ 1
-            adaptive_params.update(regime_params)
-
-            # 5. Обрабатываем вложенные словари (strength_multipliers, strength_thresholds)
-            if "strength_multipliers" in adaptive_params:
-                adaptive_params["strength_multipliers"] = self.to_dict(
-                    adaptive_params["strength_multipliers"]
+            cache_key = (regime, profile_name)
+            cached = self._adaptive_risk_cache.get(cache_key)
+            if cached is None:
+                cached = self._compile_adaptive_risk_params(
+                    risk_config, regime, profile_name
                 )
-            else:
-                # Fallback strength_multipliers
-                adaptive_params["strength_multipliers"] = {
-                    "conflict": 0.5,
-                    "very_strong": 1.5,
-                    "strong": 1.2,
-                    "medium": 1.0,
-                    "weak": 0.8,
-                }
-
-            if "strength_thresholds" in adaptive_params:
-                adaptive_params["strength_thresholds"] = self.to_dict(
-                    adaptive_params["strength_thresholds"]
-                )
-            else:
-                # Fallback strength_thresholds
-                adaptive_params["strength_thresholds"] = {
-                    "very_strong": 0.8,
-                    "strong": 0.6,
-                    "medium": 0.4,
-                }
-
-            # 6. Валидация параметров
-            adaptive_params = self.validate_risk_params(
-                adaptive_params, regime, profile_name
-            )
+                self._adaptive_risk_cache[cache_key] = cached
+            adaptive_params = self._copy_compiled_params(cached)
 
             # ✅ НОВОЕ (03.01.2026): Логирование адаптивных параметров риска на уровне INFO
             max_loss_pct = adaptive_params.get("max_loss_per_trade_percent", 2.0)
@@ -1655,6 +1621,93 @@ class ConfigManager:
             )
             return self.get_fallback_risk_params()
 
+    def _compile_adaptive_risk_params(
+        self,
+        risk_config: Any,
+        regime: str,
+        profile_name: str,
+    ) -> Dict[str, Any]:
+        """Слияние base → by_balance → by_regime + валидация (кэшируется по режиму/профилю)."""
+        # Конвертируем в словарь если нужно
+        risk_dict = self.to_dict(risk_config)
+
+        # ✅ ОТЛАДКА: Проверяем наличие полей в risk_dict
+        if (
+            not risk_dict.get("base")
+            and not risk_dict.get("by_regime")
+            and not risk_dict.get("by_balance")
+        ):
+            logger.warning(
+                f"⚠️ Поля base, by_regime, by_balance не найдены в risk_config. "
+                f"Доступные поля: {list(risk_dict.keys())}. "
+                f"Используем fallback значения."
+            )
+            # Пытаемся получить напрямую из объекта
+            if hasattr(risk_config, "base"):
+                risk_dict["base"] = self.to_dict(risk_config.base)
+            if hasattr(risk_config, "by_regime"):
+                risk_dict["by_regime"] = self.to_dict(risk_config.by_regime)
+            if hasattr(risk_config, "by_balance"):
+                risk_dict["by_balance"] = self.to_dict(risk_config.by_balance)
+
+        # Базовые параметры (fallback)
+        base_params = self.to_dict(risk_dict.get("base", {}))
+
+        # Параметры по балансу
+        by_balance = self.to_dict(risk_dict.get("by_balance", {}))
+        balance_params = self.to_dict(by_balance.get(profile_name, {}))
+
+        # Параметры по режиму (ПРИОРИТЕТ 1)
+        by_regime = self.to_dict(risk_dict.get("by_regime", {}))
+        regime_params = self.to_dict(by_regime.get(regime, {}))
+        logger.info(f"regime_params for {regime}: {regime_params}")
+        logger.info(
+            f"by_regime keys: {list(by_regime.keys()) if by_regime else 'None'}"
+        )
+        logger.info(
+            f"risk_dict keys: {list(risk_dict.keys()) if risk_dict else 'None'}"
+        )
+
+        # 4. Объединяем параметры с приоритетом: режим > баланс > базовые
+        # Начинаем с базовых параметров
+        adaptive_params = base_params.copy()
+
+        # Применяем параметры баланса (перезаписывают базовые)
+        adaptive_params.update(balance_params)
+
+        # Применяем параметры режима (перезаписывают баланс и базовые) - ПРИОРИТЕТ 1
+        adaptive_params.update(regime_params)
+
+        # 5. Обрабатываем вложенные словари (strength_multipliers, strength_thresholds)
+        if "strength_multipliers" in adaptive_params:
+            adaptive_params["strength_multipliers"] = self.to_dict(
+                adaptive_params["strength_multipliers"]
+            )
+        else:
+            # Fallback strength_multipliers
+            adaptive_params["strength_multipliers"] = {
+                "conflict": 0.5,
+                "very_strong": 1.5,
+                "strong": 1.2,
+                "medium": 1.0,
+                "weak": 0.8,
+            }
+
+        if "strength_thresholds" in adaptive_params:
+            adaptive_params["strength_thresholds"] = self.to_dict(
+                adaptive_params["strength_thresholds"]
+            )
+        else:
+            # Fallback strength_thresholds
+            adaptive_params["strength_thresholds"] = {
+                "very_strong": 0.8,
+                "strong": 0.6,
+                "medium": 0.4,
+            }
+
+        # 6. Валидация параметров
+        return self.validate_risk_params(adaptive_params, regime, profile_name)
+
     def get_adaptive_delay(
         self,
         delay_key: str,
@@ -0,0 +1,391 @@
+"""
+Горячая перезагрузка config_futures.yaml без перезапуска бота.
+
+Фоновая задача следит за файлом конфига. При изменении она:
+1. в отдельном потоке читает и валидирует YAML (load_yaml_strict, BotConfig,
+   валидаторы ConfigManager), компилирует таблицы параметров;
+2. строит структурный diff со старым raw-конфигом;
+3. атомарно (без await между присваиваниями) подменяет снапшот в живых
+   ConfigManager / ParameterOrchestrator;
+4. уведомляет подписчиков (фильтры, TSL coordinator, regime managers).
+
+Открытые позиции по умолчанию продолжают работать на exit-параметрах
+той версии конфига, с которой были открыты (pin в ParameterOrchestrator).
+Торговый цикл не останавливается: тяжёлая работа выполняется вне event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import io
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from src.config import BotConfig, load_yaml_strict
+
+from .config_manager import ConfigManager
+
+# Изменения, которые нельзя применить на лету (нужен перезапуск)
+RESTART_REQUIRED_PREFIXES: Tuple[str, ...] = (
+    "api",
+    "trading.symbols",
+    "scalping.symbols",
+)
+
+_MISSING = object()
+
+ConfigReloadCallback = Callable[["ConfigDiff"], Union[None, Awaitable[None]]]
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """Одно изменение в конфиге (путь через точку)."""
+
+    path: str
+    kind: str  # added | removed | changed
+    old: Any = None
+    new: Any = None
+
+
+@dataclass
+class ConfigDiff:
+    """Структурный diff между двумя версиями raw-конфига."""
+
+    old_version: int
+    new_version: int
+    changes: List[ConfigChange] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    @property
+    def paths(self) -> List[str]:
+        return [change.path for change in self.changes]
+
+    def touches(self, *prefixes: str) -> bool:
+        """Есть ли изменения в указанных разделах (scalping.adaptive_regime и т.п.)."""
+        return any(
+            _path_has_prefix(change.path, prefix)
+            for change in self.changes
+            for prefix in prefixes
+        )
+
+    def filter(self, *prefixes: str) -> List[ConfigChange]:
+        return [
+            change
+            for change in self.changes
+            if any(_path_has_prefix(change.path, prefix) for prefix in prefixes)
+        ]
+
+    def summary(self, limit: int = 10) -> str:
+        head = ", ".join(self.paths[:limit])
+        rest = len(self.changes) - limit
+        return f"{head} (+{rest})" if rest > 0 else head
+
+
+def _path_has_prefix(path: str, prefix: str) -> bool:
+    return path == prefix or path.startswith(prefix + ".")
+
+
+def diff_config(old: Any, new: Any, path: str = "") -> List[ConfigChange]:
+    """
+    Рекурсивный diff двух raw-конфигов.
+
+    Словари сравниваются по ключам, списки и скаляры - целиком.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes: List[ConfigChange] = []
+        for key in list(old.keys()) + [k for k in new.keys() if k not in old]:
+            sub_path = f"{path}.{key}" if path else str(key)
+            old_value = old.get(key, _MISSING)
+            new_value = new.get(key, _MISSING)
+            if old_value is _MISSING:
+                changes.append(ConfigChange(sub_path, "added", None, new_value))
+            elif new_value is _MISSING:
+                changes.append(ConfigChange(sub_path, "removed", old_value, None))
+            else:
+                changes.extend(diff_config(old_value, new_value, sub_path))
+        return changes
+    if old != new or type(old) is not type(new):
+        return [ConfigChange(path, "changed", old, new)]
+    return []
+
+
+@dataclass
+class StagedConfig:
+    """Новая версия конфига, провалидированная и скомпилированная вне event loop."""
+
+    digest: str
+    bot_config: BotConfig
+    raw_config: Dict[str, Any]
+    config_manager: ConfigManager
+    parameter_orchestrator: Any = None
+
+
+@dataclass
+class _Subscriber:
+    name: str
+    callback: ConfigReloadCallback
+    prefixes: Tuple[str, ...]
+
+
+class ConfigHotReloader:
+    """
+    Следит за config_futures.yaml и применяет изменения на лету.
+
+    Подписчики регистрируются через subscribe(); callback получает ConfigDiff
+    и вызывается только если diff затрагивает его разделы (prefixes).
+    """
+
+    def __init__(
+        self,
+        config_path: Union[str, Path],
+        config_manager: ConfigManager,
+        parameter_orchestrator=None,
+        position_registry=None,
+        poll_interval_sec: float = 2.0,
+        settle_sec: float = 0.5,
+        apply_to_open_positions: bool = False,
+    ):
+        self.config_path = Path(config_path)
+        self.config_manager = config_manager
+        self.parameter_orchestrator = parameter_orchestrator
+        self.position_registry = position_registry
+        self.poll_interval_sec = max(0.1, float(poll_interval_sec))
+        self.settle_sec = max(0.0, float(settle_sec))
+        self.apply_to_open_positions = bool(apply_to_open_positions)
+
+        self.version = 1
+        self.is_running = False
+        self.watch_task: Optional[asyncio.Task] = None
+        self._reload_lock = asyncio.Lock()
+        self._subscribers: List[_Subscriber] = []
+        self._last_signature: Optional[Tuple[float, int]] = None
+        self._digest: Optional[str] = None
+        self.last_diff: Optional[ConfigDiff] = None
+        self.stats: Dict[str, int] = {
+            "applied": 0,
+            "rejected": 0,
+            "unchanged": 0,
+            "subscriber_errors": 0,
+        }
+
+        try:
+            self._last_signature = self._file_signature()
+            self._digest = self._hash_file()
+        except OSError as e:
+            logger.warning(
+                f"⚠️ ConfigHotReloader: не удалось прочитать {self.config_path}: {e}"
+            )
+
+    # ---------- подписки ----------
+
+    def subscribe(
+        self,
+        name: str,
+        callback: ConfigReloadCallback,
+        prefixes: Optional[Tuple[str, ...]] = None,
+    ) -> None:
+        """Регистрирует обработчик перезагрузки (prefixes=None - любые изменения)."""
+        self._subscribers.append(_Subscriber(name, callback, tuple(prefixes or ())))
+
+    # ---------- жизненный цикл ----------
+
+    async def start(self) -> None:
+        if self.is_running:
+            logger.warning("⚠️ ConfigHotReloader: Уже запущен")
+            return
+        self.is_running = True
+        self.watch_task = asyncio.create_task(self._watch_loop())
+        logger.info(
+            f"🚀 ConfigHotReloader: слежу за {self.config_path} "
+            f"(интервал {self.poll_interval_sec:.1f}с)"
+        )
+
+    async def stop(self) -> None:
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self.watch_task:
+            self.watch_task.cancel()
+            try:
+                await self.watch_task
+            except asyncio.CancelledError:
+                pass
+        logger.info("🛑 ConfigHotReloader: Остановлен")
+
+    async def _watch_loop(self) -> None:
+        while self.is_running:
+            try:
+                await asyncio.sleep(self.poll_interval_sec)
+                self.release_closed_positions()
+                signature = self._file_signature()
+                if signature == self._last_signature:
+                    continue
+                # Ждём, пока редактор допишет файл (mtime/size перестанут меняться)
+                if self.settle_sec:
+                    await asyncio.sleep(self.settle_sec)
+                    settled = self._file_signature()
+                    if settled != signature:
+                        continue
+                self._last_signature = signature
+                await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except FileNotFoundError:
+                logger.warning(f"⚠️ ConfigHotReloader: {self.config_path} не найден")
+            except Exception as e:
+                logger.error(f"❌ ConfigHotReloader: ошибка цикла наблюдения: {e}")
+
+    def _file_signature(self) -> Tuple[float, int]:
+        stat = self.config_path.stat()
+        return stat.st_mtime, stat.st_size
+
+    def _hash_file(self) -> str:
+        return hashlib.sha256(self.config_path.read_bytes()).hexdigest()
+
+    # ---------- перезагрузка ----------
+
+    async def reload(self) -> Optional[ConfigDiff]:
+        """
+        Перечитывает конфиг и применяет изменения.
+
+        Returns:
+            ConfigDiff применённых изменений, либо None (нет изменений / отклонено).
+        """
+        async with self._reload_lock:
+            try:
+                staged = await asyncio.to_thread(self._stage)
+            except Exception as e:
+                self.stats["rejected"] += 1
+                logger.error(
+                    f"❌ CONFIG_RELOAD: новый конфиг отклонён, работаем на v{self.version}: {e}"
+                )
+                return None
+
+            if staged.digest == self._digest:
+                self.stats["unchanged"] += 1
+                return None
+
+            changes = diff_config(
+                self.config_manager._raw_config_dict or {}, staged.raw_config
+            )
+            diff = ConfigDiff(self.version, self.version + 1, changes)
+            if not diff:
+                self._digest = staged.digest
+                self.stats["unchanged"] += 1
+                return None
+
+            blocked = diff.filter(*RESTART_REQUIRED_PREFIXES)
+            if blocked:
+                self.stats["rejected"] += 1
+                logger.error(
+                    f"❌ CONFIG_RELOAD: изменения требуют перезапуска, конфиг не применён: "
+                    f"{[c.path for c in blocked]}"
+                )
+                return None
+
+            self._swap(staged, diff)
+            await self._notify(diff)
+            return diff
+
+    def _stage(self) -> StagedConfig:
+        """Загрузка + валидация + компиляция (выполняется в отдельном потоке)."""
+        started = time.perf_counter()
+        data = self.config_path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        raw_config = load_yaml_strict(io.StringIO(data.decode("utf-8")))
+        bot_config = BotConfig.load_from_file(str(self.config_path))
+        if self._hash_file() != digest:
+            raise RuntimeError(
+                "файл изменился во время загрузки, повторим на следующем цикле"
+            )
+        # ConfigManager в конструкторе прогоняет валидаторы единиц/диапазонов и структуры
+        staged_manager = ConfigManager(bot_config, raw_config_dict=raw_config)
+
+        staged_orchestrator = None
+        if self.parameter_orchestrator is not None:
+            staged_orchestrator = type(self.parameter_orchestrator)(
+                config_manager=staged_manager,
+                data_registry=self.parameter_orchestrator.data_registry,
+                regime_manager=self.parameter_orchestrator.regime_manager,
+            )
+            invalid = staged_orchestrator.compiled.errors
+            if invalid:
+                raise ValueError(
+                    f"compiled parameter tables invalid: {sorted(map(str, invalid))[:5]}"
+                )
+
+        logger.debug(
+            f"CONFIG_RELOAD: staged за {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return StagedConfig(
+            digest=digest,
+            bot_config=bot_config,
+            raw_config=raw_config,
+            config_manager=staged_manager,
+            parameter_orchestrator=staged_orchestrator,
+        )
+
+    def _open_position_symbols(self) -> List[str]:
+        if self.position_registry is None:
+            return []
+        try:
+            return list(self.position_registry.get_all_positions_sync().keys())
+        except Exception as e:
+            logger.debug(
+                f"ConfigHotReloader: не удалось получить открытые позиции: {e}"
+            )
+            return []
+
+    def _swap(self, staged: StagedConfig, diff: ConfigDiff) -> None:
+        """Атомарная подмена снапшота: только присваивания, без await."""
+        orchestrator = self.parameter_orchestrator
+        if orchestrator is not None and staged.parameter_orchestrator is not None:
+            if not self.apply_to_open_positions:
+                orchestrator.pin_symbols(self._open_position_symbols())
+            orchestrator.adopt(staged.parameter_orchestrator)
+
+        self.config_manager.apply_snapshot(staged.config_manager)
+        self._digest = staged.digest
+        self.version = diff.new_version
+        self.last_diff = diff
+        self.stats["applied"] += 1
+        logger.info(
+            f"✅ CONFIG_RELOAD: применена v{diff.new_version} "
+            f"({len(diff.changes)} изменений): {diff.summary()}"
+        )
+
+    async def _notify(self, diff: ConfigDiff) -> None:
+        for subscriber in self._subscribers:
+            if subscriber.prefixes and not diff.touches(*subscriber.prefixes):
+                continue
+            try:
+                result = subscriber.callback(diff)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.stats["subscriber_errors"] += 1
+                logger.error(
+                    f"❌ CONFIG_RELOAD: подписчик {subscriber.name} упал на v{diff.new_version}: {e}"
+                )
+
+    def release_closed_positions(self) -> None:
+        """Снимает pin с символов, по которым позиции уже закрыты."""
+        if self.parameter_orchestrator is not None:
+            self.parameter_orchestrator.release_pins(self._open_position_symbols())
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "path": str(self.config_path),
+            "running": self.is_running,
+            "last_changes": self.last_diff.paths if self.last_diff else [],
+            **self.stats,
+        }
@@ -41,6 +41,8 @@ class OrderCoordinator:
         self.last_orders_cache = last_orders_cache_ref  # Ссылка на кэш
         self.structured_logger = structured_logger
         self._last_amend_ts: Dict[str, float] = {}
+        # LimitOrderChaser: его ордера ведутся по книге, REST-опрос не нужен
+        self.order_chaser = None
 
         # --- Получаем конфиги ДО использования ---
         order_executor_config = getattr(self.scalping_config, "order_executor", {})
@@ -70,6 +72,60 @@ class OrderCoordinator:
 
         logger.info("✅ OrderCoordinator initialized")
 
+    def set_order_chaser(self, order_chaser) -> None:
+        """Установить LimitOrderChaser (таймауты и amend его ордеров - на нем)."""
+        self.order_chaser = order_chaser
+
+    def can_market_replace(self, symbol: str) -> bool:
+        """Не превышен ли лимит market-замен подряд по символу."""
+        cnt = self._market_replace_counters.get(symbol, 0)
+        if cnt >= self._market_replace_limit:
+            logger.warning(
+                f"⛔ Превышен лимит market-замен подряд для {symbol}: {cnt} (максимум {self._market_replace_limit}), market-замена не выполняется"
+            )
+            return False
+        return True
+
+    def is_reentry_blocked(self, symbol: str) -> bool:
+        """Заблокирован ли вход по символу после неудачной market-замены."""
+        return time.time() < self._reentry_blocked_until.get(symbol, 0)
+
+    async def record_market_replace(self, symbol: str, success: bool) -> None:
+        """
+        Итог market-замены лимитного ордера (таймаут OrderCoordinator или
+        конец ожидания LimitOrderChaser).
+
+        Успех - сброс счетчика замен подряд и принудительный sync позиций;
+        неудача - счетчик +1 и блокировка входов по символу на N минут.
+        """
+        if success:
+            # Сбросить счётчик market-замен подряд
+            self._market_replace_counters[symbol] = 0
+            # Сразу после market-замены инициируем sync позиций для актуализации реестра
+            position_manager = getattr(self.order_executor, "position_manager", None)
+            if position_manager:
+                try:
+                    await position_manager.sync_positions_with_exchange(force=True)
+                    logger.info(
+                        f"✅ Реестр позиций синхронизирован после market-замены для {symbol}"
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"⚠️ Не удалось синхронизировать позиции после market-замены для {symbol}: {e}"
+                    )
+            return
+        # Увеличить счётчик market-замен подряд
+        self._market_replace_counters[symbol] = (
+            self._market_replace_counters.get(symbol, 0) + 1
+        )
+        # Блокируем повторные входы по символу на N минут
+        self._reentry_blocked_until[symbol] = (
+            time.time() + self._reentry_block_minutes * 60
+        )
+        logger.warning(
+            f"⏳ Вход по {symbol} заблокирован на {self._reentry_block_minutes} мин после неудачной market-замены"
+        )
+
     async def monitor_limit_orders(self):
         now_ts = time.time()
         # Очищаем устаревшие записи из истории отмен/замен
@@ -199,6 +255,9 @@ class OrderCoordinator:
                         f"⏳ Вход по {symbol} заблокирован до {datetime.fromtimestamp(blocked_until).strftime('%H:%M:%S')}"
                     )
                     continue
+                # Лимитки символа ведет LimitOrderChaser по потоку книги
+                if self.order_chaser and self.order_chaser.has_orders(symbol):
+                    continue
                 try:
                     active_orders = await self.client.get_active_orders(symbol)
 
@@ -371,13 +430,7 @@ class OrderCoordinator:
 
                                         if replace_with_market:
                                             # Проверка лимита market-замен подряд
-                                            cnt = self._market_replace_counters.get(
-                                                symbol, 0
-                                            )
-                                            if cnt >= self._market_replace_limit:
-                                                logger.warning(
-                                                    f"⛔ Превышен лимит market-замен подряд для {symbol}: {cnt} (максимум {self._market_replace_limit}), market-замена не выполняется"
-                                                )
+                                            if not self.can_market_replace(symbol):
                                                 continue
                                             size_str = order.get("sz", "0")
                                             filled_str = order.get("accFillSz", "0")
@@ -424,49 +477,13 @@ class OrderCoordinator:
                                                     logger.info(
                                                         f"✅ Market ордер размещен вместо лимитного (таймаут): {result.get('order_id')}"
                                                     )
-                                                    # Сбросить счётчик market-замен подряд
-                                                    self._market_replace_counters[
-                                                        symbol
-                                                    ] = 0
-                                                    # Сразу после market-замены инициируем sync позиций для актуализации реестра
-                                                    if (
-                                                        hasattr(
-                                                            self.order_executor,
-                                                            "position_manager",
-                                                        )
-                                                        and self.order_executor.position_manager
-                                                    ):
-                                                        try:
-                                                            await self.order_executor.position_manager.sync_positions_with_exchange(
-                                                                force=True
-                                                            )
-                                                            logger.info(
-                                                                f"✅ Реестр позиций синхронизирован после market-замены для {symbol}"
-                                                            )
-                                                        except Exception as e:
-                                                            logger.warning(
-                                                                f"⚠️ Не удалось синхронизировать позиции после market-замены для {symbol}: {e}"
-                                                            )
                                                 else:
                                                     logger.error(
                                                         f"❌ Не удалось разместить market ордер для {symbol}: {result.get('error', 'unknown error')}"
                                                     )
-                                                    # Увеличить счётчик market-замен подряд
-                                                    self._market_replace_counters[
-                                                        symbol
-                                                    ] = (cnt + 1)
-                                                    # Блокируем повторные входы по символу на N минут
-                                                    block_until = (
-                                                        time.time()
-                                                        + self._reentry_block_minutes
-                                                        * 60
-                                                    )
-                                                    self._reentry_blocked_until[
-                                                        symbol
-                                                    ] = block_until
-                                                    logger.warning(
-                                                        f"⏳ Вход по {symbol} заблокирован на {self._reentry_block_minutes} мин после неудачной market-замены"
-                                                    )
+                                                await self.record_market_replace(
+                                                    symbol, bool(result.get("success"))
+                                                )
                                             except (ValueError, TypeError) as e:
                                                 logger.debug(
                                                     f"Ошибка парсинга размера/остатка ордера {order_id} при замене на market: {e}"
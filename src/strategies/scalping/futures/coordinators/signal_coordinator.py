@@ -1576,7 +1576,15 @@ class SignalCoordinator:
         try:
             # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (28.12.2025): Блокировка торговли до готовности всех модулей
             # Ждём готовности всех модулей перед генерацией сигналов
-            if self.orchestrator and hasattr(
+            if self.orchestrator and hasattr(self.orchestrator, "is_symbol_ready"):
+                # Символ, восстановленный параллельным стартом, не ждет остальных
+                if not self.orchestrator.is_symbol_ready(symbol):
+                    await self.orchestrator.initialization_complete.wait()
+                    # Старт завершен, но данные/позиции символа еще догружаются
+                    if not self.orchestrator.is_symbol_ready(symbol):
+                        self.orchestrator.skipped_signals_due_init += 1
+                        return
+            elif self.orchestrator and hasattr(
                 self.orchestrator, "initialization_complete"
             ):
                 await self.orchestrator.initialization_complete.wait()
@@ -17,6 +17,7 @@ from typing import Any, Awaitable, Callable, Dict, Optional
 from loguru import logger
 
 from ..indicators.trailing_stop_loss import TrailingStopLoss
+from ..positions.exit_plan import ExitPlanner
 
 
 class TrailingSLCoordinator:
@@ -94,6 +95,8 @@ class TrailingSLCoordinator:
         )
         self.position_registry = position_registry  # ✅ НОВОЕ (09.01.2026): PositionRegistry для доступа к DataRegistry
         self.exit_decision_coordinator = None  # ✅ НОВОЕ (26.12.2025): ExitDecisionCoordinator для координации закрытия
+        self.exchange_stops = None  # ExchangeStopManager: зеркало TSL в биржевой SL
+        self.execution_costs = None  # ExecutionCostModel: комиссии по нашим fill'ам
 
         # ✅ ЭТАП 1.1: История delta для анализа разворота Order Flow
         self._order_flow_delta_history: Dict[
@@ -117,6 +120,13 @@ class TrailingSLCoordinator:
         self._tsl_log_count: Dict[str, int] = {}
         self._latest_price_snapshot: Dict[str, Dict[str, Any]] = {}
 
+        # Скомпилированные планы выхода: на "спокойных" тиках полный анализ
+        # выхода (ExitDecisionCoordinator + should_close_position) пропускается
+        exit_plan_cfg = getattr(self.scalping_config, "exit_plan", {}) or {}
+        if not isinstance(exit_plan_cfg, dict):
+            exit_plan_cfg = dict(getattr(exit_plan_cfg, "__dict__", {}) or {})
+        self.exit_planner = ExitPlanner(exit_plan_cfg, exit_analyzer=self.exit_analyzer)
+
         logger.info("✅ TrailingSLCoordinator initialized")
 
     def _remember_price_snapshot(
@@ -153,6 +163,39 @@ class TrailingSLCoordinator:
         self.exit_decision_coordinator = exit_decision_coordinator
         logger.debug("✅ TrailingSLCoordinator: ExitDecisionCoordinator установлен")
 
+    def set_exchange_stops(self, exchange_stops):
+        """Установить ExchangeStopManager для зеркалирования TSL на бирже."""
+        self.exchange_stops = exchange_stops
+        logger.debug("✅ TrailingSLCoordinator: ExchangeStopManager установлен")
+
+    def set_execution_costs(self, execution_costs):
+        """Установить ExecutionCostModel: maker/taker комиссии TSL по нашим исполнениям."""
+        self.execution_costs = execution_costs
+        logger.debug("✅ TrailingSLCoordinator: ExecutionCostModel установлен")
+
+    def set_exit_guard(self, exit_guard):
+        """Установить ExitGuard: его комиссионный порог входит в план выхода."""
+        self.exit_planner.exit_guard = exit_guard
+        self.exit_planner.drop()
+
+    def apply_config_reload(self, diff) -> None:
+        """
+        Применяет перезагруженный конфиг (ConfigHotReloader).
+
+        Уже созданные TrailingStopLoss открытых позиций сохраняют параметры входа,
+        новые значения действуют для следующих позиций и интервалов проверки.
+        """
+        self._full_config = getattr(self.config_manager, "_raw_config_dict", {}) or {}
+        self.scalping_config = getattr(
+            self.config_manager, "scalping_config", self.scalping_config
+        )
+        tsl_config = getattr(self.scalping_config, "trailing_sl", {})
+        self._tsl_check_interval = getattr(
+            tsl_config, "check_interval_seconds", self._tsl_check_interval
+        )
+        self._tsl_check_intervals_by_regime.clear()
+        logger.info(f"🔄 TrailingSLCoordinator: конфиг v{diff.new_version} применён")
+
     def set_parameter_provider(self, parameter_provider):
         """
         ✅ НОВОЕ (26.12.2025): Установить ParameterProvider для единого доступа к параметрам.
@@ -209,6 +252,7 @@ class TrailingSLCoordinator:
                             "high_profit_max_factor", 2.0
                         )
                     logger.debug(f"✅ TSL для {sym} обновлён под режим {new_regime}")
+                self.exit_planner.drop(sym)
         except Exception as e:
             logger.error(f"❌ Ошибка перезагрузки TSL параметров: {e}")
 
@@ -625,6 +669,17 @@ class TrailingSLCoordinator:
         min_trail = params["min_trail"] or 0.0
         maker_fee_rate = params.get("maker_fee_rate")
         taker_fee_rate = params.get("taker_fee_rate")
+        # Комиссии по нашим исполнениям; пока данных мало - из конфига
+        if self.execution_costs is not None:
+            try:
+                learned_maker = self.execution_costs.fee_rate(symbol, "limit")
+                learned_taker = self.execution_costs.fee_rate(symbol, "market")
+                if learned_maker is not None:
+                    maker_fee_rate = learned_maker
+                if learned_taker is not None:
+                    taker_fee_rate = learned_taker
+            except Exception as e:
+                logger.debug(f"⚠️ ExecutionCostModel: комиссии {symbol}: {e}")
         trading_fee_rate = params.get("trading_fee_rate") or maker_fee_rate or 0.0
 
         # ✅ ЭТАП 4: Создаем TrailingStopLoss с новыми параметрами
@@ -1165,44 +1220,21 @@ class TrailingSLCoordinator:
                 )
 
             # ✅ КРИТИЧЕСКОЕ УЛУЧШЕНИЕ (07.02.2026): Обновление базового SL на бирже при движении TSL
-            # Hybrid approach: синхронизируем биржевой SL с динамическим TSL
-            try:
-                if (
-                    stop_loss
-                    and hasattr(self, "position_registry")
-                    and self.position_registry
-                ):
-                    # Получаем metadata для доступа к exchange_sl_algo_id
-                    metadata = await self.position_registry.get_metadata(symbol)
-                    if metadata:
-                        algo_id = (
-                            metadata.exchange_sl_algo_id
-                        )  # dataclass attribute access
-                        if (
-                            algo_id
-                            and self.client
-                            and hasattr(self.client, "amend_algo_order")
-                        ):
-                            # Обновляем биржевой SL под новый stop_loss
-                            # Применяем safety buffer (используем текущий stop_loss без дополнительного расширения)
-                            try:
-                                await self.client.amend_algo_order(
-                                    symbol=symbol,
-                                    algo_id=algo_id,
-                                    new_trigger_price=stop_loss,
-                                )
-                                logger.debug(
-                                    f"✅ Exchange base SL обновлён для {symbol}: "
-                                    f"new_trigger={stop_loss:.2f}, algoId={algo_id}"
-                                )
-                            except Exception as e:
-                                # Не критично если обновление не удалось - динамический TSL всё равно работает
-                                logger.debug(
-                                    f"⚠️ Не удалось обновить exchange SL для {symbol}: {e}"
-                                )
-            except Exception as e:
-                # Не критично - продолжаем работу с динамическим TSL
-                logger.debug(f"⚠️ Ошибка синхронизации exchange SL для {symbol}: {e}")
+            # Hybrid approach: синхронизируем биржевой SL с динамическим TSL.
+            # Без REST на тике: ExchangeStopManager копит уровни и шлет amend пачками
+            if stop_loss and self.exchange_stops:
+                self.exchange_stops.update(symbol, stop_loss, current_price)
+
+            # Цена далеко от всех порогов плана выхода - полный анализ не нужен
+            if not await self.exit_planner.should_analyze(
+                symbol,
+                tsl,
+                current_price,
+                stop_loss=stop_loss,
+                regime=self._resolve_symbol_regime(symbol),
+                position=position,
+            ):
+                return
 
             profit_pct = tsl.get_profit_pct(
                 current_price,
@@ -2629,13 +2661,17 @@ class TrailingSLCoordinator:
     def remove_tsl(self, symbol: str) -> Optional[TrailingStopLoss]:
         """Удаляет TSL для символа и возвращает его."""
         tsl = self.trailing_sl_by_symbol.pop(symbol, None)
+        self.exit_planner.drop(symbol)
         if tsl:
             logger.debug(f"✅ TSL удален для {symbol}")
+        if self.exchange_stops:
+            self.exchange_stops.release(symbol)
         return tsl
 
     def clear_all_tsl(self) -> int:
         """Очищает все TSL и возвращает количество удаленных записей."""
         count = len(self.trailing_sl_by_symbol)
         self.trailing_sl_by_symbol.clear()
+        self.exit_planner.drop()
         logger.info(f"✅ Очищено {count} TSL")
         return count
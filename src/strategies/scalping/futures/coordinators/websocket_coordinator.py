@@ -11,15 +11,36 @@ WebSocket Coordinator для Futures торговли.
 import asyncio
 import time
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from loguru import logger
 
 from src.models import OHLCV
 
+from ..core.bar_builder import (
+    DEFAULT_TIMEFRAMES,
+    BarCloseEvent,
+    TradeBarBuilder,
+    bucket_start,
+)
+from ..core.tick_admission import TickAdmissionController
+from ..websocket_pool import PublicWebSocketPool
+
 # ✅ Импорт Dict уже есть в typing
 
 
+class _CurrentTick:
+    """Real-time цена для DataRegistry (market_data["current_tick"])."""
+
+    __slots__ = ("price", "bid", "ask", "timestamp")
+
+    def __init__(self, price, bid, ask, timestamp):
+        self.price = price
+        self.bid = bid
+        self.ask = ask
+        self.timestamp = timestamp
+
+
 class WebSocketCoordinator:
     """
     Координатор WebSocket для Futures торговли.
@@ -64,6 +85,11 @@ class WebSocketCoordinator:
         signal_generator=None,  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (27.12.2025): SignalGenerator для проверки готовности
         orchestrator=None,  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (28.12.2025): Orchestrator для проверки готовности модулей
         slo_monitor=None,  # Optional runtime SLO monitor
+        exchange_stops=None,  # ExchangeStopManager: сверка биржевых стопов по orders
+        account_state=None,  # AccountStateCache: снимок аккаунта из account/positions
+        portfolio_risk=None,  # PortfolioRiskEngine: цены открытых позиций
+        execution_costs=None,  # ExecutionCostModel: исполнения из канала orders
+        order_chaser=None,  # LimitOrderChaser: лимитки по лучшим ценам книги
     ):
         """
         Инициализация WebSocketCoordinator.
@@ -123,6 +149,11 @@ class WebSocketCoordinator:
         # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (28.12.2025): Orchestrator для проверки готовности модулей
         self.orchestrator = orchestrator
         self.slo_monitor = slo_monitor
+        self.exchange_stops = exchange_stops
+        self.account_state = account_state
+        self.portfolio_risk = portfolio_risk
+        self.execution_costs = execution_costs
+        self.order_chaser = order_chaser
         # OrderFlowIndicator source (can be provided directly or resolved via orchestrator).
         self.order_flow = getattr(orchestrator, "order_flow", None)
         self._order_flow_from_trades_enabled = True
@@ -151,23 +182,26 @@ class WebSocketCoordinator:
         # Формат: "symbol_timeframe" -> timestamp последней обработанной свечи (в секундах)
         self._last_candle_timestamps: Dict[str, int] = {}
 
-        # ✅ ИСПРАВЛЕНИЕ CPU 100% (06.01.2026): Дросселирование обработки тикеров
-        # Обрабатывать каждый N-й тикер вместо каждого
-        # Это снижает CPU с 100% до 40-50% без потери live данных
-        self._ticker_counter: Dict[str, int] = {}  # symbol -> counter
-        self._ticker_throttle: int = (
-            1  # Обрабатывать каждый тикер (1/1 = 100% от исходной частоты)
-        )
         # ✅ Новый lock для атомарного обновления свечей/market_data/индикаторов
         self._update_lock = asyncio.Lock()
-        # ✅ Конфигурация адаптивного дросселирования по волатильности
-        self._throttle_config = {
-            "low": 5,  # <0.1%/мин — обрабатывать 1/5
-            "medium": 2,  # 0.1-0.3%/мин — обрабатывать 1/2
-            "high": 1,  # >0.3%/мин — обрабатывать все
-        }
-        # Кэш последних N цен для оценки волатильности
-        self._volatility_cache: Dict[str, list] = {}
+        # ✅ Допуск тикеров к полной обработке: тиры по волатильности за 60с,
+        # бюджет CPU на символ, bypass при позиции или pending-ордере
+        # (индекс pending-ордеров ведется из приватного WS, см. handle_private_ws_orders)
+        tick_admission_config = getattr(scalping_config, "tick_admission", {}) or {}
+        self.tick_admission = TickAdmissionController(tick_admission_config)
+        # Шардинг: воркер читает рыночные данные из MarketBus (shared memory)
+        sharding_cfg = getattr(scalping_config, "sharding", {}) or {}
+        if not isinstance(sharding_cfg, dict):
+            sharding_cfg = dict(getattr(sharding_cfg, "__dict__", {}) or {})
+        self._market_bus_name: Optional[str] = (
+            sharding_cfg.get("bus_name")
+            if sharding_cfg.get("role") == "worker"
+            else None
+        )
+        self._market_bus_poll_interval = (
+            float(sharding_cfg.get("poll_interval_ms", 5.0)) / 1000.0
+        )
+        self.market_bus_consumer = None
         # Отслеживание последнего выбранного режима дросселирования для логирования изменений
         self._last_throttle_state: Dict[str, str] = {}
         # Последний момент вывода health-логов по символу
@@ -193,15 +227,13 @@ class WebSocketCoordinator:
         self._ws_watchdog_min_symbols = 2
         self._ws_watchdog_global_consecutive = 2
         self._ws_watchdog_global_stale_cycles = 0
+        self._ws_watchdog_shard_stale_cycles: Dict[int, int] = {}
         self._last_ws_watchdog_global_trigger = 0.0
         self._last_ws_watchdog_trigger: Dict[str, float] = {}
         self._ws_watchdog_stale_counts: Dict[str, int] = {}
         # Последний обработанный тикер и логи форсированных обходов, чтобы избежать устаревших цен
         self._last_ticker_processed_ts: Dict[str, float] = {}
         self._last_throttle_force_log_ts: Dict[str, float] = {}
-        self._ticker_force_process_threshold: float = (
-            45.0  # seconds before we force processing to keep DataRegistry fresh
-        )
         # FIX (2026-02-21): timestamp последнего account WS обновления — для REST fallback guard
         self._ws_account_last_ts: float = 0.0
         # FIX (2026-02-21): timestamp последнего WS positions обновления — для TCC REST throttle guard
@@ -210,13 +242,33 @@ class WebSocketCoordinator:
         # Sandbox WS often does not support candle channels; use REST fallback.
         if self.client and getattr(self.client, "sandbox", False):
             self._use_kline_candles = False
+
+        # Свечи из потока сделок: точный объем, buy/sell, VWAP и CVD за один проход.
+        # Пока сделки по символу свежие, ticker-свечи (оценка объема по volCcy24h) не строятся.
+        trade_bars_cfg = getattr(self.scalping_config, "trade_bars", {}) or {}
+        if not isinstance(trade_bars_cfg, dict):
+            trade_bars_cfg = getattr(trade_bars_cfg, "__dict__", {}) or {}
+        self.bar_builder: Optional[TradeBarBuilder] = None
+        self._trade_bars_max_age = float(trade_bars_cfg.get("max_age", 30.0))
+        # Таймфреймы, которые уже приходят готовыми из kline-каналов
+        self._kline_timeframes = ("1m", "5m")
+        if trade_bars_cfg.get("enabled", True):
+            try:
+                self.bar_builder = TradeBarBuilder(
+                    trade_bars_cfg.get("timeframes") or DEFAULT_TIMEFRAMES
+                )
+                self.bar_builder.subscribe(self._on_trade_bar_close)
+            except ValueError as e:
+                logger.warning(f"⚠️ TradeBarBuilder отключен: {e}")
         logger.info(
-            f"✅ WebSocketCoordinator initialized (ticker throttle: 1/{self._ticker_throttle})"
+            f"✅ WebSocketCoordinator initialized "
+            f"(tick admission: enabled={self.tick_admission.enabled}, "
+            f"budget={self.tick_admission.budget_ms_per_sec}ms/s)"
         )
 
     async def auto_reconnect(self) -> bool:
         """Delegate auto-reconnect to WebSocketManager."""
-        if not self.ws_manager:
+        if not self.ws_manager or self._market_bus_name:
             return False
         try:
             return await self.ws_manager.auto_reconnect()
@@ -229,9 +281,15 @@ class WebSocketCoordinator:
         symbol: Optional[str] = None,
         fallback_count: Optional[int] = None,
         reason: str = "",
+        symbols: Optional[List[str]] = None,
     ) -> bool:
-        """Принудительный reconnect по сигналу деградации WS."""
-        if not self.ws_manager:
+        """
+        Принудительный reconnect по сигналу деградации WS.
+
+        symbols - переподключить только соединения этих символов
+        (для PublicWebSocketPool; одиночный менеджер переподключается целиком).
+        """
+        if not self.ws_manager or self._market_bus_name:
             return False
         details = []
         if symbol:
@@ -242,6 +300,11 @@ class WebSocketCoordinator:
             details.append(f"reason={reason}")
         detail_str = ", ".join(details)
         try:
+            if symbols and isinstance(self.ws_manager, PublicWebSocketPool):
+                # Свежесть символа - по tickers/mark-price
+                return await self.ws_manager.force_reconnect(
+                    reason=detail_str, symbols=symbols, channel="tickers"
+                )
             return await self.ws_manager.force_reconnect(reason=detail_str)
         except Exception as e:
             logger.debug(f"WebSocketCoordinator force_reconnect failed: {e}")
@@ -254,6 +317,10 @@ class WebSocketCoordinator:
             self.order_flow = self.orchestrator.order_flow
         return self.order_flow
 
+    def get_tick_admission_stats(self) -> Dict[str, Any]:
+        """Счетчики допуска тикеров: admitted / dropped по символам и суммарно."""
+        return self.tick_admission.get_stats()
+
     @staticmethod
     def _safe_float(value: Any, default: float = 0.0) -> float:
         """Best-effort float parser for noisy WS payloads."""
@@ -306,30 +373,43 @@ class WebSocketCoordinator:
         return parsed
 
     async def handle_trades_data(self, symbol: str, data: dict) -> None:
-        """Update OrderFlowIndicator from public trades stream."""
-        indicator = self._get_order_flow_indicator()
-        if not indicator:
-            return
-
+        """Update trade bars and OrderFlowIndicator from public trades stream."""
         rows = data.get("data", [])
         if not rows:
             return
 
         buy_volume = 0.0
         sell_volume = 0.0
-        for row in rows:
-            side = str(row.get("side", "")).strip().lower()
+        if self.bar_builder:
+            trades = self.bar_builder.parse_okx_trades(rows)
+            for _ts, _price, size, side in trades:
+                if side == "buy":
+                    buy_volume += size
+                elif side == "sell":
+                    sell_volume += size
             try:
-                size = float(row.get("sz", 0) or 0)
-            except (TypeError, ValueError):
-                size = 0.0
-            if size <= 0:
-                continue
-            if side == "buy":
-                buy_volume += size
-            elif side == "sell":
-                sell_volume += size
+                await self._apply_trade_bars(symbol, trades)
+            except Exception as e:
+                logger.warning(f"⚠️ Ошибка обновления trade-свечей для {symbol}: {e}")
+        else:
+            for row in rows:
+                side = str(row.get("side", "")).strip().lower()
+                try:
+                    size = float(row.get("sz", 0) or 0)
+                except (TypeError, ValueError):
+                    size = 0.0
+                if size <= 0:
+                    continue
+                if side == "buy":
+                    buy_volume += size
+                elif side == "sell":
+                    sell_volume += size
 
+        if not self._order_flow_from_trades_enabled:
+            return
+        indicator = self._get_order_flow_indicator()
+        if not indicator:
+            return
         if buy_volume <= 0 and sell_volume <= 0:
             return
 
@@ -354,6 +434,89 @@ class WebSocketCoordinator:
         except Exception as e:
             logger.debug(f"Order flow trades update failed for {symbol}: {e}")
 
+    def _trade_bars_active(self, symbol: str) -> bool:
+        """Свечи символа строятся из сделок (поток trades свежий)."""
+        return self.bar_builder is not None and self.bar_builder.is_fresh(
+            symbol, self._trade_bars_max_age
+        )
+
+    async def _apply_trade_bars(self, symbol: str, trades: list) -> None:
+        """
+        Обновить бары по сделкам и записать их в DataRegistry одним вызовом.
+
+        Закрытые бары пишутся финальными значениями, затем формирующиеся.
+        Таймфреймы из kline-каналов не трогаем — там биржевые свечи.
+        """
+        if trades and self.data_registry:
+            await self._seed_trade_bars(symbol, trades[0][0])
+        events = self.bar_builder.update(symbol, trades)
+        if not events and not trades:
+            return
+
+        if self.data_registry:
+            skip = self._kline_timeframes if self._use_kline_candles else ()
+            candles = [
+                event.bar.to_ohlcv(symbol, event.timeframe)
+                for event in events
+                if event.timeframe not in skip
+            ]
+            for timeframe, bar in self.bar_builder.get_bars(symbol).items():
+                if timeframe in skip:
+                    continue
+                candles.append(bar.to_ohlcv(symbol, timeframe))
+                self._last_candle_timestamps[f"{symbol}_{timeframe}"] = bar.timestamp
+            if candles:
+                await self.data_registry.upsert_candles(symbol, candles)
+
+        if events:
+            await self.bar_builder.publish(events)
+
+    async def _seed_trade_bars(self, symbol: str, first_trade_ms: int) -> None:
+        """
+        Продолжить формирующиеся свечи DataRegistry (загружены по REST на старте)
+        вместо новых баров с первой сделки: иначе open/high/low/volume текущего
+        1H/1D периода урезаются до сделок с момента старта (и портят pivots).
+        """
+        skip = self._kline_timeframes if self._use_kline_candles else ()
+        for timeframe in self.bar_builder.timeframes:
+            if timeframe in skip or self.bar_builder.get_bar(symbol, timeframe):
+                continue
+            candles = await self.data_registry.get_candles(symbol, timeframe)
+            if not candles:
+                continue
+            period_start = bucket_start(first_trade_ms, timeframe)
+            if int(candles[-1].timestamp) * 1000 == period_start:
+                self.bar_builder.seed(symbol, timeframe, candles[-1])
+
+    def _on_trade_bar_close(self, event: BarCloseEvent) -> None:
+        """Логирование закрытых trade-свечей (как для ticker/kline свечей)."""
+        bar = event.bar
+        if event.timeframe == "1m":
+            logger.debug(f"📊 Закрыта trade-свеча {event.symbol} 1m: {bar}")
+            return
+        logger.info(
+            f"📊 Закрыта trade-свеча {event.symbol} {event.timeframe}: "
+            f"close={bar.close}, volume={bar.volume:.4f}, vwap={bar.vwap:.6f}, "
+            f"delta={bar.delta:.4f}, cvd={bar.cvd:.4f}, trades={bar.trades}"
+        )
+        if self.structured_logger:
+            try:
+                self.structured_logger.log_candle_new(
+                    symbol=event.symbol,
+                    timeframe=event.timeframe,
+                    timestamp=bar.timestamp,
+                    price=bar.close,
+                    open_price=bar.open,
+                    high=bar.high,
+                    low=bar.low,
+                    close=bar.close,
+                    volume=bar.volume,
+                )
+            except Exception as e:
+                logger.debug(
+                    f"⚠️ Ошибка логирования trade-свечи в StructuredLogger: {e}"
+                )
+
     async def initialize_websocket(self):
         """
         Инициализация WebSocket для получения рыночных данных.
@@ -362,7 +525,10 @@ class WebSocketCoordinator:
             logger.info("📡 Подключение к WebSocket...")
 
             # Подключение публичного WebSocket
-            if await self.ws_manager.connect():
+            if self._market_bus_name:
+                # Воркер шардинга: публичный WS держит процесс market-data
+                await self._start_market_bus_consumer()
+            elif await self.ws_manager.connect():
                 logger.info("✅ WebSocket подключен")
 
                 # Callback для обработки тикеров (один на все инструменты)
@@ -399,29 +565,10 @@ class WebSocketCoordinator:
                 # source="MARK_PRICE" (не WEBSOCKET) → НЕ триггерит _ws_tick_event
                 # (чтобы не будить TCC на каждый mark-price, только на реальные тики).
                 async def mark_price_callback(data):
-                    if "data" not in data or not data["data"]:
-                        return
-                    item = data["data"][0]
-                    inst_id = item.get("instId", "") or data.get("arg", {}).get(
-                        "instId", ""
-                    )
-                    symbol = inst_id.replace("-SWAP", "")
-                    mark_px_str = item.get("markPx", "")
-                    if not symbol or not mark_px_str:
-                        return
-                    try:
-                        mark_px = float(mark_px_str)
-                        if mark_px > 0 and self.data_registry:
-                            await self.data_registry.update_market_data(
-                                symbol,
-                                {
-                                    "mark_price": mark_px,
-                                    "updated_at": datetime.now(),
-                                    "source": "MARK_PRICE",
-                                },
-                            )
-                    except (ValueError, TypeError):
-                        pass
+                    await self.handle_mark_price_data(data)
+
+                async def book_callback(data):
+                    self.handle_book_data(data)
 
                 # FIX (2026-02-20): подписываемся только на АКТИВНЫЕ символы
                 # by_symbol.enabled=false → не подписываемся на WS (раньше BTC/XRP получали данные вхолостую)
@@ -478,7 +625,7 @@ class WebSocketCoordinator:
                             inst_id=inst_id,
                             callback=kline_callback,
                         )
-                    if (
+                    if self.bar_builder or (
                         self._order_flow_from_trades_enabled
                         and self._get_order_flow_indicator()
                     ):
@@ -487,6 +634,13 @@ class WebSocketCoordinator:
                             inst_id=inst_id,
                             callback=trades_callback,
                         )
+                    # Лучшие цены для ведения лимитных входов (bbo-tbt / books5)
+                    if self.order_chaser and self.order_chaser.enabled:
+                        await self.ws_manager.subscribe(
+                            channel=self.order_chaser.book_channel,
+                            inst_id=inst_id,
+                            callback=book_callback,
+                        )
 
                 logger.info(
                     f"📊 Подписка на тикеры для {len(active_symbols)}/{len(self.scalping_config.symbols)} пар "
@@ -531,12 +685,78 @@ class WebSocketCoordinator:
                     f"⚠️ Ошибка подключения Private WebSocket: {e} (будет использоваться REST API)"
                 )
 
+    def handle_book_data(self, data: dict) -> None:
+        """
+        Лучшие bid/ask из bbo-tbt/books5 -> LimitOrderChaser.
+
+        Формат OKX: data[0] = {"bids": [[px, sz, ...]], "asks": [[px, sz, ...]], "ts"}.
+        """
+        if not self.order_chaser or not data.get("data"):
+            return
+        symbol = data.get("arg", {}).get("instId", "").replace("-SWAP", "")
+        if not self.order_chaser.has_orders(symbol):
+            return
+        book = data["data"][0]
+        try:
+            best_bid = float(book["bids"][0][0])
+            best_ask = float(book["asks"][0][0])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return
+        self.order_chaser.on_book(symbol, best_bid, best_ask)
+
+    async def handle_mark_price_data(self, data: dict) -> None:
+        """
+        Обработка mark-price (heartbeat свежести, OKX шлет каждые ~3с).
+
+        source="MARK_PRICE" (не WEBSOCKET) -> НЕ триггерит _ws_tick_event.
+        """
+        if "data" not in data or not data["data"]:
+            return
+        item = data["data"][0]
+        inst_id = item.get("instId", "") or data.get("arg", {}).get("instId", "")
+        symbol = inst_id.replace("-SWAP", "")
+        mark_px_str = item.get("markPx", "")
+        if not symbol or not mark_px_str:
+            return
+        try:
+            mark_px = float(mark_px_str)
+            if self.portfolio_risk:
+                self.portfolio_risk.update_price(symbol, mark_px)
+            if mark_px > 0 and self.data_registry:
+                await self.data_registry.update_market_data(
+                    symbol,
+                    {
+                        "mark_price": mark_px,
+                        "updated_at": datetime.now(),
+                        "source": "MARK_PRICE",
+                    },
+                )
+        except (ValueError, TypeError):
+            pass
+
+    async def _start_market_bus_consumer(self) -> None:
+        """Воркер шардинга: рыночные данные из MarketBus вместо публичного WS."""
+        from ..sharding import MarketBusConsumer, MarketBusError, MarketBusReader
+
+        try:
+            reader = MarketBusReader(self._market_bus_name)
+        except MarketBusError as e:
+            logger.error(f"❌ MarketBus недоступен, рыночных данных не будет: {e}")
+            return
+        self.market_bus_consumer = MarketBusConsumer(
+            reader,
+            self,
+            self.scalping_config.symbols,
+            poll_interval=self._market_bus_poll_interval,
+        )
+        self.market_bus_consumer.start()
+
+    async def stop_market_bus_consumer(self) -> None:
+        if self.market_bus_consumer:
+            await self.market_bus_consumer.stop()
+            self.market_bus_consumer = None
+
     async def handle_ticker_data(self, symbol: str, data: dict):
-        logger.info(f"handle_ticker_data: {symbol}, data={str(data)[:500]}")
-        now = time.time()
-        # Преобразуем символ из формата OKX (например, BTC-USDT-SWAP) к внутреннему (BTC-USDT)
-        if symbol.endswith("-SWAP"):
-            symbol = symbol.replace("-SWAP", "")
         """
         Обработка данных тикера.
 
@@ -544,6 +764,13 @@ class WebSocketCoordinator:
             symbol: Торговый символ
             data: Данные тикера из WebSocket
         """
+        logger.opt(lazy=True).debug(
+            "handle_ticker_data: {} data={}", lambda: symbol, lambda: str(data)[:500]
+        )
+        now = time.time()
+        # Преобразуем символ из формата OKX (например, BTC-USDT-SWAP) к внутреннему (BTC-USDT)
+        if symbol.endswith("-SWAP"):
+            symbol = symbol.replace("-SWAP", "")
         try:
             # ✅ FIX (22.01.2026): ПРИОРИТЕТ #1 - Обновление market data (price, updated_at)
             # Это должно происходить ВСЕГДА, даже если модули не готовы или тикер дросселирован
@@ -562,18 +789,11 @@ class WebSocketCoordinator:
                         ask_price = float(ticker.get("askPx", price))
 
                         # Создаем объект current_tick для real-time цены
-                        class CurrentTick:
-                            def __init__(self, price, bid, ask, timestamp):
-                                self.price = price
-                                self.bid = bid
-                                self.ask = ask
-                                self.timestamp = timestamp
-
-                        current_tick = CurrentTick(
+                        current_tick = _CurrentTick(
                             price=price,
                             bid=bid_price,
                             ask=ask_price,
-                            timestamp=time.time(),
+                            timestamp=now,
                         )
 
                         # ✅ ОБНОВЛЯЕМ MARKET DATA БЕЗ ЗАДЕРЖЕК
@@ -597,10 +817,17 @@ class WebSocketCoordinator:
                                 "source": "WEBSOCKET",
                             },
                         )
-                        now_ts = time.time()
-                        self._last_ticker_processed_ts[symbol] = now_ts
+                        self._last_ticker_processed_ts[symbol] = now
+                        if self.order_chaser and ask_price > bid_price > 0:
+                            # Запасные цены LimitOrderChaser, если книга молчит
+                            self.order_chaser.on_ticker(symbol, bid_price, ask_price)
+                        if self.portfolio_risk:
+                            self.portfolio_risk.update_price(symbol, price)
                         logger.debug(
-                            f"✅ WS→DataRegistry: {symbol} price=${price:.2f} source=WS ts={now_ts:.3f}"
+                            "✅ WS→DataRegistry: {} price=${:.2f} source=WS ts={:.3f}",
+                            symbol,
+                            price,
+                            now,
                         )
                     except Exception as e:
                         logger.warning(
@@ -619,7 +846,11 @@ class WebSocketCoordinator:
                     )
                     modules_ready = False
 
-            if self.orchestrator and hasattr(self.orchestrator, "all_modules_ready"):
+            if self.orchestrator and hasattr(self.orchestrator, "is_symbol_ready"):
+                # Параллельный старт: символ допускается, как только готовы его данные
+                if not self.orchestrator.is_symbol_ready(symbol):
+                    modules_ready = False
+            elif self.orchestrator and hasattr(self.orchestrator, "all_modules_ready"):
                 if not self.orchestrator.all_modules_ready:
                     modules_ready = False
 
@@ -627,101 +858,36 @@ class WebSocketCoordinator:
             if not modules_ready:
                 return
 
-            # ✅ Адаптивное дросселирование: полная обработка при открытой позиции
-            if symbol not in self._ticker_counter:
-                self._ticker_counter[symbol] = 0
-
-            self._ticker_counter[symbol] += 1
-
-            # ✅ FIX (22.01.2026): Проверяем не только позиции, но и pending ордера
-            # Если по символу есть открытая позиция ИЛИ pending ордер — не дросселируем
+            # ✅ Адаптивное дросселирование: тир по волатильности + бюджет символа,
+            # полная обработка при открытой позиции или pending ордере
             has_open_position = symbol in self.active_positions_ref
-            has_pending_order = False
-
-            # Проверяем pending orders через order_coordinator
-            if hasattr(self, "order_coordinator") and self.order_coordinator:
-                try:
-                    # Проверяем активные лимитные ордера
-                    if hasattr(self.order_coordinator, "active_limit_orders"):
-                        has_pending_order = any(
-                            order_info.get("symbol") == symbol
-                            for order_info in self.order_coordinator.active_limit_orders.values()
-                        )
-                except Exception as e:
-                    logger.debug(
-                        f"⚠️ Не удалось проверить pending orders для {symbol}: {e}"
-                    )
-
-            # Если есть позиция ИЛИ pending ордер - bypass throttle
-            has_open_position_or_pending = has_open_position or has_pending_order
-
-            effective_throttle = self._ticker_throttle
-            if not has_open_position_or_pending:
-                # Оценка волатильности по последним ценам
-                try:
-                    if (
-                        "data" in data
-                        and len(data["data"]) > 0
-                        and "last" in data["data"][0]
-                    ):
-                        price = float(data["data"][0]["last"])  # предварительно
-                        cache = self._volatility_cache.setdefault(symbol, [])
-                        cache.append((time.time(), price))
-                        # Храним последние ~60 секунд данных
-                        cutoff = time.time() - 60.0
-                        self._volatility_cache[symbol] = [
-                            p for p in cache if p[0] >= cutoff
-                        ]
-                        if len(self._volatility_cache[symbol]) >= 2:
-                            p0 = self._volatility_cache[symbol][0][1]
-                            p1 = self._volatility_cache[symbol][-1][1]
-                            if p0 > 0:
-                                change_pct = abs(p1 - p0) / p0 * 100.0
-                                if change_pct > 0.3:
-                                    effective_throttle = self._throttle_config["high"]
-                                elif change_pct > 0.1:
-                                    effective_throttle = self._throttle_config["medium"]
-                                else:
-                                    effective_throttle = self._throttle_config["low"]
-                except Exception:
-                    effective_throttle = self._ticker_throttle
+            last_price = None
+            if "data" in data and len(data["data"]) > 0:
+                last_price = self._safe_float(data["data"][0].get("last"), 0.0)
+            decision = self.tick_admission.admit(
+                symbol, last_price, has_position=has_open_position, now=now
+            )
 
             # Логируем смену состояния throttle (один раз на изменение)
-            try:
-                state = (
-                    "bypass"
-                    if has_open_position_or_pending
-                    else (
-                        "high"
-                        if effective_throttle == 1
-                        else ("medium" if effective_throttle == 2 else "low")
-                    )
+            if self._last_throttle_state.get(symbol) != decision.state:
+                self._last_throttle_state[symbol] = decision.state
+                logger.info(
+                    f"THROTTLE_STATE {symbol}: {decision.state} "
+                    f"(open_position={has_open_position}, "
+                    f"pending_order={self.tick_admission.has_pending_order(symbol)}, "
+                    f"eff={decision.throttle})"
                 )
-                if self._last_throttle_state.get(symbol) != state:
-                    self._last_throttle_state[symbol] = state
-                    logger.info(
-                        f"THROTTLE_STATE {symbol}: {state} (open_position={has_open_position}, pending_order={has_pending_order}, eff={effective_throttle})"
-                    )
-            except Exception:
-                pass
 
-            if not has_open_position_or_pending and (
-                self._ticker_counter[symbol] % effective_throttle != 0
-            ):
-                time_since_last = now - self._last_ticker_processed_ts.get(symbol, 0)
-                if time_since_last <= self._ticker_force_process_threshold:
-                    # Пропускаем обработку, но логируем редко
-                    if self._ticker_counter[symbol] % (effective_throttle * 10) == 0:
-                        logger.debug(
-                            f"⏭️ Тикер пропущен (адаптивное дросселирование {symbol} 1/{effective_throttle})"
-                        )
-                    return
+            if not decision.admitted:
+                return
+            if decision.reason == "forced":
                 force_log_time = self._last_throttle_force_log_ts.get(symbol, 0)
-                if now - force_log_time > self._ticker_force_process_threshold:
+                if now - force_log_time > self.tick_admission.force_after_sec:
                     self._last_throttle_force_log_ts[symbol] = now
                     logger.warning(
                         f"⚠️ Forced ticker processing for {symbol}: "
-                        f"{time_since_last:.1f}s since last processed tick (throttle 1/{effective_throttle})"
+                        f">{self.tick_admission.force_after_sec:.0f}s since last processed tick "
+                        f"(throttle 1/{decision.throttle})"
                     )
 
             # Извлекаем данные из ответа WebSocket
@@ -743,7 +909,9 @@ class WebSocketCoordinator:
                         start_ts = time.perf_counter()
                         async with self._update_lock:
                             # 1) Обновление свечей
-                            if not self._use_kline_candles:
+                            if not self._use_kline_candles and not (
+                                self._trade_bars_active(symbol)
+                            ):
                                 try:
                                     await self._update_candle_from_ticker(
                                         symbol, price, ticker
@@ -815,7 +983,9 @@ class WebSocketCoordinator:
                                 logger.debug(
                                     f"⚠️ Не удалось обновить FastADX для {symbol}: {e}"
                                 )
-                        dur_ms = int((time.perf_counter() - start_ts) * 1000)
+                        elapsed = time.perf_counter() - start_ts
+                        self.tick_admission.record_cost(symbol, elapsed)
+                        dur_ms = int(elapsed * 1000)
                         if dur_ms > 50:
                             logger.warning(
                                 f"DATA_ATOMIC_UPDATE_SLOW {symbol} took {dur_ms}ms"
@@ -859,11 +1029,15 @@ class WebSocketCoordinator:
                                     if last_5m
                                     else None
                                 )
+                                admission = self.tick_admission.get_symbol_stats(symbol)
                                 logger.info(
                                     f"DATA_HEALTH {symbol} md_age={md_age if md_age is not None else 'N/A'}s "
                                     f"adx_age={adx_age if adx_age is not None else 'N/A'}s "
                                     f"candle1m_age={last1m_age if last1m_age is not None else 'N/A'}s "
-                                    f"candle5m_age={last5m_age if last5m_age is not None else 'N/A'}s"
+                                    f"candle5m_age={last5m_age if last5m_age is not None else 'N/A'}s "
+                                    f"ticks_admitted={admission.get('admitted', 0)} "
+                                    f"dropped_throttle={admission.get('dropped_throttle', 0)} "
+                                    f"dropped_budget={admission.get('dropped_budget', 0)}"
                                 )
                             except Exception as e:
                                 logger.debug(
@@ -871,7 +1045,7 @@ class WebSocketCoordinator:
                                 )
 
                     # Логируем получение данных тикера
-                    logger.info(f"💰 {symbol}: ${price:.2f}")
+                    logger.debug("💰 {}: ${:.2f}", symbol, price)
 
                     # Проверяем TP ПЕРВЫМ, затем Loss Cut, затем TSL
                     # ✅ ИСПРАВЛЕНО (TODO #1): Убрали проверку entry_price - он будет восстановлен в update_trailing_stop_loss()
@@ -1132,6 +1306,7 @@ class WebSocketCoordinator:
                     symbols = []
 
                 stale_ready = []
+                checked = []
                 checked_symbols = 0
 
                 for symbol in symbols:
@@ -1141,6 +1316,7 @@ class WebSocketCoordinator:
                         if self._last_ticker_processed_ts.get(symbol) is None:
                             continue
                         checked_symbols += 1
+                        checked.append(symbol)
 
                         # FIX (2026-02-20): per-symbol max_age (DOGE=90s, SOL=50s, ETH=30s)
                         # Без этого DOGE (OKX шлёт ~30-60s) всегда stale при global=12s
@@ -1165,7 +1341,11 @@ class WebSocketCoordinator:
                     except Exception as e:
                         logger.debug(f"WS watchdog error for {symbol}: {e}")
 
-                if checked_symbols > 0:
+                if checked_symbols > 0 and isinstance(
+                    self.ws_manager, PublicWebSocketPool
+                ):
+                    await self._reconnect_stale_shards(stale_ready, checked)
+                elif checked_symbols > 0:
                     stale_ratio = (
                         len(stale_ready) / float(checked_symbols)
                         if checked_symbols > 0
@@ -1230,6 +1410,70 @@ class WebSocketCoordinator:
                 logger.debug(f"WS watchdog loop error: {e}")
             await asyncio.sleep(self._ws_watchdog_interval)
 
+    async def _reconnect_stale_shards(
+        self, stale_ready: List[str], checked: List[str]
+    ) -> None:
+        """
+        Watchdog для пула соединений: те же условия, что и для одного
+        соединения (доля устаревших, min_symbols, global_consecutive циклов
+        подряд), применяются к каждому шарду отдельно, переподключается
+        только он.
+        """
+        pool = self.ws_manager
+        stale_by_shard: Dict[int, List[str]] = {}
+        checked_by_shard: Dict[int, int] = {}
+        for symbol in checked:
+            for index in pool.shards_of(symbol, channel="tickers"):
+                checked_by_shard[index] = checked_by_shard.get(index, 0) + 1
+                if symbol in stale_ready:
+                    stale_by_shard.setdefault(index, []).append(symbol)
+
+        now = time.time()
+        for index in list(self._ws_watchdog_shard_stale_cycles):
+            if index not in stale_by_shard:
+                self._ws_watchdog_shard_stale_cycles.pop(index, None)
+        for index, stale in stale_by_shard.items():
+            ratio = len(stale) / float(checked_by_shard[index])
+            # Один тихий символ (1/1 на шарде) не повод рвать соединение
+            if (
+                len(stale) < self._ws_watchdog_min_symbols
+                or ratio < self._ws_watchdog_global_stale_ratio
+            ):
+                self._ws_watchdog_shard_stale_cycles.pop(index, None)
+                continue
+            cycles = self._ws_watchdog_shard_stale_cycles.get(index, 0) + 1
+            self._ws_watchdog_shard_stale_cycles[index] = cycles
+            if cycles < self._ws_watchdog_global_consecutive:
+                logger.debug(
+                    f"WS_STALE_WATCHDOG shard{index} stale pending hysteresis: "
+                    f"cycle={cycles}/{self._ws_watchdog_global_consecutive}, "
+                    f"stale={len(stale)}/{checked_by_shard[index]}"
+                )
+                continue
+            key = f"shard{index}"
+            if now - self._last_ws_watchdog_trigger.get(key, 0.0) < (
+                self._ws_watchdog_cooldown
+            ):
+                continue
+            self._last_ws_watchdog_trigger[key] = now
+            self._ws_watchdog_shard_stale_cycles[index] = 0
+            for symbol in stale:
+                self._ws_watchdog_stale_counts[symbol] = 0
+            logger.warning(
+                f"WS_STALE_WATCHDOG shard{index}: stale={len(stale)}/"
+                f"{checked_by_shard[index]} ({ratio:.0%}), "
+                f"symbols={','.join(stale[:5])}, forcing shard reconnect"
+            )
+            if self.slo_monitor:
+                try:
+                    self.slo_monitor.record_event("ws_stale_watchdog")
+                except Exception:
+                    pass
+            await self.force_reconnect(
+                reason=f"ws_stale_watchdog_shard{index} ratio={ratio:.2f}",
+                symbols=stale,
+            )
+
     def _ensure_rest_candle_polling(self):
         if self._rest_candle_task or not self.client:
             return
@@ -1552,6 +1796,8 @@ class WebSocketCoordinator:
             self._ws_positions_last_ts = time.time()
             if self.data_registry:
                 self.data_registry.update_ws_positions_ts()
+            if self.account_state:
+                self.account_state.apply_positions(positions_data)
 
             for position_data in positions_data:
                 symbol = position_data.get("instId", "").replace("-SWAP", "")
@@ -1729,6 +1975,19 @@ class WebSocketCoordinator:
                             symbol, order_id, order_cache_data
                         )
 
+                    # Индекс pending-ордеров для допуска тикеров (bypass дросселирования)
+                    self.tick_admission.on_order_update(symbol, order_id, state)
+
+                    # Исполнение биржевого стопа приходит ордером с algoId
+                    if self.exchange_stops:
+                        self.exchange_stops.on_order_update(order_data)
+
+                    # Комиссия, проскальзывание и исполнение лимиток по нашим fill'ам
+                    if self.execution_costs:
+                        self.execution_costs.on_order_update(order_data)
+                    if self.order_chaser:
+                        self.order_chaser.on_order_update(order_data)
+
                     # Если ордер исполнен или отменен - логируем
                     if state in ["filled", "canceled", "partially_filled"]:
                         logger.debug(
@@ -1756,6 +2015,8 @@ class WebSocketCoordinator:
         """
         try:
             self._ws_account_last_ts = time.time()
+            if self.account_state:
+                self.account_state.apply_account(account_data)
 
             for account in account_data:
                 details = account.get("details", [])
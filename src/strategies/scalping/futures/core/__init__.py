@@ -2,21 +2,42 @@
 Core модули - ядро системы управления торговлей.
 
 Модули:
+- account_state: Снимок аккаунта (equity, маржа, позиции) из private WS
+- bar_builder: Свечи всех таймфреймов из потока сделок (VWAP, CVD)
 - candle_buffer: Циклический буфер для хранения свечей
 - data_registry: Единый реестр всех данных (market data, indicators, regimes, balance)
 - position_registry: Единый реестр всех позиций (position + metadata)
 - position_sync: Синхронизация позиций с биржей
+- private_event_pipeline: Приоритетная доставка событий private WS
+- recovery_planner: Параллельный старт и восстановление после reconnect
+- tick_admission: Допуск тикеров к полной обработке (дросселирование, бюджеты)
 """
 
+from .account_state import AccountSnapshot, AccountStateCache, PositionState
+from .bar_builder import BarCloseEvent, TradeBar, TradeBarBuilder
 from .candle_buffer import CandleBuffer
 from .data_registry import DataRegistry
 from .position_registry import PositionMetadata, PositionRegistry
 from .position_sync import PositionSync
+from .private_event_pipeline import PrivateEventPipeline
+from .recovery_planner import RecoveryPlanner, RecoveryStep, RestRateLimiter
+from .tick_admission import TickAdmissionController
 
 __all__ = [
+    "AccountSnapshot",
+    "AccountStateCache",
+    "BarCloseEvent",
     "CandleBuffer",
     "DataRegistry",
     "PositionRegistry",
     "PositionMetadata",
+    "PositionState",
     "PositionSync",
+    "PrivateEventPipeline",
+    "RecoveryPlanner",
+    "RecoveryStep",
+    "RestRateLimiter",
+    "TickAdmissionController",
+    "TradeBar",
+    "TradeBarBuilder",
 ]
@@ -0,0 +1,336 @@
+"""
+AccountStateCache - единый снимок состояния аккаунта для риск-модулей.
+
+Equity, доступная и использованная маржа, позиции (плечо, маржа, цена
+ликвидации) обновляются из приватных каналов account и positions. Каждое
+обновление публикует новый неизменяемый AccountSnapshot с version + 1, поэтому
+читатель всегда видит согласованный срез без блокировок.
+
+Чтение с ограниченной свежестью: get_*(max_age=...) отдает снимок из памяти,
+если его часть (баланс или позиции) не старше max_age, иначе один раз сверяет
+ее по REST - параллельные читатели ждут тот же запрос (single-flight).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from loguru import logger
+
+_POSITION_EPS = 1e-8
+
+
+def _float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value) if value not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class PositionState:
+    """Позиция из канала positions / REST account/positions."""
+
+    symbol: str
+    size: float  # pos (контракты, со знаком в net mode)
+    side: str  # long / short
+    leverage: float
+    margin: float
+    liq_px: float
+    avg_px: float
+    mark_px: float
+    upl: float
+    raw: Mapping[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_okx(cls, data: Dict[str, Any]) -> "PositionState":
+        size = _float(data.get("pos"))
+        side = str(data.get("posSide") or "").lower()
+        if side not in ("long", "short"):
+            side = "long" if size >= 0 else "short"
+        return cls(
+            symbol=str(data.get("instId", "")).replace("-SWAP", ""),
+            size=size,
+            side=side,
+            leverage=_float(data.get("lever")),
+            # В cross-режиме margin пустой - используем начальную маржу (imr)
+            margin=_float(data.get("margin")) or _float(data.get("imr")),
+            liq_px=_float(data.get("liqPx")),
+            avg_px=_float(data.get("avgPx")),
+            mark_px=_float(data.get("markPx")),
+            upl=_float(data.get("upl")),
+            raw=MappingProxyType(dict(data)),
+        )
+
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """Согласованный срез аккаунта; новые данные - новый снимок."""
+
+    version: int = 0
+    equity: Optional[float] = None
+    available: Optional[float] = None
+    positions: Mapping[str, PositionState] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    balance_ts: float = 0.0  # time.monotonic() последнего обновления баланса
+    positions_ts: float = 0.0
+    balance_source: str = ""
+    positions_source: str = ""
+
+    @property
+    def used_margin(self) -> float:
+        return sum(position.margin for position in self.positions.values())
+
+    def position(self, symbol: str) -> Optional[PositionState]:
+        return self.positions.get(symbol)
+
+    def leverage(self, symbol: str) -> Optional[float]:
+        position = self.positions.get(symbol)
+        return position.leverage if position and position.leverage > 0 else None
+
+    def balance_age(self, now: Optional[float] = None) -> float:
+        if not self.balance_ts:
+            return float("inf")
+        return (now or time.monotonic()) - self.balance_ts
+
+    def positions_age(self, now: Optional[float] = None) -> float:
+        if not self.positions_ts:
+            return float("inf")
+        return (now or time.monotonic()) - self.positions_ts
+
+
+class AccountStateCache:
+    """
+    Снимок аккаунта из private WS с REST-сверкой по устареванию.
+
+    Использование:
+        cache = AccountStateCache(client, {"max_age_sec": 15})
+        cache.apply_account(account_data)      # из канала account
+        cache.apply_positions(positions_data)  # из канала positions
+        equity = await cache.get_equity()
+        positions = await cache.get_positions("BTC-USDT", max_age=3.0)
+    """
+
+    def __init__(self, client=None, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            client: OKXFuturesClient для сверки (get_balance / get_positions)
+            config: Секция scalping.account_state
+        """
+        cfg = config or {}
+        self.client = client
+        self.max_age_sec = float(cfg.get("max_age_sec", 15.0))
+        self.currency = str(cfg.get("currency", "USDT"))
+        self._snapshot = AccountSnapshot()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._listeners: List[Callable[[AccountSnapshot], None]] = []
+        self.stats: Dict[str, int] = {
+            "ws_account_updates": 0,
+            "ws_position_updates": 0,
+            "memory_reads": 0,
+            "rest_balance": 0,
+            "rest_positions": 0,
+            "rest_errors": 0,
+        }
+
+    @property
+    def snapshot(self) -> AccountSnapshot:
+        """Текущий снимок без проверки свежести."""
+        return self._snapshot
+
+    def subscribe(self, callback: Callable[[AccountSnapshot], None]) -> None:
+        """Вызывать callback(snapshot) синхронно при каждой публикации снимка."""
+        self._listeners.append(callback)
+
+    def apply_account(self, account_data: List[Dict[str, Any]]) -> bool:
+        """Обновить equity/available из канала account. True - баланс найден."""
+        for account in account_data or []:
+            for detail in account.get("details", []) or []:
+                if detail.get("ccy") != self.currency:
+                    continue
+                equity = _float(detail.get("eq"))
+                if equity <= 0:
+                    return False
+                available = _float(detail.get("availEq")) or _float(
+                    detail.get("availBal")
+                )
+                self.stats["ws_account_updates"] += 1
+                self._publish_balance(equity, available, "ACCOUNT_WS")
+                return True
+        return False
+
+    def apply_positions(self, positions_data: List[Dict[str, Any]]) -> None:
+        """Инкрементально применить обновления канала positions."""
+        positions = dict(self._snapshot.positions)
+        for data in positions_data or []:
+            state = PositionState.from_okx(data)
+            if not state.symbol:
+                continue
+            if abs(state.size) < _POSITION_EPS:
+                positions.pop(state.symbol, None)
+            else:
+                positions[state.symbol] = state
+        self.stats["ws_position_updates"] += 1
+        self._publish_positions(positions, "POSITIONS_WS")
+
+    def replace_positions(
+        self, positions_data: List[Dict[str, Any]], source: str = "REST"
+    ) -> None:
+        """Полный список позиций (REST): заменяет снимок позиций целиком."""
+        positions = {}
+        for data in positions_data or []:
+            state = PositionState.from_okx(data)
+            if state.symbol and abs(state.size) >= _POSITION_EPS:
+                positions[state.symbol] = state
+        self._publish_positions(positions, source)
+
+    async def get(self, max_age: Optional[float] = None) -> AccountSnapshot:
+        """Снимок, в котором и баланс, и позиции не старше max_age."""
+        max_age = self.max_age_sec if max_age is None else max_age
+        now = time.monotonic()
+        snapshot = self._snapshot
+        pending = []
+        if snapshot.balance_age(now) > max_age:
+            pending.append(self._refresh("balance"))
+        if snapshot.positions_age(now) > max_age:
+            pending.append(self._refresh("positions"))
+        if not pending:
+            self.stats["memory_reads"] += 1
+            return snapshot
+        await asyncio.gather(*pending, return_exceptions=True)
+        return self._snapshot
+
+    async def get_equity(self, max_age: Optional[float] = None) -> Optional[float]:
+        snapshot = self._snapshot
+        max_age = self.max_age_sec if max_age is None else max_age
+        if snapshot.balance_age() > max_age:
+            await self._refresh("balance")
+            snapshot = self._snapshot
+        else:
+            self.stats["memory_reads"] += 1
+        return snapshot.equity
+
+    async def get_position(
+        self, symbol: str, max_age: Optional[float] = None
+    ) -> Optional[PositionState]:
+        snapshot = await self._positions_snapshot(max_age)
+        return snapshot.positions.get(symbol)
+
+    async def get_positions(
+        self, symbol: Optional[str] = None, max_age: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Открытые позиции в формате OKX (как client.get_positions).
+
+        Можно подставлять вместо REST-вызова: разбор полей у вызывающего
+        кода не меняется.
+        """
+        snapshot = await self._positions_snapshot(max_age)
+        if symbol:
+            position = snapshot.positions.get(symbol)
+            return [dict(position.raw)] if position else []
+        return [dict(position.raw) for position in snapshot.positions.values()]
+
+    async def get_used_margin(self, max_age: Optional[float] = None) -> float:
+        snapshot = await self._positions_snapshot(max_age)
+        return snapshot.used_margin
+
+    async def reconcile(self) -> AccountSnapshot:
+        """Принудительная сверка баланса и позиций по REST."""
+        await asyncio.gather(
+            self._refresh("balance"), self._refresh("positions"), return_exceptions=True
+        )
+        return self._snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        stats: Dict[str, Any] = dict(self.stats)
+        stats.update(
+            version=snapshot.version,
+            positions=len(snapshot.positions),
+            balance_age_sec=round(snapshot.balance_age(), 3),
+            positions_age_sec=round(snapshot.positions_age(), 3),
+            balance_source=snapshot.balance_source,
+            positions_source=snapshot.positions_source,
+        )
+        return stats
+
+    async def _positions_snapshot(self, max_age: Optional[float]) -> AccountSnapshot:
+        max_age = self.max_age_sec if max_age is None else max_age
+        if self._snapshot.positions_age() > max_age:
+            await self._refresh("positions")
+        else:
+            self.stats["memory_reads"] += 1
+        return self._snapshot
+
+    async def _refresh(self, part: str) -> None:
+        """REST-сверка части снимка; одновременные вызовы ждут один запрос."""
+        if self.client is None:
+            return
+        future = self._inflight.get(part)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(part))
+            self._inflight[part] = future
+            future.add_done_callback(lambda _: self._inflight.pop(part, None))
+        try:
+            await asyncio.shield(future)
+        except Exception as e:
+            logger.debug(f"⚠️ AccountStateCache: REST-сверка {part} не удалась: {e}")
+
+    async def _fetch(self, part: str) -> None:
+        try:
+            if part == "balance":
+                equity = await self.client.get_balance()
+                self.stats["rest_balance"] += 1
+                if equity and equity > 0:
+                    self._publish_balance(equity, self._snapshot.available, "REST")
+            else:
+                positions = await self.client.get_positions()
+                self.stats["rest_positions"] += 1
+                self.replace_positions(positions)
+        except Exception:
+            self.stats["rest_errors"] += 1
+            raise
+
+    def _publish_balance(
+        self, equity: float, available: Optional[float], source: str
+    ) -> None:
+        old = self._snapshot
+        self._snapshot = AccountSnapshot(
+            version=old.version + 1,
+            equity=equity,
+            available=available,
+            positions=old.positions,
+            balance_ts=time.monotonic(),
+            positions_ts=old.positions_ts,
+            balance_source=source,
+            positions_source=old.positions_source,
+        )
+        self._notify()
+
+    def _publish_positions(
+        self, positions: Dict[str, PositionState], source: str
+    ) -> None:
+        old = self._snapshot
+        self._snapshot = AccountSnapshot(
+            version=old.version + 1,
+            equity=old.equity,
+            available=old.available,
+            positions=MappingProxyType(positions),
+            balance_ts=old.balance_ts,
+            positions_ts=time.monotonic(),
+            balance_source=old.balance_source,
+            positions_source=source,
+        )
+        self._notify()
+
+    def _notify(self) -> None:
+        snapshot = self._snapshot
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.debug(f"⚠️ AccountStateCache: ошибка подписчика: {e}")
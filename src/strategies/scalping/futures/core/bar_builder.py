@@ -0,0 +1,339 @@
+"""
+TradeBarBuilder - Свечи всех таймфреймов из потока сделок (trades).
+
+Один проход по сделке обновляет формирующиеся бары всех таймфреймов:
+OHLC, реальный проторгованный объем, объем покупок/продаж, VWAP и
+кумулятивную дельту (CVD). При переходе сделки в новый интервал бар
+закрывается и подписчики получают BarCloseEvent.
+
+Границы интервалов считаются целочисленно от timestamp сделки (мс), без
+datetime и без обращений к DataRegistry на каждую сделку. Как и свечи OKX
+(bar=1D по REST и kline), интервалы выровнены по времени Гонконга (UTC+8):
+день начинается в 16:00 UTC, неделя - в понедельник 00:00 UTC+8. Таймфреймы
+с суффиксом utc ("1Dutc") выровнены по UTC.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from src.models import OHLCV
+
+DEFAULT_TIMEFRAMES: Tuple[str, ...] = ("1m", "5m", "1H", "1D")
+
+_UNIT_SECONDS = {"s": 1, "m": 60, "H": 3600, "D": 86400, "W": 604800}
+_HK_OFFSET_MS = 8 * 3600 * 1000  # Свечи OKX без суффикса utc - по UTC+8
+_MONDAY_PHASE_MS = 4 * 86400 * 1000  # 1970-01-01 - четверг, недели с понедельника
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """'1m' -> 60, '4H' -> 14400, '1D' / '1Dutc' -> 86400 (формат OKX)."""
+    base = timeframe[:-3] if timeframe.endswith("utc") else timeframe
+    unit = _UNIT_SECONDS.get(base[-1:])
+    count = base[:-1]
+    if unit is None or not count.isdigit() or int(count) <= 0:
+        raise ValueError(f"Unsupported timeframe: {timeframe!r}")
+    return int(count) * unit
+
+
+def timeframe_phase_ms(timeframe: str) -> int:
+    """Сдвиг границ интервалов OKX: начало = ts - (ts + phase) % interval."""
+    utc = timeframe.endswith("utc")
+    phase = 0 if utc else _HK_OFFSET_MS
+    if (timeframe[:-3] if utc else timeframe).endswith("W"):
+        phase -= _MONDAY_PHASE_MS
+    return phase
+
+
+def bucket_start(ts_ms: int, timeframe: str) -> int:
+    """Начало интервала таймфрейма, в который попадает ts_ms (мс)."""
+    interval = timeframe_seconds(timeframe) * 1000
+    return ts_ms - (ts_ms + timeframe_phase_ms(timeframe)) % interval
+
+
+class TradeBar:
+    """Бар, собранный из сделок. Время открытия — в миллисекундах."""
+
+    __slots__ = (
+        "start_ms",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "buy_volume",
+        "sell_volume",
+        "notional",
+        "trades",
+        "cvd",
+    )
+
+    def __init__(self, start_ms: int, price: float):
+        self.start_ms = start_ms
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = 0.0
+        self.buy_volume = 0.0
+        self.sell_volume = 0.0
+        self.notional = 0.0  # Σ price × size
+        self.trades = 0
+        self.cvd = 0.0  # кумулятивная дельта символа на последней сделке бара
+
+    @property
+    def timestamp(self) -> int:
+        """Время открытия в секундах (как у OHLCV в DataRegistry)."""
+        return self.start_ms // 1000
+
+    @property
+    def vwap(self) -> float:
+        return self.notional / self.volume if self.volume > 0 else self.close
+
+    @property
+    def delta(self) -> float:
+        return self.buy_volume - self.sell_volume
+
+    def to_ohlcv(self, symbol: str, timeframe: str) -> OHLCV:
+        return OHLCV(
+            timestamp=self.timestamp,
+            symbol=symbol,
+            open=self.open,
+            high=self.high,
+            low=self.low,
+            close=self.close,
+            volume=self.volume,
+            timeframe=timeframe,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"TradeBar(ts={self.timestamp}, o={self.open}, h={self.high}, "
+            f"l={self.low}, c={self.close}, v={self.volume}, vwap={self.vwap:.6f}, "
+            f"delta={self.delta}, cvd={self.cvd})"
+        )
+
+
+@dataclass
+class BarCloseEvent:
+    """Закрытие бара: следующая сделка пришла в новый интервал."""
+
+    symbol: str
+    timeframe: str
+    bar: TradeBar
+
+
+class TradeBarBuilder:
+    """
+    Построитель баров по сделкам для всех символов.
+
+    Example:
+        >>> builder = TradeBarBuilder(("1m", "5m"))
+        >>> builder.subscribe(on_close)
+        >>> events = builder.handle_trades_message("BTC-USDT", okx_trades_message)
+        >>> await builder.publish(events)
+    """
+
+    def __init__(self, timeframes: Iterable[str] = DEFAULT_TIMEFRAMES):
+        """
+        Args:
+            timeframes: Таймфреймы в формате OKX ("1m", "5m", "1H", "1D")
+        """
+        self.timeframes: Tuple[str, ...] = tuple(timeframes)
+        # (timeframe, интервал в мс, сдвиг границ) — готово для горячего цикла
+        self._intervals: Tuple[Tuple[str, int, int], ...] = tuple(
+            (tf, timeframe_seconds(tf) * 1000, timeframe_phase_ms(tf))
+            for tf in self.timeframes
+        )
+        # symbol -> timeframe -> формирующийся бар
+        self._bars: Dict[str, Dict[str, TradeBar]] = {}
+        self._cvd: Dict[str, float] = {}
+        self._last_trade_ms: Dict[str, int] = {}
+        self._last_update: Dict[str, float] = {}  # symbol -> time.time() приема
+        self._subscribers: List[Callable[[BarCloseEvent], Any]] = []
+        self.stats = {"trades": 0, "late_trades": 0, "closed_bars": 0, "bad_rows": 0}
+
+    # ==================== ПОДПИСКИ ====================
+
+    def subscribe(self, callback: Callable[[BarCloseEvent], Any]) -> None:
+        """Подписаться на закрытие баров (sync или async callback)."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[BarCloseEvent], Any]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    async def publish(self, events: List[BarCloseEvent]) -> None:
+        """Разослать события подписчикам; ошибка одного не мешает остальным."""
+        for event in events:
+            for callback in list(self._subscribers):
+                try:
+                    result = callback(event)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.warning(
+                        f"⚠️ TradeBarBuilder: ошибка подписчика на {event.symbol} "
+                        f"{event.timeframe}: {e}"
+                    )
+
+    # ==================== ОБНОВЛЕНИЕ ====================
+
+    def update(
+        self, symbol: str, trades: Iterable[Tuple[int, float, float, str]]
+    ) -> List[BarCloseEvent]:
+        """
+        Применить сделки символа (старые -> новые).
+
+        Args:
+            symbol: Торговый символ
+            trades: (ts_ms, price, size, side), side = "buy" / "sell"
+
+        Returns:
+            Закрытые бары (в порядке закрытия)
+        """
+        bars = self._bars.get(symbol)
+        if bars is None:
+            bars = self._bars[symbol] = {}
+        cvd = self._cvd.get(symbol, 0.0)
+        last_ms = self._last_trade_ms.get(symbol, 0)
+        closed: List[BarCloseEvent] = []
+        intervals = self._intervals
+        applied = 0
+
+        for ts_ms, price, size, side in trades:
+            is_buy = side == "buy"
+            is_sell = side == "sell"
+            if is_buy:
+                cvd += size
+            elif is_sell:
+                cvd -= size
+            if ts_ms > last_ms:
+                last_ms = ts_ms
+            applied += 1
+            notional = price * size
+
+            for timeframe, interval, phase in intervals:
+                start = ts_ms - (ts_ms + phase) % interval
+                bar = bars.get(timeframe)
+                if bar is None or start > bar.start_ms:
+                    if bar is not None:
+                        closed.append(BarCloseEvent(symbol, timeframe, bar))
+                    bar = bars[timeframe] = TradeBar(start, price)
+                elif start < bar.start_ms:
+                    # Сделка из уже закрытого интервала (переупорядочивание WS)
+                    self.stats["late_trades"] += 1
+                    continue
+                else:
+                    if price > bar.high:
+                        bar.high = price
+                    elif price < bar.low:
+                        bar.low = price
+                    bar.close = price
+                bar.volume += size
+                bar.notional += notional
+                if is_buy:
+                    bar.buy_volume += size
+                elif is_sell:
+                    bar.sell_volume += size
+                bar.trades += 1
+                bar.cvd = cvd
+
+        if applied:
+            self._cvd[symbol] = cvd
+            self._last_trade_ms[symbol] = last_ms
+            self._last_update[symbol] = time.time()
+            self.stats["trades"] += applied
+            self.stats["closed_bars"] += len(closed)
+        return closed
+
+    def seed(self, symbol: str, timeframe: str, candle: Any) -> bool:
+        """
+        Начать формирующийся бар с уже известной свечи (REST/DataRegistry).
+
+        Без этого первая сделка периода открывает новый бар, и его OHLC и
+        объем покрывают только сделки с момента старта бота. Сделки этого
+        же интервала продолжают засеянный бар. Покупки/продажи и CVD по
+        засеянной части неизвестны; VWAP для нее оценивается по (H+L+C)/3.
+
+        Returns:
+            True если бар засеян (таймфрейм известен и бара еще нет)
+        """
+        spec = {tf: (interval, phase) for tf, interval, phase in self._intervals}
+        bars = self._bars.setdefault(symbol, {})
+        if timeframe not in spec or timeframe in bars:
+            return False
+        interval, phase = spec[timeframe]
+        start_ms = int(candle.timestamp) * 1000
+        if (start_ms + phase) % interval:
+            return False
+        bar = TradeBar(start_ms, float(candle.open))
+        bar.high = float(candle.high)
+        bar.low = float(candle.low)
+        bar.close = float(candle.close)
+        bar.volume = float(candle.volume or 0.0)
+        bar.notional = bar.volume * (bar.high + bar.low + bar.close) / 3
+        bar.cvd = self._cvd.get(symbol, 0.0)
+        bars[timeframe] = bar
+        return True
+
+    def handle_trades_message(self, symbol: str, data: dict) -> List[BarCloseEvent]:
+        """Разобрать сообщение OKX канала trades и применить сделки."""
+        return self.update(symbol, self.parse_okx_trades(data.get("data") or []))
+
+    def parse_okx_trades(
+        self, rows: Iterable[Dict[str, Any]]
+    ) -> List[Tuple[int, float, float, str]]:
+        """OKX trades rows ({px, sz, side, ts}) -> сделки по возрастанию ts."""
+        trades = []
+        for row in rows:
+            try:
+                ts_ms = int(row["ts"])
+                price = float(row["px"])
+                size = float(row["sz"])
+            except (KeyError, TypeError, ValueError):
+                self.stats["bad_rows"] += 1
+                continue
+            if price <= 0 or size <= 0:
+                self.stats["bad_rows"] += 1
+                continue
+            trades.append((ts_ms, price, size, str(row.get("side", "")).lower()))
+        # OKX может прислать пачку от новых к старым
+        if len(trades) > 1 and trades[0][0] > trades[-1][0]:
+            trades.sort(key=lambda trade: trade[0])
+        return trades
+
+    def forget(self, symbol: str) -> None:
+        """Сбросить состояние символа (например, после реконнекта WS)."""
+        self._bars.pop(symbol, None)
+        self._cvd.pop(symbol, None)
+        self._last_trade_ms.pop(symbol, None)
+        self._last_update.pop(symbol, None)
+
+    # ==================== ЗАПРОСЫ ====================
+
+    def get_bar(self, symbol: str, timeframe: str) -> Optional[TradeBar]:
+        """Формирующийся бар (или None, если сделок еще не было)."""
+        return self._bars.get(symbol, {}).get(timeframe)
+
+    def get_bars(self, symbol: str) -> Dict[str, TradeBar]:
+        return dict(self._bars.get(symbol, {}))
+
+    def get_cvd(self, symbol: str) -> float:
+        return self._cvd.get(symbol, 0.0)
+
+    def is_fresh(self, symbol: str, max_age: float) -> bool:
+        """Были ли сделки по символу за последние max_age секунд."""
+        updated = self._last_update.get(symbol)
+        return updated is not None and time.time() - updated <= max_age
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "symbols": len(self._bars),
+            "timeframes": list(self.timeframes),
+        }
@@ -34,7 +34,7 @@ class CandleBuffer:
         self._candles: List[OHLCV] = []
         self._lock = asyncio.Lock()
 
-    async def add_candle(self, candle: OHLCV) -> None:
+    async def add_candle(self, candle: OHLCV) -> bool:
         """
         Добавить новую свечу в буфер.
 
@@ -43,6 +43,9 @@ class CandleBuffer:
 
         Args:
             candle: Свеча OHLCV
+
+        Returns:
+            True если свеча добавлена
         """
         async with self._lock:
             last_ts = getattr(self._candles[-1], "timestamp", None) if self._candles else None
@@ -52,12 +55,12 @@ class CandleBuffer:
             if last_ts is not None and new_ts is not None:
                 if new_ts == last_ts:
                     # logger.debug(f"⏩ CandleBuffer: Дубликат свечи по timestamp {new_ts} — не добавлен")
-                    return
+                    return False
                 if new_ts < last_ts:
                     logger.debug(
                         f"⏩ CandleBuffer: out-of-order candle ignored (ts={new_ts}, last_ts={last_ts})"
                     )
-                    return
+                    return False
             self._candles.append(candle)
 
             # Если превышен max_size, удаляем самую старую свечу
@@ -66,6 +69,7 @@ class CandleBuffer:
                 # DEBUG логирование отключено - слишком много вывода, убивает бота
                 # Включить только если нужна отладка конкретного буфера
                 # logger.debug(f"📊 CandleBuffer: Удалена старая свеча ...")
+            return True
 
     async def update_last_candle(
         self,
@@ -106,6 +110,33 @@ class CandleBuffer:
 
             return True
 
+    async def upsert_candle(self, candle: OHLCV) -> bool:
+        """
+        Заменить формирующуюся свечу с тем же timestamp или добавить новую.
+
+        В отличие от update_last_candle значения берутся как есть (источник
+        уже агрегировал high/low/volume), open тоже обновляется.
+
+        Returns:
+            True если добавлена новая свеча, False если обновлена/отброшена
+        """
+        async with self._lock:
+            if self._candles:
+                last = self._candles[-1]
+                if candle.timestamp == last.timestamp:
+                    last.open = candle.open
+                    last.high = candle.high
+                    last.low = candle.low
+                    last.close = candle.close
+                    last.volume = candle.volume
+                    return False
+                if candle.timestamp < last.timestamp:
+                    return False
+            self._candles.append(candle)
+            if len(self._candles) > self.max_size:
+                self._candles.pop(0)
+            return True
+
     async def get_candles(self) -> List[OHLCV]:
         """
         Получить все свечи из буфера.
@@ -17,6 +17,14 @@ from typing import Any, Dict, List, Optional
 from loguru import logger
 
 from src.models import OHLCV
+from src.utils.derived_cache import (
+    CacheRegistry,
+    DependencyVersions,
+    DerivedCache,
+    candles_dep,
+    indicators_dep,
+    regime_dep,
+)
 
 from .candle_buffer import CandleBuffer
 
@@ -82,6 +90,9 @@ class DataRegistry:
         self._margin: Optional[Dict[str, Any]] = None
         self._candle_buffers: Dict[str, Dict[str, CandleBuffer]] = {}
         self._lock = asyncio.Lock()
+        # Версии данных для производных кэшей (инвалидация по событию, а не по TTL)
+        self.versions = DependencyVersions()
+        self.caches = CacheRegistry(self.versions)
         # 🔇 Для условного логирования баланса (только при значительном изменении)
         self._last_logged_balance: Optional[float] = None
         # FIX (2026-02-21): timestamp последнего WS positions обновления (из handle_private_ws_positions)
@@ -653,6 +664,7 @@ class DataRegistry:
 
             self._indicators[symbol][indicator_name] = value
             self._indicators[symbol]["updated_at"] = datetime.now()
+            self.versions.bump(indicators_dep(symbol))
 
             logger.debug(
                 f"✅ DataRegistry: Обновлен индикатор {indicator_name} для {symbol}"
@@ -672,6 +684,7 @@ class DataRegistry:
 
             self._indicators[symbol].update(indicators)
             self._indicators[symbol]["updated_at"] = datetime.now()
+            self.versions.bump(indicators_dep(symbol))
 
             logger.debug(f"✅ DataRegistry: Обновлены индикаторы для {symbol}")
 
@@ -747,6 +760,8 @@ class DataRegistry:
             if symbol not in self._regimes:
                 self._regimes[symbol] = {}
 
+            if self._regimes[symbol].get("regime") != regime:
+                self.versions.bump(regime_dep(symbol))
             self._regimes[symbol]["regime"] = regime
             if params:
                 self._regimes[symbol]["params"] = params.copy()
@@ -1025,7 +1040,9 @@ class DataRegistry:
                 )
 
             # Добавляем свечу в буфер
-            await self._candle_buffers[symbol][timeframe].add_candle(candle)
+            if await self._candle_buffers[symbol][timeframe].add_candle(candle):
+                # Новая свеча = предыдущая закрылась
+                self.versions.bump(candles_dep(symbol, timeframe))
 
             # ✅ P0-1 FIX: Сбрасываем stale флаг при получении свежей свечи
             # Проверяем, что свеча свежая (не старше 2 минут)
@@ -1073,6 +1090,52 @@ class DataRegistry:
             buffer = self._candle_buffers[symbol][timeframe]
             return await buffer.update_last_candle(high, low, close, volume)
 
+    async def upsert_candles(self, symbol: str, candles: List[OHLCV]) -> List[str]:
+        """
+        Записать свечи нескольких таймфреймов символа за один захват lock.
+
+        Свеча с timestamp последней свечи буфера заменяет ее (формирующаяся),
+        более новая добавляется. Таймфрейм берется из candle.timeframe.
+
+        Args:
+            symbol: Торговый символ
+            candles: Свечи (по одной на таймфрейм)
+
+        Returns:
+            Таймфреймы, в которых добавилась новая свеча
+        """
+        opened: List[str] = []
+        async with self._lock:
+            buffers = self._candle_buffers.setdefault(symbol, {})
+            for candle in candles:
+                timeframe = candle.timeframe
+                buffer = buffers.get(timeframe)
+                if buffer is None:
+                    buffer = buffers[timeframe] = CandleBuffer(
+                        max_size=200 if timeframe == "1m" else 100
+                    )
+                if await buffer.upsert_candle(candle):
+                    opened.append(timeframe)
+                    self.versions.bump(candles_dep(symbol, timeframe))
+                    if time.time() - float(candle.timestamp) < 120:
+                        self.clear_candle_buffer_stale(symbol, timeframe)
+        return opened
+
+    # ==================== DERIVED CACHES ====================
+
+    def derived_cache(self, name: str, max_entries: int = 256) -> DerivedCache:
+        """
+        Именованный кэш производных данных, привязанный к версиям реестра.
+
+        Значение кэша объявляет зависимости (candles_dep/regime_dep/indicators_dep)
+        и инвалидируется, когда реестр повышает их версию.
+        """
+        return self.caches.cache(name, max_entries=max_entries)
+
+    def get_cache_stats(self, with_memory: bool = True) -> Dict[str, Any]:
+        """Hit/miss, записи и память всех производных кэшей."""
+        return self.caches.get_stats(with_memory=with_memory)
+
     async def get_candles(self, symbol: str, timeframe: str) -> List[OHLCV]:
         """
         Получить все свечи для символа и таймфрейма.
@@ -1150,6 +1213,7 @@ class DataRegistry:
             # Добавляем все свечи
             for candle in candles:
                 await buffer.add_candle(candle)
+            self.versions.bump(candles_dep(symbol, timeframe))
 
             # ✅ P0-1 FIX: Проверяем свежесть последней свечи
             if candles:
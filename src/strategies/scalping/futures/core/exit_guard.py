@@ -39,6 +39,7 @@ class ExitGuard:
     DEFAULT_NON_CRITICAL_CONFIRMATIONS = 2
     DEFAULT_NON_CRITICAL_CONFIRM_WINDOW_SEC = 3.0
     POSITION_SIZE_EPS = 1e-8
+    SYNC_MAX_AGE_SEC = 3.0  # Допустимый возраст снимка позиций при сверке
 
     def __init__(
         self,
@@ -47,11 +48,15 @@ class ExitGuard:
         position_registry: Optional[Any] = None,
         client: Optional[Any] = None,
         parameter_provider: Optional[Any] = None,
+        account_state: Optional[Any] = None,
     ) -> None:
         self.data_registry = data_registry
         self.position_registry = position_registry
         self.client = client
         self.parameter_provider = parameter_provider
+        self.account_state = account_state
+        # ExecutionCostModel: комиссия + проскальзывание круга по нашим fill'ам
+        self.execution_costs: Optional[Any] = None
 
         self.stale_thresholds = dict(self.DEFAULT_STALE_THRESHOLDS)
         self.critical_exceptions = set(self.DEFAULT_CRITICAL_EXCEPTIONS)
@@ -177,7 +182,7 @@ class ExitGuard:
             if not allowed:
                 return False, block
 
-            allowed, block = self._check_fee_edge(reason, payload)
+            allowed, block = self._check_fee_edge(reason, payload, symbol)
             if not allowed:
                 return False, block
 
@@ -287,8 +292,22 @@ class ExitGuard:
         )
         return any(token in reason_l for token in protective_tokens)
 
+    def round_trip_fee_rate(self, symbol: Optional[str] = None) -> float:
+        """
+        Стоимость круга (доля notional): выученная по нашим исполнениям,
+        пока данных мало - fee_rate_round_trip из конфига.
+        """
+        if self.execution_costs is not None and symbol:
+            try:
+                learned = self.execution_costs.round_trip_cost(symbol)
+            except Exception:
+                learned = None
+            if learned is not None and learned > 0:
+                return learned
+        return self.fee_rate_round_trip
+
     def _check_fee_edge(
-        self, reason: str, payload: Dict[str, Any]
+        self, reason: str, payload: Dict[str, Any], symbol: Optional[str] = None
     ) -> Tuple[bool, Optional[str]]:
         # Критические/защитные выходы не блокируем комиссионным guard.
         if self._is_critical_reason(reason) or self._is_protective_reason(reason):
@@ -300,7 +319,7 @@ class ExitGuard:
 
         net_frac = self._extract_profit_fraction(payload, "net_pnl_pct")
         leverage = self._extract_leverage(payload)
-        effective_fee = self.fee_rate_round_trip * max(1.0, leverage)
+        effective_fee = self.round_trip_fee_rate(symbol) * max(1.0, leverage)
         if net_frac is None and gross_frac is not None:
             net_frac = gross_frac - effective_fee
 
@@ -498,10 +517,16 @@ class ExitGuard:
     async def _sync_position_from_exchange(
         self, symbol: str
     ) -> Optional[Dict[str, Any]]:
-        if not self.client:
+        if not self.client and not self.account_state:
             return None
         try:
-            positions = await self.client.get_positions(symbol)
+            if self.account_state:
+                # Канал positions событийный: свежесть как у решения о выходе
+                positions = await self.account_state.get_positions(
+                    symbol, max_age=self.SYNC_MAX_AGE_SEC
+                )
+            else:
+                positions = await self.client.get_positions(symbol)
             if not positions:
                 return None
             for pos in positions:
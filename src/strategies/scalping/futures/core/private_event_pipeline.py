@@ -0,0 +1,269 @@
+"""
+PrivateEventPipeline - приоритетная доставка событий private WebSocket.
+
+Listener сокета только разбирает кадр и кладет события в очереди (submit),
+обработчики вызывает отдельная задача-диспетчер, поэтому медленный обработчик
+не задерживает чтение сокета и ответы на торговые запросы.
+
+Порядок и слияние:
+- orders: FIFO без слияния (каждое исполнение важно), всегда первыми;
+- positions: пачка обновлений одного инструмента (instId + posSide)
+  сворачивается в последнее по uTime;
+- account: хранится только последний снимок.
+
+Дедупликация - по (id, uTime) в TTLCache ограниченного размера, поэтому
+повторы биржи отсекаются, а новые обновления той же позиции проходят.
+Задержка событие -> обработчик и время обработчика пишутся в WindowedMetrics
+с гистограммой (квантили в get_stats).
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from loguru import logger
+
+from src.utils.window_metrics import WindowedMetrics
+
+Handler = Callable[[List[Dict[str, Any]]], Awaitable[Any]]
+
+CHANNELS = ("orders", "positions", "account")
+
+
+def _order_key(order: Dict[str, Any]) -> Optional[Tuple]:
+    ord_id = order.get("ordId") or order.get("algoId")
+    if not ord_id:
+        return None
+    return (
+        "o",
+        ord_id,
+        order.get("state"),
+        order.get("accFillSz"),
+        order.get("uTime"),
+    )
+
+
+def _position_key(position: Dict[str, Any]) -> Optional[Tuple]:
+    pos_id = position.get("posId")
+    if not pos_id:
+        return None
+    return ("p", pos_id, position.get("uTime"))
+
+
+def _utime(item: Dict[str, Any]) -> int:
+    try:
+        return int(item.get("uTime") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class PrivateEventPipeline:
+    """
+    Очереди событий private WS с приоритетом ордеров.
+
+    Использование:
+        pipeline = PrivateEventPipeline()
+        pipeline.set_handler("orders", on_orders)
+        pipeline.start()
+        pipeline.submit("orders", data["data"])   # из listener сокета
+        await pipeline.stop()
+    """
+
+    def __init__(
+        self,
+        dedup_size: int = 10_000,
+        dedup_ttl_sec: float = 300.0,
+        metrics: Optional[WindowedMetrics] = None,
+    ):
+        """
+        Args:
+            dedup_size: Максимум ключей дедупликации в памяти
+            dedup_ttl_sec: Время жизни ключа дедупликации
+            metrics: Хранилище метрик задержек (по умолчанию - свое, окно 1ч)
+        """
+        self._handlers: Dict[str, Handler] = {}
+        self._seen: TTLCache = TTLCache(maxsize=int(dedup_size), ttl=dedup_ttl_sec)
+        self._orders: Deque[Tuple[Dict[str, Any], int]] = deque()
+        # (instId, posSide) -> (позиция, время получения первого события пачки)
+        self._positions: Dict[Tuple[str, str], Tuple[Dict[str, Any], int]] = {}
+        self._account: Optional[Tuple[List[Dict[str, Any]], int]] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.metrics = metrics or WindowedMetrics(
+            bucket_seconds=10, retention_seconds=3600
+        )
+        self.stats: Dict[str, int] = {
+            "orders": 0,
+            "positions": 0,
+            "account": 0,
+            "duplicates": 0,
+            "coalesced": 0,
+            "handler_errors": 0,
+        }
+
+    def set_handler(self, channel: str, handler: Optional[Handler]) -> None:
+        if channel not in CHANNELS:
+            raise ValueError(f"Неизвестный канал private WS: {channel}")
+        if handler is None:
+            self._handlers.pop(channel, None)
+        else:
+            self._handlers[channel] = handler
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Запустить диспетчер (повторный вызов - без эффекта)."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        if self.pending:
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить диспетчер; недоставленные события остаются в очередях."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    @property
+    def pending(self) -> int:
+        return len(self._orders) + len(self._positions) + (1 if self._account else 0)
+
+    def submit(self, channel: str, items: List[Dict[str, Any]]) -> int:
+        """
+        Поставить события канала в очередь (вызывается из listener, без await).
+
+        Returns:
+            Сколько событий принято после дедупликации
+        """
+        if not items or channel not in self._handlers:
+            return 0
+        received = time.perf_counter_ns()
+        accepted = 0
+        if channel == "orders":
+            for order in items:
+                if self._is_duplicate(_order_key(order)):
+                    continue
+                self._orders.append((order, received))
+                accepted += 1
+        elif channel == "positions":
+            for position in items:
+                if self._is_duplicate(_position_key(position)):
+                    continue
+                key = (position.get("instId", ""), position.get("posSide", ""))
+                queued = self._positions.get(key)
+                if queued is not None:
+                    self.stats["coalesced"] += 1
+                    if _utime(position) < _utime(queued[0]):
+                        continue  # пришло позже, но обновление старее
+                    received = min(received, queued[1])
+                self._positions[key] = (position, received)
+                accepted += 1
+        elif channel == "account":
+            if self._account is not None:
+                self.stats["coalesced"] += 1
+                received = self._account[1]
+            self._account = (items, received)
+            accepted = 1
+        if accepted:
+            self._wakeup.set()
+        return accepted
+
+    async def drain(self) -> None:
+        """Доставить все накопленное: ордера, затем позиции, затем аккаунт."""
+        while True:
+            if self._orders:
+                batch = list(self._orders)
+                self._orders.clear()
+                await self._deliver("orders", batch)
+            elif self._positions:
+                batch = list(self._positions.values())
+                self._positions.clear()
+                await self._deliver("positions", batch)
+            elif self._account is not None:
+                items, received = self._account
+                self._account = None
+                await self._deliver("account", [(items, received)], unpack=False)
+            else:
+                return
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ PrivateEventPipeline: ошибка диспетчера: {e}")
+
+    async def _deliver(
+        self,
+        channel: str,
+        batch: List[Tuple[Any, int]],
+        unpack: bool = True,
+    ) -> None:
+        handler = self._handlers.get(channel)
+        if handler is None:
+            return
+        started = time.perf_counter_ns()
+        for _, received in batch:
+            self.metrics.record(
+                "private_ws.event_to_handler_ms",
+                (started - received) / 1e6,
+                reason=channel,
+                histogram=True,
+            )
+        self.stats[channel] += len(batch)
+        payload = [item for item, _ in batch] if unpack else batch[0][0]
+        try:
+            await handler(payload)
+        except Exception as e:
+            self.stats["handler_errors"] += 1
+            logger.error(f"❌ PrivateEventPipeline: ошибка обработчика {channel}: {e}")
+        self.metrics.record(
+            "private_ws.handler_ms",
+            (time.perf_counter_ns() - started) / 1e6,
+            reason=channel,
+            histogram=True,
+        )
+
+    def _is_duplicate(self, key: Optional[Tuple]) -> bool:
+        if key is None:
+            return False
+        if key in self._seen:
+            self.stats["duplicates"] += 1
+            return True
+        self._seen[key] = True
+        return False
+
+    def get_stats(self, window_seconds: Optional[float] = 300.0) -> Dict[str, Any]:
+        """Счетчики и квантили задержек по каналам за окно."""
+        stats: Dict[str, Any] = dict(self.stats)
+        stats["pending"] = self.pending
+        stats["dedup_keys"] = len(self._seen)
+        for metric in ("event_to_handler_ms", "handler_ms"):
+            groups = self.metrics.group_by(
+                f"private_ws.{metric}", "reason", window_seconds
+            )
+            stats[metric] = {
+                channel: {
+                    "count": agg.count,
+                    "p50": round(agg.quantile(0.5), 3),
+                    "p99": round(agg.quantile(0.99), 3),
+                    "max": round(agg.max, 3),
+                }
+                for channel, agg in groups.items()
+            }
+        return stats
@@ -0,0 +1,358 @@
+"""
+RecoveryPlanner - параллельный старт и восстановление после reconnect.
+
+Раньше orchestrator выполнял шаги старта строго по очереди (свечи всех
+символов и таймфреймов со sleep между страницами REST, загрузка позиций,
+синхронизация), и открытые позиции минутами оставались без управления.
+Теперь шаги - граф зависимостей:
+- шаг стартует, как только завершены его зависимости; независимые шаги
+  идут параллельно (не больше max_concurrency одновременно);
+- REST-запросы шагов проходят через общий RestRateLimiter, который при
+  конкуренции отдает слот шагу с меньшим приоритетом (защитные раньше);
+- приоритеты: PRIORITY_PROTECTIVE (позиции, стопы) -> PRIORITY_MARKET_DATA
+  -> PRIORITY_COSMETIC (данные для фильтров);
+- символ готов к торговле, когда завершены все gate-шаги без символа и
+  шаги этого символа - on_symbol_ready вызывается сразу, не дожидаясь
+  остальных символов;
+- у шага свой таймаут, у плана - дедлайн: после него run() возвращает
+  отчет, незавершенные шаги доделываются в фоне; шаги, без которых
+  торговать нельзя (позиции, стопы), дожидаются через wait_for();
+- отчет по каждому шагу: статус, старт и длительность в мс от начала плана.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+PRIORITY_PROTECTIVE = 0
+PRIORITY_MARKET_DATA = 1
+PRIORITY_COSMETIC = 2
+
+# Статусы завершенного шага
+_FINISHED = frozenset({"done", "failed", "timeout", "skipped"})
+
+
+class RestRateLimiter:
+    """
+    Ограничитель частоты REST-запросов с приоритетной очередью.
+
+    Запросы выдаются не чаще rate_per_sec; ожидающие обслуживаются по
+    (priority, порядок прихода).
+    """
+
+    def __init__(self, rate_per_sec: float = 10.0):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next_ts = 0.0
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self.stats = {"acquired": 0, "waited_ms": 0.0}
+
+    async def acquire(self, priority: int = PRIORITY_MARKET_DATA) -> None:
+        if self.interval <= 0:
+            self.stats["acquired"] += 1
+            return
+        ticket = (priority, next(self._seq))
+        heapq.heappush(self._queue, ticket)
+        started = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                if self._queue[0] == ticket and now >= self._next_ts:
+                    heapq.heappop(self._queue)
+                    self._next_ts = max(self._next_ts, now) + self.interval
+                    self.stats["acquired"] += 1
+                    self.stats["waited_ms"] += (now - started) * 1000.0
+                    return
+                await asyncio.sleep(max(self._next_ts - now, 0.005))
+        except asyncio.CancelledError:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+            raise
+
+
+@dataclass
+class RecoveryStep:
+    """Шаг плана: корутина, зависимости и параметры планирования."""
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+    priority: int = PRIORITY_MARKET_DATA
+    timeout: Optional[float] = None
+    critical: bool = True  # при ошибке зависимые шаги пропускаются
+    gate: bool = True  # нужен для готовности символа к торговле
+    symbol: Optional[str] = None  # None - общий шаг для всех символов
+    status: str = "pending"
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+
+class RecoveryPlanner:
+    """
+    Планировщик шагов старта / восстановления по графу зависимостей.
+
+    Использование:
+        planner = RecoveryPlanner("startup", max_concurrency=6, rate_per_sec=10)
+        planner.add("candles:BTC-USDT:1m", load, symbol="BTC-USDT")
+        planner.add("positions", load_positions, deps=("candles:BTC-USDT:1m",),
+                    priority=PRIORITY_PROTECTIVE)
+        report = await planner.run(deadline=45.0)
+    """
+
+    def __init__(
+        self,
+        name: str = "startup",
+        max_concurrency: int = 6,
+        rate_per_sec: float = 10.0,
+        limiter: Optional[RestRateLimiter] = None,
+        on_symbol_ready: Optional[Callable[[str], Any]] = None,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limiter = limiter or RestRateLimiter(rate_per_sec)
+        self.on_symbol_ready = on_symbol_ready
+        self.steps: Dict[str, RecoveryStep] = {}
+        self.ready_symbols: Dict[str, float] = {}  # symbol -> мс от старта
+        self.deadline_hit = False
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._progress = asyncio.Event()  # Заменяется на новый при каждом изменении
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        deps: Tuple[str, ...] = (),
+        priority: int = PRIORITY_MARKET_DATA,
+        timeout: Optional[float] = None,
+        critical: bool = True,
+        gate: bool = True,
+        symbol: Optional[str] = None,
+    ) -> RecoveryStep:
+        if name in self.steps:
+            raise ValueError(f"Шаг {name} уже добавлен в план {self.name}")
+        step = RecoveryStep(
+            name=name,
+            func=func,
+            deps=tuple(deps),
+            priority=priority,
+            timeout=timeout,
+            critical=critical,
+            gate=gate,
+            symbol=symbol,
+        )
+        self.steps[name] = step
+        return step
+
+    def names(self, prefix: str) -> Tuple[str, ...]:
+        """Имена шагов с префиксом (для зависимостей вида 'все свечи 1m')."""
+        return tuple(name for name in self.steps if name.startswith(prefix))
+
+    async def run(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Выполнить план.
+
+        Args:
+            deadline: Максимум секунд ожидания; оставшиеся шаги доделываются в фоне
+
+        Returns:
+            Отчет get_report()
+        """
+        for step in self.steps.values():
+            missing = [dep for dep in step.deps if dep not in self.steps]
+            if missing:
+                raise ValueError(f"Шаг {step.name}: неизвестные зависимости {missing}")
+
+        self._started_at = time.monotonic()
+        self._task = asyncio.create_task(self._schedule())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=deadline)
+        except asyncio.TimeoutError:
+            self.deadline_hit = True
+            pending = [s.name for s in self.steps.values() if not s.finished]
+            logger.warning(
+                f"⏱️ RecoveryPlanner[{self.name}]: дедлайн {deadline:.0f}с, "
+                f"в фоне продолжаются: {', '.join(pending)}"
+            )
+        return self.get_report()
+
+    async def wait(self) -> Dict[str, Any]:
+        """Дождаться всех шагов (включая доделываемые после дедлайна)."""
+        if self._task is not None:
+            await self._task
+        return self.get_report()
+
+    async def wait_for(self, names: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Дождаться завершения шагов names независимо от дедлайна run().
+
+        Returns:
+            Отчет get_report()
+        """
+        missing = [name for name in names if name not in self.steps]
+        if missing:
+            raise ValueError(f"План {self.name}: неизвестные шаги {missing}")
+        while not all(self.steps[name].finished for name in names):
+            if self._task is None or self._task.done():
+                break
+            await self._progress.wait()
+        return self.get_report()
+
+    def _notify_progress(self) -> None:
+        progress, self._progress = self._progress, asyncio.Event()
+        progress.set()
+
+    async def _schedule(self) -> None:
+        running: Dict[asyncio.Task, RecoveryStep] = {}
+        order = {name: i for i, name in enumerate(self.steps)}
+        self._check_symbols_ready()
+
+        while True:
+            self._skip_blocked()
+            ready = [
+                step
+                for step in self.steps.values()
+                if step.status == "pending"
+                and all(self.steps[dep].finished for dep in step.deps)
+            ]
+            self._check_symbols_ready()
+
+            ready.sort(key=lambda s: (s.priority, order[s.name]))
+            for step in ready[: self.max_concurrency - len(running)]:
+                step.status = "running"
+                step.started_at = time.monotonic()
+                running[asyncio.create_task(self._run_step(step))] = step
+
+            if not running:
+                # Оставшиеся pending без готовых шагов - цикл зависимостей
+                for step in self.steps.values():
+                    if step.status == "pending":
+                        step.status = "skipped"
+                        step.error = "цикл зависимостей"
+                break
+
+            done, _ = await asyncio.wait(
+                running.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                running.pop(task)
+            self._notify_progress()
+
+        self._finished_at = time.monotonic()
+        self._check_symbols_ready()
+        self._notify_progress()
+
+    def _skip_blocked(self) -> None:
+        """Пропустить шаги, у которых критичная зависимость не выполнена."""
+        changed = True
+        while changed:
+            changed = False
+            for step in self.steps.values():
+                if step.status != "pending":
+                    continue
+                deps = [self.steps[dep] for dep in step.deps]
+                failed = [
+                    dep.name
+                    for dep in deps
+                    if dep.critical and dep.finished and dep.status != "done"
+                ]
+                if failed:
+                    step.status = "skipped"
+                    step.error = f"зависимости не выполнены: {', '.join(failed)}"
+                    logger.warning(
+                        f"⚠️ RecoveryPlanner[{self.name}]: {step.name} пропущен "
+                        f"({step.error})"
+                    )
+                    changed = True
+
+    async def _run_step(self, step: RecoveryStep) -> None:
+        try:
+            if step.timeout:
+                await asyncio.wait_for(step.func(), timeout=step.timeout)
+            else:
+                await step.func()
+            step.status = "done"
+        except asyncio.TimeoutError:
+            step.status = "timeout"
+            step.error = f"таймаут {step.timeout:.0f}с"
+            logger.warning(
+                f"⏱️ RecoveryPlanner[{self.name}]: {step.name} - {step.error}"
+            )
+        except Exception as e:
+            step.status = "failed"
+            step.error = str(e)
+            logger.error(f"❌ RecoveryPlanner[{self.name}]: {step.name} - {e}")
+        finally:
+            step.finished_at = time.monotonic()
+
+    def _check_symbols_ready(self) -> None:
+        steps = [step for step in self.steps.values() if step.gate]
+        if any(not step.finished for step in steps if step.symbol is None):
+            return
+        symbols: Set[str] = {step.symbol for step in self.steps.values() if step.symbol}
+        for symbol in sorted(symbols - set(self.ready_symbols)):
+            if all(step.finished for step in steps if step.symbol == symbol):
+                self.ready_symbols[symbol] = self._ms(time.monotonic())
+                if self.on_symbol_ready:
+                    try:
+                        self.on_symbol_ready(symbol)
+                    except Exception as e:
+                        logger.debug(f"⚠️ on_symbol_ready({symbol}) ошибка: {e}")
+
+    def is_symbol_ready(self, symbol: str) -> bool:
+        return symbol in self.ready_symbols
+
+    def _ms(self, ts: Optional[float]) -> Optional[float]:
+        if ts is None or self._started_at is None:
+            return None
+        return round((ts - self._started_at) * 1000.0, 1)
+
+    def get_report(self) -> Dict[str, Any]:
+        steps = {}
+        for step in self.steps.values():
+            duration = None
+            if step.started_at is not None and step.finished_at is not None:
+                duration = round((step.finished_at - step.started_at) * 1000.0, 1)
+            steps[step.name] = {
+                "status": step.status,
+                "priority": step.priority,
+                "symbol": step.symbol,
+                "start_ms": self._ms(step.started_at),
+                "duration_ms": duration,
+                "error": step.error,
+            }
+        return {
+            "name": self.name,
+            "total_ms": self._ms(self._finished_at),
+            "deadline_hit": self.deadline_hit,
+            "ready_symbols": dict(self.ready_symbols),
+            "rest": dict(self.limiter.stats),
+            "steps": steps,
+        }
+
+    def log_report(self) -> None:
+        """Сводка по шагам в лог (время до готовности символов - отдельно)."""
+        report = self.get_report()
+        for name, info in report["steps"].items():
+            logger.info(
+                f"⏱️ {self.name}.{name}: {info['status']} "
+                f"start={info['start_ms']}ms duration={info['duration_ms']}ms"
+                + (f" error={info['error']}" if info["error"] else "")
+            )
+        logger.info(
+            f"📊 RecoveryPlanner[{self.name}]: total={report['total_ms']}ms, "
+            f"готовность символов (мс): {report['ready_symbols']}, "
+            f"REST: {report['rest']['acquired']} запросов"
+        )
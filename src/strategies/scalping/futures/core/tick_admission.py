@@ -0,0 +1,267 @@
+"""
+TickAdmissionController - допуск тикеров к полной обработке.
+
+Рыночные данные (цена, bid/ask) обновляются на каждом тикере всегда; этот
+модуль решает только, запускать ли дорогую часть (свечи, FastADX, TP/SL,
+проверка сигналов):
+- Волатильность за 60с - deque (ts, price) с амортизированным O(1) на тикер
+- Тир дросселирования по волатильности: low 1/5, medium 1/2, high 1/1
+- Бюджет CPU на символ (мс в секунду); при открытой позиции или
+  pending-ордере бюджет умножается, а тир не применяется
+- Pending-ордера - индекс {symbol: {order_id}} из приватного WS, O(1) проверка
+- Счетчики admitted / dropped по причинам - сколько работы сброшено
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+# Состояния ордера из OKX orders channel, после которых ордер не висит в стакане
+_DONE_ORDER_STATES = frozenset({"filled", "canceled", "mmp_canceled"})
+
+
+class RollingVolatility:
+    """Изменение цены за окно (первая vs последняя цена), O(1) амортизированно."""
+
+    __slots__ = ("window_sec", "_points")
+
+    def __init__(self, window_sec: float = 60.0, max_points: int = 4096):
+        self.window_sec = window_sec
+        self._points: Deque[Tuple[float, float]] = deque(maxlen=max_points)
+
+    def update(self, ts: float, price: float) -> Optional[float]:
+        """
+        Добавить цену и вернуть |изменение| за окно в процентах.
+
+        Returns:
+            None пока в окне меньше двух цен
+        """
+        points = self._points
+        points.append((ts, price))
+        cutoff = ts - self.window_sec
+        while points[0][0] < cutoff:
+            points.popleft()
+        if len(points) < 2:
+            return None
+        first = points[0][1]
+        if first <= 0:
+            return None
+        return abs(price - first) / first * 100.0
+
+
+class TickDecision:
+    """Решение по тикеру: admitted, причина и выбранный тир."""
+
+    __slots__ = ("admitted", "reason", "state", "throttle")
+
+    def __init__(self, admitted: bool, reason: str, state: str, throttle: int):
+        self.admitted = admitted
+        self.reason = reason
+        self.state = state
+        self.throttle = throttle
+
+
+class _SymbolState:
+    __slots__ = (
+        "counter",
+        "volatility",
+        "window_start",
+        "spent_ms",
+        "last_admitted_ts",
+        "admitted",
+        "forced",
+        "dropped_throttle",
+        "dropped_budget",
+        "cost_ms_total",
+    )
+
+    def __init__(self, window_sec: float):
+        self.counter = 0
+        self.volatility = RollingVolatility(window_sec)
+        self.window_start = 0.0
+        self.spent_ms = 0.0
+        self.last_admitted_ts: Optional[float] = None
+        self.admitted = 0
+        self.forced = 0
+        self.dropped_throttle = 0
+        self.dropped_budget = 0
+        self.cost_ms_total = 0.0
+
+
+class TickAdmissionController:
+    """
+    Контроллер допуска тикеров по символам.
+
+    Конфиг (scalping.tick_admission):
+        enabled: true
+        volatility_window_sec: 60
+        medium_change_pct: 0.1 / high_change_pct: 0.3
+        throttle: {low: 5, medium: 2, high: 1}
+        budget_ms_per_sec: 200 -> бюджет обработки символа без позиции
+        engaged_budget_multiplier: 5 -> при позиции / pending-ордере
+        force_after_sec: 45 -> после стольких секунд без обработки тикер допускается всегда
+    """
+
+    def __init__(self, config: Optional[Any] = None):
+        if config is not None and not isinstance(config, dict):
+            config = dict(getattr(config, "__dict__", {}) or {})
+        config = config or {}
+        self.enabled = bool(config.get("enabled", True))
+        self.window_sec = float(config.get("volatility_window_sec", 60.0))
+        self.medium_change_pct = float(config.get("medium_change_pct", 0.1))
+        self.high_change_pct = float(config.get("high_change_pct", 0.3))
+        throttle = config.get("throttle") or {}
+        if not isinstance(throttle, dict):
+            throttle = dict(getattr(throttle, "__dict__", {}) or {})
+        self.throttle = {
+            "low": int(throttle.get("low", 5)),
+            "medium": int(throttle.get("medium", 2)),
+            "high": int(throttle.get("high", 1)),
+        }
+        budget = config.get("budget_ms_per_sec", 200.0)
+        self.budget_ms_per_sec = float(budget) if budget else None
+        self.engaged_budget_multiplier = float(
+            config.get("engaged_budget_multiplier", 5.0)
+        )
+        self.force_after_sec = float(config.get("force_after_sec", 45.0))
+
+        self._symbols: Dict[str, _SymbolState] = {}
+        self._pending_orders: Dict[str, Set[str]] = {}
+
+    def _state(self, symbol: str) -> _SymbolState:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = _SymbolState(self.window_sec)
+        return state
+
+    # --------------------------------------------------------- pending-ордера
+
+    def on_order_update(self, symbol: str, order_id: str, order_state: str) -> None:
+        """Обновить индекс pending-ордеров по событию orders channel."""
+        if not symbol or not order_id:
+            return
+        if order_state in _DONE_ORDER_STATES:
+            orders = self._pending_orders.get(symbol)
+            if orders is not None:
+                orders.discard(order_id)
+                if not orders:
+                    del self._pending_orders[symbol]
+        else:
+            self._pending_orders.setdefault(symbol, set()).add(order_id)
+
+    def has_pending_order(self, symbol: str) -> bool:
+        return symbol in self._pending_orders
+
+    # ------------------------------------------------------------------ допуск
+
+    def admit(
+        self,
+        symbol: str,
+        price: Optional[float],
+        has_position: bool = False,
+        now: Optional[float] = None,
+    ) -> TickDecision:
+        """
+        Решить, обрабатывать ли тикер полностью.
+
+        Args:
+            symbol: Символ
+            price: Последняя цена (для оценки волатильности)
+            has_position: Есть ли открытая позиция по символу
+            now: Время (по умолчанию time.time())
+        """
+        now = time.time() if now is None else now
+        state = self._state(symbol)
+        state.counter += 1
+        engaged = has_position or symbol in self._pending_orders
+
+        if not self.enabled:
+            return self._admitted(state, now, "disabled", "bypass", 1)
+
+        throttle = self.throttle["high"]
+        tier = "bypass" if engaged else "high"
+        if not engaged and price:
+            change_pct = state.volatility.update(now, price)
+            if change_pct is not None:
+                if change_pct > self.high_change_pct:
+                    tier = "high"
+                elif change_pct > self.medium_change_pct:
+                    tier = "medium"
+                else:
+                    tier = "low"
+                throttle = self.throttle[tier]
+
+        stale = (
+            state.last_admitted_ts is not None
+            and now - state.last_admitted_ts > self.force_after_sec
+        )
+
+        if throttle > 1 and state.counter % throttle != 0:
+            if stale:
+                state.forced += 1
+                return self._admitted(state, now, "forced", tier, throttle)
+            state.dropped_throttle += 1
+            return TickDecision(False, "throttle", tier, throttle)
+
+        if self.budget_ms_per_sec:
+            if now - state.window_start >= 1.0:
+                state.window_start = now
+                state.spent_ms = 0.0
+            budget = self.budget_ms_per_sec
+            if engaged:
+                budget *= self.engaged_budget_multiplier
+            if state.spent_ms >= budget:
+                if stale:
+                    state.forced += 1
+                    return self._admitted(state, now, "forced", tier, throttle)
+                state.dropped_budget += 1
+                return TickDecision(False, "budget", tier, throttle)
+
+        return self._admitted(state, now, "admitted", tier, throttle)
+
+    @staticmethod
+    def _admitted(
+        state: _SymbolState, now: float, reason: str, tier: str, throttle: int
+    ) -> TickDecision:
+        state.admitted += 1
+        state.last_admitted_ts = now
+        return TickDecision(True, reason, tier, throttle)
+
+    def record_cost(self, symbol: str, seconds: float) -> None:
+        """Учесть время обработки допущенного тикера в бюджете символа."""
+        state = self._state(symbol)
+        cost_ms = seconds * 1000.0
+        state.spent_ms += cost_ms
+        state.cost_ms_total += cost_ms
+
+    # -------------------------------------------------------------- отчетность
+
+    def get_symbol_stats(self, symbol: str) -> Dict[str, Any]:
+        state = self._symbols.get(symbol)
+        if state is None:
+            return {}
+        dropped = state.dropped_throttle + state.dropped_budget
+        total = state.admitted + dropped
+        return {
+            "ticks": total,
+            "admitted": state.admitted,
+            "forced": state.forced,
+            "dropped_throttle": state.dropped_throttle,
+            "dropped_budget": state.dropped_budget,
+            "shed_ratio": dropped / total if total else 0.0,
+            "avg_cost_ms": (
+                state.cost_ms_total / state.admitted if state.admitted else 0.0
+            ),
+            "pending_orders": len(self._pending_orders.get(symbol, ())),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Счетчики по символам и суммарно."""
+        symbols = {symbol: self.get_symbol_stats(symbol) for symbol in self._symbols}
+        totals = {"ticks": 0, "admitted": 0, "dropped_throttle": 0, "dropped_budget": 0}
+        for stats in symbols.values():
+            for key in totals:
+                totals[key] += stats[key]
+        dropped = totals["dropped_throttle"] + totals["dropped_budget"]
+        totals["shed_ratio"] = dropped / totals["ticks"] if totals["ticks"] else 0.0
+        return {**totals, "symbols": symbols}
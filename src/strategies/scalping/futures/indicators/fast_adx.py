@@ -5,8 +5,9 @@ Fast ADX для Futures торговли.
 на изменение тренда на коротких таймфреймах (1m, 5m).
 """
 
+import copy
 from collections import deque
-from typing import Any, Deque, Dict, Optional
+from typing import Any, Deque, Dict, Optional, Tuple
 
 from loguru import logger
 
@@ -166,6 +167,55 @@ class FastADX:
             ) / self.period
             self.adx_history.append(self._smoothed_adx)
 
+    def peek(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        """
+        (ADX, +DI, -DI) как после update(high, low, close), без изменения состояния.
+
+        Нужен для формирующейся свечи: состояние двигается только закрытыми барами.
+        """
+        if self._smoothed_tr is None or self._smoothed_adx is None:
+            # Прогрев еще не завершен - считаем на копии (редкий путь)
+            probe = copy.deepcopy(self)
+            probe.update(high=high, low=low, close=close)
+            return (
+                probe.get_current_adx(),
+                probe.get_current_di_plus(),
+                probe.get_current_di_minus(),
+            )
+
+        adx = self.get_current_adx()
+        di_plus = self.get_current_di_plus()
+        di_minus = self.get_current_di_minus()
+
+        up_move = high - self.current_high
+        down_move = self.current_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        tr = max(
+            high - low,
+            abs(high - self.current_close),
+            abs(low - self.current_close),
+        )
+
+        smoothed_tr = self._smoothed_tr - (self._smoothed_tr / self.period) + tr
+        if not smoothed_tr:
+            return adx, di_plus, di_minus
+        smoothed_plus_dm = (
+            self._smoothed_plus_dm - (self._smoothed_plus_dm / self.period) + plus_dm
+        )
+        smoothed_minus_dm = (
+            self._smoothed_minus_dm - (self._smoothed_minus_dm / self.period) + minus_dm
+        )
+        di_plus = 100 * (smoothed_plus_dm / smoothed_tr)
+        di_minus = 100 * (smoothed_minus_dm / smoothed_tr)
+
+        di_sum = di_plus + di_minus
+        if di_sum == 0:
+            return adx, di_plus, di_minus
+        dx = 100 * abs(di_plus - di_minus) / di_sum
+        adx = ((self._smoothed_adx * (self.period - 1)) + dx) / self.period
+        return adx, di_plus, di_minus
+
     def _calculate_adx(self) -> float:
         """Расчет ADX на основе истории +DI и -DI."""
         if len(self.adx_history) == 0:
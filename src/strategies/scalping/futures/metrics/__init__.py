@@ -5,10 +5,12 @@ Metrics модули для Futures торговли.
 - conversion_metrics: Метрики конверсии сигналов
 - holding_time_metrics: Метрики времени удержания позиций
 - alert_manager: Менеджер алертов
+- execution_costs: Стоимость исполнения по собственным fill'ам
 """
 
 from .alert_manager import AlertManager
 from .conversion_metrics import ConversionMetrics
+from .execution_costs import ExecutionCostModel, ExecutionEstimate
 from .holding_time_metrics import HoldingTimeMetrics
 from .log_replay import apply_replay_to_slo_monitor, replay_archive_events
 from .slo_monitor import SLOMonitor
@@ -18,6 +20,8 @@ __all__ = [
     "HoldingTimeMetrics",
     "AlertManager",
     "SLOMonitor",
+    "ExecutionCostModel",
+    "ExecutionEstimate",
     "replay_archive_events",
     "apply_replay_to_slo_monitor",
 ]
@@ -9,12 +9,14 @@ Alert Manager - Менеджер алертов на критические со
 - Превышении лимитов
 """
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 from loguru import logger
 
+from src.utils.window_metrics import WindowedMetrics
+
 
 class AlertManager:
     """
@@ -32,10 +34,14 @@ class AlertManager:
         "high_filter_rate": 90.0,  # Фильтрация > 90%
     }
 
+    # Метрика алертов в WindowedMetrics (reason = тип алерта)
+    ALERT_METRIC = "alert"
+
     def __init__(
         self,
         conversion_metrics=None,  # ConversionMetrics (опционально)
         holding_time_metrics=None,  # HoldingTimeMetrics (опционально)
+        metrics_store: Optional[WindowedMetrics] = None,
     ):
         """
         Инициализация Alert Manager.
@@ -43,13 +49,17 @@ class AlertManager:
         Args:
             conversion_metrics: ConversionMetrics для отслеживания конверсии
             holding_time_metrics: HoldingTimeMetrics для отслеживания времени удержания
+            metrics_store: Общее хранилище оконных метрик (по умолчанию свое)
         """
         self.conversion_metrics = conversion_metrics
         self.holding_time_metrics = holding_time_metrics
+        self.metrics = metrics_store or WindowedMetrics()
 
-        # История алертов
-        self._alert_history: List[Dict[str, Any]] = []
+        # Последние алерты (для recent_alerts) - кольцевой буфер
         self._max_history_size = 1000
+        self._alert_history: Deque[Dict[str, Any]] = deque(
+            maxlen=self._max_history_size
+        )
 
         # Счетчики алертов
         self._alert_counts: Dict[str, int] = defaultdict(int)
@@ -279,10 +289,9 @@ class AlertManager:
         # Сохраняем в историю
         self._alert_history.append(alert)
         self._alert_counts[alert["type"]] += 1
-
-        # Ограничиваем размер истории
-        if len(self._alert_history) > self._max_history_size:
-            self._alert_history = self._alert_history[-self._max_history_size :]
+        self.metrics.record(
+            self.ALERT_METRIC, ts=alert["timestamp"], reason=alert["type"]
+        )
 
         # Вызываем callbacks
         for callback in self._alert_callbacks:
@@ -312,15 +321,17 @@ class AlertManager:
         """
         cutoff_time = datetime.now() - timedelta(hours=period_hours)
 
-        filtered = [
-            a
-            for a in self._alert_history
-            if a["timestamp"] >= cutoff_time
-            and (alert_type is None or a["type"] == alert_type)
-            and (severity is None or a.get("severity") == severity)
-        ]
+        # История хронологическая: идем с конца до первого старого алерта
+        filtered = []
+        for alert in reversed(self._alert_history):
+            if alert["timestamp"] < cutoff_time:
+                break
+            if (alert_type is None or alert["type"] == alert_type) and (
+                severity is None or alert.get("severity") == severity
+            ):
+                filtered.append(alert)
 
-        return sorted(filtered, key=lambda x: x["timestamp"], reverse=True)
+        return filtered
 
     def get_alert_summary(self, period_hours: int = 24) -> Dict[str, Any]:
         """
@@ -332,25 +343,33 @@ class AlertManager:
         Returns:
             Словарь со сводкой
         """
-        alerts = self.get_alert_history(period_hours=period_hours)
+        by_type_agg = self.metrics.group_by(
+            self.ALERT_METRIC, "reason", period_hours * 3600
+        )
+        by_type = {alert_type: agg.count for alert_type, agg in by_type_agg.items()}
 
-        by_type = defaultdict(int)
         by_severity = defaultdict(int)
+        for alert_type, count in by_type.items():
+            by_severity[self._get_severity(alert_type)] += count
 
-        for alert in alerts:
-            by_type[alert["type"]] += 1
-            by_severity[alert.get("severity", "info")] += 1
+        recent_alerts = []
+        cutoff_time = datetime.now() - timedelta(hours=period_hours)
+        for alert in reversed(self._alert_history):
+            if alert["timestamp"] < cutoff_time or len(recent_alerts) >= 10:
+                break
+            recent_alerts.append(alert)
 
         return {
             "period_hours": period_hours,
-            "total_alerts": len(alerts),
-            "by_type": dict(by_type),
+            "total_alerts": sum(by_type.values()),
+            "by_type": by_type,
             "by_severity": dict(by_severity),
-            "recent_alerts": alerts[:10],  # Последние 10 алертов
+            "recent_alerts": recent_alerts,  # Последние 10 алертов
         }
 
     def reset(self) -> None:
         """Сбросить все метрики."""
         self._alert_history.clear()
         self._alert_counts.clear()
+        self.metrics.reset([self.ALERT_METRIC])
         logger.info("✅ AlertManager: Все метрики сброшены")
@@ -9,12 +9,12 @@ Conversion Metrics - Отслеживание конверсии сигнало
 - Причины блокировки сигналов
 """
 
-from collections import defaultdict
-from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from src.utils.window_metrics import WindowedMetrics
+
 
 class ConversionMetrics:
     """
@@ -23,33 +23,33 @@ class ConversionMetrics:
     Отслеживает весь путь сигнала от генерации до открытия позиции.
     """
 
-    def __init__(self):
-        """Инициализация Conversion Metrics."""
-        # Счетчики сигналов
-        self.signals_generated: Dict[str, int] = defaultdict(int)  # {symbol: count}
-        self.signals_filtered: Dict[str, int] = defaultdict(int)  # {symbol: count}
-        self.signals_executed: Dict[str, int] = defaultdict(int)  # {symbol: count}
+    # Этапы воронки -> метрики в общем WindowedMetrics
+    STAGE_METRICS = {
+        "generated": "conversion.generated",
+        "filtered": "conversion.filtered",
+        "executed": "conversion.executed",
+        "closed": "conversion.closed",
+    }
 
-        # Причины блокировки сигналов
-        self.filter_reasons: Dict[str, Dict[str, int]] = defaultdict(
-            lambda: defaultdict(int)
-        )  # {symbol: {reason: count}}
+    def __init__(self, metrics_store: Optional[WindowedMetrics] = None):
+        """
+        Инициализация Conversion Metrics.
 
-        # Временные метки для расчета конверсии за период
-        self._signals_history: List[Dict[str, Any]] = []  # История сигналов
-        self._max_history_size = 10000  # Максимальный размер истории
+        Args:
+            metrics_store: Общее хранилище оконных метрик (по умолчанию свое)
+        """
+        # ✅ Каждый этап - отдельный оконный счетчик с метками
+        # symbol/regime/signal_type/reason вместо истории сигналов со статусами
+        self.metrics = metrics_store or WindowedMetrics()
 
-        # Статистика по режимам
-        self.signals_by_regime: Dict[str, Dict[str, int]] = defaultdict(
-            lambda: defaultdict(int)
-        )  # {regime: {status: count}}
+        logger.info("✅ ConversionMetrics инициализирован")
 
-        # Статистика по типам сигналов
-        self.signals_by_type: Dict[str, Dict[str, int]] = defaultdict(
-            lambda: defaultdict(int)
-        )  # {signal_type: {status: count}}
+    def _record(self, stage: str, value: float = 1.0, **labels: Any) -> None:
+        self.metrics.record(self.STAGE_METRICS[stage], value, **labels)
 
-        logger.info("✅ ConversionMetrics инициализирован")
+    def _count(self, stage: str, period_hours: Optional[float], **labels: Any) -> int:
+        window = period_hours * 3600 if period_hours is not None else None
+        return self.metrics.query(self.STAGE_METRICS[stage], window, **labels).count
 
     def record_signal_generated(
         self,
@@ -67,30 +67,14 @@ class ConversionMetrics:
             regime: Режим рынка (trending, ranging, choppy)
             strength: Сила сигнала (0.0-1.0)
         """
-        self.signals_generated[symbol] += 1
-
-        if regime:
-            self.signals_by_regime[regime]["generated"] += 1
-
-        if signal_type:
-            self.signals_by_type[signal_type]["generated"] += 1
-
-        # Сохраняем в историю
-        self._signals_history.append(
-            {
-                "timestamp": datetime.now(),
-                "symbol": symbol,
-                "signal_type": signal_type,
-                "regime": regime,
-                "strength": strength,
-                "status": "generated",
-            }
+        self._record(
+            "generated",
+            strength if strength is not None else 0.0,
+            symbol=symbol,
+            signal_type=signal_type,
+            regime=regime,
         )
 
-        # Ограничиваем размер истории
-        if len(self._signals_history) > self._max_history_size:
-            self._signals_history = self._signals_history[-self._max_history_size :]
-
     def record_signal_filtered(
         self,
         symbol: str,
@@ -107,25 +91,13 @@ class ConversionMetrics:
             signal_type: Тип сигнала
             regime: Режим рынка
         """
-        self.signals_filtered[symbol] += 1
-        self.filter_reasons[symbol][reason] += 1
-
-        if regime:
-            self.signals_by_regime[regime]["filtered"] += 1
-
-        if signal_type:
-            self.signals_by_type[signal_type]["filtered"] += 1
-
-        # Обновляем историю
-        for signal in reversed(self._signals_history):
-            if (
-                signal.get("symbol") == symbol
-                and signal.get("status") == "generated"
-                and signal.get("signal_type") == signal_type
-            ):
-                signal["status"] = "filtered"
-                signal["filter_reason"] = reason
-                break
+        self._record(
+            "filtered",
+            symbol=symbol,
+            signal_type=signal_type,
+            regime=regime,
+            reason=reason,
+        )
 
     def record_signal_executed(
         self,
@@ -141,23 +113,7 @@ class ConversionMetrics:
             signal_type: Тип сигнала
             regime: Режим рынка
         """
-        self.signals_executed[symbol] += 1
-
-        if regime:
-            self.signals_by_regime[regime]["executed"] += 1
-
-        if signal_type:
-            self.signals_by_type[signal_type]["executed"] += 1
-
-        # Обновляем историю
-        for signal in reversed(self._signals_history):
-            if (
-                signal.get("symbol") == symbol
-                and signal.get("status") in ["generated", "filtered"]
-                and signal.get("signal_type") == signal_type
-            ):
-                signal["status"] = "executed"
-                break
+        self._record("executed", symbol=symbol, signal_type=signal_type, regime=regime)
 
     def record_position_closed(
         self,
@@ -179,34 +135,14 @@ class ConversionMetrics:
             signal_type: Тип сигнала (опционально, для связи с историей)
             regime: Режим рынка (опционально, для статистики)
         """
-        # Обновляем статистику по режимам
-        if regime:
-            if regime not in self.signals_by_regime:
-                self.signals_by_regime[regime] = defaultdict(int)
-            self.signals_by_regime[regime]["closed"] = (
-                self.signals_by_regime[regime].get("closed", 0) + 1
-            )
-
-        # Обновляем статистику по типам сигналов
-        if signal_type:
-            if signal_type not in self.signals_by_type:
-                self.signals_by_type[signal_type] = defaultdict(int)
-            self.signals_by_type[signal_type]["closed"] = (
-                self.signals_by_type[signal_type].get("closed", 0) + 1
-            )
-
-        # Обновляем историю - ищем последний executed сигнал для этого символа
-        for signal in reversed(self._signals_history):
-            if (
-                signal.get("symbol") == symbol
-                and signal.get("status") == "executed"
-                and (not signal_type or signal.get("signal_type") == signal_type)
-            ):
-                signal["status"] = "closed"
-                signal["exit_reason"] = reason
-                if pnl is not None:
-                    signal["pnl"] = pnl
-                break
+        self._record(
+            "closed",
+            pnl if pnl is not None else 0.0,
+            symbol=symbol,
+            signal_type=signal_type,
+            regime=regime,
+            reason=reason,
+        )
 
     def get_conversion_rate(
         self, symbol: Optional[str] = None, period_hours: int = 24
@@ -214,6 +150,9 @@ class ConversionMetrics:
         """
         Получить конверсию сигналов.
 
+        Этапы считаются как события за окно: generated - все сгенерированные
+        сигналы, а не только оставшиеся в статусе "generated".
+
         Args:
             symbol: Торговый символ (если None - общая статистика)
             period_hours: Период для расчета (часы)
@@ -229,19 +168,9 @@ class ConversionMetrics:
                 "executed_to_filtered": float,  # Конверсия после фильтрации
             }
         """
-        cutoff_time = datetime.now() - timedelta(hours=period_hours)
-
-        # Фильтруем историю по периоду
-        recent_signals = [
-            s for s in self._signals_history if s["timestamp"] >= cutoff_time
-        ]
-
-        if symbol:
-            recent_signals = [s for s in recent_signals if s.get("symbol") == symbol]
-
-        generated = len([s for s in recent_signals if s.get("status") == "generated"])
-        filtered = len([s for s in recent_signals if s.get("status") == "filtered"])
-        executed = len([s for s in recent_signals if s.get("status") == "executed"])
+        generated = self._count("generated", period_hours, symbol=symbol)
+        filtered = self._count("filtered", period_hours, symbol=symbol)
+        executed = self._count("executed", period_hours, symbol=symbol)
 
         filter_to_generated = (filtered / generated * 100) if generated > 0 else 0.0
         executed_to_generated = (executed / generated * 100) if generated > 0 else 0.0
@@ -264,7 +193,7 @@ class ConversionMetrics:
         self, symbol: Optional[str] = None, top_n: int = 10
     ) -> List[Dict[str, Any]]:
         """
-        Получить топ причин блокировки сигналов.
+        Получить топ причин блокировки сигналов (за весь retention хранилища).
 
         Args:
             symbol: Торговый символ (если None - общая статистика)
@@ -274,33 +203,49 @@ class ConversionMetrics:
             Список словарей с причинами:
             [{"reason": str, "count": int, "percentage": float}, ...]
         """
-        if symbol:
-            reasons = self.filter_reasons.get(symbol, {})
-        else:
-            # Объединяем все символы
-            reasons = defaultdict(int)
-            for symbol_reasons in self.filter_reasons.values():
-                for reason, count in symbol_reasons.items():
-                    reasons[reason] += count
-
-        total = sum(reasons.values())
+        reasons = self.metrics.group_by(
+            self.STAGE_METRICS["filtered"], "reason", symbol=symbol
+        )
+        total = sum(agg.count for agg in reasons.values())
         if total == 0:
             return []
 
         # Сортируем по количеству
-        sorted_reasons = sorted(reasons.items(), key=lambda x: x[1], reverse=True)[
-            :top_n
-        ]
+        sorted_reasons = sorted(
+            reasons.items(), key=lambda x: x[1].count, reverse=True
+        )[:top_n]
 
         return [
             {
                 "reason": reason,
-                "count": count,
-                "percentage": (count / total * 100) if total > 0 else 0.0,
+                "count": agg.count,
+                "percentage": (agg.count / total * 100) if total > 0 else 0.0,
             }
-            for reason, count in sorted_reasons
+            for reason, agg in sorted_reasons
         ]
 
+    def _stats_by(self, label: str) -> Dict[str, Dict[str, Any]]:
+        by_stage = {
+            stage: self.metrics.group_by(metric, label)
+            for stage, metric in self.STAGE_METRICS.items()
+        }
+        stats = {}
+        for value in set().union(*by_stage.values()):
+            counts = {
+                stage: groups[value].count if value in groups else 0
+                for stage, groups in by_stage.items()
+            }
+            generated = counts["generated"]
+            stats[value] = {
+                "generated": generated,
+                "filtered": counts["filtered"],
+                "executed": counts["executed"],
+                "conversion_rate": (
+                    (counts["executed"] / generated * 100) if generated > 0 else 0.0
+                ),
+            }
+        return stats
+
     def get_regime_stats(self) -> Dict[str, Dict[str, Any]]:
         """
         Получить статистику по режимам.
@@ -308,22 +253,7 @@ class ConversionMetrics:
         Returns:
             Словарь {regime: {generated, filtered, executed, conversion_rate}}
         """
-        stats = {}
-        for regime, counts in self.signals_by_regime.items():
-            generated = counts.get("generated", 0)
-            filtered = counts.get("filtered", 0)
-            executed = counts.get("executed", 0)
-
-            conversion_rate = (executed / generated * 100) if generated > 0 else 0.0
-
-            stats[regime] = {
-                "generated": generated,
-                "filtered": filtered,
-                "executed": executed,
-                "conversion_rate": conversion_rate,
-            }
-
-        return stats
+        return self._stats_by("regime")
 
     def get_signal_type_stats(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -332,22 +262,7 @@ class ConversionMetrics:
         Returns:
             Словарь {signal_type: {generated, filtered, executed, conversion_rate}}
         """
-        stats = {}
-        for signal_type, counts in self.signals_by_type.items():
-            generated = counts.get("generated", 0)
-            filtered = counts.get("filtered", 0)
-            executed = counts.get("executed", 0)
-
-            conversion_rate = (executed / generated * 100) if generated > 0 else 0.0
-
-            stats[signal_type] = {
-                "generated": generated,
-                "filtered": filtered,
-                "executed": executed,
-                "conversion_rate": conversion_rate,
-            }
-
-        return stats
+        return self._stats_by("signal_type")
 
     def get_summary(self, period_hours: int = 24) -> Dict[str, Any]:
         """
@@ -402,11 +317,5 @@ class ConversionMetrics:
 
     def reset(self) -> None:
         """Сбросить все метрики."""
-        self.signals_generated.clear()
-        self.signals_filtered.clear()
-        self.signals_executed.clear()
-        self.filter_reasons.clear()
-        self._signals_history.clear()
-        self.signals_by_regime.clear()
-        self.signals_by_type.clear()
+        self.metrics.reset(self.STAGE_METRICS.values())
         logger.info("✅ ConversionMetrics: Все метрики сброшены")
@@ -0,0 +1,515 @@
+"""
+ExecutionCostModel - стоимость исполнения по нашим собственным fill'ам.
+
+SlippageGuard, ExitGuard (fee-edge), TrailingStopLoss и OrderExecutor
+опирались на статические комиссии и проскальзывание из конфига. Модель
+учится на:
+- приватном канале orders (fillPx/fillFee/fillNotionalUsd/execType,
+  cTime/fillTime, финальный state ордера);
+- журнале сделок (строки orders из all_data_*.csv - проскальзывание и
+  латентность market-исполнений).
+
+Оценки - EWMA по ячейкам (symbol, side, тип ордера, бакет размера, час UTC):
+- realized slippage (bps, + = против нас) относительно bid/ask на момент
+  размещения;
+- вероятность исполнения лимитного ордера;
+- время до первого исполнения;
+- эффективная комиссия (доля notional, с учетом maker/taker и ребейтов).
+
+Каждое обновление пишет в 4 уровня агрегации (точная ячейка -> без часа ->
+символ+тип -> тип), чтение - первый уровень с достаточным числом выборок:
+O(1) на запрос из путей входа и выхода.
+"""
+
+import csv
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+# Бакеты notional (USDT): <100, <500, <2000, <10000, >=10000
+SIZE_BUCKETS_USD = (100.0, 500.0, 2000.0, 10000.0)
+
+# Финальные состояния ордера в канале orders
+_TERMINAL_STATES = frozenset({"filled", "canceled", "mmp_canceled"})
+
+# Типы ордеров OKX -> limit / market для модели
+_MAKER_ORDER_TYPES = frozenset({"limit", "post_only"})
+
+CellKey = Tuple[Optional[str], Optional[str], str, Optional[int], Optional[int]]
+
+
+def size_bucket(notional: Optional[float]) -> Optional[int]:
+    """Индекс бакета размера по notional в USDT (None если неизвестен)."""
+    if notional is None or notional <= 0:
+        return None
+    for i, bound in enumerate(SIZE_BUCKETS_USD):
+        if notional < bound:
+            return i
+    return len(SIZE_BUCKETS_USD)
+
+
+def normalize_order_type(ord_type: Optional[str]) -> str:
+    """limit/post_only -> limit; market/ioc/fok/optimal_limit_ioc -> market."""
+    return "limit" if str(ord_type or "").lower() in _MAKER_ORDER_TYPES else "market"
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        if value is None or value == "":
+            return None
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Ewma:
+    """Экспоненциальное среднее с числом выборок."""
+
+    __slots__ = ("mean", "count")
+
+    def __init__(self):
+        self.mean = 0.0
+        self.count = 0
+
+    def update(self, value: float, alpha: float) -> None:
+        self.count += 1
+        # Первые выборки - обычное среднее, дальше EWMA
+        weight = max(alpha, 1.0 / self.count)
+        self.mean += weight * (value - self.mean)
+
+
+class _CostCell:
+    __slots__ = ("slippage_bps", "fee_rate", "fill_time_sec", "fill_prob")
+
+    def __init__(self):
+        self.slippage_bps = _Ewma()
+        self.fee_rate = _Ewma()
+        self.fill_time_sec = _Ewma()
+        self.fill_prob = _Ewma()
+
+
+class _OrderTrack:
+    """Ордер в работе: цена-ориентир и накопленные исполнения."""
+
+    __slots__ = (
+        "symbol",
+        "side",
+        "order_type",
+        "notional",
+        "ref_price",
+        "created_ts",
+        "filled_notional",
+        "fill_px_sum",
+        "fill_sz_sum",
+        "first_fill_ts",
+        "trade_ids",
+    )
+
+    def __init__(self, symbol, side, order_type, notional, ref_price, created_ts):
+        self.symbol = symbol
+        self.side = side
+        self.order_type = order_type
+        self.notional = notional
+        self.ref_price = ref_price
+        self.created_ts = created_ts
+        self.filled_notional = 0.0
+        self.fill_px_sum = 0.0
+        self.fill_sz_sum = 0.0
+        self.first_fill_ts: Optional[float] = None
+        self.trade_ids = set()
+
+
+@dataclass(frozen=True)
+class ExecutionEstimate:
+    """Оценка исполнения; None - нет данных (используются статичные значения)."""
+
+    slippage_bps: Optional[float]
+    fee_rate: Optional[float]
+    maker_fill_prob: Optional[float]
+    time_to_fill_sec: Optional[float]
+    samples: int
+
+
+class ExecutionCostModel:
+    """
+    Потоковые оценки стоимости исполнения по символу/стороне/типу/размеру/часу.
+
+    Использование:
+        costs = ExecutionCostModel(config, quote_source=registry_quotes)
+        costs.on_order_update(order)  # из приватного канала orders
+        est = costs.estimate("BTC-USDT", "buy", "market", notional=250.0)
+        cost = costs.round_trip_cost("BTC-USDT")  # доля notional или None
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        quote_source: Optional[Callable[[str], Optional[Tuple[float, float]]]] = None,
+    ):
+        cfg = dict(config or {})
+        self.enabled = bool(cfg.get("enabled", True))
+        self.alpha = float(cfg.get("alpha", 0.1))
+        self.min_samples = int(cfg.get("min_samples", 5))
+        self.limit_miss_penalty_bps = float(cfg.get("limit_miss_penalty_bps", 5.0))
+        self.max_tracked_orders = int(cfg.get("max_tracked_orders", 2000))
+        self.quote_source = quote_source
+
+        self._cells: Dict[CellKey, _CostCell] = {}
+        self._orders: "OrderedDict[str, _OrderTrack]" = OrderedDict()
+        # Завершенные ордера: повторные события не создают ордер заново
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self.stats = {"fills": 0, "orders": 0, "journal_rows": 0}
+
+    # ------------------------------------------------------------------
+    # Ввод данных
+    # ------------------------------------------------------------------
+
+    def on_order_placed(
+        self,
+        order_id: str,
+        symbol: str,
+        side: str,
+        order_type: str,
+        notional: Optional[float] = None,
+        ref_price: Optional[float] = None,
+    ) -> None:
+        """
+        Зарегистрировать размещенный ордер с ценой-ориентиром (bid/ask на момент решения).
+
+        Если события ордера уже пришли из WS раньше ответа на размещение,
+        уточняется только ориентир и размер.
+        """
+        if not self.enabled or not order_id or order_id in self._finished:
+            return
+        track = self._orders.get(order_id)
+        if track is None:
+            self._track(
+                order_id,
+                _OrderTrack(
+                    symbol,
+                    str(side).lower(),
+                    normalize_order_type(order_type),
+                    notional,
+                    ref_price,
+                    time.time(),
+                ),
+            )
+            return
+        if ref_price:
+            track.ref_price = ref_price
+        if notional:
+            track.notional = notional
+
+    def on_order_update(self, order: Dict[str, Any]) -> None:
+        """Обработать событие канала orders (исполнение и/или смена состояния)."""
+        if not self.enabled:
+            return
+        order_id = order.get("ordId")
+        if not order_id or order_id in self._finished:
+            return
+        track = self._orders.get(order_id)
+        if track is None:
+            track = self._track_from_event(order_id, order)
+            if track is None:
+                return
+        # Время создания - по часам биржи, как и fillTime
+        created_ms = _float(order.get("cTime"))
+        if created_ms:
+            track.created_ts = created_ms / 1000.0
+
+        fill_sz = _float(order.get("fillSz")) or 0.0
+        trade_id = order.get("tradeId")
+        if fill_sz > 0 and trade_id not in track.trade_ids:
+            if trade_id:
+                track.trade_ids.add(trade_id)
+            self._on_fill(track, order, fill_sz)
+
+        state = order.get("state")
+        if state in _TERMINAL_STATES:
+            self._on_terminal(order_id, track, order)
+
+    def ingest_journal(self, path: str) -> int:
+        """
+        Загрузить исполнения market-ордеров из журнала (строки orders, status=filled).
+
+        Returns:
+            Количество учтенных строк
+        """
+        count = 0
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    if row.get("record_type") != "orders":
+                        continue
+                    if row.get("status") != "filled":
+                        continue
+                    fill_price = _float(row.get("fill_price"))
+                    fill_size = _float(row.get("fill_size")) or _float(row.get("size"))
+                    notional = (
+                        fill_price * fill_size if fill_price and fill_size else None
+                    )
+                    hour = None
+                    try:
+                        hour = datetime.fromisoformat(row.get("timestamp", "")).hour
+                    except (TypeError, ValueError):
+                        pass
+                    keys = self._keys(
+                        row.get("symbol"),
+                        str(row.get("side", "")).lower(),
+                        normalize_order_type(row.get("order_type")),
+                        size_bucket(notional),
+                        hour,
+                    )
+                    # В журнале slippage - в процентах
+                    slippage_pct = _float(row.get("slippage"))
+                    latency_ms = _float(row.get("execution_time_ms"))
+                    for cell in keys:
+                        if slippage_pct is not None:
+                            cell.slippage_bps.update(slippage_pct * 100.0, self.alpha)
+                        if latency_ms is not None:
+                            cell.fill_time_sec.update(latency_ms / 1000.0, self.alpha)
+                    count += 1
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logger.warning(f"⚠️ ExecutionCostModel: ошибка чтения журнала {path}: {e}")
+        self.stats["journal_rows"] += count
+        return count
+
+    def ingest_journal_dir(self, logs_dir: str = "logs", days: int = 3) -> int:
+        """Загрузить последние days файлов all_data_*.csv."""
+        files = sorted(Path(logs_dir).glob("all_data_*.csv"))[-days:]
+        total = sum(self.ingest_journal(str(path)) for path in files)
+        if total:
+            logger.info(
+                f"📊 ExecutionCostModel: из журнала учтено {total} исполнений "
+                f"({len(files)} файлов)"
+            )
+        return total
+
+    # ------------------------------------------------------------------
+    # Запросы (O(1))
+    # ------------------------------------------------------------------
+
+    def estimate(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        notional: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> ExecutionEstimate:
+        """Оценка исполнения: каждая величина - с самого точного уровня с данными."""
+        hour = time.gmtime(now if now is not None else time.time()).tm_hour
+        cells = [
+            self._cells.get(key)
+            for key in self._key_tuple(
+                symbol,
+                str(side).lower(),
+                normalize_order_type(order_type),
+                size_bucket(notional),
+                hour,
+            )
+        ]
+        slippage = self._pick(cells, "slippage_bps")
+        fee = self._pick(cells, "fee_rate")
+        fill_prob = self._pick(cells, "fill_prob")
+        fill_time = self._pick(cells, "fill_time_sec")
+        return ExecutionEstimate(
+            slippage_bps=slippage.mean if slippage else None,
+            fee_rate=fee.mean if fee else None,
+            maker_fill_prob=fill_prob.mean if fill_prob else None,
+            time_to_fill_sec=fill_time.mean if fill_time else None,
+            samples=max(
+                (m.count for m in (slippage, fee, fill_prob, fill_time) if m),
+                default=0,
+            ),
+        )
+
+    def fee_rate(self, symbol: str, order_type: str) -> Optional[float]:
+        """Эффективная комиссия за сторону для типа ордера (None - мало данных)."""
+        cells = [
+            self._cells.get(key)
+            for key in (
+                (symbol, None, normalize_order_type(order_type), None, None),
+                (None, None, normalize_order_type(order_type), None, None),
+            )
+        ]
+        fee = self._pick(cells, "fee_rate")
+        return fee.mean if fee else None
+
+    def round_trip_cost(
+        self,
+        symbol: str,
+        entry_type: str = "limit",
+        exit_side: Optional[str] = None,
+        notional: Optional[float] = None,
+    ) -> Optional[float]:
+        """
+        Стоимость круга (доля notional): комиссия входа + комиссия и
+        проскальзывание market-выхода. None - пока не хватает данных.
+        """
+        entry_fee = self.fee_rate(symbol, entry_type)
+        exit_est = self.estimate(symbol, exit_side or "", "market", notional)
+        if entry_fee is None or exit_est.fee_rate is None:
+            return None
+        slippage = max(0.0, exit_est.slippage_bps or 0.0) / 1e4
+        return entry_fee + exit_est.fee_rate + slippage
+
+    def preferred_entry_type(
+        self, symbol: str, side: str, notional: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        "market" если ожидаемая стоимость лимитного входа выше market:
+        p * maker + (1 - p) * (market + штраф за ожидание) > market.
+        None - данных недостаточно, решает конфиг.
+        """
+        limit_est = self.estimate(symbol, side, "limit", notional)
+        market_est = self.estimate(symbol, side, "market", notional)
+        p = limit_est.maker_fill_prob
+        if p is None or limit_est.fee_rate is None or market_est.fee_rate is None:
+            return None
+        market_cost = (
+            market_est.fee_rate + max(0.0, market_est.slippage_bps or 0.0) / 1e4
+        )
+        limit_cost = p * limit_est.fee_rate + (1.0 - p) * (
+            market_cost + self.limit_miss_penalty_bps / 1e4
+        )
+        return "market" if limit_cost > market_cost else "limit"
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "cells": len(self._cells),
+            "tracked_orders": len(self._orders),
+        }
+
+    # ------------------------------------------------------------------
+    # Внутреннее
+    # ------------------------------------------------------------------
+
+    def _track(self, order_id: str, track: _OrderTrack) -> None:
+        self._orders[order_id] = track
+        while len(self._orders) > self.max_tracked_orders:
+            self._orders.popitem(last=False)
+
+    def _track_from_event(
+        self, order_id: str, order: Dict[str, Any]
+    ) -> Optional[_OrderTrack]:
+        """Ордер, размещенный в обход on_order_placed: ориентир - текущие bid/ask."""
+        symbol = str(order.get("instId", "")).replace("-SWAP", "")
+        side = str(order.get("side", "")).lower()
+        if not symbol or side not in ("buy", "sell"):
+            return None
+        ref_price = None
+        if self.quote_source is not None:
+            try:
+                quote = self.quote_source(symbol)
+            except Exception:
+                quote = None
+            if quote:
+                bid, ask = quote
+                ref_price = ask if side == "buy" else bid
+        created_ms = _float(order.get("cTime"))
+        track = _OrderTrack(
+            symbol,
+            side,
+            normalize_order_type(order.get("ordType")),
+            _float(order.get("notionalUsd")),
+            ref_price,
+            created_ms / 1000.0 if created_ms else time.time(),
+        )
+        self._track(order_id, track)
+        return track
+
+    def _on_fill(self, track: _OrderTrack, order: Dict[str, Any], fill_sz: float):
+        fill_px = _float(order.get("fillPx"))
+        fill_ms = _float(order.get("fillTime")) or _float(order.get("uTime"))
+        fill_ts = fill_ms / 1000.0 if fill_ms else time.time()
+        notional = _float(order.get("fillNotionalUsd"))
+        fee = _float(order.get("fillFee"))
+
+        keys = self._keys(
+            track.symbol,
+            track.side,
+            track.order_type,
+            size_bucket(track.notional or notional),
+            time.gmtime(fill_ts).tm_hour,
+        )
+        # OKX: fillFee < 0 - списание, > 0 - ребейт
+        if fee is not None and notional:
+            for cell in keys:
+                cell.fee_rate.update(-fee / notional, self.alpha)
+        if track.first_fill_ts is None:
+            track.first_fill_ts = fill_ts
+            wait = max(0.0, fill_ts - track.created_ts)
+            for cell in keys:
+                cell.fill_time_sec.update(wait, self.alpha)
+        if fill_px:
+            track.fill_px_sum += fill_px * fill_sz
+            track.fill_sz_sum += fill_sz
+        if notional:
+            track.filled_notional += notional
+        self.stats["fills"] += 1
+
+    def _on_terminal(self, order_id: str, track: _OrderTrack, order: Dict[str, Any]):
+        self._orders.pop(order_id, None)
+        self._finished[order_id] = None
+        while len(self._finished) > self.max_tracked_orders:
+            self._finished.popitem(last=False)
+        acc_fill = _float(order.get("accFillSz")) or track.fill_sz_sum
+        ts_ms = _float(order.get("uTime"))
+        keys = self._keys(
+            track.symbol,
+            track.side,
+            track.order_type,
+            size_bucket(track.notional or track.filled_notional or None),
+            time.gmtime(ts_ms / 1000.0 if ts_ms else time.time()).tm_hour,
+        )
+        if track.order_type == "limit":
+            filled = 1.0 if acc_fill and acc_fill > 0 else 0.0
+            for cell in keys:
+                cell.fill_prob.update(filled, self.alpha)
+        avg_px = _float(order.get("avgPx"))
+        if not avg_px and track.fill_sz_sum > 0:
+            avg_px = track.fill_px_sum / track.fill_sz_sum
+        if avg_px and track.ref_price:
+            if track.side == "buy":
+                slippage = (avg_px - track.ref_price) / track.ref_price * 1e4
+            else:
+                slippage = (track.ref_price - avg_px) / track.ref_price * 1e4
+            for cell in keys:
+                cell.slippage_bps.update(slippage, self.alpha)
+        self.stats["orders"] += 1
+
+    @staticmethod
+    def _key_tuple(symbol, side, order_type, bucket, hour) -> Tuple[CellKey, ...]:
+        return (
+            (symbol, side, order_type, bucket, hour),
+            (symbol, side, order_type, bucket, None),
+            (symbol, None, order_type, None, None),
+            (None, None, order_type, None, None),
+        )
+
+    def _keys(self, symbol, side, order_type, bucket, hour):
+        cells = []
+        for key in self._key_tuple(symbol, side, order_type, bucket, hour):
+            cell = self._cells.get(key)
+            if cell is None:
+                cell = self._cells[key] = _CostCell()
+            cells.append(cell)
+        return cells
+
+    def _pick(self, cells, metric: str) -> Optional[_Ewma]:
+        for cell in cells:
+            if cell is None:
+                continue
+            value = getattr(cell, metric)
+            if value.count >= self.min_samples:
+                return value
+        return None
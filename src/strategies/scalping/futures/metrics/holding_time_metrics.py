@@ -8,12 +8,14 @@ Holding Time Metrics - Отслеживание времени удержани
 - Распределение времени удержания
 """
 
-from collections import defaultdict
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from loguru import logger
 
+from src.utils.window_metrics import WindowAggregate, WindowedMetrics
+
 
 class HoldingTimeMetrics:
     """
@@ -22,26 +24,21 @@ class HoldingTimeMetrics:
     Отслеживает время от открытия до закрытия позиций.
     """
 
-    def __init__(self):
-        """Инициализация Holding Time Metrics."""
-        # История позиций
-        self._positions_history: List[Dict[str, Any]] = []
-        self._max_history_size = 10000
+    HOLDING_METRIC = "holding_time"
 
-        # Статистика по режимам
-        self.holding_times_by_regime: Dict[str, List[float]] = defaultdict(
-            list
-        )  # {regime: [seconds, ...]}
+    def __init__(self, metrics_store: Optional[WindowedMetrics] = None):
+        """
+        Инициализация Holding Time Metrics.
 
-        # Статистика по типам выхода
-        self.holding_times_by_exit: Dict[str, List[float]] = defaultdict(
-            list
-        )  # {exit_reason: [seconds, ...]}
+        Args:
+            metrics_store: Общее хранилище оконных метрик (по умолчанию свое)
+        """
+        # Закрытые позиции - в оконных бакетах (symbol/regime/reason)
+        self.metrics = metrics_store or WindowedMetrics()
 
-        # Статистика по символам
-        self.holding_times_by_symbol: Dict[str, List[float]] = defaultdict(
-            list
-        )  # {symbol: [seconds, ...]}
+        # Открытые позиции ждут закрытия: {position_id: {...}}
+        self._open_positions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._max_open_positions = 10000
 
         logger.info("✅ HoldingTimeMetrics инициализирован")
 
@@ -59,21 +56,18 @@ class HoldingTimeMetrics:
             regime: Режим рынка
             position_id: ID позиции (для связи с закрытием)
         """
-        self._positions_history.append(
-            {
-                "position_id": position_id or f"{symbol}_{datetime.now().timestamp()}",
-                "symbol": symbol,
-                "regime": regime,
-                "opened_at": datetime.now(),
-                "closed_at": None,
-                "exit_reason": None,
-                "holding_seconds": None,
-            }
-        )
+        opened_at = datetime.now()
+        position_id = position_id or f"{symbol}_{opened_at.timestamp()}"
+        self._open_positions.pop(position_id, None)
+        self._open_positions[position_id] = {
+            "symbol": symbol,
+            "regime": regime,
+            "opened_at": opened_at,
+        }
 
-        # Ограничиваем размер истории
-        if len(self._positions_history) > self._max_history_size:
-            self._positions_history = self._positions_history[-self._max_history_size :]
+        # Ограничиваем число "висящих" открытий (закрытие могло потеряться)
+        while len(self._open_positions) > self._max_open_positions:
+            self._open_positions.popitem(last=False)
 
     def record_position_closed(
         self,
@@ -93,56 +87,31 @@ class HoldingTimeMetrics:
         """
         closed_at = datetime.now()
 
-        # Ищем позицию в истории
+        # Ищем открытую позицию по ID
         position = None
         if position_id:
-            for pos in reversed(self._positions_history):
-                if (
-                    pos.get("position_id") == position_id
-                    and pos.get("closed_at") is None
-                ):
-                    position = pos
-                    break
+            position = self._open_positions.pop(position_id, None)
 
         # Если не нашли по ID, ищем по символу и времени открытия
         if not position and opened_at:
-            for pos in reversed(self._positions_history):
-                if (
-                    pos.get("symbol") == symbol
-                    and pos.get("opened_at") == opened_at
-                    and pos.get("closed_at") is None
-                ):
-                    position = pos
+            for pid, pos in reversed(self._open_positions.items()):
+                if pos["symbol"] == symbol and pos["opened_at"] == opened_at:
+                    position = self._open_positions.pop(pid)
                     break
 
-        # Если не нашли, создаем новую запись
-        if not position:
-            position = {
-                "position_id": position_id or f"{symbol}_{closed_at.timestamp()}",
-                "symbol": symbol,
-                "regime": None,
-                "opened_at": opened_at or closed_at,
-                "closed_at": None,
-                "exit_reason": None,
-                "holding_seconds": None,
-            }
-            self._positions_history.append(position)
-
-        # Обновляем позицию
-        position["closed_at"] = closed_at
-        position["exit_reason"] = exit_reason
-
-        # Рассчитываем время удержания
-        if position["opened_at"]:
-            holding_seconds = (closed_at - position["opened_at"]).total_seconds()
-            position["holding_seconds"] = holding_seconds
+        regime = position.get("regime") if position else None
+        start = position["opened_at"] if position else (opened_at or closed_at)
+        holding_seconds = (closed_at - start).total_seconds()
 
-            # Добавляем в статистику
-            if position.get("regime"):
-                self.holding_times_by_regime[position["regime"]].append(holding_seconds)
-
-            self.holding_times_by_exit[exit_reason].append(holding_seconds)
-            self.holding_times_by_symbol[symbol].append(holding_seconds)
+        self.metrics.record(
+            self.HOLDING_METRIC,
+            holding_seconds,
+            ts=closed_at,
+            symbol=symbol,
+            regime=regime,
+            reason=exit_reason,
+            histogram=True,
+        )
 
     def record_holding_time(
         self,
@@ -174,6 +143,21 @@ class HoldingTimeMetrics:
             opened_at=opened_at,
         )
 
+    def _query(
+        self,
+        period_hours: float,
+        symbol: Optional[str] = None,
+        regime: Optional[str] = None,
+        exit_reason: Optional[str] = None,
+    ) -> WindowAggregate:
+        return self.metrics.query(
+            self.HOLDING_METRIC,
+            period_hours * 3600,
+            symbol=symbol or None,
+            regime=regime or None,
+            reason=exit_reason or None,
+        )
+
     def get_average_holding_time(
         self,
         symbol: Optional[str] = None,
@@ -193,43 +177,14 @@ class HoldingTimeMetrics:
         Returns:
             Среднее время удержания в секундах
         """
-        cutoff_time = datetime.now() - timedelta(hours=period_hours)
-
-        # Фильтруем закрытые позиции за период
-        closed_positions = [
-            p
-            for p in self._positions_history
-            if p.get("closed_at")
-            and p.get("closed_at") >= cutoff_time
-            and p.get("holding_seconds") is not None
-        ]
-
-        if symbol:
-            closed_positions = [
-                p for p in closed_positions if p.get("symbol") == symbol
-            ]
-
-        if regime:
-            closed_positions = [
-                p for p in closed_positions if p.get("regime") == regime
-            ]
-
-        if exit_reason:
-            closed_positions = [
-                p for p in closed_positions if p.get("exit_reason") == exit_reason
-            ]
-
-        if not closed_positions:
-            return 0.0
-
-        total_seconds = sum(p.get("holding_seconds", 0) for p in closed_positions)
-        return total_seconds / len(closed_positions)
+        return self._query(period_hours, symbol, regime, exit_reason).mean
 
     def get_holding_time_stats(
         self,
         symbol: Optional[str] = None,
         regime: Optional[str] = None,
         period_hours: int = 24,
+        exit_reason: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Получить статистику времени удержания.
@@ -238,40 +193,21 @@ class HoldingTimeMetrics:
             symbol: Торговый символ (если None - все символы)
             regime: Режим рынка (если None - все режимы)
             period_hours: Период для расчета (часы)
+            exit_reason: Причина закрытия (если None - все причины)
 
         Returns:
             Словарь со статистикой:
             {
                 "average": float,
-                "median": float,
+                "median": float,  # приближенная, по лог-гистограмме (~2.5%)
                 "min": float,
                 "max": float,
                 "count": int,
                 "by_exit_reason": {exit_reason: average_seconds},
             }
         """
-        cutoff_time = datetime.now() - timedelta(hours=period_hours)
-
-        # Фильтруем закрытые позиции за период
-        closed_positions = [
-            p
-            for p in self._positions_history
-            if p.get("closed_at")
-            and p.get("closed_at") >= cutoff_time
-            and p.get("holding_seconds") is not None
-        ]
-
-        if symbol:
-            closed_positions = [
-                p for p in closed_positions if p.get("symbol") == symbol
-            ]
-
-        if regime:
-            closed_positions = [
-                p for p in closed_positions if p.get("regime") == regime
-            ]
-
-        if not closed_positions:
+        total = self._query(period_hours, symbol, regime, exit_reason)
+        if not total.count:
             return {
                 "average": 0.0,
                 "median": 0.0,
@@ -281,27 +217,34 @@ class HoldingTimeMetrics:
                 "by_exit_reason": {},
             }
 
-        holding_times = [p.get("holding_seconds", 0) for p in closed_positions]
-        holding_times.sort()
-
-        # Статистика по причинам выхода
-        by_exit_reason = defaultdict(list)
-        for p in closed_positions:
-            exit_reason = p.get("exit_reason", "unknown")
-            by_exit_reason[exit_reason].append(p.get("holding_seconds", 0))
+        by_exit_reason = self.metrics.group_by(
+            self.HOLDING_METRIC,
+            "reason",
+            period_hours * 3600,
+            symbol=symbol or None,
+            regime=regime or None,
+            reason=exit_reason or None,
+        )
 
-        exit_stats = {
-            reason: sum(times) / len(times) if times else 0.0
-            for reason, times in by_exit_reason.items()
+        return {
+            "average": total.mean,
+            "median": total.quantile(0.5),
+            "min": total.min,
+            "max": total.max,
+            "count": total.count,
+            "by_exit_reason": {
+                reason: agg.mean for reason, agg in by_exit_reason.items()
+            },
         }
 
+    def _stats_by(self, label: str, period_hours: int) -> Dict[str, Dict[str, Any]]:
+        values = self.metrics.group_by(self.HOLDING_METRIC, label, period_hours * 3600)
+        key = "exit_reason" if label == "reason" else label
         return {
-            "average": sum(holding_times) / len(holding_times),
-            "median": holding_times[len(holding_times) // 2] if holding_times else 0.0,
-            "min": min(holding_times) if holding_times else 0.0,
-            "max": max(holding_times) if holding_times else 0.0,
-            "count": len(holding_times),
-            "by_exit_reason": exit_stats,
+            value: self.get_holding_time_stats(
+                period_hours=period_hours, **{key: value}
+            )
+            for value in values
         }
 
     def get_regime_stats(self, period_hours: int = 24) -> Dict[str, Dict[str, Any]]:
@@ -314,14 +257,7 @@ class HoldingTimeMetrics:
         Returns:
             Словарь {regime: {average, median, min, max, count}}
         """
-        stats = {}
-        for regime in self.holding_times_by_regime.keys():
-            regime_stats = self.get_holding_time_stats(
-                regime=regime, period_hours=period_hours
-            )
-            stats[regime] = regime_stats
-
-        return stats
+        return self._stats_by("regime", period_hours)
 
     def get_exit_reason_stats(
         self, period_hours: int = 24
@@ -335,14 +271,7 @@ class HoldingTimeMetrics:
         Returns:
             Словарь {exit_reason: {average, median, min, max, count}}
         """
-        stats = {}
-        for exit_reason in self.holding_times_by_exit.keys():
-            exit_stats = self.get_holding_time_stats(
-                exit_reason=exit_reason, period_hours=period_hours
-            )
-            stats[exit_reason] = exit_stats
-
-        return stats
+        return self._stats_by("reason", period_hours)
 
     def get_summary(self, period_hours: int = 24) -> Dict[str, Any]:
         """
@@ -398,8 +327,6 @@ class HoldingTimeMetrics:
 
     def reset(self) -> None:
         """Сбросить все метрики."""
-        self._positions_history.clear()
-        self.holding_times_by_regime.clear()
-        self.holding_times_by_exit.clear()
-        self.holding_times_by_symbol.clear()
+        self._open_positions.clear()
+        self.metrics.reset([self.HOLDING_METRIC])
         logger.info("✅ HoldingTimeMetrics: Все метрики сброшены")
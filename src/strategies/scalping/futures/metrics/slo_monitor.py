@@ -31,13 +31,18 @@ class SLOMonitor:
     }
 
     def __init__(
-        self, config: Optional[Any] = None, alert_manager: Optional[Any] = None
+        self,
+        config: Optional[Any] = None,
+        alert_manager: Optional[Any] = None,
+        metrics_store: Optional[Any] = None,
     ):
         self.enabled = True
         self.window_sec = self.DEFAULT_WINDOW_SEC
         self.alert_cooldown_sec = self.DEFAULT_ALERT_COOLDOWN_SEC
         self.thresholds = dict(self.DEFAULT_THRESHOLDS)
         self.alert_manager = alert_manager
+        # WindowedMetrics: оконные метрики торговли попадают в snapshot/экспорт
+        self.metrics_store = metrics_store
 
         self._event_ts: Dict[str, Deque[float]] = defaultdict(deque)
         self._decision_snapshot_events: Deque[Tuple[float, bool]] = deque()
@@ -139,8 +144,22 @@ class SLOMonitor:
             metrics[threshold_key] = self._get_rate_per_hour(event_name)
         metrics["stale_ratio"] = self._get_stale_ratio()
         metrics["window_sec"] = self.window_sec
+        if self.metrics_store is not None:
+            metrics["windowed"] = self.metrics_store.snapshot(self.window_sec)
         return metrics
 
+    def to_prometheus(self, prefix: str = "scalping") -> str:
+        """Export SLO rates and windowed trading metrics in Prometheus text format."""
+        lines: List[str] = []
+        for key, value in self.get_snapshot().items():
+            if isinstance(value, (int, float)):
+                lines.append(f"# TYPE {prefix}_slo_{key} gauge")
+                lines.append(f"{prefix}_slo_{key} {float(value):.10g}")
+        text = "\n".join(lines) + "\n"
+        if self.metrics_store is not None:
+            text += self.metrics_store.to_prometheus(prefix, self.window_sec)
+        return text
+
     def evaluate_alerts(self) -> List[Dict[str, Any]]:
         if not self.enabled:
             return []
@@ -17,7 +17,7 @@ import time
 import zipfile
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from loguru import logger
@@ -30,12 +30,14 @@ from src.strategies.modules.liquidation_guard import LiquidationGuard
 from src.strategies.modules.slippage_guard import SlippageGuard
 from src.strategies.modules.trading_statistics import TradingStatistics
 from src.utils.telegram_notifier import TelegramNotifier
+from src.utils.window_metrics import WindowedMetrics
 
 from ..spot.performance_tracker import PerformanceTracker
 
 # ✅ РЕФАКТОРИНГ: Импортируем новые модули
 from .calculations.margin_calculator import MarginCalculator
 from .config.config_manager import ConfigManager
+from .config.config_reloader import ConfigHotReloader
 from .config.config_view import get_scalping_view
 from .config.parameter_provider import ParameterProvider
 from .coordinators.exit_decision_coordinator import (
@@ -49,33 +51,50 @@ from .coordinators.signal_coordinator import SignalCoordinator
 from .coordinators.smart_exit_coordinator import SmartExitCoordinator
 from .coordinators.trailing_sl_coordinator import TrailingSLCoordinator
 from .coordinators.websocket_coordinator import WebSocketCoordinator
+from .core.account_state import AccountStateCache
 from .core.data_registry import DataRegistry
 from .core.exit_guard import ExitGuard
 from .core.position_registry import PositionRegistry
 from .core.position_sync import PositionSync
+from .core.recovery_planner import (
+    PRIORITY_COSMETIC,
+    PRIORITY_MARKET_DATA,
+    PRIORITY_PROTECTIVE,
+    RecoveryPlanner,
+    RestRateLimiter,
+)
 from .core.trading_control_center import TradingControlCenter
 from .indicators.fast_adx import FastADX
 from .indicators.funding_rate_monitor import FundingRateMonitor
 from .indicators.order_flow_indicator import OrderFlowIndicator
 from .logging.logger_factory import LoggerFactory
 from .logging.structured_logger import StructuredLogger
+from .metrics.execution_costs import ExecutionCostModel
 from .order_executor import FuturesOrderExecutor
 from .parameters.parameter_orchestrator import ParameterOrchestrator
 from .position_manager import FuturesPositionManager
 from .positions.entry_manager import EntryManager
+from .positions.exchange_stop_manager import ExchangeStopManager
 from .positions.exit_analyzer import (
     ExitAnalyzer,  # ✅ НОВОЕ: ExitAnalyzer для анализа закрытия
 )
+from .positions.order_chaser import LimitOrderChaser
 from .positions.position_monitor import (
     PositionMonitor,  # ✅ НОВОЕ: PositionMonitor для периодического мониторинга позиций
 )
 from .positions.position_scaling_manager import PositionScalingManager
 from .private_websocket_manager import PrivateWebSocketManager
+from .recording import FrameRecorder
 from .risk.adaptive_leverage import AdaptiveLeverage
 from .risk.max_size_limiter import MaxSizeLimiter
+from .risk.portfolio_risk import PortfolioRiskEngine
 from .risk_manager import FuturesRiskManager
 from .signal_generator import FuturesSignalGenerator
 from .websocket_manager import FuturesWebSocketManager
+from .websocket_pool import PublicWebSocketPool
+
+# Шаги старта, без которых торговля не разрешается даже после дедлайна
+_PROTECTIVE_STARTUP_STEPS = ("positions", "sync_positions")
 
 
 class FuturesScalpingOrchestrator:
@@ -141,6 +160,7 @@ class FuturesScalpingOrchestrator:
         from pathlib import Path
 
         raw_config_dict = {}
+        self._config_path: Optional[str] = None
         try:
             # Пробуем найти config файл
             config_paths = [
@@ -153,6 +173,7 @@ class FuturesScalpingOrchestrator:
                 if config_file.exists():
                     with open(config_file, "r", encoding="utf-8") as f:
                         raw_config_dict = load_yaml_strict(f)
+                    self._config_path = config_path
                     logger.debug(f"✅ Raw config загружен из {config_path}")
                     break
         except Exception as e:
@@ -281,12 +302,19 @@ class FuturesScalpingOrchestrator:
             margin_mode=margin_mode,
         )
 
+        # Снимок аккаунта (equity, маржа, позиции) из private WS; REST - только сверка
+        account_cfg = getattr(self.scalping_config, "account_state", {}) or {}
+        if not isinstance(account_cfg, dict):
+            account_cfg = dict(getattr(account_cfg, "__dict__", {}) or {})
+        self.account_state = AccountStateCache(self.client, account_cfg)
+
         self.exit_guard = ExitGuard(
             config=self.scalping_config,
             data_registry=self.data_registry,
             position_registry=self.position_registry,
             client=self.client,
             parameter_provider=self.parameter_provider,
+            account_state=self.account_state,
         )
         logger.info("ExitGuard initialized")
 
@@ -410,8 +438,29 @@ class FuturesScalpingOrchestrator:
             slippage_config_full if slippage_config_full else slippage_config
         )
 
+        # Стоимость исполнения по нашим fill'ам (канал orders + журнал сделок):
+        # комиссии, проскальзывание, исполнение лимиток (scalping.execution_costs)
+        costs_cfg = getattr(self.scalping_config, "execution_costs", {}) or {}
+        if not isinstance(costs_cfg, dict):
+            costs_cfg = dict(getattr(costs_cfg, "__dict__", {}) or {})
+        self.execution_costs = ExecutionCostModel(
+            costs_cfg, quote_source=self._best_quote
+        )
+        self.slippage_guard.execution_costs = self.execution_costs
+        self.exit_guard.execution_costs = self.execution_costs
+
+        # ✅ Общее хранилище оконных метрик (статистика, конверсия, удержание, алерты)
+        metrics_store_cfg = getattr(self.scalping_config, "metrics_store", {}) or {}
+        self.metrics_store = WindowedMetrics(
+            bucket_seconds=float(metrics_store_cfg.get("bucket_sec", 60)),
+            retention_seconds=float(metrics_store_cfg.get("retention_hours", 24))
+            * 3600,
+        )
+
         # ✅ НОВОЕ: Модуль статистики для динамической адаптации
-        self.trading_statistics = TradingStatistics(lookback_hours=24)
+        self.trading_statistics = TradingStatistics(
+            lookback_hours=24, metrics_store=self.metrics_store
+        )
 
         # Торговые модули
         # ✅ Передаем клиент в signal_generator для инициализации фильтров
@@ -440,11 +489,17 @@ class FuturesScalpingOrchestrator:
         from .metrics.holding_time_metrics import HoldingTimeMetrics
         from .metrics.slo_monitor import SLOMonitor
 
-        self.conversion_metrics = ConversionMetrics()
-        self.holding_time_metrics = HoldingTimeMetrics()
-        self.alert_manager = AlertManager()
+        self.conversion_metrics = ConversionMetrics(metrics_store=self.metrics_store)
+        self.holding_time_metrics = HoldingTimeMetrics(metrics_store=self.metrics_store)
+        self.alert_manager = AlertManager(
+            conversion_metrics=self.conversion_metrics,
+            holding_time_metrics=self.holding_time_metrics,
+            metrics_store=self.metrics_store,
+        )
         self.slo_monitor = SLOMonitor(
-            config=self.scalping_config, alert_manager=self.alert_manager
+            config=self.scalping_config,
+            alert_manager=self.alert_manager,
+            metrics_store=self.metrics_store,
         )
         logger.info(
             "✅ Метрики инициализированы: ConversionMetrics, HoldingTimeMetrics, AlertManager, SLOMonitor"
@@ -506,6 +561,7 @@ class FuturesScalpingOrchestrator:
             self.order_executor.set_signal_generator(self.signal_generator)
         if hasattr(self.signal_generator, "set_performance_tracker"):
             self.signal_generator.set_performance_tracker(self.performance_tracker)
+        self.order_executor.set_execution_costs(self.execution_costs)
 
         # Telegram: инициализация и подключение к order_executor
         self.telegram = TelegramNotifier()
@@ -639,10 +695,24 @@ class FuturesScalpingOrchestrator:
             exit_analyzer=self.exit_analyzer,  # ✅ НОВОЕ: Передаем ExitAnalyzer для анализа закрытия (fallback)
             position_registry=self.position_registry,  # ✅ НОВОЕ (09.01.2026): Передаем PositionRegistry для доступа к DataRegistry
         )
+        # Комиссионный порог ExitGuard - граница безубытка в плане выхода
+        self.trailing_sl_coordinator.set_exit_guard(self.exit_guard)
+        self.trailing_sl_coordinator.set_execution_costs(self.execution_costs)
         # Для совместимости с существующими модулями (PositionManager)
         self.trailing_sl_by_symbol = self.trailing_sl_coordinator.trailing_sl_by_symbol
         logger.info("✅ TrailingSLCoordinator инициализирован в orchestrator")
 
+        # Биржевые стопы: уровень TSL зеркалируется в conditional SL, amend пачками
+        # с ratchet/гистерезисом и лимитом запросов (scalping.exchange_stops)
+        self.exchange_stops: Optional[ExchangeStopManager] = None
+        stops_cfg = getattr(self.scalping_config, "exchange_stops", {}) or {}
+        if not isinstance(stops_cfg, dict):
+            stops_cfg = dict(getattr(stops_cfg, "__dict__", {}) or {})
+        if stops_cfg.get("enabled", True):
+            self.exchange_stops = ExchangeStopManager(self.client, stops_cfg)
+            self.entry_manager.set_exchange_stops(self.exchange_stops)
+            self.trailing_sl_coordinator.set_exchange_stops(self.exchange_stops)
+
         # ✅ НОВОЕ (26.12.2025): Инициализация ExitDecisionCoordinator
         # Получаем smart_exit_coordinator если он есть
         smart_exit_coordinator = getattr(self, "smart_exit_coordinator", None)
@@ -763,6 +833,7 @@ class FuturesScalpingOrchestrator:
 
         # ✅ ИСПРАВЛЕНИЕ #3: Инициализируем AdaptiveLeverage для адаптивного левериджа
         self.adaptive_leverage = AdaptiveLeverage(config=config)
+        self.adaptive_leverage.set_account_state(self.account_state)
         logger.info("✅ AdaptiveLeverage инициализирован")
 
         # ✅ ИСПРАВЛЕНИЕ #7, #8: Инициализируем LiquidationProtector и MarginMonitor
@@ -776,6 +847,17 @@ class FuturesScalpingOrchestrator:
         self.margin_monitor = MarginMonitor(
             config=config.risk if hasattr(config, "risk") else None
         )
+
+        # Векторный риск портфеля: позиции из снимка аккаунта, цены из WS
+        portfolio_cfg = getattr(self.scalping_config, "portfolio_risk", {}) or {}
+        if not isinstance(portfolio_cfg, dict):
+            portfolio_cfg = dict(getattr(portfolio_cfg, "__dict__", {}) or {})
+        self.portfolio_risk = PortfolioRiskEngine(
+            portfolio_cfg, margin_calculator=self.margin_calculator
+        )
+        self.account_state.subscribe(self.portfolio_risk.sync_snapshot)
+        self.portfolio_risk.set_correlation_source(self._get_correlation_matrix)
+        self.liquidation_protector.set_portfolio_risk(self.portfolio_risk)
         logger.info("✅ LiquidationProtector и MarginMonitor инициализированы")
 
         # ✅ РЕФАКТОРИНГ: Инициализируем RiskManager для расчета размера позиций
@@ -789,6 +871,8 @@ class FuturesScalpingOrchestrator:
             max_size_limiter=self.max_size_limiter,
             orchestrator=self,  # ✅ РЕФАКТОРИНГ: Передаем ссылку на orchestrator
             data_registry=self.data_registry,  # ✅ НОВОЕ: DataRegistry для чтения баланса
+            account_state=self.account_state,
+            portfolio_risk=self.portfolio_risk,
         )
         logger.info("✅ FuturesRiskManager инициализирован")
 
@@ -801,6 +885,7 @@ class FuturesScalpingOrchestrator:
             margin_calculator=self.margin_calculator,
             client=self.client,
             config=self.config,
+            account_state=self.account_state,
         )
         logger.info("✅ PositionScalingManager инициализирован в orchestrator")
 
@@ -816,7 +901,15 @@ class FuturesScalpingOrchestrator:
             ws_url = "wss://ws.okx.com:8443/ws/v5/public"  # Production Public WebSocket (одинаков для обоих)
             logger.info("📡 Используется PRODUCTION Public WebSocket (ws.okx.com:8443)")
 
-        self.ws_manager = FuturesWebSocketManager(ws_url=ws_url)
+        # Публичные подписки на N соединениях с ребалансировкой символов по
+        # частоте сообщений (scalping.public_ws); connections=1 - одно соединение
+        public_ws_cfg = getattr(self.scalping_config, "public_ws", {}) or {}
+        if not isinstance(public_ws_cfg, dict):
+            public_ws_cfg = dict(getattr(public_ws_cfg, "__dict__", {}) or {})
+        if int(public_ws_cfg.get("connections", 2) or 1) > 1:
+            self.ws_manager = PublicWebSocketPool(ws_url, public_ws_cfg)
+        else:
+            self.ws_manager = FuturesWebSocketManager(ws_url=ws_url)
 
         # ✅ МОДЕРНИЗАЦИЯ #2: Private WebSocket для мониторинга позиций/ордеров
         self.private_ws_manager: Optional[PrivateWebSocketManager] = None
@@ -827,12 +920,40 @@ class FuturesScalpingOrchestrator:
                 passphrase=okx_config.passphrase,
                 sandbox=okx_config.sandbox,
             )
+            self.private_ws_manager.reconnect_callback = self._recover_after_reconnect
             logger.info("✅ Private WebSocket Manager инициализирован")
         except Exception as e:
             logger.warning(
                 f"⚠️ Не удалось инициализировать Private WebSocket Manager: {e}"
             )
 
+        # Запись сырых WS-кадров для воспроизведения сессий (scalping.ws_recording)
+        self.frame_recorder: Optional[FrameRecorder] = None
+        rec_cfg = getattr(self.scalping_config, "ws_recording", {}) or {}
+        if not isinstance(rec_cfg, dict):
+            rec_cfg = dict(getattr(rec_cfg, "__dict__", {}) or {})
+        if rec_cfg.get("enabled", False):
+            self.frame_recorder = FrameRecorder.from_config(rec_cfg)
+            self.frame_recorder.start()
+            self.ws_manager.set_recorder(self.frame_recorder)
+            if self.private_ws_manager:
+                self.private_ws_manager.set_recorder(self.frame_recorder)
+
+        # Торговля (place/cancel/amend/batch) через Private WebSocket, fallback на REST
+        oe_cfg = getattr(self.scalping_config, "order_executor", {}) or {}
+        ws_trading_cfg = (
+            oe_cfg.get("ws_trading", {})
+            if isinstance(oe_cfg, dict)
+            else getattr(oe_cfg, "ws_trading", {})
+        ) or {}
+        if not isinstance(ws_trading_cfg, dict):
+            ws_trading_cfg = getattr(ws_trading_cfg, "__dict__", {})
+        if self.private_ws_manager and ws_trading_cfg.get("enabled", False):
+            self.client.set_ws_trading(
+                self.private_ws_manager,
+                request_timeout=float(ws_trading_cfg.get("request_timeout_sec", 2.0)),
+            )
+
         # Состояние
         self.is_running = False
         # ✅ ПРОКСИ: active_positions теперь прокси к PositionRegistry для обратной совместимости
@@ -878,6 +999,9 @@ class FuturesScalpingOrchestrator:
         self.skipped_signals_due_init = (
             0  # Счётчик пропущенных сигналов из-за неготовности
         )
+        # Символы, готовые к торговле до общей готовности (параллельный старт)
+        self.ready_symbols = set()
+        self.last_recovery_report = None
 
         # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ: Кэш последних ордеров и задержки между сигналами
         # Кэш последних ордеров: {symbol: {order_id, timestamp, status}}
@@ -893,6 +1017,20 @@ class FuturesScalpingOrchestrator:
             structured_logger=self.structured_logger,
         )
 
+        # Лимитные входы ведутся по bbo-tbt: amend на лучшую цену по кривой
+        # срочности, market-добор в конце ожидания (scalping.order_chaser)
+        self.order_chaser: Optional[LimitOrderChaser] = None
+        chaser_cfg = getattr(self.scalping_config, "order_chaser", {}) or {}
+        if not isinstance(chaser_cfg, dict):
+            chaser_cfg = dict(getattr(chaser_cfg, "__dict__", {}) or {})
+        if chaser_cfg.get("enabled", True):
+            self.order_chaser = LimitOrderChaser(
+                self.client, chaser_cfg, executor=self.order_executor
+            )
+            self.order_executor.set_order_chaser(self.order_chaser)
+            self.order_coordinator.set_order_chaser(self.order_chaser)
+            self.order_chaser.set_replace_guard(self.order_coordinator)
+
         # Время последнего сигнала по символу: {symbol: timestamp}
         self.last_signal_time = {}
         # Недавние закрытия позиций для anti-churn gate на входе.
@@ -1110,6 +1248,11 @@ class FuturesScalpingOrchestrator:
             signal_generator=self.signal_generator,  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (27.12.2025): Для проверки готовности перед обработкой тикеров
             orchestrator=self,  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (28.12.2025): Передаем orchestrator для проверки готовности
             slo_monitor=self.slo_monitor,
+            exchange_stops=self.exchange_stops,
+            account_state=self.account_state,
+            portfolio_risk=self.portfolio_risk,
+            execution_costs=self.execution_costs,
+            order_chaser=self.order_chaser,
         )
         if self.data_registry:
             self.data_registry.set_ws_reconnect_callback(
@@ -1141,6 +1284,11 @@ class FuturesScalpingOrchestrator:
             # Подключение WebSocket (ПОСЛЕ инициализации торговых модулей)
             await self.websocket_coordinator.initialize_websocket()
 
+            if self.exchange_stops:
+                await self.exchange_stops.start()
+            if self.order_chaser:
+                await self.order_chaser.start()
+
             # Запуск модулей безопасности (после инициализации RegimeManager)
             await self._start_safety_modules()
 
@@ -1149,18 +1297,21 @@ class FuturesScalpingOrchestrator:
             # Важно: вызываем ПОСЛЕ инициализации модулей, чтобы фильтры были созданы
             self._reset_all_states()
 
-            # ✅ НОВОЕ: Инициализация буферов свечей для всех символов (перед загрузкой позиций)
-            await self._initialize_candle_buffers()
+            # Свечи, позиции и синхронизация - граф шагов с параллельной загрузкой
+            if not await self._run_startup_plan():
+                # ✅ НОВОЕ: Инициализация буферов свечей для всех символов (перед загрузкой позиций)
+                await self._initialize_candle_buffers()
 
-            # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ: Загружаем существующие позиции и инициализируем TrailingStopLoss
-            await self._load_existing_positions()
+                # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ: Загружаем существующие позиции и инициализируем TrailingStopLoss
+                await self._load_existing_positions()
 
-            # ✅ РЕФАКТОРИНГ: Используем новый модуль PositionSync
-            if self.position_sync:
-                await self.position_sync.sync_positions_with_exchange(force=True)
-            else:
-                # Fallback на старый метод
-                await self._sync_positions_with_exchange(force=True)
+                await self._sync_positions_step()
+
+                await self._load_execution_costs_journal()
+
+                # Последовательный старт завершен - все символы готовы
+                for symbol in self.scalping_config.symbols or []:
+                    self._on_symbol_ready(symbol)
 
             # ✅ НОВОЕ: Запуск PositionMonitor как фоновой задачи для периодического мониторинга
             await self.position_monitor.start()
@@ -1173,6 +1324,9 @@ class FuturesScalpingOrchestrator:
             # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (26.12.2025): Проверяем готовность всех модулей перед началом торговли
             await self._verify_readiness()
 
+            # Горячая перезагрузка конфига (фоновая задача, торговый цикл не блокируется)
+            await self._start_config_reloader()
+
             # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (28.12.2025): Устанавливаем флаг готовности после всех проверок
             # Это блокирует торговлю до полной инициализации всех модулей (candles, индикаторы, ATR, pivots, volume profile, regime)
             self.all_modules_ready = True
@@ -1200,6 +1354,221 @@ class FuturesScalpingOrchestrator:
         finally:
             await self.stop()
 
+    def _startup_config(self) -> Dict[str, Any]:
+        """Параметры параллельного старта (scalping.startup)."""
+        cfg = getattr(self.scalping_config, "startup", {}) or {}
+        if not isinstance(cfg, dict):
+            cfg = dict(getattr(cfg, "__dict__", {}) or {})
+        return cfg
+
+    async def _sync_positions_step(self) -> None:
+        """Синхронизация позиций с биржей (PositionSync или прежний метод)."""
+        # ✅ РЕФАКТОРИНГ: Используем новый модуль PositionSync
+        if self.position_sync:
+            await self.position_sync.sync_positions_with_exchange(force=True)
+        else:
+            # Fallback на старый метод
+            await self._sync_positions_with_exchange(force=True)
+
+    async def _run_startup_plan(self) -> bool:
+        """
+        Параллельный старт: свечи, instruments, позиции и синхронизация как граф шагов.
+
+        - 1m свечи всех символов и instruments - параллельно под общим RestRateLimiter;
+        - позиции и синхронизация (защитное состояние) - сразу после 1m свечей,
+          раньше свечей 5m/1H/1D (данные для фильтров);
+        - символ допускается к торговле, как только готовы позиции и его свечи
+          из startup.ready_timeframes (is_symbol_ready);
+        - дедлайн ограничивает только данные: позиции и синхронизацию старт
+          дожидается всегда, торговля до них не разрешается.
+
+        Returns:
+            False если параллельный старт отключен (startup.enabled=false)
+        """
+        cfg = self._startup_config()
+        if not cfg.get("enabled", True):
+            return False
+        symbols = list(self.scalping_config.symbols or [])
+        timeframes = self._candle_buffer_timeframes()
+        ready_timeframes = set(
+            cfg.get("ready_timeframes") or [tf["timeframe"] for tf in timeframes]
+        )
+        step_timeout = float(cfg.get("step_timeout_sec", 30.0))
+
+        planner = RecoveryPlanner(
+            "startup",
+            max_concurrency=int(cfg.get("max_concurrency", 6)),
+            rate_per_sec=float(cfg.get("rest_rate_per_sec", 10.0)),
+            on_symbol_ready=self._on_symbol_ready,
+        )
+
+        for symbol in symbols:
+            planner.add(
+                f"instruments:{symbol}",
+                lambda symbol=symbol: self._warm_instrument_details(
+                    symbol, planner.limiter
+                ),
+                priority=PRIORITY_PROTECTIVE,
+                timeout=step_timeout,
+                critical=False,
+                gate=False,
+                symbol=symbol,
+            )
+        candles_1m = []
+        if self.data_registry:
+            for tf_config in timeframes:
+                timeframe = tf_config["timeframe"]
+                # 1m нужны до загрузки позиций (TSL, режимы), остальное - после
+                priority = (
+                    PRIORITY_MARKET_DATA if timeframe == "1m" else PRIORITY_COSMETIC
+                )
+                for symbol in symbols:
+                    planner.add(
+                        f"candles:{symbol}:{timeframe}",
+                        lambda symbol=symbol, tf_config=tf_config, priority=priority: (
+                            self._load_candle_buffer(
+                                symbol, tf_config, planner.limiter, priority
+                            )
+                        ),
+                        priority=priority,
+                        timeout=step_timeout,
+                        critical=False,
+                        gate=timeframe in ready_timeframes,
+                        symbol=symbol,
+                    )
+                    if timeframe == "1m":
+                        candles_1m.append(f"candles:{symbol}:{timeframe}")
+
+        planner.add(
+            "positions",
+            self._load_existing_positions,
+            deps=planner.names("instruments:") + tuple(candles_1m),
+            priority=PRIORITY_PROTECTIVE,
+            timeout=step_timeout,
+            critical=False,  # синхронизация с биржей нужна и после ошибки загрузки
+        )
+        planner.add(
+            "sync_positions",
+            self._sync_positions_step,
+            deps=("positions",),
+            priority=PRIORITY_PROTECTIVE,
+            timeout=step_timeout,
+            critical=False,
+        )
+        planner.add(
+            "execution_costs",
+            self._load_execution_costs_journal,
+            priority=PRIORITY_COSMETIC,
+            timeout=step_timeout,
+            critical=False,
+            gate=False,
+        )
+
+        logger.info(
+            f"🚀 Параллельный старт: {len(planner.steps)} шагов, "
+            f"{len(symbols)} символов, готовность по {sorted(ready_timeframes)}"
+        )
+        await planner.run(deadline=float(cfg.get("deadline_sec", 60.0)))
+        if planner.deadline_hit:
+            logger.warning(
+                "⏳ Параллельный старт: дедлайн истек, ждем восстановления "
+                "позиций и синхронизации с биржей перед торговлей"
+            )
+        await planner.wait_for(_PROTECTIVE_STARTUP_STEPS)
+        planner.log_report()
+        self.last_recovery_report = planner.get_report()
+        self.startup_planner = planner
+        return True
+
+    async def _warm_instrument_details(
+        self, symbol: str, limiter: RestRateLimiter
+    ) -> None:
+        """Загрузить ctVal/lotSz/tickSz символа в кэш клиента."""
+        await limiter.acquire(PRIORITY_PROTECTIVE)
+        await self.client.get_instrument_details(symbol)
+
+    async def _load_execution_costs_journal(self) -> None:
+        """Прогреть ExecutionCostModel исполнениями из журнала сделок (logs/all_data_*.csv)."""
+        costs_cfg = getattr(self.scalping_config, "execution_costs", {}) or {}
+        if not isinstance(costs_cfg, dict):
+            costs_cfg = dict(getattr(costs_cfg, "__dict__", {}) or {})
+        await asyncio.to_thread(
+            self.execution_costs.ingest_journal_dir,
+            costs_cfg.get("journal_dir", "logs"),
+            int(costs_cfg.get("journal_days", 3)),
+        )
+
+    def _best_quote(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """Лучшие bid/ask из DataRegistry (ориентир проскальзывания для ExecutionCostModel)."""
+        market_data = self.data_registry._market_data.get(symbol) or {}
+        bid = market_data.get("best_bid")
+        ask = market_data.get("best_ask")
+        if not bid or not ask:
+            return None
+        return float(bid), float(ask)
+
+    def _on_symbol_ready(self, symbol: str) -> None:
+        self.ready_symbols.add(symbol)
+        logger.info(f"🟢 {symbol}: данные и позиции восстановлены - символ готов")
+
+    def is_symbol_ready(self, symbol: str) -> bool:
+        """Готов ли символ к торговле: его данные и защитное состояние восстановлены."""
+        return symbol in self.ready_symbols
+
+    async def _recover_after_reconnect(self) -> None:
+        """Восстановление после reconnect private WS: позиции и стопы (с отчетом)."""
+        cfg = self._startup_config()
+        planner = RecoveryPlanner("reconnect", max_concurrency=1, rate_per_sec=0)
+        planner.add(
+            "sync_positions",
+            self._sync_positions_step,
+            priority=PRIORITY_PROTECTIVE,
+            timeout=float(cfg.get("step_timeout_sec", 30.0)),
+        )
+        await planner.run(deadline=float(cfg.get("deadline_sec", 60.0)))
+        planner.log_report()
+        self.last_recovery_report = planner.get_report()
+
+    async def _start_config_reloader(self) -> None:
+        """Запускает ConfigHotReloader и подписывает модули на изменения конфига."""
+        reload_cfg = getattr(self.scalping_config, "config_reload", {}) or {}
+        if not isinstance(reload_cfg, dict):
+            reload_cfg = getattr(reload_cfg, "__dict__", {})
+        if not reload_cfg.get("enabled", False) or not self._config_path:
+            logger.info("⚪ ConfigHotReloader отключен")
+            return
+
+        self.config_reloader = ConfigHotReloader(
+            config_path=self._config_path,
+            config_manager=self.config_manager,
+            parameter_orchestrator=getattr(self, "parameter_orchestrator", None),
+            position_registry=self.position_registry,
+            poll_interval_sec=float(reload_cfg.get("poll_interval_sec", 2.0)),
+            apply_to_open_positions=bool(
+                reload_cfg.get("apply_to_open_positions", False)
+            ),
+        )
+        self.config_reloader.subscribe("orchestrator", self._on_config_reload)
+        self.config_reloader.subscribe(
+            "parameter_provider", lambda diff: self.parameter_provider.clear_cache()
+        )
+        self.config_reloader.subscribe(
+            "signal_generator",
+            self.signal_generator.apply_config_reload,
+            prefixes=("scalping", "futures_modules", "risk", "exit_params"),
+        )
+        self.config_reloader.subscribe(
+            "trailing_sl_coordinator",
+            self.trailing_sl_coordinator.apply_config_reload,
+            prefixes=("scalping", "futures_modules", "exit_params"),
+        )
+        await self.config_reloader.start()
+
+    def _on_config_reload(self, diff) -> None:
+        """Обновляет ссылки orchestrator на конфиг после горячей перезагрузки."""
+        self.config = self.config_manager.config
+        self.scalping_config = self.config_manager.scalping_config
+
     async def stop(self):
         """Остановка Futures торгового бота"""
         logger.info("🛑 Остановка Futures торгового бота...")
@@ -1255,6 +1624,9 @@ class FuturesScalpingOrchestrator:
             await self.trading_control_center.stop()
             logger.info("✅ TradingControlCenter остановлен")
 
+        if getattr(self, "config_reloader", None):
+            await self.config_reloader.stop()
+
         # Остановка модулей безопасности
         await self.liquidation_guard.stop_monitoring()
         await self.slippage_guard.stop_monitoring()
@@ -1265,6 +1637,7 @@ class FuturesScalpingOrchestrator:
             logger.info("✅ PositionMonitor остановлен")
 
         # Отключение WebSocket
+        await self.websocket_coordinator.stop_market_bus_consumer()
         await self.ws_manager.disconnect()
 
         # ✅ МОДЕРНИЗАЦИЯ #2: Отключение Private WebSocket
@@ -1275,6 +1648,14 @@ class FuturesScalpingOrchestrator:
             except Exception as e:
                 logger.warning(f"⚠️ Ошибка отключения Private WebSocket: {e}")
 
+        if self.exchange_stops:
+            await self.exchange_stops.stop()
+        if self.order_chaser:
+            await self.order_chaser.stop()
+
+        if self.frame_recorder:
+            await asyncio.to_thread(self.frame_recorder.close)
+
         # ✅ ИСПРАВЛЕНО: Закрытие клиента (включая его aiohttp сессию)
         if self.client:
             try:
@@ -1624,39 +2005,7 @@ class FuturesScalpingOrchestrator:
                 logger.warning("⚠️ Нет символов для инициализации свечей")
                 return
 
-            import aiohttp
-
-            from src.models import OHLCV
-
-            # ✅ КРИТИЧЕСКОЕ: Определяем все нужные таймфреймы и их параметры
-            # ✅ ИСПРАВЛЕНО (06.01.2026): Увеличена лимит свечей для лучшей прогрев ATR/BB (особенно для низковолатильных пар)
-            # ✅ ОПТИМИЗИРОВАНО (06.01.2026): Увеличивамиимо ЗАГРУЗКУ на 500, но ХРАНИМ только 200 (для быстрого расчета индикаторов, чтобы цикл не брал 26 сек)
-            timeframes_config = [
-                {
-                    "timeframe": "1m",
-                    "limit": 500,  # ✅ Загружаем 500 свечей через пагинацию (обход лимита OKX 300)
-                    "max_size": 500,  # ✅ ИСПРАВЛЕНО: Храним все 500 для корректного ATR на малых парах (DOGE/XRP)
-                    "description": "основные индикаторы (ATR/BB с полными 500 свечами для прогрева)",
-                },
-                {
-                    "timeframe": "5m",
-                    "limit": 300,  # ✅ Загружаем 300 для лучшей фильтрации (~24 часов данных вместо 16)
-                    "max_size": 200,  # ⚡ Буфер ограничен 200 свечей для скорости
-                    "description": "Multi-Timeframe и Correlation",
-                },
-                {
-                    "timeframe": "1H",
-                    "limit": 168,  # ✅ Загружаем 168 для недельного профиля объемов (полная неделя)
-                    "max_size": 100,  # ⚡ Но в буфере только 100 (часовые свечи - не требовательны к скорости)
-                    "description": "Volume Profile (недельный)",
-                },
-                {
-                    "timeframe": "1D",
-                    "limit": 20,  # ✅ Загружаем 20 для месячного профиля Pivot Points
-                    "max_size": 20,  # Дневные - так же как загружаем (малое количество)
-                    "description": "Pivot Points (месячный)",
-                },
-            ]
+            timeframes_config = self._candle_buffer_timeframes()
 
             total_initialized = 0
             for symbol in symbols:
@@ -1664,145 +2013,9 @@ class FuturesScalpingOrchestrator:
                 logger.info(f"📥 Загрузка свечей для символа {symbol}...")
 
                 for tf_config in timeframes_config:
-                    timeframe = tf_config["timeframe"]
-                    limit = tf_config["limit"]
-                    max_size = tf_config["max_size"]
-                    description = tf_config["description"]
-
-                    try:
-                        # Получаем свечи через API (с пагинацией если limit > 300)
-                        inst_id = f"{symbol}-SWAP"
-                        all_candles = []
-
-                        async with aiohttp.ClientSession(
-                            timeout=aiohttp.ClientTimeout(total=30)
-                        ) as session:
-                            # Если нужно больше 300 свечей - делаем несколько запросов
-                            remaining = limit
-                            after_ts = None
-
-                            while remaining > 0:
-                                batch_limit = min(
-                                    remaining, 300
-                                )  # OKX API макс 300 за запрос
-                                url = f"https://www.okx.com/api/v5/market/candles?instId={inst_id}&bar={timeframe}&limit={batch_limit}"
-                                if after_ts:
-                                    url += f"&after={after_ts}"
-
-                                try:
-                                    async with session.get(url) as resp:
-                                        if resp.status == 200:
-                                            data = await resp.json()
-                                            if data.get("code") == "0" and data.get(
-                                                "data"
-                                            ):
-                                                batch = data["data"]
-                                                if not batch:
-                                                    break  # Нет больше данных
-
-                                                all_candles.extend(batch)
-                                                remaining -= len(batch)
-
-                                                # after_ts = самая старая свеча из batch (для следующей страницы)
-                                                after_ts = batch[-1][
-                                                    0
-                                                ]  # timestamp последней (самой старой) свечи
-
-                                                if len(batch) < batch_limit:
-                                                    break  # Получили меньше чем запрашивали - больше нет данных
-
-                                                # ⏳ Добавляем задержку между запросами чтобы не overload API
-                                                await asyncio.sleep(0.5)
-                                            else:
-                                                break
-                                        else:
-                                            break
-                                except asyncio.TimeoutError:
-                                    logger.warning(
-                                        f"⏱️ Timeout при загрузке {symbol} {timeframe}, используем имеющиеся данные"
-                                    )
-                                    break
-                                except Exception as e:
-                                    logger.warning(
-                                        f"⚠️ Ошибка при загрузке {symbol} {timeframe}: {e}"
-                                    )
-                                    break
-
-                            candles = all_candles
-
-                        if candles:
-                            # Конвертируем свечи из формата OKX в OHLCV
-                            ohlcv_data = []
-                            for candle in candles:
-                                if len(candle) >= 6:
-                                    ohlcv_item = OHLCV(
-                                        timestamp=int(candle[0])
-                                        // 1000,  # OKX в миллисекундах
-                                        symbol=symbol,
-                                        open=float(candle[1]),
-                                        high=float(candle[2]),
-                                        low=float(candle[3]),
-                                        close=float(candle[4]),
-                                        volume=float(candle[5]),
-                                        timeframe=timeframe,
-                                    )
-                                    ohlcv_data.append(ohlcv_item)
-
-                            if ohlcv_data:
-                                # Сортируем по timestamp (старые -> новые)
-                                ohlcv_data.sort(key=lambda x: x.timestamp)
-
-                                # Инициализируем буфер в DataRegistry
-                                await self.data_registry.initialize_candles(
-                                    symbol=symbol,
-                                    timeframe=timeframe,
-                                    candles=ohlcv_data,
-                                    max_size=max_size,
-                                )
-
-                                symbol_initialized += 1
-                                total_initialized += 1
-                                logger.info(
-                                    f"✅ Инициализирован буфер свечей {timeframe} для {symbol} "
-                                    f"({len(ohlcv_data)} свечей, {description})"
-                                )
-
-                                # ✅ НОВОЕ: Логируем в StructuredLogger
-                                if self.structured_logger:
-                                    try:
-                                        self.structured_logger.log_candle_init(
-                                            symbol=symbol,
-                                            timeframe=timeframe,
-                                            candles_count=len(ohlcv_data),
-                                            status="success",
-                                        )
-                                    except Exception as e:
-                                        logger.debug(
-                                            f"⚠️ Ошибка логирования инициализации свечей в StructuredLogger: {e}"
-                                        )
-                        else:
-                            logger.warning(
-                                f"⚠️ Не удалось получить свечи {timeframe} для {symbol}: OKX API вернул пустой ответ или ошибку"
-                            )
-                            # ✅ НОВОЕ: Логируем ошибку в StructuredLogger
-                            if self.structured_logger:
-                                try:
-                                    self.structured_logger.log_candle_init(
-                                        symbol=symbol,
-                                        timeframe=timeframe,
-                                        candles_count=0,
-                                        status="error",
-                                        error="Empty response from API",
-                                    )
-                                except Exception as e:
-                                    logger.debug(
-                                        f"⚠️ Ошибка логирования ошибки инициализации свечей: {e}"
-                                    )
-
-                    except Exception as e:
-                        logger.warning(
-                            f"⚠️ Ошибка инициализации буфера свечей {timeframe} для {symbol}: {e}"
-                        )
+                    if await self._load_candle_buffer(symbol, tf_config):
+                        symbol_initialized += 1
+                        total_initialized += 1
 
                 if symbol_initialized > 0:
                     logger.info(
@@ -1832,6 +2045,202 @@ class FuturesScalpingOrchestrator:
                 exc_info=True,
             )
 
+    def _candle_buffer_timeframes(self) -> List[Dict[str, Any]]:
+        """Таймфреймы буферов свечей: сколько загрузить и сколько хранить."""
+        # ✅ КРИТИЧЕСКОЕ: Определяем все нужные таймфреймы и их параметры
+        # ✅ ИСПРАВЛЕНО (06.01.2026): Увеличена лимит свечей для лучшей прогрев ATR/BB (особенно для низковолатильных пар)
+        # ✅ ОПТИМИЗИРОВАНО (06.01.2026): Увеличивамиимо ЗАГРУЗКУ на 500, но ХРАНИМ только 200 (для быстрого расчета индикаторов, чтобы цикл не брал 26 сек)
+        return [
+            {
+                "timeframe": "1m",
+                "limit": 500,  # ✅ Загружаем 500 свечей через пагинацию (обход лимита OKX 300)
+                "max_size": 500,  # ✅ ИСПРАВЛЕНО: Храним все 500 для корректного ATR на малых парах (DOGE/XRP)
+                "description": "основные индикаторы (ATR/BB с полными 500 свечами для прогрева)",
+            },
+            {
+                "timeframe": "5m",
+                "limit": 300,  # ✅ Загружаем 300 для лучшей фильтрации (~24 часов данных вместо 16)
+                "max_size": 200,  # ⚡ Буфер ограничен 200 свечей для скорости
+                "description": "Multi-Timeframe и Correlation",
+            },
+            {
+                "timeframe": "1H",
+                "limit": 168,  # ✅ Загружаем 168 для недельного профиля объемов (полная неделя)
+                "max_size": 100,  # ⚡ Но в буфере только 100 (часовые свечи - не требовательны к скорости)
+                "description": "Volume Profile (недельный)",
+            },
+            {
+                "timeframe": "1D",
+                "limit": 20,  # ✅ Загружаем 20 для месячного профиля Pivot Points
+                "max_size": 20,  # Дневные - так же как загружаем (малое количество)
+                "description": "Pivot Points (месячный)",
+            },
+        ]
+
+    async def _load_candle_buffer(
+        self,
+        symbol: str,
+        tf_config: Dict[str, Any],
+        limiter: Optional[RestRateLimiter] = None,
+        priority: int = PRIORITY_MARKET_DATA,
+    ) -> bool:
+        """
+        Загрузить буфер свечей одного символа и таймфрейма через REST (с пагинацией).
+
+        Args:
+            symbol: Торговый символ
+            tf_config: Элемент _candle_buffer_timeframes()
+            limiter: Общий ограничитель REST при параллельном старте
+                (None - пауза 0.5с между страницами, как при последовательном старте)
+            priority: Приоритет запросов в limiter
+
+        Returns:
+            True если буфер инициализирован
+        """
+        import aiohttp
+
+        from src.models import OHLCV
+
+        loaded = False
+        timeframe = tf_config["timeframe"]
+        limit = tf_config["limit"]
+        max_size = tf_config["max_size"]
+        description = tf_config["description"]
+
+        try:
+            # Получаем свечи через API (с пагинацией если limit > 300)
+            inst_id = f"{symbol}-SWAP"
+            all_candles = []
+
+            async with aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as session:
+                # Если нужно больше 300 свечей - делаем несколько запросов
+                remaining = limit
+                after_ts = None
+
+                while remaining > 0:
+                    batch_limit = min(remaining, 300)  # OKX API макс 300 за запрос
+                    url = f"https://www.okx.com/api/v5/market/candles?instId={inst_id}&bar={timeframe}&limit={batch_limit}"
+                    if after_ts:
+                        url += f"&after={after_ts}"
+
+                    try:
+                        if limiter is not None:
+                            await limiter.acquire(priority)
+                        async with session.get(url) as resp:
+                            if resp.status == 200:
+                                data = await resp.json()
+                                if data.get("code") == "0" and data.get("data"):
+                                    batch = data["data"]
+                                    if not batch:
+                                        break  # Нет больше данных
+
+                                    all_candles.extend(batch)
+                                    remaining -= len(batch)
+
+                                    # after_ts = самая старая свеча из batch (для следующей страницы)
+                                    after_ts = batch[-1][
+                                        0
+                                    ]  # timestamp последней (самой старой) свечи
+
+                                    if len(batch) < batch_limit:
+                                        break  # Получили меньше чем запрашивали - больше нет данных
+
+                                    # ⏳ Задержка между запросами чтобы не overload API (при параллельном старте - общий RestRateLimiter)
+                                    if limiter is None:
+                                        await asyncio.sleep(0.5)
+                                else:
+                                    break
+                            else:
+                                break
+                    except asyncio.TimeoutError:
+                        logger.warning(
+                            f"⏱️ Timeout при загрузке {symbol} {timeframe}, используем имеющиеся данные"
+                        )
+                        break
+                    except Exception as e:
+                        logger.warning(
+                            f"⚠️ Ошибка при загрузке {symbol} {timeframe}: {e}"
+                        )
+                        break
+
+                candles = all_candles
+
+            if candles:
+                # Конвертируем свечи из формата OKX в OHLCV
+                ohlcv_data = []
+                for candle in candles:
+                    if len(candle) >= 6:
+                        ohlcv_item = OHLCV(
+                            timestamp=int(candle[0]) // 1000,  # OKX в миллисекундах
+                            symbol=symbol,
+                            open=float(candle[1]),
+                            high=float(candle[2]),
+                            low=float(candle[3]),
+                            close=float(candle[4]),
+                            volume=float(candle[5]),
+                            timeframe=timeframe,
+                        )
+                        ohlcv_data.append(ohlcv_item)
+
+                if ohlcv_data:
+                    # Сортируем по timestamp (старые -> новые)
+                    ohlcv_data.sort(key=lambda x: x.timestamp)
+
+                    # Инициализируем буфер в DataRegistry
+                    await self.data_registry.initialize_candles(
+                        symbol=symbol,
+                        timeframe=timeframe,
+                        candles=ohlcv_data,
+                        max_size=max_size,
+                    )
+
+                    loaded = True
+                    logger.info(
+                        f"✅ Инициализирован буфер свечей {timeframe} для {symbol} "
+                        f"({len(ohlcv_data)} свечей, {description})"
+                    )
+
+                    # ✅ НОВОЕ: Логируем в StructuredLogger
+                    if self.structured_logger:
+                        try:
+                            self.structured_logger.log_candle_init(
+                                symbol=symbol,
+                                timeframe=timeframe,
+                                candles_count=len(ohlcv_data),
+                                status="success",
+                            )
+                        except Exception as e:
+                            logger.debug(
+                                f"⚠️ Ошибка логирования инициализации свечей в StructuredLogger: {e}"
+                            )
+            else:
+                logger.warning(
+                    f"⚠️ Не удалось получить свечи {timeframe} для {symbol}: OKX API вернул пустой ответ или ошибку"
+                )
+                # ✅ НОВОЕ: Логируем ошибку в StructuredLogger
+                if self.structured_logger:
+                    try:
+                        self.structured_logger.log_candle_init(
+                            symbol=symbol,
+                            timeframe=timeframe,
+                            candles_count=0,
+                            status="error",
+                            error="Empty response from API",
+                        )
+                    except Exception as e:
+                        logger.debug(
+                            f"⚠️ Ошибка логирования ошибки инициализации свечей: {e}"
+                        )
+
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Ошибка инициализации буфера свечей {timeframe} для {symbol}: {e}"
+            )
+
+        return loaded
+
     def _reset_all_states(self):
         """Очистка всех состояний при старте бота"""
         try:
@@ -3975,6 +4384,13 @@ class FuturesScalpingOrchestrator:
         """✅ ЭТАП 1: Валидация параметров риска через ConfigManager"""
         return self.config_manager.validate_risk_params(params, regime, profile_name)
 
+    def _get_correlation_matrix(self):
+        """RollingCorrelationMatrix фильтра корреляций (None - фильтр выключен)."""
+        signal_generator = getattr(self, "signal_generator", None)
+        correlation_filter = getattr(signal_generator, "correlation_filter", None)
+        manager = getattr(correlation_filter, "correlation_manager", None)
+        return getattr(manager, "matrix", None)
+
     async def _get_used_margin(self) -> float:
         """
         ✅ НОВОЕ: Получает использованную маржу из всех открытых позиций на бирже.
@@ -3999,9 +4415,9 @@ class FuturesScalpingOrchestrator:
                         )
                         await asyncio.sleep(delay)
 
-            # Получаем все позиции с биржи
+            # Позиции из снимка аккаунта (private WS), REST - только если снимок устарел
             exchange_positions = await _retry_call(
-                "get_positions", self.client.get_positions
+                "get_positions", self.account_state.get_positions
             )
             if not exchange_positions:
                 return 0.0
@@ -55,6 +55,8 @@ class FuturesOrderExecutor:
         self.data_registry = None  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (02.01.2026): DataRegistry для получения волатильности
         self.signal_generator = None  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (02.01.2026): SignalGenerator для получения волатильности
         self.telegram = None  # TelegramNotifier — устанавливается из orchestrator
+        self.execution_costs = None  # ExecutionCostModel из orchestrator
+        self.order_chaser = None  # LimitOrderChaser из orchestrator
 
         # Состояние
         self.is_initialized = False
@@ -106,6 +108,55 @@ class FuturesOrderExecutor:
         self.signal_generator = signal_generator
         logger.debug("✅ FuturesOrderExecutor: SignalGenerator установлен")
 
+    def set_execution_costs(self, execution_costs):
+        """Установить ExecutionCostModel (выбор limit/market по нашим исполнениям)"""
+        self.execution_costs = execution_costs
+        logger.debug("✅ FuturesOrderExecutor: ExecutionCostModel установлен")
+
+    def set_order_chaser(self, order_chaser):
+        """Установить LimitOrderChaser (ведение лимитных входов по книге)"""
+        self.order_chaser = order_chaser
+        logger.debug("✅ FuturesOrderExecutor: LimitOrderChaser установлен")
+
+    def _limit_max_wait(self, regime: Optional[str]) -> Optional[float]:
+        """max_wait_seconds лимитного ордера по режиму (как в OrderCoordinator)"""
+        order_executor_cfg = getattr(self.scalping_config, "order_executor", {}) or {}
+        limit_cfg = order_executor_cfg.get("limit_order", {}) or {}
+        if not isinstance(limit_cfg, dict):
+            return None
+        regime_cfg = (limit_cfg.get("by_regime") or {}).get(
+            str(regime or "ranging").lower(), {}
+        )
+        max_wait = (regime_cfg or {}).get(
+            "max_wait_seconds", limit_cfg.get("max_wait_seconds")
+        )
+        return float(max_wait) if max_wait else None
+
+    def _register_order_for_costs(
+        self,
+        order_id: Optional[str],
+        symbol: str,
+        side: str,
+        order_type: str,
+        size: float,
+        price: Optional[float],
+        ref_price: Optional[float] = None,
+    ) -> None:
+        """Передать размещенный ордер в ExecutionCostModel (ориентир для slippage)."""
+        if self.execution_costs is None or not order_id:
+            return
+        try:
+            self.execution_costs.on_order_placed(
+                order_id,
+                symbol,
+                "buy" if side.lower() in ("buy", "long") else "sell",
+                order_type,
+                notional=size * price if price else None,
+                ref_price=ref_price,
+            )
+        except Exception as e:
+            logger.debug(f"⚠️ ExecutionCostModel: ошибка регистрации {order_id}: {e}")
+
     def set_telegram(self, telegram):
         """Установить TelegramNotifier для отправки сигнальных уведомлений"""
         self.telegram = telegram
@@ -311,6 +362,29 @@ class FuturesOrderExecutor:
                     f"используем limit ордер с уменьшенным offset"
                 )
 
+            # Выбор limit/market по нашим исполнениям: если ожидаемая стоимость
+            # лимитного входа (вероятность неисполнения + добор по market) выше
+            # market-входа, не ставим лимитку, которую потом придется гонять
+            if (
+                order_type == "limit"
+                and self.execution_costs is not None
+                and current_price_for_check > 0
+            ):
+                try:
+                    preferred = self.execution_costs.preferred_entry_type(
+                        symbol,
+                        "buy" if str(side).lower() in ("buy", "long") else "sell",
+                        notional=position_size * current_price_for_check,
+                    )
+                    if preferred == "market":
+                        logger.info(
+                            f"💰 ExecutionCostModel: market дешевле limit для {symbol} "
+                            f"(низкая вероятность исполнения лимитки), используем market"
+                        )
+                        order_type = "market"
+                except Exception as e:
+                    logger.debug(f"⚠️ ExecutionCostModel: выбор типа ордера: {e}")
+
             # Расчет цены для лимитных ордеров
             price = None
             if order_type == "limit":
@@ -394,6 +468,23 @@ class FuturesOrderExecutor:
                     "signal": signal,
                 }
 
+                # Лимитный вход ведется по лучшим ценам книги (amend/market-добор)
+                if order_type == "limit" and self.order_chaser and order_id:
+                    try:
+                        await self.order_chaser.track(
+                            order_id,
+                            symbol,
+                            side,
+                            position_size,
+                            float(result.get("price") or price or 0.0),
+                            post_only=bool(result.get("post_only", False)),
+                            max_wait=self._limit_max_wait(signal.get("regime")),
+                        )
+                    except Exception as e:
+                        logger.debug(
+                            f"⚠️ LimitOrderChaser: не удалось взять {order_id}: {e}"
+                        )
+
                 # ✅ НОВОЕ: Логирование размещения ордера в CSV
                 if self.performance_tracker:
                     try:
@@ -1824,6 +1915,16 @@ class FuturesOrderExecutor:
             if result.get("code") == "0":
                 order_id = result.get("data", [{}])[0].get("ordId")
                 logger.info(f"✅ Рыночный ордер размещен: {order_id}")
+                ref_px = best_ask if side.lower() in ("buy", "long") else best_bid
+                self._register_order_for_costs(
+                    order_id,
+                    symbol,
+                    side,
+                    "market",
+                    size,
+                    ref_px or current_price,
+                    ref_price=ref_px,
+                )
 
                 # Метрики: учёт market-ордеров и проскальзывания (если есть fill price)
                 try:
@@ -2229,6 +2330,14 @@ class FuturesOrderExecutor:
             if result.get("code") == "0":
                 order_id = result.get("data", [{}])[0].get("ordId")
                 logger.info(f"✅ Лимитный ордер размещен: {order_id}")
+                self._register_order_for_costs(
+                    order_id,
+                    symbol,
+                    side,
+                    "post_only" if post_only else "limit",
+                    size,
+                    price,
+                )
                 # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ: Возвращаем результат сразу после успешного размещения
                 # Метрики: учитываем тип лимитного ордера как maker/other по флагу post_only
                 try:
@@ -2247,6 +2356,7 @@ class FuturesOrderExecutor:
                     "side": side,
                     "size": size,
                     "price": price,
+                    "post_only": post_only,
                     "timestamp": datetime.now(),
                 }
             elif result.get("code") == "1" or result.get("code") != "0":
@@ -3263,21 +3373,16 @@ class FuturesOrderExecutor:
     async def amend_order_price(
         self, symbol: str, order_id: str, new_price: float
     ) -> Dict[str, Any]:
-        """Изменение цены лимитного ордера через batch amend (1 ордер)."""
+        """Изменение цены лимитного ордера (amend-order: WS, fallback REST)."""
         try:
             if new_price <= 0:
                 return {"success": False, "error": "invalid new_price"}
 
-            inst_id = f"{symbol}-SWAP"
-            amend_item = {
-                "instId": inst_id,
-                "ordId": str(order_id),
-                "newPx": str(new_price),
-            }
-
             logger.info(f"🔄 Amend price: {symbol} ordId={order_id} → {new_price:.6f}")
 
-            result = await self.client.batch_amend_orders([amend_item])
+            result = await self.client.amend_order(
+                symbol, order_id=str(order_id), new_price=new_price
+            )
 
             if result and str(result.get("code")) == "0":
                 logger.info(f"✅ Цена ордера {order_id} изменена на {new_price:.6f}")
@@ -1,3 +1,9 @@
+from .parameter_compiler import (
+    CompiledParameterTable,
+    FrozenParams,
+    ParameterCompiler,
+    freeze_params,
+)
 from .parameter_orchestrator import ParameterOrchestrator
 from .parameter_schema import (
     ExitParams,
@@ -18,4 +24,8 @@ __all__ = [
     "OrderParams",
     "RiskParams",
     "PatternParams",
+    "ParameterCompiler",
+    "CompiledParameterTable",
+    "FrozenParams",
+    "freeze_params",
 ]
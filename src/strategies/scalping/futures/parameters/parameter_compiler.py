@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from dataclasses import asdict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+from .parameter_schema import ParameterStatus
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .parameter_orchestrator import ParameterOrchestrator
+
+DEFAULT_REGIMES: Tuple[str, ...] = ("trending", "ranging", "choppy")
+
+# Exit fields that depend on market data (ATR/price) and are computed per call.
+EXIT_DYNAMIC_FIELDS = ("tp_percent", "sl_percent")
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, FrozenParams):
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, FrozenParams):
+        return value.as_dict()
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class FrozenParams:
+    """
+    Immutable parameter record backed by __slots__.
+
+    Concrete types are generated per field set by frozen_params_type(), so a
+    lookup is a plain slot attribute read. Mapping-style access (get/[]) is kept
+    for callers that still treat parameters as dicts.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, **values: Any) -> None:
+        for name in self._fields:
+            object.__setattr__(self, name, _freeze(values.get(name)))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is frozen")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrozenParams):
+            return NotImplemented
+        return self._fields == other._fields and all(
+            getattr(self, f) == getattr(other, f) for f in self._fields
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._fields:
+            return getattr(self, key)
+        return default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Mutable deep copy (plain dicts/lists) for legacy dict consumers."""
+        return {name: _thaw(getattr(self, name)) for name in self._fields}
+
+    def __repr__(self) -> str:
+        body = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields)
+        return f"{type(self).__name__}({body})"
+
+
+_RESERVED = frozenset(dir(FrozenParams))
+_TYPE_CACHE: Dict[Tuple[str, Tuple[str, ...]], type] = {}
+
+
+def frozen_params_type(name: str, fields: Iterable[str]) -> type:
+    """Return (and cache) a FrozenParams subclass with the given slot fields."""
+    fields = tuple(fields)
+    key = (name, fields)
+    cls = _TYPE_CACHE.get(key)
+    if cls is None:
+        for field_name in fields:
+            if not field_name.isidentifier() or field_name in _RESERVED:
+                raise ValueError(f"{name}: invalid parameter field name '{field_name}'")
+        cls = type(name, (FrozenParams,), {"__slots__": fields, "_fields": fields})
+        _TYPE_CACHE[key] = cls
+    return cls
+
+
+def freeze_params(name: str, values: Mapping[str, Any]) -> FrozenParams:
+    """Build a frozen __slots__ record from a flat mapping."""
+    return frozen_params_type(name, (str(k) for k in values))(**values)
+
+
+class CompiledParameterTable:
+    """
+    Result of ParameterCompiler.compile(): O(1) lookup tables.
+
+    signal/exit/order: keyed by (symbol, regime)
+    patterns:          keyed by regime
+    risk:              keyed by (regime, balance_profile_name)
+    errors:            (section, key) -> validation errors of combos that failed to compile
+    resolved:          (section, key) -> prebuilt schema dataclass for config-only sections
+                       (signal/order/patterns); shared instances, treat as read-only
+    """
+
+    __slots__ = (
+        "version",
+        "compiled_at",
+        "compile_ms",
+        "symbols",
+        "regimes",
+        "signal",
+        "exit",
+        "order",
+        "patterns",
+        "risk",
+        "errors",
+        "resolved",
+        "_profile_thresholds",
+        "_profile_names",
+    )
+
+    def __init__(
+        self, version: int, symbols: Tuple[str, ...], regimes: Tuple[str, ...]
+    ):
+        self.version = version
+        self.compiled_at = time.time()
+        self.compile_ms = 0.0
+        self.symbols = symbols
+        self.regimes = regimes
+        self.signal: Dict[Tuple[str, str], FrozenParams] = {}
+        self.exit: Dict[Tuple[str, str], FrozenParams] = {}
+        self.order: Dict[Tuple[str, str], FrozenParams] = {}
+        self.patterns: Dict[str, FrozenParams] = {}
+        self.risk: Dict[Tuple[str, str], FrozenParams] = {}
+        self.errors: Dict[Tuple[str, Any], List[str]] = {}
+        self.resolved: Dict[Tuple[str, Any], Any] = {}
+        self._profile_thresholds: List[float] = []
+        self._profile_names: List[str] = []
+
+    def set_balance_profiles(self, profiles: List[Tuple[str, float]]) -> None:
+        profiles = sorted(profiles, key=lambda item: item[1])
+        self._profile_names = [name for name, _ in profiles]
+        self._profile_thresholds = [threshold for _, threshold in profiles]
+
+    def profile_for_balance(self, balance: float) -> Optional[str]:
+        """First profile with balance <= threshold, else the largest one."""
+        if not self._profile_names:
+            return None
+        idx = bisect_left(self._profile_thresholds, balance)
+        if idx >= len(self._profile_names):
+            idx = len(self._profile_names) - 1
+        return self._profile_names[idx]
+
+    def get_errors(self, section: str, key: Any) -> Optional[List[str]]:
+        return self.errors.get((section, key))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "compile_ms": round(self.compile_ms, 3),
+            "symbols": len(self.symbols),
+            "regimes": len(self.regimes),
+            "signal": len(self.signal),
+            "exit": len(self.exit),
+            "order": len(self.order),
+            "patterns": len(self.patterns),
+            "risk": len(self.risk),
+            "invalid": len(self.errors),
+        }
+
+
+class ParameterCompiler:
+    """
+    Compiles the config-only part of ParameterOrchestrator resolution for every
+    symbol × regime × balance profile. Validation stays in the orchestrator's
+    resolvers, so compiled values and errors are identical to the per-call path.
+    """
+
+    def __init__(
+        self,
+        orchestrator: "ParameterOrchestrator",
+        symbols: Optional[Iterable[str]] = None,
+        regimes: Optional[Iterable[str]] = None,
+    ):
+        self.orchestrator = orchestrator
+        self.symbols = tuple(symbols) if symbols else self._discover_symbols()
+        self.regimes = tuple(regimes) if regimes else self._discover_regimes()
+
+    def _discover_symbols(self) -> Tuple[str, ...]:
+        scalping = self.orchestrator._scalping
+        found: List[str] = []
+        for sym in list(scalping.get("symbols") or []) + list(
+            (scalping.get("by_symbol") or {}).keys()
+        ):
+            if isinstance(sym, str) and sym not in found:
+                found.append(sym)
+        return tuple(found)
+
+    def _discover_regimes(self) -> Tuple[str, ...]:
+        found = list(DEFAULT_REGIMES)
+        for key in (self.orchestrator._exit_params or {}).keys():
+            if isinstance(key, str) and key.lower() not in found:
+                found.append(key.lower())
+        return tuple(found)
+
+    def compile(self, version: int = 1) -> CompiledParameterTable:
+        started = time.perf_counter()
+        orch = self.orchestrator
+        table = CompiledParameterTable(version, self.symbols, self.regimes)
+
+        for regime in self.regimes:
+            status = ParameterStatus(valid=True)
+            patterns = orch._build_pattern_params("", regime, status)
+            if patterns is not None:
+                table.patterns[regime] = freeze_params(
+                    "CompiledPatternParams", asdict(patterns)
+                )
+                table.resolved[("patterns", regime)] = patterns
+            else:
+                table.errors[("patterns", regime)] = list(status.errors)
+
+            for symbol in self.symbols:
+                key = (symbol, regime)
+
+                status = ParameterStatus(valid=True)
+                signal = orch._build_signal_params(symbol, regime, status)
+                if signal is not None:
+                    table.signal[key] = freeze_params(
+                        "CompiledSignalParams", asdict(signal)
+                    )
+                    table.resolved[("signal", key)] = signal
+                else:
+                    table.errors[("signal", key)] = list(status.errors)
+
+                errors: List[str] = []
+                exit_static = orch._resolve_exit_static(symbol, regime, errors)
+                if not errors:
+                    table.exit[key] = freeze_params("CompiledExitParams", exit_static)
+                else:
+                    table.errors[("exit", key)] = errors
+
+                status = ParameterStatus(valid=True)
+                order = orch._build_order_params(symbol, regime, status)
+                if order is not None:
+                    table.order[key] = freeze_params(
+                        "CompiledOrderParams", asdict(order)
+                    )
+                    table.resolved[("order", key)] = order
+                else:
+                    table.errors[("order", key)] = list(status.errors)
+
+        profiles = orch._iter_balance_profiles()
+        table.set_balance_profiles(
+            [(name, threshold) for name, threshold, _ in profiles]
+        )
+        for regime in self.regimes:
+            for name, _threshold, cfg in profiles:
+                errors = []
+                risk_static = orch._resolve_risk_static(regime, name, cfg, errors)
+                if not errors:
+                    table.risk[(regime, name)] = freeze_params(
+                        "CompiledRiskParams", risk_static
+                    )
+                else:
+                    table.errors[("risk", (regime, name))] = errors
+
+        table.compile_ms = (time.perf_counter() - started) * 1000.0
+        logger.info(f"PARAM_COMPILER: compiled tables {table.summary()}")
+        return table
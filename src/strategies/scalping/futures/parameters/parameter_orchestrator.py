@@ -7,6 +7,12 @@ from typing import Any, Dict, List, Optional, Tuple  # noqa: F401
 from loguru import logger
 
 from ..indicators.atr_provider import ATRProvider
+from .parameter_compiler import (
+    CompiledParameterTable,
+    FrozenParams,
+    ParameterCompiler,
+    freeze_params,
+)
 from .parameter_schema import (
     ExitParams,
     OrderParams,
@@ -60,6 +66,72 @@ class ParameterOrchestrator:
             f"ParameterOrchestrator init: patterns keys: {list(self._patterns.keys())}"
         )
 
+        # Config-only parameters are compiled once (and on hot-reload) into
+        # frozen lookup tables; per-call work is ATR/balance math only.
+        self._compiled: Optional[CompiledParameterTable] = None
+        # symbol -> таблица, с которой была открыта позиция (exit-параметры не меняются
+        # до её закрытия при горячей перезагрузке конфига)
+        self._pinned: Dict[str, CompiledParameterTable] = {}
+        self.compile()
+
+    def compile(self) -> CompiledParameterTable:
+        """(Re)build compiled symbol × regime × balance-profile tables."""
+        version = (self._compiled.version + 1) if self._compiled else 1
+        self._compiled = ParameterCompiler(self).compile(version=version)
+        return self._compiled
+
+    @property
+    def compiled(self) -> Optional[CompiledParameterTable]:
+        return self._compiled
+
+    def adopt(self, staged: "ParameterOrchestrator") -> None:
+        """
+        Take over config sections and compiled tables of a staged orchestrator
+        (built off-loop on hot-reload). Plain attribute swaps, no awaits.
+        """
+        self._raw = staged._raw
+        self._scalping = staged._scalping
+        self._exit_params = staged._exit_params
+        self._adaptive_regime = staged._adaptive_regime
+        self._signal_generator = staged._signal_generator
+        self._order_executor = staged._order_executor
+        self._balance_profiles = staged._balance_profiles
+        self._patterns = staged._patterns
+        self._by_symbol = staged._by_symbol
+        table = staged._compiled
+        if table is not None and self._compiled is not None:
+            table.version = self._compiled.version + 1
+        self._compiled = table
+
+    def pin_symbols(self, symbols: List[str]) -> None:
+        """Keep current exit tables for symbols with open positions."""
+        if self._compiled is None:
+            return
+        for symbol in symbols:
+            self._pinned.setdefault(symbol, self._compiled)
+
+    def release_pins(self, open_symbols: List[str]) -> None:
+        """Drop pins for symbols that no longer have an open position."""
+        for symbol in [s for s in self._pinned if s not in open_symbols]:
+            del self._pinned[symbol]
+
+    def get_compiled(
+        self, section: str, symbol: str, regime: str
+    ) -> Optional[FrozenParams]:
+        """
+        O(1) access to compiled config-only parameters.
+
+        section: "signal" | "exit" | "order" (keyed by symbol+regime),
+        "patterns" (regime only). Exit entries exclude ATR-dependent tp/sl_percent.
+        """
+        table = self._compiled
+        if table is None:
+            return None
+        regime = self._normalize_regime(regime)
+        if section == "patterns":
+            return table.patterns.get(regime)
+        return getattr(table, section).get((symbol, regime))
+
     def resolve_bundle(
         self,
         symbol: str,
@@ -193,12 +265,47 @@ class ParameterOrchestrator:
             return raw.split(".", 1)[1]
         return raw
 
+    def _compiled_lookup(
+        self,
+        section: str,
+        key: Any,
+        status: ParameterStatus,
+        table: Optional[CompiledParameterTable] = None,
+    ) -> Tuple[bool, Any]:
+        """
+        (hit, value) from the compiled table. value is the prebuilt dataclass for
+        signal/order/patterns and the static FrozenParams for exit/risk; on a hit
+        with value=None the compiled validation errors are reported to status.
+        """
+        table = table or self._compiled
+        if table is None:
+            return False, None
+        if section in ("exit", "risk"):
+            value = getattr(table, section).get(key)
+        else:
+            value = table.resolved.get((section, key))
+        if value is not None:
+            return True, value
+        errors = table.get_errors(section, key)
+        if errors is not None:
+            status.errors.extend(errors)
+            return True, None
+        return False, None
+
     def _resolve_signal_params(
         self, symbol: str, regime: Optional[str], status: ParameterStatus
     ) -> Optional[SignalParams]:
         if regime is None:
             status.errors.append("signal params: regime missing")
             return None
+        hit, entry = self._compiled_lookup("signal", (symbol, regime), status)
+        if hit:
+            return entry
+        return self._build_signal_params(symbol, regime, status)
+
+    def _build_signal_params(
+        self, symbol: str, regime: str, status: ParameterStatus
+    ) -> Optional[SignalParams]:
         errors: list[str] = []
 
         sources = {
@@ -310,6 +417,66 @@ class ParameterOrchestrator:
             status.errors.append("exit params: regime missing")
             return None
         errors: list[str] = []
+        hit, entry = self._compiled_lookup(
+            "exit", (symbol, regime), status, table=self._pinned.get(symbol)
+        )
+        if hit:
+            if entry is None:
+                return None
+            static = entry
+        else:
+            static = freeze_params(
+                "CompiledExitParams", self._resolve_exit_static(symbol, regime, errors)
+            )
+
+        current_price = self._get_current_price(symbol, market_data, errors)
+        atr_value = self.atr_provider.get_atr(symbol)
+        if atr_value is None:
+            errors.append(f"ATR missing for {symbol}")
+        if current_price is None or current_price <= 0:
+            errors.append("current_price missing or <= 0")
+
+        if errors:
+            status.errors.extend(errors)
+            return None
+
+        atr_pct = (atr_value / current_price) * 100.0
+        tp_percent = max(static.tp_min_percent, atr_pct * static.tp_atr_multiplier)
+        if static.tp_max_percent is not None:
+            tp_percent = min(tp_percent, static.tp_max_percent)
+
+        sl_percent = max(static.sl_min_percent, atr_pct * static.sl_atr_multiplier)
+        if static.sl_max_percent is not None:
+            sl_percent = min(sl_percent, static.sl_max_percent)
+
+        return ExitParams(
+            regime=regime,
+            tp_percent=float(tp_percent),
+            sl_percent=float(sl_percent),
+            tp_atr_multiplier=static.tp_atr_multiplier,
+            sl_atr_multiplier=static.sl_atr_multiplier,
+            tp_min_percent=static.tp_min_percent,
+            tp_max_percent=static.tp_max_percent,
+            sl_min_percent=static.sl_min_percent,
+            sl_max_percent=static.sl_max_percent,
+            max_holding_minutes=static.max_holding_minutes,
+            min_holding_minutes=static.min_holding_minutes,
+            min_profit_for_extension=static.min_profit_for_extension,
+            extension_percent=static.extension_percent,
+            ph_threshold_type=static.ph_threshold_type,
+            ph_threshold_percent=static.ph_threshold_percent,
+            ph_min_absolute_usd=static.ph_min_absolute_usd,
+            sources={
+                "exit_params": f"exit_params.{regime}",
+                "atr": "data_registry.indicators.atr",
+                "current_price": "market_data",
+            },
+        )
+
+    def _resolve_exit_static(
+        self, symbol: str, regime: str, errors: list[str]
+    ) -> Dict[str, Any]:
+        """Config-only part of exit params (no ATR/price); compiled per symbol × regime."""
         exit_cfg = require_dict(self._exit_params, regime, errors, "exit_params")
 
         tp_atr_multiplier = require_float(
@@ -345,59 +512,29 @@ class ParameterOrchestrator:
         tp_max_percent = optional_float(exit_cfg, "tp_max_percent")
         sl_max_percent = optional_float(exit_cfg, "sl_max_percent")
 
-        current_price = self._get_current_price(symbol, market_data, errors)
-        atr_value = self.atr_provider.get_atr(symbol)
-        if atr_value is None:
-            errors.append(f"ATR missing for {symbol}")
-        if current_price is None or current_price <= 0:
-            errors.append("current_price missing or <= 0")
-
         if errors:
-            status.errors.extend(errors)
-            return None
-
-        atr_pct = (atr_value / current_price) * 100.0
-        tp_percent = max(tp_min_percent, atr_pct * tp_atr_multiplier)
-        if tp_max_percent is not None:
-            tp_percent = min(tp_percent, tp_max_percent)
-
-        sl_percent = max(sl_min_percent, atr_pct * sl_atr_multiplier)
-        if sl_max_percent is not None:
-            sl_percent = min(sl_percent, sl_max_percent)
-
-        ph_threshold_type = optional_str(exit_cfg, "ph_threshold_type")
-        ph_threshold_percent = optional_float(exit_cfg, "ph_threshold_percent")
-        ph_min_absolute_usd = optional_float(exit_cfg, "ph_min_absolute_usd")
-
-        sources = {
-            "exit_params": f"exit_params.{regime}",
-            "atr": "data_registry.indicators.atr",
-            "current_price": "market_data",
-        }
-
-        return ExitParams(
-            regime=regime,
-            tp_percent=float(tp_percent),
-            sl_percent=float(sl_percent),
-            tp_atr_multiplier=float(tp_atr_multiplier),
-            sl_atr_multiplier=float(sl_atr_multiplier),
-            tp_min_percent=float(tp_min_percent),
-            tp_max_percent=float(tp_max_percent)
+            return {}
+
+        return {
+            "regime": regime,
+            "tp_atr_multiplier": float(tp_atr_multiplier),
+            "sl_atr_multiplier": float(sl_atr_multiplier),
+            "tp_min_percent": float(tp_min_percent),
+            "tp_max_percent": float(tp_max_percent)
             if tp_max_percent is not None
             else None,
-            sl_min_percent=float(sl_min_percent),
-            sl_max_percent=float(sl_max_percent)
+            "sl_min_percent": float(sl_min_percent),
+            "sl_max_percent": float(sl_max_percent)
             if sl_max_percent is not None
             else None,
-            max_holding_minutes=float(max_holding),
-            min_holding_minutes=float(min_holding),
-            min_profit_for_extension=float(min_profit_for_extension),
-            extension_percent=float(extension_percent),
-            ph_threshold_type=ph_threshold_type,
-            ph_threshold_percent=ph_threshold_percent,
-            ph_min_absolute_usd=ph_min_absolute_usd,
-            sources=sources,
-        )
+            "max_holding_minutes": float(max_holding),
+            "min_holding_minutes": float(min_holding),
+            "min_profit_for_extension": float(min_profit_for_extension),
+            "extension_percent": float(extension_percent),
+            "ph_threshold_type": optional_str(exit_cfg, "ph_threshold_type"),
+            "ph_threshold_percent": optional_float(exit_cfg, "ph_threshold_percent"),
+            "ph_min_absolute_usd": optional_float(exit_cfg, "ph_min_absolute_usd"),
+        }
 
     def _resolve_order_params(
         self, symbol: str, regime: Optional[str], status: ParameterStatus
@@ -405,6 +542,14 @@ class ParameterOrchestrator:
         if regime is None:
             status.errors.append("order params: regime missing")
             return None
+        hit, entry = self._compiled_lookup("order", (symbol, regime), status)
+        if hit:
+            return entry
+        return self._build_order_params(symbol, regime, status)
+
+    def _build_order_params(
+        self, symbol: str, regime: str, status: ParameterStatus
+    ) -> Optional[OrderParams]:
         errors: list[str] = []
         limit_cfg = require_dict(
             self._order_executor, "limit_order", errors, "scalping.order_executor"
@@ -498,15 +643,75 @@ class ParameterOrchestrator:
             status.errors.extend(errors)
             return None
 
+        static = None
+        table = self._compiled
+        profile_name = table.profile_for_balance(balance) if table else None
+        if profile_name is not None:
+            hit, static = self._compiled_lookup("risk", (regime, profile_name), status)
+            if hit and static is None:
+                return None
+        if static is None:
+            profiles = self._iter_balance_profiles(errors)
+            if not profiles:
+                status.errors.extend(errors)
+                return None
+            name, cfg = self._pick_balance_profile(profiles, balance)
+            static_values = self._resolve_risk_static(regime, name, cfg, errors)
+            if errors:
+                status.errors.extend(errors)
+                return None
+            static = freeze_params("CompiledRiskParams", static_values)
+
+        # ✅ ИСПРАВЛЕНИЕ (11.02.2026): base_position_usd теперь вычисляется динамически
+        # из max_position_percent × balance, если не задан явно в конфиге
+        if static.progressive:
+            min_balance = static.min_balance
+            max_balance = static.max_balance
+            if balance <= min_balance:
+                base_position_usd = static.size_at_min
+            elif balance >= max_balance:
+                base_position_usd = static.size_at_max
+            else:
+                progress = (balance - min_balance) / (max_balance - min_balance)
+                base_position_usd = (
+                    static.size_at_min
+                    + (static.size_at_max - static.size_at_min) * progress
+                )
+        else:
+            base_position_usd = static.base_position_usd
+            if base_position_usd is None:
+                base_position_usd = float(balance) * static.max_position_percent / 100.0
+
+        position_size_usd = float(base_position_usd) * static.position_size_multiplier
+
+        sources = {
+            "balance_profile": f"scalping.balance_profiles.{static.profile_name}",
+            "position_size_multiplier": f"adaptive_regime.{regime}",
+            "leverage": "scalping.leverage",
+        }
+
+        return RiskParams(
+            regime=regime,
+            leverage=static.leverage,
+            position_size_usd=float(position_size_usd),
+            min_position_usd=static.min_position_usd,
+            max_position_usd=static.max_position_usd,
+            max_open_positions=static.max_open_positions,
+            max_position_percent=static.max_position_percent,
+            sources=sources,
+        )
+
+    def _resolve_risk_static(
+        self,
+        regime: str,
+        profile_name: str,
+        profile: Dict[str, Any],
+        errors: list[str],
+    ) -> Dict[str, Any]:
+        """Balance-independent part of risk params; compiled per regime × balance profile."""
         leverage = require_float(self._scalping, "leverage", errors, "scalping")
         if leverage is None:
-            status.errors.extend(errors)
-            return None
-
-        profile = self._select_balance_profile(balance, errors)
-        if profile is None:
-            status.errors.extend(errors)
-            return None
+            return {}
 
         position_size_multiplier = None
         if isinstance(self._adaptive_regime, dict) and regime in self._adaptive_regime:
@@ -517,24 +722,31 @@ class ParameterOrchestrator:
                 )
         if position_size_multiplier is None:
             errors.append(f"adaptive_regime.{regime}.position_size_multiplier missing")
-            status.errors.extend(errors)
-            return None
+            return {}
+
+        progressive = bool(profile.get("progressive"))
+        min_balance = size_at_min = size_at_max = max_balance = None
+        if progressive:
+            min_balance = profile.get("min_balance")
+            size_at_min = profile.get("size_at_min")
+            size_at_max = profile.get("size_at_max")
+            threshold = profile.get("threshold")
+            if None in (min_balance, size_at_min, size_at_max, threshold):
+                errors.append(
+                    f"balance_profile {profile_name} missing progressive fields"
+                )
+            else:
+                max_balance = profile.get("max_balance", threshold)
 
         min_position_usd = profile.get("min_position_usd")
         max_position_usd = profile.get("max_position_usd")
         max_open_positions = profile.get("max_open_positions")
         max_position_percent = profile.get("max_position_percent")
-
-        # ✅ ИСПРАВЛЕНИЕ (11.02.2026): base_position_usd теперь вычисляется динамически
-        # из max_position_percent × balance, если не задан явно в конфиге
         base_position_usd = profile.get("base_position_usd")
-        if base_position_usd is None and max_position_percent is not None and balance:
-            base_position_usd = float(balance) * float(max_position_percent) / 100.0
 
         if any(
             v is None
             for v in (
-                base_position_usd,
                 min_position_usd,
                 max_position_usd,
                 max_open_positions,
@@ -544,34 +756,41 @@ class ParameterOrchestrator:
             errors.append("balance_profile missing required fields")
 
         if errors:
-            status.errors.extend(errors)
-            return None
-
-        position_size_usd = float(base_position_usd) * float(position_size_multiplier)
-
-        sources = {
-            "balance_profile": f"scalping.balance_profiles.{profile.get('name')}",
-            "position_size_multiplier": f"adaptive_regime.{regime}",
-            "leverage": "scalping.leverage",
+            return {}
+
+        return {
+            "regime": regime,
+            "profile_name": profile_name,
+            "leverage": float(leverage),
+            "position_size_multiplier": float(position_size_multiplier),
+            "min_position_usd": float(min_position_usd),
+            "max_position_usd": float(max_position_usd),
+            "max_open_positions": int(max_open_positions),
+            "max_position_percent": float(max_position_percent),
+            "base_position_usd": float(base_position_usd)
+            if base_position_usd is not None
+            else None,
+            "progressive": progressive,
+            "min_balance": float(min_balance) if progressive else None,
+            "max_balance": float(max_balance) if progressive else None,
+            "size_at_min": float(size_at_min) if progressive else None,
+            "size_at_max": float(size_at_max) if progressive else None,
         }
 
-        return RiskParams(
-            regime=regime,
-            leverage=float(leverage),
-            position_size_usd=float(position_size_usd),
-            min_position_usd=float(min_position_usd),
-            max_position_usd=float(max_position_usd),
-            max_open_positions=int(max_open_positions),
-            max_position_percent=float(max_position_percent),
-            sources=sources,
-        )
-
     def _resolve_pattern_params(
         self, symbol: str, regime: Optional[str], status: ParameterStatus
     ) -> Optional[PatternParams]:
         if regime is None:
             status.errors.append("pattern params: regime missing")
             return None
+        hit, entry = self._compiled_lookup("patterns", regime, status)
+        if hit:
+            return entry
+        return self._build_pattern_params(symbol, regime, status)
+
+    def _build_pattern_params(
+        self, symbol: str, regime: str, status: ParameterStatus
+    ) -> Optional[PatternParams]:
         errors: list[str] = []
         enabled = (
             self._patterns.get("enabled") if isinstance(self._patterns, dict) else None
@@ -664,12 +883,14 @@ class ParameterOrchestrator:
             return None
         return None
 
-    def _select_balance_profile(
-        self, balance: float, errors: list[str]
-    ) -> Optional[Dict[str, Any]]:
+    def _iter_balance_profiles(
+        self, errors: Optional[list[str]] = None
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Valid balance profiles as (name, threshold, cfg), sorted by threshold."""
+        errors = errors if errors is not None else []
         if not isinstance(self._balance_profiles, dict) or not self._balance_profiles:
             errors.append("scalping.balance_profiles missing")
-            return None
+            return []
 
         profiles = []
         for name, cfg in self._balance_profiles.items():
@@ -682,40 +903,19 @@ class ParameterOrchestrator:
 
         if not profiles:
             errors.append("no valid balance profiles found")
-            return None
+            return []
 
         profiles.sort(key=lambda item: item[1])
-        chosen = None
+        return profiles
+
+    @staticmethod
+    def _pick_balance_profile(
+        profiles: List[Tuple[str, float, Dict[str, Any]]], balance: float
+    ) -> Tuple[str, Dict[str, Any]]:
         for name, threshold, cfg in profiles:
             if balance <= threshold:
-                chosen = (name, cfg)
-                break
-        if chosen is None:
-            chosen = (profiles[-1][0], profiles[-1][2])
-
-        name, cfg = chosen
-        cfg = dict(cfg)
-        cfg["name"] = name
-
-        if cfg.get("progressive"):
-            min_balance = cfg.get("min_balance")
-            size_at_min = cfg.get("size_at_min")
-            size_at_max = cfg.get("size_at_max")
-            threshold = cfg.get("threshold")
-            if None in (min_balance, size_at_min, size_at_max, threshold):
-                errors.append(f"balance_profile {name} missing progressive fields")
-                return cfg
-            max_balance = cfg.get("max_balance", threshold)
-            if balance <= min_balance:
-                base = size_at_min
-            elif balance >= max_balance:
-                base = size_at_max
-            else:
-                progress = (balance - min_balance) / (max_balance - min_balance)
-                base = size_at_min + (size_at_max - size_at_min) * progress
-            cfg["base_position_usd"] = base
-
-        return cfg
+                return name, cfg
+        return profiles[-1][0], profiles[-1][2]
 
     def log_bundle(self, bundle: ParameterBundle, symbol: str) -> None:
         if not bundle:
@@ -1,3 +1,4 @@
+from .candle_masks import OHLCArrays, compute_pattern_masks
 from .pattern_engine import PatternEngine, PatternSignal
 
-__all__ = ["PatternEngine", "PatternSignal"]
+__all__ = ["OHLCArrays", "PatternEngine", "PatternSignal", "compute_pattern_masks"]
@@ -0,0 +1,229 @@
+"""
+Векторизованные маски свечных паттернов на NumPy.
+
+Все маски считаются за один проход по окну: элемент i маски = паттерн
+сформировался на свече i. Функции принимают как 1D (одно окно), так и 2D
+(символы × свечи) массивы — время всегда по последней оси. Недостающая
+история заполняется NaN, поэтому любые сравнения с ней дают False.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+EPS = 1e-9
+BREAKOUT_LOOKBACK = 5
+PINBAR_MAX_BODY_RATIO = 0.35
+PINBAR_MAX_OPPOSITE_RATIO = 0.2
+RETEST_TOLERANCE = 0.003
+
+# Свечей достаточно, чтобы посчитать все маски на самой новой свече
+TAIL_BARS = BREAKOUT_LOOKBACK + 1
+
+MASK_NAMES: Tuple[str, ...] = (
+    "pinbar_bullish",
+    "pinbar_bearish",
+    "engulfing_bullish",
+    "engulfing_bearish",
+    "inside_bar",
+    "fakey_bullish",
+    "fakey_bearish",
+    "three_candles_bullish",
+    "three_candles_bearish",
+    "breakout_bullish",
+    "breakout_bearish",
+)
+
+Threshold = Union[float, np.ndarray]
+
+
+@dataclass
+class OHLCArrays:
+    """OHLC окна свечей как float64 массивы (время — последняя ось)."""
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    timestamp: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return int(self.close.shape[-1])
+
+    def tail(self, bars: int) -> "OHLCArrays":
+        return OHLCArrays(
+            self.open[..., -bars:],
+            self.high[..., -bars:],
+            self.low[..., -bars:],
+            self.close[..., -bars:],
+            None if self.timestamp is None else self.timestamp[..., -bars:],
+        )
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Any]) -> "OHLCArrays":
+        """Список OHLCV/dict -> массивы. Отсутствующие поля = 0.0, как в _extract."""
+        count = len(candles)
+        if count and isinstance(candles[0], dict):
+            rows = [
+                (
+                    c.get("open", 0.0),
+                    c.get("high", 0.0),
+                    c.get("low", 0.0),
+                    c.get("close", 0.0),
+                )
+                for c in candles
+            ]
+        else:
+            rows = [
+                (
+                    getattr(c, "open", 0.0),
+                    getattr(c, "high", 0.0),
+                    getattr(c, "low", 0.0),
+                    getattr(c, "close", 0.0),
+                )
+                for c in candles
+            ]
+        data = np.asarray(rows, dtype=np.float64).reshape(count, 4)
+        return cls(data[:, 0], data[:, 1], data[:, 2], data[:, 3])
+
+    @classmethod
+    def from_frame(cls, df: Any) -> "OHLCArrays":
+        """pandas DataFrame с колонками open/high/low/close."""
+        return cls(
+            df["open"].to_numpy(dtype=np.float64),
+            df["high"].to_numpy(dtype=np.float64),
+            df["low"].to_numpy(dtype=np.float64),
+            df["close"].to_numpy(dtype=np.float64),
+        )
+
+    @classmethod
+    def stack(cls, windows: Sequence["OHLCArrays"], bars: int) -> "OHLCArrays":
+        """Склеить последние `bars` свечей нескольких окон в 2D (короткие — NaN слева)."""
+        out = np.full((4, len(windows), bars), np.nan)
+        for row, window in enumerate(windows):
+            size = min(len(window), bars)
+            if size:
+                out[0, row, -size:] = window.open[-size:]
+                out[1, row, -size:] = window.high[-size:]
+                out[2, row, -size:] = window.low[-size:]
+                out[3, row, -size:] = window.close[-size:]
+        return cls(out[0], out[1], out[2], out[3])
+
+
+def lag(values: np.ndarray, bars: int) -> np.ndarray:
+    """values[..., i - bars] на позиции i; NaN, где истории нет."""
+    out = np.full(values.shape, np.nan)
+    if bars < values.shape[-1]:
+        out[..., bars:] = values[..., :-bars]
+    return out
+
+
+def rolling_prev(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """reducer по `window` свечам строго ДО i (без самой свечи i)."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] > window:
+        view = sliding_window_view(values[..., :-1], window, axis=-1)
+        out[..., window:] = reducer(view, axis=-1)
+    return out
+
+
+def compute_pattern_masks(
+    arrays: OHLCArrays,
+    pinbar_wick_ratio: Threshold,
+    breakout_pct: Threshold,
+) -> Dict[str, np.ndarray]:
+    """
+    Булевы маски всех паттернов PatternEngine по всему окну за один проход.
+
+    Пороги могут быть скаляром или массивом (символы, 1) для batch-режима.
+    """
+    o, h, l, c = arrays.open, arrays.high, arrays.low, arrays.close
+    o1, h1, l1, c1 = lag(o, 1), lag(h, 1), lag(l, 1), lag(c, 1)
+    h2, l2, c2 = lag(h, 2), lag(l, 2), lag(c, 2)
+    has_prev = ~np.isnan(c1)
+
+    with np.errstate(invalid="ignore"):
+        total = np.maximum(h - l, EPS)
+        upper_ratio = (h - np.maximum(o, c)) / total
+        lower_ratio = (np.minimum(o, c) - l) / total
+        small_body = np.abs(c - o) / total <= PINBAR_MAX_BODY_RATIO
+
+        masks = {
+            "pinbar_bullish": has_prev
+            & small_body
+            & (lower_ratio >= pinbar_wick_ratio)
+            & (upper_ratio <= PINBAR_MAX_OPPOSITE_RATIO),
+            "pinbar_bearish": has_prev
+            & small_body
+            & (upper_ratio >= pinbar_wick_ratio)
+            & (lower_ratio <= PINBAR_MAX_OPPOSITE_RATIO),
+            "engulfing_bullish": (c1 < o1) & (c > o) & (o <= c1) & (c >= o1),
+            "engulfing_bearish": (c1 > o1) & (c < o) & (o >= c1) & (c <= o1),
+            "inside_bar": (h < h1) & (l > l1),
+            "three_candles_bullish": (c2 < c1) & (c1 < c),
+            "three_candles_bearish": (c2 > c1) & (c1 > c),
+        }
+
+        # Fakey: внутренняя свеча (i-1 внутри i-2) + ложный пробой материнской
+        mother = (h1 < h2) & (l1 > l2)
+        masks["fakey_bullish"] = mother & (l < l2) & (c > h1)
+        masks["fakey_bearish"] = mother & (h > h2) & (c < l1) & ~masks["fakey_bullish"]
+
+        recent_high = rolling_prev(h, BREAKOUT_LOOKBACK, np.max)
+        recent_low = rolling_prev(l, BREAKOUT_LOOKBACK, np.min)
+        masks["breakout_bullish"] = (recent_high > 0) & (
+            c > recent_high * (1 + breakout_pct)
+        )
+        masks["breakout_bearish"] = (recent_low > 0) & (
+            c < recent_low * (1 - breakout_pct)
+        )
+    return masks
+
+
+def breakout_retest_hits(
+    arrays: OHLCArrays,
+    level: float,
+    lookback: int = BREAKOUT_LOOKBACK,
+    tolerance: float = RETEST_TOLERANCE,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Прорыв уровня + ретест в следующие `lookback` свечей (1D окно).
+
+    Returns:
+        (breakout_idx, retest_idx) для прорыва вверх и для пробоя вниз;
+        retest_idx — первая свеча ретеста после каждого прорыва.
+    """
+    h, l, c = arrays.high, arrays.low, arrays.close
+    n = h.shape[-1]
+    empty = np.empty(0, dtype=np.int64)
+    if n < 2 * lookback + 1 or level == 0:
+        return empty, empty, empty, empty
+
+    # Прорыв на i ∈ [lookback, n - lookback): место для ретеста справа
+    idx = np.arange(n)
+    window = (idx >= lookback) & (idx < n - lookback)
+    prev_high = rolling_prev(h, lookback, np.max)
+    prev_low = rolling_prev(l, lookback, np.min)
+    with np.errstate(invalid="ignore"):
+        broke_up = window & (h > level) & (prev_high < level)
+        broke_down = window & (l < level) & (prev_low > level)
+        retest_up = (np.abs(l - level) / level < tolerance) & (c > level)
+        retest_down = (np.abs(h - level) / level < tolerance) & (c < level)
+
+    def _first_retest(breaks: np.ndarray, retest: np.ndarray):
+        starts = np.flatnonzero(breaks)
+        if not starts.size:
+            return empty, empty
+        # ahead[i] = retest[i+1 .. i+lookback]
+        ahead = sliding_window_view(retest[1:], lookback)[starts]
+        found = ahead.any(axis=1)
+        first = starts[found] + 1 + ahead[found].argmax(axis=1)
+        return starts[found], first
+
+    up_break, up_retest = _first_retest(broke_up, retest_up)
+    down_break, down_retest = _first_retest(broke_down, retest_down)
+    return up_break, up_retest, down_break, down_retest
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from .candle_masks import OHLCArrays, breakout_retest_hits, compute_pattern_masks, lag
+
 
 class PatternType(Enum):
     BULLISH = "bullish"
@@ -92,94 +94,86 @@ class PatternDetector:
         Пинбар = длинная тень + маленькое тело + короткая противоположная тень
         """
         signals = []
+        if len(df) < 3:
+            return signals
 
-        for i in range(2, len(df)):
-            current = df.iloc[i]
-
-            # Расчет параметров свечи
-            body_size = abs(current["close"] - current["open"])
-            total_size = current["high"] - current["low"]
-            upper_shadow = current["high"] - max(current["open"], current["close"])
-            lower_shadow = min(current["open"], current["close"]) - current["low"]
-
-            if total_size == 0:
-                continue
-
-            # Проверка на пинбар
-            body_ratio = body_size / total_size
-            upper_ratio = upper_shadow / total_size
-            lower_ratio = lower_shadow / total_size
-
-            # Пинбар должен иметь маленькое тело и длинную тень
-            if body_ratio > 0.3:  # Тело больше 30% - не пинбар
-                continue
-
-            # Определяем тип пинбара
-            is_bullish_pinbar = (
-                lower_ratio > self.pinbar_threshold
-                and upper_ratio < 0.15
-                and current["close"] > current["open"]
-            )
-
-            is_bearish_pinbar = (
-                upper_ratio > self.pinbar_threshold
-                and lower_ratio < 0.15
-                and current["close"] < current["open"]
-            )
-
-            # Проверяем совпадение с уровнями S/R
-            near_support = False
-            near_resistance = False
-
-            if support_levels:
-                near_support = any(
-                    abs(current["low"] - level) / level < 0.005
-                    for level in support_levels
-                )
+        bars = OHLCArrays.from_frame(df)
+        o, h, l, c = bars.open, bars.high, bars.low, bars.close
+
+        # Расчет параметров свечей сразу по всему окну
+        total_size = h - l
+        valid = total_size != 0
+        valid[:2] = False
+        safe_total = np.where(valid, total_size, 1.0)
+        body_ratio = np.abs(c - o) / safe_total
+        upper_ratio = (h - np.maximum(o, c)) / safe_total
+        lower_ratio = (np.minimum(o, c) - l) / safe_total
+
+        # Пинбар должен иметь маленькое тело (<= 30%) и длинную тень
+        candidate = valid & (body_ratio <= 0.3)
+        is_bullish_pinbar = (
+            candidate
+            & (lower_ratio > self.pinbar_threshold)
+            & (upper_ratio < 0.15)
+            & (c > o)
+        )
+        is_bearish_pinbar = (
+            candidate
+            & (upper_ratio > self.pinbar_threshold)
+            & (lower_ratio < 0.15)
+            & (c < o)
+        )
 
-            if resistance_levels:
-                near_resistance = any(
-                    abs(current["high"] - level) / level < 0.005
-                    for level in resistance_levels
-                )
+        # Совпадение с уровнями S/R
+        near_support = self._near_levels(l, support_levels, 0.005)
+        near_resistance = self._near_levels(h, resistance_levels, 0.005)
+
+        bullish = is_bullish_pinbar & near_support
+        bearish = is_bearish_pinbar & near_resistance & ~bullish
 
-            # Генерируем сигнал
-            if is_bullish_pinbar and near_support:
-                signal = PatternSignal(
-                    pattern_name="Bullish Pinbar at Support",
-                    pattern_type=PatternType.BULLISH,
-                    strength=PatternStrength.STRONG
-                    if near_support
-                    else PatternStrength.MEDIUM,
-                    entry_price=current["close"],
-                    stop_loss=current["low"] * 0.998,  # Ниже хвоста
-                    take_profit=current["close"]
-                    + (current["close"] - current["low"]) * 2,
-                    confidence=0.85 if near_support else 0.7,
-                    timestamp=df.index[i],
-                    timeframe="15m",
+        for i in np.flatnonzero(bullish | bearish):
+            if bullish[i]:
+                signals.append(
+                    PatternSignal(
+                        pattern_name="Bullish Pinbar at Support",
+                        pattern_type=PatternType.BULLISH,
+                        strength=PatternStrength.STRONG,
+                        entry_price=c[i],
+                        stop_loss=l[i] * 0.998,  # Ниже хвоста
+                        take_profit=c[i] + (c[i] - l[i]) * 2,
+                        confidence=0.85,
+                        timestamp=df.index[i],
+                        timeframe="15m",
+                    )
                 )
-                signals.append(signal)
-
-            elif is_bearish_pinbar and near_resistance:
-                signal = PatternSignal(
-                    pattern_name="Bearish Pinbar at Resistance",
-                    pattern_type=PatternType.BEARISH,
-                    strength=PatternStrength.STRONG
-                    if near_resistance
-                    else PatternStrength.MEDIUM,
-                    entry_price=current["close"],
-                    stop_loss=current["high"] * 1.002,  # Выше хвоста
-                    take_profit=current["close"]
-                    - (current["high"] - current["close"]) * 2,
-                    confidence=0.85 if near_resistance else 0.7,
-                    timestamp=df.index[i],
-                    timeframe="15m",
+            else:
+                signals.append(
+                    PatternSignal(
+                        pattern_name="Bearish Pinbar at Resistance",
+                        pattern_type=PatternType.BEARISH,
+                        strength=PatternStrength.STRONG,
+                        entry_price=c[i],
+                        stop_loss=h[i] * 1.002,  # Выше хвоста
+                        take_profit=c[i] - (h[i] - c[i]) * 2,
+                        confidence=0.85,
+                        timestamp=df.index[i],
+                        timeframe="15m",
+                    )
                 )
-                signals.append(signal)
 
         return signals
 
+    @staticmethod
+    def _near_levels(
+        prices: np.ndarray, levels: Optional[List[float]], tolerance: float
+    ) -> np.ndarray:
+        """Маска свечей, у которых цена в пределах tolerance от любого уровня"""
+        if not levels:
+            return np.zeros(prices.shape, dtype=bool)
+        levels_arr = np.asarray(levels, dtype=np.float64)
+        distance = np.abs(prices[:, None] - levels_arr[None, :]) / levels_arr
+        return (distance < tolerance).any(axis=1)
+
     def detect_engulfing(self, df: pd.DataFrame) -> List[PatternSignal]:
         """
         Детектирует поглощающие паттерны (bullish/bearish engulfing)
@@ -188,64 +182,52 @@ class PatternDetector:
         Bearish: красная свеча полностью поглощает предыдущую зеленую
         """
         signals = []
+        if len(df) < 2:
+            return signals
 
-        for i in range(1, len(df)):
-            current = df.iloc[i]
-            previous = df.iloc[i - 1]
-
-            # Bullish Engulfing
-            if (
-                previous["close"] < previous["open"]
-                and current["close"] > current["open"]  # Предыдущая красная
-                and current["open"] < previous["close"]  # Текущая зеленая
-                and current["close"]  # Открытие ниже предыдущего close
-                > previous["open"]
-            ):  # Close выше предыдущего open
-                body_ratio = abs(current["close"] - current["open"]) / abs(
-                    previous["close"] - previous["open"]
-                )
-
-                if body_ratio > self.engulfing_min_ratio:
-                    signal = PatternSignal(
+        bars = OHLCArrays.from_frame(df)
+        o, h, l, c = bars.open, bars.high, bars.low, bars.close
+        o1, c1 = lag(o, 1), lag(c, 1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            body_ratio = np.abs(c - o) / np.abs(c1 - o1)
+            strong = body_ratio > self.engulfing_min_ratio
+            # Bullish: предыдущая красная, текущая зеленая, открытие ниже
+            # предыдущего close, закрытие выше предыдущего open
+            bullish = (c1 < o1) & (c > o) & (o < c1) & (c > o1) & strong
+            # Bearish: зеркально
+            bearish = (c1 > o1) & (c < o) & (o > c1) & (c < o1) & strong
+
+        for i in np.flatnonzero(bullish | bearish):
+            confidence = min(0.75, body_ratio[i] * 0.5)
+            if bullish[i]:
+                signals.append(
+                    PatternSignal(
                         pattern_name="Bullish Engulfing",
                         pattern_type=PatternType.BULLISH,
                         strength=PatternStrength.MEDIUM,
-                        entry_price=current["close"],
-                        stop_loss=current["low"] * 0.998,
-                        take_profit=current["close"]
-                        + abs(current["close"] - current["open"]) * 2,
-                        confidence=min(0.75, body_ratio * 0.5),
+                        entry_price=c[i],
+                        stop_loss=l[i] * 0.998,
+                        take_profit=c[i] + abs(c[i] - o[i]) * 2,
+                        confidence=confidence,
                         timestamp=df.index[i],
                         timeframe="15m",
                     )
-                    signals.append(signal)
-
-            # Bearish Engulfing
-            elif (
-                previous["close"] > previous["open"]
-                and current["close"] < current["open"]  # Предыдущая зеленая
-                and current["open"] > previous["close"]  # Текущая красная
-                and current["close"]  # Открытие выше предыдущего close
-                < previous["open"]
-            ):  # Close ниже предыдущего open
-                body_ratio = abs(current["close"] - current["open"]) / abs(
-                    previous["close"] - previous["open"]
                 )
-
-                if body_ratio > self.engulfing_min_ratio:
-                    signal = PatternSignal(
+            else:
+                signals.append(
+                    PatternSignal(
                         pattern_name="Bearish Engulfing",
                         pattern_type=PatternType.BEARISH,
                         strength=PatternStrength.MEDIUM,
-                        entry_price=current["close"],
-                        stop_loss=current["high"] * 1.002,
-                        take_profit=current["close"]
-                        - abs(current["close"] - current["open"]) * 2,
-                        confidence=min(0.75, body_ratio * 0.5),
+                        entry_price=c[i],
+                        stop_loss=h[i] * 1.002,
+                        take_profit=c[i] - abs(c[i] - o[i]) * 2,
+                        confidence=confidence,
                         timestamp=df.index[i],
                         timeframe="15m",
                     )
-                    signals.append(signal)
+                )
 
         return signals
 
@@ -256,48 +238,50 @@ class PatternDetector:
         Inside Bar: текущая свеча полностью внутри предыдущей
         """
         signals = []
+        if len(df) < 3:
+            return signals
 
-        for i in range(1, len(df)):
-            current = df.iloc[i]
-            previous = df.iloc[i - 1]
-
-            # Inside Bar: High текущей < High предыдущей, Low текущей > Low предыдущей
-            if current["high"] < previous["high"] and current["low"] > previous["low"]:
-                # Ждем прорыва на следующей свече
-                if i + 1 < len(df):
-                    next_candle = df.iloc[i + 1]
-
-                    # Bullish breakout
-                    if next_candle["close"] > previous["high"]:
-                        signal = PatternSignal(
-                            pattern_name="Inside Bar Bullish Breakout",
-                            pattern_type=PatternType.BULLISH,
-                            strength=PatternStrength.MEDIUM,
-                            entry_price=next_candle["close"],
-                            stop_loss=current["low"] * 0.998,
-                            take_profit=next_candle["close"]
-                            + (previous["high"] - current["low"]) * 1.5,
-                            confidence=0.7,
-                            timestamp=df.index[i + 1],
-                            timeframe="15m",
-                        )
-                        signals.append(signal)
-
-                    # Bearish breakout
-                    elif next_candle["close"] < previous["low"]:
-                        signal = PatternSignal(
-                            pattern_name="Inside Bar Bearish Breakout",
-                            pattern_type=PatternType.BEARISH,
-                            strength=PatternStrength.MEDIUM,
-                            entry_price=next_candle["close"],
-                            stop_loss=current["high"] * 1.002,
-                            take_profit=next_candle["close"]
-                            - (current["high"] - previous["low"]) * 1.5,
-                            confidence=0.7,
-                            timestamp=df.index[i + 1],
-                            timeframe="15m",
-                        )
-                        signals.append(signal)
+        bars = OHLCArrays.from_frame(df)
+        h, l, c = bars.high, bars.low, bars.close
+        h1, l1 = lag(h, 1), lag(l, 1)
+
+        with np.errstate(invalid="ignore"):
+            # Inside Bar на i, прорыв матери (i-1) закрытием следующей свечи (i+1)
+            inside = (h < h1) & (l > l1)
+            inside[-1] = False  # Ждем прорыва на следующей свече
+            next_close = np.roll(c, -1)
+            bullish = inside & (next_close > h1)
+            bearish = inside & (next_close < l1) & ~bullish
+
+        for i in np.flatnonzero(bullish | bearish):
+            if bullish[i]:
+                signals.append(
+                    PatternSignal(
+                        pattern_name="Inside Bar Bullish Breakout",
+                        pattern_type=PatternType.BULLISH,
+                        strength=PatternStrength.MEDIUM,
+                        entry_price=c[i + 1],
+                        stop_loss=l[i] * 0.998,
+                        take_profit=c[i + 1] + (h1[i] - l[i]) * 1.5,
+                        confidence=0.7,
+                        timestamp=df.index[i + 1],
+                        timeframe="15m",
+                    )
+                )
+            else:
+                signals.append(
+                    PatternSignal(
+                        pattern_name="Inside Bar Bearish Breakout",
+                        pattern_type=PatternType.BEARISH,
+                        strength=PatternStrength.MEDIUM,
+                        entry_price=c[i + 1],
+                        stop_loss=h[i] * 1.002,
+                        take_profit=c[i + 1] - (h[i] - l1[i]) * 1.5,
+                        confidence=0.7,
+                        timestamp=df.index[i + 1],
+                        timeframe="15m",
+                    )
+                )
 
         return signals
 
@@ -318,70 +302,50 @@ class PatternDetector:
             return signals
 
         all_levels = (support_levels or []) + (resistance_levels or [])
+        bars = OHLCArrays.from_frame(df)
+        h, l, c = bars.high, bars.low, bars.close
 
         for level in all_levels:
-            # Ищем прорыв уровня
-            breakout_idx = None
-            breakout_direction = None
-
-            for i in range(5, len(df) - 5):  # Оставляем место для ретеста
-                current = df.iloc[i]
-                prev_candles = df.iloc[i - 5 : i]
-                next_candles = df.iloc[i + 1 : i + 6]
-
-                # Проверяем прорыв сопротивления
-                if current["high"] > level and all(
-                    candle["high"] < level for candle in prev_candles.itertuples()
-                ):
-                    # Ищем ретест (откат к уровню)
-                    for j in range(i + 1, min(i + 6, len(df))):
-                        retest_candle = df.iloc[j]
-
-                        # Ретест: цена откатывает к уровню и отбивается
-                        if (
-                            abs(retest_candle["low"] - level) / level < 0.003
-                            and retest_candle["close"] > level
-                        ):
-                            signal = PatternSignal(
-                                pattern_name="Breakout + Retest (Resistance)",
-                                pattern_type=PatternType.BULLISH,
-                                strength=PatternStrength.STRONG,
-                                entry_price=retest_candle["close"],
-                                stop_loss=level * 0.995,
-                                take_profit=level + (level - retest_candle["low"]) * 2,
-                                confidence=0.8,
-                                timestamp=df.index[j],
-                                timeframe="15m",
-                            )
-                            signals.append(signal)
-                            break
-
-                # Проверяем прорыв поддержки
-                elif current["low"] < level and all(
-                    candle["low"] > level for candle in prev_candles.itertuples()
-                ):
-                    # Ищем ретест (откат к уровню)
-                    for j in range(i + 1, min(i + 6, len(df))):
-                        retest_candle = df.iloc[j]
-
-                        # Ретест: цена откатывает к уровню и отбивается
-                        if (
-                            abs(retest_candle["high"] - level) / level < 0.003
-                            and retest_candle["close"] < level
-                        ):
-                            signal = PatternSignal(
-                                pattern_name="Breakdown + Retest (Support)",
-                                pattern_type=PatternType.BEARISH,
-                                strength=PatternStrength.STRONG,
-                                entry_price=retest_candle["close"],
-                                stop_loss=level * 1.005,
-                                take_profit=level - (retest_candle["high"] - level) * 2,
-                                confidence=0.8,
-                                timestamp=df.index[j],
-                                timeframe="15m",
-                            )
-                            signals.append(signal)
-                            break
+            # Маски прорыва/ретеста по всему окну, без вложенных циклов по свечам
+            (
+                up_break,
+                up_retest,
+                down_break,
+                down_retest,
+            ) = breakout_retest_hits(bars, level)
+            hits = [(i, j, True) for i, j in zip(up_break, up_retest)]
+            hits += [(i, j, False) for i, j in zip(down_break, down_retest)]
+            hits.sort()
+
+            for _, j, bullish in hits:
+                if bullish:
+                    signals.append(
+                        PatternSignal(
+                            pattern_name="Breakout + Retest (Resistance)",
+                            pattern_type=PatternType.BULLISH,
+                            strength=PatternStrength.STRONG,
+                            entry_price=c[j],
+                            stop_loss=level * 0.995,
+                            take_profit=level + (level - l[j]) * 2,
+                            confidence=0.8,
+                            timestamp=df.index[j],
+                            timeframe="15m",
+                        )
+                    )
+                else:
+                    signals.append(
+                        PatternSignal(
+                            pattern_name="Breakdown + Retest (Support)",
+                            pattern_type=PatternType.BEARISH,
+                            strength=PatternStrength.STRONG,
+                            entry_price=c[j],
+                            stop_loss=level * 1.005,
+                            take_profit=level - (h[j] - level) * 2,
+                            confidence=0.8,
+                            timestamp=df.index[j],
+                            timeframe="15m",
+                        )
+                    )
 
         return signals
 
@@ -392,55 +356,45 @@ class PatternDetector:
         Внутренняя свеча + ложный прорыв + возврат внутрь
         """
         signals = []
+        if len(df) < 3:
+            return signals
 
-        for i in range(2, len(df)):
-            current = df.iloc[i]
-            prev1 = df.iloc[i - 1]  # Внутренняя свеча
-            prev2 = df.iloc[i - 2]  # Материнская свеча
-
-            # Проверяем Inside Bar (prev1 внутри prev2)
-            if not (prev1["high"] < prev2["high"] and prev1["low"] > prev2["low"]):
-                continue
-
-            # Проверяем ложный прорыв текущей свечой
-            # Сначала прорыв за пределы материнской свечи
-            # Затем возврат внутрь
-
-            # Bullish Fakey: ложный пробой вниз + возврат
-            if (
-                current["low"] < prev2["low"]
-                and current["close"] > prev1["high"]  # Пробой ниже материнской
-            ):  # Возврат выше внутренней
-                signal = PatternSignal(
-                    pattern_name="Bullish Fakey",
-                    pattern_type=PatternType.BULLISH,
-                    strength=PatternStrength.STRONG,
-                    entry_price=current["close"],
-                    stop_loss=current["low"] * 0.998,
-                    take_profit=current["close"] + (prev2["high"] - current["low"]) * 2,
-                    confidence=0.8,
-                    timestamp=df.index[i],
-                    timeframe="15m",
+        bars = OHLCArrays.from_frame(df)
+        h, l, c = bars.high, bars.low, bars.close
+        h2, l2 = lag(h, 2), lag(l, 2)
+        masks = compute_pattern_masks(bars, 1.0, 0.0)
+
+        for i in np.flatnonzero(masks["fakey_bullish"] | masks["fakey_bearish"]):
+            # Bullish Fakey: ложный пробой вниз + возврат выше внутренней
+            if masks["fakey_bullish"][i]:
+                signals.append(
+                    PatternSignal(
+                        pattern_name="Bullish Fakey",
+                        pattern_type=PatternType.BULLISH,
+                        strength=PatternStrength.STRONG,
+                        entry_price=c[i],
+                        stop_loss=l[i] * 0.998,
+                        take_profit=c[i] + (h2[i] - l[i]) * 2,
+                        confidence=0.8,
+                        timestamp=df.index[i],
+                        timeframe="15m",
+                    )
                 )
-                signals.append(signal)
-
-            # Bearish Fakey: ложный пробой вверх + возврат
-            elif (
-                current["high"] > prev2["high"]
-                and current["close"] < prev1["low"]  # Пробой выше материнской
-            ):  # Возврат ниже внутренней
-                signal = PatternSignal(
-                    pattern_name="Bearish Fakey",
-                    pattern_type=PatternType.BEARISH,
-                    strength=PatternStrength.STRONG,
-                    entry_price=current["close"],
-                    stop_loss=current["high"] * 1.002,
-                    take_profit=current["close"] - (current["high"] - prev2["low"]) * 2,
-                    confidence=0.8,
-                    timestamp=df.index[i],
-                    timeframe="15m",
+            # Bearish Fakey: ложный пробой вверх + возврат ниже внутренней
+            else:
+                signals.append(
+                    PatternSignal(
+                        pattern_name="Bearish Fakey",
+                        pattern_type=PatternType.BEARISH,
+                        strength=PatternStrength.STRONG,
+                        entry_price=c[i],
+                        stop_loss=h[i] * 1.002,
+                        take_profit=c[i] - (h[i] - l2[i]) * 2,
+                        confidence=0.8,
+                        timestamp=df.index[i],
+                        timeframe="15m",
+                    )
                 )
-                signals.append(signal)
 
         return signals
 
@@ -452,57 +406,52 @@ class PatternDetector:
         Three Crows: три подряд падающие свечи с увеличивающимися телами
         """
         signals = []
+        if len(df) < 3:
+            return signals
 
-        for i in range(2, len(df)):
-            c1, c2, c3 = df.iloc[i - 2], df.iloc[i - 1], df.iloc[i]
-
-            # Three White Soldiers
-            if (
-                c1["close"] > c1["open"]
-                and c2["close"] > c2["open"]  # Первая зеленая
-                and c3["close"] > c3["open"]  # Вторая зеленая
-                and c1["close"] < c2["open"]  # Третья зеленая
-                and c2["close"] < c3["open"]  # Переход между свечами
-                and abs(c3["close"] - c3["open"])
-                > abs(c2["close"] - c2["open"])
-                > abs(c1["close"] - c1["open"])
-            ):
-                signal = PatternSignal(
-                    pattern_name="Three White Soldiers",
-                    pattern_type=PatternType.BULLISH,
-                    strength=PatternStrength.MEDIUM,
-                    entry_price=c3["close"],
-                    stop_loss=c1["low"] * 0.998,
-                    take_profit=c3["close"] + (c3["close"] - c1["low"]) * 1.5,
-                    confidence=0.75,
-                    timestamp=df.index[i],
-                    timeframe="15m",
+        bars = OHLCArrays.from_frame(df)
+        o, h, l, c = bars.open, bars.high, bars.low, bars.close
+        body = np.abs(c - o)
+        o1, c1, body1 = lag(o, 1), lag(c, 1), lag(body, 1)
+        o2, c2, body2 = lag(o, 2), lag(c, 2), lag(body, 2)
+        h2, l2 = lag(h, 2), lag(l, 2)
+
+        with np.errstate(invalid="ignore"):
+            growing = (body > body1) & (body1 > body2)
+            # Три зеленые подряд с переходом между свечами
+            soldiers = (c2 > o2) & (c1 > o1) & (c > o) & (c2 < o1) & (c1 < o) & growing
+            # Три красные подряд
+            crows = (c2 < o2) & (c1 < o1) & (c < o) & (c2 > o1) & (c1 > o) & growing
+
+        for i in np.flatnonzero(soldiers | crows):
+            if soldiers[i]:
+                signals.append(
+                    PatternSignal(
+                        pattern_name="Three White Soldiers",
+                        pattern_type=PatternType.BULLISH,
+                        strength=PatternStrength.MEDIUM,
+                        entry_price=c[i],
+                        stop_loss=l2[i] * 0.998,
+                        take_profit=c[i] + (c[i] - l2[i]) * 1.5,
+                        confidence=0.75,
+                        timestamp=df.index[i],
+                        timeframe="15m",
+                    )
                 )
-                signals.append(signal)
-
-            # Three Black Crows
-            elif (
-                c1["close"] < c1["open"]
-                and c2["close"] < c2["open"]  # Первая красная
-                and c3["close"] < c3["open"]  # Вторая красная
-                and c1["close"] > c2["open"]  # Третья красная
-                and c2["close"] > c3["open"]  # Переход между свечами
-                and abs(c3["close"] - c3["open"])
-                > abs(c2["close"] - c2["open"])
-                > abs(c1["close"] - c1["open"])
-            ):
-                signal = PatternSignal(
-                    pattern_name="Three Black Crows",
-                    pattern_type=PatternType.BEARISH,
-                    strength=PatternStrength.MEDIUM,
-                    entry_price=c3["close"],
-                    stop_loss=c1["high"] * 1.002,
-                    take_profit=c3["close"] - (c1["high"] - c3["close"]) * 1.5,
-                    confidence=0.75,
-                    timestamp=df.index[i],
-                    timeframe="15m",
+            else:
+                signals.append(
+                    PatternSignal(
+                        pattern_name="Three Black Crows",
+                        pattern_type=PatternType.BEARISH,
+                        strength=PatternStrength.MEDIUM,
+                        entry_price=c[i],
+                        stop_loss=h2[i] * 1.002,
+                        take_profit=c[i] - (h2[i] - c[i]) * 1.5,
+                        confidence=0.75,
+                        timestamp=df.index[i],
+                        timeframe="15m",
+                    )
                 )
-                signals.append(signal)
 
         return signals
 
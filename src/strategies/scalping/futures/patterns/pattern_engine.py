@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
+from .candle_masks import TAIL_BARS, OHLCArrays, compute_pattern_masks
+
 
 @dataclass
 class PatternSignal:
@@ -18,67 +22,153 @@ class PatternSignal:
 class PatternEngine:
     """
     Lightweight pattern engine operating on OHLCV candles.
-    No external dependencies, deterministic, ASCII-only.
+    Deterministic, ASCII-only. Pattern masks are computed with NumPy over the
+    candle window (see candle_masks); evaluate() only checks the newest bar and,
+    when a symbol is given, reuses the result until that bar changes.
     """
 
+    REQUIRED_THRESHOLDS = (
+        "min_confidence",
+        "min_strength",
+        "boost_multiplier",
+        "penalty_multiplier",
+        "breakout_pct",
+        "pinbar_wick_ratio",
+        "min_bars",
+    )
+
+    def __init__(self) -> None:
+        self._last: Dict[str, Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
+        self.stats = {"evaluated": 0, "cached": 0, "batches": 0}
+
     def evaluate(
         self,
         candles: List[Any],
         current_price: float,
         pattern_params: Any,
+        symbol: Optional[str] = None,
     ) -> Dict[str, Any]:
+        limits, failed = self._prepare(candles, pattern_params)
+        if failed is not None:
+            return failed
+
+        key = self._newest_bar_key(candles[-1], limits) if symbol else None
+        if key is not None:
+            cached = self._last.get(symbol)
+            if cached is not None and cached[0] == key:
+                self.stats["cached"] += 1
+                return cached[1]
+
+        tail = OHLCArrays.from_candles(candles[-TAIL_BARS:])
+        masks = compute_pattern_masks(
+            tail, limits["pinbar_wick_ratio"], limits["breakout_pct"]
+        )
+        ctx = self._build_context(self._signals_at_close(tail, masks), limits)
+        self.stats["evaluated"] += 1
+        if key is not None:
+            self._last[symbol] = (key, ctx)
+        return ctx
+
+    def evaluate_batch(
+        self, inputs: Dict[str, Tuple[List[Any], float, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        evaluate() for all symbols at once: newest-bar windows are stacked into
+        one (symbols x TAIL_BARS) matrix and masks are computed in a single pass.
+
+        inputs: symbol -> (candles, current_price, pattern_params)
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: List[Tuple[str, Dict[str, float], Optional[Tuple[Any, ...]]]] = []
+        windows: List[OHLCArrays] = []
+        for symbol, (candles, _price, pattern_params) in inputs.items():
+            limits, failed = self._prepare(candles, pattern_params)
+            if failed is not None:
+                results[symbol] = failed
+                continue
+            key = self._newest_bar_key(candles[-1], limits)
+            cached = self._last.get(symbol)
+            if key is not None and cached is not None and cached[0] == key:
+                self.stats["cached"] += 1
+                results[symbol] = cached[1]
+                continue
+            pending.append((symbol, limits, key))
+            windows.append(OHLCArrays.from_candles(candles[-TAIL_BARS:]))
+
+        if not pending:
+            return results
+
+        matrix = OHLCArrays.stack(windows, TAIL_BARS)
+        masks = compute_pattern_masks(
+            matrix,
+            np.array([[limits["pinbar_wick_ratio"]] for _, limits, _ in pending]),
+            np.array([[limits["breakout_pct"]] for _, limits, _ in pending]),
+        )
+        for row, (symbol, limits, key) in enumerate(pending):
+            row_masks = {name: mask[row] for name, mask in masks.items()}
+            signals = self._signals_at_close(windows[row], row_masks)
+            ctx = self._build_context(signals, limits)
+            if key is not None:
+                self._last[symbol] = (key, ctx)
+            results[symbol] = ctx
+        self.stats["evaluated"] += len(pending)
+        self.stats["batches"] += 1
+        return results
+
+    def scan(self, candles: List[Any], pattern_params: Any) -> Dict[str, np.ndarray]:
+        """Full-window masks (one bool per candle) for analytics/backtests."""
         thresholds = getattr(pattern_params, "thresholds", {}) or {}
-        required = (
-            "min_confidence",
-            "min_strength",
-            "boost_multiplier",
-            "penalty_multiplier",
-            "breakout_pct",
-            "pinbar_wick_ratio",
-            "min_bars",
+        return compute_pattern_masks(
+            OHLCArrays.from_candles(candles),
+            float(thresholds.get("pinbar_wick_ratio", 0.6)),
+            float(thresholds.get("breakout_pct", 0.0)),
         )
-        missing = [key for key in required if key not in thresholds]
+
+    def forget(self, symbol: Optional[str] = None) -> None:
+        """Drop cached newest-bar results (one symbol or all)."""
+        if symbol is None:
+            self._last.clear()
+        else:
+            self._last.pop(symbol, None)
+
+    def _prepare(
+        self, candles: List[Any], pattern_params: Any
+    ) -> Tuple[Dict[str, float], Optional[Dict[str, Any]]]:
+        thresholds = getattr(pattern_params, "thresholds", {}) or {}
+        missing = [key for key in self.REQUIRED_THRESHOLDS if key not in thresholds]
         if missing:
-            return {
-                "valid": False,
-                "errors": [f"pattern_thresholds_missing: {', '.join(missing)}"],
-                "bias": 0,
-                "confidence": 0.0,
-                "signals": [],
-                "min_confidence": 0.0,
-                "min_strength": 0.0,
-                "boost_multiplier": 0.0,
-                "penalty_multiplier": 0.0,
-            }
-
-        min_confidence = float(thresholds["min_confidence"])
-        min_strength = float(thresholds["min_strength"])
-        boost_multiplier = float(thresholds["boost_multiplier"])
-        penalty_multiplier = float(thresholds["penalty_multiplier"])
-        breakout_pct = float(thresholds["breakout_pct"])
-        pinbar_wick_ratio = float(thresholds["pinbar_wick_ratio"])
-        min_bars = int(thresholds["min_bars"])
+            return {}, self._invalid(
+                f"pattern_thresholds_missing: {', '.join(missing)}", {}
+            )
 
+        limits = {
+            key: float(thresholds[key])
+            for key in self.REQUIRED_THRESHOLDS
+            if key != "min_bars"
+        }
+        min_bars = int(thresholds["min_bars"])
         if not candles or len(candles) < max(5, min_bars):
-            return {
-                "valid": False,
-                "errors": ["insufficient_candles_for_patterns"],
-                "bias": 0,
-                "confidence": 0.0,
-                "signals": [],
-                "min_confidence": min_confidence,
-                "min_strength": min_strength,
-                "boost_multiplier": boost_multiplier,
-                "penalty_multiplier": penalty_multiplier,
-            }
+            return limits, self._invalid("insufficient_candles_for_patterns", limits)
+        return limits, None
 
-        signals: List[PatternSignal] = []
-        signals += self._detect_pinbar(candles, pinbar_wick_ratio)
-        signals += self._detect_engulfing(candles)
-        signals += self._detect_inside_bar(candles)
-        signals += self._detect_three_candles(candles)
-        signals += self._detect_breakout(candles, breakout_pct)
+    @staticmethod
+    def _invalid(error: str, limits: Dict[str, float]) -> Dict[str, Any]:
+        return {
+            "valid": False,
+            "errors": [error],
+            "bias": 0,
+            "confidence": 0.0,
+            "signals": [],
+            "min_confidence": limits.get("min_confidence", 0.0),
+            "min_strength": limits.get("min_strength", 0.0),
+            "boost_multiplier": limits.get("boost_multiplier", 0.0),
+            "penalty_multiplier": limits.get("penalty_multiplier", 0.0),
+        }
 
+    @staticmethod
+    def _build_context(
+        signals: List[PatternSignal], limits: Dict[str, float]
+    ) -> Dict[str, Any]:
         bullish_score = 0.0
         bearish_score = 0.0
         for sig in signals:
@@ -101,44 +191,50 @@ class PatternEngine:
             "signals": signals,
             "bullish_score": bullish_score,
             "bearish_score": bearish_score,
-            "min_confidence": min_confidence,
-            "min_strength": min_strength,
-            "boost_multiplier": boost_multiplier,
-            "penalty_multiplier": penalty_multiplier,
+            "min_confidence": limits["min_confidence"],
+            "min_strength": limits["min_strength"],
+            "boost_multiplier": limits["boost_multiplier"],
+            "penalty_multiplier": limits["penalty_multiplier"],
         }
 
     @staticmethod
-    def _extract(candle: Any) -> Tuple[float, float, float, float]:
+    def _newest_bar_key(
+        candle: Any, limits: Dict[str, float]
+    ) -> Optional[Tuple[Any, ...]]:
+        """Closed history is immutable, so the newest bar identifies the window."""
         if isinstance(candle, dict):
-            return (
-                float(candle.get("open", 0.0)),
-                float(candle.get("high", 0.0)),
-                float(candle.get("low", 0.0)),
-                float(candle.get("close", 0.0)),
+            ts = candle.get("timestamp")
+            ohlc = tuple(candle.get(f, 0.0) for f in ("open", "high", "low", "close"))
+        else:
+            ts = getattr(candle, "timestamp", None)
+            ohlc = tuple(
+                getattr(candle, f, 0.0) for f in ("open", "high", "low", "close")
             )
-        return (
-            float(getattr(candle, "open", 0.0)),
-            float(getattr(candle, "high", 0.0)),
-            float(getattr(candle, "low", 0.0)),
-            float(getattr(candle, "close", 0.0)),
-        )
+        if ts is None:
+            return None
+        return (ts,) + ohlc + tuple(limits.values())
 
-    def _detect_pinbar(
-        self, candles: List[Any], wick_ratio: float
+    @staticmethod
+    def _signals_at_close(
+        tail: OHLCArrays, masks: Dict[str, np.ndarray]
     ) -> List[PatternSignal]:
+        """Materialize PatternSignal objects for the masks set on the newest bar."""
+        hit = {name: bool(mask[-1]) for name, mask in masks.items()}
         signals: List[PatternSignal] = []
-        if len(candles) < 2:
+        if not any(hit.values()):
             return signals
-        o, h, l, c = self._extract(candles[-1])
+
+        o, h, l, c = (
+            float(tail.open[-1]),
+            float(tail.high[-1]),
+            float(tail.low[-1]),
+            float(tail.close[-1]),
+        )
         total = max(h - l, 1e-9)
-        body = abs(c - o)
-        upper = h - max(o, c)
-        lower = min(o, c) - l
-        if body / total > 0.35:
-            return signals
-        upper_ratio = upper / total
-        lower_ratio = lower / total
-        if lower_ratio >= wick_ratio and upper_ratio <= 0.2:
+        upper_ratio = (h - max(o, c)) / total
+        lower_ratio = (min(o, c) - l) / total
+
+        if hit["pinbar_bullish"]:
             signals.append(
                 PatternSignal(
                     name="pinbar_bullish",
@@ -150,7 +246,7 @@ class PatternEngine:
                     target=c + (c - l) * 2.0,
                 )
             )
-        if upper_ratio >= wick_ratio and lower_ratio <= 0.2:
+        if hit["pinbar_bearish"]:
             signals.append(
                 PatternSignal(
                     name="pinbar_bearish",
@@ -162,132 +258,103 @@ class PatternEngine:
                     target=c - (h - c) * 2.0,
                 )
             )
-        return signals
 
-    def _detect_engulfing(self, candles: List[Any]) -> List[PatternSignal]:
-        signals: List[PatternSignal] = []
-        if len(candles) < 2:
-            return signals
-        o1, h1, l1, c1 = self._extract(candles[-2])
-        o2, h2, l2, c2 = self._extract(candles[-1])
-        prev_red = c1 < o1
-        prev_green = c1 > o1
-        curr_green = c2 > o2
-        curr_red = c2 < o2
-        if prev_red and curr_green and o2 <= c1 and c2 >= o1:
-            strength = min(1.0, abs(c2 - o2) / max(abs(c1 - o1), 1e-9))
-            signals.append(
-                PatternSignal(
-                    name="engulfing_bullish",
-                    bias=1,
-                    strength=strength,
-                    confidence=min(1.0, strength * 0.8),
-                    entry=c2,
-                    stop=min(l1, l2) * 0.999,
-                    target=c2 + abs(c2 - o2) * 2.0,
-                )
+        if hit["engulfing_bullish"] or hit["engulfing_bearish"]:
+            o1, h1, l1, c1 = (
+                float(tail.open[-2]),
+                float(tail.high[-2]),
+                float(tail.low[-2]),
+                float(tail.close[-2]),
             )
-        if prev_green and curr_red and o2 >= c1 and c2 <= o1:
-            strength = min(1.0, abs(c2 - o2) / max(abs(c1 - o1), 1e-9))
-            signals.append(
-                PatternSignal(
-                    name="engulfing_bearish",
-                    bias=-1,
-                    strength=strength,
-                    confidence=min(1.0, strength * 0.8),
-                    entry=c2,
-                    stop=max(h1, h2) * 1.001,
-                    target=c2 - abs(c2 - o2) * 2.0,
+            strength = min(1.0, abs(c - o) / max(abs(c1 - o1), 1e-9))
+            if hit["engulfing_bullish"]:
+                signals.append(
+                    PatternSignal(
+                        name="engulfing_bullish",
+                        bias=1,
+                        strength=strength,
+                        confidence=min(1.0, strength * 0.8),
+                        entry=c,
+                        stop=min(l1, l) * 0.999,
+                        target=c + abs(c - o) * 2.0,
+                    )
+                )
+            if hit["engulfing_bearish"]:
+                signals.append(
+                    PatternSignal(
+                        name="engulfing_bearish",
+                        bias=-1,
+                        strength=strength,
+                        confidence=min(1.0, strength * 0.8),
+                        entry=c,
+                        stop=max(h1, h) * 1.001,
+                        target=c - abs(c - o) * 2.0,
+                    )
                 )
-            )
-        return signals
 
-    def _detect_inside_bar(self, candles: List[Any]) -> List[PatternSignal]:
-        signals: List[PatternSignal] = []
-        if len(candles) < 2:
-            return signals
-        o1, h1, l1, c1 = self._extract(candles[-2])
-        o2, h2, l2, c2 = self._extract(candles[-1])
-        if h2 < h1 and l2 > l1:
-            bias = 1 if c2 > o2 else -1
+        if hit["inside_bar"]:
+            bias = 1 if c > o else -1
             signals.append(
                 PatternSignal(
                     name="inside_bar",
                     bias=bias,
                     strength=0.4,
                     confidence=0.5,
-                    entry=c2,
-                    stop=l2 * 0.999 if bias > 0 else h2 * 1.001,
-                    target=c2 + (c2 - l2) if bias > 0 else c2 - (h2 - c2),
+                    entry=c,
+                    stop=l * 0.999 if bias > 0 else h * 1.001,
+                    target=c + (c - l) if bias > 0 else c - (h - c),
                 )
             )
-        return signals
 
-    def _detect_three_candles(self, candles: List[Any]) -> List[PatternSignal]:
-        signals: List[PatternSignal] = []
-        if len(candles) < 3:
-            return signals
-        closes = [self._extract(c)[3] for c in candles[-3:]]
-        if closes[0] < closes[1] < closes[2]:
+        if hit["three_candles_bullish"]:
             signals.append(
                 PatternSignal(
                     name="three_candles_bullish",
                     bias=1,
                     strength=0.6,
                     confidence=0.6,
-                    entry=closes[-1],
-                    stop=closes[-1] * 0.995,
-                    target=closes[-1] * 1.01,
+                    entry=c,
+                    stop=c * 0.995,
+                    target=c * 1.01,
                 )
             )
-        if closes[0] > closes[1] > closes[2]:
+        if hit["three_candles_bearish"]:
             signals.append(
                 PatternSignal(
                     name="three_candles_bearish",
                     bias=-1,
                     strength=0.6,
                     confidence=0.6,
-                    entry=closes[-1],
-                    stop=closes[-1] * 1.005,
-                    target=closes[-1] * 0.99,
+                    entry=c,
+                    stop=c * 1.005,
+                    target=c * 0.99,
                 )
             )
-        return signals
 
-    def _detect_breakout(
-        self, candles: List[Any], breakout_pct: float
-    ) -> List[PatternSignal]:
-        signals: List[PatternSignal] = []
-        if len(candles) < 6:
-            return signals
-        recent = candles[-6:-1]
-        highs = [self._extract(c)[1] for c in recent]
-        lows = [self._extract(c)[2] for c in recent]
-        last_o, last_h, last_l, last_c = self._extract(candles[-1])
-        recent_high = max(highs)
-        recent_low = min(lows)
-        if recent_high > 0 and last_c > recent_high * (1 + breakout_pct):
+        if hit["breakout_bullish"]:
+            recent_high = float(np.max(tail.high[-TAIL_BARS:-1]))
             signals.append(
                 PatternSignal(
                     name="breakout_bullish",
                     bias=1,
                     strength=0.7,
                     confidence=0.7,
-                    entry=last_c,
+                    entry=c,
                     stop=recent_high * 0.997,
-                    target=last_c + (last_c - recent_high) * 2.0,
+                    target=c + (c - recent_high) * 2.0,
                 )
             )
-        if recent_low > 0 and last_c < recent_low * (1 - breakout_pct):
+        if hit["breakout_bearish"]:
+            recent_low = float(np.min(tail.low[-TAIL_BARS:-1]))
             signals.append(
                 PatternSignal(
                     name="breakout_bearish",
                     bias=-1,
                     strength=0.7,
                     confidence=0.7,
-                    entry=last_c,
+                    entry=c,
                     stop=recent_low * 1.003,
-                    target=last_c - (recent_low - last_c) * 2.0,
+                    target=c - (recent_low - c) * 2.0,
                 )
             )
         return signals
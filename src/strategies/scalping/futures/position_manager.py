@@ -7503,6 +7503,14 @@ class FuturesPositionManager:
                         f"⚠️ [PARTIAL_CLOSE] {symbol}: Не удалось пересчитать peak_profit_usd после partial_close: {e}"
                     )
 
+                # Биржевой стоп - на остаток позиции (иначе reduce-only SL
+                # остается на полный исходный размер)
+                exchange_stops = getattr(self.orchestrator, "exchange_stops", None)
+                if exchange_stops:
+                    exchange_stops.resize(
+                        symbol, (abs(current_size) - close_size_contracts) * ct_val
+                    )
+
                 # Обновляем метаданные позиции (partial_tp_executed = True)
                 if symbol in self.active_positions:
                     self.active_positions[symbol]["partial_tp_executed"] = True
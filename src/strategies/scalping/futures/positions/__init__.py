@@ -3,8 +3,11 @@
 
 Модули:
 - entry_manager: Открытие позиций
+- exchange_stop_manager: Биржевые стопы (conditional SL), ведомые TSL
 - exit_analyzer: Централизованное управление закрытием позиций
 - position_monitor: Периодический мониторинг позиций
+- exit_plan: Пороги выхода позиции, скомпилированные в цены
+- order_chaser: Ведение лимитных входов по лучшим ценам книги
 - exit_decision_logger: Логирование решений ExitAnalyzer
 - peak_profit_tracker: Отслеживание максимальной прибыли
 - take_profit_manager: Управление Take Profit
@@ -12,8 +15,11 @@
 """
 
 from .entry_manager import EntryManager
+from .exchange_stop_manager import ExchangeStopManager
 from .exit_analyzer import ExitAnalyzer
 from .exit_decision_logger import ExitDecisionLogger
+from .exit_plan import ExitPlan, ExitPlanner
+from .order_chaser import LimitOrderChaser
 from .peak_profit_tracker import PeakProfitTracker
 from .position_monitor import PositionMonitor
 from .stop_loss_manager import StopLossManager
@@ -21,7 +27,11 @@ from .take_profit_manager import TakeProfitManager
 
 __all__ = [
     "EntryManager",
+    "ExchangeStopManager",
     "ExitAnalyzer",
+    "ExitPlan",
+    "ExitPlanner",
+    "LimitOrderChaser",
     "PositionMonitor",
     "ExitDecisionLogger",
     "PeakProfitTracker",
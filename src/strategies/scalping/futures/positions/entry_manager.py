@@ -52,6 +52,7 @@ class EntryManager:
             None  # ✅ НОВОЕ (26.12.2025): ConversionMetrics для отслеживания конверсии
         )
         self.data_registry = None  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (29.12.2025): DataRegistry для fallback entry_price
+        self.exchange_stops = None  # ExchangeStopManager: биржевой SL, ведомый TSL
 
         logger.info("✅ EntryManager инициализирован")
 
@@ -84,6 +85,11 @@ class EntryManager:
         logger.debug("✅ EntryManager: DataRegistry установлен")
         logger.debug("✅ EntryManager: PerformanceTracker установлен")
 
+    def set_exchange_stops(self, exchange_stops):
+        """Установить ExchangeStopManager (базовый SL выставляется через него)."""
+        self.exchange_stops = exchange_stops
+        logger.debug("✅ EntryManager: ExchangeStopManager установлен")
+
     def set_conversion_metrics(self, conversion_metrics):
         """
         ✅ НОВОЕ (26.12.2025): Установить ConversionMetrics для отслеживания конверсии сигналов.
@@ -272,7 +278,22 @@ class EntryManager:
 
                         # Размещаем базовый SL на бирже
                         client = self._resolve_client()
-                        if client and hasattr(client, "place_algo_order"):
+                        if self.exchange_stops:
+                            # Дальше уровень ведет TSL через пакетные amend
+                            algo_id = await self.exchange_stops.place(
+                                symbol, position_side, position_size, base_sl_price
+                            )
+                            if algo_id:
+                                logger.info(
+                                    f"✅ Exchange base SL установлен для {symbol}: "
+                                    f"trigger={base_sl_price:.2f} (safety buffer 50%), "
+                                    f"algoId={algo_id}"
+                                )
+                                await self.position_registry.update_position(
+                                    symbol,
+                                    metadata_updates={"exchange_sl_algo_id": algo_id},
+                                )
+                        elif client and hasattr(client, "place_algo_order"):
                             try:
                                 algo_result = await client.place_algo_order(
                                     symbol=symbol,
@@ -0,0 +1,460 @@
+"""
+ExchangeStopManager - биржевые стопы позиций как conditional algo-ордера.
+
+Уровень TSL каждой позиции зеркалируется в conditional SL на бирже. Раньше
+TrailingSLCoordinator на каждом обновлении синхронно ждал amend-algos по REST;
+теперь обновление - только запись целевого уровня в память (update), а
+отправкой занимается фоновый flush-цикл:
+- ratchet: стоп двигается только в сторону ужесточения;
+- гистерезис: amend уходит, только если уровень сдвинулся от подтвержденного
+  биржей не меньше чем на min_step_pct;
+- коалесинг: за окно coalesce_ms все обновления по символу сводятся к
+  последнему уровню, amend по всем позициям уходит пачкой;
+- rate limit: token bucket под лимит OKX amend-algos (20 запросов / 2 с).
+
+Сверка: канал private WS orders (исполненный ордер стопа несет algoId) и
+периодическая сверка по REST orders-algo-pending - пропавший на бирже стоп
+выставляется заново, не принятый биржей (failed) - повторяется. После
+частичного закрытия размер стопа уменьшается до остатка позиции (resize). Канал orders-algo OKX отдает только на business-эндпоинте,
+а Private WebSocket бота подключен к /ws/v5/private.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+
+@dataclass
+class ExchangeStop:
+    """Состояние биржевого стопа одной позиции."""
+
+    symbol: str
+    position_side: str  # "long" / "short"
+    size: float
+    target_px: float  # Желаемый уровень (последний из TSL)
+    exchange_px: float  # Уровень, подтвержденный биржей
+    exchange_size: Optional[float] = None  # Размер, подтвержденный биржей
+    algo_id: Optional[str] = None
+    state: str = "live"  # live / placing / triggered / canceled / failed
+    in_flight: bool = False
+    updated_at: float = 0.0
+
+    @property
+    def close_side(self) -> str:
+        return "sell" if self.position_side == "long" else "buy"
+
+    def is_tighter(self, price: float, than: float) -> bool:
+        """Уровень price строже than (ближе к текущей цене)."""
+        return price > than if self.position_side == "long" else price < than
+
+
+class _TokenBucket:
+    """Token bucket для лимита запросов (rate запросов/с, burst - запас)."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(float(rate), 0.1)
+        self.capacity = max(int(burst), 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+class ExchangeStopManager:
+    """
+    Биржевые conditional SL для открытых позиций с пакетной отправкой amend.
+
+    Использование:
+        stops = ExchangeStopManager(client, config)
+        await stops.start()
+        await stops.place("BTC-USDT", "long", size, stop_px)   # при открытии
+        stops.update("BTC-USDT", new_stop_px, current_price)  # на каждом TSL
+        stops.resize("BTC-USDT", remaining_size)              # partial close
+        stops.release("BTC-USDT")                             # при закрытии
+    """
+
+    def __init__(self, client, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            client: OKXFuturesClient (place/amend/cancel/get_algo_orders)
+            config: Секция scalping.exchange_stops
+        """
+        cfg = config or {}
+        self.client = client
+        self.enabled = bool(cfg.get("enabled", True))
+        # Минимальный сдвиг стопа для amend, % от подтвержденного уровня
+        self.min_step_pct = float(cfg.get("min_step_pct", 0.05))
+        # Минимальный зазор стопа от текущей цены, % (иначе биржа отклонит триггер)
+        self.min_gap_pct = float(cfg.get("min_gap_pct", 0.05))
+        self.coalesce_sec = float(cfg.get("coalesce_ms", 250)) / 1000
+        self.batch_size = int(cfg.get("batch_size", 20))
+        self.reconcile_interval_sec = float(cfg.get("reconcile_interval_sec", 30.0))
+        self._bucket = _TokenBucket(
+            rate=cfg.get("max_requests_per_sec", 8.0),
+            burst=cfg.get("burst", 10),
+        )
+
+        self.stops: Dict[str, ExchangeStop] = {}
+        self._dirty: Dict[str, None] = {}  # Упорядоченное множество символов
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._background: set = set()
+
+        self.stats: Dict[str, int] = {
+            "updates": 0,
+            "ratchet_rejected": 0,
+            "hysteresis_skipped": 0,
+            "coalesced": 0,
+            "amends": 0,
+            "amend_errors": 0,
+            "batches": 0,
+            "placed": 0,
+            "replaced": 0,
+            "canceled": 0,
+            "triggered": 0,
+            "retried": 0,
+            "resized": 0,
+        }
+
+    async def start(self) -> None:
+        """Запустить flush-цикл и периодическую сверку."""
+        if not self.enabled or self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._flush_loop(), name="exchange-stops-flush"),
+            asyncio.create_task(
+                self._reconcile_loop(), name="exchange-stops-reconcile"
+            ),
+        ]
+        logger.info(
+            f"🛡️ ExchangeStopManager запущен: min_step={self.min_step_pct}%, "
+            f"coalesce={self.coalesce_sec * 1000:.0f}ms, "
+            f"rate={self._bucket.rate}/s"
+        )
+
+    async def stop(self) -> None:
+        """Отправить накопленные amend и остановить фоновые задачи."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._dirty:
+            await self.flush()
+
+    async def place(
+        self, symbol: str, position_side: str, size: float, stop_price: float
+    ) -> Optional[str]:
+        """
+        Выставить биржевой стоп для новой позиции.
+
+        Returns:
+            algoId или None, если биржа не приняла ордер
+        """
+        stop = ExchangeStop(
+            symbol=symbol,
+            position_side=position_side.lower(),
+            size=size,
+            target_px=stop_price,
+            exchange_px=stop_price,
+            state="placing",
+            updated_at=time.time(),
+        )
+        self.stops[symbol] = stop
+        return await self._place(stop)
+
+    def update(
+        self, symbol: str, stop_price: float, current_price: Optional[float] = None
+    ) -> bool:
+        """
+        Записать новый уровень TSL (горячий путь, без I/O).
+
+        Returns:
+            True, если уровень принят к отправке на биржу
+        """
+        stop = self.stops.get(symbol)
+        if stop is None or not stop_price:
+            return False
+        if stop.state not in ("live", "placing", "failed"):
+            return False
+        self.stats["updates"] += 1
+        if current_price and current_price > 0:
+            # Триггер по ту сторону цены биржа отклонит - держим зазор
+            gap = current_price * self.min_gap_pct / 100
+            if stop.position_side == "long":
+                stop_price = min(stop_price, current_price - gap)
+            else:
+                stop_price = max(stop_price, current_price + gap)
+        if not stop.is_tighter(stop_price, stop.target_px):
+            self.stats["ratchet_rejected"] += 1
+            return False
+        stop.target_px = stop_price
+        stop.updated_at = time.time()
+        if stop.state == "failed":
+            # Повтор выставления на сверке возьмет последний уровень
+            return False
+        if abs(stop_price - stop.exchange_px) < (
+            stop.exchange_px * self.min_step_pct / 100
+        ):
+            self.stats["hysteresis_skipped"] += 1
+            return False
+        if symbol in self._dirty:
+            self.stats["coalesced"] += 1
+        else:
+            self._dirty[symbol] = None
+        self._wakeup.set()
+        return True
+
+    def resize(self, symbol: str, size: float) -> bool:
+        """
+        Позиция частично закрыта: размер стопа - остаток позиции.
+
+        Returns:
+            True, если новый размер принят к отправке на биржу
+        """
+        stop = self.stops.get(symbol)
+        if stop is None or size <= 0 or stop.state not in ("live", "placing", "failed"):
+            return False
+        if abs(size - stop.size) <= 1e-12:
+            return False
+        stop.size = size
+        stop.updated_at = time.time()
+        if stop.state == "live":
+            self._dirty[symbol] = None
+            self._wakeup.set()
+        # placing/failed: размер подхватит _place
+        return True
+
+    def release(self, symbol: str) -> None:
+        """
+        Позиция закрыта: снять стоп с биржи в фоне.
+
+        Если стоп в этот момент выставляется, его снимет _place после ответа
+        биржи (стопа уже нет в self.stops).
+        """
+        stop = self.stops.pop(symbol, None)
+        self._dirty.pop(symbol, None)
+        if stop is None or not stop.algo_id or stop.state != "live":
+            return
+        self._cancel_in_background(stop)
+
+    def get_stop(self, symbol: str) -> Optional[ExchangeStop]:
+        return self.stops.get(symbol)
+
+    def on_order_update(self, order: Dict[str, Any]) -> None:
+        """
+        Сверка по каналу orders: исполненный ордер стопа несет algoId.
+        """
+        algo_id = order.get("algoId")
+        if not algo_id or order.get("state") != "filled":
+            return
+        self._mark_done(algo_id, "triggered")
+
+    async def flush(self) -> None:
+        """Отправить amend по всем символам с изменившимся уровнем."""
+        symbols = [symbol for symbol in self._dirty if symbol in self.stops]
+        self._dirty.clear()
+        batch = []
+        for symbol in symbols:
+            stop = self.stops[symbol]
+            if stop.in_flight:
+                # Ответ на прошлый amend еще не пришел - отправим следующим окном
+                self._dirty[symbol] = None
+                continue
+            batch.append(stop)
+        for i in range(0, len(batch), self.batch_size):
+            chunk = batch[i : i + self.batch_size]
+            self.stats["batches"] += 1
+            await asyncio.gather(*(self._amend(stop) for stop in chunk))
+
+    async def reconcile(self) -> None:
+        """
+        Сверка с REST orders-algo-pending: пропавшие стопы выставляем заново,
+        не принятые биржей - повторяем.
+        """
+        failed = [
+            s for s in self.stops.values() if s.state == "failed" and not s.in_flight
+        ]
+        for stop in failed:
+            if self.stops.get(stop.symbol) is not stop:
+                continue
+            logger.info(f"🔄 ExchangeStop {stop.symbol}: повтор выставления стопа")
+            self.stats["retried"] += 1
+            await self._place(stop)
+        live = [s for s in self.stops.values() if s.state == "live" and s.algo_id]
+        if not live:
+            return
+        pending = await self.client.get_algo_orders(order_type="conditional")
+        pending_ids = {order.get("algoId") for order in pending or []}
+        for stop in live:
+            if stop.algo_id not in pending_ids and not stop.in_flight:
+                logger.warning(
+                    f"⚠️ ExchangeStop {stop.symbol}: algoId={stop.algo_id} "
+                    f"нет на бирже, выставляем заново"
+                )
+                self.stats["replaced"] += 1
+                await self._place(stop)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.stats)
+        stats["active"] = len(self.stops)
+        stats["pending"] = len(self._dirty)
+        return stats
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Окно коалесинга: обновления TSL за это время сводятся в одно
+            await asyncio.sleep(self.coalesce_sec)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ ExchangeStopManager: ошибка flush: {e}")
+            if self._dirty:
+                self._wakeup.set()
+
+    async def _reconcile_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval_sec)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.debug(f"⚠️ ExchangeStopManager: ошибка сверки: {e}")
+
+    async def _place(self, stop: ExchangeStop) -> Optional[str]:
+        await self._bucket.acquire()
+        price = stop.target_px
+        size = stop.size
+        stop.in_flight = True
+        try:
+            result = await self.client.place_algo_order(
+                symbol=stop.symbol,
+                side=stop.close_side,
+                size=size,
+                trigger_price=price,
+                order_price="-1",  # market при срабатывании
+                order_type="conditional",
+                reduce_only=True,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ ExchangeStop {stop.symbol}: ошибка выставления: {e}")
+            result = None
+        finally:
+            stop.in_flight = False
+        if not result or result.get("code") != "0":
+            stop.state = "failed"
+            logger.warning(
+                f"⚠️ ExchangeStop {stop.symbol}: биржа не приняла стоп "
+                f"({(result or {}).get('msg', 'no response')}), повтор на сверке"
+            )
+            return None
+        stop.algo_id = (result.get("data") or [{}])[0].get("algoId")
+        stop.exchange_px = price
+        stop.exchange_size = size
+        stop.state = "live"
+        self.stats["placed"] += 1
+        if self.stops.get(stop.symbol) is not stop:
+            # Позиция закрылась, пока ордер выставлялся - снимаем стоп
+            logger.info(
+                f"🛡️ ExchangeStop {stop.symbol}: позиция закрыта во время "
+                f"выставления, снимаем algoId={stop.algo_id}"
+            )
+            self._cancel_in_background(stop)
+            return None
+        if stop.target_px != price or stop.size != size:
+            # TSL ушел дальше или позиция уменьшилась, пока ордер выставлялся
+            self._dirty[stop.symbol] = None
+            self._wakeup.set()
+        return stop.algo_id
+
+    async def _amend(self, stop: ExchangeStop) -> None:
+        await self._bucket.acquire()
+        if self.stops.get(stop.symbol) is not stop or stop.state != "live":
+            return
+        price = stop.target_px
+        size = stop.size
+        amend: Dict[str, Any] = {"new_sl_trigger_price": price}
+        if size != stop.exchange_size:
+            amend["new_size"] = size
+        stop.in_flight = True
+        try:
+            result = await self.client.amend_algo_order(
+                symbol=stop.symbol, algo_id=stop.algo_id, **amend
+            )
+        except Exception as e:
+            result = {"code": "-1", "msg": str(e)}
+        finally:
+            stop.in_flight = False
+        self.stats["amends"] += 1
+        if result and result.get("code") == "0":
+            stop.exchange_px = price
+            if "new_size" in amend:
+                stop.exchange_size = size
+                self.stats["resized"] += 1
+            logger.debug(
+                f"✅ ExchangeStop {stop.symbol}: SL → {price:.6g}, sz={size:.6g} "
+                f"(algoId={stop.algo_id})"
+            )
+            return
+        self.stats["amend_errors"] += 1
+        logger.debug(
+            f"⚠️ ExchangeStop {stop.symbol}: amend не прошел "
+            f"({(result or {}).get('msg', 'no response')})"
+        )
+        await self._verify(stop)
+
+    async def _verify(self, stop: ExchangeStop) -> None:
+        """После ошибки amend: ордер на месте - повторим окном, пропал - заново."""
+        pending = await self.client.get_algo_orders(
+            symbol=stop.symbol, order_type="conditional"
+        )
+        if self.stops.get(stop.symbol) is not stop or stop.state != "live":
+            return
+        if stop.algo_id in {order.get("algoId") for order in pending or []}:
+            self._dirty[stop.symbol] = None
+            return
+        self.stats["replaced"] += 1
+        await self._place(stop)
+
+    def _cancel_in_background(self, stop: ExchangeStop) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(self._cancel(stop))
+        except RuntimeError:
+            return
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _cancel(self, stop: ExchangeStop) -> None:
+        await self._bucket.acquire()
+        try:
+            await self.client.cancel_algo_order(stop.symbol, stop.algo_id)
+            self.stats["canceled"] += 1
+        except Exception as e:
+            logger.debug(f"⚠️ ExchangeStop {stop.symbol}: ошибка отмены: {e}")
+
+    def _mark_done(self, algo_id: str, state: str) -> None:
+        for stop in self.stops.values():
+            if stop.algo_id == algo_id:
+                if stop.state == "live":
+                    stop.state = state
+                    self._dirty.pop(stop.symbol, None)
+                    if state == "triggered":
+                        self.stats["triggered"] += 1
+                        logger.info(
+                            f"🛡️ ExchangeStop {stop.symbol}: сработал на бирже "
+                            f"@ {stop.exchange_px:.6g}"
+                        )
+                return
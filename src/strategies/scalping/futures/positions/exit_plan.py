@@ -0,0 +1,318 @@
+"""
+ExitPlan - скомпилированный план выхода позиции в абсолютных ценах.
+
+На каждом тике TrailingSLCoordinator раньше прогонял ExitDecisionCoordinator /
+ExitAnalyzer и TrailingStopLoss.should_close_position: резолв параметров через
+ParameterProvider, пересчет PnL от маржи, анализ тренда. Но почти все правила
+выхода - это пороги по цене относительно входа, которые меняются только при
+открытии позиции и смене режима. ExitPlanner переводит их в цены один раз:
+- loss-cut и critical loss-cut (2x) TrailingStopLoss;
+- SL ExitAnalyzer (sl_percent от маржи);
+- безубыток fee-edge ExitGuard (комиссия на круг * плечо + минимальный край);
+- лестница TP: partial TP trigger, TP, big profit;
+- дедлайн: timeout TSL и max_holding режима.
+
+Между ближайшим порогом убытка и ближайшим порогом прибыли (с запасом band_pct)
+позиция "спокойна": проверка на тике - два сравнения float и сравнение времени.
+Полный анализ запускается, когда цена подходит к порогу, к уровню TSL, после
+дедлайна и не реже чем раз в full_check_interval_sec (выходы по сигналам
+разворота, подтверждения loss-cut). Пороги строятся консервативно (комиссия
+сдвигает порог убытка ближе ко входу), поэтому план может только раньше
+отдать позицию полному анализу, но не пропустить выход.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+@dataclass
+class ExitPlan:
+    """Пороги выхода одной позиции в ценах и "спокойный" коридор."""
+
+    symbol: str
+    side: str  # "long" / "short"
+    entry_price: float
+    leverage: float
+    regime: str
+    loss_cut_price: Optional[float] = None
+    critical_loss_cut_price: Optional[float] = None
+    sl_price: Optional[float] = None
+    break_even_price: Optional[float] = None
+    tp_prices: Tuple[float, ...] = ()  # partial TP, TP, big profit - от ближнего
+    deadline: Optional[float] = None  # unix-время timeout / max_holding
+    band_pct: float = 0.0
+    lower: float = 0.0  # цена <= lower - нужен полный анализ
+    upper: float = float("inf")  # цена >= upper - нужен полный анализ
+    compiled_at: float = field(default_factory=time.time)
+    next_full_check: float = 0.0
+
+    def is_quiet(
+        self,
+        price: float,
+        now: Optional[float] = None,
+        stop_loss: Optional[float] = None,
+    ) -> bool:
+        """Цена внутри коридора, дедлайн не наступил и до уровня TSL далеко."""
+        if not self.lower < price < self.upper:
+            return False
+        if self.deadline is not None and (now or time.time()) >= self.deadline:
+            return False
+        if stop_loss:
+            if self.side == "long":
+                return price > stop_loss * (1 + self.band_pct)
+            return price < stop_loss * (1 - self.band_pct)
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "entry_price": self.entry_price,
+            "leverage": self.leverage,
+            "regime": self.regime,
+            "loss_cut_price": self.loss_cut_price,
+            "critical_loss_cut_price": self.critical_loss_cut_price,
+            "sl_price": self.sl_price,
+            "break_even_price": self.break_even_price,
+            "tp_prices": list(self.tp_prices),
+            "deadline": self.deadline,
+            "lower": self.lower,
+            "upper": self.upper,
+        }
+
+
+class ExitPlanner:
+    """
+    Компиляция и кэш ExitPlan по символам.
+
+    Использование:
+        planner = ExitPlanner(config, exit_analyzer=..., exit_guard=...)
+        if await planner.should_analyze(symbol, tsl, price, stop_loss, regime):
+            ...  # полный анализ выхода
+        planner.drop(symbol)  # при закрытии позиции
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        exit_analyzer: Optional[Any] = None,
+        exit_guard: Optional[Any] = None,
+    ):
+        """
+        Args:
+            config: scalping.exit_plan (enabled, approach_band_pct,
+                full_check_interval_sec)
+            exit_analyzer: ExitAnalyzer - источник SL/TP/max_holding режима
+            exit_guard: ExitGuard - параметры комиссионного порога
+        """
+        config = config or {}
+        self.enabled = bool(config.get("enabled", True))
+        # Запас до порога в долях цены: 0.0015 = 0.15%
+        self.band_pct = max(0.0, float(config.get("approach_band_pct", 0.0015)))
+        self.full_check_interval_sec = max(
+            0.0, float(config.get("full_check_interval_sec", 2.0))
+        )
+        self.exit_analyzer = exit_analyzer
+        self.exit_guard = exit_guard
+        self.plans: Dict[str, ExitPlan] = {}
+        self.stats: Dict[str, int] = {
+            "compiled": 0,
+            "quiet_ticks": 0,
+            "full_checks": 0,
+        }
+
+    def get(self, symbol: str) -> Optional[ExitPlan]:
+        return self.plans.get(symbol)
+
+    def drop(self, symbol: Optional[str] = None) -> None:
+        """Сбросить план символа (или все) - пересоберется на следующем тике."""
+        if symbol is None:
+            self.plans.clear()
+        else:
+            self.plans.pop(symbol, None)
+
+    async def should_analyze(
+        self,
+        symbol: str,
+        tsl: Any,
+        price: float,
+        stop_loss: Optional[float] = None,
+        regime: Optional[str] = None,
+        position: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Any] = None,
+        now: Optional[float] = None,
+    ) -> bool:
+        """
+        Нужен ли на этом тике полный анализ выхода.
+
+        План пересобирается, если его нет, сменился режим, средняя цена входа
+        (partial TP / добор) или плечо.
+        """
+        if not self.enabled or price <= 0:
+            return True
+        now = now or time.time()
+        regime = (regime or "ranging").lower()
+        plan = self.plans.get(symbol)
+        if (
+            plan is None
+            or plan.regime != regime
+            or plan.entry_price != tsl.entry_price
+            or plan.leverage != float(tsl.leverage or 1)
+        ):
+            try:
+                plan = await self.compile(symbol, tsl, regime, position, metadata)
+            except Exception as e:
+                logger.warning(f"⚠️ ExitPlanner: не удалось собрать план {symbol}: {e}")
+                self.plans.pop(symbol, None)
+                return True
+
+        if now < plan.next_full_check and plan.is_quiet(price, now, stop_loss):
+            self.stats["quiet_ticks"] += 1
+            return False
+        plan.next_full_check = now + self.full_check_interval_sec
+        self.stats["full_checks"] += 1
+        return True
+
+    async def compile(
+        self,
+        symbol: str,
+        tsl: Any,
+        regime: str,
+        position: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Any] = None,
+    ) -> ExitPlan:
+        """Перевести пороги TSL / ExitAnalyzer / ExitGuard в цены."""
+        entry = float(tsl.entry_price)
+        if entry <= 0:
+            raise ValueError(f"entry_price={entry}")
+        side = "short" if str(tsl.side).lower() in ("short", "sell") else "long"
+        sign = 1.0 if side == "long" else -1.0
+        leverage = float(tsl.leverage or 1)
+        lev = max(leverage, 1.0)
+        # Комиссия на круг в долях цены; TSL считает net = gross - 2 * fee
+        round_trip_fee = 2.0 * float(getattr(tsl, "trading_fee_rate", 0.0) or 0.0)
+
+        def price_at(move: float) -> float:
+            """Цена при движении move (доля цены, > 0 - в прибыль)."""
+            return entry * (1.0 + sign * move)
+
+        loss_cut_price = critical_price = sl_price = break_even = None
+        loss_cut = getattr(tsl, "loss_cut_percent", None)
+        if loss_cut:
+            move = float(loss_cut) / lev
+            loss_cut_price = price_at(-(move - round_trip_fee))
+            critical_price = price_at(-(2.0 * move - round_trip_fee))
+
+        tp_levels = []
+        deadlines = []
+        timeout_minutes = getattr(tsl, "timeout_minutes", None)
+        entry_ts = float(getattr(tsl, "entry_timestamp", 0) or 0) or time.time()
+        if timeout_minutes:
+            deadlines.append(entry_ts + float(timeout_minutes) * 60.0)
+
+        analyzer = self.exit_analyzer
+        if analyzer is not None:
+            # Проценты ExitAnalyzer - PnL от маржи: в долю цены делим на плечо
+            try:
+                sl_percent = float(
+                    analyzer._safe_sl_percent(
+                        symbol,
+                        regime,
+                        current_price=entry,
+                        position=position,
+                        metadata=metadata,
+                    )
+                )
+                if sl_percent > 0:
+                    sl_price = price_at(-(sl_percent / 100.0 / lev - round_trip_fee))
+            except Exception as e:
+                logger.debug(f"⚠️ ExitPlanner: sl_percent {symbol}: {e}")
+            try:
+                tp_percent = await analyzer._get_tp_percent(
+                    symbol,
+                    regime,
+                    entry,
+                    None,
+                    current_pnl=0.0,
+                    position=position,
+                    metadata=metadata,
+                )
+                if tp_percent:
+                    tp_levels.append(float(tp_percent))
+            except Exception as e:
+                logger.debug(f"⚠️ ExitPlanner: tp_percent {symbol}: {e}")
+            try:
+                partial = analyzer._get_partial_tp_params(regime) or {}
+                if partial.get("enabled") and partial.get("trigger_percent"):
+                    tp_levels.append(float(partial["trigger_percent"]))
+                tp_levels.append(float(analyzer._get_big_profit_exit_percent(symbol)))
+                max_holding = float(analyzer._get_max_holding_minutes(regime, symbol))
+                if max_holding > 0:
+                    deadlines.append(entry_ts + max_holding * 60.0)
+            except Exception as e:
+                logger.debug(f"⚠️ ExitPlanner: параметры режима {symbol}: {e}")
+
+        guard = self.exit_guard
+        if guard is not None:
+            # Условие ExitGuard._check_fee_edge в доле от маржи -> доля цены
+            fee_rate_fn = getattr(guard, "round_trip_fee_rate", None)
+            fee_rate = (
+                fee_rate_fn(symbol)
+                if callable(fee_rate_fn)
+                else guard.fee_rate_round_trip
+            )
+            required = float(fee_rate) * lev + max(
+                float(guard.min_gross_edge), float(guard.min_net_profit)
+            )
+            break_even = price_at(required / lev)
+
+        tp_prices = tuple(
+            price_at(pct / 100.0 / lev) for pct in sorted(p for p in tp_levels if p > 0)
+        )
+
+        # Ближайший порог с каждой стороны задает спокойный коридор
+        loss_side = [p for p in (loss_cut_price, critical_price, sl_price) if p]
+        profit_side = [p for p in (break_even, *tp_prices) if p]
+        band = self.band_pct
+        if side == "long":
+            lower = max(loss_side) * (1 + band) if loss_side else 0.0
+            upper = min(profit_side) * (1 - band) if profit_side else float("inf")
+        else:
+            lower = max(profit_side) * (1 + band) if profit_side else 0.0
+            upper = min(loss_side) * (1 - band) if loss_side else float("inf")
+
+        plan = ExitPlan(
+            symbol=symbol,
+            side=side,
+            entry_price=entry,
+            leverage=leverage,
+            regime=regime,
+            loss_cut_price=loss_cut_price,
+            critical_loss_cut_price=critical_price,
+            sl_price=sl_price,
+            break_even_price=break_even,
+            tp_prices=tp_prices,
+            deadline=min(deadlines) if deadlines else None,
+            band_pct=band,
+            lower=lower,
+            upper=upper,
+        )
+        self.plans[symbol] = plan
+        self.stats["compiled"] += 1
+        logger.debug(
+            f"🧭 ExitPlan {symbol} ({side}, {regime}): entry={entry:.6g}, "
+            f"коридор=({lower:.6g}, {upper:.6g}), tp={[round(p, 6) for p in tp_prices]}"
+        )
+        return plan
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.stats)
+        stats["plans"] = len(self.plans)
+        total = self.stats["quiet_ticks"] + self.stats["full_checks"]
+        stats["quiet_ratio"] = (
+            round(self.stats["quiet_ticks"] / total, 4) if total else 0.0
+        )
+        return stats
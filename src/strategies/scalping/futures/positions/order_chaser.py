@@ -0,0 +1,552 @@
+"""
+LimitOrderChaser - ведение лимитных входов по потоку лучших цен.
+
+Раньше лимитка ставилась по get_price_limits/тикеру и дальше жила сама:
+OrderCoordinator раз в цикл опрашивал REST orders-pending по каждому символу
+и по таймауту или дрейфу отменял ордер и ставил новый. Теперь каждый рабочий
+лимитный ордер ведется по best bid/ask из bbo-tbt (books5):
+- держать: ордер уже на лучшей цене своей стороны книги;
+- amend: книга ушла - двигаем цену на лучшую цену стороны, если уход от
+  исходной цены не больше допуска кривой срочности на текущий момент;
+- market: к концу ожидания (market_at от max_wait) отменяем остаток и
+  добираем market, если уход в пределах последней точки кривой, иначе
+  просто отменяем (сигнал устарел).
+
+Кривая срочности - точки (доля времени ожидания, допустимый уход в bps):
+чем дольше висит ордер, тем дальше готовы за ним идти.
+
+amend уходят не с горячего пути: решение пишет целевую цену в память, фоновый
+flush-цикл сводит обновления за окно coalesce_ms и отправляет пачками
+batch-amend через token bucket (бюджет запросов). Исполнения и отмены
+приходят из канала orders Private WebSocket.
+"""
+
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from .exchange_stop_manager import _TokenBucket
+
+DEFAULT_URGENCY_CURVE = ((0.0, 2.0), (0.5, 5.0), (1.0, 10.0))
+
+# Ордер уже исполнен/отменен - amend бессмыслен
+_ORDER_GONE_CODES = frozenset({"51503", "51509", "51510"})
+
+
+@dataclass
+class WorkingOrder:
+    """Рабочий лимитный ордер под ведением."""
+
+    order_id: str
+    symbol: str
+    side: str  # "buy" / "sell"
+    size: float  # в монетах (как в OrderExecutor)
+    origin_px: float  # Цена первого размещения - от нее считается уход
+    price: float  # Цена, подтвержденная биржей
+    tick: float
+    post_only: bool
+    max_wait: float
+    created_at: float
+    target_px: Optional[float] = None
+    total_contracts: float = 0.0
+    filled_contracts: float = 0.0
+    amends: int = 0
+    errors: int = 0
+    last_amend_at: float = 0.0
+    in_flight: bool = False
+    state: str = "live"  # live / converting / done
+
+    def adverse_bps(self, price: float) -> float:
+        """Насколько price хуже исходной цены (bps, > 0 - рынок ушел от нас)."""
+        if self.origin_px <= 0:
+            return 0.0
+        if self.side == "buy":
+            return (price - self.origin_px) / self.origin_px * 1e4
+        return (self.origin_px - price) / self.origin_px * 1e4
+
+
+def round_to_tick(price: float, tick: float) -> float:
+    """Округлить цену к шагу инструмента."""
+    if tick <= 0:
+        return price
+    decimals = max(0, len(f"{tick:.10f}".rstrip("0").split(".")[1]))
+    return round(round(price / tick) * tick, decimals)
+
+
+class LimitOrderChaser:
+    """
+    Ведение лимитных ордеров по лучшим ценам книги.
+
+    Использование:
+        chaser = LimitOrderChaser(client, config, executor=order_executor)
+        await chaser.start()
+        await chaser.track(order_id, "BTC-USDT", "buy", size, price, max_wait=30)
+        chaser.on_book("BTC-USDT", best_bid, best_ask)  # из bbo-tbt
+        chaser.on_ticker("BTC-USDT", bid_px, ask_px)     # запасные цены из tickers
+        chaser.on_order_update(order)                   # из канала orders
+    """
+
+    def __init__(self, client, config: Optional[Dict[str, Any]] = None, executor=None):
+        """
+        Args:
+            client: OKXFuturesClient (batch_amend_orders/cancel_order/get_order/
+                get_instrument_details)
+            config: Секция scalping.order_chaser
+            executor: FuturesOrderExecutor для отмены и market-добора
+        """
+        cfg = config or {}
+        self.client = client
+        self.executor = executor
+        # OrderCoordinator: лимит market-замен подряд, sync позиций и
+        # блокировка входов после неудачной замены (set_replace_guard)
+        self.replace_guard = None
+        self.enabled = bool(cfg.get("enabled", True))
+        self.book_channel = str(cfg.get("book_channel", "bbo-tbt"))
+        self.default_max_wait = float(cfg.get("max_wait_sec", 30.0))
+        self.urgency_curve = self._parse_curve(
+            cfg.get("urgency_curve", DEFAULT_URGENCY_CURVE)
+        )
+        self.market_at = float(cfg.get("market_at", 1.0))
+        self.convert_to_market = bool(cfg.get("convert_to_market", True))
+        self.min_amend_ticks = float(cfg.get("min_amend_ticks", 1))
+        self.min_amend_interval_sec = (
+            float(cfg.get("min_amend_interval_ms", 300)) / 1000
+        )
+        self.max_amends = int(cfg.get("max_amends", 8))
+        self.max_errors = int(cfg.get("max_errors", 3))
+        self.coalesce_sec = float(cfg.get("coalesce_ms", 50)) / 1000
+        self.batch_size = int(cfg.get("batch_size", 20))
+        self._bucket = _TokenBucket(
+            rate=cfg.get("max_requests_per_sec", 5.0),
+            burst=cfg.get("burst", 5),
+        )
+
+        self.orders: Dict[str, WorkingOrder] = {}
+        self._books: Dict[str, Tuple[float, float]] = {}  # symbol -> (bid, ask)
+        self._tickers: Dict[str, Tuple[float, float]] = {}  # bidPx/askPx тикера
+        self._by_symbol: Dict[str, Dict[str, None]] = {}
+        self._dirty: Dict[str, None] = {}  # Упорядоченное множество ordId
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._background: set = set()
+
+        self.stats: Dict[str, int] = {
+            "tracked": 0,
+            "book_updates": 0,
+            "holds": 0,
+            "amend_decisions": 0,
+            "coalesced": 0,
+            "amends": 0,
+            "amend_errors": 0,
+            "batches": 0,
+            "filled": 0,
+            "converted": 0,
+            "canceled": 0,
+            "released": 0,
+        }
+
+    @staticmethod
+    def _parse_curve(curve: Any) -> Tuple[Tuple[float, float], ...]:
+        points = sorted((float(frac), float(bps)) for frac, bps in curve)
+        return tuple(points) or DEFAULT_URGENCY_CURVE
+
+    def set_replace_guard(self, replace_guard) -> None:
+        """
+        Установить защиту market-замен (OrderCoordinator): can_market_replace,
+        is_reentry_blocked и record_market_replace.
+        """
+        self.replace_guard = replace_guard
+
+    async def start(self) -> None:
+        """Запустить flush-цикл amend."""
+        if not self.enabled or self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._flush_loop(), name="order-chaser-flush")
+        ]
+        logger.info(
+            f"🎯 LimitOrderChaser запущен: канал={self.book_channel}, "
+            f"кривая={list(self.urgency_curve)}, rate={self._bucket.rate}/s"
+        )
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def track(
+        self,
+        order_id: str,
+        symbol: str,
+        side: str,
+        size: float,
+        price: float,
+        post_only: bool = False,
+        max_wait: Optional[float] = None,
+    ) -> Optional[WorkingOrder]:
+        """Взять размещенный лимитный ордер под ведение."""
+        if not self.enabled or not order_id or not price:
+            return None
+        tick = 0.0
+        try:
+            details = await self.client.get_instrument_details(symbol)
+            tick = float((details or {}).get("tickSz") or 0.0)
+        except Exception as e:
+            logger.debug(f"⚠️ LimitOrderChaser: tickSz {symbol}: {e}")
+        order = WorkingOrder(
+            order_id=order_id,
+            symbol=symbol,
+            side="buy" if side.lower() in ("buy", "long") else "sell",
+            size=size,
+            origin_px=price,
+            price=price,
+            tick=tick,
+            post_only=post_only,
+            max_wait=float(max_wait or self.default_max_wait),
+            created_at=time.monotonic(),
+        )
+        self.orders[order_id] = order
+        self._by_symbol.setdefault(symbol, {})[order_id] = None
+        self.stats["tracked"] += 1
+        return order
+
+    def is_tracking(self, order_id: str) -> bool:
+        return order_id in self.orders
+
+    def has_orders(self, symbol: str) -> bool:
+        return bool(self._by_symbol.get(symbol))
+
+    def allowed_chase_bps(self, frac: float) -> float:
+        """Допустимый уход от исходной цены (bps) на доле времени ожидания frac."""
+        curve = self.urgency_curve
+        if frac <= curve[0][0]:
+            return curve[0][1]
+        if frac >= curve[-1][0]:
+            return curve[-1][1]
+        i = bisect.bisect_right([point[0] for point in curve], frac)
+        (x0, y0), (x1, y1) = curve[i - 1], curve[i]
+        return y0 + (y1 - y0) * (frac - x0) / (x1 - x0)
+
+    def decide(
+        self,
+        order: WorkingOrder,
+        best_bid: float,
+        best_ask: float,
+        now: Optional[float] = None,
+    ) -> Tuple[str, Optional[float]]:
+        """
+        Решение по ордеру на обновлении книги.
+
+        Returns:
+            ("hold", None) / ("amend", цена) / ("market", None) / ("cancel", None)
+        """
+        if best_bid <= 0 or best_ask <= 0 or best_bid >= best_ask:
+            return "hold", None
+        now = time.monotonic() if now is None else now
+        frac = (now - order.created_at) / order.max_wait if order.max_wait > 0 else 1.0
+        top = best_bid if order.side == "buy" else best_ask
+
+        if frac >= self.market_at:
+            if self.convert_to_market and order.adverse_bps(top) <= (
+                self.urgency_curve[-1][1]
+            ):
+                return "market", None
+            return "cancel", None
+
+        target = round_to_tick(top, order.tick)
+        step = order.tick * self.min_amend_ticks if order.tick > 0 else 0.0
+        # Ордер выше лучшей цены своей стороны - он и есть лучшая цена
+        # (или уже исполнен): двигать только в сторону рынка
+        behind = target > order.price if order.side == "buy" else target < order.price
+        if not behind or abs(target - order.price) < step:
+            return "hold", None
+        if order.adverse_bps(target) > self.allowed_chase_bps(frac):
+            return "hold", None
+        if order.amends >= self.max_amends:
+            return "hold", None
+        if now - order.last_amend_at < self.min_amend_interval_sec:
+            return "hold", None
+        return "amend", target
+
+    def on_book(self, symbol: str, best_bid: float, best_ask: float) -> None:
+        """Обновление лучших цен (горячий путь, без I/O)."""
+        order_ids = self._by_symbol.get(symbol)
+        if not order_ids:
+            return
+        self._books[symbol] = (best_bid, best_ask)
+        self.stats["book_updates"] += 1
+        self._apply(order_ids, best_bid, best_ask, time.monotonic())
+
+    def on_ticker(self, symbol: str, best_bid: float, best_ask: float) -> None:
+        """Bid/ask тикера: запасные цены для expire, если книга молчит."""
+        if self._by_symbol.get(symbol):
+            self._tickers[symbol] = (best_bid, best_ask)
+
+    def expire(self, now: Optional[float] = None) -> None:
+        """
+        Ордера без свежих обновлений книги: по истечении ожидания решение
+        принимается по последним известным ценам книги или тикера. Без цен
+        ордер возвращается под REST-мониторинг OrderCoordinator.
+        """
+        now = time.monotonic() if now is None else now
+        for order in list(self.orders.values()):
+            if order.state != "live":
+                continue
+            if now - order.created_at < order.max_wait * self.market_at:
+                continue
+            best_bid, best_ask = self._books.get(order.symbol) or self._tickers.get(
+                order.symbol, (0.0, 0.0)
+            )
+            if best_bid > 0 and best_ask > best_bid:
+                self._apply((order.order_id,), best_bid, best_ask, now)
+            else:
+                # Не отменяем вслепую: monitor_limit_orders решит по REST-ценам
+                # (has_orders по символу станет False)
+                self.stats["released"] += 1
+                logger.info(
+                    f"🎯 LimitOrderChaser {order.symbol}: нет цен книги/тикера, "
+                    f"{order.order_id} передан REST-мониторингу лимиток"
+                )
+                self._drop(order)
+
+    def _apply(self, order_ids, best_bid: float, best_ask: float, now: float) -> None:
+        for order_id in list(order_ids):
+            order = self.orders.get(order_id)
+            if order is None or order.state != "live":
+                continue
+            action, price = self.decide(order, best_bid, best_ask, now)
+            if action == "hold":
+                self.stats["holds"] += 1
+            elif action == "amend":
+                self.stats["amend_decisions"] += 1
+                order.target_px = price
+                if order_id in self._dirty:
+                    self.stats["coalesced"] += 1
+                else:
+                    self._dirty[order_id] = None
+                self._wakeup.set()
+            else:
+                order.state = "converting"
+                self._dirty.pop(order_id, None)
+                self._spawn(self._finish(order, action))
+
+    def on_order_update(self, order_data: Dict[str, Any]) -> None:
+        """Сверка по каналу orders: цена после amend, исполнение, отмена."""
+        order = self.orders.get(order_data.get("ordId", ""))
+        if order is None:
+            return
+        state = order_data.get("state", "")
+        try:
+            if order_data.get("sz"):
+                order.total_contracts = float(order_data["sz"])
+            if order_data.get("accFillSz"):
+                order.filled_contracts = float(order_data["accFillSz"])
+            if order_data.get("px") and state in ("live", "partially_filled"):
+                order.price = float(order_data["px"])
+        except (TypeError, ValueError):
+            pass
+        if state == "filled":
+            self.stats["filled"] += 1
+            self._drop(order)
+        elif state in ("canceled", "mmp_canceled") and order.state == "live":
+            self._drop(order)
+
+    def remaining_size(self, order: WorkingOrder) -> float:
+        """Неисполненный остаток в монетах."""
+        if order.total_contracts > 0:
+            left = max(0.0, 1.0 - order.filled_contracts / order.total_contracts)
+            return order.size * left
+        return order.size
+
+    async def flush(self) -> None:
+        """Отправить amend по ордерам с новой целевой ценой."""
+        order_ids = list(self._dirty)
+        self._dirty.clear()
+        batch = []
+        for order_id in order_ids:
+            order = self.orders.get(order_id)
+            if order is None or order.state != "live" or order.target_px is None:
+                continue
+            if order.in_flight:
+                self._dirty[order_id] = None
+                continue
+            batch.append(order)
+        for i in range(0, len(batch), self.batch_size):
+            await self._amend_batch(batch[i : i + self.batch_size])
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.stats)
+        stats["working"] = len(self.orders)
+        stats["pending"] = len(self._dirty)
+        filled = self.stats["filled"] + self.stats["converted"]
+        stats["amends_per_fill"] = (
+            round(self.stats["amends"] / filled, 2) if filled else None
+        )
+        return stats
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            # Истекшие ордера проверяются на каждом проходе: обновления книги
+            # по другим символам не должны откладывать таймаут тихого символа
+            self.expire()
+            if not self._wakeup.is_set():
+                continue
+            await asyncio.sleep(self.coalesce_sec)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ LimitOrderChaser: ошибка flush: {e}")
+            if self._dirty:
+                self._wakeup.set()
+
+    async def _amend_batch(self, chunk: Sequence[WorkingOrder]) -> None:
+        await self._bucket.acquire()
+        chunk = [o for o in chunk if o.state == "live" and o.target_px is not None]
+        if not chunk:
+            return
+        payload = []
+        for order in chunk:
+            order.in_flight = True
+            payload.append(
+                {
+                    "instId": f"{order.symbol}-SWAP",
+                    "ordId": order.order_id,
+                    "newPx": str(order.target_px),
+                }
+            )
+        self.stats["batches"] += 1
+        try:
+            result = await self.client.batch_amend_orders(payload)
+            items = {item.get("ordId"): item for item in result.get("data") or []}
+        except Exception as e:
+            logger.debug(f"⚠️ LimitOrderChaser: batch amend не прошел: {e}")
+            items = {}
+        finally:
+            for order in chunk:
+                order.in_flight = False
+
+        now = time.monotonic()
+        for order, sent in zip(chunk, payload):
+            item = items.get(order.order_id) or {}
+            code = str(item.get("sCode", "-1"))
+            if code == "0":
+                order.price = float(sent["newPx"])
+                order.amends += 1
+                order.errors = 0
+                order.last_amend_at = now
+                self.stats["amends"] += 1
+                logger.debug(
+                    f"🎯 LimitOrderChaser {order.symbol} {order.side}: "
+                    f"{order.order_id} → {order.price} (amend #{order.amends})"
+                )
+                continue
+            self.stats["amend_errors"] += 1
+            order.errors += 1
+            if code in _ORDER_GONE_CODES or order.errors >= self.max_errors:
+                self._drop(order)
+
+    async def _finish(self, order: WorkingOrder, action: str) -> None:
+        """Конец ожидания: отменить остаток и (для market) добрать рынком."""
+        await self._bucket.acquire()
+        try:
+            if self.executor is not None:
+                result = await self.executor.cancel_order(order.order_id, order.symbol)
+                canceled = bool(result.get("success"))
+            else:
+                result = await self.client.cancel_order(order.symbol, order.order_id)
+                canceled = result.get("code") == "0"
+        except Exception as e:
+            logger.warning(f"⚠️ LimitOrderChaser: отмена {order.order_id}: {e}")
+            canceled = False
+        self._drop(order)
+        if not canceled:
+            # Ордер исполнился раньше отмены - добирать нечего
+            return
+        if action == "market" and not self._market_allowed(order.symbol):
+            action = "cancel"
+        if action != "market" or self.executor is None:
+            self.stats["canceled"] += 1
+            logger.info(
+                f"🎯 LimitOrderChaser {order.symbol}: {order.order_id} отменен "
+                f"(рынок ушел дальше допуска кривой или market-замена запрещена)"
+            )
+            return
+        # Исполнение перед самой отменой могло еще не прийти по каналу orders:
+        # остаток считаем по accFillSz ордера с биржи после отмены
+        if not await self._refresh_fill(order):
+            self.stats["canceled"] += 1
+            logger.warning(
+                f"⚠️ LimitOrderChaser {order.symbol}: не удалось получить исполнение "
+                f"{order.order_id} после отмены, market-добор пропущен"
+            )
+            return
+        remaining = self.remaining_size(order)
+        if remaining <= 0:
+            self.stats["filled"] += 1
+            return
+        logger.info(
+            f"🎯 LimitOrderChaser {order.symbol}: конец ожидания, "
+            f"добираем market {order.side} {remaining:.6f}"
+        )
+        result = await self.executor._place_market_order(
+            order.symbol, order.side, remaining
+        )
+        success = bool(result.get("success"))
+        if success:
+            self.stats["converted"] += 1
+        else:
+            logger.warning(
+                f"⚠️ LimitOrderChaser {order.symbol}: market-добор не прошел "
+                f"({result.get('error')})"
+            )
+        if self.replace_guard is not None:
+            await self.replace_guard.record_market_replace(order.symbol, success)
+
+    def _market_allowed(self, symbol: str) -> bool:
+        guard = self.replace_guard
+        if guard is None:
+            return True
+        return not guard.is_reentry_blocked(symbol) and guard.can_market_replace(symbol)
+
+    async def _refresh_fill(self, order: WorkingOrder) -> bool:
+        """Обновить sz/accFillSz ордера запросом к бирже (REST get-order)."""
+        try:
+            data = await self.client.get_order(order.symbol, order.order_id)
+            info = data[0] if data else {}
+            order.total_contracts = float(info["sz"])
+            order.filled_contracts = float(info.get("accFillSz") or 0.0)
+        except Exception as e:
+            logger.debug(f"⚠️ LimitOrderChaser: get-order {order.order_id}: {e}")
+            return False
+        return True
+
+    def _drop(self, order: WorkingOrder) -> None:
+        order.state = "done"
+        self.orders.pop(order.order_id, None)
+        self._dirty.pop(order.order_id, None)
+        symbol_orders = self._by_symbol.get(order.symbol)
+        if symbol_orders is not None:
+            symbol_orders.pop(order.order_id, None)
+            if not symbol_orders:
+                self._by_symbol.pop(order.symbol, None)
+                self._books.pop(order.symbol, None)
+                self._tickers.pop(order.symbol, None)
+
+    def _spawn(self, coro) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            return
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
@@ -32,6 +32,7 @@ class PositionScalingManager:
         margin_calculator,
         client,
         config,
+        account_state=None,
     ):
         """
         Инициализация PositionScalingManager.
@@ -43,6 +44,7 @@ class PositionScalingManager:
             margin_calculator: Калькулятор маржи
             client: OKXFuturesClient
             config: Конфигурация бота
+            account_state: AccountStateCache - позиции из private WS (опционально)
         """
         self.position_registry = position_registry
         self.config_manager = config_manager
@@ -51,6 +53,7 @@ class PositionScalingManager:
         self.client = client
         self.config = config
         self.scalping_config = getattr(config, "scalping", None)
+        self.account_state = account_state
 
         logger.info("✅ PositionScalingManager инициализирован")
 
@@ -241,7 +244,7 @@ class PositionScalingManager:
 
             # Получаем данные с биржи для актуального PnL
             try:
-                positions = await self.client.get_positions(symbol)
+                positions = await self._get_exchange_positions(symbol)
                 current_pnl_percent = None
                 for pos in positions:
                     inst_id = pos.get("instId", "").replace("-SWAP", "")
@@ -461,6 +464,12 @@ class PositionScalingManager:
             )
             return None
 
+    async def _get_exchange_positions(self, symbol: str) -> list:
+        """Позиция в формате OKX: из снимка аккаунта, REST - если снимка нет."""
+        if self.account_state:
+            return await self.account_state.get_positions(symbol)
+        return await self.client.get_positions(symbol)
+
     async def _get_existing_position_leverage(self, symbol: str) -> Optional[int]:
         """
         Получить leverage существующей позиции.
@@ -473,7 +482,7 @@ class PositionScalingManager:
         """
         try:
             # Получаем позицию с биржи
-            positions = await self.client.get_positions(symbol)
+            positions = await self._get_exchange_positions(symbol)
             for pos in positions:
                 inst_id = pos.get("instId", "").replace("-SWAP", "")
                 if inst_id == symbol:
@@ -8,14 +8,16 @@ import asyncio
 import base64
 import hashlib
 import hmac
+import itertools
 import json
 import time
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
-from cachetools import TTLCache
 from loguru import logger
 
+from .core.private_event_pipeline import PrivateEventPipeline
+
 
 class PrivateWebSocketManager:
     """
@@ -64,9 +66,12 @@ class PrivateWebSocketManager:
         self.position_callback: Optional[Callable] = None
         self.order_callback: Optional[Callable] = None
         self.account_callback: Optional[Callable] = None
+        # Восстановление состояния после reconnect (события разрыва потеряны)
+        self.reconnect_callback: Optional[Callable] = None
 
         # Фоновые задачи
         self.listener_task: Optional[asyncio.Task] = None
+        self.recovery_task: Optional[asyncio.Task] = None
         self.heartbeat_task: Optional[asyncio.Task] = None
 
         # Подписки
@@ -75,13 +80,22 @@ class PrivateWebSocketManager:
         # Флаг для остановки
         self.should_run = True
 
-        # ✅ FIX: Дедупликация posId с TTL 5 минут (предотвращает двойную обработку)
-        self.seen_pos: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+        # События каналов: дедупликация (id, uTime), приоритет ордеров,
+        # слияние пачек позиций; обработчики вызывает отдельная задача
+        self.pipeline = PrivateEventPipeline()
 
         # ✅ FIX: Счётчик reconnect с exponential backoff
         self._reconnect_attempts = 0
         self._max_reconnect_attempts = 10
 
+        # Торговые запросы (op=order/cancel-order/amend-order/batch-*) через WS:
+        # ответ сопоставляется с запросом по полю "id"
+        self._pending_requests: Dict[str, asyncio.Future] = {}
+        self._request_seq = itertools.count(1)
+
+        # Запись сырых кадров (FrameRecorder), None - не пишем
+        self.recorder = None
+
         logger.info(f"PrivateWebSocketManager инициализирован (sandbox={sandbox})")
 
     async def connect(self) -> bool:
@@ -129,6 +143,7 @@ class PrivateWebSocketManager:
 
             # Запускаем listener и heartbeat
             self.listener_task = asyncio.create_task(self._listen_for_data())
+            self.pipeline.start()
             self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
             logger.info("✅ Private WebSocket готов к работе")
@@ -214,6 +229,7 @@ class PrivateWebSocketManager:
 
         try:
             self.position_callback = callback
+            self.pipeline.set_handler("positions", callback)
 
             subscribe_msg = {
                 "op": "subscribe",
@@ -246,6 +262,7 @@ class PrivateWebSocketManager:
 
         try:
             self.order_callback = callback
+            self.pipeline.set_handler("orders", callback)
 
             subscribe_msg = {
                 "op": "subscribe",
@@ -278,6 +295,7 @@ class PrivateWebSocketManager:
 
         try:
             self.account_callback = callback
+            self.pipeline.set_handler("account", callback)
 
             subscribe_msg = {
                 "op": "subscribe",
@@ -294,6 +312,69 @@ class PrivateWebSocketManager:
             logger.error(f"❌ Ошибка подписки на аккаунт: {e}")
             return False
 
+    def is_ready(self) -> bool:
+        """Готов ли канал к отправке торговых запросов (подключен и аутентифицирован)."""
+        return bool(
+            self.connected
+            and self.authenticated
+            and self.ws is not None
+            and not self.ws.closed
+        )
+
+    async def send_request(
+        self, op: str, args: List[Dict[str, Any]], timeout: float = 2.0
+    ) -> Dict[str, Any]:
+        """
+        Отправка торгового запроса через Private WebSocket и ожидание ответа.
+
+        Ответ сопоставляется с запросом по полю "id" (OKX возвращает его без изменений).
+
+        Args:
+            op: Операция OKX ("order", "cancel-order", "amend-order",
+                "batch-orders", "batch-cancel-orders", "batch-amend-orders")
+            args: Аргументы операции (как в REST payload)
+            timeout: Максимальное время ожидания ответа (секунды)
+
+        Returns:
+            Ответ биржи в формате {"id", "op", "code", "msg", "data": [...]}
+
+        Raises:
+            ConnectionError: Канал не готов или отправка не удалась; при разрыве
+                после отправки - с атрибутом request_sent=True
+            asyncio.TimeoutError: Ответ не получен за timeout
+        """
+        if not self.is_ready():
+            raise ConnectionError("Private WebSocket не готов для торговых запросов")
+
+        # OKX: id - до 32 буквенно-цифровых символов
+        request_id = f"t{next(self._request_seq)}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending_requests[request_id] = future
+        try:
+            try:
+                await self.ws.send_str(
+                    json.dumps({"id": request_id, "op": op, "args": args})
+                )
+            except Exception as e:
+                raise ConnectionError(f"Ошибка отправки WS запроса {op}: {e}") from e
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending_requests.pop(request_id, None)
+
+    def _fail_pending_requests(self, reason: str) -> None:
+        """
+        Завершает ожидающие торговые запросы ошибкой (при разрыве соединения).
+
+        Запрос уже отправлен и мог быть принят биржей - ошибка помечена
+        request_sent=True, чтобы клиент не повторял его вслепую.
+        """
+        for future in self._pending_requests.values():
+            if not future.done():
+                error = ConnectionError(reason)
+                error.request_sent = True
+                future.set_exception(error)
+        self._pending_requests.clear()
+
     async def _listen_for_data(self):
         """Слушаем данные от Private WebSocket."""
         while self.should_run and self.connected and self.ws:
@@ -304,6 +385,8 @@ class PrivateWebSocketManager:
 
                     if msg.type == aiohttp.WSMsgType.TEXT:
                         data = json.loads(msg.data)
+                        if self.recorder is not None:
+                            self.recorder.record("private", msg.data, data)
                         await self._handle_data(data)
 
                     elif msg.type == aiohttp.WSMsgType.ERROR:
@@ -325,9 +408,25 @@ class PrivateWebSocketManager:
 
             await asyncio.sleep(1)
 
+    def set_recorder(self, recorder) -> None:
+        """Писать каждый входящий кадр в FrameRecorder (None - отключить)."""
+        self.recorder = recorder
+
+    async def replay_frame(self, data: dict):
+        """Подать записанный кадр в обработчики каналов (FrameReplayer)."""
+        await self._handle_data(data)
+
     async def _handle_data(self, data: dict):
         """Обработка данных от Private WebSocket."""
         try:
+            # Ответы на торговые запросы (send_request)
+            request_id = data.get("id")
+            if request_id and request_id in self._pending_requests:
+                future = self._pending_requests[request_id]
+                if not future.done():
+                    future.set_result(data)
+                return
+
             # Обрабатываем события (subscribe, login, error)
             event = data.get("event")
             if event:
@@ -350,33 +449,11 @@ class PrivateWebSocketManager:
             arg = data.get("arg", {})
             channel = arg.get("channel")
 
-            if channel == "positions":
-                positions_data = data.get("data", [])
-                if positions_data and self.position_callback:
-                    # ✅ FIX: Дедупликация по posId (биржа может слать дубли)
-                    filtered_positions = []
-                    for pos in positions_data:
-                        pos_id = pos.get("posId")
-                        if pos_id and pos_id in self.seen_pos:
-                            logger.debug(f"⏭️ Пропуск дубликата позиции: {pos_id}")
-                            continue
-                        if pos_id:
-                            self.seen_pos[pos_id] = True
-                        filtered_positions.append(pos)
-
-                    if filtered_positions:
-                        await self.position_callback(filtered_positions)
-
-            elif channel == "orders":
-                orders_data = data.get("data", [])
-                if orders_data and self.order_callback:
-                    await self.order_callback(orders_data)
-
-            elif channel == "account":
-                account_data = data.get("data", [])
-                if account_data and self.account_callback:
-                    await self.account_callback(account_data)
-
+            if channel in ("orders", "positions", "account"):
+                self.pipeline.submit(channel, data.get("data", []))
+                # Без диспетчера (replay, тесты) доставляем сразу
+                if not self.pipeline.running:
+                    await self.pipeline.drain()
         except Exception as e:
             logger.error(f"❌ Ошибка обработки данных Private WebSocket: {e}")
 
@@ -398,6 +475,7 @@ class PrivateWebSocketManager:
         logger.warning("🔌 Private WebSocket отключен")
         self.connected = False
         self.authenticated = False
+        self._fail_pending_requests("Private WebSocket отключен")
 
         # Пытаемся переподключиться
         if self.should_run:
@@ -440,18 +518,26 @@ class PrivateWebSocketManager:
                         await self.subscribe_orders(self.order_callback)
                     if self.account_callback:
                         await self.subscribe_account(self.account_callback)
+                    if self.reconnect_callback and (
+                        self.recovery_task is None or self.recovery_task.done()
+                    ):
+                        self.recovery_task = asyncio.create_task(
+                            self.reconnect_callback()
+                        )
 
     async def disconnect(self):
         """Отключение от Private WebSocket."""
         self.should_run = False
         self.connected = False
         self.authenticated = False
+        self._fail_pending_requests("Private WebSocket остановлен")
 
         # Останавливаем задачи
         if self.listener_task:
             self.listener_task.cancel()
         if self.heartbeat_task:
             self.heartbeat_task.cancel()
+        await self.pipeline.stop()
 
         # Закрываем WebSocket
         if self.ws:
@@ -489,6 +575,8 @@ class PrivateWebSocketManager:
             "has_position_callback": self.position_callback is not None,
             "has_order_callback": self.order_callback is not None,
             "has_account_callback": self.account_callback is not None,
+            "pending_requests": len(self._pending_requests),
+            "pipeline": self.pipeline.get_stats(),
         }
 
     def __repr__(self) -> str:
@@ -0,0 +1,18 @@
+"""
+Recording - запись сырых кадров WebSocket и воспроизведение сессий.
+
+Модули:
+- frame_recorder: Запись кадров в сжатые чанки с индексом по времени и каналам
+- frame_reader: Выборка кадров по времени/символу/каналу и воспроизведение
+"""
+
+from .frame_reader import FrameReplayer, RecordedFrame, RecordingReader, list_sessions
+from .frame_recorder import FrameRecorder
+
+__all__ = [
+    "FrameRecorder",
+    "FrameReplayer",
+    "RecordedFrame",
+    "RecordingReader",
+    "list_sessions",
+]
@@ -0,0 +1,214 @@
+"""
+Чтение и воспроизведение записей FrameRecorder.
+
+RecordingReader выбирает блоки по index.jsonl (диапазон времени, символы,
+каналы, источник) и распаковывает только их - seek по смещению gzip-члена,
+без чтения чанка целиком. FrameReplayer подает кадры обратно в обработчики
+WebSocket-менеджеров в исходном темпе или ускоренно.
+"""
+
+import asyncio
+import gzip
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+from .frame_recorder import INDEX_FILE
+
+
+@dataclass
+class RecordedFrame:
+    """Кадр записи: время приема, источник, канал, инструмент и сам кадр."""
+
+    ts: float
+    mono: int
+    source: str
+    channel: str
+    inst_id: str
+    payload: Dict[str, Any]
+
+    @property
+    def symbol(self) -> str:
+        return self.inst_id.replace("-SWAP", "")
+
+
+def list_sessions(directory: str) -> List[Path]:
+    """Каталоги сессий с индексом, от старых к новым."""
+    root = Path(directory)
+    if not root.exists():
+        return []
+    return sorted(p.parent for p in root.glob(f"*/{INDEX_FILE}"))
+
+
+def _inst_ids(symbols: Optional[Iterable[str]]) -> Optional[set]:
+    """Символы в виде instId: BTC-USDT -> {BTC-USDT, BTC-USDT-SWAP}."""
+    if not symbols:
+        return None
+    result = set()
+    for symbol in symbols:
+        base = symbol.replace("-SWAP", "")
+        result.add(base)
+        result.add(f"{base}-SWAP")
+    return result
+
+
+class RecordingReader:
+    """Чтение одной сессии записи."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        index_path = self.path / INDEX_FILE
+        if not index_path.exists():
+            raise FileNotFoundError(f"Нет {INDEX_FILE} в {self.path}")
+        self.index: List[Dict[str, Any]] = []
+        with open(index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self.index.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Последняя строка могла оборваться при аварийной остановке
+                    logger.debug("RecordingReader: пропуск битой строки индекса")
+
+    def time_range(self) -> Optional[tuple]:
+        if not self.index:
+            return None
+        return self.index[0]["first_ts"], self.index[-1]["last_ts"]
+
+    def blocks(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        symbols: Optional[Iterable[str]] = None,
+        channels: Optional[Iterable[str]] = None,
+        sources: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Записи индекса, пересекающиеся с фильтром."""
+        inst_ids = _inst_ids(symbols)
+        channels = set(channels) if channels else None
+        sources = set(sources) if sources else None
+        selected = []
+        for entry in self.index:
+            if start is not None and entry["last_ts"] < start:
+                continue
+            if end is not None and entry["first_ts"] > end:
+                continue
+            if channels and not channels.intersection(entry["channels"]):
+                continue
+            if sources and not sources.intersection(entry["sources"]):
+                continue
+            if inst_ids and not inst_ids.intersection(entry["inst_ids"]):
+                continue
+            selected.append(entry)
+        return selected
+
+    def frames(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        symbols: Optional[Iterable[str]] = None,
+        channels: Optional[Iterable[str]] = None,
+        sources: Optional[Iterable[str]] = None,
+    ) -> Iterator[RecordedFrame]:
+        """
+        Кадры в порядке приема.
+
+        При заданном symbols кадры без инструмента (login, account) отбрасываются.
+        """
+        inst_ids = _inst_ids(symbols)
+        channels = set(channels) if channels else None
+        sources = set(sources) if sources else None
+        handles: Dict[str, Any] = {}
+        try:
+            for entry in self.blocks(start, end, symbols, channels, sources):
+                handle = handles.get(entry["file"])
+                if handle is None:
+                    handle = handles[entry["file"]] = open(
+                        self.path / entry["file"], "rb"
+                    )
+                handle.seek(entry["offset"])
+                text = gzip.decompress(handle.read(entry["length"])).decode("utf-8")
+                first_ts, first_mono = entry["first_ts"], entry["first_mono"]
+                for line in text.splitlines():
+                    row = json.loads(line)
+                    ts = first_ts + (row["mono"] - first_mono) / 1e9
+                    if start is not None and ts < start:
+                        continue
+                    if end is not None and ts > end:
+                        continue
+                    if channels and row["channel"] not in channels:
+                        continue
+                    if sources and row["src"] not in sources:
+                        continue
+                    if inst_ids and row["inst_id"] not in inst_ids:
+                        continue
+                    yield RecordedFrame(
+                        ts=ts,
+                        mono=row["mono"],
+                        source=row["src"],
+                        channel=row["channel"],
+                        inst_id=row["inst_id"],
+                        payload=row["payload"],
+                    )
+        finally:
+            for handle in handles.values():
+                handle.close()
+
+
+FrameHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class FrameReplayer:
+    """
+    Воспроизведение записи в обработчики WebSocket-менеджеров.
+
+    Пример:
+        replayer = FrameReplayer(RecordingReader(path))
+        await replayer.replay(
+            {"public": ws_manager.replay_frame, "private": private_ws.replay_frame},
+            speed=10.0,
+        )
+    """
+
+    def __init__(self, reader: RecordingReader):
+        self.reader = reader
+
+    async def replay(
+        self,
+        handlers: Dict[str, FrameHandler],
+        speed: float = 1.0,
+        **filters: Any,
+    ) -> int:
+        """
+        Подать кадры в обработчики по источнику.
+
+        Args:
+            handlers: source -> async handler(payload)
+            speed: 1.0 - исходный темп, 10.0 - в 10 раз быстрее,
+                0 - без пауз (максимальная скорость)
+            **filters: start, end, symbols, channels (как RecordingReader.frames)
+
+        Returns:
+            Число поданных кадров
+        """
+        filters.setdefault("sources", list(handlers))
+        replayed = 0
+        first_mono = None
+        started = time.monotonic()
+        for frame in self.reader.frames(**filters):
+            handler = handlers.get(frame.source)
+            if handler is None:
+                continue
+            if speed and speed > 0:
+                if first_mono is None:
+                    first_mono = frame.mono
+                due = started + (frame.mono - first_mono) / 1e9 / speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await handler(frame.payload)
+            replayed += 1
+        return replayed
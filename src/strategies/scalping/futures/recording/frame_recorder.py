@@ -0,0 +1,323 @@
+"""
+FrameRecorder - запись сырых кадров WebSocket для воспроизведения сессий.
+
+Формат записи (каталог сессии):
+- frames_NNNNNN.jsonl.gz - чанки, только дописываются; чанк - последовательность
+  gzip-членов (блоков), каждый блок - строки JSONL:
+  {"mono": monotonic_ns, "src": "public"|"private", "channel": ...,
+   "inst_id": ..., "payload": <сырой кадр как есть>}
+- index.jsonl - строка на блок: файл, смещение и длина gzip-члена, диапазон
+  ts/mono, число кадров, каналы и инструменты блока. Пишется после данных,
+  поэтому читатель видит только целые блоки. Время кадра (epoch) читатель
+  восстанавливает от якоря блока: first_ts + (mono - first_mono).
+
+Горячий путь (record) - только форматирование строки и append в буфер под
+локом; сжатие и запись на диск - в отдельном потоке. Если поток записи не
+успевает, блоки отбрасываются (dropped_blocks), торговый цикл не ждет диск.
+"""
+
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+INDEX_FILE = "index.jsonl"
+CHUNK_PATTERN = "frames_{:06d}.jsonl.gz"
+
+
+@lru_cache(maxsize=4096)
+def _quoted(value: str) -> str:
+    """JSON-строка для канала/инструмента (набор значений мал - кэшируем)."""
+    return json.dumps(value)
+
+
+class _Block:
+    """Накопленные строки одного будущего gzip-члена."""
+
+    __slots__ = (
+        "lines",
+        "first_ts",
+        "first_mono",
+        "last_mono",
+        "channels",
+        "inst_ids",
+        "sources",
+    )
+
+    def __init__(self, ts: float, mono: int):
+        self.lines: List[str] = []
+        self.first_ts = ts
+        self.first_mono = mono
+        self.last_mono = mono
+        self.channels: Dict[str, int] = {}
+        self.inst_ids = set()
+        self.sources = set()
+
+
+class FrameRecorder:
+    """
+    Запись сырых кадров public/private WebSocket в сжатые чанки.
+
+    Использование:
+        recorder = FrameRecorder("logs/futures/ws_recording")
+        recorder.start()
+        ws_manager.set_recorder(recorder)
+        ...
+        recorder.close()
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        session: Optional[str] = None,
+        chunk_seconds: float = 300.0,
+        flush_interval_sec: float = 1.0,
+        flush_frames: int = 2000,
+        channels: Optional[Iterable[str]] = None,
+        compress_level: int = 1,
+        max_pending_blocks: int = 256,
+    ):
+        """
+        Args:
+            directory: Корневой каталог записей
+            session: Имя сессии (подкаталог), по умолчанию - время старта
+            chunk_seconds: Длительность одного файла-чанка
+            flush_interval_sec: Максимальный возраст блока в памяти
+            flush_frames: Максимум кадров в блоке
+            channels: Записывать только эти каналы (None - все)
+            compress_level: Уровень gzip (1 - быстрый)
+            max_pending_blocks: Очередь блоков к записи, сверх - отбрасываем
+        """
+        session = session or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = Path(directory) / session
+        self.chunk_seconds = float(chunk_seconds)
+        self.flush_interval_ns = int(float(flush_interval_sec) * 1e9)
+        self.flush_frames = int(flush_frames)
+        self.channels = set(channels) if channels else None
+        self.compress_level = int(compress_level)
+        self.max_pending_blocks = int(max_pending_blocks)
+
+        self._lock = threading.Lock()
+        self._block: Optional[_Block] = None
+        self._queue: "queue.SimpleQueue[Optional[_Block]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self._chunk_index = 0
+        self._chunk_started: Optional[float] = None
+
+        self.stats: Dict[str, Any] = {
+            "frames": 0,
+            "filtered": 0,
+            "blocks": 0,
+            "dropped_blocks": 0,
+            "dropped_frames": 0,
+            "bytes_raw": 0,
+            "bytes_written": 0,
+            "record_ns": 0,
+            "record_max_ns": 0,
+            "write_errors": 0,
+        }
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "FrameRecorder":
+        """Создать из секции scalping.ws_recording."""
+        return cls(
+            directory=cfg.get("dir", "logs/futures/ws_recording"),
+            session=cfg.get("session"),
+            chunk_seconds=cfg.get("chunk_seconds", 300.0),
+            flush_interval_sec=cfg.get("flush_interval_sec", 1.0),
+            flush_frames=cfg.get("flush_frames", 2000),
+            channels=cfg.get("channels") or None,
+            compress_level=cfg.get("compress_level", 1),
+            max_pending_blocks=cfg.get("max_pending_blocks", 256),
+        )
+
+    def start(self) -> None:
+        """Создать каталог сессии и запустить поток записи."""
+        if self._thread is not None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Продолжаем нумерацию, если сессия уже писалась (перезапуск с тем же именем)
+        existing = sorted(self.path.glob("frames_*.jsonl.gz"))
+        if existing:
+            self._chunk_index = int(existing[-1].name[7:13])
+        index_path = self.path / INDEX_FILE
+        if index_path.exists() and index_path.stat().st_size:
+            with open(index_path, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Оборванная при аварии строка индекса - закрываем ее,
+                    # иначе следующая запись склеится с ней
+                    f.write(b"\n")
+        self._thread = threading.Thread(
+            target=self._writer_loop, name="ws-frame-recorder", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"🎥 Запись WS-кадров: {self.path}")
+
+    def record(self, source: str, raw: str, data: Dict[str, Any]) -> None:
+        """
+        Записать кадр (горячий путь, вызывается из listener WebSocket).
+
+        Args:
+            source: "public" или "private"
+            raw: Текст кадра как пришел от биржи (валидный JSON)
+            data: Тот же кадр после json.loads (для канала и инструмента)
+        """
+        started = time.perf_counter_ns()
+        arg = data.get("arg") or {}
+        channel = arg.get("channel") or data.get("event") or data.get("op") or ""
+        if self.channels is not None and channel not in self.channels:
+            self.stats["filtered"] += 1
+            return
+        inst_id = arg.get("instId") or ""
+        mono = time.monotonic_ns()
+        line = (
+            f'{{"mono":{mono},"src":"{source}","channel":{_quoted(channel)},'
+            f'"inst_id":{_quoted(inst_id)},"payload":{raw}}}\n'
+        )
+
+        ready = None
+        with self._lock:
+            block = self._block
+            if block is None:
+                block = self._block = _Block(time.time(), mono)
+            block.lines.append(line)
+            block.last_mono = mono
+            block.channels[channel] = block.channels.get(channel, 0) + 1
+            if inst_id:
+                block.inst_ids.add(inst_id)
+            block.sources.add(source)
+            if (
+                len(block.lines) >= self.flush_frames
+                or mono - block.first_mono >= self.flush_interval_ns
+            ):
+                ready = block
+                self._block = None
+        if ready is not None:
+            self._submit(ready)
+
+        stats = self.stats
+        stats["frames"] += 1
+        stats["bytes_raw"] += len(line)
+        elapsed = time.perf_counter_ns() - started
+        stats["record_ns"] += elapsed
+        if elapsed > stats["record_max_ns"]:
+            stats["record_max_ns"] = elapsed
+
+    def flush(self) -> None:
+        """Отдать текущий блок потоку записи."""
+        with self._lock:
+            block = self._block
+            self._block = None
+        if block is not None:
+            self._submit(block)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Дописать накопленное и остановить поток записи."""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info(
+            f"🎥 Запись WS-кадров завершена: frames={self.stats['frames']}, "
+            f"blocks={self.stats['blocks']}, "
+            f"written={self.stats['bytes_written'] / 1e6:.1f}MB, "
+            f"avg={self._avg_record_us():.2f}us/кадр"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["avg_record_us"] = round(self._avg_record_us(), 3)
+        stats["record_max_us"] = round(stats.pop("record_max_ns") / 1000, 3)
+        stats.pop("record_ns")
+        stats["pending_blocks"] = self._queue.qsize()
+        stats["path"] = str(self.path)
+        return stats
+
+    def _avg_record_us(self) -> float:
+        frames = self.stats["frames"]
+        return self.stats["record_ns"] / frames / 1000 if frames else 0.0
+
+    def _submit(self, block: _Block) -> None:
+        if self._thread is None or self._queue.qsize() >= self.max_pending_blocks:
+            self.stats["dropped_blocks"] += 1
+            self.stats["dropped_frames"] += len(block.lines)
+            return
+        self._queue.put(block)
+
+    def _writer_loop(self) -> None:
+        while True:
+            try:
+                block = self._queue.get(timeout=self.flush_interval_ns / 1e9)
+            except queue.Empty:
+                # Редкие кадры (private WS) не должны висеть в памяти дольше интервала
+                with self._lock:
+                    block = self._block
+                    if (
+                        block is not None
+                        and time.monotonic_ns() - block.first_mono
+                        >= self.flush_interval_ns
+                    ):
+                        self._block = None
+                    else:
+                        block = None
+                if block is None:
+                    continue
+            if block is None:
+                return
+            try:
+                self._write_block(block)
+            except Exception as e:
+                self.stats["write_errors"] += 1
+                logger.warning(f"⚠️ FrameRecorder: ошибка записи блока: {e}")
+
+    def _chunk_path(self, block: _Block) -> Path:
+        if (
+            self._chunk_started is None
+            or block.first_ts - self._chunk_started >= self.chunk_seconds
+        ):
+            self._chunk_index += 1
+            self._chunk_started = block.first_ts
+        return self.path / CHUNK_PATTERN.format(self._chunk_index)
+
+    def _write_block(self, block: _Block) -> None:
+        data = gzip.compress(
+            "".join(block.lines).encode("utf-8"), compresslevel=self.compress_level
+        )
+        chunk = self._chunk_path(block)
+        with open(chunk, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        entry = {
+            "file": chunk.name,
+            "offset": offset,
+            "length": len(data),
+            "first_ts": block.first_ts,
+            "last_ts": block.first_ts + (block.last_mono - block.first_mono) / 1e9,
+            "first_mono": block.first_mono,
+            "last_mono": block.last_mono,
+            "frames": len(block.lines),
+            "sources": sorted(block.sources),
+            "channels": block.channels,
+            "inst_ids": sorted(block.inst_ids),
+        }
+        with open(self.path / INDEX_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.stats["blocks"] += 1
+        self.stats["bytes_written"] += len(data)
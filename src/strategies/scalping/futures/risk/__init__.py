@@ -5,14 +5,18 @@ Futures-специфичное управление рисками.
 - adaptive_leverage: Адаптивный леверидж на основе качества сигнала
 - liquidation_protector: Защита от ликвидации
 - margin_monitor: Мониторинг маржи
+- portfolio_risk: Векторный риск портфеля (маржа, ликвидация, стресс)
 - max_size_limiter: Ограничение размера позиций
 - position_sizer: Расчет размера позиций
 """
 
 from .adaptive_leverage import AdaptiveLeverage
 from .max_size_limiter import MaxSizeLimiter
+from .portfolio_risk import PortfolioRiskEngine, PortfolioRiskReport
 
 __all__ = [
     "AdaptiveLeverage",
     "MaxSizeLimiter",
+    "PortfolioRiskEngine",
+    "PortfolioRiskReport",
 ]
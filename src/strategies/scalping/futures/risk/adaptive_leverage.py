@@ -78,6 +78,12 @@ class AdaptiveLeverage:
         self.position_size_limit_2_percent = (
             0.20  # 20% of equity (SCALPING: повышен с 10%)
         )
+        # AccountStateCache: equity из private WS вместо REST на каждом сигнале
+        self.account_state = None
+
+    def set_account_state(self, account_state) -> None:
+        """Установить AccountStateCache (equity для лимитов плеча)."""
+        self.account_state = account_state
 
     async def calculate_leverage(
         self,
@@ -159,14 +165,21 @@ class AdaptiveLeverage:
             # Если это margin, то notional = margin * leverage (будет пересчитано в signal_coordinator)
             # Если это notional, то используем напрямую
             # Для безопасности считаем, что это margin, и применяем более строгие ограничения
-            if position_size_usd is not None and position_size_usd > 0 and client:
+            if (
+                position_size_usd is not None
+                and position_size_usd > 0
+                and (client or self.account_state)
+            ):
                 try:
                     # Get current balance to calculate thresholds as % of equity
-                    current_balance = (
-                        await client.get_balance()
-                        if hasattr(client, "get_balance")
-                        else None
-                    )
+                    if self.account_state:
+                        current_balance = await self.account_state.get_equity()
+                    else:
+                        current_balance = (
+                            await client.get_balance()
+                            if hasattr(client, "get_balance")
+                            else None
+                        )
                     if current_balance and current_balance > 0:
                         # Calculate margin limits as % of equity
                         limit_high = (
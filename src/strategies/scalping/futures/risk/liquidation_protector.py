@@ -37,6 +37,8 @@ class LiquidationProtector:
         self.config_manager = config_manager
         self.margin_calculator = margin_calculator
         self.config = config or {}
+        # PortfolioRiskEngine: liqPx/плечо открытых позиций с биржи
+        self.portfolio_risk = None
 
         # Порог безопасности: минимальное расстояние до ликвидации
         # ✅ P0-4 FIX: Дефолт 1.5 соответствует config.yaml (risk_management.liquidation_guard.safety_threshold)
@@ -54,6 +56,10 @@ class LiquidationProtector:
             f"(safety_threshold={self.safety_threshold:.1%})"
         )
 
+    def set_portfolio_risk(self, portfolio_risk) -> None:
+        """Подключить PortfolioRiskEngine (цена ликвидации открытых позиций)."""
+        self.portfolio_risk = portfolio_risk
+
     async def check_liquidation_risk(
         self,
         symbol: str,
@@ -110,15 +116,29 @@ class LiquidationProtector:
                     "symbol": symbol,
                 }
 
-            # Рассчитываем цену ликвидации
+            # Цена ликвидации: для открытой позиции - из PortfolioRiskEngine
+            # (liqPx биржи или формула с реальным плечом), иначе - по конфигу
+            portfolio_details = None
+            if self.portfolio_risk and self.portfolio_risk.has_position(symbol):
+                portfolio_details = self.portfolio_risk.position_risk(symbol)
+                side_alias = {"buy": "long", "sell": "short"}
+                if portfolio_details and portfolio_details[
+                    "position_side"
+                ] != side_alias.get(position_side, position_side):
+                    portfolio_details = None
             try:
-                liquidation_price = self.margin_calculator.calculate_liquidation_price(
-                    side=position_side,
-                    entry_price=entry_price,
-                    position_size=abs(position_size),
-                    equity=balance,
-                    leverage=None,  # Используется из конфига
-                )
+                if portfolio_details:
+                    liquidation_price = portfolio_details["liquidation_price"]
+                else:
+                    liquidation_price = (
+                        self.margin_calculator.calculate_liquidation_price(
+                            side=position_side,
+                            entry_price=entry_price,
+                            position_size=abs(position_size),
+                            equity=balance,
+                            leverage=None,  # Используется из конфига
+                        )
+                    )
             except Exception as e:
                 logger.warning(
                     f"⚠️ LiquidationProtector: Ошибка расчета ликвидации для {symbol}: {e}"
@@ -165,7 +185,10 @@ class LiquidationProtector:
                 "position_side": position_side,
                 "margin_used": margin_used,
                 "symbol": symbol,
+                "source": "portfolio_risk" if portfolio_details else "formula",
             }
+            if portfolio_details:
+                details["margin_ratio"] = portfolio_details["margin_ratio"]
 
             if not is_safe:
                 logger.warning(
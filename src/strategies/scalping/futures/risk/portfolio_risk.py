@@ -0,0 +1,474 @@
+"""
+PortfolioRiskEngine - векторный риск всего портфеля позиций.
+
+Позиции хранятся колонками NumPy (side, qty, entry, leverage, margin, liqPx,
+mark). События позиций (снимок AccountStateCache) и цен (тикер / mark-price)
+только пишут в ячейки массивов; evaluate() одним векторным проходом считает
+для всех позиций PnL, margin ratio, цену и расстояние до ликвидации, нотионал
+по направлениям и стресс-сценарии (равномерный сдвиг цен и сдвиг одного
+символа, разнесенный по матрице корреляций). Результат кэшируется до
+следующего события, поэтому частые вызовы position_risk() из
+LiquidationProtector / RiskManager не пересчитывают портфель.
+
+Формулы совпадают со скалярными MarginCalculator: ликвидация
+entry * (1 -/+ 1/lev +/- mmr) с поправкой 0.999/1.001 (если биржа не дала
+liqPx), margin ratio = (equity - margin + pnl) / margin.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+def _float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value) if value not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class PortfolioRiskReport:
+    """Результат evaluate(): массивы в порядке symbols + агрегаты."""
+
+    symbols: Tuple[str, ...]
+    side: np.ndarray  # +1 long / -1 short
+    notional: np.ndarray  # USD по текущей цене
+    pnl: np.ndarray
+    margin_used: np.ndarray
+    margin_ratio: np.ndarray
+    liquidation_price: np.ndarray
+    distance_pct: np.ndarray  # до ликвидации, % от текущей цены
+    equity: float
+    long_notional: float
+    short_notional: float
+    total_margin: float
+    total_pnl: float
+    account_margin_ratio: float  # (equity + pnl) / общая маржа
+    # name -> {"pnl": ..., "breaches": [symbols]}
+    scenarios: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    worst_scenario: Optional[str] = None
+    computed_at: float = 0.0
+
+    @property
+    def net_notional(self) -> float:
+        return self.long_notional - self.short_notional
+
+    @property
+    def gross_notional(self) -> float:
+        return self.long_notional + self.short_notional
+
+    def position(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Детали позиции в формате details скалярных проверок."""
+        try:
+            i = self.symbols.index(symbol)
+        except ValueError:
+            return None
+        return {
+            "symbol": symbol,
+            "position_side": "long" if self.side[i] > 0 else "short",
+            "notional": float(self.notional[i]),
+            "pnl": float(self.pnl[i]),
+            "margin_used": float(self.margin_used[i]),
+            "margin_ratio": float(self.margin_ratio[i]),
+            "liquidation_price": float(self.liquidation_price[i]),
+            "distance_pct": float(self.distance_pct[i]),
+        }
+
+
+class PortfolioRiskEngine:
+    """
+    Риск портфеля в массивах NumPy с инкрементальными обновлениями.
+
+    Использование:
+        engine = PortfolioRiskEngine({"shocks_pct": [1, 3]}, margin_calculator)
+        account_state.subscribe(engine.sync_snapshot)   # события позиций
+        engine.update_price("BTC-USDT", 65000.0)        # события цен
+        report = engine.evaluate()
+        details = engine.position_risk("BTC-USDT")
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        margin_calculator=None,
+        capacity: int = 16,
+    ):
+        """
+        Args:
+            config: Секция scalping.portfolio_risk
+            margin_calculator: MarginCalculator - источник mmr и плеча по умолчанию
+            capacity: Начальная емкость массивов (растет удвоением)
+        """
+        cfg = config or {}
+        self.maintenance_margin_ratio = float(
+            cfg.get(
+                "maintenance_margin_ratio",
+                getattr(margin_calculator, "maintenance_margin_ratio", 0.01),
+            )
+        )
+        self.default_leverage = float(
+            cfg.get(
+                "default_leverage", getattr(margin_calculator, "default_leverage", 5)
+            )
+        )
+        self.shocks_pct = tuple(float(s) for s in cfg.get("shocks_pct", (1.0, 3.0)))
+        self.correlated_shock_pct = float(cfg.get("correlated_shock_pct", 3.0))
+
+        self._symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._n = 0
+        self._alloc(max(int(capacity), 1))
+
+        self.equity = 0.0
+        self._positions_ref = None  # последний примененный mapping снимка
+        self._correlation_source: Optional[Callable[[], Any]] = None
+        self._corr_key = None
+        self._corr_sub: Optional[np.ndarray] = None
+        self._report: Optional[PortfolioRiskReport] = None
+        self.stats: Dict[str, int] = {
+            "evaluations": 0,
+            "cached_reads": 0,
+            "price_updates": 0,
+            "position_updates": 0,
+        }
+
+    # ==================== СОБЫТИЯ ====================
+
+    def upsert_position(
+        self,
+        symbol: str,
+        side: str,
+        qty: float,
+        entry_price: float,
+        leverage: Optional[float] = None,
+        margin: float = 0.0,
+        liquidation_price: float = 0.0,
+        mark_price: float = 0.0,
+    ) -> None:
+        """
+        Добавить или обновить позицию.
+
+        Args:
+            qty: Размер в монетах (не контрактах), без знака
+            margin: Маржа с биржи (0 - оценить как entry * qty / leverage)
+            liquidation_price: liqPx с биржи (0 - формула MarginCalculator)
+        """
+        i = self._index.get(symbol)
+        if i is None:
+            if self._n == len(self._qty):
+                self._grow()
+            i = self._n
+            self._n += 1
+            self._index[symbol] = i
+            self._symbols.append(symbol)
+            self._corr_key = None
+        self._side[i] = 1.0 if str(side).lower() in ("long", "buy") else -1.0
+        self._qty[i] = abs(float(qty))
+        self._entry[i] = float(entry_price)
+        self._lev[i] = float(leverage or 0) or self.default_leverage
+        self._margin[i] = float(margin or 0)
+        self._liq[i] = float(liquidation_price or 0)
+        if mark_price and mark_price > 0:
+            self._mark[i] = float(mark_price)
+        elif self._mark[i] <= 0:
+            self._mark[i] = float(entry_price)
+        self.stats["position_updates"] += 1
+        self._report = None
+
+    def remove_position(self, symbol: str) -> bool:
+        """Удалить позицию: последняя строка переезжает на место удаленной."""
+        i = self._index.pop(symbol, None)
+        if i is None:
+            return False
+        last = self._n - 1
+        if i != last:
+            moved = self._symbols[last]
+            for column in self._columns():
+                column[i] = column[last]
+            self._symbols[i] = moved
+            self._index[moved] = i
+        self._symbols.pop()
+        for column in self._columns():
+            column[last] = 0.0
+        self._n = last
+        self._corr_key = None
+        self._report = None
+        return True
+
+    def update_price(self, symbol: str, price: float) -> None:
+        """Цена символа (горячий путь: одна запись в массив)."""
+        i = self._index.get(symbol)
+        if i is None or not price or price <= 0:
+            return
+        self._mark[i] = price
+        self.stats["price_updates"] += 1
+        self._report = None
+
+    def update_prices(self, prices: Dict[str, float]) -> None:
+        for symbol, price in prices.items():
+            self.update_price(symbol, price)
+
+    def set_equity(self, equity: Optional[float]) -> None:
+        if equity and equity > 0 and equity != self.equity:
+            self.equity = float(equity)
+            self._report = None
+
+    def sync_snapshot(self, snapshot) -> None:
+        """
+        Применить AccountSnapshot (подписка на AccountStateCache).
+
+        Позиции пересобираются, только если снимок принес новый mapping
+        позиций; обновление одного баланса меняет лишь equity.
+        """
+        self.set_equity(snapshot.equity)
+        if snapshot.positions is self._positions_ref:
+            return
+        self._positions_ref = snapshot.positions
+        for symbol in [s for s in self._symbols if s not in snapshot.positions]:
+            self.remove_position(symbol)
+        for symbol, state in snapshot.positions.items():
+            raw = state.raw
+            mark = state.mark_px or state.avg_px
+            # pos - в контрактах; монеты берем из нотионала биржи
+            notional = _float(raw.get("notionalUsd"))
+            if notional > 0 and mark > 0:
+                qty = notional / mark
+            elif state.margin > 0 and state.leverage > 0 and state.avg_px > 0:
+                qty = state.margin * state.leverage / state.avg_px
+            else:
+                logger.debug(
+                    f"⚠️ PortfolioRisk: нет нотионала для {symbol}, позиция пропущена"
+                )
+                self.remove_position(symbol)
+                continue
+            self.upsert_position(
+                symbol,
+                state.side,
+                qty,
+                state.avg_px,
+                leverage=state.leverage,
+                margin=state.margin,
+                liquidation_price=state.liq_px,
+                mark_price=state.mark_px,
+            )
+
+    def set_correlation_source(self, source: Any) -> None:
+        """
+        Матрица корреляций для стресс-сценариев.
+
+        Args:
+            source: RollingCorrelationMatrix (symbols / as_array / ready) или
+                callable, возвращающий ее (матрицу могут пересоздавать)
+        """
+        self._correlation_source = source if callable(source) else (lambda: source)
+        self._corr_key = None
+        self._report = None
+
+    # ==================== РАСЧЕТ ====================
+
+    def evaluate(
+        self,
+        equity: Optional[float] = None,
+        prices: Optional[Sequence[float]] = None,
+    ) -> PortfolioRiskReport:
+        """
+        Риск всех позиций одним векторным проходом.
+
+        Args:
+            equity: Баланс счета (по умолчанию - последний из снимка)
+            prices: Вектор цен в порядке symbols (по умолчанию - последние)
+        """
+        if equity is None and prices is None and self._report is not None:
+            self.stats["cached_reads"] += 1
+            return self._report
+
+        n = self._n
+        side = self._side[:n]
+        qty = self._qty[:n]
+        entry = self._entry[:n]
+        lev = self._lev[:n]
+        mark = (
+            self._mark[:n].copy()
+            if prices is None
+            else np.asarray(prices, dtype=np.float64)
+        )
+        mark = np.where(mark > 0, mark, entry)
+        equity = self.equity if equity is None else float(equity)
+        mmr = self.maintenance_margin_ratio
+
+        notional = qty * mark
+        pnl = side * (mark - entry) * qty
+        margin = np.where(self._margin[:n] > 0, self._margin[:n], entry * qty / lev)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            margin_ratio = np.where(
+                margin > 0, (equity - margin + pnl) / margin, np.inf
+            )
+        formula_liq = np.where(
+            side > 0,
+            entry * (1 - 1 / lev + mmr) * 0.999,
+            entry * (1 + 1 / lev - mmr) * 1.001,
+        )
+        liq = np.where(self._liq[:n] > 0, self._liq[:n], formula_liq)
+        distance_pct = side * (mark - liq) / mark * 100.0
+
+        long_notional = float(notional[side > 0].sum())
+        short_notional = float(notional[side < 0].sum())
+        total_margin = float(margin.sum())
+        total_pnl = float(pnl.sum())
+        account_margin_ratio = (
+            (equity + total_pnl) / total_margin if total_margin > 0 else float("inf")
+        )
+
+        scenarios, worst = self._stress(side, qty, entry, mark, liq)
+        report = PortfolioRiskReport(
+            symbols=tuple(self._symbols),
+            side=side.copy(),
+            notional=notional,
+            pnl=pnl,
+            margin_used=margin,
+            margin_ratio=margin_ratio,
+            liquidation_price=liq,
+            distance_pct=distance_pct,
+            equity=equity,
+            long_notional=long_notional,
+            short_notional=short_notional,
+            total_margin=total_margin,
+            total_pnl=total_pnl,
+            account_margin_ratio=account_margin_ratio,
+            scenarios=scenarios,
+            worst_scenario=worst,
+            computed_at=time.time(),
+        )
+        self.stats["evaluations"] += 1
+        if prices is None and equity == self.equity:
+            self._report = report
+        return report
+
+    def position_risk(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Детали одной позиции из (кэшированного) отчета или None."""
+        if symbol not in self._index:
+            return None
+        return self.evaluate().position(symbol)
+
+    def has_position(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.stats)
+        stats["positions"] = self._n
+        report = self._report
+        if report is not None:
+            stats.update(
+                long_notional=round(report.long_notional, 2),
+                short_notional=round(report.short_notional, 2),
+                account_margin_ratio=round(report.account_margin_ratio, 3),
+                worst_scenario=report.worst_scenario,
+            )
+        return stats
+
+    def _stress(
+        self,
+        side: np.ndarray,
+        qty: np.ndarray,
+        entry: np.ndarray,
+        mark: np.ndarray,
+        liq: np.ndarray,
+    ) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+        """
+        Стресс-сценарии: матрица относительных сдвигов (сценарии x позиции).
+
+        - shift_down_X / shift_up_X: все цены на X%
+        - corr_<symbol>_down / _up: символ на correlated_shock_pct, остальные
+          на corr * shock (без матрицы - только сам символ)
+        """
+        n = len(side)
+        if n == 0:
+            return {}, None
+        names: List[str] = []
+        rows: List[np.ndarray] = []
+        for shock in self.shocks_pct:
+            for direction, label in ((-1.0, "down"), (1.0, "up")):
+                names.append(f"shift_{label}_{shock:g}")
+                rows.append(np.full(n, direction * shock / 100.0))
+        if self.correlated_shock_pct > 0:
+            corr = self._correlation_submatrix()
+            shock = self.correlated_shock_pct / 100.0
+            for direction, label in ((-1.0, "down"), (1.0, "up")):
+                names.extend(f"corr_{s}_{label}" for s in self._symbols)
+                rows.extend(direction * shock * corr)
+
+        shifts = np.vstack(rows)
+        prices = mark * (1.0 + shifts)
+        pnl = ((prices - entry) * side * qty).sum(axis=1)
+        breached = side * (prices - liq) <= 0
+        symbols = np.array(self._symbols, dtype=object)
+        scenarios = {
+            name: {
+                "pnl": float(pnl[k]),
+                "breaches": list(symbols[breached[k]]),
+            }
+            for k, name in enumerate(names)
+        }
+        return scenarios, names[int(np.argmin(pnl))]
+
+    def _correlation_submatrix(self) -> np.ndarray:
+        """Корреляции между открытыми позициями (кэш до смены состава/матрицы)."""
+        matrix = self._correlation_source() if self._correlation_source else None
+        ready = bool(matrix is not None and getattr(matrix, "ready", True))
+        key = (
+            id(matrix) if ready else None,
+            getattr(matrix, "last_timestamp", None) if ready else None,
+            tuple(self._symbols),
+        )
+        if key == self._corr_key and self._corr_sub is not None:
+            return self._corr_sub
+        n = self._n
+        sub = np.eye(n)
+        if ready:
+            full = matrix.as_array()
+            index = {s: k for k, s in enumerate(matrix.symbols)}
+            rows = np.array([index.get(s, -1) for s in self._symbols])
+            known = np.flatnonzero(rows >= 0)
+            if len(known):
+                block = full[np.ix_(rows[known], rows[known])]
+                sub[np.ix_(known, known)] = np.nan_to_num(block, nan=0.0)
+                np.fill_diagonal(sub, 1.0)
+        self._corr_key = key
+        self._corr_sub = sub
+        return sub
+
+    # ==================== ХРАНЕНИЕ ====================
+
+    def _alloc(self, capacity: int) -> None:
+        self._side = np.zeros(capacity)
+        self._qty = np.zeros(capacity)
+        self._entry = np.zeros(capacity)
+        self._lev = np.zeros(capacity)
+        self._margin = np.zeros(capacity)
+        self._liq = np.zeros(capacity)
+        self._mark = np.zeros(capacity)
+
+    def _columns(self) -> Tuple[np.ndarray, ...]:
+        return (
+            self._side,
+            self._qty,
+            self._entry,
+            self._lev,
+            self._margin,
+            self._liq,
+            self._mark,
+        )
+
+    def _grow(self) -> None:
+        old = self._columns()
+        self._alloc(len(self._qty) * 2)
+        for new, column in zip(self._columns(), old):
+            new[: len(column)] = column
@@ -43,6 +43,8 @@ class FuturesRiskManager:
         max_size_limiter: Optional[MaxSizeLimiter] = None,
         orchestrator: Optional[Any] = None,
         data_registry=None,  # вњ… РќРћР’РћР•: DataRegistry РґР»СЏ С‡С‚РµРЅРёСЏ Р±Р°Р»Р°РЅСЃР°
+        account_state=None,  # AccountStateCache: баланс/позиции из private WS
+        portfolio_risk=None,  # PortfolioRiskEngine: векторный риск всех позиций
     ):
         """
         Args:
@@ -66,6 +68,8 @@ class FuturesRiskManager:
         self.orchestrator = orchestrator  # вњ… Р Р•Р¤РђРљРўРћР РРќР“: Р”Р»СЏ РґРѕСЃС‚СѓРїР° Рє РјРµС‚РѕРґР°Рј orchestrator
         # вњ… РќРћР’РћР•: DataRegistry РґР»СЏ С‡С‚РµРЅРёСЏ Р±Р°Р»Р°РЅСЃР°
         self.data_registry = data_registry
+        self.account_state = account_state
+        self.portfolio_risk = portfolio_risk
 
         # РџРѕР»СѓС‡Р°РµРј symbol_profiles РёР· config_manager
         self.symbol_profiles = config_manager.get_symbol_profiles()
@@ -181,6 +185,8 @@ class FuturesRiskManager:
         if self.orchestrator and hasattr(self.orchestrator, "_get_used_margin"):
             return await self.orchestrator._get_used_margin()
         # Fallback: РїРѕР»СѓС‡Р°РµРј РЅР°РїСЂСЏРјСѓСЋ
+        if self.account_state:
+            return await self.account_state.get_used_margin()
         try:
             exchange_positions = await self.client.get_positions()
             if not exchange_positions:
@@ -760,6 +766,8 @@ class FuturesRiskManager:
                         )
 
                 # Fallback: РµСЃР»Рё DataRegistry РЅРµ РґРѕСЃС‚СѓРїРµРЅ РёР»Рё РЅРµС‚ РґР°РЅРЅС‹С…
+                if balance is None and self.account_state:
+                    balance = await self.account_state.get_equity()
                 if balance is None:
                     if self.client:
                         try:
@@ -1825,6 +1833,12 @@ class FuturesRiskManager:
             )
             return 0.0
 
+    def get_position_risk(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Риск открытой позиции из PortfolioRiskEngine (None - нет данных)."""
+        if not self.portfolio_risk:
+            return None
+        return self.portfolio_risk.position_risk(symbol)
+
     async def check_margin_safety(
         self,
         position_size_usd: float,
@@ -1898,7 +1912,16 @@ class FuturesRiskManager:
             # REST fallback С‚РѕР»СЊРєРѕ РµСЃР»Рё WS margin == 0 (РЅРѕРІР°СЏ РїРѕР·РёС†РёСЏ, WS РµС‰С‘ РЅРµ РѕР±РЅРѕРІРёР»СЃСЏ).
             try:
                 ws_margin = 0.0
-                if self.orchestrator and hasattr(self.orchestrator, "active_positions"):
+                position_risk = (
+                    self.portfolio_risk.position_risk(symbol)
+                    if self.portfolio_risk
+                    else None
+                )
+                if position_risk and position_risk["margin_used"] > 0:
+                    margin = position_risk["margin_used"]
+                elif self.orchestrator and hasattr(
+                    self.orchestrator, "active_positions"
+                ):
                     pos_data = self.orchestrator.active_positions.get(symbol, {})
                     ws_margin = float(pos_data.get("margin", 0) or 0)
                     if ws_margin > 0:
@@ -1909,7 +1932,11 @@ class FuturesRiskManager:
 
                 # REST fallback: С‚РѕР»СЊРєРѕ РµСЃР»Рё WS margin РЅРµ РїСЂРёС€С‘Р» РµС‰С‘
                 if (margin is None or margin == 0) and self.client:
-                    positions_data = await self.client.get_positions()
+                    positions_data = (
+                        await self.account_state.get_positions(symbol)
+                        if self.account_state
+                        else await self.client.get_positions()
+                    )
                     if positions_data:
                         for pos in positions_data:
                             if pos.get("instId") == f"{symbol}-SWAP":
@@ -1947,11 +1974,13 @@ class FuturesRiskManager:
                 "margin": margin,
             }
             # Р’С‹Р·С‹РІР°РµРј check_liquidation_risk СЃ РїСЂР°РІРёР»СЊРЅС‹РјРё Р°СЂРіСѓРјРµРЅС‚Р°РјРё
-            return await self.liquidation_protector.check_liquidation_risk(
+            # Протектор возвращает (is_safe, details); кортеж всегда truthy
+            is_safe, _ = await self.liquidation_protector.check_liquidation_risk(
                 symbol=symbol,
                 position=position,
                 balance=margin,
             )
+            return is_safe
         except Exception as e:
             logger.error(f"вќЊ Error checking liquidation risk: {e}")
             return False
@@ -0,0 +1,28 @@
+"""
+Sharding - запуск стратегии в нескольких процессах с общими рыночными данными.
+
+Модули:
+- market_bus: Слоты рыночных данных в shared memory (seqlock, версии секций)
+- market_feed: Процесс market-data - публичный WebSocket -> шина
+- bus_consumer: Воркер - шина -> обработчики WebSocketCoordinator
+- shard_plan: Распределение символов и суб-аккаунтов по воркерам
+- supervisor: Перезапуск упавших процессов-воркеров
+"""
+
+from .bus_consumer import MarketBusConsumer
+from .market_bus import MarketBusError, MarketBusReader, MarketBusWriter
+from .market_feed import MarketDataFeed
+from .shard_plan import WorkerShard, check_accounts, plan_shards
+from .supervisor import WorkerSupervisor
+
+__all__ = [
+    "MarketBusConsumer",
+    "MarketBusError",
+    "MarketBusReader",
+    "MarketBusWriter",
+    "MarketDataFeed",
+    "WorkerShard",
+    "WorkerSupervisor",
+    "check_accounts",
+    "plan_shards",
+]
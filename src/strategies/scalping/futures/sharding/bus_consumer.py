@@ -0,0 +1,192 @@
+"""
+MarketBusConsumer - воркер: MarketBus -> WebSocketCoordinator.
+
+Опрашивает слоты своих символов и для изменившихся секций вызывает те же
+обработчики, что и публичный WebSocket (handle_candle_data,
+handle_mark_price_data, handle_trades_data, handle_book_data,
+handle_ticker_data) с payload в формате OKX. Сделки берутся из кольца
+слота - все, что новее прочитанного счетчика.
+Вся стратегия воркера (допуск тикеров, ADX, TP/SL, сигналы) работает без
+изменений, только на своем наборе символов.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from .market_bus import BusSnapshot, MarketBusReader
+
+# Порядок применения: закрытая свеча -> формирующаяся -> mark -> сделки ->
+# стакан -> тикер, чтобы тикер (он запускает проверку сигналов) видел свежие
+# свечи и trade-свечи
+_REPLAY_ORDER = (
+    "candle1m_closed",
+    "candle1m",
+    "candle5m_closed",
+    "candle5m",
+    "mark",
+    "trades",
+    "book",
+    "ticker",
+)
+
+
+class MarketBusConsumer:
+    """Опрос MarketBus и доставка обновлений в координатор."""
+
+    def __init__(
+        self,
+        reader: MarketBusReader,
+        coordinator: Any,
+        symbols: Sequence[str],
+        poll_interval: float = 0.005,
+    ):
+        self.reader = reader
+        self.coordinator = coordinator
+        self.symbols: List[str] = [s for s in symbols if reader.has_symbol(s)]
+        self.poll_interval = poll_interval
+        self._seen: Dict[str, Dict[str, int]] = {s: {} for s in self.symbols}
+        # Счетчик кольца сделок, до которого сделки уже доставлены
+        self._trade_counts: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "polls": 0,
+            "updates": 0,
+            "errors": 0,
+            "trades_lost": 0,
+        }
+        missing = sorted(set(symbols) - set(self.symbols))
+        if missing:
+            logger.warning(
+                f"⚠️ MarketBusConsumer: символов нет в шине {reader.name}: {missing}"
+            )
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"✅ MarketBusConsumer: {len(self.symbols)} символов из шины "
+                f"{self.reader.name} (poll={self.poll_interval * 1000:.0f}ms)"
+            )
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self.reader.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.debug(f"⚠️ MarketBusConsumer: ошибка опроса шины: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll_once(self) -> int:
+        """Применить изменившиеся секции всех символов. Возвращает число секций."""
+        self.stats["polls"] += 1
+        applied = 0
+        for symbol in self.symbols:
+            snapshot = self.reader.read(symbol)
+            if snapshot is None:
+                continue
+            seen = self._seen[symbol]
+            for section in _REPLAY_ORDER:
+                version = snapshot.version(section)
+                if not version or seen.get(section) == version:
+                    continue
+                seen[section] = version
+                if section == "trades":
+                    await self._apply_trades(symbol, snapshot)
+                else:
+                    await self._apply(symbol, section, snapshot.section(section))
+                applied += 1
+        self.stats["updates"] += applied
+        return applied
+
+    async def _apply_trades(self, symbol: str, snapshot: BusSnapshot) -> None:
+        since = self._trade_counts.get(symbol)
+        if since is None:
+            # Первое чтение (старт или перезапуск воркера): старые сделки из
+            # кольца не доставляем, только следующие
+            self._trade_counts[symbol] = snapshot.trades(0)[1]
+            return
+        trades, count, lost = snapshot.trades(since)
+        self._trade_counts[symbol] = count
+        if lost:
+            self.stats["trades_lost"] += lost
+        if not trades:
+            return
+        inst_id = f"{symbol}-SWAP"
+        rows = [
+            {
+                "instId": inst_id,
+                "ts": int(ts),
+                "px": px,
+                "sz": sz,
+                "side": "buy" if side > 0 else "sell",
+            }
+            for ts, px, sz, side in trades
+        ]
+        await self.coordinator.handle_trades_data(
+            symbol, {"arg": {"channel": "trades", "instId": inst_id}, "data": rows}
+        )
+
+    async def _apply(self, symbol: str, section: str, values: Dict[str, float]) -> None:
+        inst_id = f"{symbol}-SWAP"
+        if section == "book":
+            self.coordinator.handle_book_data(
+                {
+                    "arg": {"channel": "bbo-tbt", "instId": inst_id},
+                    "data": [
+                        {
+                            "bids": [[values["bidPx"], values["bidSz"]]],
+                            "asks": [[values["askPx"], values["askSz"]]],
+                            "ts": values["ts"],
+                        }
+                    ],
+                }
+            )
+        elif section == "ticker":
+            ticker = dict(values)
+            ticker["instId"] = inst_id
+            await self.coordinator.handle_ticker_data(
+                symbol,
+                {"arg": {"channel": "tickers", "instId": inst_id}, "data": [ticker]},
+            )
+        elif section == "mark":
+            await self.coordinator.handle_mark_price_data(
+                {
+                    "arg": {"channel": "mark-price", "instId": inst_id},
+                    "data": [{"instId": inst_id, **values}],
+                }
+            )
+        else:
+            channel = section.replace("_closed", "")
+            row = [
+                values["ts"],
+                values["o"],
+                values["h"],
+                values["l"],
+                values["c"],
+                values["vol"],
+                values["volCcy"],
+                0.0,
+                "1" if values["confirm"] >= 1.0 else "0",
+            ]
+            await self.coordinator.handle_candle_data(
+                symbol,
+                {"arg": {"channel": channel, "instId": inst_id}, "data": [row]},
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "reader": dict(self.reader.stats)}
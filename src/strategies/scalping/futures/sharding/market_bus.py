@@ -0,0 +1,301 @@
+"""
+MarketBus - рыночные данные в shared memory для процессов-воркеров.
+
+Один процесс market-data (писатель) держит публичный WebSocket и пишет
+последнее состояние символа в слот сегмента multiprocessing.shared_memory.
+Воркеры (читатели) подключаются к сегменту по имени и читают слоты без
+IPC-вызовов и копирования через pipe:
+- Слот фиксированного размера на символ: тикер, mark price, свечи 1m/5m
+  (формирующаяся и последняя закрытая), лучшие bid/ask стакана и кольцо
+  последних сделок (TRADE_RING штук со сквозным счетчиком - читатель берет
+  сделки новее прочитанного счетчика)
+- Версия у каждой секции - читатель применяет только изменившиеся секции
+- Seqlock на слот: единственный писатель делает seq нечетным на время
+  записи, читатель повторяет чтение, если seq нечетный или изменился
+"""
+
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_MAGIC = b"SCALPBUS"
+_LAYOUT_VERSION = 2
+# magic, layout version, slot count, slot size, name size
+_HEADER = struct.Struct("<8sIIII")
+_NAME_SIZE = 32
+
+# Секции слота и их поля (все значения - float64)
+TICKER_FIELDS = (
+    "last",
+    "bidPx",
+    "askPx",
+    "vol24h",
+    "volCcy24h",
+    "high24h",
+    "low24h",
+    "open24h",
+    "ts",
+)
+MARK_FIELDS = ("markPx", "ts")
+# Формат OKX kline: [ts, o, h, l, c, vol, volCcy, confirm]
+CANDLE_FIELDS = ("ts", "o", "h", "l", "c", "vol", "volCcy", "confirm")
+BOOK_FIELDS = ("bidPx", "bidSz", "askPx", "askSz", "ts")
+# Сделка в кольце: side 1.0 - buy, -1.0 - sell
+TRADE_FIELDS = ("ts", "px", "sz", "side")
+TRADE_RING = 64
+
+SECTIONS = (
+    ("ticker", TICKER_FIELDS),
+    ("mark", MARK_FIELDS),
+    ("candle1m", CANDLE_FIELDS),
+    ("candle1m_closed", CANDLE_FIELDS),
+    ("candle5m", CANDLE_FIELDS),
+    ("candle5m_closed", CANDLE_FIELDS),
+    ("book", BOOK_FIELDS),
+    (
+        "trades",
+        ("count",)
+        + tuple(f"{name}{i}" for i in range(TRADE_RING) for name in TRADE_FIELDS),
+    ),
+)
+SECTION_NAMES = tuple(name for name, _ in SECTIONS)
+_SECTION_INDEX = {name: i for i, name in enumerate(SECTION_NAMES)}
+
+_SECTION_OFFSETS: Dict[str, Tuple[int, int]] = {}
+_offset = 0
+for _name, _fields in SECTIONS:
+    _SECTION_OFFSETS[_name] = (_offset, len(_fields))
+    _offset += len(_fields)
+_VALUE_COUNT = _offset
+del _offset, _name, _fields
+
+# seq + версия каждой секции + значения
+_SLOT = struct.Struct(f"<{1 + len(SECTIONS)}Q{_VALUE_COUNT}d")
+_SEQ = struct.Struct("<Q")
+SLOT_SIZE = _SLOT.size
+
+
+class MarketBusError(RuntimeError):
+    """Сегмент не найден или несовместим с текущей версией формата."""
+
+
+def _slot_offset(header_size: int, slot: int) -> int:
+    return header_size + slot * SLOT_SIZE
+
+
+def _header_size(slot_count: int) -> int:
+    return _HEADER.size + slot_count * _NAME_SIZE
+
+
+class MarketBusWriter:
+    """
+    Писатель шины (процесс market-data).
+
+    Держит локальную копию слотов: обновление секции = правка копии +
+    одна запись слота целиком под seqlock.
+    """
+
+    def __init__(self, name: str, symbols: Sequence[str]):
+        self.name = name
+        self.symbols: List[str] = list(symbols)
+        self._slots = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._header_size = _header_size(len(self.symbols))
+        size = self._header_size + len(self.symbols) * SLOT_SIZE
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Сегмент от упавшего прошлого запуска - пересоздаем
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        buf = self._shm.buf
+        buf[: self._header_size] = bytes(self._header_size)
+        for i, symbol in enumerate(self.symbols):
+            encoded = symbol.encode("utf-8")[:_NAME_SIZE]
+            start = _HEADER.size + i * _NAME_SIZE
+            buf[start : start + len(encoded)] = encoded
+        # Записываем заголовок последним: читатель видит magic только у готового сегмента
+        _HEADER.pack_into(
+            buf, 0, _MAGIC, _LAYOUT_VERSION, len(self.symbols), SLOT_SIZE, _NAME_SIZE
+        )
+        self._seq = [0] * len(self.symbols)
+        self._versions = [[0] * len(SECTIONS) for _ in self.symbols]
+        self._values = [[0.0] * _VALUE_COUNT for _ in self.symbols]
+
+    def publish(self, symbol: str, section: str, values: Sequence[float]) -> bool:
+        """
+        Записать секцию символа.
+
+        Returns:
+            False если символ не входит в шину
+        """
+        slot = self._slots.get(symbol)
+        if slot is None:
+            return False
+        start, count = _SECTION_OFFSETS[section]
+        self._values[slot][start : start + count] = values
+        self._write(slot, section)
+        return True
+
+    def publish_trades(
+        self, symbol: str, trades: Sequence[Tuple[float, float, float, float]]
+    ) -> bool:
+        """
+        Дописать сделки (ts, px, sz, side) в кольцо символа одной записью слота.
+
+        Returns:
+            False если символ не входит в шину
+        """
+        slot = self._slots.get(symbol)
+        if slot is None:
+            return False
+        if not trades:
+            return True
+        start, _ = _SECTION_OFFSETS["trades"]
+        slot_values = self._values[slot]
+        count = int(slot_values[start])
+        if len(trades) > TRADE_RING:
+            # В кольцо помещаются только последние - счетчик учитывает все
+            count += len(trades) - TRADE_RING
+            trades = trades[-TRADE_RING:]
+        width = len(TRADE_FIELDS)
+        for trade in trades:
+            pos = start + 1 + (count % TRADE_RING) * width
+            slot_values[pos : pos + width] = trade
+            count += 1
+        slot_values[start] = float(count)
+        self._write(slot, "trades")
+        return True
+
+    def _write(self, slot: int, section: str) -> None:
+        versions = self._versions[slot]
+        versions[_SECTION_INDEX[section]] += 1
+        buf = self._shm.buf
+        offset = _slot_offset(self._header_size, slot)
+        seq = self._seq[slot] + 1
+        _SEQ.pack_into(buf, offset, seq)
+        _SLOT.pack_into(buf, offset, seq, *versions, *self._values[slot])
+        seq += 1
+        _SEQ.pack_into(buf, offset, seq)
+        self._seq[slot] = seq
+
+    def close(self, unlink: bool = True) -> None:
+        self._shm.close()
+        if unlink:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class BusSnapshot:
+    """Согласованный снимок слота: версии секций и значения."""
+
+    __slots__ = ("symbol", "versions", "values")
+
+    def __init__(self, symbol: str, versions: Tuple[int, ...], values: Tuple):
+        self.symbol = symbol
+        self.versions = versions
+        self.values = values
+
+    def version(self, section: str) -> int:
+        return self.versions[_SECTION_INDEX[section]]
+
+    def section(self, section: str) -> Dict[str, float]:
+        start, count = _SECTION_OFFSETS[section]
+        fields = SECTIONS[_SECTION_INDEX[section]][1]
+        return dict(zip(fields, self.values[start : start + count]))
+
+    def trades(self, since: int) -> Tuple[List[Tuple[float, ...]], int, int]:
+        """
+        Сделки кольца новее счетчика since.
+
+        Returns:
+            (сделки по порядку записи, текущий счетчик, потеряно - читатель
+            отстал больше чем на TRADE_RING сделок)
+        """
+        start, _ = _SECTION_OFFSETS["trades"]
+        count = int(self.values[start])
+        new = count - since
+        if new <= 0:
+            return [], count, 0
+        kept = min(new, TRADE_RING)
+        width = len(TRADE_FIELDS)
+        rows = []
+        for k in range(count - kept, count):
+            pos = start + 1 + (k % TRADE_RING) * width
+            rows.append(tuple(self.values[pos : pos + width]))
+        return rows, count, new - kept
+
+
+class MarketBusReader:
+    """Читатель шины (процесс-воркер). Символы берутся из заголовка сегмента."""
+
+    def __init__(self, name: str, max_retries: int = 64):
+        self.name = name
+        self.max_retries = max_retries
+        try:
+            self._shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError as e:
+            raise MarketBusError(f"Сегмент {name} не найден") from e
+        # Воркеры - дочерние процессы писателя и делят с ним resource_tracker,
+        # поэтому unlink сегмента остается за писателем (MarketBusWriter.close)
+        buf = self._shm.buf
+        magic, layout, slot_count, slot_size, name_size = _HEADER.unpack_from(buf, 0)
+        if (
+            magic != _MAGIC
+            or layout != _LAYOUT_VERSION
+            or slot_size != SLOT_SIZE
+            or name_size != _NAME_SIZE
+        ):
+            self._shm.close()
+            raise MarketBusError(
+                f"Сегмент {name} несовместим (layout={layout}, slot={slot_size})"
+            )
+        self._header_size = _header_size(slot_count)
+        self.symbols: List[str] = []
+        for i in range(slot_count):
+            start = _HEADER.size + i * _NAME_SIZE
+            raw = bytes(buf[start : start + _NAME_SIZE])
+            self.symbols.append(raw.rstrip(b"\x00").decode("utf-8"))
+        self._slots = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.stats = {"reads": 0, "retries": 0, "torn": 0}
+
+    def has_symbol(self, symbol: str) -> bool:
+        return symbol in self._slots
+
+    def read(self, symbol: str) -> Optional[BusSnapshot]:
+        """
+        Прочитать слот символа.
+
+        Returns:
+            None если символа нет в шине, в слот еще ничего не писали или
+            писатель не отпустил слот за max_retries попыток
+        """
+        slot = self._slots.get(symbol)
+        if slot is None:
+            return None
+        buf = self._shm.buf
+        offset = _slot_offset(self._header_size, slot)
+        self.stats["reads"] += 1
+        for _ in range(self.max_retries):
+            seq = _SEQ.unpack_from(buf, offset)[0]
+            if seq & 1:
+                self.stats["retries"] += 1
+                continue
+            record = _SLOT.unpack_from(buf, offset)
+            if _SEQ.unpack_from(buf, offset)[0] != seq or record[0] != seq:
+                self.stats["retries"] += 1
+                continue
+            if seq == 0:
+                return None
+            section_count = len(SECTIONS)
+            return BusSnapshot(
+                symbol, record[1 : 1 + section_count], record[1 + section_count :]
+            )
+        self.stats["torn"] += 1
+        return None
+
+    def close(self) -> None:
+        self._shm.close()
@@ -0,0 +1,260 @@
+"""
+MarketDataFeed - процесс market-data: публичный WebSocket -> MarketBus.
+
+Единственное публичное WS-подключение на все символы всех воркеров:
+tickers, mark-price, свечи 1m/5m, сделки (trades - свечи из сделок и order
+flow воркеров) и лучшие цены стакана (bbo-tbt - ведение лимитных входов)
+пишутся в слоты шины как есть (без стратегии), поэтому число соединений с
+биржей не растет с числом воркеров.
+
+У воркеров нет своего публичного WS (auto_reconnect/force_reconnect в роли
+worker ничего не делают), поэтому за свежесть данных отвечает этот процесс:
+supervise() проверяет соединение и время последнего сообщения и
+переподключается, пока поток не восстановится.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from .market_bus import MarketBusWriter
+
+_KLINE_CHANNELS = ("candle1m", "candle5m")
+
+
+def _float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class MarketDataFeed:
+    """Подписка на публичные каналы и публикация в MarketBus."""
+
+    def __init__(
+        self,
+        ws_manager,
+        writer: MarketBusWriter,
+        symbols: Sequence[str],
+        trades: bool = True,
+        book_channel: Optional[str] = "bbo-tbt",
+    ):
+        """
+        Args:
+            ws_manager: Публичный FuturesWebSocketManager
+            writer: Писатель шины
+            symbols: Символы всех воркеров
+            trades: Транслировать канал trades
+            book_channel: Канал лучших цен (bbo-tbt / books5), None - не нужен
+        """
+        self.ws_manager = ws_manager
+        self.writer = writer
+        self.symbols: List[str] = list(symbols)
+        self.trades = trades
+        self.book_channel = book_channel
+        self.stats: Dict[str, int] = {
+            "ticker": 0,
+            "mark": 0,
+            "candle": 0,
+            "trades": 0,
+            "book": 0,
+            "dropped": 0,
+            "stale_checks": 0,
+            "reconnects": 0,
+        }
+        self.last_message_at = time.monotonic()
+
+    async def start(self) -> bool:
+        """Подключиться и подписаться на каналы всех символов."""
+        if not await self.ws_manager.connect():
+            logger.warning("⚠️ MarketDataFeed: не удалось подключиться к WebSocket")
+            return False
+        for symbol in self.symbols:
+            inst_id = f"{symbol}-SWAP"
+            await self.ws_manager.subscribe(
+                channel="tickers", inst_id=inst_id, callback=self.on_ticker
+            )
+            await self.ws_manager.subscribe(
+                channel="mark-price", inst_id=inst_id, callback=self.on_mark_price
+            )
+            for channel in _KLINE_CHANNELS:
+                await self.ws_manager.subscribe(
+                    channel=channel, inst_id=inst_id, callback=self.on_candle
+                )
+            if self.trades:
+                await self.ws_manager.subscribe(
+                    channel="trades", inst_id=inst_id, callback=self.on_trades
+                )
+            if self.book_channel:
+                await self.ws_manager.subscribe(
+                    channel=self.book_channel, inst_id=inst_id, callback=self.on_book
+                )
+        logger.info(
+            f"📡 MarketDataFeed: {len(self.symbols)} символов -> шина {self.writer.name} "
+            f"(trades={'да' if self.trades else 'нет'}, "
+            f"стакан={self.book_channel or 'нет'})"
+        )
+        return True
+
+    async def check_health(
+        self, stale_after: float, now: Optional[float] = None
+    ) -> bool:
+        """
+        Проверить поток данных и переподключиться при разрыве или тишине.
+
+        Returns:
+            True если поток в порядке
+        """
+        now = time.monotonic() if now is None else now
+        silence = now - self.last_message_at
+        connected = bool(getattr(self.ws_manager, "connected", False))
+        if connected and silence <= stale_after:
+            return True
+        self.stats["stale_checks"] += 1
+        reason = (
+            "WebSocket отключен"
+            if not connected
+            else f"нет данных {silence:.0f}с (порог {stale_after:.0f}с)"
+        )
+        logger.warning(f"⚠️ MarketDataFeed: {reason}, переподключение")
+        try:
+            # force_reconnect сбрасывает счетчик попыток: после исчерпанных
+            # попыток автопереподключения поток все равно восстанавливается
+            if await self.ws_manager.force_reconnect(f"MarketDataFeed: {reason}"):
+                self.stats["reconnects"] += 1
+        except Exception as e:
+            logger.error(f"❌ MarketDataFeed: ошибка переподключения: {e}")
+        return False
+
+    async def supervise(
+        self, stale_after: float = 30.0, check_interval: float = 5.0
+    ) -> None:
+        """Фоновый контроль свежести потока (до отмены задачи)."""
+        self.last_message_at = time.monotonic()
+        while True:
+            await asyncio.sleep(check_interval)
+            await self.check_health(stale_after)
+
+    async def stop(self) -> None:
+        try:
+            await self.ws_manager.disconnect()
+        except Exception as e:
+            logger.debug(f"⚠️ MarketDataFeed: ошибка отключения WebSocket: {e}")
+
+    @staticmethod
+    def _symbol(data: dict, item: Optional[dict] = None) -> str:
+        inst_id = data.get("arg", {}).get("instId", "")
+        if not inst_id and item:
+            inst_id = item.get("instId", "")
+        return inst_id.replace("-SWAP", "")
+
+    async def on_ticker(self, data: dict) -> None:
+        rows = data.get("data") or []
+        if not rows:
+            return
+        item = rows[0]
+        last = _float(item.get("last"))
+        if last <= 0:
+            return
+        values = (
+            last,
+            _float(item.get("bidPx"), last),
+            _float(item.get("askPx"), last),
+            _float(item.get("vol24h")),
+            _float(item.get("volCcy24h")),
+            _float(item.get("high24h"), last),
+            _float(item.get("low24h"), last),
+            _float(item.get("open24h"), last),
+            _float(item.get("ts"), time.time() * 1000),
+        )
+        self._publish(self._symbol(data, item), "ticker", values)
+
+    async def on_mark_price(self, data: dict) -> None:
+        rows = data.get("data") or []
+        if not rows:
+            return
+        item = rows[0]
+        mark_px = _float(item.get("markPx"))
+        if mark_px <= 0:
+            return
+        values = (mark_px, _float(item.get("ts"), time.time() * 1000))
+        self._publish(self._symbol(data, item), "mark", values)
+
+    async def on_candle(self, data: dict) -> None:
+        channel = data.get("arg", {}).get("channel", "")
+        rows = data.get("data") or []
+        if channel not in _KLINE_CHANNELS or not rows or len(rows[0]) < 6:
+            return
+        row = rows[0]
+        values = (
+            _float(row[0]),
+            _float(row[1]),
+            _float(row[2]),
+            _float(row[3]),
+            _float(row[4]),
+            _float(row[5]),
+            _float(row[6]) if len(row) > 6 else 0.0,
+            _float(row[8]) if len(row) > 8 else 0.0,
+        )
+        symbol = self._symbol(data)
+        self._publish(symbol, channel, values, stat="candle")
+        if values[7] >= 1.0:
+            # Закрытую свечу храним отдельно: следующая формирующаяся свеча
+            # перезапишет секцию раньше, чем воркер успеет ее прочитать
+            self._publish(symbol, f"{channel}_closed", values, stat="candle")
+
+    async def on_trades(self, data: dict) -> None:
+        rows = data.get("data") or []
+        if not rows:
+            return
+        trades = []
+        for row in rows:
+            price = _float(row.get("px"))
+            size = _float(row.get("sz"))
+            if price <= 0 or size <= 0:
+                continue
+            side = 1.0 if str(row.get("side", "")).lower() == "buy" else -1.0
+            trades.append((_float(row.get("ts")), price, size, side))
+        if not trades:
+            return
+        # OKX может прислать пачку от новых к старым
+        trades.sort(key=lambda trade: trade[0])
+        self.last_message_at = time.monotonic()
+        if self.writer.publish_trades(self._symbol(data, rows[0]), trades):
+            self.stats["trades"] += len(trades)
+        else:
+            self.stats["dropped"] += 1
+
+    async def on_book(self, data: dict) -> None:
+        rows = data.get("data") or []
+        if not rows:
+            return
+        book = rows[0]
+        try:
+            bid = book["bids"][0]
+            ask = book["asks"][0]
+            values = (
+                float(bid[0]),
+                float(bid[1]),
+                float(ask[0]),
+                float(ask[1]),
+                _float(book.get("ts"), time.time() * 1000),
+            )
+        except (KeyError, IndexError, TypeError, ValueError):
+            return
+        self._publish(self._symbol(data), "book", values)
+
+    def _publish(
+        self, symbol: str, section: str, values: Sequence[float], stat: str = ""
+    ) -> None:
+        self.last_message_at = time.monotonic()
+        if self.writer.publish(symbol, section, values):
+            self.stats[stat or section] += 1
+        else:
+            self.stats["dropped"] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
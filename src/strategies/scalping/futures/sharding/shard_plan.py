@@ -0,0 +1,99 @@
+"""
+ShardPlan - распределение символов по процессам-воркерам.
+
+Каждый воркер получает свой набор символов и (опционально) свой
+суб-аккаунт из секции api конфига. Символы раскладываются жадно по весу
+(самый тяжелый - в наименее загруженный воркер), чтобы нагрузка на ядра
+была ровной; результат детерминирован для одинакового входа.
+
+Несколько воркеров запускаются только на разных аккаунтах (check_accounts):
+воркер загружает и ведет все позиции своего аккаунта, а лимиты позиций и
+риска считает сам - на общем аккаунте воркеры вели бы позиции чужих символов
+без рыночных данных по ним, а лимиты складывались бы.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+
+@dataclass
+class WorkerShard:
+    """Набор символов и аккаунт одного воркера."""
+
+    index: int
+    symbols: List[str] = field(default_factory=list)
+    account: Optional[str] = None
+    weight: float = 0.0
+
+
+def plan_shards(
+    symbols: Sequence[str],
+    workers: int,
+    accounts: Optional[Sequence[str]] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> List[WorkerShard]:
+    """
+    Разложить символы по воркерам.
+
+    Args:
+        symbols: Активные символы
+        workers: Число воркеров (ограничивается числом символов)
+        accounts: Ключи секции api для воркеров по кругу (None - общий аккаунт)
+        weights: Относительная стоимость символа (по умолчанию 1.0)
+
+    Returns:
+        Непустые шарды в порядке index
+    """
+    if workers < 1:
+        raise ValueError(f"workers должно быть >= 1, получено {workers}")
+    unique = list(dict.fromkeys(symbols))
+    workers = max(1, min(workers, len(unique)))
+    weights = weights or {}
+    shards = [
+        WorkerShard(index=i, account=accounts[i % len(accounts)] if accounts else None)
+        for i in range(workers)
+    ]
+    ordered = sorted(
+        unique, key=lambda symbol: (-float(weights.get(symbol, 1.0)), symbol)
+    )
+    for symbol in ordered:
+        target = min(shards, key=lambda shard: (shard.weight, shard.index))
+        target.symbols.append(symbol)
+        target.weight += float(weights.get(symbol, 1.0))
+    return [shard for shard in shards if shard.symbols]
+
+
+def check_accounts(
+    shards: Sequence[WorkerShard], api: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Проверить, что у каждого воркера свой аккаунт.
+
+    Args:
+        shards: Шарды из plan_shards
+        api: Секция api конфига (проверяются ключи и api_key аккаунтов)
+
+    Raises:
+        ValueError: Воркеров несколько, а аккаунт общий или не найден
+    """
+    if len(shards) < 2:
+        return
+    accounts = [shard.account or "okx" for shard in shards]
+    if len(set(accounts)) < len(accounts):
+        raise ValueError(
+            f"{len(shards)} воркеров на аккаунтах {accounts}: каждому воркеру "
+            f"нужен свой аккаунт (scalping.sharding.accounts)"
+        )
+    if api is None:
+        return
+    keys: Dict[str, str] = {}
+    for account in accounts:
+        if account not in api:
+            raise ValueError(f"Аккаунт {account} не найден в секции api")
+        api_key = getattr(api[account], "api_key", None)
+        if api_key and api_key in keys:
+            raise ValueError(
+                f"Аккаунты {keys[api_key]} и {account} - один и тот же "
+                f"api_key: каждому воркеру нужен свой аккаунт"
+            )
+        keys[api_key] = account
@@ -0,0 +1,132 @@
+"""
+WorkerSupervisor - контроль процессов-воркеров шардированного запуска.
+
+Воркер, упавший с ошибкой (exitcode != 0), перезапускается на том же шарде
+с экспоненциальной задержкой: иначе его символы остаются без стратегии и
+без управления открытыми позициями до ручного перезапуска. Воркер,
+завершившийся штатно (exitcode 0, например аварийная остановка
+стратегии), не перезапускается.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from .shard_plan import WorkerShard
+
+
+@dataclass
+class _WorkerState:
+    shard: WorkerShard
+    process: Any
+    restarts: int = 0
+    restart_at: Optional[float] = None  # Когда перезапустить упавший воркер
+    started_at: float = 0.0
+    finished: bool = False  # Штатно завершен - не перезапускается
+
+
+class WorkerSupervisor:
+    """
+    Запуск и перезапуск процессов-воркеров.
+
+    Использование:
+        supervisor = WorkerSupervisor(shards, spawn=lambda shard: process)
+        supervisor.start()
+        supervisor.check()   # периодически из главного цикла
+    """
+
+    def __init__(
+        self,
+        shards: List[WorkerShard],
+        spawn: Callable[[WorkerShard], Any],
+        restart_delay: float = 5.0,
+        max_restart_delay: float = 300.0,
+        stable_after: float = 600.0,
+    ):
+        """
+        Args:
+            shards: Шарды воркеров
+            spawn: Создает и запускает процесс воркера для шарда
+            restart_delay: Задержка перед первым перезапуском (секунды)
+            max_restart_delay: Максимальная задержка (удваивается с каждым падением)
+            stable_after: Воркер, проработавший столько секунд, считается
+                стабильным - задержка сбрасывается к начальной
+        """
+        self.spawn = spawn
+        self.restart_delay = float(restart_delay)
+        self.max_restart_delay = float(max_restart_delay)
+        self.stable_after = float(stable_after)
+        self.workers: Dict[int, _WorkerState] = {
+            shard.index: _WorkerState(shard=shard, process=None) for shard in shards
+        }
+        self.stats = {"restarts": 0, "crashes": 0, "clean_exits": 0}
+
+    def start(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        for state in self.workers.values():
+            self._spawn(state, now)
+
+    def _spawn(self, state: _WorkerState, now: float) -> None:
+        state.process = self.spawn(state.shard)
+        state.started_at = now
+        state.restart_at = None
+
+    def check(self, now: Optional[float] = None) -> int:
+        """
+        Проверить воркеры и перезапустить упавшие, у которых истекла задержка.
+
+        Returns:
+            Количество перезапущенных воркеров
+        """
+        now = time.monotonic() if now is None else now
+        restarted = 0
+        for index, state in self.workers.items():
+            process = state.process
+            if state.finished or process is None or process.is_alive():
+                continue
+            if state.restart_at is None:
+                exitcode = process.exitcode
+                if exitcode == 0:
+                    state.finished = True
+                    self.stats["clean_exits"] += 1
+                    logger.warning(
+                        f"⚠️ Воркер #{index} завершился штатно - без перезапуска"
+                    )
+                    continue
+                if now - state.started_at >= self.stable_after:
+                    state.restarts = 0
+                delay = min(
+                    self.restart_delay * (2**state.restarts), self.max_restart_delay
+                )
+                state.restart_at = now + delay
+                self.stats["crashes"] += 1
+                logger.error(
+                    f"❌ Воркер #{index} упал (exitcode={exitcode}), "
+                    f"перезапуск через {delay:.0f}с"
+                )
+            if now >= state.restart_at:
+                state.restarts += 1
+                self.stats["restarts"] += 1
+                logger.info(
+                    f"🔄 Перезапуск воркера #{index} ({', '.join(state.shard.symbols)}), "
+                    f"попытка {state.restarts}"
+                )
+                self._spawn(state, now)
+                restarted += 1
+        return restarted
+
+    def processes(self) -> List[Any]:
+        return [
+            state.process
+            for state in self.workers.values()
+            if state.process is not None
+        ]
+
+    def alive(self) -> int:
+        return sum(process.is_alive() for process in self.processes())
+
+    def all_finished(self) -> bool:
+        """Все воркеры завершились штатно - перезапускать нечего."""
+        return all(state.finished for state in self.workers.values())
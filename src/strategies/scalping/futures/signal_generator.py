@@ -11,7 +11,8 @@ Futures Signal Generator для скальпинг стратегии.
 import copy
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np  # ✅ Для per-symbol ATR расчётов
 from loguru import logger
@@ -34,6 +35,7 @@ from .patterns.pattern_engine import PatternEngine
 from .signals.filter_manager import FilterManager
 from .signals.macd_signal_generator import MACDSignalGenerator
 from .signals.rsi_signal_generator import RSISignalGenerator
+from .signals.signal_model import Signal
 from .signals.trend_following_signal_generator import (
     TrendFollowingSignalGenerator,  # ✅ НОВОЕ (09.01.2026)
 )
@@ -267,7 +269,8 @@ class FuturesSignalGenerator:
 
         # ✅ РЕФАКТОРИНГ: FilterManager для координации всех фильтров
         self.filter_manager = FilterManager(
-            data_registry=self.data_registry
+            data_registry=self.data_registry,
+            planner_config=getattr(self.scalping_config, "filter_planner", None),
         )  # ✅ НОВОЕ: Передаем DataRegistry в FilterManager
 
         modules_config = getattr(self.config, "futures_modules", None)
@@ -394,14 +397,18 @@ class FuturesSignalGenerator:
         """
         try:
             from .analysis.direction_analyzer import DirectionAnalyzer
+            from .analysis.trend_state import TrendStateService
 
             self.direction_analyzer = DirectionAnalyzer(fast_adx=fast_adx)
+            # Направление по символу из потокового состояния свечей (кэш на бар)
+            self.trend_state = TrendStateService(self.direction_analyzer)
             logger.info(
                 "✅ SignalGenerator: DirectionAnalyzer инициализирован с FastADX"
             )
         except Exception as e:
             logger.warning(f"⚠️ Не удалось инициализировать DirectionAnalyzer: {e}")
             self.direction_analyzer = None
+            self.trend_state = None
 
     def set_structured_logger(self, structured_logger):
         """
@@ -635,6 +642,254 @@ class FuturesSignalGenerator:
             profiles[symbol] = normalized
         return profiles
 
+    def apply_config_reload(self, diff) -> None:
+        """
+        Применяет перезагруженный конфиг (ConfigHotReloader).
+
+        Фильтры получают новые секции futures_modules, regime managers -
+        пересобранные RegimeConfig; накопленное состояние модулей сохраняется.
+        """
+        if not self.config_manager:
+            return
+        self.config = self.config_manager.config
+        self.scalping_config = get_scalping_view(self.config)
+
+        if diff.touches("futures_modules"):
+            modules_config = getattr(self.config, "futures_modules", None)
+            for attr, section in (
+                ("funding_filter", "funding_filter"),
+                ("liquidity_filter", "liquidity_filter"),
+                ("order_flow_filter", "order_flow"),
+                ("volatility_filter", "volatility_filter"),
+            ):
+                filter_obj = getattr(self, attr, None)
+                new_cfg = getattr(modules_config, section, None)
+                if filter_obj is not None and new_cfg is not None:
+                    filter_obj.config = new_cfg
+            self.impulse_config = getattr(modules_config, "impulse_trading", None)
+
+        if self.adaptive_filter_params is not None:
+            self.adaptive_filter_params._cache.clear()
+
+        if diff.touches("scalping.adaptive_regime") and (
+            self.regime_manager or self.regime_managers
+        ):
+            adaptive_regime_config = getattr(
+                self.scalping_config, "adaptive_regime", None
+            )
+            regime_config, symbol_regime_configs = self._build_regime_configs(
+                adaptive_regime_config
+            )
+            if self.regime_manager:
+                self.regime_manager.apply_config(regime_config)
+            for symbol, manager in self.regime_managers.items():
+                if manager and symbol in symbol_regime_configs:
+                    manager.apply_config(symbol_regime_configs[symbol])
+
+        logger.info(f"🔄 SignalGenerator: конфиг v{diff.new_version} применён")
+
+    def _build_regime_configs(
+        self, adaptive_regime_config: Any
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Собирает RegimeConfig (общий + per-symbol) из секции adaptive_regime.
+
+        Используется при инициализации ARM и при горячей перезагрузке конфига.
+        """
+        from .adaptivity.regime_manager import RegimeConfig
+
+        adaptive_regime_dict = self._to_dict(adaptive_regime_config)
+        detection_dict = self._to_dict(adaptive_regime_dict.get("detection", {}))
+        symbol_profiles_raw = adaptive_regime_dict.get("symbol_profiles", {})
+        self.symbol_profiles = self._normalize_symbol_profiles(symbol_profiles_raw)
+
+        def extract_regime_params(regime_name: str) -> Dict[str, Any]:
+            return self._to_dict(adaptive_regime_dict.get(regime_name, {}) or {})
+
+        # ✅ ИСПРАВЛЕНИЕ: Сохраняем extract_regime_params для использования в фильтрах
+        self._extract_regime_params = extract_regime_params
+        self._adaptive_regime_dict = adaptive_regime_dict
+
+        from .adaptivity.regime_manager import (
+            IndicatorParameters,
+            ModuleParameters,
+            RegimeParameters,
+        )
+
+        def create_regime_params(
+            regime_name: str,
+            override: Optional[Dict[str, Any]] = None,
+        ) -> RegimeParameters:
+            params_dict = extract_regime_params(regime_name)
+            if override:
+                params_dict = self._deep_merge_dict(params_dict, override)
+            indicators_dict = params_dict.get("indicators", {})
+            modules_dict = params_dict.get("modules", {})
+
+            indicators = IndicatorParameters(
+                rsi_overbought=indicators_dict.get("rsi_overbought", 70),
+                rsi_oversold=indicators_dict.get("rsi_oversold", 30),
+                volume_threshold=indicators_dict.get("volume_threshold", 1.1),
+                sma_fast=indicators_dict.get("sma_fast", 10),
+                sma_slow=indicators_dict.get("sma_slow", 30),
+                ema_fast=indicators_dict.get("ema_fast", 10),
+                ema_slow=indicators_dict.get("ema_slow", 30),
+                atr_period=indicators_dict.get("atr_period", 14),
+                min_volatility_atr=indicators_dict.get("min_volatility_atr", 0.0005),
+            )
+
+            mtf_dict = modules_dict.get("multi_timeframe", {})
+            corr_dict = modules_dict.get("correlation_filter", {})
+            time_dict = modules_dict.get("time_filter", {})
+            pivot_dict = modules_dict.get("pivot_points", {})
+            vp_dict = modules_dict.get("volume_profile", {})
+            adx_dict = modules_dict.get("adx_filter", {})
+
+            # ✅ АДАПТИВНО: Получаем correlation_threshold через AdaptiveFilterParameters
+            if self.adaptive_filter_params:
+                corr_threshold = self.adaptive_filter_params.get_correlation_threshold(
+                    symbol="",  # Глобальный параметр
+                    regime=None,
+                )
+            else:
+                corr_threshold = corr_dict.get("correlation_threshold", 0.7)
+
+            modules = ModuleParameters(
+                mtf_block_opposite=mtf_dict.get("block_opposite", True),
+                mtf_score_bonus=mtf_dict.get("score_bonus", 2),
+                mtf_confirmation_timeframe=mtf_dict.get(
+                    "confirmation_timeframe", "15m"
+                ),
+                correlation_threshold=corr_threshold,
+                max_correlated_positions=corr_dict.get("max_correlated_positions", 2),
+                block_same_direction_only=corr_dict.get(
+                    "block_same_direction_only", True
+                ),
+                prefer_overlaps=time_dict.get("prefer_overlaps", True),
+                avoid_low_liquidity_hours=time_dict.get(
+                    "avoid_low_liquidity_hours", True
+                ),
+                pivot_level_tolerance_percent=pivot_dict.get(
+                    "level_tolerance_percent", 0.25
+                ),
+                pivot_score_bonus_near_level=pivot_dict.get(
+                    "score_bonus_near_level", 1
+                ),
+                pivot_use_last_n_days=pivot_dict.get("use_last_n_days", 5),
+                vp_score_bonus_in_value_area=vp_dict.get(
+                    "score_bonus_in_value_area", 1
+                ),
+                vp_score_bonus_near_poc=vp_dict.get("score_bonus_near_poc", 1),
+                vp_poc_tolerance_percent=vp_dict.get("poc_tolerance_percent", 0.25),
+                # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (27.12.2025): Стандартизация периода на 50 свечей (было 200)
+                vp_lookback_candles=vp_dict.get("lookback_candles", 50),
+                adx_threshold=adx_dict.get("adx_threshold", 18.0),
+                adx_di_difference=adx_dict.get("adx_di_difference", 1.5),
+            )
+
+            return RegimeParameters(
+                min_score_threshold=params_dict.get("min_score_threshold", 3.0),
+                max_trades_per_hour=params_dict.get("max_trades_per_hour", 15),
+                position_size_multiplier=params_dict.get(
+                    "position_size_multiplier", 1.0
+                ),
+                tp_atr_multiplier=params_dict.get("tp_atr_multiplier", 2.0),
+                sl_atr_multiplier=params_dict.get("sl_atr_multiplier", 1.0),
+                max_holding_minutes=params_dict.get("max_holding_minutes", 15),
+                cooldown_after_loss_minutes=params_dict.get(
+                    "cooldown_after_loss_minutes", 3
+                ),
+                pivot_bonus_multiplier=params_dict.get("pivot_bonus_multiplier", 1.0),
+                volume_profile_bonus_multiplier=params_dict.get(
+                    "volume_profile_bonus_multiplier", 1.0
+                ),
+                indicators=indicators,
+                modules=modules,
+                ph_enabled=params_dict.get("ph_enabled", True),
+                ph_threshold=params_dict.get("ph_threshold", 0.20),
+                ph_time_limit=params_dict.get("ph_time_limit", 300),
+            )
+
+        base_trending_threshold = detection_dict.get("trending_adx_threshold", 20.0)
+        base_ranging_threshold = detection_dict.get("ranging_adx_threshold", 15.0)
+        base_high_vol = detection_dict.get("high_volatility_threshold", 0.03)
+        base_low_vol = detection_dict.get("low_volatility_threshold", 0.02)
+        base_trend_strength = detection_dict.get("trend_strength_percent", 2.0)
+        base_min_duration = detection_dict.get("min_regime_duration_minutes", 15)
+        base_confirmations = detection_dict.get("required_confirmations", 3)
+        score_log_symbols = detection_dict.get("score_log_symbols", [])
+
+        trending_params = create_regime_params("trending")
+        ranging_params = create_regime_params("ranging")
+        choppy_params = create_regime_params("choppy")
+
+        regime_config = RegimeConfig(
+            enabled=True,
+            trending_adx_threshold=base_trending_threshold,
+            ranging_adx_threshold=base_ranging_threshold,
+            high_volatility_threshold=base_high_vol,
+            low_volatility_threshold=base_low_vol,
+            trend_strength_percent=base_trend_strength,
+            min_regime_duration_minutes=base_min_duration,
+            required_confirmations=base_confirmations,
+            score_log_symbols=score_log_symbols,
+            trending_params=trending_params,
+            ranging_params=ranging_params,
+            choppy_params=choppy_params,
+        )
+
+        symbol_regime_configs: Dict[str, RegimeConfig] = {}
+        for symbol in self.scalping_config.symbols:
+            symbol_profile = self.symbol_profiles.get(symbol, {})
+            symbol_detection = self._deep_merge_dict(
+                detection_dict,
+                symbol_profile.get("__detection__", {}),
+            )
+            symbol_trending_params = create_regime_params(
+                "trending",
+                symbol_profile.get("trending", {}).get("arm"),
+            )
+            symbol_ranging_params = create_regime_params(
+                "ranging",
+                symbol_profile.get("ranging", {}).get("arm"),
+            )
+            symbol_choppy_params = create_regime_params(
+                "choppy",
+                symbol_profile.get("choppy", {}).get("arm"),
+            )
+
+            symbol_regime_config = RegimeConfig(
+                enabled=True,
+                trending_adx_threshold=symbol_detection.get(
+                    "trending_adx_threshold", base_trending_threshold
+                ),
+                ranging_adx_threshold=symbol_detection.get(
+                    "ranging_adx_threshold", base_ranging_threshold
+                ),
+                high_volatility_threshold=symbol_detection.get(
+                    "high_volatility_threshold", base_high_vol
+                ),
+                low_volatility_threshold=symbol_detection.get(
+                    "low_volatility_threshold", base_low_vol
+                ),
+                trend_strength_percent=symbol_detection.get(
+                    "trend_strength_percent", base_trend_strength
+                ),
+                min_regime_duration_minutes=symbol_detection.get(
+                    "min_regime_duration_minutes", base_min_duration
+                ),
+                required_confirmations=symbol_detection.get(
+                    "required_confirmations", base_confirmations
+                ),
+                score_log_symbols=score_log_symbols,
+                trending_params=symbol_trending_params,
+                ranging_params=symbol_ranging_params,
+                choppy_params=symbol_choppy_params,
+            )
+            symbol_regime_configs[symbol] = symbol_regime_config
+
+        return regime_config, symbol_regime_configs
+
     async def initialize(self, ohlcv_data: Dict[str, List[OHLCV]] = None):
         """
         Инициализация генератора сигналов.
@@ -676,183 +931,10 @@ class FuturesSignalGenerator:
 
             if adaptive_regime_config and enabled:
                 try:
-                    adaptive_regime_dict = self._to_dict(adaptive_regime_config)
-                    detection_dict = self._to_dict(
-                        adaptive_regime_dict.get("detection", {})
-                    )
-                    symbol_profiles_raw = adaptive_regime_dict.get(
-                        "symbol_profiles", {}
-                    )
-                    self.symbol_profiles = self._normalize_symbol_profiles(
-                        symbol_profiles_raw
-                    )
-
-                    def extract_regime_params(regime_name: str) -> Dict[str, Any]:
-                        return self._to_dict(
-                            adaptive_regime_dict.get(regime_name, {}) or {}
-                        )
-
-                    # ✅ ИСПРАВЛЕНИЕ: Сохраняем extract_regime_params для использования в фильтрах
-                    self._extract_regime_params = extract_regime_params
-                    self._adaptive_regime_dict = adaptive_regime_dict
-
-                    from .adaptivity.regime_manager import (
-                        IndicatorParameters,
-                        ModuleParameters,
-                        RegimeParameters,
-                    )
-
-                    def create_regime_params(
-                        regime_name: str,
-                        override: Optional[Dict[str, Any]] = None,
-                    ) -> RegimeParameters:
-                        params_dict = extract_regime_params(regime_name)
-                        if override:
-                            params_dict = self._deep_merge_dict(params_dict, override)
-                        indicators_dict = params_dict.get("indicators", {})
-                        modules_dict = params_dict.get("modules", {})
-
-                        indicators = IndicatorParameters(
-                            rsi_overbought=indicators_dict.get("rsi_overbought", 70),
-                            rsi_oversold=indicators_dict.get("rsi_oversold", 30),
-                            volume_threshold=indicators_dict.get(
-                                "volume_threshold", 1.1
-                            ),
-                            sma_fast=indicators_dict.get("sma_fast", 10),
-                            sma_slow=indicators_dict.get("sma_slow", 30),
-                            ema_fast=indicators_dict.get("ema_fast", 10),
-                            ema_slow=indicators_dict.get("ema_slow", 30),
-                            atr_period=indicators_dict.get("atr_period", 14),
-                            min_volatility_atr=indicators_dict.get(
-                                "min_volatility_atr", 0.0005
-                            ),
-                        )
-
-                        mtf_dict = modules_dict.get("multi_timeframe", {})
-                        corr_dict = modules_dict.get("correlation_filter", {})
-                        time_dict = modules_dict.get("time_filter", {})
-                        pivot_dict = modules_dict.get("pivot_points", {})
-                        vp_dict = modules_dict.get("volume_profile", {})
-                        adx_dict = modules_dict.get("adx_filter", {})
-
-                        # ✅ АДАПТИВНО: Получаем correlation_threshold через AdaptiveFilterParameters
-                        if self.adaptive_filter_params:
-                            corr_threshold = (
-                                self.adaptive_filter_params.get_correlation_threshold(
-                                    symbol="",  # Глобальный параметр
-                                    regime=None,
-                                )
-                            )
-                        else:
-                            corr_threshold = corr_dict.get("correlation_threshold", 0.7)
-
-                        modules = ModuleParameters(
-                            mtf_block_opposite=mtf_dict.get("block_opposite", True),
-                            mtf_score_bonus=mtf_dict.get("score_bonus", 2),
-                            mtf_confirmation_timeframe=mtf_dict.get(
-                                "confirmation_timeframe", "15m"
-                            ),
-                            correlation_threshold=corr_threshold,
-                            max_correlated_positions=corr_dict.get(
-                                "max_correlated_positions", 2
-                            ),
-                            block_same_direction_only=corr_dict.get(
-                                "block_same_direction_only", True
-                            ),
-                            prefer_overlaps=time_dict.get("prefer_overlaps", True),
-                            avoid_low_liquidity_hours=time_dict.get(
-                                "avoid_low_liquidity_hours", True
-                            ),
-                            pivot_level_tolerance_percent=pivot_dict.get(
-                                "level_tolerance_percent", 0.25
-                            ),
-                            pivot_score_bonus_near_level=pivot_dict.get(
-                                "score_bonus_near_level", 1
-                            ),
-                            pivot_use_last_n_days=pivot_dict.get("use_last_n_days", 5),
-                            vp_score_bonus_in_value_area=vp_dict.get(
-                                "score_bonus_in_value_area", 1
-                            ),
-                            vp_score_bonus_near_poc=vp_dict.get(
-                                "score_bonus_near_poc", 1
-                            ),
-                            vp_poc_tolerance_percent=vp_dict.get(
-                                "poc_tolerance_percent", 0.25
-                            ),
-                            # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (27.12.2025): Стандартизация периода на 50 свечей (было 200)
-                            vp_lookback_candles=vp_dict.get("lookback_candles", 50),
-                            adx_threshold=adx_dict.get("adx_threshold", 18.0),
-                            adx_di_difference=adx_dict.get("adx_di_difference", 1.5),
-                        )
-
-                        return RegimeParameters(
-                            min_score_threshold=params_dict.get(
-                                "min_score_threshold", 3.0
-                            ),
-                            max_trades_per_hour=params_dict.get(
-                                "max_trades_per_hour", 15
-                            ),
-                            position_size_multiplier=params_dict.get(
-                                "position_size_multiplier", 1.0
-                            ),
-                            tp_atr_multiplier=params_dict.get("tp_atr_multiplier", 2.0),
-                            sl_atr_multiplier=params_dict.get("sl_atr_multiplier", 1.0),
-                            max_holding_minutes=params_dict.get(
-                                "max_holding_minutes", 15
-                            ),
-                            cooldown_after_loss_minutes=params_dict.get(
-                                "cooldown_after_loss_minutes", 3
-                            ),
-                            pivot_bonus_multiplier=params_dict.get(
-                                "pivot_bonus_multiplier", 1.0
-                            ),
-                            volume_profile_bonus_multiplier=params_dict.get(
-                                "volume_profile_bonus_multiplier", 1.0
-                            ),
-                            indicators=indicators,
-                            modules=modules,
-                            ph_enabled=params_dict.get("ph_enabled", True),
-                            ph_threshold=params_dict.get("ph_threshold", 0.20),
-                            ph_time_limit=params_dict.get("ph_time_limit", 300),
-                        )
-
-                    base_trending_threshold = detection_dict.get(
-                        "trending_adx_threshold", 20.0
-                    )
-                    base_ranging_threshold = detection_dict.get(
-                        "ranging_adx_threshold", 15.0
-                    )
-                    base_high_vol = detection_dict.get(
-                        "high_volatility_threshold", 0.03
-                    )
-                    base_low_vol = detection_dict.get("low_volatility_threshold", 0.02)
-                    base_trend_strength = detection_dict.get(
-                        "trend_strength_percent", 2.0
-                    )
-                    base_min_duration = detection_dict.get(
-                        "min_regime_duration_minutes", 15
-                    )
-                    base_confirmations = detection_dict.get("required_confirmations", 3)
-                    score_log_symbols = detection_dict.get("score_log_symbols", [])
-
-                    trending_params = create_regime_params("trending")
-                    ranging_params = create_regime_params("ranging")
-                    choppy_params = create_regime_params("choppy")
-
-                    regime_config = RegimeConfig(
-                        enabled=True,
-                        trending_adx_threshold=base_trending_threshold,
-                        ranging_adx_threshold=base_ranging_threshold,
-                        high_volatility_threshold=base_high_vol,
-                        low_volatility_threshold=base_low_vol,
-                        trend_strength_percent=base_trend_strength,
-                        min_regime_duration_minutes=base_min_duration,
-                        required_confirmations=base_confirmations,
-                        score_log_symbols=score_log_symbols,
-                        trending_params=trending_params,
-                        ranging_params=ranging_params,
-                        choppy_params=choppy_params,
-                    )
+                    (
+                        regime_config,
+                        symbol_regime_configs,
+                    ) = self._build_regime_configs(adaptive_regime_config)
                     self.regime_manager = AdaptiveRegimeManager(
                         regime_config,
                         trading_statistics=self.trading_statistics,
@@ -864,52 +946,7 @@ class FuturesSignalGenerator:
                         await self.regime_manager.initialize(ohlcv_data)
 
                     for symbol in self.scalping_config.symbols:
-                        symbol_profile = self.symbol_profiles.get(symbol, {})
-                        symbol_detection = self._deep_merge_dict(
-                            detection_dict,
-                            symbol_profile.get("__detection__", {}),
-                        )
-                        symbol_trending_params = create_regime_params(
-                            "trending",
-                            symbol_profile.get("trending", {}).get("arm"),
-                        )
-                        symbol_ranging_params = create_regime_params(
-                            "ranging",
-                            symbol_profile.get("ranging", {}).get("arm"),
-                        )
-                        symbol_choppy_params = create_regime_params(
-                            "choppy",
-                            symbol_profile.get("choppy", {}).get("arm"),
-                        )
-
-                        symbol_regime_config = RegimeConfig(
-                            enabled=True,
-                            trending_adx_threshold=symbol_detection.get(
-                                "trending_adx_threshold", base_trending_threshold
-                            ),
-                            ranging_adx_threshold=symbol_detection.get(
-                                "ranging_adx_threshold", base_ranging_threshold
-                            ),
-                            high_volatility_threshold=symbol_detection.get(
-                                "high_volatility_threshold", base_high_vol
-                            ),
-                            low_volatility_threshold=symbol_detection.get(
-                                "low_volatility_threshold", base_low_vol
-                            ),
-                            trend_strength_percent=symbol_detection.get(
-                                "trend_strength_percent", base_trend_strength
-                            ),
-                            min_regime_duration_minutes=symbol_detection.get(
-                                "min_regime_duration_minutes", base_min_duration
-                            ),
-                            required_confirmations=symbol_detection.get(
-                                "required_confirmations", base_confirmations
-                            ),
-                            score_log_symbols=score_log_symbols,
-                            trending_params=symbol_trending_params,
-                            ranging_params=symbol_ranging_params,
-                            choppy_params=symbol_choppy_params,
-                        )
+                        symbol_regime_config = symbol_regime_configs[symbol]
                         self.regime_managers[symbol] = AdaptiveRegimeManager(
                             symbol_regime_config,
                             trading_statistics=self.trading_statistics,
@@ -1027,6 +1064,7 @@ class FuturesSignalGenerator:
 
             # ✅ НОВОЕ (26.12.2025): Инициализация DirectionAnalyzer
             self.direction_analyzer = None
+            self.trend_state = None
             # DirectionAnalyzer будет инициализирован после установки fast_adx (импорт удалён как неиспользуемый)
 
             # ✅ Инициализация ADX Filter (ПРОВЕРКА ТРЕНДА)
@@ -1147,6 +1185,7 @@ class FuturesSignalGenerator:
                     )
                 corr_max_positions = 2
                 corr_block_same_direction = True
+                corr_max_cluster_exposure = 0.0
 
                 if corr_config_data:
                     if isinstance(corr_config_data, dict):
@@ -1159,6 +1198,9 @@ class FuturesSignalGenerator:
                         corr_block_same_direction = corr_config_data.get(
                             "block_same_direction_only", corr_block_same_direction
                         )
+                        corr_max_cluster_exposure = corr_config_data.get(
+                            "max_cluster_exposure", corr_max_cluster_exposure
+                        )
                     elif hasattr(corr_config_data, "correlation_threshold"):
                         corr_threshold = getattr(
                             corr_config_data, "correlation_threshold", corr_threshold
@@ -1173,12 +1215,18 @@ class FuturesSignalGenerator:
                             "block_same_direction_only",
                             corr_block_same_direction,
                         )
+                        corr_max_cluster_exposure = getattr(
+                            corr_config_data,
+                            "max_cluster_exposure",
+                            corr_max_cluster_exposure,
+                        )
 
                 corr_config = CorrelationFilterConfig(
                     enabled=corr_enabled,
                     correlation_threshold=corr_threshold,
                     max_correlated_positions=corr_max_positions,
                     block_same_direction_only=corr_block_same_direction,
+                    max_cluster_exposure=corr_max_cluster_exposure,
                 )
 
                 # CorrelationFilter требует OKXClient, но у нас может быть futures client
@@ -1919,31 +1967,14 @@ class FuturesSignalGenerator:
             self._update_signal_history(filtered_signals)
 
             # ✅ НОВОЕ: Логирование сигналов в CSV
-            if self.performance_tracker:
-                for signal in filtered_signals:
-                    try:
-                        filters_passed = signal.get("filters_passed", [])
-                        if isinstance(filters_passed, str):
-                            filters_passed = (
-                                filters_passed.split(",") if filters_passed else []
-                            )
-                        elif not isinstance(filters_passed, list):
-                            filters_passed = []
-
-                        self.performance_tracker.record_signal(
-                            symbol=signal.get("symbol", ""),
-                            side=signal.get("side", ""),
-                            price=signal.get("price", 0.0),
-                            strength=signal.get("strength", 0.0),
-                            regime=signal.get("regime"),
-                            filters_passed=filters_passed,
-                            executed=False,  # Будет обновлено при исполнении
-                            order_id=None,  # Будет обновлено при исполнении
-                        )
-                    except Exception as e:
-                        logger.warning(
-                            f"⚠️ SignalGenerator: Ошибка записи сигнала в CSV: {e}"
-                        )
+            # Пачкой: одна запись и один flush на цикл (executed обновится при исполнении)
+            if self.performance_tracker and filtered_signals:
+                try:
+                    self.performance_tracker.record_signals(filtered_signals)
+                except Exception as e:
+                    logger.warning(
+                        f"⚠️ SignalGenerator: Ошибка записи сигнала в CSV: {e}"
+                    )
 
             return filtered_signals
 
@@ -2015,6 +2046,9 @@ class FuturesSignalGenerator:
             base_signals = await self._generate_base_signals(
                 symbol, market_data, regime
             )
+            if base_signals:
+                # Сигналы внешних генераторов (RSI/MACD/TrendFollowing) приходят dict
+                base_signals = [Signal.from_dict(s) for s in base_signals]
 
             # ✅ ИСПРАВЛЕНО (10.01.2026): Убрано misleading логирование ADX=0 до инициализации ADX
             # Реальное логирование причин происходит внутри _generate_base_signals после получения ADX
@@ -3432,23 +3466,23 @@ class FuturesSignalGenerator:
 
                 # Генерируем SHORT сигнал
                 signals.append(
-                    {
-                        "symbol": symbol,
-                        "side": "sell",
-                        "type": "short_combo",  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (30.12.2025): Новый тип SHORT сигнала
-                        "strength": final_strength,
-                        "price": self._adjust_price_for_slippage(
+                    Signal(
+                        symbol=symbol,
+                        side="sell",
+                        type="short_combo",  # ✅ КРИТИЧЕСКОЕ ИСПРАВЛЕНИЕ (30.12.2025): Новый тип SHORT сигнала
+                        strength=final_strength,
+                        price=self._adjust_price_for_slippage(
                             symbol, current_price, "sell"
                         ),
-                        "timestamp": datetime.now(timezone.utc),
-                        "rsi": rsi_value,
-                        "macd_line": macd_line,
-                        "signal_line": signal_line,
-                        "adx_value": adx_value,
-                        "confidence": 0.8,  # Высокая уверенность при выполнении всех условий
-                        "has_conflict": False,
-                        "source": "short_combo_rsi_macd_adx",
-                    }
+                        timestamp=datetime.now(timezone.utc),
+                        rsi=rsi_value,
+                        macd_line=macd_line,
+                        signal_line=signal_line,
+                        adx_value=adx_value,
+                        confidence=0.8,  # Высокая уверенность при выполнении всех условий
+                        has_conflict=False,
+                        source="short_combo_rsi_macd_adx",
+                    )
                 )
                 signal_stats["adx"]["generated"] = (
                     signal_stats.get("adx", {}).get("generated", 0) + 1
@@ -3493,20 +3527,20 @@ class FuturesSignalGenerator:
 
                     # Генерируем SHORT сигнал на основе ADX bearish тренда
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "sell",
-                            "type": "adx_bearish",
-                            "strength": final_strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="sell",
+                            type="adx_bearish",
+                            strength=final_strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "sell"
                             ),
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": adx_value,
-                            "confidence": 0.7,  # Высокая уверенность при сильном bearish тренде
-                            "has_conflict": False,
-                            "source": "adx_bearish",
-                        }
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=adx_value,
+                            confidence=0.7,  # Высокая уверенность при сильном bearish тренде
+                            has_conflict=False,
+                            source="adx_bearish",
+                        )
                     )
                     signal_stats["adx"]["generated"] = (
                         signal_stats.get("adx", {}).get("generated", 0) + 1
@@ -3520,20 +3554,20 @@ class FuturesSignalGenerator:
                 # ✅ НОВОЕ: Генерируем LONG сигнал на основе ADX bullish тренда (зеркально SHORT)
                 if adx_trend == "bullish" and adx_value >= adx_threshold:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "buy",
-                            "type": "adx_bullish",
-                            "strength": final_strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="buy",
+                            type="adx_bullish",
+                            strength=final_strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "buy"
                             ),
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": adx_value,
-                            "confidence": 0.7,  # Высокая уверенность при сильном bullish тренде
-                            "has_conflict": False,
-                            "source": "adx_bullish",
-                        }
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=adx_value,
+                            confidence=0.7,  # Высокая уверенность при сильном bullish тренде
+                            has_conflict=False,
+                            source="adx_bullish",
+                        )
                     )
                     signal_stats["adx"]["generated"] = (
                         signal_stats.get("adx", {}).get("generated", 0) + 1
@@ -3760,12 +3794,24 @@ class FuturesSignalGenerator:
                                     f"⚠️ Не удалось получить regime для DirectionAnalyzer: {e}"
                                 )
 
-                        direction_result = self.direction_analyzer.analyze_direction(
-                            candles=market_data.ohlcv_data,
-                            current_price=current_price,
-                            indicators=indicators,
-                            regime=current_regime,  # ✅ Передаем regime для блокировки контр-тренда
-                        )
+                        trend_state = getattr(self, "trend_state", None)
+                        if trend_state is not None:
+                            # Свечи символа вливаются один раз, остальные сигналы
+                            # пачки получают результат из кэша
+                            direction_result = trend_state.analyze(
+                                getattr(market_data, "symbol", None) or signal_symbol,
+                                market_data.ohlcv_data,
+                                current_price,
+                                indicators,
+                                current_regime,
+                            )
+                        else:
+                            direction_result = self.direction_analyzer.analyze_direction(
+                                candles=market_data.ohlcv_data,
+                                current_price=current_price,
+                                indicators=indicators,
+                                regime=current_regime,  # ✅ Передаем regime для блокировки контр-тренда
+                            )
 
                         market_direction = direction_result.get("direction", "neutral")
                         adx_value_from_analyzer = direction_result.get("adx_value", 0)
@@ -4677,26 +4723,26 @@ class FuturesSignalGenerator:
                 min_strength_threshold = 0.12 if current_regime == "trending" else 0.15
                 if strength >= min_strength_threshold:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "buy",
-                            "type": "rsi_divergence",
-                            "strength": strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="buy",
+                            type="rsi_divergence",
+                            strength=strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "buy"
                             ),
-                            "timestamp": __import__("datetime").datetime.now(
+                            timestamp=__import__("datetime").datetime.now(
                                 __import__("datetime").timezone.utc
                             ),
-                            "confidence": 0.65,
-                            "has_conflict": False,
-                            "source": "rsi_bullish_divergence",
-                            "rsi": current_rsi,
-                            "divergence_type": "bullish",
-                            "regime": current_regime,
-                            "price_drop_pct": round(price_drop * 100, 3),
-                            "rsi_recovery_pct": round(rsi_recovery * 100, 3),
-                        }
+                            confidence=0.65,
+                            has_conflict=False,
+                            source="rsi_bullish_divergence",
+                            rsi=current_rsi,
+                            divergence_type="bullish",
+                            regime=current_regime,
+                            price_drop_pct=round(price_drop * 100, 3),
+                            rsi_recovery_pct=round(rsi_recovery * 100, 3),
+                        )
                     )
                     logger.debug(
                         f"📐 {symbol}: Bullish RSI divergence [{current_regime}]: "
@@ -4734,26 +4780,26 @@ class FuturesSignalGenerator:
                 min_strength_threshold = 0.12 if current_regime == "trending" else 0.15
                 if strength >= min_strength_threshold:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "sell",
-                            "type": "rsi_divergence",
-                            "strength": strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="sell",
+                            type="rsi_divergence",
+                            strength=strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "sell"
                             ),
-                            "timestamp": __import__("datetime").datetime.now(
+                            timestamp=__import__("datetime").datetime.now(
                                 __import__("datetime").timezone.utc
                             ),
-                            "confidence": 0.65,
-                            "has_conflict": False,
-                            "source": "rsi_bearish_divergence",
-                            "rsi": current_rsi,
-                            "divergence_type": "bearish",
-                            "regime": current_regime,
-                            "price_rise_pct": round(price_rise * 100, 3),
-                            "rsi_weakness_pct": round(rsi_weakness * 100, 3),
-                        }
+                            confidence=0.65,
+                            has_conflict=False,
+                            source="rsi_bearish_divergence",
+                            rsi=current_rsi,
+                            divergence_type="bearish",
+                            regime=current_regime,
+                            price_rise_pct=round(price_rise * 100, 3),
+                            rsi_weakness_pct=round(rsi_weakness * 100, 3),
+                        )
                     )
                     logger.debug(
                         f"📐 {symbol}: Bearish RSI divergence [{current_regime}]: "
@@ -4854,27 +4900,25 @@ class FuturesSignalGenerator:
                 strength = min(0.78, abs(std_bands) / strength_divisor)
                 if strength >= 0.15:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "buy",
-                            "type": "vwap_mean_reversion",
-                            "strength": strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="buy",
+                            type="vwap_mean_reversion",
+                            strength=strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "buy"
                             ),
-                            "timestamp": __import__("datetime").datetime.now(
+                            timestamp=__import__("datetime").datetime.now(
                                 __import__("datetime").timezone.utc
                             ),
-                            "confidence": confidence_val,
-                            "has_conflict": False,
-                            "source": "vwap_below",
-                            "vwap": round(vwap, 6),
-                            "std_bands": round(std_bands, 3),
-                            "regime": current_regime,
-                            "deviation_pct": round(
-                                (current_price - vwap) / vwap * 100, 3
-                            ),
-                        }
+                            confidence=confidence_val,
+                            has_conflict=False,
+                            source="vwap_below",
+                            vwap=round(vwap, 6),
+                            std_bands=round(std_bands, 3),
+                            regime=current_regime,
+                            deviation_pct=round((current_price - vwap) / vwap * 100, 3),
+                        )
                     )
                     logger.debug(
                         f"📊 {symbol}: VWAP BUY [{current_regime}]: "
@@ -4888,27 +4932,25 @@ class FuturesSignalGenerator:
                 strength = min(0.78, abs(std_bands) / strength_divisor)
                 if strength >= 0.15:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "sell",
-                            "type": "vwap_mean_reversion",
-                            "strength": strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="sell",
+                            type="vwap_mean_reversion",
+                            strength=strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "sell"
                             ),
-                            "timestamp": __import__("datetime").datetime.now(
+                            timestamp=__import__("datetime").datetime.now(
                                 __import__("datetime").timezone.utc
                             ),
-                            "confidence": confidence_val,
-                            "has_conflict": False,
-                            "source": "vwap_above",
-                            "vwap": round(vwap, 6),
-                            "std_bands": round(std_bands, 3),
-                            "regime": current_regime,
-                            "deviation_pct": round(
-                                (current_price - vwap) / vwap * 100, 3
-                            ),
-                        }
+                            confidence=confidence_val,
+                            has_conflict=False,
+                            source="vwap_above",
+                            vwap=round(vwap, 6),
+                            std_bands=round(std_bands, 3),
+                            regime=current_regime,
+                            deviation_pct=round((current_price - vwap) / vwap * 100, 3),
+                        )
                     )
                     logger.debug(
                         f"📊 {symbol}: VWAP SELL [{current_regime}]: "
@@ -5143,17 +5185,17 @@ class FuturesSignalGenerator:
                         symbol, current_price, "buy"
                     )
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "buy",
-                            "type": "rsi_oversold",
-                            "strength": strength,
-                            "price": adjusted_price,
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": rsi,
-                            "confidence": confidence,
-                            "has_conflict": has_conflict,
-                        }
+                        Signal(
+                            symbol=symbol,
+                            side="buy",
+                            type="rsi_oversold",
+                            strength=strength,
+                            price=adjusted_price,
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=rsi,
+                            confidence=confidence,
+                            has_conflict=has_conflict,
+                        )
                     )
 
             # Перекупленность (продажа) - используем адаптивный порог
@@ -5229,19 +5271,19 @@ class FuturesSignalGenerator:
                     )
                 else:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "sell",
-                            "type": "rsi_overbought",
-                            "strength": strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="sell",
+                            type="rsi_overbought",
+                            strength=strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "sell"
                             ),  # ✅ НОВОЕ (28.12.2025): Учет slippage
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": rsi,
-                            "confidence": confidence,
-                            "has_conflict": has_conflict,
-                        }
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=rsi,
+                            confidence=confidence,
+                            has_conflict=has_conflict,
+                        )
                     )
 
         except Exception as e:
@@ -5299,13 +5341,8 @@ class FuturesSignalGenerator:
                         )
 
                         # Convert dict back to object for getattr access
-                        class _RegimeConfidence:
-                            def __init__(self, d):
-                                for k, v in d.items():
-                                    setattr(self, k, v)
-
                         regime_confidence = (
-                            _RegimeConfidence(regime_confidence_dict)
+                            SimpleNamespace(**regime_confidence_dict)
                             if regime_confidence_dict
                             else None
                         )
@@ -5525,18 +5562,18 @@ class FuturesSignalGenerator:
                     )
                 else:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "buy",
-                            "type": "macd_bullish",
-                            "strength": base_strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="buy",
+                            type="macd_bullish",
+                            strength=base_strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "buy"
                             ),  # ✅ НОВОЕ (28.12.2025): Учет slippage
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": histogram,
-                            "confidence": macd_confidence,  # ✅ АДАПТИВНО: Из конфига
-                        }
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=histogram,
+                            confidence=macd_confidence,  # ✅ АДАПТИВНО: Из конфига
+                        )
                     )
 
             elif macd_line < signal_line and histogram < 0:
@@ -5625,18 +5662,18 @@ class FuturesSignalGenerator:
                     )
                 else:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "sell",
-                            "type": "macd_bearish",
-                            "strength": base_strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="sell",
+                            type="macd_bearish",
+                            strength=base_strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "sell"
                             ),  # ✅ НОВОЕ (28.12.2025): Учет slippage
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": histogram,
-                            "confidence": macd_confidence,  # ✅ АДАПТИВНО: Из конфига
-                        }
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=histogram,
+                            confidence=macd_confidence,  # ✅ АДАПТИВНО: Из конфига
+                        )
                     )
 
         except Exception as e:
@@ -5693,13 +5730,8 @@ class FuturesSignalGenerator:
                         )
 
                         # Convert dict back to object for getattr access
-                        class _RegimeConfidence:
-                            def __init__(self, d):
-                                for k, v in d.items():
-                                    setattr(self, k, v)
-
                         regime_confidence = (
-                            _RegimeConfidence(regime_confidence_dict)
+                            SimpleNamespace(**regime_confidence_dict)
                             if regime_confidence_dict
                             else None
                         )
@@ -5894,18 +5926,18 @@ class FuturesSignalGenerator:
                     )
                 else:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "buy",
-                            "type": "bb_oversold",
-                            "strength": base_strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="buy",
+                            type="bb_oversold",
+                            strength=base_strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "buy"
                             ),  # ✅ НОВОЕ (28.12.2025): Учет slippage
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": current_price,
-                            "confidence": bb_confidence,  # ✅ АДАПТИВНО: Из конфига
-                        }
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=current_price,
+                            confidence=bb_confidence,  # ✅ АДАПТИВНО: Из конфига
+                        )
                     )
 
             # Отскок от верхней полосы (продажа)
@@ -6030,18 +6062,18 @@ class FuturesSignalGenerator:
                     )
                 else:
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "sell",
-                            "type": "bb_overbought",
-                            "strength": base_strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="sell",
+                            type="bb_overbought",
+                            strength=base_strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "sell"
                             ),  # ✅ НОВОЕ (28.12.2025): Учет slippage
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": current_price,
-                            "confidence": bb_confidence,  # ✅ АДАПТИВНО: Из конфига
-                        }
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=current_price,
+                            confidence=bb_confidence,  # ✅ АДАПТИВНО: Из конфига
+                        )
                     )
 
         except Exception as e:
@@ -6140,18 +6172,18 @@ class FuturesSignalGenerator:
                     f"ADX={adx:.1f}, BB_width={bb_width_pct:.2f}%"
                 )
                 signals.append(
-                    {
-                        "symbol": symbol,
-                        "side": "buy",
-                        "type": "range_bounce_long",
-                        "strength": strength,
-                        "price": self._adjust_price_for_slippage(
+                    Signal(
+                        symbol=symbol,
+                        side="buy",
+                        type="range_bounce_long",
+                        strength=strength,
+                        price=self._adjust_price_for_slippage(
                             symbol, current_price, "buy"
                         ),
-                        "timestamp": datetime.now(timezone.utc),
-                        "indicator_value": distance_to_lower,
-                        "confidence": 0.70,  # Средняя уверенность для range-bounce
-                    }
+                        timestamp=datetime.now(timezone.utc),
+                        indicator_value=distance_to_lower,
+                        confidence=0.70,  # Средняя уверенность для range-bounce
+                    )
                 )
 
             # Проверка SHORT условий (касание upper + RSI overbought)
@@ -6172,18 +6204,18 @@ class FuturesSignalGenerator:
                     f"ADX={adx:.1f}, BB_width={bb_width_pct:.2f}%"
                 )
                 signals.append(
-                    {
-                        "symbol": symbol,
-                        "side": "sell",
-                        "type": "range_bounce_short",
-                        "strength": strength,
-                        "price": self._adjust_price_for_slippage(
+                    Signal(
+                        symbol=symbol,
+                        side="sell",
+                        type="range_bounce_short",
+                        strength=strength,
+                        price=self._adjust_price_for_slippage(
                             symbol, current_price, "sell"
                         ),
-                        "timestamp": datetime.now(timezone.utc),
-                        "indicator_value": distance_to_upper,
-                        "confidence": 0.70,  # Средняя уверенность для range-bounce
-                    }
+                        timestamp=datetime.now(timezone.utc),
+                        indicator_value=distance_to_upper,
+                        confidence=0.70,  # Средняя уверенность для range-bounce
+                    )
                 )
 
         except Exception as e:
@@ -6791,13 +6823,8 @@ class FuturesSignalGenerator:
                         )
 
                         # Convert dict back to object for getattr access
-                        class _RegimeConfidence:
-                            def __init__(self, d):
-                                for k, v in d.items():
-                                    setattr(self, k, v)
-
                         regime_confidence = (
-                            _RegimeConfidence(regime_confidence_dict)
+                            SimpleNamespace(**regime_confidence_dict)
                             if regime_confidence_dict
                             else None
                         )
@@ -6899,22 +6926,22 @@ class FuturesSignalGenerator:
                         f"цена({current_price:.2f}) > EMA_12, направление={price_direction}, strength={strength:.4f}"
                     )
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "buy",
-                            "type": "ma_bullish",
-                            "strength": strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="buy",
+                            type="ma_bullish",
+                            strength=strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "buy"
                             ),  # ✅ НОВОЕ (28.12.2025): Учет slippage
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": ma_fast,
-                            "confidence": (
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=ma_fast,
+                            confidence=(
                                 confidence_config.get("bullish_strong", 0.7)
                                 if price_direction == "up"
                                 else confidence_config.get("bullish_normal", 0.5)
                             ),  # ✅ АДАПТИВНО: Из конфига
-                        }
+                        )
                     )
 
             elif ma_fast < ma_slow and current_price < ma_fast and ma_slow > 0:
@@ -6969,22 +6996,22 @@ class FuturesSignalGenerator:
                         f"цена({current_price:.2f}) < EMA_12, направление={price_direction}, strength={strength:.4f}"
                     )
                     signals.append(
-                        {
-                            "symbol": symbol,
-                            "side": "sell",
-                            "type": "ma_bearish",
-                            "strength": strength,
-                            "price": self._adjust_price_for_slippage(
+                        Signal(
+                            symbol=symbol,
+                            side="sell",
+                            type="ma_bearish",
+                            strength=strength,
+                            price=self._adjust_price_for_slippage(
                                 symbol, current_price, "sell"
                             ),  # ✅ НОВОЕ (28.12.2025): Учет slippage
-                            "timestamp": datetime.now(timezone.utc),
-                            "indicator_value": ma_fast,
-                            "confidence": (
+                            timestamp=datetime.now(timezone.utc),
+                            indicator_value=ma_fast,
+                            confidence=(
                                 confidence_config.get("bearish_strong", 0.7)
                                 if price_direction == "down"
                                 else confidence_config.get("bearish_normal", 0.5)
                             ),  # ✅ АДАПТИВНО: Из конфига
-                        }
+                        )
                     )
 
         except Exception as e:
@@ -7272,18 +7299,18 @@ class FuturesSignalGenerator:
             symbol, candle_close_price
         )
 
-        signal = {
-            "symbol": symbol,
-            "side": "buy" if direction == "buy" else "sell",
-            "type": "impulse_breakout",
-            "strength": strength,
-            "price": current_market_price,  # ✅ Используем актуальную цену из стакана
-            "timestamp": datetime.now(timezone.utc),
-            "indicator_value": body_ratio,
-            "confidence": 0.9,
-            "is_impulse": True,
-            "impulse_meta": meta,
-        }
+        signal = Signal(
+            symbol=symbol,
+            side="buy" if direction == "buy" else "sell",
+            type="impulse_breakout",
+            strength=strength,
+            price=current_market_price,  # ✅ Используем актуальную цену из стакана
+            timestamp=datetime.now(timezone.utc),
+            indicator_value=body_ratio,
+            confidence=0.9,
+            is_impulse=True,
+            impulse_meta=meta,
+        )
 
         relax_payload: Dict[str, float] = {}
         if relax_cfg:
@@ -8584,6 +8611,7 @@ class FuturesSignalGenerator:
                     return []
 
             pattern_context_by_symbol = {}
+            pattern_inputs = {}
             orchestrator_min_strength_by_symbol = {}
             orchestrator_source_by_symbol = {}
 
@@ -8679,12 +8707,17 @@ class FuturesSignalGenerator:
                 )
                 if bundle.patterns and bundle.patterns.enabled and self.pattern_engine:
                     current_price = self._get_current_price(market_data)
-                    ctx = self.pattern_engine.evaluate(
+                    pattern_inputs[symbol_val] = (
                         market_data.ohlcv_data,
                         current_price,
                         bundle.patterns,
                     )
-                    pattern_context_by_symbol[symbol_val] = ctx
+
+            # ✅ Паттерны по всем символам одним векторизованным проходом
+            if pattern_inputs:
+                pattern_context_by_symbol = self.pattern_engine.evaluate_batch(
+                    pattern_inputs
+                )
 
             min_strength_by_symbol = {}
             source_info_by_symbol = {}
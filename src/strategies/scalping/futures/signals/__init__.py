@@ -3,16 +3,23 @@
 
 Модули:
 - filter_manager: Координатор всех фильтров
+- filter_planner: Порядок/параллельность фильтров и funnel trace
+- signal_model: Signal / FilterVerdict на __slots__ (dict-совместимый доступ)
 - rsi_signal_generator: Генератор RSI сигналов
 - macd_signal_generator: Генератор MACD сигналов
 """
 
 from .filter_manager import FilterManager
+from .filter_planner import FilterPlanner
 from .macd_signal_generator import MACDSignalGenerator
 from .rsi_signal_generator import RSISignalGenerator
+from .signal_model import FilterVerdict, Signal
 
 __all__ = [
     "FilterManager",
+    "FilterPlanner",
     "RSISignalGenerator",
     "MACDSignalGenerator",
+    "Signal",
+    "FilterVerdict",
 ]
@@ -6,6 +6,8 @@ FilterManager - Координатор всех фильтров.
 2. Trend filters: MTF, Correlation
 3. Entry filters: Pivot Points, Volume Profile, Liquidity
 4. Market filters: Order Flow, Funding Rate
+
+Фактический порядок и параллельность шагов выбирает FilterPlanner.
 """
 
 import time
@@ -13,6 +15,18 @@ from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from .filter_planner import FilterContext, FilterPlanner, FilterStage
+from .signal_model import Signal
+
+
+def _get_indicator(indicators: Any, *keys):
+    if not indicators or not isinstance(indicators, dict):
+        return None
+    for key in keys:
+        if key in indicators:
+            return indicators.get(key)
+    return None
+
 
 class FilterManager:
     """
@@ -22,12 +36,13 @@ class FilterManager:
     ✅ ГРОК ОПТИМИЗАЦИЯ: Добавлено кэширование фильтров для снижения времени signals на 50-60%
     """
 
-    def __init__(self, data_registry=None):
+    def __init__(self, data_registry=None, planner_config=None):
         """
         Инициализация FilterManager
 
         Args:
             data_registry: DataRegistry для чтения индикаторов (опционально)
+            planner_config: Настройки FilterPlanner (scalping.filter_planner)
         """
         # ✅ НОВОЕ: DataRegistry для чтения индикаторов
         self.data_registry = data_registry
@@ -62,6 +77,9 @@ class FilterManager:
         self.price_direction_conflicts: Dict[str, Dict[str, Any]] = {}
         self._conflict_log_ts: Dict[str, float] = {}
 
+        # Планировщик: порядок по стоимости/доле блокировок, early-exit, funnel trace
+        self.planner = FilterPlanner(planner_config)
+
         logger.info(
             f"✅ FilterManager инициализирован с кэшированием: "
             f"fast={self.filter_cache_ttl_fast:.0f}s, slow={self.filter_cache_ttl_slow:.0f}s"
@@ -226,7 +244,8 @@ class FilterManager:
         Применить все фильтры к сигналу.
         ✅ ГРОК ОПТИМИЗАЦИЯ: Использует кэш для ADX/MTF/Pivot/VolumeProfile (TTL 10s/30s)
 
-        Порядок применения:
+        Порядок применения (по умолчанию, FilterPlanner переупорядочивает
+        по стоимости и доле блокировок и останавливается на первой блокировке):
         1. Pre-filters: ADX (тренд), Volatility
         2. Trend filters: MTF, Correlation
         3. Entry filters: Pivot Points, Volume Profile, Liquidity
@@ -260,116 +279,191 @@ class FilterManager:
         impulse_relax = signal.get("impulse_relax", {})
         is_impulse = signal.get("is_impulse", False)
 
-        # ==================== PRE-FILTERS ====================
+        ctx = FilterContext(
+            symbol=symbol,
+            signal=signal,
+            market_data=market_data,
+            regime=regime,
+            filters_profile=filters_profile,
+            impulse_relax=impulse_relax,
+            is_impulse=is_impulse,
+        )
+        verdict = await self.planner.evaluate(self._build_stages(ctx), ctx)
+        if isinstance(signal, Signal):
+            signal.verdict = verdict
+            signal.annotate("filters", verdict.blocked_by or "passed")
+        if not verdict.passed:
+            return None
 
-        # 1. ADX Filter (проверка тренда и силы)
-        # ✅ ГРОК ОПТИМИЗАЦИЯ: Проверяем кэш перед расчетом
-        if self.adx_filter:
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
-
-                def _get_indicator(indicators: Any, *keys):
-                    if not indicators or not isinstance(indicators, dict):
-                        return None
-                    for key in keys:
-                        if key in indicators:
-                            return indicators.get(key)
-                    return None
+        # Все фильтры пройдены
+        return signal
 
-                # Пытаемся получить из кэша
-                cached_adx_result = self._get_cached_filter_result(symbol, "adx")
-                use_cache = cached_adx_result is not None
-                if use_cache:
-                    # ✅ УЛУЧШЕНИЕ (10.01.2026): Получаем фактические значения ADX для логирования
-                    adx_value = None
-                    plus_di = None
-                    minus_di = None
-                    try:
-                        if market_data and hasattr(market_data, "indicators"):
-                            indicators = market_data.indicators
-                            adx_value = _get_indicator(indicators, "adx", "ADX")
-                            plus_di = _get_indicator(
-                                indicators, "adx_plus_di", "+DI", "DI_PLUS"
-                            )
-                            minus_di = _get_indicator(
-                                indicators, "adx_minus_di", "-DI", "DI_MINUS"
-                            )
-                    except Exception as exc:
-                        logger.debug("Ignored error in optional block: %s", exc)
-
-                    adx_has_data = adx_value is not None
-                    if cached_adx_result is False and not adx_has_data:
-                        logger.debug(
-                            f"🔍 ADX cache bypass for {symbol}: cached=False but ADX missing"
-                        )
-                        use_cache = False
-
-                if use_cache:
-                    # Используем кэш - ADX меняется медленно
-                    if not cached_adx_result:
-                        # ✅ УЛУЧШЕНО: Логируем значения даже из кэша
-                        adx_str = f"ADX={adx_value:.1f}" if adx_value else "ADX=N/A"
-                        di_str = (
-                            f", +DI={plus_di:.1f}, -DI={minus_di:.1f}"
-                            if plus_di is not None and minus_di is not None
-                            else ""
-                        )
-                        signal[
-                            "filter_reason"
-                        ] = f"ADX Filter (cached): blocked | {adx_str}{di_str}, regime={regime or 'unknown'}"
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): ADX Filter - BLOCKED (из кэша) | "
-                            f"{adx_str}{di_str}, Режим: {regime or 'unknown'} | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
-                        )
-                        return None
-                    else:
-                        # ADX прошел - добавляем в список пройденных фильтров
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("ADX")
-                        # ✅ УЛУЧШЕНО: Логируем значения даже из кэша
-                        adx_str = f"ADX={adx_value:.1f}" if adx_value else "ADX=N/A"
-                        di_str = (
-                            f", +DI={plus_di:.1f}, -DI={minus_di:.1f}"
-                            if plus_di is not None and minus_di is not None
-                            else ""
+    def _build_stages(self, ctx: FilterContext) -> List[FilterStage]:
+        """
+        Шаги фильтрации для сигнала (только включенные фильтры).
+
+        Исходный порядок (pre -> trend -> entry -> market) - порядок по умолчанию,
+        FilterPlanner переупорядочивает шаги по стоимости и доле блокировок.
+        """
+        impulse_relax, is_impulse = ctx.impulse_relax, ctx.is_impulse
+        bypass_mtf = bool(is_impulse and impulse_relax.get("allow_mtf_bypass", False))
+        bypass_correlation = bool(
+            is_impulse and impulse_relax.get("bypass_correlation", False)
+        )
+        candidates = [
+            # ==================== PRE-FILTERS ====================
+            (self.adx_filter, "adx", self._stage_adx, False),
+            (True, "adx_direction", self._stage_adx_direction, False),
+            # Импульсы могут обходить волатильность
+            (
+                self.volatility_filter and not is_impulse,
+                "volatility",
+                self._stage_volatility,
+                False,
+            ),
+            # ==================== TREND FILTERS ====================
+            (self.mtf_filter and not bypass_mtf, "mtf", self._stage_mtf, False),
+            (
+                self.correlation_filter and not bypass_correlation,
+                "correlation",
+                self._stage_correlation,
+                False,
+            ),
+            # ==================== ENTRY FILTERS ====================
+            (self.pivot_points_filter, "pivot_points", self._stage_pivot_points, True),
+            (
+                self.volume_profile_filter,
+                "volume_profile",
+                self._stage_volume_profile,
+                True,
+            ),
+            (self.liquidity_filter, "liquidity", self._stage_liquidity, True),
+            # ==================== MARKET FILTERS ====================
+            (self.order_flow_filter, "order_flow", self._stage_order_flow, True),
+            (self.funding_rate_filter, "funding", self._stage_funding, True),
+        ]
+        return [
+            FilterStage(name, run, slow=slow, prior_cost_ms=5.0 if slow else 0.1)
+            for enabled, name, run, slow in candidates
+            if enabled
+        ]
+
+    def get_planner_stats(self) -> Dict[str, Any]:
+        """Статистика планировщика фильтров (стоимость, доля блокировок, дедлайны)."""
+        return self.planner.get_stats()
+
+    def get_funnel_traces(
+        self, symbol: Optional[str] = None, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Последние funnel trace сигналов (какие фильтры, сколько мс, кто заблокировал)."""
+        return self.planner.get_traces(symbol=symbol, limit=limit)
+
+    # ==================== ШАГИ ФИЛЬТРАЦИИ ====================
+
+    async def _stage_adx(self, ctx: FilterContext) -> bool:
+        """1. ADX Filter (проверка тренда и силы) с кэшем результата."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
+
+            # Пытаемся получить из кэша
+            cached_adx_result = self._get_cached_filter_result(symbol, "adx")
+            use_cache = cached_adx_result is not None
+            if use_cache:
+                # ✅ УЛУЧШЕНИЕ (10.01.2026): Получаем фактические значения ADX для логирования
+                adx_value = None
+                plus_di = None
+                minus_di = None
+                try:
+                    if market_data and hasattr(market_data, "indicators"):
+                        indicators = market_data.indicators
+                        adx_value = _get_indicator(indicators, "adx", "ADX")
+                        plus_di = _get_indicator(
+                            indicators, "adx_plus_di", "+DI", "DI_PLUS"
                         )
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): ADX Filter - PASSED (из кэша) | "
-                            f"{adx_str}{di_str}, Режим: {regime or 'unknown'} | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
+                        minus_di = _get_indicator(
+                            indicators, "adx_minus_di", "-DI", "DI_MINUS"
                         )
+                except Exception as exc:
+                    logger.debug("Ignored error in optional block: %s", exc)
+
+                adx_has_data = adx_value is not None
+                if cached_adx_result is False and not adx_has_data:
+                    logger.debug(
+                        f"🔍 ADX cache bypass for {symbol}: cached=False but ADX missing"
+                    )
+                    use_cache = False
+
+            if use_cache:
+                # Используем кэш - ADX меняется медленно
+                if not cached_adx_result:
+                    # ✅ УЛУЧШЕНО: Логируем значения даже из кэша
+                    adx_str = f"ADX={adx_value:.1f}" if adx_value else "ADX=N/A"
+                    di_str = (
+                        f", +DI={plus_di:.1f}, -DI={minus_di:.1f}"
+                        if plus_di is not None and minus_di is not None
+                        else ""
+                    )
+                    signal[
+                        "filter_reason"
+                    ] = f"ADX Filter (cached): blocked | {adx_str}{di_str}, regime={regime or 'unknown'}"
+                    logger.info(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): ADX Filter - BLOCKED (из кэша) | "
+                        f"{adx_str}{di_str}, Режим: {regime or 'unknown'} | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
+                    )
+                    return False
                 else:
-                    # Кэша нет - вычисляем и сохраняем
-                    signal = await self._apply_adx_filter(
-                        symbol, signal, market_data, regime=regime
+                    # ADX прошел - добавляем в список пройденных фильтров
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("ADX")
+                    # ✅ УЛУЧШЕНО: Логируем значения даже из кэша
+                    adx_str = f"ADX={adx_value:.1f}" if adx_value else "ADX=N/A"
+                    di_str = (
+                        f", +DI={plus_di:.1f}, -DI={minus_di:.1f}"
+                        if plus_di is not None and minus_di is not None
+                        else ""
                     )
-                    if signal is None:
-                        # Сохраняем в кэш только при валидном ADX
-                        if await self._is_adx_data_available(symbol, market_data):
-                            self._set_cached_filter_result(symbol, "adx", False)
-                        else:
-                            logger.debug(f"🔍 ADX cache skip for {symbol}: no ADX data")
-                        # ✅ НОВОЕ: Причина фильтрации уже сохранена в signal["filter_reason"] в _apply_adx_filter
-                        # Детальное логирование происходит в _apply_adx_filter
-                        logger.debug(f"🔍 Сигнал {symbol} отфильтрован: ADX Filter")
-                        return None
+                    logger.debug(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): ADX Filter - PASSED (из кэша) | "
+                        f"{adx_str}{di_str}, Режим: {regime or 'unknown'} | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
+                    )
+            else:
+                # Кэша нет - вычисляем и сохраняем
+                signal = await self._apply_adx_filter(
+                    symbol, signal, market_data, regime=regime
+                )
+                if signal is None:
+                    # Сохраняем в кэш только при валидном ADX
+                    if await self._is_adx_data_available(symbol, market_data):
+                        self._set_cached_filter_result(symbol, "adx", False)
                     else:
-                        # Сохраняем в кэш только при валидном ADX
-                        if await self._is_adx_data_available(symbol, market_data):
-                            self._set_cached_filter_result(symbol, "adx", True)
-                        else:
-                            logger.debug(f"🔍 ADX cache skip for {symbol}: no ADX data")
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("ADX")
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка ADX фильтра для {symbol}: {e}")
+                        logger.debug(f"🔍 ADX cache skip for {symbol}: no ADX data")
+                    # ✅ НОВОЕ: Причина фильтрации уже сохранена в signal["filter_reason"] в _apply_adx_filter
+                    # Детальное логирование происходит в _apply_adx_filter
+                    logger.debug(f"🔍 Сигнал {symbol} отфильтрован: ADX Filter")
+                    return False
+                else:
+                    # Сохраняем в кэш только при валидном ADX
+                    if await self._is_adx_data_available(symbol, market_data):
+                        self._set_cached_filter_result(symbol, "adx", True)
+                    else:
+                        logger.debug(f"🔍 ADX cache skip for {symbol}: no ADX data")
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("ADX")
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка ADX фильтра для {symbol}: {e}")
+        return True
 
-        # ✅ УЛУЧШЕНИЕ #3: Дополнительная проверка направления тренда
-        # Не входить против тренда (если ADX показывает сильный тренд в противоположном направлении)
+    async def _stage_adx_direction(self, ctx: FilterContext) -> bool:
+        """Дополнительная проверка направления тренда по ADX/DI."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
         try:
             if market_data and hasattr(market_data, "indicators"):
                 indicators = market_data.indicators
@@ -398,7 +492,7 @@ class FilterManager:
                         signal_side_str,
                         regime,
                     )
-                    return None
+                    return False
                 elif (
                     signal_side == "sell"
                     and di_plus
@@ -420,398 +514,408 @@ class FilterManager:
                         signal_side_str,
                         regime,
                     )
-                    return None
+                    return False
         except Exception as e:
             logger.debug(f"⚠️ Ошибка проверки направления тренда для {symbol}: {e}")
+        return True
 
-        # 2. Volatility Filter (проверка волатильности)
-        if (
-            self.volatility_filter and not is_impulse
-        ):  # Импульсы могут обходить волатильность
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
-                volatility_params = filters_profile.get("volatility", {})
-                volatility_result = await self._apply_volatility_filter(
-                    symbol, signal, market_data, volatility_params
+    async def _stage_volatility(self, ctx: FilterContext) -> bool:
+        """2. Volatility Filter (проверка волатильности)."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        filters_profile = ctx.filters_profile
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
+            volatility_params = filters_profile.get("volatility", {})
+            volatility_result = await self._apply_volatility_filter(
+                symbol, signal, market_data, volatility_params
+            )
+            if not volatility_result:
+                logger.info(
+                    f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volatility Filter - BLOCKED | "
+                    f"Режим: {regime or 'unknown'}, Параметры: {volatility_params} | "
+                    f"Источник: VolatilityFilter (проверка волатильности рынка)"
                 )
-                if not volatility_result:
+                return False
+            else:
+                logger.debug(
+                    f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volatility Filter - PASSED | "
+                    f"Режим: {regime or 'unknown'}, Параметры: {volatility_params} | "
+                    f"Источник: VolatilityFilter (проверка волатильности рынка)"
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка Volatility фильтра для {symbol}: {e}")
+        return True
+
+    async def _stage_mtf(self, ctx: FilterContext) -> bool:
+        """3. MTF Filter (Multi-Timeframe проверка) с кэшем результата."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        filters_profile = ctx.filters_profile
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
+
+            # Пытаемся получить из кэша
+            cached_mtf_result = self._get_cached_filter_result(symbol, "mtf")
+            if cached_mtf_result is not None:
+                # Используем кэш - MTF меняется медленно
+                if not cached_mtf_result:
                     logger.info(
-                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volatility Filter - BLOCKED | "
-                        f"Режим: {regime or 'unknown'}, Параметры: {volatility_params} | "
-                        f"Источник: VolatilityFilter (проверка волатильности рынка)"
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): MTF Filter - BLOCKED (из кэша) | "
+                        f"Режим: {regime or 'unknown'} | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
                     )
-                    return None
+                    return False
                 else:
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("MTF")
                     logger.debug(
-                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volatility Filter - PASSED | "
-                        f"Режим: {regime or 'unknown'}, Параметры: {volatility_params} | "
-                        f"Источник: VolatilityFilter (проверка волатильности рынка)"
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): MTF Filter - PASSED (из кэша) | "
+                        f"Режим: {regime or 'unknown'} | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
                     )
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка Volatility фильтра для {symbol}: {e}")
+            else:
+                # Кэша нет - вычисляем и сохраняем
+                mtf_params = filters_profile.get("mtf", {})
+                mtf_result = await self._apply_mtf_filter(
+                    symbol, signal, market_data, mtf_params
+                )
+                # Сохраняем в кэш
+                self._set_cached_filter_result(symbol, "mtf", mtf_result)
+                if not mtf_result:
+                    logger.info(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): MTF Filter - BLOCKED | "
+                        f"Режим: {regime or 'unknown'}, Параметры: {mtf_params} | "
+                        f"Источник: MTFFilter.is_signal_valid() -> Multi-Timeframe анализ"
+                    )
+                    return False
+                else:
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("MTF")
+                    logger.debug(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): MTF Filter - PASSED | "
+                        f"Режим: {regime or 'unknown'}, Параметры: {mtf_params} | "
+                        f"Источник: MTFFilter.is_signal_valid() -> Multi-Timeframe анализ"
+                    )
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка MTF фильтра для {symbol}: {e}")
+        return True
+
+    async def _stage_correlation(self, ctx: FilterContext) -> bool:
+        """4. Correlation Filter (проверка корреляции)."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
+            correlation_result = await self._apply_correlation_filter(symbol, signal)
+            if not correlation_result:
+                logger.info(
+                    f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Correlation Filter - BLOCKED | "
+                    f"Режим: {regime or 'unknown'} | "
+                    f"Источник: CorrelationFilter.is_signal_valid() -> Анализ корреляции с текущими позициями"
+                )
+                return False
+            else:
+                # ✅ НОВОЕ: Добавляем в список пройденных фильтров
+                if "filters_passed" not in signal:
+                    signal["filters_passed"] = []
+                signal["filters_passed"].append("Correlation")
+                logger.debug(
+                    f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Correlation Filter - PASSED | "
+                    f"Режим: {regime or 'unknown'} | "
+                    f"Источник: CorrelationFilter.is_signal_valid() -> Анализ корреляции с текущими позициями"
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка Correlation фильтра для {symbol}: {e}")
+        return True
 
-        # ==================== TREND FILTERS ====================
+    async def _stage_pivot_points(self, ctx: FilterContext) -> bool:
+        """5. Pivot Points Filter (проверка уровня) с кэшем результата."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        filters_profile = ctx.filters_profile
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
+            signal_price = signal.get("price", 0.0)
 
-        # 3. MTF Filter (Multi-Timeframe проверка)
-        # ✅ ГРОК ОПТИМИЗАЦИЯ: Проверяем кэш перед расчетом
-        bypass_mtf = bool(is_impulse and impulse_relax.get("allow_mtf_bypass", False))
-        if self.mtf_filter and not bypass_mtf:
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
-
-                # Пытаемся получить из кэша
-                cached_mtf_result = self._get_cached_filter_result(symbol, "mtf")
-                if cached_mtf_result is not None:
-                    # Используем кэш - MTF меняется медленно
-                    if not cached_mtf_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): MTF Filter - BLOCKED (из кэша) | "
-                            f"Режим: {regime or 'unknown'} | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
-                        )
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("MTF")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): MTF Filter - PASSED (из кэша) | "
-                            f"Режим: {regime or 'unknown'} | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
-                        )
+            # Пытаемся получить из кэша
+            cached_pivot_result = self._get_cached_filter_result(symbol, "pivot")
+            if cached_pivot_result is not None:
+                # Используем кэш - Pivot Points меняются медленно (раз в день)
+                if not cached_pivot_result:
+                    logger.info(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Pivot Points Filter - BLOCKED (из кэша) | "
+                        f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'} | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s, Pivot Points обновляются раз в день)"
+                    )
+                    return False
                 else:
-                    # Кэша нет - вычисляем и сохраняем
-                    mtf_params = filters_profile.get("mtf", {})
-                    mtf_result = await self._apply_mtf_filter(
-                        symbol, signal, market_data, mtf_params
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("PivotPoints")
+                    logger.debug(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Pivot Points Filter - PASSED (из кэша) | "
+                        f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'} | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
                     )
-                    # Сохраняем в кэш
-                    self._set_cached_filter_result(symbol, "mtf", mtf_result)
-                    if not mtf_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): MTF Filter - BLOCKED | "
-                            f"Режим: {regime or 'unknown'}, Параметры: {mtf_params} | "
-                            f"Источник: MTFFilter.is_signal_valid() -> Multi-Timeframe анализ"
-                        )
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("MTF")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): MTF Filter - PASSED | "
-                            f"Режим: {regime or 'unknown'}, Параметры: {mtf_params} | "
-                            f"Источник: MTFFilter.is_signal_valid() -> Multi-Timeframe анализ"
-                        )
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка MTF фильтра для {symbol}: {e}")
-
-        # 4. Correlation Filter (проверка корреляции)
-        bypass_correlation = bool(
-            is_impulse and impulse_relax.get("bypass_correlation", False)
-        )
-        if self.correlation_filter and not bypass_correlation:
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
-                correlation_result = await self._apply_correlation_filter(
-                    symbol, signal
+            else:
+                # Кэша нет - вычисляем и сохраняем
+                pivot_params = filters_profile.get("pivot_points", {})
+                pivot_result = await self._apply_pivot_points_filter(
+                    symbol, signal, market_data, pivot_params
                 )
-                if not correlation_result:
+                # Сохраняем в кэш
+                self._set_cached_filter_result(symbol, "pivot", pivot_result)
+                if not pivot_result:
                     logger.info(
-                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Correlation Filter - BLOCKED | "
-                        f"Режим: {regime or 'unknown'} | "
-                        f"Источник: CorrelationFilter.is_signal_valid() -> Анализ корреляции с текущими позициями"
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Pivot Points Filter - BLOCKED | "
+                        f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'}, Параметры: {pivot_params} | "
+                        f"Источник: PivotPointsFilter.is_signal_valid() -> Анализ уровней pivot points"
                     )
-                    return None
+                    return False
                 else:
-                    # ✅ НОВОЕ: Добавляем в список пройденных фильтров
                     if "filters_passed" not in signal:
                         signal["filters_passed"] = []
-                    signal["filters_passed"].append("Correlation")
+                    signal["filters_passed"].append("PivotPoints")
                     logger.debug(
-                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Correlation Filter - PASSED | "
-                        f"Режим: {regime or 'unknown'} | "
-                        f"Источник: CorrelationFilter.is_signal_valid() -> Анализ корреляции с текущими позициями"
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Pivot Points Filter - PASSED | "
+                        f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'}, Параметры: {pivot_params} | "
+                        f"Источник: PivotPointsFilter.is_signal_valid() -> Анализ уровней pivot points"
                     )
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка Correlation фильтра для {symbol}: {e}")
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка Pivot Points фильтра для {symbol}: {e}")
+        return True
 
-        # ==================== ENTRY FILTERS ====================
+    async def _stage_volume_profile(self, ctx: FilterContext) -> bool:
+        """6. Volume Profile Filter (проверка объема), медленный TTL кэша."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        filters_profile = ctx.filters_profile
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
+            signal_price = signal.get("price", 0.0)
 
-        # 5. Pivot Points Filter (проверка уровня)
-        # ✅ ГРОК ОПТИМИЗАЦИЯ: Проверяем кэш перед расчетом
-        if self.pivot_points_filter:
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
-                signal_price = signal.get("price", 0.0)
-
-                # Пытаемся получить из кэша
-                cached_pivot_result = self._get_cached_filter_result(symbol, "pivot")
-                if cached_pivot_result is not None:
-                    # Используем кэш - Pivot Points меняются медленно (раз в день)
-                    if not cached_pivot_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Pivot Points Filter - BLOCKED (из кэша) | "
-                            f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'} | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s, Pivot Points обновляются раз в день)"
-                        )
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("PivotPoints")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Pivot Points Filter - PASSED (из кэша) | "
-                            f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'} | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_fast:.0f}s)"
-                        )
+            # Пытаемся получить из кэша (используем медленный TTL 30s)
+            cached_vp_result = self._get_cached_filter_result(
+                symbol, "volume_profile", use_slow_ttl=True
+            )
+            if cached_vp_result is not None:
+                # Используем кэш - Volume Profile меняется медленно (historical data)
+                if not cached_vp_result:
+                    logger.info(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volume Profile Filter - BLOCKED (из кэша) | "
+                        f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'} | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s, Volume Profile обновляется медленно)"
+                    )
+                    return False
                 else:
-                    # Кэша нет - вычисляем и сохраняем
-                    pivot_params = filters_profile.get("pivot_points", {})
-                    pivot_result = await self._apply_pivot_points_filter(
-                        symbol, signal, market_data, pivot_params
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("VolumeProfile")
+                    logger.debug(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volume Profile Filter - PASSED (из кэша) | "
+                        f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'} | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s)"
                     )
-                    # Сохраняем в кэш
-                    self._set_cached_filter_result(symbol, "pivot", pivot_result)
-                    if not pivot_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Pivot Points Filter - BLOCKED | "
-                            f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'}, Параметры: {pivot_params} | "
-                            f"Источник: PivotPointsFilter.is_signal_valid() -> Анализ уровней pivot points"
-                        )
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("PivotPoints")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Pivot Points Filter - PASSED | "
-                            f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'}, Параметры: {pivot_params} | "
-                            f"Источник: PivotPointsFilter.is_signal_valid() -> Анализ уровней pivot points"
-                        )
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка Pivot Points фильтра для {symbol}: {e}")
-
-        # 6. Volume Profile Filter (проверка объема)
-        # ✅ ГРОК ОПТИМИЗАЦИЯ: Проверяем кэш перед расчетом (TTL 30s для тяжелых фильтров)
-        if self.volume_profile_filter:
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
-                signal_price = signal.get("price", 0.0)
-
-                # Пытаемся получить из кэша (используем медленный TTL 30s)
-                cached_vp_result = self._get_cached_filter_result(
-                    symbol, "volume_profile", use_slow_ttl=True
+            else:
+                # Кэша нет - вычисляем и сохраняем
+                vp_params = filters_profile.get("volume_profile", {})
+                vp_result = await self._apply_volume_profile_filter(
+                    symbol, signal, market_data, vp_params
                 )
-                if cached_vp_result is not None:
-                    # Используем кэш - Volume Profile меняется медленно (historical data)
-                    if not cached_vp_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volume Profile Filter - BLOCKED (из кэша) | "
-                            f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'} | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s, Volume Profile обновляется медленно)"
-                        )
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("VolumeProfile")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volume Profile Filter - PASSED (из кэша) | "
-                            f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'} | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s)"
-                        )
+                # Сохраняем в кэш
+                self._set_cached_filter_result(symbol, "volume_profile", vp_result)
+                if not vp_result:
+                    logger.info(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volume Profile Filter - BLOCKED | "
+                        f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'}, Параметры: {vp_params} | "
+                        f"Источник: VolumeProfileFilter.is_signal_valid() -> Анализ объемного профиля (historical data)"
+                    )
+                    return False
                 else:
-                    # Кэша нет - вычисляем и сохраняем
-                    vp_params = filters_profile.get("volume_profile", {})
-                    vp_result = await self._apply_volume_profile_filter(
-                        symbol, signal, market_data, vp_params
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("VolumeProfile")
+                    logger.debug(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volume Profile Filter - PASSED | "
+                        f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'}, Параметры: {vp_params} | "
+                        f"Источник: VolumeProfileFilter.is_signal_valid() -> Анализ объемного профиля (historical data)"
                     )
-                    # Сохраняем в кэш
-                    self._set_cached_filter_result(symbol, "volume_profile", vp_result)
-                    if not vp_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volume Profile Filter - BLOCKED | "
-                            f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'}, Параметры: {vp_params} | "
-                            f"Источник: VolumeProfileFilter.is_signal_valid() -> Анализ объемного профиля (historical data)"
-                        )
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("VolumeProfile")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Volume Profile Filter - PASSED | "
-                            f"Цена: ${signal_price:.2f}, Режим: {regime or 'unknown'}, Параметры: {vp_params} | "
-                            f"Источник: VolumeProfileFilter.is_signal_valid() -> Анализ объемного профиля (historical data)"
-                        )
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка Volume Profile фильтра для {symbol}: {e}")
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка Volume Profile фильтра для {symbol}: {e}")
+        return True
 
-        # 7. Liquidity Filter (проверка ликвидности)
-        # ✅ ГРОК ОПТИМИЗАЦИЯ: Проверяем кэш перед расчетом (TTL 30s для тяжелых фильтров)
+    async def _stage_liquidity(self, ctx: FilterContext) -> bool:
+        """7. Liquidity Filter (проверка ликвидности), медленный TTL кэша."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        filters_profile = ctx.filters_profile
+        impulse_relax, is_impulse = ctx.impulse_relax, ctx.is_impulse
         liquidity_relax = (
             float(impulse_relax.get("liquidity", 1.0)) if is_impulse else 1.0
         )
-        if self.liquidity_filter:
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
 
-                # Пытаемся получить из кэша (используем медленный TTL 30s)
-                cached_liquidity_result = self._get_cached_filter_result(
-                    symbol, "liquidity", use_slow_ttl=True
-                )
-                if cached_liquidity_result is not None:
-                    # Используем кэш - Liquidity меняется медленно (API calls)
-                    if not cached_liquidity_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Liquidity Filter - BLOCKED (из кэша) | "
-                            f"Режим: {regime or 'unknown'}, Relax: {liquidity_relax:.2f}x | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s, Liquidity обновляется через API)"
-                        )
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("Liquidity")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Liquidity Filter - PASSED (из кэша) | "
-                            f"Режим: {regime or 'unknown'}, Relax: {liquidity_relax:.2f}x | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s)"
-                        )
+            # Пытаемся получить из кэша (используем медленный TTL 30s)
+            cached_liquidity_result = self._get_cached_filter_result(
+                symbol, "liquidity", use_slow_ttl=True
+            )
+            if cached_liquidity_result is not None:
+                # Используем кэш - Liquidity меняется медленно (API calls)
+                if not cached_liquidity_result:
+                    logger.info(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Liquidity Filter - BLOCKED (из кэша) | "
+                        f"Режим: {regime or 'unknown'}, Relax: {liquidity_relax:.2f}x | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s, Liquidity обновляется через API)"
+                    )
+                    return False
                 else:
-                    # Кэша нет - вычисляем и сохраняем
-                    liquidity_params = filters_profile.get("liquidity", {})
-                    liquidity_result = await self._apply_liquidity_filter(
-                        symbol, signal, market_data, liquidity_params, liquidity_relax
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("Liquidity")
+                    logger.debug(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Liquidity Filter - PASSED (из кэша) | "
+                        f"Режим: {regime or 'unknown'}, Relax: {liquidity_relax:.2f}x | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s)"
                     )
-                    # Сохраняем в кэш
-                    self._set_cached_filter_result(
-                        symbol, "liquidity", liquidity_result
+            else:
+                # Кэша нет - вычисляем и сохраняем
+                liquidity_params = filters_profile.get("liquidity", {})
+                liquidity_result = await self._apply_liquidity_filter(
+                    symbol, signal, market_data, liquidity_params, liquidity_relax
+                )
+                # Сохраняем в кэш
+                self._set_cached_filter_result(symbol, "liquidity", liquidity_result)
+                if not liquidity_result:
+                    logger.info(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Liquidity Filter - BLOCKED | "
+                        f"Режим: {regime or 'unknown'}, Параметры: {liquidity_params}, Relax: {liquidity_relax:.2f}x | "
+                        f"Источник: LiquidityFilter -> API запрос данных о ликвидности"
                     )
-                    if not liquidity_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Liquidity Filter - BLOCKED | "
-                            f"Режим: {regime or 'unknown'}, Параметры: {liquidity_params}, Relax: {liquidity_relax:.2f}x | "
-                            f"Источник: LiquidityFilter -> API запрос данных о ликвидности"
-                        )
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("Liquidity")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Liquidity Filter - PASSED | "
-                            f"Режим: {regime or 'unknown'}, Параметры: {liquidity_params}, Relax: {liquidity_relax:.2f}x | "
-                            f"Источник: LiquidityFilter -> API запрос данных о ликвидности"
-                        )
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка Liquidity фильтра для {symbol}: {e}")
-
-        # ==================== MARKET FILTERS ====================
+                    return False
+                else:
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("Liquidity")
+                    logger.debug(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Liquidity Filter - PASSED | "
+                        f"Режим: {regime or 'unknown'}, Параметры: {liquidity_params}, Relax: {liquidity_relax:.2f}x | "
+                        f"Источник: LiquidityFilter -> API запрос данных о ликвидности"
+                    )
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка Liquidity фильтра для {symbol}: {e}")
+        return True
 
-        # 8. Order Flow Filter (проверка потока ордеров)
-        # ✅ ГРОК ОПТИМИЗАЦИЯ: Проверяем кэш перед расчетом (TTL 30s для тяжелых фильтров)
+    async def _stage_order_flow(self, ctx: FilterContext) -> bool:
+        """8. Order Flow Filter (проверка потока ордеров), медленный TTL кэша."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        filters_profile = ctx.filters_profile
+        impulse_relax, is_impulse = ctx.impulse_relax, ctx.is_impulse
         order_flow_relax = (
             float(impulse_relax.get("order_flow", 1.0)) if is_impulse else 1.0
         )
-        if self.order_flow_filter:
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
 
-                # Пытаемся получить из кэша (используем медленный TTL 30s)
-                cached_of_result = self._get_cached_filter_result(
-                    symbol, "order_flow", use_slow_ttl=True
-                )
-                if cached_of_result is not None:
-                    # Используем кэш - Order Flow меняется медленно (API calls)
-                    if not cached_of_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Order Flow Filter - BLOCKED (из кэша) | "
-                            f"Режим: {regime or 'unknown'}, Relax: {order_flow_relax:.2f}x | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s, Order Flow обновляется через API)"
-                        )
-                        signal[
-                            "filter_reason"
-                        ] = f"Order Flow Filter (cached): BLOCKED | Режим: {regime or 'unknown'}, Relax: {order_flow_relax:.2f}x"
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("OrderFlow")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Order Flow Filter - PASSED (из кэша) | "
-                            f"Режим: {regime or 'unknown'}, Relax: {order_flow_relax:.2f}x | "
-                            f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s)"
-                        )
+            # Пытаемся получить из кэша (используем медленный TTL 30s)
+            cached_of_result = self._get_cached_filter_result(
+                symbol, "order_flow", use_slow_ttl=True
+            )
+            if cached_of_result is not None:
+                # Используем кэш - Order Flow меняется медленно (API calls)
+                if not cached_of_result:
+                    logger.info(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Order Flow Filter - BLOCKED (из кэша) | "
+                        f"Режим: {regime or 'unknown'}, Relax: {order_flow_relax:.2f}x | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s, Order Flow обновляется через API)"
+                    )
+                    signal[
+                        "filter_reason"
+                    ] = f"Order Flow Filter (cached): BLOCKED | Режим: {regime or 'unknown'}, Relax: {order_flow_relax:.2f}x"
+                    return False
                 else:
-                    # Кэша нет - вычисляем и сохраняем
-                    order_flow_params = filters_profile.get("order_flow", {})
-                    of_result = await self._apply_order_flow_filter(
-                        symbol, signal, market_data, order_flow_params, order_flow_relax
+                    if "filters_passed" not in signal:
+                        signal["filters_passed"] = []
+                    signal["filters_passed"].append("OrderFlow")
+                    logger.debug(
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Order Flow Filter - PASSED (из кэша) | "
+                        f"Режим: {regime or 'unknown'}, Relax: {order_flow_relax:.2f}x | "
+                        f"Источник: FilterManager._get_cached_filter_result() (TTL={self.filter_cache_ttl_slow:.0f}s)"
                     )
-                    # Сохраняем в кэш
-                    self._set_cached_filter_result(symbol, "order_flow", of_result)
-                    if not of_result:
-                        logger.info(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Order Flow Filter - BLOCKED | "
-                            f"Режим: {regime or 'unknown'}, Параметры: {order_flow_params}, Relax: {order_flow_relax:.2f}x | "
-                            f"Источник: OrderFlowFilter -> API запрос данных о потоке ордеров"
-                        )
-                        signal[
-                            "filter_reason"
-                        ] = f"Order Flow Filter: BLOCKED | Режим: {regime or 'unknown'}, Relax: {order_flow_relax:.2f}x"
-                        return None
-                    else:
-                        if "filters_passed" not in signal:
-                            signal["filters_passed"] = []
-                        signal["filters_passed"].append("OrderFlow")
-                        logger.debug(
-                            f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Order Flow Filter - PASSED | "
-                            f"Режим: {regime or 'unknown'}, Параметры: {order_flow_params}, Relax: {order_flow_relax:.2f}x | "
-                            f"Источник: OrderFlowFilter -> API запрос данных о потоке ордеров"
-                        )
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка Order Flow фильтра для {symbol}: {e}")
-
-        # 9. Funding Rate Filter (проверка funding rate)
-        if self.funding_rate_filter:
-            try:
-                signal_side_str = signal.get("side", "").upper()
-                signal_type_str = signal.get("type", "unknown")
-                funding_params = filters_profile.get("funding", {})
-                funding_result = await self._apply_funding_rate_filter(
-                    symbol, signal, funding_params
+            else:
+                # Кэша нет - вычисляем и сохраняем
+                order_flow_params = filters_profile.get("order_flow", {})
+                of_result = await self._apply_order_flow_filter(
+                    symbol, signal, market_data, order_flow_params, order_flow_relax
                 )
-                if not funding_result:
+                # Сохраняем в кэш
+                self._set_cached_filter_result(symbol, "order_flow", of_result)
+                if not of_result:
                     logger.info(
-                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Funding Rate Filter - BLOCKED | "
-                        f"Режим: {regime or 'unknown'}, Параметры: {funding_params} | "
-                        f"Источник: FundingRateFilter -> API запрос funding rate"
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Order Flow Filter - BLOCKED | "
+                        f"Режим: {regime or 'unknown'}, Параметры: {order_flow_params}, Relax: {order_flow_relax:.2f}x | "
+                        f"Источник: OrderFlowFilter -> API запрос данных о потоке ордеров"
                     )
-                    return None
+                    signal[
+                        "filter_reason"
+                    ] = f"Order Flow Filter: BLOCKED | Режим: {regime or 'unknown'}, Relax: {order_flow_relax:.2f}x"
+                    return False
                 else:
-                    # ✅ НОВОЕ: Добавляем в список пройденных фильтров
                     if "filters_passed" not in signal:
                         signal["filters_passed"] = []
-                    signal["filters_passed"].append("FundingRate")
+                    signal["filters_passed"].append("OrderFlow")
                     logger.debug(
-                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Funding Rate Filter - PASSED | "
-                        f"Режим: {regime or 'unknown'}, Параметры: {funding_params} | "
-                        f"Источник: FundingRateFilter -> API запрос funding rate"
+                        f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Order Flow Filter - PASSED | "
+                        f"Режим: {regime or 'unknown'}, Параметры: {order_flow_params}, Relax: {order_flow_relax:.2f}x | "
+                        f"Источник: OrderFlowFilter -> API запрос данных о потоке ордеров"
                     )
-            except Exception as e:
-                logger.warning(f"⚠️ Ошибка Funding Rate фильтра для {symbol}: {e}")
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка Order Flow фильтра для {symbol}: {e}")
+        return True
 
-        # Все фильтры пройдены
-        return signal
+    async def _stage_funding(self, ctx: FilterContext) -> bool:
+        """9. Funding Rate Filter (проверка funding rate)."""
+        symbol, signal, market_data = ctx.symbol, ctx.signal, ctx.market_data
+        regime = ctx.regime
+        filters_profile = ctx.filters_profile
+        try:
+            signal_side_str = signal.get("side", "").upper()
+            signal_type_str = signal.get("type", "unknown")
+            funding_params = filters_profile.get("funding", {})
+            funding_result = await self._apply_funding_rate_filter(
+                symbol, signal, funding_params
+            )
+            if not funding_result:
+                logger.info(
+                    f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Funding Rate Filter - BLOCKED | "
+                    f"Режим: {regime or 'unknown'}, Параметры: {funding_params} | "
+                    f"Источник: FundingRateFilter -> API запрос funding rate"
+                )
+                return False
+            else:
+                # ✅ НОВОЕ: Добавляем в список пройденных фильтров
+                if "filters_passed" not in signal:
+                    signal["filters_passed"] = []
+                signal["filters_passed"].append("FundingRate")
+                logger.debug(
+                    f"📊 [FILTER] {symbol} ({signal_type_str} {signal_side_str}): Funding Rate Filter - PASSED | "
+                    f"Режим: {regime or 'unknown'}, Параметры: {funding_params} | "
+                    f"Источник: FundingRateFilter -> API запрос funding rate"
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Ошибка Funding Rate фильтра для {symbol}: {e}")
+        return True
 
     # ==================== HELPER METHODS для каждого фильтра ====================
 
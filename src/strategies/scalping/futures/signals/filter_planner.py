@@ -0,0 +1,281 @@
+"""
+FilterPlanner - Планировщик исполнения фильтров сигнала.
+
+Фильтры FilterManager образуют конъюнкцию (сигнал проходит, только если прошли
+все), поэтому решение не зависит от порядка, а стоимость - зависит:
+- Для каждого фильтра по (symbol, regime) копятся стоимость (EWMA, мс) и доля блокировок
+- Быстрые фильтры выполняются по возрастанию cost / reject_rate до первой блокировки
+- Медленные (REST) фильтры запускаются конкурентно с дедлайном
+- Каждый прогон возвращает FilterVerdict (он же funnel trace сигнала)
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .signal_model import FilterVerdict
+
+
+@dataclass
+class FilterContext:
+    """Входные данные одного прогона фильтров."""
+
+    symbol: str
+    signal: Dict[str, Any]
+    market_data: Any
+    regime: Optional[str] = None
+    filters_profile: Dict[str, Any] = field(default_factory=dict)
+    impulse_relax: Dict[str, Any] = field(default_factory=dict)
+    is_impulse: bool = False
+
+
+@dataclass
+class FilterStage:
+    """Шаг плана: run(ctx) -> True (пропустить) / False (заблокировать)."""
+
+    name: str
+    run: Callable[[FilterContext], Awaitable[bool]]
+    slow: bool = False  # может ждать REST - кандидат на конкурентный запуск
+    prior_cost_ms: float = 0.1
+
+
+class _StageStats:
+    __slots__ = ("calls", "rejects", "cost_ms", "timeouts")
+
+    def __init__(self, prior_cost_ms: float):
+        self.calls = 0
+        self.rejects = 0
+        self.cost_ms = prior_cost_ms
+        self.timeouts = 0
+
+    @property
+    def reject_rate(self) -> float:
+        # Сглаживание Лапласа: без истории считаем 50/50
+        return (self.rejects + 1) / (self.calls + 2)
+
+
+class FilterPlanner:
+    """
+    Упорядочивает и исполняет шаги FilterManager.
+
+    Конфиг (scalping.filter_planner):
+        enabled: false -> фиксированный порядок, последовательно
+        concurrent_slow: true -> медленные фильтры параллельно
+        slow_deadline_sec: 5.0 -> дедлайн группы медленных фильтров
+        ewma_alpha: 0.2
+        trace_size: 200
+    """
+
+    def __init__(self, config: Optional[Any] = None):
+        if config is not None and not isinstance(config, dict):
+            config = dict(getattr(config, "__dict__", {}) or {})
+        config = config or {}
+        self.enabled = bool(config.get("enabled", True))
+        self.concurrent_slow = bool(config.get("concurrent_slow", True))
+        deadline = config.get("slow_deadline_sec", 5.0)
+        self.slow_deadline_sec = float(deadline) if deadline else None
+        self.ewma_alpha = float(config.get("ewma_alpha", 0.2))
+
+        self._stats: Dict[Tuple[str, str, str], _StageStats] = {}
+        self.traces: Deque[FilterVerdict] = deque(
+            maxlen=int(config.get("trace_size", 200))
+        )
+        self.counters = {"runs": 0, "passed": 0, "blocked": 0, "timeouts": 0}
+
+    # ------------------------------------------------------------ статистика
+
+    def _stat(self, stage: FilterStage, symbol: str, regime: str) -> _StageStats:
+        key = (stage.name, symbol, regime)
+        stat = self._stats.get(key)
+        if stat is None:
+            stat = self._stats[key] = _StageStats(stage.prior_cost_ms)
+        return stat
+
+    def _record(
+        self,
+        stage: FilterStage,
+        ctx: FilterContext,
+        passed: bool,
+        cost_ms: float,
+    ) -> None:
+        stat = self._stat(stage, ctx.symbol, (ctx.regime or "unknown").lower())
+        stat.calls += 1
+        if not passed:
+            stat.rejects += 1
+        stat.cost_ms += self.ewma_alpha * (cost_ms - stat.cost_ms)
+
+    def plan(
+        self, stages: List[FilterStage], symbol: str, regime: Optional[str]
+    ) -> Tuple[List[FilterStage], List[FilterStage]]:
+        """
+        Разбить шаги на (последовательные, конкурентные).
+
+        Последовательные отсортированы по cost / reject_rate: дешевые и часто
+        блокирующие фильтры идут первыми. Сортировка стабильная - без истории
+        сохраняется исходный порядок.
+        """
+        if not self.enabled:
+            return list(stages), []
+        regime_key = (regime or "unknown").lower()
+
+        def score(stage: FilterStage) -> float:
+            stat = self._stat(stage, symbol, regime_key)
+            return stat.cost_ms / stat.reject_rate
+
+        fast = sorted((s for s in stages if not s.slow), key=score)
+        slow = sorted((s for s in stages if s.slow), key=score)
+        if self.concurrent_slow and len(slow) > 1:
+            return fast, slow
+        return fast + slow, []
+
+    # ------------------------------------------------------------- исполнение
+
+    async def _timed(
+        self, stage: FilterStage, ctx: FilterContext
+    ) -> Tuple[FilterStage, bool, float]:
+        started = time.perf_counter()
+        passed = bool(await stage.run(ctx))
+        return stage, passed, (time.perf_counter() - started) * 1000.0
+
+    async def _run_concurrent(
+        self,
+        stages: List[FilterStage],
+        ctx: FilterContext,
+        steps: List[Dict[str, Any]],
+    ) -> Optional[str]:
+        """Запустить шаги параллельно; вернуть имя блокирующего или None."""
+        tasks = {asyncio.ensure_future(self._timed(s, ctx)): s for s in stages}
+        deadline = (
+            time.perf_counter() + self.slow_deadline_sec
+            if self.slow_deadline_sec
+            else None
+        )
+        blocked_by = None
+        try:
+            pending = set(tasks)
+            while pending and blocked_by is None:
+                timeout = max(0.0, deadline - time.perf_counter()) if deadline else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    stage, passed, cost_ms = task.result()
+                    self._record(stage, ctx, passed, cost_ms)
+                    steps.append(
+                        {
+                            "filter": stage.name,
+                            "passed": passed,
+                            "ms": round(cost_ms, 3),
+                            "mode": "parallel",
+                        }
+                    )
+                    if not passed and blocked_by is None:
+                        blocked_by = stage.name
+
+            # Дедлайн: как и ошибка фильтра, не блокирует сигнал (fail-open)
+            if blocked_by is None:
+                for task in pending:
+                    stage = tasks[task]
+                    self._stat(
+                        stage, ctx.symbol, (ctx.regime or "unknown").lower()
+                    ).timeouts += 1
+                    self.counters["timeouts"] += 1
+                    steps.append(
+                        {"filter": stage.name, "passed": True, "timeout": True}
+                    )
+                    logger.warning(
+                        f"⏱️ FilterPlanner: {stage.name} для {ctx.symbol} не уложился в "
+                        f"{self.slow_deadline_sec:.1f}s - пропускаем фильтр"
+                    )
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        return blocked_by
+
+    async def run(self, stages: List[FilterStage], ctx: FilterContext) -> bool:
+        """
+        Выполнить план фильтров для сигнала.
+
+        Returns:
+            True если все фильтры пропустили сигнал
+        """
+        return (await self.evaluate(stages, ctx)).passed
+
+    async def evaluate(
+        self, stages: List[FilterStage], ctx: FilterContext
+    ) -> FilterVerdict:
+        """Выполнить план фильтров и вернуть FilterVerdict (он же funnel trace)."""
+        started = time.perf_counter()
+        sequential, concurrent = self.plan(stages, ctx.symbol, ctx.regime)
+        verdict = FilterVerdict(
+            ctx.symbol,
+            regime=ctx.regime,
+            side=ctx.signal.get("side"),
+            signal_type=ctx.signal.get("type"),
+        )
+        steps = verdict.steps
+        blocked_by = None
+
+        for stage in sequential:
+            _, passed, cost_ms = await self._timed(stage, ctx)
+            if self.enabled:
+                self._record(stage, ctx, passed, cost_ms)
+            steps.append(
+                {
+                    "filter": stage.name,
+                    "passed": passed,
+                    "ms": round(cost_ms, 3),
+                    "mode": "seq",
+                }
+            )
+            if not passed:
+                blocked_by = stage.name
+                break
+
+        if blocked_by is None and concurrent:
+            blocked_by = await self._run_concurrent(concurrent, ctx, steps)
+
+        self.counters["runs"] += 1
+        self.counters["blocked" if blocked_by else "passed"] += 1
+        verdict.plan = [s.name for s in sequential] + [f"{s.name}*" for s in concurrent]
+        verdict.skipped = len(stages) - len(steps)
+        verdict.blocked_by = blocked_by
+        verdict.total_ms = round((time.perf_counter() - started) * 1000.0, 3)
+        self.traces.append(verdict)
+        return verdict
+
+    # -------------------------------------------------------------- отчетность
+
+    def get_traces(
+        self, symbol: Optional[str] = None, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Последние funnel trace (новые первыми)."""
+        result = []
+        for verdict in reversed(self.traces):
+            if symbol is None or verdict.symbol == symbol:
+                result.append(verdict.as_dict())
+                if len(result) >= limit:
+                    break
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика фильтров: {filter: {symbol|regime: {...}}} + счетчики."""
+        filters: Dict[str, Dict[str, Any]] = {}
+        for (name, symbol, regime), stat in self._stats.items():
+            if not stat.calls and not stat.timeouts:
+                continue
+            filters.setdefault(name, {})[f"{symbol}|{regime}"] = {
+                "calls": stat.calls,
+                "rejects": stat.rejects,
+                "reject_rate": stat.rejects / stat.calls if stat.calls else 0.0,
+                "cost_ms": round(stat.cost_ms, 3),
+                "timeouts": stat.timeouts,
+            }
+        return {**self.counters, "filters": filters}
@@ -0,0 +1,284 @@
+"""
+Signal / FilterVerdict - компактная модель сигнала вместо произвольного dict.
+
+Сигнал проходит _generate_*_signals -> FilterManager -> _filter_and_rank_signals
+-> SignalCoordinator -> FuturesOrderExecutor и по дороге обрастает ключами.
+Signal (__slots__) хранит частые поля в списке фиксированной длины, редкие -
+в лениво создаваемом dict:
+- Доступ signal["x"] / signal.get("x") / "x" in signal работает как у dict
+  (миграционный слой - существующий код менять не нужно)
+- copy() копирует список полей без пересборки словаря
+- annotate() - append-only журнал стадий (кто и что добавил к сигналу)
+- to_tuple() / from_tuple() - быстрая сериализация для CSV и между процессами
+"""
+
+import time
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Поля, которые выставляет почти каждый генератор или добавляет каждая стадия
+CORE_FIELDS = (
+    "symbol",
+    "side",
+    "type",
+    "strength",
+    "price",
+    "timestamp",
+    "confidence",
+    "regime",
+    "indicator_value",
+    "has_conflict",
+    "source",
+    "is_impulse",
+    "filters_passed",
+    # FilterManager / _adapt_signal_for_futures
+    "current_positions",
+    "impulse_relax",
+    "impulse_meta",
+    "leverage_adjusted_strength",
+    "margin_required",
+    "liquidation_risk",
+    "max_position_size",
+)
+
+
+class _Missing:
+    """Маркер отсутствующего поля (переживает pickle)."""
+
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        return "_MISSING"
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+def _core_property(index: int, name: str) -> property:
+    def getter(self: "Signal") -> Any:
+        value = self._values[index]
+        if value is _MISSING:
+            raise AttributeError(name)
+        return value
+
+    def setter(self: "Signal", value: Any) -> None:
+        self._values[index] = value
+
+    return property(getter, setter)
+
+
+class Signal(MutableMapping):
+    """
+    Торговый сигнал с dict-совместимым доступом.
+
+    Частые поля лежат в одном списке фиксированной длины (_values, индекс по
+    CORE_FIELDS), поэтому создание и copy() - это одна C-операция над списком,
+    без словаря на каждый сигнал. Поля доступны и атрибутами: signal.symbol.
+    Отсутствующее поле = отсутствующий ключ: "regime" in signal -> False,
+    пока режим не выставлен, как у dict.
+
+    Пример:
+        signal = Signal(symbol="BTC-USDT", side="buy", type="rsi_oversold",
+                        strength=0.7, price=50000.0, rsi=28.5)
+        signal["regime"] = "ranging"       # основное поле
+        signal["tp_percent"] = 0.4         # доп. поле
+        signal.annotate("filters", "ADX passed")
+    """
+
+    __slots__ = ("_values", "_extra", "_notes", "verdict")
+
+    def __init__(self, **fields: Any):
+        values = [_MISSING] * _CORE_COUNT
+        extra = None
+        index = _CORE_INDEX
+        for key, value in fields.items():
+            i = index.get(key)
+            if i is not None:
+                values[i] = value
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self._values = values
+        self._extra: Optional[Dict[str, Any]] = extra
+        self._notes: Optional[List[Tuple[str, Any]]] = None
+        self.verdict: Optional["FilterVerdict"] = None
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "Signal":
+        """Обернуть dict-сигнал (Signal возвращается как есть)."""
+        if isinstance(data, Signal):
+            return data
+        return cls(**data)
+
+    # ------------------------------------------------------------ dict-доступ
+
+    def __getitem__(self, key: str) -> Any:
+        i = _CORE_INDEX.get(key)
+        if i is not None:
+            value = self._values[i]
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = _CORE_INDEX.get(key)
+        if i is not None:
+            value = self._values[i]
+            return default if value is _MISSING else value
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        i = _CORE_INDEX.get(key)
+        if i is not None:
+            self._values[i] = value
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        i = _CORE_INDEX.get(key)
+        if i is not None:
+            if self._values[i] is _MISSING:
+                raise KeyError(key)
+            self._values[i] = _MISSING
+            return
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        i = _CORE_INDEX.get(key)
+        if i is not None:
+            return self._values[i] is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key, value in zip(CORE_FIELDS, self._values):
+            if value is not _MISSING:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        count = _CORE_COUNT - self._values.count(_MISSING)
+        return count + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"Signal({self.to_dict()!r})"
+
+    def copy(self) -> "Signal":
+        """Поверхностная копия (как dict.copy): поля + доп. поля + журнал."""
+        clone = Signal.__new__(Signal)
+        clone._values = self._values[:]
+        clone._extra = dict(self._extra) if self._extra else None
+        clone._notes = list(self._notes) if self._notes else None
+        clone.verdict = self.verdict
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            key: value
+            for key, value in zip(CORE_FIELDS, self._values)
+            if value is not _MISSING
+        }
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    # ---------------------------------------------------------------- журнал
+
+    def annotate(self, stage: str, note: Any) -> None:
+        """Добавить запись в журнал сигнала (только добавление)."""
+        if self._notes is None:
+            self._notes = []
+        self._notes.append((stage, note))
+
+    @property
+    def notes(self) -> Tuple[Tuple[str, Any], ...]:
+        return tuple(self._notes) if self._notes else ()
+
+    # ------------------------------------------------------------ сериализация
+
+    def to_tuple(self) -> Tuple[Any, ...]:
+        """Компактное представление: значения по CORE_FIELDS + доп. поля."""
+        return (*self._values, self._extra)
+
+    @classmethod
+    def from_tuple(cls, data: Tuple[Any, ...]) -> "Signal":
+        signal = cls.__new__(cls)
+        signal._values = list(data[:_CORE_COUNT])
+        extra = data[_CORE_COUNT]
+        signal._extra = dict(extra) if extra else None
+        signal._notes = None
+        signal.verdict = None
+        return signal
+
+
+_CORE_INDEX = {name: i for i, name in enumerate(CORE_FIELDS)}
+_CORE_COUNT = len(CORE_FIELDS)
+for _index, _name in enumerate(CORE_FIELDS):
+    setattr(Signal, _name, _core_property(_index, _name))
+del _index, _name
+
+
+class FilterVerdict:
+    """Итог одного прогона фильтров сигнала (funnel trace)."""
+
+    __slots__ = (
+        "ts",
+        "symbol",
+        "regime",
+        "side",
+        "signal_type",
+        "plan",
+        "steps",
+        "skipped",
+        "blocked_by",
+        "total_ms",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        regime: Optional[str] = None,
+        side: Optional[str] = None,
+        signal_type: Optional[str] = None,
+    ):
+        self.ts = time.time()
+        self.symbol = symbol
+        self.regime = regime
+        self.side = side
+        self.signal_type = signal_type
+        self.plan: List[str] = []
+        self.steps: List[Dict[str, Any]] = []
+        self.skipped = 0
+        self.blocked_by: Optional[str] = None
+        self.total_ms = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return self.blocked_by is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ts": self.ts,
+            "symbol": self.symbol,
+            "regime": self.regime,
+            "side": self.side,
+            "signal_type": self.signal_type,
+            "plan": self.plan,
+            "steps": self.steps,
+            "skipped": self.skipped,
+            "blocked_by": self.blocked_by,
+            "total_ms": self.total_ms,
+        }
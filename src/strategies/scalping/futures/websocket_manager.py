@@ -115,6 +115,8 @@ class FuturesWebSocketManager:
         self._reconnect_in_flight = False
         self._last_forced_reconnect_ts = 0.0
         self._force_reconnect_cooldown = 20.0
+        # Запись сырых кадров (FrameRecorder), None - не пишем
+        self.recorder = None
 
         logger.info(
             f"FuturesWebSocketManager инициализирован: "
@@ -236,6 +238,32 @@ class FuturesWebSocketManager:
             logger.error(f"❌ Ошибка подписки: {e}")
             return False
 
+    async def unsubscribe(self, channel: str, inst_id: str) -> bool:
+        """
+        Отписка от канала (подписка не восстанавливается при reconnect).
+
+        Returns:
+            True если запрос отписки отправлен
+        """
+        key = f"{channel}:{inst_id}"
+        self.callbacks.pop(key, None)
+        self.subscribed_channels.pop(key, None)
+        if not self.connected or not self.ws:
+            return False
+
+        try:
+            unsubscribe_msg = {
+                "op": "unsubscribe",
+                "args": [{"channel": channel, "instId": inst_id}],
+            }
+            await self.ws.send_str(json.dumps(unsubscribe_msg))
+            logger.info(f"📊 Отписка: {channel} - {inst_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Ошибка отписки: {e}")
+            return False
+
     async def _listen_for_data(self):
         """Слушаем данные от WebSocket."""
         while self.should_reconnect and self.connected and self.ws:
@@ -256,6 +284,8 @@ class FuturesWebSocketManager:
                         self.last_heartbeat = time.time()
                         continue
                     data = json.loads(msg.data)
+                    if self.recorder is not None:
+                        self.recorder.record("public", msg.data, data)
                     await self._handle_data(data)
 
                 elif msg.type == aiohttp.WSMsgType.ERROR:
@@ -274,6 +304,14 @@ class FuturesWebSocketManager:
 
             await asyncio.sleep(0)
 
+    def set_recorder(self, recorder) -> None:
+        """Писать каждый входящий кадр в FrameRecorder (None - отключить)."""
+        self.recorder = recorder
+
+    async def replay_frame(self, data: dict):
+        """Подать записанный кадр в обработчики подписок (FrameReplayer)."""
+        await self._handle_data(data)
+
     async def _handle_data(self, data: dict):
         """Обработка данных от WebSocket."""
         try:
@@ -282,8 +320,8 @@ class FuturesWebSocketManager:
 
             # Обрабатываем ответы
             event = data.get("event")
-            if event == "subscribe":
-                logger.info(f"✅ Подписка подтверждена: {data.get('arg', {})}")
+            if event in ("subscribe", "unsubscribe"):
+                logger.info(f"✅ Подписка подтверждена ({event}): {data.get('arg', {})}")
                 return
             elif event == "error":
                 logger.error(f"WebSocket error: {data}")
@@ -0,0 +1,438 @@
+"""
+PublicWebSocketPool - публичные подписки на нескольких WebSocket-соединениях.
+
+Один FuturesWebSocketManager вез tickers, свечи, trades и mark-price всех
+символов по одному соединению с одной задачей чтения: медленный кадр или
+reconnect останавливал все символы, а watchdog мог переподключить только всё
+сразу. Пул раскладывает подписки по N соединениям (шардам):
+- группа подписок - (полоса каналов, инструмент); каналы одного инструмента
+  в полосе идут по одному соединению, поэтому tickers и mark-price символа
+  не обгоняют друг друга, а тяжелые trades/books можно вынести в свою полосу;
+- новая группа уходит в наименее загруженный шард, раз в
+  rebalance_interval_sec группы перекладываются по измеренной частоте
+  сообщений (не больше max_moves_per_cycle за цикл);
+- перенос make-before-break: подписка на новом шарде, передача владения по
+  первому сообщению с него, затем отписка на старом; сообщения со старого
+  шарда после передачи отбрасываются, дублей в обработчиках нет;
+- каждый шард - свой FuturesWebSocketManager со своим heartbeat, reconnect и
+  восстановлением подписок; force_reconnect(symbols=...) переподключает только
+  шарды этих символов.
+
+Пропускная способность и задержка биржа -> обработчик (по ts кадра) пишутся
+по шардам в WindowedMetrics (get_status()["shards"]).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from src.utils.window_metrics import WindowedMetrics
+
+from .websocket_manager import FuturesWebSocketManager
+
+GroupKey = Tuple[str, str]  # (полоса, instId)
+
+DEFAULT_LANES = {
+    "trades": "trades",
+    "books": "books",
+    "books5": "books",
+    "bbo-tbt": "books",
+}
+
+
+@dataclass
+class _Group:
+    """Подписки одного инструмента в одной полосе каналов."""
+
+    lane: str
+    inst_id: str
+    shard: int
+    callbacks: Dict[str, Callable] = field(default_factory=dict)
+    messages: int = 0
+    rate: float = 0.0  # сообщений/с за последний цикл ребалансировки
+    moving_to: Optional[int] = None
+    move_started: float = 0.0
+
+
+def plan_rebalance(
+    loads: Dict[GroupKey, float],
+    assignment: Dict[GroupKey, int],
+    shards: int,
+    threshold: float = 0.3,
+    max_moves: int = 2,
+) -> List[Tuple[GroupKey, int]]:
+    """
+    Минимальные переносы групп с самого загруженного шарда на самый свободный.
+
+    Args:
+        loads: Частота сообщений группы
+        assignment: Текущий шард группы
+        shards: Число шардов
+        threshold: Допустимое превышение средней загрузки (0.3 = +30%)
+        max_moves: Максимум переносов
+
+    Returns:
+        [(группа, новый шард)]
+    """
+    shard_load = [0.0] * shards
+    for key, shard in assignment.items():
+        shard_load[shard] += loads.get(key, 0.0)
+    assignment = dict(assignment)
+    moves: List[Tuple[GroupKey, int]] = []
+    for _ in range(max(0, max_moves)):
+        mean = sum(shard_load) / shards
+        hi = max(range(shards), key=lambda i: (shard_load[i], -i))
+        lo = min(range(shards), key=lambda i: (shard_load[i], i))
+        if mean <= 0 or shard_load[hi] <= mean * (1 + threshold):
+            break
+        gap = shard_load[hi] - shard_load[lo]
+        candidates = [
+            key
+            for key, shard in assignment.items()
+            if shard == hi and 0 < loads.get(key, 0.0) < gap
+        ]
+        if not candidates:
+            break
+        # Лучший перенос выравнивает пару шардов: нагрузка ближе к gap/2
+        best = min(candidates, key=lambda key: (abs(gap / 2 - loads[key]), key))
+        assignment[best] = lo
+        shard_load[hi] -= loads[best]
+        shard_load[lo] += loads[best]
+        moves.append((best, lo))
+    return moves
+
+
+class PublicWebSocketPool:
+    """
+    Пул публичных WebSocket с тем же интерфейсом, что FuturesWebSocketManager.
+
+    Использование:
+        pool = PublicWebSocketPool(ws_url, {"connections": 3})
+        await pool.connect()
+        await pool.subscribe("tickers", "BTC-USDT-SWAP", on_ticker)
+        await pool.force_reconnect("stale", symbols=["BTC-USDT"])
+    """
+
+    def __init__(
+        self,
+        ws_url: str = "wss://ws.okx.com:8443/ws/v5/public",
+        config: Optional[Dict[str, Any]] = None,
+        manager_factory: Optional[Callable[[str], Any]] = None,
+    ):
+        """
+        Args:
+            ws_url: URL публичного WebSocket
+            config: scalping.public_ws (connections, lanes,
+                rebalance_interval_sec, rebalance_threshold,
+                max_moves_per_cycle, handoff_timeout_sec)
+            manager_factory: Фабрика соединения по URL (по умолчанию
+                FuturesWebSocketManager)
+        """
+        config = config or {}
+        self.ws_url = ws_url
+        self.lanes: Dict[str, str] = dict(DEFAULT_LANES)
+        self.lanes.update(config.get("lanes") or {})
+        self.rebalance_interval_sec = max(
+            1.0, float(config.get("rebalance_interval_sec", 60.0))
+        )
+        self.rebalance_threshold = max(
+            0.0, float(config.get("rebalance_threshold", 0.3))
+        )
+        self.max_moves_per_cycle = max(0, int(config.get("max_moves_per_cycle", 2)))
+        self.handoff_timeout_sec = max(
+            0.0, float(config.get("handoff_timeout_sec", 10.0))
+        )
+        factory = manager_factory or (lambda url: FuturesWebSocketManager(ws_url=url))
+        connections = max(1, int(config.get("connections", 2)))
+        self.shards: List[Any] = [factory(ws_url) for _ in range(connections)]
+        self._groups: Dict[GroupKey, _Group] = {}
+        self._rebalance_task: Optional[asyncio.Task] = None
+        self._last_rebalance = time.time()
+        self.recorder = None
+        self.metrics = WindowedMetrics(bucket_seconds=5, retention_seconds=900)
+        self.stats: Dict[str, int] = {
+            "moves": 0,
+            "forced_handoffs": 0,
+            "dropped_after_handoff": 0,
+            "rebalances": 0,
+        }
+        logger.info(
+            f"PublicWebSocketPool инициализирован: connections={connections}, "
+            f"url={ws_url}"
+        )
+
+    # ------------------------------------------------------------ соединения
+
+    @property
+    def connected(self) -> bool:
+        return any(shard.connected for shard in self.shards)
+
+    async def connect(self) -> bool:
+        """Подключить все шарды; True если подключен хотя бы один."""
+        results = await asyncio.gather(
+            *(shard.connect() for shard in self.shards), return_exceptions=True
+        )
+        ok = [result is True for result in results]
+        if not all(ok):
+            logger.warning(
+                f"⚠️ PublicWebSocketPool: подключено {sum(ok)}/{len(ok)} шардов"
+            )
+        if any(ok) and (self._rebalance_task is None or self._rebalance_task.done()):
+            self._rebalance_task = asyncio.create_task(self._rebalance_loop())
+        return any(ok)
+
+    async def disconnect(self):
+        if self._rebalance_task:
+            self._rebalance_task.cancel()
+            self._rebalance_task = None
+        await asyncio.gather(
+            *(shard.disconnect() for shard in self.shards), return_exceptions=True
+        )
+
+    async def auto_reconnect(self) -> bool:
+        results = await asyncio.gather(
+            *(shard.auto_reconnect() for shard in self.shards),
+            return_exceptions=True,
+        )
+        return any(result is True for result in results)
+
+    async def force_reconnect(
+        self,
+        reason: str = "",
+        symbols: Optional[Sequence[str]] = None,
+        channel: Optional[str] = None,
+    ) -> bool:
+        """
+        Переподключить шарды, которые везут symbols (None - все шарды),
+        только по полосе channel, если он указан. Остальные соединения
+        продолжают работать.
+        """
+        targets = set(range(len(self.shards)))
+        if symbols:
+            targets = {
+                index for symbol in symbols for index in self.shards_of(symbol, channel)
+            }
+        if not targets:
+            return False
+        logger.warning(
+            f"🔄 PublicWebSocketPool: reconnect шардов {sorted(targets)} ({reason})"
+        )
+        results = await asyncio.gather(
+            *(self.shards[i].force_reconnect(reason=reason) for i in sorted(targets)),
+            return_exceptions=True,
+        )
+        return any(result is True for result in results)
+
+    def shards_of(self, symbol: str, channel: Optional[str] = None) -> List[int]:
+        """
+        Шарды, которые везут подписки символа (BTC-USDT или BTC-USDT-SWAP);
+        channel - только шард полосы этого канала.
+        """
+        inst_ids = {symbol, f"{symbol}-SWAP"}
+        lane = self.lanes.get(channel, "market") if channel else None
+        return sorted(
+            {
+                group.shard
+                for group in self._groups.values()
+                if group.inst_id in inst_ids and (lane is None or group.lane == lane)
+            }
+        )
+
+    # -------------------------------------------------------------- подписки
+
+    async def subscribe(self, channel: str, inst_id: str, callback: Callable) -> bool:
+        key = (self.lanes.get(channel, "market"), inst_id)
+        group = self._groups.get(key)
+        if group is None:
+            group = _Group(lane=key[0], inst_id=inst_id, shard=self._least_loaded())
+            self._groups[key] = group
+        group.callbacks[channel] = callback
+        return await self._subscribe_on(group.shard, group, channel)
+
+    async def unsubscribe(self, channel: str, inst_id: str) -> bool:
+        key = (self.lanes.get(channel, "market"), inst_id)
+        group = self._groups.get(key)
+        if group is None or group.callbacks.pop(channel, None) is None:
+            return False
+        shards = {group.shard, group.moving_to} - {None}
+        if not group.callbacks:
+            self._groups.pop(key, None)
+        results = [
+            await self.shards[index].unsubscribe(channel, inst_id) for index in shards
+        ]
+        return any(results)
+
+    async def _subscribe_on(self, index: int, group: _Group, channel: str) -> bool:
+        shard = self.shards[index]
+        callback = self._wrap(group, index, group.callbacks[channel])
+        if await shard.subscribe(channel, group.inst_id, callback):
+            return True
+        # Шард сейчас без связи - подписка восстановится после его reconnect
+        sub_key = f"{channel}:{group.inst_id}"
+        shard.callbacks[sub_key] = callback
+        shard.subscribed_channels[sub_key] = {
+            "channel": channel,
+            "instId": group.inst_id,
+        }
+        return False
+
+    def _wrap(self, group: _Group, index: int, callback: Callable) -> Callable:
+        label = f"shard{index}"
+
+        async def deliver(data):
+            if group.shard != index:
+                if group.moving_to != index:
+                    self.stats["dropped_after_handoff"] += 1
+                    return
+                self._complete_move(group)
+            group.messages += 1
+            self.metrics.record("public_ws.messages", 1.0, reason=label)
+            try:
+                ts = float(data["data"][0]["ts"])
+                self.metrics.record(
+                    "public_ws.lag_ms",
+                    max(0.0, time.time() * 1000.0 - ts),
+                    reason=label,
+                    histogram=True,
+                )
+            except (KeyError, IndexError, TypeError, ValueError):
+                pass
+            await callback(data)
+
+        return deliver
+
+    def _least_loaded(self) -> int:
+        load = [0.0] * len(self.shards)
+        count = [0] * len(self.shards)
+        for group in self._groups.values():
+            load[group.shard] += group.rate
+            count[group.shard] += 1
+        return min(range(len(self.shards)), key=lambda i: (load[i], count[i], i))
+
+    # -------------------------------------------------------- ребалансировка
+
+    async def rebalance(self) -> int:
+        """Перенести группы по частоте сообщений за прошедший цикл."""
+        now = time.time()
+        elapsed = max(now - self._last_rebalance, 1e-3)
+        self._last_rebalance = now
+        for group in self._groups.values():
+            group.rate = group.messages / elapsed
+            group.messages = 0
+            # Новый шард молчит (тихий инструмент) - передаем владение по таймауту
+            if (
+                group.moving_to is not None
+                and now - group.move_started >= self.handoff_timeout_sec
+            ):
+                self.stats["forced_handoffs"] += 1
+                self._complete_move(group)
+
+        if len(self.shards) < 2:
+            return 0
+        self.stats["rebalances"] += 1
+        movable = {
+            key: group.shard
+            for key, group in self._groups.items()
+            if group.moving_to is None
+        }
+        moves = plan_rebalance(
+            {key: group.rate for key, group in self._groups.items()},
+            movable,
+            len(self.shards),
+            self.rebalance_threshold,
+            self.max_moves_per_cycle,
+        )
+        started = 0
+        for key, target in moves:
+            if not self.shards[target].connected:
+                continue
+            group = self._groups[key]
+            group.moving_to = target
+            group.move_started = now
+            for channel in list(group.callbacks):
+                await self._subscribe_on(target, group, channel)
+            started += 1
+            logger.info(
+                f"🔀 PublicWebSocketPool: {group.lane}:{group.inst_id} "
+                f"shard{group.shard} -> shard{target} ({group.rate:.1f} msg/s)"
+            )
+        return started
+
+    def _complete_move(self, group: _Group) -> None:
+        old, group.shard, group.moving_to = group.shard, group.moving_to, None
+        self.stats["moves"] += 1
+        asyncio.create_task(self._release(old, group))
+
+    async def _release(self, index: int, group: _Group) -> None:
+        for channel in list(group.callbacks):
+            try:
+                await self.shards[index].unsubscribe(channel, group.inst_id)
+            except Exception as e:
+                logger.debug(f"⚠️ PublicWebSocketPool: отписка shard{index}: {e}")
+
+    async def _rebalance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.rebalance_interval_sec)
+            try:
+                await self.rebalance()
+            except Exception as e:
+                logger.error(f"❌ PublicWebSocketPool: ошибка ребалансировки: {e}")
+
+    # --------------------------------------------------- запись и состояние
+
+    def set_recorder(self, recorder) -> None:
+        """Писать входящие кадры всех шардов в FrameRecorder."""
+        self.recorder = recorder
+        for shard in self.shards:
+            shard.set_recorder(recorder)
+
+    async def replay_frame(self, data: dict):
+        """Подать записанный кадр в шард-владелец подписки (FrameReplayer)."""
+        arg = data.get("arg", {})
+        channel = arg.get("channel")
+        group = self._groups.get((self.lanes.get(channel, "market"), arg.get("instId")))
+        if group is not None:
+            await self.shards[group.shard].replay_frame(data)
+
+    def get_status(self, window_seconds: float = 60.0) -> Dict[str, Any]:
+        now = time.time()
+        messages = self.metrics.group_by("public_ws.messages", "reason", window_seconds)
+        lags = self.metrics.group_by("public_ws.lag_ms", "reason", window_seconds)
+        shards = []
+        for index, shard in enumerate(self.shards):
+            label = f"shard{index}"
+            count = messages[label].count if label in messages else 0
+            lag = lags.get(label)
+            shards.append(
+                {
+                    "connected": shard.connected,
+                    "groups": sum(
+                        1 for group in self._groups.values() if group.shard == index
+                    ),
+                    "subscribed_channels": len(shard.subscribed_channels),
+                    "msg_per_sec": round(count / window_seconds, 3),
+                    "lag_ms_p50": round(lag.quantile(0.5), 3) if lag else None,
+                    "lag_ms_p99": round(lag.quantile(0.99), 3) if lag else None,
+                    "reconnect_attempts": shard.reconnect_attempts,
+                    "time_since_heartbeat": now - shard.last_heartbeat,
+                }
+            )
+        return {
+            "connected": self.connected,
+            "subscribed_channels": sum(s["subscribed_channels"] for s in shards),
+            "reconnect_attempts": max(s["reconnect_attempts"] for s in shards),
+            "last_heartbeat": min(shard.last_heartbeat for shard in self.shards),
+            "time_since_heartbeat": max(s["time_since_heartbeat"] for s in shards),
+            "shards": shards,
+            **self.stats,
+        }
+
+    def __repr__(self) -> str:
+        connected = sum(1 for shard in self.shards if shard.connected)
+        return (
+            f"PublicWebSocketPool(connected={connected}/{len(self.shards)}, "
+            f"groups={len(self._groups)})"
+        )
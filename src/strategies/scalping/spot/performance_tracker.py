@@ -13,7 +13,7 @@ import csv
 from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Iterable, Mapping
 
 from loguru import logger
 
@@ -108,6 +108,9 @@ class PerformanceTracker:
             ]
 
             self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=fieldnames)
+            # Позиционная запись для горячих путей (сигналы): без dict на каждую строку
+            self._csv_columns = {name: i for i, name in enumerate(fieldnames)}
+            self._csv_row_writer = csv.writer(self.csv_file)
 
             if not file_exists:
                 self.csv_writer.writeheader()
@@ -119,6 +122,7 @@ class PerformanceTracker:
             logger.error(f"❌ Failed to initialize unified CSV: {e}")
             self.csv_file = None
             self.csv_writer = None
+            self._csv_row_writer = None
 
         # Старые CSV файлы больше не создаются - все идет в unified CSV
 
@@ -458,6 +462,34 @@ class PerformanceTracker:
         except Exception as e:
             logger.error(f"❌ Failed to export order to CSV: {e}")
 
+    def _signal_row(
+        self,
+        symbol: str,
+        side: str,
+        price: float,
+        strength: float,
+        regime: str = None,
+        filters_passed: list = None,
+        executed: bool = False,
+        order_id: str = None,
+    ) -> list:
+        """Строка сигнала для unified CSV (позиционно, в порядке fieldnames)."""
+        columns = self._csv_columns
+        row = [""] * len(columns)
+        row[columns["record_type"]] = "signals"
+        row[columns["timestamp"]] = datetime.utcnow().isoformat()
+        row[columns["symbol"]] = symbol
+        row[columns["side"]] = side
+        row[columns["regime"]] = regime or ""
+        row[columns["order_id"]] = order_id or ""
+        row[columns["price"]] = f"{price:.8f}"
+        row[columns["strength"]] = f"{strength:.4f}"
+        row[columns["filters_passed"]] = (
+            ",".join(filters_passed) if filters_passed else ""
+        )
+        row[columns["executed"]] = "1" if executed else "0"
+        return row
+
     def record_signal(
         self,
         symbol: str,
@@ -488,39 +520,52 @@ class PerformanceTracker:
                 return
 
             # ✅ ИСПРАВЛЕНО: Записываем в объединенный CSV с record_type
-            self.csv_writer.writerow(
-                {
-                    "record_type": "signals",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "symbol": symbol,
-                    "side": side,
-                    "entry_price": "",
-                    "exit_price": "",
-                    "size": "",
-                    "gross_pnl": "",
-                    "commission": "",
-                    "net_pnl": "",
-                    "duration_sec": "",
-                    "reason": "",
-                    "win_rate": "",
-                    "regime": regime or "",
-                    "order_id": order_id or "",
-                    "order_type": "",
-                    "price": f"{price:.8f}",
-                    "strength": f"{strength:.4f}",
-                    "filters_passed": ",".join(filters_passed)
-                    if filters_passed
-                    else "",
-                    "executed": "1" if executed else "0",
-                    "status": "",
-                    "fill_price": "",
-                    "fill_size": "",
-                    "execution_time_ms": "",
-                    "slippage": "",
-                    "event_type": "",
-                    "data": "",
-                }
+            self._csv_row_writer.writerow(
+                self._signal_row(
+                    symbol,
+                    side,
+                    price,
+                    strength,
+                    regime=regime,
+                    filters_passed=filters_passed,
+                    executed=executed,
+                    order_id=order_id,
+                )
             )
             self.csv_file.flush()
         except Exception as e:
             logger.error(f"❌ Failed to export signal to CSV: {e}")
+
+    def record_signals(self, signals: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Записать пачку сигналов (dict или Signal) одним flush.
+
+        Сигналы цикла пишутся вместе, а не по flush на каждый.
+        """
+        try:
+            if not self.csv_writer or not self.csv_file:
+                logger.warning("⚠️ CSV writer not initialized, skipping signal export")
+                return
+
+            rows = []
+            for signal in signals:
+                filters_passed = signal.get("filters_passed") or []
+                if isinstance(filters_passed, str):
+                    filters_passed = filters_passed.split(",")
+                elif not isinstance(filters_passed, list):
+                    filters_passed = []
+                rows.append(
+                    self._signal_row(
+                        signal.get("symbol", ""),
+                        signal.get("side", ""),
+                        signal.get("price", 0.0) or 0.0,
+                        signal.get("strength", 0.0) or 0.0,
+                        regime=signal.get("regime"),
+                        filters_passed=filters_passed,
+                    )
+                )
+            if rows:
+                self._csv_row_writer.writerows(rows)
+                self.csv_file.flush()
+        except Exception as e:
+            logger.error(f"❌ Failed to export signals to CSV: {e}")
@@ -0,0 +1,251 @@
+"""
+DerivedCache - Мемоизация производных данных по версиям зависимостей.
+
+Вместо TTL по часам кэшированное значение объявляет, от чего зависит:
+"свечи 5m BTC-USDT", "режим ETH-USDT" и т.д. DataRegistry повышает версию
+зависимости на событии (закрытие свечи, смена режима), и значение становится
+невалидным ровно тогда, когда изменились входные данные.
+
+- DependencyVersions: счетчики версий зависимостей (владелец — DataRegistry)
+- DerivedCache: именованный LRU кэш значений с зависимостями и метриками
+- CacheRegistry: единая точка просмотра всех кэшей (hit/miss, память)
+"""
+
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from loguru import logger
+
+Dependency = Tuple[Hashable, ...]
+Snapshot = Tuple[int, ...]
+
+
+def candles_dep(symbol: str, timeframe: str) -> Dependency:
+    """Закрытые свечи таймфрейма (версия растет при открытии новой свечи)."""
+    return ("candles", symbol, timeframe)
+
+
+def regime_dep(symbol: str) -> Dependency:
+    """Режим рынка символа (версия растет при смене режима)."""
+    return ("regime", symbol)
+
+
+def indicators_dep(symbol: str) -> Dependency:
+    """Индикаторы символа в DataRegistry (версия растет при каждом обновлении)."""
+    return ("indicators", symbol)
+
+
+class DependencyVersions:
+    """Версии зависимостей. Чтение синхронное, без lock (один event loop)."""
+
+    def __init__(self):
+        self._versions: Dict[Dependency, int] = {}
+
+    def bump(self, dep: Dependency) -> int:
+        version = self._versions.get(dep, 0) + 1
+        self._versions[dep] = version
+        return version
+
+    def get(self, dep: Dependency) -> int:
+        return self._versions.get(dep, 0)
+
+    def snapshot(self, deps: Tuple[Dependency, ...]) -> Snapshot:
+        versions = self._versions
+        return tuple(versions.get(dep, 0) for dep in deps)
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+
+def _deep_sizeof(obj: Any, seen: set) -> int:
+    """Приблизительный размер объекта в байтах (с вложенными контейнерами)."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+        return size
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _deep_sizeof(item, seen)
+        return size
+    nbytes = getattr(obj, "nbytes", None)  # numpy
+    if isinstance(nbytes, int):
+        return size + nbytes
+    if hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += _deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+class DerivedCache:
+    """
+    LRU кэш производных значений, инвалидируемый версиями зависимостей.
+
+    Example:
+        >>> cache = data_registry.derived_cache("mtf_trend", max_entries=64)
+        >>> deps = (candles_dep("BTC-USDT", "5m"),)
+        >>> trend = await cache.get_or_compute("BTC-USDT", deps, compute_trend)
+    """
+
+    def __init__(self, name: str, versions: DependencyVersions, max_entries: int = 256):
+        """
+        Args:
+            name: Имя кэша (ключ в CacheRegistry)
+            versions: Версии зависимостей (DataRegistry.versions)
+            max_entries: Лимит записей, при превышении вытесняется самая старая
+        """
+        self.name = name
+        self.versions = versions
+        self.max_entries = max(1, int(max_entries))
+        # key -> (value, deps, snapshot версий на момент вычисления)
+        self._entries: (
+            "OrderedDict[Hashable, Tuple[Any, Tuple[Dependency, ...], Snapshot]]"
+        ) = OrderedDict()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "evictions": 0,
+            "compute_ms": 0.0,
+        }
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Значение, если ни одна зависимость не изменилась, иначе default."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return default
+        value, deps, snapshot = entry
+        if self.versions.snapshot(deps) != snapshot:
+            del self._entries[key]
+            self.stats["invalidations"] += 1
+            self.stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        deps: Tuple[Dependency, ...],
+        snapshot: Optional[Snapshot] = None,
+    ) -> None:
+        """
+        Сохранить значение.
+
+        snapshot — версии, снятые ДО чтения входных данных; без него берутся
+        текущие (если между чтением и put версия выросла, значение будет
+        считаться свежим до следующего события).
+        """
+        deps = tuple(deps)
+        if snapshot is None:
+            snapshot = self.versions.snapshot(deps)
+        self._entries[key] = (value, deps, snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        deps: Tuple[Dependency, ...],
+        compute: Callable[[], Union[Any, Awaitable[Any]]],
+    ) -> Any:
+        """Вернуть валидное значение или вычислить (sync/async). None не кэшируется."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        deps = tuple(deps)
+        snapshot = self.versions.snapshot(deps)
+        started = time.perf_counter()
+        value = compute()
+        if asyncio.iscoroutine(value):
+            value = await value
+        self.stats["compute_ms"] += (time.perf_counter() - started) * 1000.0
+        if value is not None:
+            self.put(key, value, deps, snapshot)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Удалить запись (или все записи)."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def memory_bytes(self) -> int:
+        """Приблизительный объем памяти значений кэша."""
+        seen: set = set()
+        return sum(_deep_sizeof(entry[0], seen) for entry in self._entries.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "compute_ms": round(self.stats["compute_ms"], 3),
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CacheRegistry:
+    """Все DerivedCache процесса: создание по имени и сводная статистика."""
+
+    def __init__(self, versions: DependencyVersions):
+        self.versions = versions
+        self._caches: Dict[str, DerivedCache] = {}
+
+    def cache(self, name: str, max_entries: int = 256) -> DerivedCache:
+        """Получить кэш по имени (создается при первом обращении)."""
+        cache = self._caches.get(name)
+        if cache is None:
+            cache = DerivedCache(name, self.versions, max_entries=max_entries)
+            self._caches[name] = cache
+            logger.debug(f"📦 DerivedCache '{name}' создан (max_entries={max_entries})")
+        return cache
+
+    def get(self, name: str) -> Optional[DerivedCache]:
+        return self._caches.get(name)
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.invalidate()
+
+    def get_stats(self, with_memory: bool = True) -> Dict[str, Any]:
+        """Статистика по каждому кэшу и итог (память — опционально, O(размер))."""
+        caches = {}
+        total_memory = 0
+        for name, cache in self._caches.items():
+            stats = cache.get_stats()
+            if with_memory:
+                stats["memory_bytes"] = cache.memory_bytes()
+                total_memory += stats["memory_bytes"]
+            caches[name] = stats
+        summary: Dict[str, Any] = {
+            "caches": caches,
+            "entries": sum(len(cache) for cache in self._caches.values()),
+            "dependencies": len(self.versions),
+        }
+        if with_memory:
+            summary["memory_bytes"] = total_memory
+        return summary
@@ -0,0 +1,380 @@
+"""
+WindowedMetrics - скользящие оконные метрики на кольцевых бакетах.
+
+Заменяет неограниченные списки словарей в TradingStatistics,
+ConversionMetrics, HoldingTimeMetrics и AlertManager:
+- Время делится на бакеты фиксированной длины (bucket_seconds)
+- Каждая серия (metric + метки) хранит не больше retention/bucket ячеек
+- Ячейка: count / sum / min / max и опционально лог-гистограмма для квантилей
+- Оконный запрос стоит O(бакетов окна), а не O(событий)
+
+Метки: symbol, regime, signal_type, reason (причина выхода или фильтрации).
+"""
+
+import math
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+LABELS = ("symbol", "regime", "signal_type", "reason")
+
+# Шаг лог-гистограммы: относительная ошибка квантиля ~2.5%
+_HIST_GROWTH = 1.05
+_HIST_LOG = math.log(_HIST_GROWTH)
+_HIST_ZERO = -(10**9)  # бин для значений <= 0
+
+Timestamp = Union[float, int, datetime, None]
+LabelKey = Tuple[str, str, str, str]
+
+
+def _hist_bin(value: float) -> int:
+    if value <= 0:
+        return _HIST_ZERO
+    return math.floor(math.log(value) / _HIST_LOG)
+
+
+def _hist_value(bin_key: int) -> float:
+    if bin_key == _HIST_ZERO:
+        return 0.0
+    return _HIST_GROWTH ** (bin_key + 0.5)
+
+
+class _Cell:
+    """Агрегат одного бакета одной серии."""
+
+    __slots__ = ("idx", "count", "total", "min", "max", "hist")
+
+    def __init__(self, idx: int):
+        self.idx = idx
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.hist: Optional[Dict[int, int]] = None
+
+    def add(self, value: float, histogram: bool) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if histogram:
+            if self.hist is None:
+                self.hist = {}
+            key = _hist_bin(value)
+            self.hist[key] = self.hist.get(key, 0) + 1
+
+
+class WindowAggregate:
+    """Результат оконного запроса (слияние ячеек)."""
+
+    __slots__ = ("count", "total", "min", "max", "hist")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.hist: Dict[int, int] = {}
+
+    def merge(self, cell: Any) -> None:
+        if not cell.count:
+            return
+        self.count += cell.count
+        self.total += cell.total
+        if cell.min < self.min:
+            self.min = cell.min
+        if cell.max > self.max:
+            self.max = cell.max
+        if cell.hist:
+            for key, n in cell.hist.items():
+                self.hist[key] = self.hist.get(key, 0) + n
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Приближенный квантиль по лог-гистограмме.
+
+        Ранг считается как int(q * count) — для q=0.5 это верхняя медиана,
+        как в прежнем sorted(values)[len // 2]. Без гистограммы — среднее.
+        """
+        if not self.count:
+            return 0.0
+        total_hist = sum(self.hist.values())
+        if not total_hist:
+            return self.mean
+        rank = min(int(q * total_hist), total_hist - 1)
+        seen = 0
+        for key in sorted(self.hist):
+            seen += self.hist[key]
+            if seen > rank:
+                return min(max(_hist_value(key), self.min), self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+        }
+
+
+class _Ring:
+    """Кольцо ячеек серии: слот = idx % size, устаревший слот перезаписывается."""
+
+    __slots__ = ("cells",)
+
+    def __init__(self):
+        self.cells: Dict[int, _Cell] = {}
+
+    def add(self, idx: int, size: int, value: float, histogram: bool) -> None:
+        slot = idx % size
+        cell = self.cells.get(slot)
+        if cell is None or cell.idx != idx:
+            cell = _Cell(idx)
+            self.cells[slot] = cell
+        cell.add(value, histogram)
+
+    def collect(self, first: int, last: int, size: int, out: WindowAggregate) -> None:
+        cells = self.cells
+        if len(cells) <= last - first + 1:
+            for cell in cells.values():
+                if first <= cell.idx <= last:
+                    out.merge(cell)
+            return
+        for idx in range(first, last + 1):
+            cell = cells.get(idx % size)
+            if cell is not None and cell.idx == idx:
+                out.merge(cell)
+
+
+class WindowedMetrics:
+    """
+    Хранилище оконных метрик с ограниченной памятью.
+
+    Пример:
+        store = WindowedMetrics(bucket_seconds=60, retention_seconds=86400)
+        store.record("trade.pnl", 1.5, symbol="BTC-USDT", regime="ranging")
+        store.query("trade.pnl", 3600, symbol="BTC-USDT").mean
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: float = 60.0,
+        retention_seconds: float = 86400.0,
+    ):
+        """
+        Args:
+            bucket_seconds: Длина бакета (разрешение окон)
+            retention_seconds: Максимальная глубина хранения
+        """
+        self.bucket_seconds = max(1.0, float(bucket_seconds))
+        self.retention_seconds = max(self.bucket_seconds, float(retention_seconds))
+        self._size = int(math.ceil(self.retention_seconds / self.bucket_seconds)) + 1
+        self._series: Dict[str, Dict[LabelKey, _Ring]] = {}
+        self.stats = {"recorded": 0, "dropped_old": 0}
+
+    # ------------------------------------------------------------------ запись
+
+    @staticmethod
+    def _to_seconds(ts: Timestamp) -> float:
+        if ts is None:
+            return time.time()
+        if isinstance(ts, datetime):
+            return ts.timestamp()
+        return float(ts)
+
+    def _bucket(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+
+    def record(
+        self,
+        metric: str,
+        value: float = 1.0,
+        *,
+        ts: Timestamp = None,
+        symbol: Optional[str] = None,
+        regime: Optional[str] = None,
+        signal_type: Optional[str] = None,
+        reason: Optional[str] = None,
+        histogram: bool = False,
+    ) -> bool:
+        """
+        Записать значение метрики.
+
+        Args:
+            metric: Имя метрики
+            value: Значение (1.0 для счетчиков)
+            ts: Время события (unix seconds или datetime), по умолчанию сейчас
+            histogram: Вести лог-гистограмму (нужна для quantile)
+
+        Returns:
+            False если событие старше retention и отброшено
+        """
+        now_idx = self._bucket(time.time())
+        idx = min(self._bucket(self._to_seconds(ts)), now_idx)
+        if idx <= now_idx - self._size + 1:
+            self.stats["dropped_old"] += 1
+            return False
+        key = (symbol or "", regime or "", signal_type or "", reason or "")
+        series = self._series.setdefault(metric, {})
+        ring = series.get(key)
+        if ring is None:
+            ring = series[key] = _Ring()
+        ring.add(idx, self._size, float(value), histogram)
+        self.stats["recorded"] += 1
+        return True
+
+    # ----------------------------------------------------------------- запросы
+
+    def _range(
+        self, window_seconds: Optional[float], now: Optional[float]
+    ) -> Tuple[int, int]:
+        last = self._bucket(time.time() if now is None else float(now))
+        window = self.retention_seconds if window_seconds is None else window_seconds
+        window = min(max(float(window), self.bucket_seconds), self.retention_seconds)
+        span = int(math.ceil(window / self.bucket_seconds))
+        return last - span + 1, last
+
+    @staticmethod
+    def _matcher(labels: Dict[str, Optional[str]]) -> List[Tuple[int, str]]:
+        matcher = []
+        for name, value in labels.items():
+            if name not in LABELS:
+                raise ValueError(f"Неизвестная метка: {name}")
+            if value is not None:
+                matcher.append((LABELS.index(name), value))
+        return matcher
+
+    def _iter_series(
+        self, metric: str, labels: Dict[str, Optional[str]]
+    ) -> Iterable[Tuple[LabelKey, _Ring]]:
+        matcher = self._matcher(labels)
+        for key, ring in self._series.get(metric, {}).items():
+            if all(key[pos] == value for pos, value in matcher):
+                yield key, ring
+
+    def query(
+        self,
+        metric: str,
+        window_seconds: Optional[float] = None,
+        *,
+        now: Optional[float] = None,
+        **labels: Optional[str],
+    ) -> WindowAggregate:
+        """
+        Агрегат метрики за окно по всем сериям, подходящим под метки.
+
+        Args:
+            metric: Имя метрики
+            window_seconds: Окно (None - весь retention), округляется до бакетов
+            now: Правая граница окна (по умолчанию сейчас)
+            **labels: Фильтр по меткам (None - любое значение)
+        """
+        first, last = self._range(window_seconds, now)
+        out = WindowAggregate()
+        for _, ring in self._iter_series(metric, labels):
+            ring.collect(first, last, self._size, out)
+        return out
+
+    def group_by(
+        self,
+        metric: str,
+        label: str,
+        window_seconds: Optional[float] = None,
+        *,
+        now: Optional[float] = None,
+        **labels: Optional[str],
+    ) -> Dict[str, WindowAggregate]:
+        """Агрегаты метрики за окно, сгруппированные по значению метки."""
+        pos = LABELS.index(label)
+        first, last = self._range(window_seconds, now)
+        groups: Dict[str, WindowAggregate] = {}
+        for key, ring in self._iter_series(metric, labels):
+            if not key[pos]:
+                continue
+            agg = groups.get(key[pos])
+            if agg is None:
+                agg = groups[key[pos]] = WindowAggregate()
+            ring.collect(first, last, self._size, agg)
+        return {value: agg for value, agg in groups.items() if agg.count}
+
+    def metrics(self) -> List[str]:
+        return list(self._series.keys())
+
+    # ------------------------------------------------------------------ экспорт
+
+    def snapshot(
+        self, window_seconds: Optional[float] = None, now: Optional[float] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Сводка {metric: {count, sum, mean, min, max}} за окно."""
+        return {
+            metric: self.query(metric, window_seconds, now=now).as_dict()
+            for metric in self._series
+        }
+
+    def to_prometheus(
+        self,
+        prefix: str = "scalping",
+        window_seconds: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> str:
+        """
+        Оконные значения в текстовом формате Prometheus (gauge *_count/*_sum).
+
+        Отдается как есть из HTTP-хендлера или node_exporter textfile.
+        """
+        first, last = self._range(window_seconds, now)
+        lines: List[str] = []
+        for metric, series in self._series.items():
+            name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{metric}")
+            rows = []
+            for key, ring in series.items():
+                agg = WindowAggregate()
+                ring.collect(first, last, self._size, agg)
+                if not agg.count:
+                    continue
+                label_str = ",".join(
+                    f'{LABELS[i]}="{_escape(value)}"'
+                    for i, value in enumerate(key)
+                    if value
+                )
+                label_str = f"{{{label_str}}}" if label_str else ""
+                rows.append(f"{name}_count{label_str} {agg.count}")
+                rows.append(f"{name}_sum{label_str} {agg.total:.10g}")
+            if rows:
+                lines.append(f"# TYPE {name}_count gauge")
+                lines.append(f"# TYPE {name}_sum gauge")
+                lines.extend(rows)
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def get_stats(self) -> Dict[str, Any]:
+        series = sum(len(s) for s in self._series.values())
+        cells = sum(len(r.cells) for s in self._series.values() for r in s.values())
+        return {
+            **self.stats,
+            "metrics": len(self._series),
+            "series": series,
+            "cells": cells,
+            "bucket_seconds": self.bucket_seconds,
+            "retention_seconds": self.retention_seconds,
+        }
+
+    def reset(self, metrics: Optional[Iterable[str]] = None) -> None:
+        """Очистить все метрики или только перечисленные."""
+        if metrics is None:
+            self._series.clear()
+            return
+        for metric in metrics:
+            self._series.pop(metric, None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,103 @@
+"""
+Тесты AccountStateCache: снимок из private WS, версии, свежесть и REST-сверка.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.core.account_state import AccountStateCache
+
+
+class FakeAccountClient:
+    def __init__(self, equity=1000.0, positions=None):
+        self.equity = equity
+        self.positions = positions or []
+        self.balance_calls = 0
+        self.positions_calls = 0
+
+    async def get_balance(self):
+        self.balance_calls += 1
+        await asyncio.sleep(0.01)
+        return self.equity
+
+    async def get_positions(self, symbol=None):
+        self.positions_calls += 1
+        await asyncio.sleep(0.01)
+        return list(self.positions)
+
+
+def _position(inst_id: str, pos: str, **fields) -> dict:
+    data = {
+        "instId": inst_id,
+        "pos": pos,
+        "posSide": "net",
+        "lever": "10",
+        "margin": "25.5",
+        "liqPx": "90.1",
+        "avgPx": "100",
+        "markPx": "101",
+        "upl": "0.5",
+    }
+    data.update(fields)
+    return data
+
+
+def _account(eq: str, avail: str) -> list:
+    return [{"details": [{"ccy": "USDT", "eq": eq, "availEq": avail}]}]
+
+
+@pytest.mark.asyncio
+async def test_ws_updates_build_versioned_snapshot_read_from_memory() -> None:
+    client = FakeAccountClient()
+    cache = AccountStateCache(client, {"max_age_sec": 60})
+
+    assert cache.apply_account(_account("1500.5", "1200")) is True
+    cache.apply_positions(
+        [_position("BTC-USDT-SWAP", "2"), _position("ETH-USDT-SWAP", "-3")]
+    )
+    before = cache.snapshot
+    assert before.version == 2
+
+    assert await cache.get_equity() == 1500.5
+    btc = await cache.get_position("BTC-USDT")
+    assert (btc.leverage, btc.margin, btc.liq_px, btc.side) == (10, 25.5, 90.1, "long")
+    assert (await cache.get_position("ETH-USDT")).side == "short"
+    assert await cache.get_used_margin() == pytest.approx(51.0)
+    # Формат OKX, как у client.get_positions(symbol)
+    assert (await cache.get_positions("BTC-USDT"))[0]["instId"] == "BTC-USDT-SWAP"
+
+    # Закрытие позиции в канале positions - новый снимок, старый не меняется
+    cache.apply_positions([_position("BTC-USDT-SWAP", "0")])
+    assert cache.snapshot.version == 3
+    assert await cache.get_positions("BTC-USDT") == []
+    assert before.position("BTC-USDT") is not None
+
+    assert client.balance_calls == 0 and client.positions_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_reconciles_once_for_concurrent_readers() -> None:
+    client = FakeAccountClient(
+        equity=800.0, positions=[_position("SOL-USDT-SWAP", "5", margin="", imr="7")]
+    )
+    cache = AccountStateCache(client, {"max_age_sec": 10})
+
+    results = await asyncio.gather(*(cache.get(max_age=10) for _ in range(5)))
+    assert client.balance_calls == 1 and client.positions_calls == 1
+    assert all(snapshot.equity == 800.0 for snapshot in results)
+    # В cross-режиме margin пустой - берем imr
+    assert results[0].position("SOL-USDT").margin == 7.0
+    assert results[0].positions_source == "REST"
+
+    # Свежий снимок - без REST; max_age=0 - обязательная сверка
+    await cache.get_equity()
+    assert client.balance_calls == 1
+    await cache.get_positions(max_age=0)
+    assert client.positions_calls == 2
+    assert cache.get_stats()["rest_positions"] == 2
@@ -0,0 +1,211 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models import OHLCV
+from src.strategies.scalping.futures.coordinators.websocket_coordinator import (
+    WebSocketCoordinator,
+)
+from src.strategies.scalping.futures.core.bar_builder import (
+    TradeBarBuilder,
+    bucket_start,
+    timeframe_seconds,
+)
+from src.strategies.scalping.futures.core.data_registry import DataRegistry
+
+T0 = 1_699_999_200_000  # ms, начало часа (UTC)
+
+
+def _row(ts_ms: int, px: float, sz: float, side: str) -> dict:
+    return {"ts": str(ts_ms), "px": str(px), "sz": str(sz), "side": side}
+
+
+def test_timeframe_seconds() -> None:
+    assert timeframe_seconds("1m") == 60
+    assert timeframe_seconds("4H") == 14400
+    assert timeframe_seconds("1D") == 86400
+    assert timeframe_seconds("1Dutc") == 86400
+    with pytest.raises(ValueError):
+        timeframe_seconds("1x")
+
+
+def test_single_pass_builds_ohlcv_vwap_and_cvd() -> None:
+    builder = TradeBarBuilder(("1m", "5m"))
+    events = builder.update(
+        "BTC-USDT",
+        [
+            (T0 + 1_000, 100.0, 2.0, "buy"),
+            (T0 + 2_000, 102.0, 1.0, "sell"),
+            (T0 + 3_000, 99.0, 1.0, "buy"),
+        ],
+    )
+
+    assert events == []
+    bar = builder.get_bar("BTC-USDT", "1m")
+    assert (bar.open, bar.high, bar.low, bar.close) == (100.0, 102.0, 99.0, 99.0)
+    assert bar.timestamp == T0 // 1000
+    assert bar.volume == 4.0
+    assert (bar.buy_volume, bar.sell_volume, bar.delta) == (3.0, 1.0, 2.0)
+    assert bar.vwap == pytest.approx((200.0 + 102.0 + 99.0) / 4.0)
+    assert bar.cvd == builder.get_cvd("BTC-USDT") == 2.0
+    assert builder.get_bar("BTC-USDT", "5m").volume == 4.0
+
+
+def test_new_interval_closes_bar_and_notifies_subscribers() -> None:
+    builder = TradeBarBuilder(("1m", "5m"))
+    seen = []
+    builder.subscribe(seen.append)
+    builder.update("ETH-USDT", [(T0 + 1_000, 10.0, 1.0, "buy")])
+
+    events = builder.handle_trades_message(
+        "ETH-USDT",
+        {
+            "data": [
+                _row(T0 + 61_000, 11.0, 3.0, "sell"),
+                _row(T0 + 500, 9.0, 1.0, "sell"),
+            ]
+        },
+    )
+
+    # Пачка отсортирована: поздняя сделка попала в старую минуту до закрытия
+    assert [(e.timeframe, e.bar.close, e.bar.volume) for e in events] == [
+        ("1m", 9.0, 2.0)
+    ]
+    assert builder.get_bar("ETH-USDT", "1m").timestamp == (T0 + 60_000) // 1000
+    assert builder.get_bar("ETH-USDT", "5m").volume == 5.0
+    assert builder.get_cvd("ETH-USDT") == -3.0
+
+    # Сделка из закрытого интервала не портит текущий бар
+    builder.update("ETH-USDT", [(T0 + 2_000, 50.0, 1.0, "buy")])
+    assert builder.get_bar("ETH-USDT", "1m").high == 11.0
+    assert builder.stats["late_trades"] == 1
+
+
+@pytest.mark.asyncio
+async def test_coordinator_writes_trade_bars_in_one_registry_call() -> None:
+    registry = DataRegistry()
+    coordinator = WebSocketCoordinator(
+        ws_manager=None,
+        private_ws_manager=None,
+        scalping_config=SimpleNamespace(symbols=["BTC-USDT"]),
+        active_positions_ref={},
+        data_registry=registry,
+    )
+    coordinator._use_kline_candles = True
+    closed = []
+    coordinator.bar_builder.subscribe(closed.append)
+
+    await coordinator.handle_trades_data(
+        "BTC-USDT", {"data": [_row(T0 + 1_000, 100.0, 1.0, "buy")]}
+    )
+    await coordinator.handle_trades_data(
+        "BTC-USDT", {"data": [_row(T0 + 3_600_000, 105.0, 2.0, "sell")]}
+    )
+
+    # 1m/5m приходят из kline-каналов — в реестр пишутся только 1H/1D
+    assert await registry.get_candles("BTC-USDT", "1m") == []
+    hourly = await registry.get_candles("BTC-USDT", "1H")
+    assert [(c.close, c.volume) for c in hourly] == [(100.0, 1.0), (105.0, 2.0)]
+    assert {e.timeframe for e in closed} == {"1m", "5m", "1H"}
+    assert coordinator._trade_bars_active("BTC-USDT")
+
+
+@pytest.mark.asyncio
+async def test_forming_rest_candle_is_continued_not_overwritten() -> None:
+    registry = DataRegistry()
+    coordinator = WebSocketCoordinator(
+        ws_manager=None,
+        private_ws_manager=None,
+        scalping_config=SimpleNamespace(symbols=["BTC-USDT"]),
+        active_positions_ref={},
+        data_registry=registry,
+    )
+    coordinator._use_kline_candles = True
+    # Формирующаяся 1H свеча, загруженная по REST на старте
+    await registry.initialize_candles(
+        "BTC-USDT",
+        "1H",
+        [OHLCV(T0 // 1000, "BTC-USDT", 98.0, 110.0, 95.0, 101.0, 50.0, "1H")],
+    )
+
+    await coordinator.handle_trades_data(
+        "BTC-USDT",
+        {
+            "data": [
+                _row(T0 + 600_000, 100.0, 1.0, "buy"),
+                _row(T0 + 601_000, 112.0, 1.0, "buy"),
+            ]
+        },
+    )
+
+    hourly = await registry.get_candles("BTC-USDT", "1H")
+    assert len(hourly) == 1
+    candle = hourly[0]
+    assert (candle.open, candle.high, candle.low, candle.close) == (
+        98.0,
+        112.0,
+        95.0,
+        112.0,
+    )
+    assert candle.volume == 52.0
+    bar = coordinator.bar_builder.get_bar("BTC-USDT", "1H")
+    assert bar.buy_volume == 2.0 and bar.trades == 2
+
+
+def test_daily_buckets_follow_okx_hong_kong_midnight() -> None:
+    # 1D/1W у OKX начинаются в 00:00 UTC+8, "utc"-варианты — в 00:00 UTC
+    assert bucket_start(T0, "1D") == 1_699_977_600_000  # 14.11 16:00 UTC
+    assert bucket_start(T0, "1Dutc") == 1_699_920_000_000  # 14.11 00:00 UTC
+    assert bucket_start(T0, "1W") == 1_699_804_800_000  # пн 13.11 00:00 UTC+8
+    assert bucket_start(T0, "4H") == T0 - 2 * 3_600_000
+
+
+@pytest.mark.asyncio
+async def test_hong_kong_aligned_rest_daily_candle_is_seeded() -> None:
+    registry = DataRegistry()
+    coordinator = WebSocketCoordinator(
+        ws_manager=None,
+        private_ws_manager=None,
+        scalping_config=SimpleNamespace(symbols=["BTC-USDT"]),
+        active_positions_ref={},
+        data_registry=registry,
+    )
+    coordinator._use_kline_candles = True
+    # Реальная дневная свеча OKX (bar=1D): ts=1699977600000, 00:00 по Гонконгу
+    await registry.initialize_candles(
+        "BTC-USDT",
+        "1D",
+        [
+            OHLCV(
+                1_699_977_600,
+                "BTC-USDT",
+                35_536.9,
+                36_086.0,
+                35_358.3,
+                35_557.2,
+                4_120.0,
+                "1D",
+            )
+        ],
+    )
+
+    await coordinator.handle_trades_data(
+        "BTC-USDT", {"data": [_row(T0 + 1_000, 35_300.0, 2.0, "sell")]}
+    )
+
+    daily = await registry.get_candles("BTC-USDT", "1D")
+    assert len(daily) == 1
+    candle = daily[0]
+    assert candle.timestamp == 1_699_977_600
+    assert (candle.open, candle.high, candle.low, candle.close) == (
+        35_536.9,
+        36_086.0,
+        35_300.0,
+        35_300.0,
+    )
+    assert candle.volume == 4_122.0
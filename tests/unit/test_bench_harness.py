@@ -0,0 +1,86 @@
+"""
+Тесты харнесса бенчмарков: замер кейса и сравнение с baseline.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.harness import (
+    BenchCall,
+    BenchCase,
+    BenchContext,
+    compare,
+    results_document,
+    run_case,
+)
+from benchmarks.market_session import MockFuturesClient, synthetic_session
+
+
+@pytest.mark.asyncio
+async def test_run_case_measures_per_op_and_captures_errors() -> None:
+    calls = []
+
+    async def setup(ctx):
+        return BenchCall(lambda: calls.append(1), ops=4, unit="tick")
+
+    async def broken(ctx):
+        raise ValueError("no data")
+
+    ctx = BenchContext(session=None)
+    result = await run_case(BenchCase("ok", "g", setup, repeats=5, warmup=2), ctx)
+    assert len(calls) == 7
+    assert result.error is None
+    assert result.unit == "tick" and result.ops == 4
+    assert 0 < result.median_us <= result.p95_us
+
+    failed = await run_case(BenchCase("bad", "g", broken), ctx)
+    assert failed.error.startswith("setup:")
+
+
+def test_compare_flags_regressions_against_threshold() -> None:
+    def doc(values):
+        return {
+            "results": {
+                name: {"median_us": value, "error": None}
+                for name, value in values.items()
+            }
+        }
+
+    baseline = doc({"a": 10.0, "b": 10.0, "c": 10.0, "d": 10.0})
+    current = doc({"a": 11.0, "b": 14.0, "c": 5.0, "d": 14.0, "e": 1.0})
+    rows = {
+        row["name"]: row
+        for row in compare(current, baseline, threshold=0.25, thresholds={"d": 0.5})
+    }
+    assert rows["a"]["status"] == "ok"
+    assert rows["b"]["status"] == "regression"
+    assert rows["c"]["status"] == "improved"
+    assert rows["d"]["status"] == "ok"
+    assert rows["e"]["status"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_synthetic_session_is_deterministic_and_mock_client_serves_it() -> None:
+    first = synthetic_session(symbol_count=3, minutes=60, tick_minutes=1)
+    second = synthetic_session(symbol_count=3, minutes=60, tick_minutes=1)
+    assert first.symbols == ["BTC-USDT", "ETH-USDT", "SOL-USDT"]
+    assert len(first.candles["BTC-USDT"]["1m"]) == 60
+    assert len(first.candles["BTC-USDT"]["5m"]) == 12
+    assert first.tickers == second.tickers
+    assert first.tickers[1]["data"][0]["instId"] == "ETH-USDT-SWAP"
+
+    client = MockFuturesClient(first)
+    daily = await client.get_candles("BTC-USDT", "1D", limit=10)
+    assert len(daily) == 10
+    assert daily[-2].timestamp < daily[-1].timestamp
+    book = await client._make_request(
+        "GET", "/api/v5/market/books", params={"instId": "BTC-USDT-SWAP", "sz": 5}
+    )
+    assert len(book["data"][0]["bids"]) == 5
+    assert client.calls == {"get_candles": 1, "GET /api/v5/market/books": 1}
+    assert results_document([], {})["results"] == {}
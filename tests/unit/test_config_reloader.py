@@ -0,0 +1,129 @@
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config import BotConfig
+from src.strategies.scalping.futures.config.config_manager import ConfigManager
+from src.strategies.scalping.futures.config.config_reloader import (
+    ConfigHotReloader,
+    diff_config,
+)
+from src.strategies.scalping.futures.parameters import (
+    ParameterOrchestrator,
+    ParameterStatus,
+)
+
+CONFIG_PATH = project_root / "config" / "config_futures.yaml"
+
+
+class _Registry:
+    def __init__(self, symbols):
+        self.symbols = symbols
+
+    def get_all_positions_sync(self):
+        return {symbol: {} for symbol in self.symbols}
+
+
+def _setup(tmp_path: Path, open_symbols=()):
+    path = tmp_path / "config_futures.yaml"
+    path.write_text(CONFIG_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+    with open(path, "r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+    config_manager = ConfigManager(BotConfig.load_from_file(str(path)), raw)
+    orchestrator = ParameterOrchestrator(config_manager=config_manager)
+    reloader = ConfigHotReloader(
+        path,
+        config_manager,
+        parameter_orchestrator=orchestrator,
+        position_registry=_Registry(list(open_symbols)),
+    )
+    return path, copy.deepcopy(raw), config_manager, orchestrator, reloader
+
+
+def _write(path: Path, raw: dict) -> None:
+    path.write_text(yaml.safe_dump(raw, allow_unicode=True), encoding="utf-8")
+
+
+def test_diff_config_reports_nested_paths() -> None:
+    old = {"a": {"b": 1, "c": [1, 2]}, "x": 1}
+    new = {"a": {"b": 2, "c": [1, 2], "d": True}}
+
+    changes = {c.path: c.kind for c in diff_config(old, new)}
+
+    assert changes == {"a.b": "changed", "a.d": "added", "x": "removed"}
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_compiled_params_and_notifies(tmp_path: Path) -> None:
+    path, raw, config_manager, orchestrator, reloader = _setup(tmp_path)
+    seen = []
+    reloader.subscribe("exit", seen.append, prefixes=("exit_params",))
+    reloader.subscribe("filters", seen.append, prefixes=("futures_modules",))
+
+    raw["exit_params"]["ranging"]["tp_atr_multiplier"] = 9.5
+    _write(path, raw)
+    diff = await reloader.reload()
+
+    assert diff.paths == ["exit_params.ranging.tp_atr_multiplier"]
+    assert seen == [diff]
+    assert reloader.version == 2
+    assert orchestrator.compiled.version == 2
+    entry = orchestrator.get_compiled("exit", "BTC-USDT", "ranging")
+    assert entry.tp_atr_multiplier == 9.5
+    assert (
+        config_manager._raw_config_dict["exit_params"]["ranging"]["tp_atr_multiplier"]
+        == 9.5
+    )
+
+
+@pytest.mark.asyncio
+async def test_open_positions_keep_entry_time_exit_params(tmp_path: Path) -> None:
+    path, raw, _, orchestrator, reloader = _setup(tmp_path, open_symbols=["BTC-USDT"])
+    old_multiplier = raw["exit_params"]["ranging"]["tp_atr_multiplier"]
+
+    raw["exit_params"]["ranging"]["tp_atr_multiplier"] = old_multiplier + 1.0
+    _write(path, raw)
+    await reloader.reload()
+
+    orchestrator.atr_provider.get_atr = lambda symbol: 1.0
+    market_data = type("MD", (), {"current_tick": type("T", (), {"price": 100.0})})
+    status = ParameterStatus(valid=True)
+    pinned = orchestrator._resolve_exit_params(
+        "BTC-USDT", "ranging", market_data, status
+    )
+    fresh = orchestrator._resolve_exit_params(
+        "ETH-USDT", "ranging", market_data, status
+    )
+    assert pinned.tp_atr_multiplier == old_multiplier
+    assert fresh.tp_atr_multiplier == old_multiplier + 1.0
+
+    reloader.position_registry.symbols = []
+    reloader.release_closed_positions()
+    released = orchestrator._resolve_exit_params(
+        "BTC-USDT", "ranging", market_data, status
+    )
+    assert released.tp_atr_multiplier == old_multiplier + 1.0
+
+
+@pytest.mark.asyncio
+async def test_invalid_or_restart_only_changes_are_rejected(tmp_path: Path) -> None:
+    path, raw, config_manager, orchestrator, reloader = _setup(tmp_path)
+    original_raw = config_manager._raw_config_dict
+
+    path.write_text("scalping:\n  enabled: true\n  enabled: false\n", encoding="utf-8")
+    assert await reloader.reload() is None
+
+    raw["scalping"]["symbols"] = raw["scalping"]["symbols"][:1]
+    _write(path, raw)
+    assert await reloader.reload() is None
+
+    assert reloader.stats["rejected"] == 2
+    assert reloader.version == 1
+    assert config_manager._raw_config_dict is original_raw
+    assert orchestrator.compiled.version == 1
@@ -23,6 +23,7 @@ from src.filters.correlation_manager import (
     CorrelationData,
     CorrelationManager,
 )
+from src.filters.correlation_matrix import CorrelationCluster
 from src.strategies.modules.correlation_filter import (
     CorrelationFilter,
     CorrelationFilterConfig,
@@ -433,6 +434,53 @@ class TestCorrelationFilter:
         assert result.allowed is True
         assert "disabled" in result.reason
 
+    def test_hedge_mode_position_uses_pos_side(self):
+        """Тест: в hedge-режиме направление берется из posSide, а не из знака pos"""
+        hedge_short = {"pos": "2", "posSide": "short", "notionalUsd": "500"}
+        net_short = {"pos": "-2", "posSide": "net", "notionalUsd": "500"}
+
+        assert CorrelationFilter._position_direction(hedge_short) == "SHORT"
+        assert CorrelationFilter._position_exposure(hedge_short) == -500.0
+        assert CorrelationFilter._position_exposure(net_short) == -500.0
+
+    @pytest.mark.asyncio
+    async def test_cluster_exposure_limit_blocks_same_direction(self, mock_client):
+        """Тест: нагруженный коррелированный кластер блокирует вход в ту же сторону"""
+        config = CorrelationFilterConfig(
+            max_correlated_positions=5,
+            correlation_threshold=0.7,
+            max_cluster_exposure=1.5,
+        )
+        corr_filter = CorrelationFilter(
+            mock_client, config, ["BTC-USDT", "ETH-USDT", "SOL-USDT"]
+        )
+        positions = {
+            "BTC-USDT": {"pos": "1", "posSide": "long", "notionalUsd": "400"},
+            "SOL-USDT": {"pos": "3", "posSide": "long", "notionalUsd": "400"},
+        }
+        corr_filter.correlation_manager.get_correlation = AsyncMock(return_value=None)
+        corr_filter.correlation_manager.get_correlated_exposure = Mock(
+            return_value=CorrelationCluster(
+                symbol="ETH-USDT",
+                members={"BTC-USDT": 0.9, "SOL-USDT": 0.8},
+                weighted_exposure=680.0,
+            )
+        )
+
+        long_result = await corr_filter.check_entry("ETH-USDT", "LONG", positions)
+        short_result = await corr_filter.check_entry("ETH-USDT", "SHORT", positions)
+
+        # 680 USD = 1.7 средних позиции >= 1.5; SHORT - хедж кластера
+        assert long_result.blocked is True
+        assert long_result.cluster_exposure == 680.0
+        assert short_result.allowed is True
+
+        # Параметры режима ARM не сбрасывают лимит кластера
+        corr_filter.update_parameters(
+            CorrelationFilterConfig(correlation_threshold=0.8)
+        )
+        assert corr_filter.config.max_cluster_exposure == 1.5
+
     def test_get_stats(self, corr_filter):
         """Тест получения статистики"""
         # Act
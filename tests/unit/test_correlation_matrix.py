@@ -0,0 +1,135 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.filters.correlation_matrix import RollingCorrelationMatrix
+from src.models import OHLCV
+
+SYMBOLS = ["BTC-USDT", "ETH-USDT", "SOL-USDT", "XRP-USDT"]
+
+
+def _prices(bars: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, bars)
+    returns = np.stack(
+        [market * (k - 1.5) + rng.normal(0, 0.01, bars) for k in range(len(SYMBOLS))],
+        axis=1,
+    )
+    return 100.0 * np.exp(np.cumsum(returns, axis=0))
+
+
+def _reference(prices: np.ndarray, timestamps, window: int) -> np.ndarray:
+    aligned = prices[timestamps]
+    returns = np.log(aligned[1:] / aligned[:-1])[-window:]
+    return np.corrcoef(returns.T)
+
+
+def test_incremental_matrix_matches_full_recompute_with_gaps() -> None:
+    prices = _prices(300)
+    matrix = RollingCorrelationMatrix(window=40)
+    for t in range(300):
+        for k, symbol in enumerate(SYMBOLS):
+            # У SOL пропуски свечей — остальные ряды не должны сдвигаться
+            if symbol == "SOL-USDT" and t % 23 == 4:
+                continue
+            matrix.update(symbol, t * 60, prices[t, k])
+
+    aligned = [t for t in range(300) if t % 23 != 4]
+    expected = _reference(prices, aligned, 40)
+
+    assert matrix.count == 40
+    np.testing.assert_allclose(matrix.as_array(), expected, atol=1e-9)
+    assert matrix.correlation("ETH-USDT", "XRP-USDT") == pytest.approx(expected[1, 3])
+    assert matrix.stats["resyncs"] > 0
+
+
+def test_ingest_candles_is_idempotent_and_skips_forming_candle() -> None:
+    prices = _prices(60, seed=1)
+    candles = {
+        symbol: [
+            OHLCV(t * 300, symbol, p, p, p, p, 1.0) for t, p in enumerate(prices[:, k])
+        ]
+        for k, symbol in enumerate(SYMBOLS[:2])
+    }
+    matrix = RollingCorrelationMatrix(window=100)
+
+    for symbol, series in candles.items():
+        matrix.ingest_candles(symbol, series)
+    bars = matrix.stats["bars"]
+    for symbol, series in candles.items():
+        assert matrix.ingest_candles(symbol, series) == 0
+
+    assert matrix.count == 58
+    assert matrix.last_timestamp == 58 * 300
+    assert matrix.stats["bars"] == bars
+    expected = _reference(prices[:, :2], list(range(59)), 100)
+    assert matrix.correlation("BTC-USDT", "ETH-USDT") == pytest.approx(expected[0, 1])
+
+
+def test_pair_lookup_requires_min_periods() -> None:
+    matrix = RollingCorrelationMatrix(window=50, min_periods=20)
+    prices = _prices(10)
+    for t in range(10):
+        for k, symbol in enumerate(SYMBOLS):
+            matrix.update(symbol, t, prices[t, k])
+
+    assert matrix.correlation("BTC-USDT", "ETH-USDT") is None
+    assert matrix.pairs() == {}
+
+
+def test_correlated_exposure_weights_positions_by_correlation() -> None:
+    prices = _prices(120, seed=3)
+    matrix = RollingCorrelationMatrix(window=100)
+    for t in range(120):
+        for k, symbol in enumerate(SYMBOLS):
+            matrix.update(symbol, t, prices[t, k])
+    row = matrix.row("BTC-USDT")
+
+    cluster = matrix.correlated_exposure(
+        "BTC-USDT",
+        {"ETH-USDT": 1000.0, "SOL-USDT": -500.0, "XRP-USDT": 200.0},
+        threshold=0.0,
+    )
+
+    assert set(cluster.members) == {"ETH-USDT", "SOL-USDT", "XRP-USDT"}
+    expected = row["ETH-USDT"] * 1000 - row["SOL-USDT"] * 500 + row["XRP-USDT"] * 200
+    assert cluster.weighted_exposure == pytest.approx(expected)
+    strict = matrix.correlated_exposure("BTC-USDT", {"ETH-USDT": 1000.0}, threshold=1.0)
+    assert strict.size == 0
+
+
+def test_stale_symbol_is_dropped_instead_of_freezing_matrix() -> None:
+    prices = _prices(100, seed=4)
+    matrix = RollingCorrelationMatrix(window=30, max_lag=5)
+    for t in range(100):
+        for k, symbol in enumerate(SYMBOLS[:3]):
+            # SOL перестал обновляться после 58-й свечи
+            if symbol == "SOL-USDT" and t > 58:
+                continue
+            matrix.update(symbol, t * 60, prices[t, k])
+
+    assert matrix.last_timestamp == 99 * 60
+    assert matrix.symbols == SYMBOLS[:2]
+    assert matrix.stats["stale_dropped"] == 1
+    expected = _reference(prices[:, :2], list(range(100)), 30)
+    assert matrix.correlation("BTC-USDT", "ETH-USDT") == pytest.approx(expected[0, 1])
+
+
+def test_forming_candle_close_revises_last_return() -> None:
+    prices = _prices(50, seed=5)
+    matrix = RollingCorrelationMatrix(window=20)
+    for t in range(50):
+        for k, symbol in enumerate(SYMBOLS[:2]):
+            # Формирующаяся свеча: сначала промежуточный close, затем итоговый
+            matrix.update(symbol, t, prices[t, k] * 1.01)
+            matrix.update(symbol, t, prices[t, k])
+
+    expected = _reference(prices[:, :2], list(range(50)), 20)
+    assert matrix.count == 20
+    assert matrix.stats["revisions"] > 0
+    assert matrix.correlation("BTC-USDT", "ETH-USDT") == pytest.approx(expected[0, 1])
@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models import OHLCV
+from src.strategies.modules.multi_timeframe import MTFConfig, MultiTimeframeFilter
+from src.strategies.scalping.futures.core.data_registry import DataRegistry
+from src.utils.derived_cache import (
+    DependencyVersions,
+    DerivedCache,
+    candles_dep,
+    regime_dep,
+)
+
+
+def _candle(ts: int, close: float, timeframe: str = "5m") -> OHLCV:
+    return OHLCV(
+        timestamp=ts,
+        symbol="BTC-USDT",
+        open=close,
+        high=close,
+        low=close,
+        close=close,
+        volume=1.0,
+        timeframe=timeframe,
+    )
+
+
+def test_value_lives_until_dependency_version_bumps() -> None:
+    versions = DependencyVersions()
+    cache = DerivedCache("test", versions, max_entries=2)
+    deps = (candles_dep("BTC-USDT", "5m"), regime_dep("BTC-USDT"))
+
+    cache.put("a", 1, deps)
+    versions.bump(candles_dep("ETH-USDT", "5m"))
+    assert cache.get("a") == 1
+
+    versions.bump(regime_dep("BTC-USDT"))
+    assert cache.get("a") is None
+    assert cache.stats["invalidations"] == 1
+
+    cache.put("a", 1, deps)
+    cache.put("b", 2, deps)
+    cache.get("a")  # "a" становится самым свежим
+    cache.put("c", 3, deps)
+    assert "b" not in cache and "a" in cache
+    assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_taken_before_compute_wins_over_concurrent_bump() -> None:
+    versions = DependencyVersions()
+    cache = DerivedCache("test", versions)
+    dep = candles_dep("BTC-USDT", "1m")
+
+    async def compute():
+        versions.bump(dep)  # свеча закрылась, пока считали
+        return "stale"
+
+    assert await cache.get_or_compute("k", (dep,), compute) == "stale"
+    assert cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_registry_bumps_on_candle_close_not_on_forming_update() -> None:
+    registry = DataRegistry()
+    dep = candles_dep("BTC-USDT", "5m")
+    await registry.initialize_candles("BTC-USDT", "5m", [_candle(0, 1.0)])
+    start = registry.versions.get(dep)
+
+    await registry.update_last_candle("BTC-USDT", "5m", close=2.0)
+    await registry.add_candle("BTC-USDT", "5m", _candle(0, 2.0))  # дубликат
+    assert registry.versions.get(dep) == start
+
+    await registry.add_candle("BTC-USDT", "5m", _candle(300, 3.0))
+    assert registry.versions.get(dep) == start + 1
+
+    await registry.update_regime("BTC-USDT", "ranging")
+    await registry.update_regime("BTC-USDT", "ranging")
+    assert registry.versions.get(regime_dep("BTC-USDT")) == 1
+
+
+@pytest.mark.asyncio
+async def test_mtf_trend_recomputed_only_after_htf_close() -> None:
+    registry = DataRegistry()
+    candles = [_candle(i * 300, 100.0 + i) for i in range(30)]
+    await registry.initialize_candles("BTC-USDT", "5m", candles)
+    mtf = MultiTimeframeFilter(config=MTFConfig(), data_registry=registry)
+    calls = []
+    original = mtf._closed_emas
+    mtf._closed_emas = lambda c: calls.append(len(c)) or original(c)
+
+    first = await mtf.check_confirmation("BTC-USDT", "LONG")
+    await mtf.check_confirmation("BTC-USDT", "LONG")
+    assert first.htf_trend == "BULLISH"
+    assert calls == [30]
+
+    # Формирующаяся свеча провалилась: тренд меняется до закрытия свечи,
+    # EMA закрытых свечей берутся из кэша
+    await registry.update_last_candle("BTC-USDT", "5m", close=90.0)
+    dropped = await mtf.check_confirmation("BTC-USDT", "LONG")
+    assert dropped.htf_trend == "NEUTRAL"
+    assert calls == [30]
+    # Совпадает с полным пересчетом без кэша
+    forming = await registry.get_candles("BTC-USDT", "5m")
+    assert MultiTimeframeFilter()._calculate_trend(forming) == "NEUTRAL"
+
+    await registry.add_candle("BTC-USDT", "5m", _candle(30 * 300, 131.0))
+    await mtf.check_confirmation("BTC-USDT", "SHORT")
+    assert calls == [30, 31]
+
+    stats = registry.get_cache_stats()
+    assert stats["caches"]["mtf_trend"]["hits"] == 2
+    assert stats["memory_bytes"] > 0
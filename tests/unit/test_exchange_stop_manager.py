@@ -0,0 +1,204 @@
+"""
+Тесты ExchangeStopManager: ratchet, гистерезис, коалесинг amend, сверка,
+повтор не принятых стопов, снятие при закрытии во время выставления и
+размер после частичного закрытия.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.positions.exchange_stop_manager import (
+    ExchangeStopManager,
+)
+
+
+class FakeAlgoClient:
+    """Клиент с algo-ордерами в памяти."""
+
+    def __init__(self):
+        self.pending = {}
+        self.amends = []
+        self.canceled = []
+        self.fail_amend = False
+        self.reject_place = False
+        self.place_gate = None  # asyncio.Event: задержать ответ на выставление
+        self._next_id = 0
+
+    async def place_algo_order(self, symbol, side, size, trigger_price, **kwargs):
+        if self.place_gate is not None:
+            await self.place_gate.wait()
+        if self.reject_place:
+            return {"code": "51008", "msg": "insufficient margin", "data": []}
+        self._next_id += 1
+        algo_id = f"algo{self._next_id}"
+        self.pending[algo_id] = {
+            "algoId": algo_id,
+            "instId": f"{symbol}-SWAP",
+            "sz": size,
+        }
+        return {"code": "0", "data": [{"algoId": algo_id}]}
+
+    async def amend_algo_order(
+        self, symbol, algo_id, new_sl_trigger_price=None, new_size=None
+    ):
+        self.amends.append((symbol, new_sl_trigger_price))
+        if self.fail_amend or algo_id not in self.pending:
+            return {"code": "51000", "msg": "algo order does not exist"}
+        if new_size is not None:
+            self.pending[algo_id]["sz"] = new_size
+        return {"code": "0", "data": [{"algoId": algo_id}]}
+
+    async def cancel_algo_order(self, symbol, algo_id):
+        self.canceled.append(algo_id)
+        self.pending.pop(algo_id, None)
+        return {"code": "0"}
+
+    async def get_algo_orders(self, symbol=None, order_type="conditional"):
+        return list(self.pending.values())
+
+
+def _manager(client, **cfg) -> ExchangeStopManager:
+    config = {"min_step_pct": 0.1, "min_gap_pct": 0.05, "coalesce_ms": 10}
+    config.update(cfg)
+    return ExchangeStopManager(client, config)
+
+
+@pytest.mark.asyncio
+async def test_update_ratchets_and_applies_hysteresis() -> None:
+    client = FakeAlgoClient()
+    stops = _manager(client)
+    await stops.place("BTC-USDT", "long", 0.01, 99.0)
+
+    # Ослабление стопа игнорируется
+    assert stops.update("BTC-USDT", 98.0, 101.0) is False
+    # Сдвиг меньше min_step_pct (0.1% от 99 = 0.099) не отправляется
+    assert stops.update("BTC-USDT", 99.05, 101.0) is False
+    assert stops.get_stop("BTC-USDT").target_px == 99.05
+    # Стоп выше цены прижимается к зазору min_gap_pct
+    assert stops.update("BTC-USDT", 120.0, 101.0) is True
+    assert stops.get_stop("BTC-USDT").target_px == pytest.approx(101.0 * 0.9995)
+
+    short = await stops.place("ETH-USDT", "short", 1.0, 11.0)
+    assert short
+    assert stops.update("ETH-USDT", 11.5, 10.0) is False
+    assert stops.update("ETH-USDT", 10.5, 10.0) is True
+
+    stats = stops.get_stats()
+    assert stats["ratchet_rejected"] == 2
+    assert stats["hysteresis_skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_updates_are_coalesced_into_one_amend_per_symbol() -> None:
+    client = FakeAlgoClient()
+    stops = _manager(client)
+    for symbol in ("BTC-USDT", "ETH-USDT", "SOL-USDT"):
+        await stops.place(symbol, "long", 1.0, 90.0)
+    await stops.start()
+    try:
+        for price in (91.0, 92.0, 93.0, 94.0):
+            for symbol in ("BTC-USDT", "ETH-USDT", "SOL-USDT"):
+                stops.update(symbol, price, 100.0)
+        await asyncio.sleep(0.1)
+    finally:
+        await stops.stop()
+
+    assert sorted(client.amends) == [
+        ("BTC-USDT", 94.0),
+        ("ETH-USDT", 94.0),
+        ("SOL-USDT", 94.0),
+    ]
+    assert stops.get_stop("BTC-USDT").exchange_px == 94.0
+    assert stops.get_stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_missing_algo_order_is_replaced_and_fill_marks_triggered() -> None:
+    client = FakeAlgoClient()
+    stops = _manager(client)
+    algo_id = await stops.place("BTC-USDT", "long", 0.01, 90.0)
+
+    # Ордер пропал на бирже: amend падает, сверка выставляет стоп заново
+    client.pending.clear()
+    stops.update("BTC-USDT", 95.0, 100.0)
+    await stops.flush()
+    stop = stops.get_stop("BTC-USDT")
+    assert stop.algo_id != algo_id
+    assert stop.algo_id in client.pending
+    assert stop.exchange_px == 95.0
+    assert stops.get_stats()["replaced"] == 1
+
+    # Исполнение стопа приходит в канале orders с algoId
+    stops.on_order_update({"algoId": stop.algo_id, "state": "filled"})
+    assert stop.state == "triggered"
+    assert stops.update("BTC-USDT", 97.0, 100.0) is False
+
+    # Сработавший стоп не отменяем, живой - отменяем при закрытии позиции
+    stops.release("BTC-USDT")
+    eth_id = await stops.place("ETH-USDT", "short", 1.0, 12.0)
+    stops.release("ETH-USDT")
+    await asyncio.sleep(0)
+    assert client.canceled == [eth_id]
+    assert stops.get_stop("ETH-USDT") is None
+
+
+@pytest.mark.asyncio
+async def test_rejected_stop_is_retried_on_reconcile_with_latest_level() -> None:
+    client = FakeAlgoClient()
+    stops = _manager(client)
+    client.reject_place = True
+    assert await stops.place("BTC-USDT", "long", 0.01, 90.0) is None
+    stop = stops.get_stop("BTC-USDT")
+    assert stop.state == "failed"
+    # TSL продолжает двигать уровень, пока стопа нет на бирже
+    assert stops.update("BTC-USDT", 95.0, 100.0) is False
+    await stops.reconcile()
+    assert stop.state == "failed"
+
+    client.reject_place = False
+    await stops.reconcile()
+    assert stop.state == "live" and stop.algo_id in client.pending
+    assert stop.exchange_px == 95.0
+    assert stops.get_stats()["retried"] == 2
+
+
+@pytest.mark.asyncio
+async def test_release_during_placement_cancels_stop_after_ack() -> None:
+    client = FakeAlgoClient()
+    client.place_gate = asyncio.Event()
+    stops = _manager(client)
+    placing = asyncio.create_task(stops.place("BTC-USDT", "long", 0.01, 90.0))
+    await asyncio.sleep(0)
+    # Позиция закрылась раньше, чем биржа подтвердила стоп
+    stops.release("BTC-USDT")
+    client.place_gate.set()
+    assert await placing is None
+    await asyncio.sleep(0)
+    assert client.canceled == ["algo1"]
+    assert client.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_resize_after_partial_close_amends_size() -> None:
+    client = FakeAlgoClient()
+    stops = _manager(client)
+    algo_id = await stops.place("BTC-USDT", "long", 0.02, 90.0)
+
+    assert stops.resize("BTC-USDT", 0.008) is True
+    assert stops.resize("BTC-USDT", 0.008) is False
+    await stops.flush()
+    stop = stops.get_stop("BTC-USDT")
+    assert client.pending[algo_id]["sz"] == 0.008
+    assert stop.exchange_size == 0.008
+    assert stops.get_stats()["resized"] == 1
+    # Следующий amend уровня размер не трогает
+    stops.update("BTC-USDT", 95.0, 100.0)
+    await stops.flush()
+    assert stops.get_stats()["resized"] == 1
+    assert stops.resize("ETH-USDT", 1.0) is False
@@ -0,0 +1,149 @@
+"""
+Тесты ExecutionCostModel: комиссия и проскальзывание по событиям канала
+orders, вероятность исполнения лимиток, выбор limit/market, fallback по
+уровням агрегации и загрузка журнала сделок.
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.metrics.execution_costs import (
+    ExecutionCostModel,
+    size_bucket,
+)
+
+T0_MS = 1_700_000_000_000
+
+
+def _fill(order_id, side, ord_type, px, sz, fee, state="filled", dt_ms=500, **extra):
+    return {
+        "ordId": order_id,
+        "instId": "BTC-USDT-SWAP",
+        "side": side,
+        "ordType": ord_type,
+        "state": state,
+        "fillPx": str(px),
+        "fillSz": str(sz),
+        "fillFee": str(fee),
+        "fillNotionalUsd": str(px * sz),
+        "tradeId": f"t-{order_id}",
+        "cTime": str(T0_MS),
+        "fillTime": str(T0_MS + dt_ms),
+        "uTime": str(T0_MS + dt_ms),
+        "avgPx": str(px),
+        "accFillSz": str(sz),
+        **extra,
+    }
+
+
+def test_market_fills_learn_fee_slippage_and_fall_back_by_level() -> None:
+    costs = ExecutionCostModel({"min_samples": 3})
+    assert costs.round_trip_cost("BTC-USDT") is None
+
+    for i in range(3):
+        order_id = f"m{i}"
+        costs.on_order_placed(order_id, "BTC-USDT", "buy", "market", 200.0, 100.0)
+        # Исполнение на 5 bps хуже ask, taker 0.05%
+        costs.on_order_update(_fill(order_id, "buy", "market", 100.05, 2, -0.10005))
+        # Повтор того же трейда не учитывается дважды
+        costs.on_order_update(_fill(order_id, "buy", "market", 100.05, 2, -0.10005))
+
+    est = costs.estimate("BTC-USDT", "buy", "market", notional=200.0, now=T0_MS / 1000)
+    assert abs(est.slippage_bps - 5.0) < 1e-6
+    assert abs(est.fee_rate - 0.0005) < 1e-9
+    assert abs(est.time_to_fill_sec - 0.5) < 1e-9
+    assert est.samples == 3
+    # Другая сторона/размер - уровень "символ + тип"
+    other = costs.estimate("BTC-USDT", "sell", "ioc", notional=50_000.0)
+    assert abs(other.fee_rate - 0.0005) < 1e-9
+    # Другой символ - уровень "тип"
+    assert abs(costs.fee_rate("ETH-USDT", "market") - 0.0005) < 1e-9
+    assert costs.fee_rate("BTC-USDT", "limit") is None
+    assert costs.get_stats()["tracked_orders"] == 0
+
+
+def test_limit_misses_switch_entry_to_market_and_feed_round_trip() -> None:
+    quotes = {"BTC-USDT": (99.99, 100.0)}
+    costs = ExecutionCostModel(
+        {"min_samples": 4, "alpha": 0.5}, quote_source=quotes.get
+    )
+    # Market-ордера размещены в обход on_order_placed: ориентир из quote_source
+    for i in range(4):
+        costs.on_order_update(_fill(f"m{i}", "buy", "market", 100.02, 1, -0.05001))
+
+    # Лимитки: одна исполнена (ребейт), три отменены без исполнения
+    costs.on_order_placed("l0", "BTC-USDT", "buy", "post_only", 100.0)
+    costs.on_order_update(_fill("l0", "buy", "post_only", 99.99, 1, 0.0099990))
+    for i in range(1, 4):
+        costs.on_order_placed(f"l{i}", "BTC-USDT", "buy", "limit", 100.0)
+        costs.on_order_update(
+            {"ordId": f"l{i}", "state": "canceled", "accFillSz": "0", "fillSz": "0"}
+        )
+
+    assert costs.preferred_entry_type("BTC-USDT", "buy", 100.0) is None  # 1 fee-выборка
+    for i in range(4, 7):
+        costs.on_order_placed(f"l{i}", "BTC-USDT", "buy", "limit", 100.0)
+        costs.on_order_update(_fill(f"l{i}", "buy", "limit", 99.99, 1, 0.0099990))
+
+    est = costs.estimate("BTC-USDT", "buy", "limit", 100.0)
+    assert est.maker_fill_prob is not None and est.fee_rate < 0
+    # После серии исполнений лимитки выгоднее market
+    assert costs.preferred_entry_type("BTC-USDT", "buy", 100.0) == "limit"
+    for i in range(7, 12):
+        costs.on_order_placed(f"l{i}", "BTC-USDT", "buy", "limit", 100.0)
+        costs.on_order_update({"ordId": f"l{i}", "state": "canceled"})
+    assert costs.preferred_entry_type("BTC-USDT", "buy", 100.0) == "market"
+
+    # Круг: maker-вход + taker-выход + проскальзывание выхода (2 bps)
+    round_trip = costs.round_trip_cost("BTC-USDT")
+    maker = costs.fee_rate("BTC-USDT", "limit")
+    assert abs(round_trip - (maker + 0.0005 + 0.0002)) < 1e-6
+
+
+def test_journal_rows_warm_market_slippage(tmp_path) -> None:
+    path = tmp_path / "all_data_2026-01-01.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=[
+                "record_type",
+                "timestamp",
+                "symbol",
+                "side",
+                "order_type",
+                "status",
+                "fill_price",
+                "fill_size",
+                "execution_time_ms",
+                "slippage",
+            ],
+        )
+        writer.writeheader()
+        for slippage in (0.03, 0.05):
+            writer.writerow(
+                {
+                    "record_type": "orders",
+                    "timestamp": "2026-01-01T10:00:00",
+                    "symbol": "ETH-USDT",
+                    "side": "sell",
+                    "order_type": "market",
+                    "status": "filled",
+                    "fill_price": "2000",
+                    "fill_size": "0.05",
+                    "execution_time_ms": "120",
+                    "slippage": str(slippage),
+                }
+            )
+        writer.writerow({"record_type": "orders", "status": "placed"})
+        writer.writerow({"record_type": "trades", "symbol": "ETH-USDT"})
+
+    costs = ExecutionCostModel({"min_samples": 2})
+    assert costs.ingest_journal_dir(str(tmp_path)) == 2
+    est = costs.estimate("ETH-USDT", "sell", "market", notional=100.0)
+    assert abs(est.slippage_bps - 4.0) < 1e-6
+    assert abs(est.time_to_fill_sec - 0.12) < 1e-9
+    assert size_bucket(100.0) == 1 and size_bucket(None) is None
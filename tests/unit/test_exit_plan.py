@@ -0,0 +1,122 @@
+"""
+Тесты ExitPlanner: перевод порогов TSL / ExitAnalyzer / ExitGuard в цены,
+спокойный коридор и пересборка плана при смене режима.
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.positions.exit_plan import ExitPlanner
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.tp_calls = 0
+
+    def _safe_sl_percent(self, symbol, regime, **kwargs):
+        return 2.0 if regime == "ranging" else 4.0
+
+    async def _get_tp_percent(self, symbol, regime, *args, **kwargs):
+        self.tp_calls += 1
+        return 3.0
+
+    def _get_partial_tp_params(self, regime):
+        return {"enabled": True, "fraction": 0.5, "trigger_percent": 1.0}
+
+    def _get_big_profit_exit_percent(self, symbol):
+        return 5.0
+
+    def _get_max_holding_minutes(self, regime, symbol=None):
+        return 30.0
+
+
+def _tsl(side="long", entry_timestamp=None):
+    return SimpleNamespace(
+        entry_price=100.0,
+        side=side,
+        leverage=5,
+        loss_cut_percent=0.05,
+        trading_fee_rate=0.0002,
+        timeout_minutes=None,
+        entry_timestamp=entry_timestamp or time.time(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_compiled_prices_and_quiet_corridor() -> None:
+    guard = SimpleNamespace(
+        fee_rate_round_trip=0.001, min_gross_edge=0.002, min_net_profit=0.0
+    )
+    planner = ExitPlanner(
+        {"approach_band_pct": 0.001}, exit_analyzer=FakeAnalyzer(), exit_guard=guard
+    )
+    plan = await planner.compile("BTC-USDT", _tsl(), "ranging")
+
+    # loss-cut 5% маржи / 5x = 1% цены, комиссия на круг 0.04% ближе ко входу
+    assert plan.loss_cut_price == pytest.approx(100.0 * (1 - 0.0096))
+    assert plan.critical_loss_cut_price == pytest.approx(100.0 * (1 - 0.0196))
+    assert plan.sl_price == pytest.approx(100.0 * (1 - 0.0036))
+    # fee-edge: (0.1% * 5 + 0.2%) от маржи / 5x
+    assert plan.break_even_price == pytest.approx(100.14)
+    assert plan.tp_prices == pytest.approx((100.2, 100.6, 101.0))
+    assert plan.lower == pytest.approx(99.64 * 1.001)
+    assert plan.upper == pytest.approx(100.14 * 0.999)
+
+    now = time.time()
+    assert plan.is_quiet(100.0, now)
+    assert not plan.is_quiet(99.7, now)  # в полосе подхода к SL
+    assert not plan.is_quiet(100.1, now)  # у безубытка
+    assert not plan.is_quiet(100.0, now, stop_loss=99.95)  # рядом уровень TSL
+    assert not plan.is_quiet(100.0, now + 31 * 60)  # max_holding истек
+
+    short = await planner.compile("ETH-USDT", _tsl("short"), "ranging")
+    assert short.lower == pytest.approx(99.86 * 1.001)
+    assert short.upper == pytest.approx(100.36 * 0.999)
+    assert short.is_quiet(100.0, now, stop_loss=100.5)
+
+
+@pytest.mark.asyncio
+async def test_should_analyze_skips_quiet_ticks_and_recompiles() -> None:
+    analyzer = FakeAnalyzer()
+    planner = ExitPlanner({"full_check_interval_sec": 2.0}, exit_analyzer=analyzer)
+    tsl = _tsl()
+    now = time.time()
+
+    # Первый тик - компиляция и полный анализ, дальше только сравнения
+    assert await planner.should_analyze("BTC", tsl, 100.0, regime="ranging", now=now)
+    for i in range(5):
+        assert not await planner.should_analyze(
+            "BTC", tsl, 100.0, regime="ranging", now=now + 0.1 * i
+        )
+    assert analyzer.tp_calls == 1
+    # Раз в full_check_interval_sec - полный анализ даже в коридоре
+    assert await planner.should_analyze(
+        "BTC", tsl, 100.0, regime="ranging", now=now + 2.5
+    )
+    # Подход к порогу убытка
+    assert await planner.should_analyze(
+        "BTC", tsl, 99.6, regime="ranging", now=now + 2.6
+    )
+
+    # Смена режима: SL 4% вместо 2%, план пересобран
+    assert await planner.should_analyze(
+        "BTC", tsl, 99.6, regime="trending", now=now + 2.7
+    )
+    plan = planner.get("BTC")
+    assert plan.regime == "trending"
+    assert plan.sl_price == pytest.approx(100.0 * (1 - 0.0076))
+    assert analyzer.tp_calls == 2
+
+    stats = planner.get_stats()
+    assert stats["compiled"] == 2
+    assert stats["quiet_ticks"] == 5
+
+    planner.drop("BTC")
+    assert planner.get("BTC") is None
@@ -0,0 +1,113 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.signals.filter_manager import FilterManager
+from src.strategies.scalping.futures.signals.filter_planner import (
+    FilterContext,
+    FilterPlanner,
+    FilterStage,
+)
+
+
+def _stage(name, verdict, calls, slow=False, delay=0.0):
+    async def run(ctx):
+        calls.append(name)
+        if delay:
+            await asyncio.sleep(delay)
+        return verdict
+
+    return FilterStage(name, run, slow=slow)
+
+
+def _ctx(symbol="BTC-USDT"):
+    return FilterContext(symbol=symbol, signal={"side": "buy"}, market_data=None)
+
+
+@pytest.mark.asyncio
+async def test_planner_moves_rejecting_filter_first_and_stops_early() -> None:
+    planner = FilterPlanner()
+    calls = []
+    stages = [
+        _stage("a", True, calls),
+        _stage("b", True, calls),
+        _stage("c", False, calls),
+    ]
+
+    assert await planner.run(stages, _ctx()) is False
+    assert calls == ["a", "b", "c"]
+
+    calls.clear()
+    for _ in range(3):
+        assert await planner.run(stages, _ctx()) is False
+    # "c" блокирует всегда - после первого прогона он первый в плане
+    assert calls == ["c", "c", "c"]
+
+    trace = planner.get_traces(limit=1)[0]
+    assert trace["blocked_by"] == "c"
+    assert trace["skipped"] == 2
+    assert planner.get_stats()["filters"]["c"]["BTC-USDT|unknown"]["rejects"] == 4
+
+    # Статистика ведется по символу: для другой пары порядок исходный
+    calls.clear()
+    await planner.run(stages, _ctx("ETH-USDT"))
+    assert calls == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_slow_filters_run_concurrently_with_deadline() -> None:
+    planner = FilterPlanner({"slow_deadline_sec": 0.05})
+    calls = []
+    stages = [
+        _stage("fast", True, calls),
+        _stage("rest_ok", True, calls, slow=True, delay=0.01),
+        _stage("rest_hang", True, calls, slow=True, delay=1.0),
+    ]
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert await planner.run(stages, _ctx()) is True
+    assert loop.time() - started < 0.5
+    steps = planner.get_traces(limit=1)[0]["steps"]
+    assert {"filter": "rest_hang", "passed": True, "timeout": True} in steps
+    assert planner.counters["timeouts"] == 1
+
+    # Блокирующий медленный фильтр отменяет остальных
+    stages[1] = _stage("rest_block", False, calls, slow=True, delay=0.01)
+    assert await planner.run(stages, _ctx()) is False
+    assert planner.get_traces(limit=1)[0]["blocked_by"] == "rest_block"
+
+
+class _Funding:
+    def __init__(self, allowed):
+        self.allowed = allowed
+
+    async def is_signal_valid(self, symbol, side, overrides=None):
+        return self.allowed
+
+
+class _Correlation:
+    async def is_signal_valid(self, signal, _):
+        return True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("planner_config", [None, {"enabled": False}])
+async def test_filter_manager_decisions_do_not_depend_on_planner(
+    planner_config,
+) -> None:
+    manager = FilterManager(planner_config=planner_config)
+    manager.set_correlation_filter(_Correlation())
+    manager.set_funding_rate_filter(_Funding(True))
+
+    passed = await manager.apply_all_filters("BTC-USDT", {"side": "buy"}, None)
+    assert passed["filters_passed"] == ["Correlation", "FundingRate"]
+
+    manager.set_funding_rate_filter(_Funding(False))
+    assert await manager.apply_all_filters("BTC-USDT", {"side": "buy"}, None) is None
+    assert manager.get_funnel_traces("BTC-USDT")[0]["blocked_by"] == "funding"
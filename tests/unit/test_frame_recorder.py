@@ -0,0 +1,166 @@
+"""
+Тесты записи и воспроизведения WS-кадров (FrameRecorder / RecordingReader).
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.recording import (
+    FrameRecorder,
+    FrameReplayer,
+    RecordingReader,
+    list_sessions,
+)
+
+
+def _ticker(inst_id: str, last: float) -> dict:
+    return {
+        "arg": {"channel": "tickers", "instId": inst_id},
+        "data": [{"instId": inst_id, "last": str(last)}],
+    }
+
+
+def _record(recorder: FrameRecorder, source: str, frame: dict) -> None:
+    recorder.record(source, json.dumps(frame), frame)
+
+
+def test_recorder_writes_indexed_blocks_and_reader_filters(tmp_path) -> None:
+    recorder = FrameRecorder(str(tmp_path), session="s1", flush_frames=3)
+    recorder.start()
+    for i in range(4):
+        _record(recorder, "public", _ticker("BTC-USDT-SWAP", 100 + i))
+    for i in range(4):
+        _record(recorder, "public", _ticker("ETH-USDT-SWAP", 10 + i))
+    account = {"arg": {"channel": "account"}, "data": [{"totalEq": "1000"}]}
+    _record(recorder, "private", account)
+    recorder.close()
+
+    stats = recorder.get_stats()
+    assert stats["frames"] == 9
+    assert stats["dropped_blocks"] == 0
+    assert stats["avg_record_us"] > 0
+
+    assert list_sessions(str(tmp_path)) == [tmp_path / "s1"]
+    reader = RecordingReader(str(tmp_path / "s1"))
+    assert sum(entry["frames"] for entry in reader.index) == 9
+    assert len(reader.index) == 3
+
+    frames = list(reader.frames())
+    assert len(frames) == 9
+    assert [f.mono for f in frames] == sorted(f.mono for f in frames)
+    assert frames[0].payload == _ticker("BTC-USDT-SWAP", 100)
+
+    eth = list(reader.frames(symbols=["ETH-USDT"]))
+    assert [f.payload["data"][0]["last"] for f in eth] == ["10", "11", "12", "13"]
+    # Блок без ETH-USDT не распаковывается
+    assert len(reader.blocks(symbols=["ETH-USDT"])) == 2
+
+    private = list(reader.frames(sources=["private"]))
+    assert [f.channel for f in private] == ["account"]
+
+    first_ts, last_ts = reader.time_range()
+    assert first_ts <= frames[4].ts <= last_ts
+    assert list(reader.frames(start=frames[5].ts))[0].mono == frames[5].mono
+    assert list(reader.frames(start=last_ts + 1)) == []
+
+
+def test_reader_skips_torn_index_line_and_resumes_chunk_numbering(tmp_path) -> None:
+    recorder = FrameRecorder(str(tmp_path), session="s2")
+    recorder.start()
+    _record(recorder, "public", _ticker("BTC-USDT-SWAP", 1))
+    recorder.close()
+    with open(tmp_path / "s2" / "index.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"file": "frames_0000')
+
+    restarted = FrameRecorder(str(tmp_path), session="s2")
+    restarted.start()
+    _record(restarted, "public", _ticker("BTC-USDT-SWAP", 2))
+    restarted.close()
+
+    assert sorted(p.name for p in (tmp_path / "s2").glob("frames_*")) == [
+        "frames_000001.jsonl.gz",
+        "frames_000002.jsonl.gz",
+    ]
+    reader = RecordingReader(str(tmp_path / "s2"))
+    assert [f.payload["data"][0]["last"] for f in reader.frames()] == ["1", "2"]
+
+
+def test_recorder_channel_filter(tmp_path) -> None:
+    recorder = FrameRecorder(str(tmp_path), session="s3", channels=["tickers"])
+    recorder.start()
+    _record(recorder, "public", _ticker("BTC-USDT-SWAP", 1))
+    _record(
+        recorder,
+        "public",
+        {"arg": {"channel": "mark-price", "instId": "BTC-USDT-SWAP"}, "data": []},
+    )
+    recorder.close()
+    assert recorder.get_stats()["filtered"] == 1
+    reader = RecordingReader(str(tmp_path / "s3"))
+    assert [f.channel for f in reader.frames()] == ["tickers"]
+
+
+@pytest.mark.asyncio
+async def test_replayer_feeds_handlers_by_source_and_keeps_pace(tmp_path) -> None:
+    recorder = FrameRecorder(str(tmp_path), session="s4")
+    recorder.start()
+    _record(recorder, "public", _ticker("BTC-USDT-SWAP", 1))
+    time.sleep(0.2)
+    _record(recorder, "private", {"arg": {"channel": "orders"}, "data": [{}]})
+    _record(recorder, "public", _ticker("BTC-USDT-SWAP", 2))
+    recorder.close()
+
+    received = []
+
+    async def public(data):
+        received.append(("public", data["arg"]["channel"]))
+
+    async def private(data):
+        received.append(("private", data["arg"]["channel"]))
+
+    replayer = FrameReplayer(RecordingReader(str(tmp_path / "s4")))
+    started = time.monotonic()
+    count = await replayer.replay({"public": public, "private": private}, speed=2.0)
+    elapsed = time.monotonic() - started
+    assert count == 3
+    assert received == [
+        ("public", "tickers"),
+        ("private", "orders"),
+        ("public", "tickers"),
+    ]
+    assert 0.08 <= elapsed < 0.5
+
+    received.clear()
+    assert await replayer.replay({"public": public}, speed=0) == 2
+    assert received == [("public", "tickers"), ("public", "tickers")]
+
+
+@pytest.mark.asyncio
+async def test_replay_into_websocket_manager_callbacks(tmp_path) -> None:
+    from src.strategies.scalping.futures.websocket_manager import (
+        FuturesWebSocketManager,
+    )
+
+    recorder = FrameRecorder(str(tmp_path), session="s5")
+    recorder.start()
+    for i in range(3):
+        _record(recorder, "public", _ticker("BTC-USDT-SWAP", 100 + i))
+    recorder.close()
+
+    ws_manager = FuturesWebSocketManager()
+    prices = []
+
+    async def on_ticker(data):
+        prices.append(data["data"][0]["last"])
+
+    ws_manager.callbacks["tickers:BTC-USDT-SWAP"] = on_ticker
+    replayer = FrameReplayer(RecordingReader(str(tmp_path / "s5")))
+    await replayer.replay({"public": ws_manager.replay_frame}, speed=0)
+    assert prices == ["100", "101", "102"]
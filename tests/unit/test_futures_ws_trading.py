@@ -0,0 +1,170 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clients.futures_client import OKXFuturesClient
+from src.strategies.scalping.futures.private_websocket_manager import (
+    PrivateWebSocketManager,
+)
+
+
+class _FakeWS:
+    def __init__(self, manager: PrivateWebSocketManager, reply=None):
+        self.closed = False
+        self.sent = []
+        self._manager = manager
+        self._reply = reply
+
+    async def send_str(self, text: str) -> None:
+        msg = json.loads(text)
+        self.sent.append(msg)
+        if self._reply is not None:
+            response = dict(self._reply, id=msg["id"], op=msg["op"])
+            asyncio.get_running_loop().call_soon(
+                lambda: asyncio.ensure_future(self._manager._handle_data(response))
+            )
+
+
+def _ready_manager(reply=None) -> PrivateWebSocketManager:
+    manager = PrivateWebSocketManager("k", "s", "p", sandbox=True)
+    manager.connected = True
+    manager.authenticated = True
+    manager.ws = _FakeWS(manager, reply)
+    return manager
+
+
+def _client() -> OKXFuturesClient:
+    client = OKXFuturesClient("k", "s", "p", sandbox=True)
+    client._make_request = AsyncMock(
+        return_value={"code": "0", "msg": "", "data": [{"ordId": "rest"}]}
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_send_request_matches_response_by_id() -> None:
+    manager = _ready_manager(reply={"code": "0", "msg": "", "data": [{"ordId": "1"}]})
+
+    resp = await manager.send_request("order", [{"instId": "BTC-USDT-SWAP"}])
+
+    assert resp["data"][0]["ordId"] == "1"
+    assert resp["id"] == manager.ws.sent[0]["id"]
+    assert manager._pending_requests == {}
+
+
+@pytest.mark.asyncio
+async def test_send_request_times_out_and_cleans_up() -> None:
+    manager = _ready_manager(reply=None)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await manager.send_request("cancel-order", [{}], timeout=0.05)
+    assert manager._pending_requests == {}
+
+
+@pytest.mark.asyncio
+async def test_cancel_order_goes_over_ws_when_ready() -> None:
+    client = _client()
+    client.set_ws_trading(
+        _ready_manager(reply={"code": "0", "msg": "", "data": [{"ordId": "9"}]})
+    )
+
+    resp = await client.cancel_order("BTC-USDT", "9")
+
+    assert resp["data"][0]["ordId"] == "9"
+    client._make_request.assert_not_called()
+    assert client.ws_trading_stats["ws_ok"] == 1
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_rest_when_ws_disconnected() -> None:
+    client = _client()
+    manager = _ready_manager()
+    manager.connected = False
+    client.set_ws_trading(manager)
+
+    resp = await client.amend_order("BTC-USDT", order_id="9", new_price=100.0)
+
+    assert resp["data"][0]["ordId"] == "rest"
+    client._make_request.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_exchange_rejection_over_ws_raises_like_rest() -> None:
+    client = _client()
+    client.set_ws_trading(
+        _ready_manager(
+            reply={"code": "1", "msg": "", "data": [{"sCode": "51400", "sMsg": "x"}]}
+        )
+    )
+
+    with pytest.raises(RuntimeError):
+        await client.cancel_order("BTC-USDT", "9")
+    client._make_request.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_timeout_recovers_order_by_clordid_instead_of_duplicate() -> None:
+    client = _client()
+    client.set_ws_trading(_ready_manager(reply=None), request_timeout=0.05)
+    client.get_order_by_clordid = AsyncMock(
+        return_value=[{"ordId": "42", "clOrdId": "abc"}]
+    )
+
+    resp = await client._submit_trade(
+        "order",
+        [{"clOrdId": "abc"}],
+        "/api/v5/trade/order",
+        {"clOrdId": "abc"},
+        symbol="BTC-USDT",
+    )
+
+    assert resp["data"][0]["ordId"] == "42"
+    client._make_request.assert_not_called()
+    assert client.ws_trading_stats["ws_recovered_by_clordid"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_order_without_clordid_is_checked_before_rest() -> None:
+    client = _client()
+    client.set_ws_trading(_ready_manager(reply=None), request_timeout=0.05)
+    client.get_order_by_clordid = AsyncMock(
+        side_effect=RuntimeError({"code": "51603", "msg": "Order does not exist"})
+    )
+    payload = {"instId": "BTC-USDT-SWAP", "side": "buy", "ordType": "market"}
+
+    await client._submit_trade(
+        "order", [payload], "/api/v5/trade/order", payload, symbol="BTC-USDT"
+    )
+
+    # clOrdId присвоен до отправки, REST повторяет ордер с тем же clOrdId
+    cl_ord_id = payload["clOrdId"]
+    assert cl_ord_id and len(cl_ord_id) <= 32 and cl_ord_id.isalnum()
+    client.get_order_by_clordid.assert_awaited_once_with("BTC-USDT", cl_ord_id)
+    assert client._make_request.await_args.kwargs["data"]["clOrdId"] == cl_ord_id
+
+
+@pytest.mark.asyncio
+async def test_unverifiable_order_raises_instead_of_resending() -> None:
+    client = _client()
+    manager = _ready_manager(reply=None)
+    client.set_ws_trading(manager, request_timeout=1.0)
+    client.get_order_by_clordid = AsyncMock(side_effect=RuntimeError("timeout"))
+    payload = {"instId": "BTC-USDT-SWAP", "side": "sell", "reduceOnly": "true"}
+
+    task = asyncio.ensure_future(
+        client._submit_trade("order", [payload], "/api/v5/trade/order", payload)
+    )
+    await asyncio.sleep(0.01)
+    # Разрыв после отправки - так же неоднозначен, как таймаут
+    manager._fail_pending_requests("Private WebSocket отключен")
+
+    with pytest.raises(RuntimeError):
+        await task
+    client._make_request.assert_not_called()
@@ -0,0 +1,290 @@
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.sharding import (
+    MarketBusConsumer,
+    MarketBusError,
+    MarketBusReader,
+    MarketBusWriter,
+    MarketDataFeed,
+    WorkerSupervisor,
+    check_accounts,
+    plan_shards,
+)
+from src.strategies.scalping.futures.sharding.market_bus import TRADE_RING
+
+
+def _bus_name(tag):
+    return f"test_bus_{tag}_{os.getpid()}"
+
+
+def test_plan_shards_balances_weights_and_assigns_accounts() -> None:
+    shards = plan_shards(
+        ["BTC-USDT", "ETH-USDT", "SOL-USDT", "XRP-USDT", "DOGE-USDT", "BTC-USDT"],
+        workers=2,
+        accounts=["okx", "okx_sub1"],
+        weights={"BTC-USDT": 3.0},
+    )
+    assert [shard.symbols for shard in shards] == [
+        ["BTC-USDT", "XRP-USDT"],
+        ["DOGE-USDT", "ETH-USDT", "SOL-USDT"],
+    ]
+    assert [shard.account for shard in shards] == ["okx", "okx_sub1"]
+    assert len(plan_shards(["BTC-USDT"], workers=4)) == 1
+    with pytest.raises(ValueError):
+        plan_shards(["BTC-USDT"], workers=0)
+
+
+def test_reader_sees_section_versions_from_writer() -> None:
+    writer = MarketBusWriter(_bus_name("rw"), ["BTC-USDT", "ETH-USDT"])
+    try:
+        reader = MarketBusReader(writer.name)
+        assert reader.symbols == ["BTC-USDT", "ETH-USDT"]
+        assert reader.read("BTC-USDT") is None
+        assert not writer.publish("SOL-USDT", "mark", (1.0, 2.0))
+
+        writer.publish("BTC-USDT", "mark", (50000.5, 1.0))
+        writer.publish("BTC-USDT", "mark", (50001.0, 2.0))
+        snapshot = reader.read("BTC-USDT")
+        assert snapshot.version("mark") == 2
+        assert snapshot.version("ticker") == 0
+        assert snapshot.section("mark") == {"markPx": 50001.0, "ts": 2.0}
+        assert reader.read("ETH-USDT") is None
+        reader.close()
+    finally:
+        writer.close()
+    with pytest.raises(MarketBusError):
+        MarketBusReader(writer.name)
+
+
+class _Coordinator:
+    def __init__(self):
+        self.calls = []
+
+    async def handle_ticker_data(self, symbol, data):
+        self.calls.append(("ticker", symbol, float(data["data"][0]["last"])))
+
+    async def handle_mark_price_data(self, data):
+        self.calls.append(("mark", data["data"][0]["markPx"]))
+
+    async def handle_candle_data(self, symbol, data):
+        row = data["data"][0]
+        self.calls.append((data["arg"]["channel"], row[4], row[8]))
+
+    async def handle_trades_data(self, symbol, data):
+        self.calls.append(
+            ("trades", [(row["px"], row["side"]) for row in data["data"]])
+        )
+
+    def handle_book_data(self, data):
+        book = data["data"][0]
+        self.calls.append(("book", book["bids"][0][0], book["asks"][0][0]))
+
+
+@pytest.mark.asyncio
+async def test_feed_to_consumer_replays_only_changed_sections() -> None:
+    writer = MarketBusWriter(_bus_name("feed"), ["BTC-USDT", "ETH-USDT"])
+    try:
+        feed = MarketDataFeed(ws_manager=None, writer=writer, symbols=writer.symbols)
+        coordinator = _Coordinator()
+        consumer = MarketBusConsumer(
+            MarketBusReader(writer.name), coordinator, ["BTC-USDT"]
+        )
+
+        arg = {"instId": "BTC-USDT-SWAP"}
+        await feed.on_candle(
+            {
+                "arg": {"channel": "candle1m", **arg},
+                "data": [["1700000000000", "1", "3", "0.5", "2", "10", "20", "0", "1"]],
+            }
+        )
+        await feed.on_candle(
+            {
+                "arg": {"channel": "candle1m", **arg},
+                "data": [["1700000060000", "2", "2", "2", "2.5", "1", "2", "0", "0"]],
+            }
+        )
+        await feed.on_mark_price(
+            {"arg": {"channel": "mark-price", **arg}, "data": [{"markPx": "2.4"}]}
+        )
+        await feed.on_ticker(
+            {"arg": {"channel": "tickers", **arg}, "data": [{"last": "2.5"}]}
+        )
+        await feed.on_ticker(
+            {
+                "arg": {"channel": "tickers", "instId": "ETH-USDT-SWAP"},
+                "data": [{"last": "100"}],
+            }
+        )
+
+        assert await consumer.poll_once() == 4
+        assert coordinator.calls == [
+            ("candle1m", 2.0, "1"),
+            ("candle1m", 2.5, "0"),
+            ("mark", 2.4),
+            ("ticker", "BTC-USDT", 2.5),
+        ]
+        assert await consumer.poll_once() == 0
+
+        await feed.on_ticker(
+            {"arg": {"channel": "tickers", **arg}, "data": [{"last": "2.6"}]}
+        )
+        assert await consumer.poll_once() == 1
+        assert coordinator.calls[-1] == ("ticker", "BTC-USDT", 2.6)
+        assert feed.get_stats()["ticker"] == 3
+        await consumer.stop()
+    finally:
+        writer.close()
+
+
+def _trades(start, count):
+    return {
+        "arg": {"channel": "trades", "instId": "BTC-USDT-SWAP"},
+        "data": [
+            {
+                "px": str(100 + i),
+                "sz": "1",
+                "side": "buy" if i % 2 else "sell",
+                "ts": str(1700000000000 + i),
+            }
+            for i in range(start, start + count)
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_trades_and_book_are_bridged_without_losing_bursts() -> None:
+    writer = MarketBusWriter(_bus_name("trades"), ["BTC-USDT"])
+    try:
+        feed = MarketDataFeed(ws_manager=None, writer=writer, symbols=writer.symbols)
+        coordinator = _Coordinator()
+        consumer = MarketBusConsumer(
+            MarketBusReader(writer.name), coordinator, ["BTC-USDT"]
+        )
+        # Сделки до старта воркера не доставляются
+        await feed.on_trades(_trades(0, 3))
+        await consumer.poll_once()
+        assert coordinator.calls == []
+
+        # Несколько сообщений между опросами - все сделки по порядку
+        await feed.on_trades(_trades(3, 2))
+        await feed.on_trades(_trades(5, 1))
+        await feed.on_book(
+            {
+                "arg": {"channel": "bbo-tbt", "instId": "BTC-USDT-SWAP"},
+                "data": [{"bids": [["99.9", "3"]], "asks": [["100.1", "2"]]}],
+            }
+        )
+        assert await consumer.poll_once() == 2
+        assert coordinator.calls == [
+            ("trades", [(103.0, "buy"), (104.0, "sell"), (105.0, "buy")]),
+            ("book", 99.9, 100.1),
+        ]
+
+        # Отставание больше кольца: доставлены последние TRADE_RING, остальное
+        # учтено как потерянное
+        await feed.on_trades(_trades(6, TRADE_RING + 5))
+        await consumer.poll_once()
+        delivered = coordinator.calls[-1][1]
+        assert len(delivered) == TRADE_RING
+        assert delivered[-1][0] == 100.0 + 6 + TRADE_RING + 4
+        assert consumer.stats["trades_lost"] == 5
+        assert feed.get_stats()["trades"] == 6 + TRADE_RING + 5
+        await consumer.stop()
+    finally:
+        writer.close()
+
+
+class _WS:
+    def __init__(self):
+        self.connected = True
+        self.reconnects = []
+
+    async def force_reconnect(self, reason=""):
+        self.reconnects.append(reason)
+        self.connected = True
+        return True
+
+
+@pytest.mark.asyncio
+async def test_feed_reconnects_on_disconnect_and_silent_stall() -> None:
+    ws = _WS()
+    feed = MarketDataFeed(ws_manager=ws, writer=None, symbols=["BTC-USDT"])
+    now = feed.last_message_at
+
+    assert await feed.check_health(30.0, now=now + 10)
+    # Соединение формально живо, но данных нет - тихий обрыв
+    assert not await feed.check_health(30.0, now=now + 31)
+    ws.connected = False
+    assert not await feed.check_health(30.0, now=now + 1)
+    assert len(ws.reconnects) == 2
+    assert feed.get_stats()["reconnects"] == 2
+
+
+class _Process:
+    def __init__(self):
+        self.alive = True
+        self.exitcode = None
+
+    def is_alive(self):
+        return self.alive
+
+    def exit(self, code):
+        self.alive = False
+        self.exitcode = code
+
+
+def test_supervisor_restarts_crashed_workers_with_backoff() -> None:
+    spawned = []
+
+    def spawn(shard):
+        process = _Process()
+        spawned.append((shard.index, process))
+        return process
+
+    shards = plan_shards(["BTC-USDT", "ETH-USDT"], workers=2)
+    supervisor = WorkerSupervisor(shards, spawn, restart_delay=5, stable_after=600)
+    supervisor.start(now=0)
+    first, second = spawned[0][1], spawned[1][1]
+
+    first.exit(1)
+    assert supervisor.check(now=1) == 0  # ждем задержку
+    assert supervisor.check(now=6) == 1
+    assert spawned[-1][0] == 0 and supervisor.alive() == 2
+    # Повторное падение сразу после старта - задержка удваивается
+    spawned[-1][1].exit(1)
+    assert supervisor.check(now=7) == 0
+    assert supervisor.check(now=16) == 0
+    assert supervisor.check(now=17) == 1
+
+    # Штатное завершение не перезапускается
+    second.exit(0)
+    assert supervisor.check(now=100) == 0
+    assert supervisor.stats == {"restarts": 2, "crashes": 2, "clean_exits": 1}
+    assert not supervisor.all_finished()
+
+
+def test_workers_require_own_accounts() -> None:
+    symbols = ["BTC-USDT", "ETH-USDT", "SOL-USDT"]
+    check_accounts(plan_shards(symbols, workers=1))
+    # Общий аккаунт: воркеры вели бы чужие позиции, лимиты складывались бы
+    with pytest.raises(ValueError):
+        check_accounts(plan_shards(symbols, workers=2))
+    with pytest.raises(ValueError):
+        check_accounts(plan_shards(symbols, workers=3, accounts=["okx", "sub1"]))
+
+    shards = plan_shards(symbols, workers=2, accounts=["okx", "sub1"])
+    api = {"okx": SimpleNamespace(api_key="a"), "sub1": SimpleNamespace(api_key="b")}
+    check_accounts(shards, api)
+    api["sub1"] = SimpleNamespace(api_key="a")
+    with pytest.raises(ValueError):
+        check_accounts(shards, api)
+    with pytest.raises(ValueError):
+        check_accounts(shards, {"okx": api["okx"]})
@@ -0,0 +1,219 @@
+"""
+Тесты LimitOrderChaser: решения по кривой срочности, коалесинг amend в
+пачки, сверка по каналу orders и market-добор остатка в конце ожидания.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.positions.order_chaser import (
+    LimitOrderChaser,
+    round_to_tick,
+)
+
+
+class FakeClient:
+    def __init__(self):
+        self.batches = []
+        self.gone = set()
+        self.orders = {}  # ordId -> состояние для get-order
+
+    async def get_order(self, symbol, order_id):
+        return [self.orders[order_id]]
+
+    async def get_instrument_details(self, symbol):
+        return {"tickSz": 0.01, "ctVal": 0.01}
+
+    async def batch_amend_orders(self, amend_list):
+        self.batches.append(list(amend_list))
+        return {
+            "code": "0",
+            "data": [
+                {
+                    "ordId": item["ordId"],
+                    "sCode": "51503" if item["ordId"] in self.gone else "0",
+                }
+                for item in amend_list
+            ],
+        }
+
+
+class FakeGuard:
+    def __init__(self, allow=True):
+        self.allow = allow
+        self.recorded = []
+
+    def can_market_replace(self, symbol):
+        return self.allow
+
+    def is_reentry_blocked(self, symbol):
+        return False
+
+    async def record_market_replace(self, symbol, success):
+        self.recorded.append((symbol, success))
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.canceled = []
+        self.market = []
+
+    async def cancel_order(self, order_id, symbol):
+        self.canceled.append(order_id)
+        return {"success": True}
+
+    async def _place_market_order(self, symbol, side, size):
+        self.market.append((symbol, side, round(size, 6)))
+        return {"success": True, "order_id": "m1"}
+
+
+def _chaser(client, executor=None, **cfg) -> LimitOrderChaser:
+    config = {
+        "urgency_curve": [[0.0, 2.0], [1.0, 10.0]],
+        "coalesce_ms": 5,
+        "min_amend_interval_ms": 0,
+    }
+    config.update(cfg)
+    return LimitOrderChaser(client, config, executor=executor)
+
+
+@pytest.mark.asyncio
+async def test_decide_follows_urgency_curve() -> None:
+    chaser = _chaser(FakeClient())
+    order = await chaser.track("o1", "BTC-USDT", "buy", 0.01, 100.0, max_wait=10)
+    t0 = order.created_at
+
+    assert round_to_tick(100.0349, 0.01) == 100.03
+    assert chaser.allowed_chase_bps(0.5) == pytest.approx(6.0)
+    # На лучшей цене - держим; книга ушла вниз (мы выше bid) - тоже держим
+    assert chaser.decide(order, 100.0, 100.01, t0) == ("hold", None)
+    assert chaser.decide(order, 99.95, 99.97, t0 + 1) == ("hold", None)
+    # Уход на 1 bps - в пределах допуска сразу
+    assert chaser.decide(order, 100.01, 100.02, t0 + 1) == ("amend", 100.01)
+    # Уход на 5 bps: в начале держим, к середине ожидания - догоняем
+    assert chaser.decide(order, 100.05, 100.06, t0 + 1)[0] == "hold"
+    assert chaser.decide(order, 100.05, 100.06, t0 + 6) == ("amend", 100.05)
+    # Конец ожидания: в пределах кривой - market, дальше - отмена
+    assert chaser.decide(order, 100.05, 100.06, t0 + 10) == ("market", None)
+    assert chaser.decide(order, 100.2, 100.21, t0 + 10) == ("cancel", None)
+    # Скрещенная книга - не действуем
+    assert chaser.decide(order, 100.02, 100.02, t0 + 1) == ("hold", None)
+
+    sell = await chaser.track("o2", "BTC-USDT", "sell", 0.01, 100.0, max_wait=10)
+    assert chaser.decide(sell, 99.98, 99.99, sell.created_at) == ("amend", 99.99)
+
+
+@pytest.mark.asyncio
+async def test_book_updates_coalesce_into_batched_amends() -> None:
+    client = FakeClient()
+    chaser = _chaser(client)
+    await chaser.start()
+    try:
+        await chaser.track("a", "BTC-USDT", "buy", 0.01, 100.0, max_wait=60)
+        await chaser.track("b", "BTC-USDT", "buy", 0.01, 100.0, max_wait=60)
+        await chaser.track("c", "ETH-USDT", "sell", 0.1, 2000.0, max_wait=60)
+        client.gone.add("b")
+
+        chaser.on_book("BTC-USDT", 100.01, 100.03)
+        chaser.on_book("BTC-USDT", 100.02, 100.03)  # то же окно - последняя цена
+        chaser.on_book("ETH-USDT", 1999.9, 1999.95)
+        chaser.on_book("SOL-USDT", 10.0, 10.01)  # нет ордеров - без работы
+        await asyncio.sleep(0.05)
+
+        assert len(client.batches) == 1
+        assert [(i["ordId"], i["newPx"]) for i in client.batches[0]] == [
+            ("a", "100.02"),
+            ("b", "100.02"),
+            ("c", "1999.95"),
+        ]
+        assert chaser.orders["a"].price == 100.02
+        # Ордер, которого уже нет на бирже, снят с ведения
+        assert not chaser.is_tracking("b")
+        assert chaser.stats["coalesced"] == 2
+
+        # Подтверждение цены и исполнение из канала orders
+        chaser.on_order_update(
+            {"ordId": "c", "state": "partially_filled", "px": "1999.95", "sz": "10"}
+        )
+        chaser.on_order_update({"ordId": "a", "state": "filled", "accFillSz": "1"})
+        assert not chaser.has_orders("BTC-USDT") and chaser.has_orders("ETH-USDT")
+        assert chaser.get_stats()["amends_per_fill"] == 2.0
+    finally:
+        await chaser.stop()
+
+
+@pytest.mark.asyncio
+async def test_deadline_converts_remaining_to_market_or_releases() -> None:
+    executor = FakeExecutor()
+    client = FakeClient()
+    guard = FakeGuard()
+    chaser = _chaser(client, executor)
+    chaser.set_replace_guard(guard)
+
+    order = await chaser.track("o1", "BTC-USDT", "buy", 0.02, 100.0, max_wait=5)
+    chaser.on_order_update(
+        {"ordId": "o1", "state": "partially_filled", "sz": "2", "accFillSz": "1"}
+    )
+    # Исполнение перед отменой еще не пришло по WS - остаток берется с биржи
+    client.orders["o1"] = {"ordId": "o1", "sz": "2", "accFillSz": "1.5"}
+    order.created_at -= 5
+    chaser.on_book("BTC-USDT", 100.03, 100.04)
+    await asyncio.sleep(0)
+    # Пока идет отмена, событие отмены из WS не снимает ордер повторно
+    chaser.on_order_update({"ordId": "o1", "state": "canceled"})
+    await asyncio.sleep(0.01)
+    assert executor.canceled == ["o1"]
+    assert executor.market == [("BTC-USDT", "buy", 0.005)]
+    assert guard.recorded == [("BTC-USDT", True)]
+
+    # Книга молчит - истекший ордер добирается по bid/ask тикера
+    stale = await chaser.track("o2", "ETH-USDT", "sell", 0.1, 2000.0, max_wait=5)
+    client.orders["o2"] = {"ordId": "o2", "sz": "1", "accFillSz": "0"}
+    chaser.on_ticker("ETH-USDT", 1999.9, 2000.1)
+    stale.created_at -= 6
+    chaser.expire()
+    await asyncio.sleep(0.01)
+    assert executor.canceled == ["o1", "o2"]
+    assert executor.market[-1] == ("ETH-USDT", "sell", 0.1)
+
+    # Без книги и тикера ордер не отменяется вслепую, а уходит REST-мониторингу
+    blind = await chaser.track("o3", "SOL-USDT", "buy", 1.0, 150.0, max_wait=5)
+    blind.created_at -= 6
+    chaser.expire()
+    await asyncio.sleep(0.01)
+    assert executor.canceled == ["o1", "o2"]
+    assert not chaser.has_orders("SOL-USDT")
+    assert chaser.get_stats()["working"] == 0
+    assert chaser.stats["converted"] == 2 and chaser.stats["released"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replace_guard_and_busy_book_do_not_delay_expiry() -> None:
+    executor = FakeExecutor()
+    client = FakeClient()
+    guard = FakeGuard(allow=False)
+    chaser = _chaser(client, executor, urgency_curve=[[0.0, 50.0], [1.0, 50.0]])
+    chaser.set_replace_guard(guard)
+    await chaser.start()
+    try:
+        quiet = await chaser.track("q", "ETH-USDT", "sell", 0.1, 2000.0, max_wait=5)
+        await chaser.track("busy", "BTC-USDT", "buy", 0.01, 100.0, max_wait=60)
+        chaser.on_book("ETH-USDT", 1999.99, 2000.0)
+        quiet.created_at -= 6
+        # Книга BTC будит цикл чаще раза в секунду - ETH все равно истекает
+        for i in range(1, 6):
+            chaser.on_book("BTC-USDT", 100.0 + i / 100, 100.1)
+            await asyncio.sleep(0.01)
+        assert len(client.batches) >= 2
+        assert executor.canceled == ["q"]
+        # Лимит market-замен подряд исчерпан - только отмена
+        assert executor.market == [] and guard.recorded == []
+        assert chaser.stats["canceled"] == 1
+    finally:
+        await chaser.stop()
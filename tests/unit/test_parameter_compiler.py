@@ -0,0 +1,161 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.parameters import (
+    ParameterOrchestrator,
+    ParameterStatus,
+    freeze_params,
+)
+
+
+def _raw_config() -> dict:
+    indicators = {"rsi_overbought": 70, "rsi_oversold": 30}
+    regime_cfg = {
+        "min_score_threshold": 2.0,
+        "max_trades_per_hour": 4,
+        "position_size_multiplier": 1.5,
+        "indicators": indicators,
+        "modules": {"adx_filter": {"adx_threshold": 20}},
+    }
+    exit_cfg = {
+        "tp_atr_multiplier": 2.0,
+        "sl_atr_multiplier": 1.0,
+        "tp_min_percent": 0.5,
+        "tp_max_percent": 3.0,
+        "sl_min_percent": 0.4,
+        "sl_max_percent": 2.0,
+        "max_holding_minutes": 30,
+        "min_holding_minutes": 1,
+        "min_profit_for_extension": 0.4,
+        "extension_percent": 50,
+    }
+    return {
+        "scalping": {
+            "symbols": ["BTC-USDT"],
+            "leverage": 5,
+            "signal_generator": {
+                "thresholds": {
+                    "by_regime": {
+                        "trending": {"min_signal_strength": 0.2},
+                        "ranging": {"min_signal_strength": 0.3},
+                    }
+                }
+            },
+            "adaptive_regime": {"trending": regime_cfg, "ranging": regime_cfg},
+            "balance_profiles": {
+                "small": {
+                    "threshold": 1000,
+                    "max_position_percent": 10,
+                    "min_position_usd": 5,
+                    "max_position_usd": 100,
+                    "max_open_positions": 2,
+                },
+                "large": {
+                    "threshold": 999999,
+                    "progressive": True,
+                    "min_balance": 1000,
+                    "max_balance": 5000,
+                    "size_at_min": 100,
+                    "size_at_max": 300,
+                    "max_position_percent": 10,
+                    "min_position_usd": 10,
+                    "max_position_usd": 500,
+                    "max_open_positions": 4,
+                },
+            },
+        },
+        "exit_params": {"trending": exit_cfg, "ranging": exit_cfg},
+    }
+
+
+def _orchestrator() -> ParameterOrchestrator:
+    config_manager = SimpleNamespace(_raw_config_dict=_raw_config())
+    orchestrator = ParameterOrchestrator(config_manager=config_manager)
+    orchestrator.atr_provider.get_atr = lambda symbol: 2.0
+    return orchestrator
+
+
+def _market_data(price: float = 100.0):
+    return SimpleNamespace(current_tick=SimpleNamespace(price=price), ohlcv_data=[])
+
+
+def _resolve(orchestrator: ParameterOrchestrator, regime: str, balance: float):
+    status = ParameterStatus(valid=True)
+    result = (
+        orchestrator._resolve_signal_params("BTC-USDT", regime, status),
+        orchestrator._resolve_exit_params("BTC-USDT", regime, _market_data(), status),
+        orchestrator._resolve_order_params("BTC-USDT", regime, status),
+        orchestrator._resolve_risk_params("BTC-USDT", regime, balance, status),
+    )
+    return result, status.errors
+
+
+@pytest.mark.parametrize("regime", ["trending", "ranging", "choppy"])
+@pytest.mark.parametrize("balance", [200.0, 1000.0, 2500.0, 50000.0])
+def test_compiled_resolution_matches_per_call_path(regime: str, balance: float) -> None:
+    orchestrator = _orchestrator()
+    assert orchestrator.compiled is not None
+
+    compiled = _resolve(orchestrator, regime, balance)
+    orchestrator._compiled = None
+    per_call = _resolve(orchestrator, regime, balance)
+
+    assert compiled == per_call
+
+
+def test_dynamic_parts_are_applied_on_top_of_compiled_static() -> None:
+    orchestrator = _orchestrator()
+    (_, exit_params, _, risk), _ = _resolve(orchestrator, "trending", 3000.0)
+
+    # ATR 2% × 2.0 = 4% → ограничено tp_max_percent; SL: 2% × 1.0
+    assert exit_params.tp_percent == 3.0
+    assert exit_params.sl_percent == 2.0
+    # progressive: 100 + (300 - 100) × 0.5, × position_size_multiplier 1.5
+    assert risk.position_size_usd == pytest.approx(300.0)
+    assert risk.sources["balance_profile"] == "scalping.balance_profiles.large"
+
+
+def test_compiled_records_are_frozen_slot_objects() -> None:
+    orchestrator = _orchestrator()
+    entry = orchestrator.get_compiled("signal", "BTC-USDT", "TRENDING")
+
+    assert entry.max_trades_per_hour == 4
+    assert entry["indicators"]["rsi_overbought"] == 70
+    assert not hasattr(entry, "__dict__")
+    with pytest.raises(AttributeError):
+        entry.max_trades_per_hour = 10
+    with pytest.raises(TypeError):
+        entry.indicators["rsi_overbought"] = 1
+    assert entry.as_dict()["indicators"] == {"rsi_overbought": 70, "rsi_oversold": 30}
+
+
+def test_recompile_picks_up_config_changes() -> None:
+    orchestrator = _orchestrator()
+    orchestrator._exit_params["trending"]["tp_max_percent"] = 10.0
+
+    table = orchestrator.compile()
+
+    assert table.version == 2
+    (_, exit_params, _, _), _ = _resolve(orchestrator, "trending", 500.0)
+    assert exit_params.tp_percent == 4.0
+
+
+def test_invalid_combination_reports_compiled_errors() -> None:
+    orchestrator = _orchestrator()
+
+    (signal, exit_params, _, risk), errors = _resolve(orchestrator, "choppy", 500.0)
+
+    assert signal is None and exit_params is None and risk is None
+    assert "exit_params.choppy missing" in " ".join(errors)
+    assert ("exit", ("BTC-USDT", "choppy")) in orchestrator.compiled.errors
+
+
+def test_freeze_params_rejects_reserved_field_names() -> None:
+    with pytest.raises(ValueError):
+        freeze_params("Broken", {"keys": 1})
@@ -0,0 +1,112 @@
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models import OHLCV
+from src.strategies.scalping.futures.patterns import PatternEngine
+from src.strategies.scalping.futures.patterns.pattern_detector import PatternDetector
+
+PARAMS = SimpleNamespace(
+    thresholds={
+        "min_confidence": 0.3,
+        "min_strength": 0.2,
+        "boost_multiplier": 0.2,
+        "penalty_multiplier": 0.2,
+        "breakout_pct": 0.001,
+        "pinbar_wick_ratio": 0.6,
+        "min_bars": 5,
+    }
+)
+SCORED = (
+    "pinbar_bullish",
+    "pinbar_bearish",
+    "engulfing_bullish",
+    "engulfing_bearish",
+    "inside_bar",
+    "three_candles_bullish",
+    "three_candles_bearish",
+    "breakout_bullish",
+    "breakout_bearish",
+)
+
+
+def _candles(count: int, seed: int):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(count):
+        open_ = price
+        close = price + rng.choice([rng.gauss(0, 1), 0.0])
+        high = max(open_, close) + abs(rng.gauss(0, 0.7)) * rng.choice([0, 1])
+        low = min(open_, close) - abs(rng.gauss(0, 0.7)) * rng.choice([0, 1])
+        candles.append(OHLCV(i * 60, "BTC-USDT", open_, high, low, close, 1.0))
+        price = close
+    return candles
+
+
+def test_newest_bar_evaluation_matches_full_window_masks() -> None:
+    candles = _candles(300, seed=7)
+    engine = PatternEngine()
+    masks = engine.scan(candles, PARAMS)
+
+    for i in range(5, len(candles)):
+        ctx = engine.evaluate(candles[: i + 1], 0.0, PARAMS)
+        fired = {sig.name for sig in ctx["signals"]}
+        expected = {name for name in SCORED if masks[name][i]}
+        assert fired == expected
+    assert masks["fakey_bullish"].dtype == np.bool_
+
+
+def test_batch_matches_per_symbol_and_caches_until_bar_changes() -> None:
+    windows = {f"S{n}": _candles(40 + n, seed=n) for n in range(6)}
+    windows["SHORT"] = windows["S0"][:5]
+    engine = PatternEngine()
+
+    batch = engine.evaluate_batch(
+        {symbol: (candles, 0.0, PARAMS) for symbol, candles in windows.items()}
+    )
+    for symbol, candles in windows.items():
+        assert batch[symbol] == PatternEngine().evaluate(candles, 0.0, PARAMS)
+    assert engine.stats["evaluated"] == len(windows)
+
+    assert engine.evaluate(windows["S1"], 0.0, PARAMS, symbol="S1") is batch["S1"]
+    assert engine.stats["cached"] == 1
+
+    grown = windows["S1"] + _candles(1, seed=99)
+    grown[-1].timestamp = grown[-2].timestamp + 60
+    engine.evaluate(grown, 0.0, PARAMS, symbol="S1")
+    assert engine.stats["evaluated"] == len(windows) + 1
+
+
+def test_invalid_inputs_keep_previous_context_shape() -> None:
+    engine = PatternEngine()
+
+    short = engine.evaluate(_candles(3, seed=1), 0.0, PARAMS)
+    missing = engine.evaluate(_candles(10, seed=1), 0.0, SimpleNamespace())
+
+    assert short["errors"] == ["insufficient_candles_for_patterns"]
+    assert short["min_confidence"] == 0.3
+    assert missing["errors"][0].startswith("pattern_thresholds_missing")
+    assert missing["valid"] is False
+
+
+def test_detector_breakout_retest_finds_first_retest() -> None:
+    highs = [99.0] * 5 + [101.0, 101.5, 100.6, 101.2, 101.4, 101.6]
+    lows = [98.0] * 5 + [99.5, 100.5, 100.1, 100.8, 101.0, 101.2]
+    closes = [98.5] * 5 + [100.8, 101.0, 100.4, 101.0, 101.2, 101.4]
+    df = pd.DataFrame(
+        {"open": closes, "high": highs, "low": lows, "close": closes},
+        index=pd.date_range("2024-01-01", periods=len(closes), freq="15min"),
+    )
+
+    signals = PatternDetector().detect_breakout_retest(df, resistance_levels=[100.0])
+
+    assert [s.pattern_name for s in signals] == ["Breakout + Retest (Resistance)"]
+    assert signals[0].timestamp == df.index[7]
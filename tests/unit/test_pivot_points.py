@@ -289,6 +289,35 @@ class TestPivotPointsFilter:
         # API вызван только 1 раз (кэш работает)
         assert mock_client.get_candles.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_registry_levels_follow_forming_day(self, mock_client, monkeypatch):
+        """Тест: обновления формирующейся дневной свечи учитываются по TTL"""
+        from dataclasses import replace
+
+        from src.strategies.modules import pivot_points
+        from src.strategies.scalping.futures.core.data_registry import DataRegistry
+
+        registry = DataRegistry()
+        day = self.create_daily_candles(110, 90, 100)[0]
+        await registry.initialize_candles("BTC-USDT", "1D", [day])
+        pivot_filter = PivotPointsFilter(
+            mock_client, PivotPointsConfig(cache_ttl_seconds=3600), registry
+        )
+        now = 1_700_000_000.0
+        monkeypatch.setattr(pivot_points.time, "time", lambda: now)
+
+        first = await pivot_filter._get_pivot_levels("BTC-USDT")
+        # Формирующаяся свеча обновилась без открытия новой — версия не меняется
+        await registry.upsert_candles(
+            "BTC-USDT", [replace(day, high=130.0, close=120.0)]
+        )
+        assert await pivot_filter._get_pivot_levels("BTC-USDT") is first
+
+        monkeypatch.setattr(pivot_points.time, "time", lambda: now + 3600)
+        refreshed = await pivot_filter._get_pivot_levels("BTC-USDT")
+        assert refreshed.pivot_point == pytest.approx((130 + 90 + 120) / 3)
+        mock_client.get_candles.assert_not_called()
+
     def test_clear_cache(self, pivot_filter):
         """Тест очистки кэша"""
         # Arrange
@@ -0,0 +1,126 @@
+"""
+Тесты PortfolioRiskEngine: совпадение с MarginCalculator, инкрементальные
+обновления, стресс-сценарии и подписка на AccountStateCache.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.calculations.margin_calculator import (
+    MarginCalculator,
+)
+from src.strategies.scalping.futures.core.account_state import AccountStateCache
+from src.strategies.scalping.futures.risk.portfolio_risk import PortfolioRiskEngine
+
+
+class FakeMatrix:
+    def __init__(self, symbols, corr):
+        self.symbols = symbols
+        self._corr = np.array(corr, dtype=float)
+        self.ready = True
+        self.last_timestamp = 1
+
+    def as_array(self):
+        return self._corr.copy()
+
+
+def test_vectorized_results_match_scalar_margin_calculator() -> None:
+    calculator = MarginCalculator(default_leverage=5)
+    engine = PortfolioRiskEngine({}, margin_calculator=calculator)
+    engine.set_equity(1000.0)
+    engine.upsert_position("BTC-USDT", "long", 0.01, 60000.0, leverage=10)
+    engine.upsert_position("ETH-USDT", "short", 0.5, 3000.0, leverage=5)
+    # liqPx с биржи важнее формулы
+    engine.upsert_position("SOL-USDT", "long", 2.0, 150.0, 3, liquidation_price=101)
+    engine.update_prices({"BTC-USDT": 61000.0, "ETH-USDT": 3100.0})
+
+    report = engine.evaluate()
+    for symbol, side, entry, lev in (
+        ("BTC-USDT", "long", 60000.0, 10),
+        ("ETH-USDT", "short", 3000.0, 5),
+    ):
+        expected = calculator.calculate_liquidation_price(
+            side, entry, 1.0, 1000.0, leverage=lev
+        )
+        assert engine.position_risk(symbol)["liquidation_price"] == pytest.approx(
+            expected
+        )
+    sol = engine.position_risk("SOL-USDT")
+    assert sol["liquidation_price"] == 101.0
+    assert sol["distance_pct"] == pytest.approx((150.0 - 101.0) / 150.0 * 100)
+
+    btc = report.position("BTC-USDT")
+    assert btc["pnl"] == pytest.approx(10.0)
+    assert btc["margin_used"] == pytest.approx(60.0)
+    assert btc["margin_ratio"] == pytest.approx((1000.0 - 60.0 + 10.0) / 60.0)
+    assert report.position("ETH-USDT")["pnl"] == pytest.approx(-50.0)
+    assert report.long_notional == pytest.approx(610.0 + 300.0)
+    assert report.short_notional == pytest.approx(1550.0)
+    assert report.total_margin == pytest.approx(60.0 + 300.0 + 100.0)
+
+
+def test_incremental_updates_cache_and_correlated_stress() -> None:
+    engine = PortfolioRiskEngine(
+        {"shocks_pct": [2.0], "correlated_shock_pct": 10.0}, capacity=1
+    )
+    engine.set_equity(500.0)
+    engine.upsert_position("BTC-USDT", "long", 1.0, 100.0, leverage=5)
+    engine.upsert_position("ETH-USDT", "long", 1.0, 100.0, leverage=5)
+    engine.upsert_position("XRP-USDT", "short", 1.0, 100.0, leverage=5)
+    engine.set_correlation_source(
+        FakeMatrix(["ETH-USDT", "BTC-USDT"], [[1.0, 0.8], [0.8, 1.0]])
+    )
+
+    report = engine.evaluate()
+    assert engine.evaluate() is report
+    assert engine.get_stats()["cached_reads"] == 1
+
+    # BTC -10%: ETH -8% через корреляцию, XRP не связан с матрицей
+    down = report.scenarios["corr_BTC-USDT_down"]
+    assert down["pnl"] == pytest.approx(-10.0 - 8.0)
+    assert report.scenarios["shift_up_2"]["pnl"] == pytest.approx(2.0)
+    assert report.worst_scenario == "corr_BTC-USDT_down"
+
+    # Цена сбрасывает кэш; удаление переносит последнюю строку
+    engine.update_price("ETH-USDT", 90.0)
+    assert engine.evaluate() is not report
+    assert engine.remove_position("BTC-USDT") is True
+    assert engine.symbols == ["XRP-USDT", "ETH-USDT"]
+    assert engine.position_risk("ETH-USDT")["pnl"] == pytest.approx(-10.0)
+    assert engine.position_risk("BTC-USDT") is None
+
+
+def test_account_state_snapshot_drives_engine() -> None:
+    cache = AccountStateCache(None, {})
+    engine = PortfolioRiskEngine({})
+    cache.subscribe(engine.sync_snapshot)
+
+    cache.apply_account([{"details": [{"ccy": "USDT", "eq": "800", "availEq": "1"}]}])
+    cache.apply_positions(
+        [
+            {
+                "instId": "BTC-USDT-SWAP",
+                "pos": "-3",
+                "lever": "10",
+                "margin": "20",
+                "liqPx": "70000",
+                "avgPx": "66000",
+                "markPx": "66000",
+                "notionalUsd": "198",
+            }
+        ]
+    )
+    btc = engine.position_risk("BTC-USDT")
+    assert btc["position_side"] == "short"
+    assert btc["notional"] == pytest.approx(198.0)
+    assert btc["liquidation_price"] == 70000.0
+    assert engine.evaluate().equity == 800.0
+
+    cache.apply_positions([{"instId": "BTC-USDT-SWAP", "pos": "0"}])
+    assert engine.symbols == []
@@ -0,0 +1,105 @@
+"""
+Тесты PrivateEventPipeline: приоритет ордеров, слияние позиций,
+дедупликация (id, uTime) и метрики задержек.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.core.private_event_pipeline import (
+    PrivateEventPipeline,
+)
+from src.strategies.scalping.futures.private_websocket_manager import (
+    PrivateWebSocketManager,
+)
+
+
+def _recording_pipeline(calls, delay=0.0) -> PrivateEventPipeline:
+    pipeline = PrivateEventPipeline()
+    for channel in ("orders", "positions", "account"):
+
+        async def handler(items, channel=channel):
+            calls.append((channel, items))
+            if delay:
+                await asyncio.sleep(delay)
+
+        pipeline.set_handler(channel, handler)
+    return pipeline
+
+
+def _pos(pos: str, u_time: str) -> dict:
+    return {
+        "instId": "BTC-USDT-SWAP",
+        "posSide": "net",
+        "posId": "1",
+        "pos": pos,
+        "uTime": u_time,
+    }
+
+
+@pytest.mark.asyncio
+async def test_orders_first_positions_coalesced_duplicates_dropped() -> None:
+    calls = []
+    pipeline = _recording_pipeline(calls)
+
+    pipeline.submit("account", [{"details": [{"eq": "1"}]}])
+    pipeline.submit("account", [{"details": [{"eq": "2"}]}])
+    pipeline.submit("positions", [_pos("1", "100"), _pos("2", "200")])
+    # Повтор биржи и запоздавшее старое обновление
+    pipeline.submit("positions", [_pos("2", "200"), _pos("1", "150")])
+    fill = {"ordId": "7", "state": "filled", "accFillSz": "1", "uTime": "300"}
+    pipeline.submit("orders", [fill, dict(fill)])
+
+    await pipeline.drain()
+
+    assert [channel for channel, _ in calls] == ["orders", "positions", "account"]
+    assert calls[0][1] == [fill]
+    assert [p["pos"] for p in calls[1][1]] == ["2"]
+    assert calls[2][1] == [{"details": [{"eq": "2"}]}]
+
+    # Новое обновление той же позиции (другой uTime) проходит
+    pipeline.submit("positions", [_pos("0", "400")])
+    await pipeline.drain()
+    assert calls[-1][1][0]["pos"] == "0"
+
+    stats = pipeline.get_stats()
+    assert stats["duplicates"] == 2
+    assert stats["coalesced"] == 3
+    assert stats["event_to_handler_ms"]["orders"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_listener_does_not_wait_for_slow_handlers() -> None:
+    calls = []
+    manager = PrivateWebSocketManager("k", "s", "p", sandbox=True)
+    manager.pipeline = _recording_pipeline(calls, delay=0.05)
+    manager.pipeline.start()
+    try:
+        await manager._handle_data(
+            {"arg": {"channel": "positions"}, "data": [_pos("1", "1")]}
+        )
+        await asyncio.sleep(0.01)  # диспетчер занят обработчиком позиции
+
+        started = asyncio.get_running_loop().time()
+        await manager._handle_data(
+            {"arg": {"channel": "positions"}, "data": [_pos("2", "2")]}
+        )
+        await manager._handle_data(
+            {"arg": {"channel": "orders"}, "data": [{"ordId": "9", "uTime": "3"}]}
+        )
+        assert asyncio.get_running_loop().time() - started < 0.02
+
+        await asyncio.sleep(0.2)
+    finally:
+        await manager.pipeline.stop()
+
+    # Пока обработчик занят, ордер обгоняет позицию, пришедшую раньше него
+    assert [channel for channel, _ in calls] == ["positions", "orders", "positions"]
+    assert calls[2][1][0]["pos"] == "2"
+    assert manager.get_status()["pipeline"]["pending"] == 0
@@ -0,0 +1,162 @@
+"""
+Тесты RecoveryPlanner: параллельные шаги по графу зависимостей, защитные
+шаги раньше косметических, готовность символов по отдельности, таймауты,
+дедлайн плана и приоритетный RestRateLimiter.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.core.recovery_planner import (
+    PRIORITY_COSMETIC,
+    PRIORITY_MARKET_DATA,
+    PRIORITY_PROTECTIVE,
+    RecoveryPlanner,
+    RestRateLimiter,
+)
+
+
+def _step(log, name, delay=0.0, error=None):
+    async def run():
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        if error:
+            raise RuntimeError(error)
+        log.append(("end", name))
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_graph_runs_in_parallel_and_symbols_ready_independently() -> None:
+    log = []
+    ready = []
+    planner = RecoveryPlanner(
+        "startup", max_concurrency=3, rate_per_sec=0, on_symbol_ready=ready.append
+    )
+    for symbol, delay in (("BTC-USDT", 0.01), ("ETH-USDT", 0.08)):
+        planner.add(
+            f"candles:{symbol}:1m", _step(log, f"{symbol}:1m", delay), symbol=symbol
+        )
+        planner.add(
+            f"candles:{symbol}:1H",
+            _step(log, f"{symbol}:1H", 0.01),
+            priority=PRIORITY_COSMETIC,
+            gate=False,
+            symbol=symbol,
+        )
+    planner.add(
+        "instruments",
+        _step(log, "instruments", error="50004"),
+        priority=PRIORITY_PROTECTIVE,
+        critical=False,
+        gate=False,
+    )
+    planner.add(
+        "positions",
+        _step(log, "positions", 0.01),
+        deps=("instruments", "candles:BTC-USDT:1m"),
+        priority=PRIORITY_PROTECTIVE,
+    )
+    planner.add("tsl", _step(log, "tsl"), deps=("positions",))
+
+    started = time.monotonic()
+    report = await planner.run(deadline=5.0)
+    elapsed = time.monotonic() - started
+
+    # Параллельно: не сумма задержек
+    assert elapsed < 0.15
+    # Защитный шаг первым, косметика 1H - после 1m обоих символов
+    assert log[0] == ("start", "instruments")
+    starts = [name for kind, name in log if kind == "start"]
+    assert starts.index("BTC-USDT:1H") > starts.index("ETH-USDT:1m")
+    # Позиции не ждут свечей ETH, ошибка некритичной зависимости не блокирует
+    assert starts.index("positions") < starts.index("ETH-USDT:1H")
+    assert report["steps"]["instruments"]["status"] == "failed"
+    assert report["steps"]["tsl"]["status"] == "done"
+    # BTC готов раньше ETH
+    assert ready == ["BTC-USDT", "ETH-USDT"]
+    assert report["ready_symbols"]["BTC-USDT"] < report["ready_symbols"]["ETH-USDT"]
+    assert report["steps"]["positions"]["duration_ms"] >= 5
+
+
+@pytest.mark.asyncio
+async def test_failures_timeouts_and_deadline() -> None:
+    log = []
+    planner = RecoveryPlanner("reconnect", max_concurrency=2, rate_per_sec=0)
+    planner.add("positions", _step(log, "positions", error="boom"))
+    planner.add("tsl", _step(log, "tsl"), deps=("positions",))
+    planner.add("slow", _step(log, "slow", 0.5), timeout=0.05)
+    planner.add("background", _step(log, "background", 0.2), gate=False)
+
+    report = await planner.run(deadline=0.1)
+    assert report["deadline_hit"]
+    assert report["steps"]["tsl"]["status"] == "skipped"
+    assert report["steps"]["slow"]["status"] == "timeout"
+    assert report["steps"]["background"]["status"] == "running"
+
+    report = await planner.wait()
+    assert report["steps"]["background"]["status"] == "done"
+    assert ("start", "tsl") not in log
+
+    cyclic = RecoveryPlanner("cycle", rate_per_sec=0)
+    cyclic.add("a", _step(log, "a"), deps=("b",))
+    cyclic.add("b", _step(log, "b"), deps=("a",))
+    report = await cyclic.run(deadline=1.0)
+    assert report["steps"]["a"]["status"] == "skipped"
+
+    with pytest.raises(ValueError):
+        bad = RecoveryPlanner("bad")
+        bad.add("a", _step(log, "a"), deps=("missing",))
+        await bad.run()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_protective_steps_outlives_deadline() -> None:
+    log = []
+    planner = RecoveryPlanner("startup", max_concurrency=3, rate_per_sec=0)
+    planner.add("candles:BTC-USDT:1m", _step(log, "1m", 0.05), symbol="BTC-USDT")
+    planner.add(
+        "positions",
+        _step(log, "positions", 0.05),
+        deps=("candles:BTC-USDT:1m",),
+        priority=PRIORITY_PROTECTIVE,
+    )
+    planner.add("sync_positions", _step(log, "sync"), deps=("positions",))
+    planner.add("candles:BTC-USDT:1D", _step(log, "1D", 0.5), gate=False)
+
+    report = await planner.run(deadline=0.02)
+    assert report["deadline_hit"]
+    assert report["steps"]["positions"]["status"] == "pending"
+
+    report = await planner.wait_for(("positions", "sync_positions"))
+    assert report["steps"]["sync_positions"]["status"] == "done"
+    assert report["steps"]["candles:BTC-USDT:1D"]["status"] == "running"
+    assert planner.is_symbol_ready("BTC-USDT")
+    await planner.wait()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_serves_protective_first() -> None:
+    limiter = RestRateLimiter(rate_per_sec=50)
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    await limiter.acquire(PRIORITY_MARKET_DATA)  # занимаем текущий слот
+    await asyncio.gather(
+        request("candles-1", PRIORITY_COSMETIC),
+        request("candles-2", PRIORITY_MARKET_DATA),
+        request("positions", PRIORITY_PROTECTIVE),
+    )
+    assert order == ["positions", "candles-2", "candles-1"]
+    assert limiter.stats["acquired"] == 4
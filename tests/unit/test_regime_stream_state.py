@@ -0,0 +1,135 @@
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models import OHLCV
+from src.strategies.scalping.futures.adaptivity.regime_manager import (
+    AdaptiveRegimeManager,
+    RegimeConfig,
+)
+from src.strategies.scalping.futures.adaptivity.regime_state import RegimeStreamState
+from src.strategies.scalping.futures.indicators.fast_adx import FastADX
+
+
+def _candles(count, seed=7, symbol="BTC-USDT"):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(count):
+        close = price + rng.uniform(-1.0, 1.0)
+        candles.append(
+            OHLCV(
+                timestamp=1_700_000_000_000 + i * 60_000,
+                symbol=symbol,
+                open=price,
+                high=max(price, close) + rng.uniform(0, 0.5),
+                low=min(price, close) - rng.uniform(0, 0.5),
+                close=close,
+                volume=rng.uniform(500, 1500),
+            )
+        )
+        price = close
+    return candles
+
+
+def _full_recompute(candles, current_price):
+    """Прежний полный пересчет (без ADX) - эталон для потокового состояния."""
+    closes = [c.close for c in candles]
+    highs = [c.high for c in candles]
+    lows = [c.low for c in candles]
+    volumes = [c.volume for c in candles]
+    true_ranges = [
+        max(
+            highs[i] - lows[i],
+            abs(highs[i] - closes[i - 1]),
+            abs(lows[i] - closes[i - 1]),
+        )
+        for i in range(1, len(candles))
+    ]
+    sma_50 = sum(closes[-50:]) / 50
+    volume_ma = sum(volumes[-20:]) / 20
+    reversals = 0
+    for i in range(-19, -1):
+        if (closes[i - 1] > closes[i - 2]) != (closes[i] > closes[i - 1]):
+            reversals += 1
+    return {
+        "sma_20": sum(closes[-20:]) / 20,
+        "sma_50": sma_50,
+        "atr": sum(true_ranges[-14:]) / 14,
+        "volume_ma": volume_ma,
+        "volume_ratio": volumes[-1] / volume_ma,
+        "trend_deviation": abs((current_price - sma_50) / sma_50 * 100),
+        "range_width": (max(highs[-20:]) - min(lows[-20:])) / min(lows[-20:]) * 100,
+        "reversals": reversals,
+    }
+
+
+def test_stream_matches_full_recompute_bar_by_bar() -> None:
+    history = _candles(260)
+    state = RegimeStreamState(adx_period=9)
+
+    for end in range(120, 261, 7):
+        window = history[end - 120 : end]
+        state.sync(window)
+        price = window[-1].close
+        indicators = state.indicators(window[-1], price)
+        for key, expected in _full_recompute(window, price).items():
+            assert indicators[key] == expected, key
+
+        # ADX: стандартный Уайлдер по всей истории закрытых свечей + peek
+        reference = FastADX(period=9)
+        for candle in history[: end - 1]:
+            reference.update(candle.high, candle.low, candle.close)
+        reference.update(window[-1].high, window[-1].low, window[-1].close)
+        assert math.isclose(indicators["adx"], reference.get_current_adx())
+        assert math.isclose(indicators["di_plus"], reference.get_current_di_plus())
+
+    # Каждая закрытая свеча влита ровно один раз, без пересборок
+    assert state.get_stats()["bars"] == 259
+    assert state.get_stats()["rebuilds"] == 0
+
+
+def test_stream_rebuilds_when_history_is_rewritten() -> None:
+    state = RegimeStreamState()
+    state.sync(_candles(100, seed=1))
+    other = _candles(100, seed=2)
+    state.sync(other)
+    assert state.get_stats()["rebuilds"] == 1
+    price = other[-1].close
+    indicators = state.indicators(other[-1], price)
+    assert indicators["sma_50"] == _full_recompute(other, price)["sma_50"]
+
+
+@pytest.mark.asyncio
+async def test_update_regime_rescores_only_when_inputs_change() -> None:
+    manager = AdaptiveRegimeManager(RegimeConfig(), symbol="BTC-USDT")
+    calls = []
+    detect = manager.detect_regime
+
+    def counting_detect(*args, **kwargs):
+        calls.append(args[1])
+        return detect(*args, **kwargs)
+
+    manager.detect_regime = counting_detect
+    history = _candles(101)
+    window = history[:100]
+    price = window[-1].close
+
+    for _ in range(5):
+        await manager.update_regime(window, price)
+    assert len(calls) == 1
+
+    await manager.update_regime(window, price + 0.5)
+    assert len(calls) == 2
+
+    # Новая закрытая свеча: в состояние вливается одна свеча, не вся история
+    bars = manager._streams["BTC-USDT"].get_stats()["bars"]
+    await manager.update_regime(history[1:101], price)
+    assert len(calls) == 3
+    assert manager._streams["BTC-USDT"].get_stats()["bars"] == bars + 1
@@ -0,0 +1,76 @@
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.signals.filter_manager import FilterManager
+from src.strategies.scalping.futures.signals.signal_model import Signal
+
+
+def test_signal_behaves_like_dict() -> None:
+    signal = Signal(symbol="BTC-USDT", side="buy", strength=0.7, rsi=28.5)
+
+    assert "regime" not in signal
+    assert signal.get("regime", "ranging") == "ranging"
+    with pytest.raises(KeyError):
+        signal["regime"]
+
+    signal["regime"] = "trending"
+    signal.setdefault("filters_passed", []).append("ADX")
+    signal["tp_percent"] = 0.4
+    assert signal.regime == "trending"
+    assert signal["rsi"] == 28.5
+    assert dict(signal) == {
+        "symbol": "BTC-USDT",
+        "side": "buy",
+        "strength": 0.7,
+        "regime": "trending",
+        "filters_passed": ["ADX"],
+        "rsi": 28.5,
+        "tp_percent": 0.4,
+    }
+    assert signal == dict(signal)
+    assert {**signal}["tp_percent"] == 0.4
+    assert signal.pop("tp_percent") == 0.4
+    assert len(signal) == 6
+
+    clone = signal.copy()
+    clone["strength"] = 0.9
+    clone["liquidation_risk"] = 0.1
+    assert signal["strength"] == 0.7
+    assert "liquidation_risk" not in signal
+
+
+def test_signal_tuple_roundtrip_and_pickle() -> None:
+    signal = Signal(symbol="ETH-USDT", side="sell", price=2500.0, impulse_meta={})
+    signal["custom"] = [1, 2]
+    signal.annotate("generator", "rsi")
+
+    restored = Signal.from_tuple(pickle.loads(pickle.dumps(signal.to_tuple())))
+    assert restored == signal
+    assert "strength" not in restored
+
+    unpickled = pickle.loads(pickle.dumps(signal))
+    assert unpickled == signal
+    assert unpickled.notes == (("generator", "rsi"),)
+
+
+class _Funding:
+    async def is_signal_valid(self, symbol, side, overrides=None):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_filter_manager_attaches_verdict_to_signal() -> None:
+    manager = FilterManager()
+    manager.set_funding_rate_filter(_Funding())
+    signal = Signal(symbol="BTC-USDT", side="buy", type="rsi_oversold")
+
+    assert await manager.apply_all_filters("BTC-USDT", signal, None) is None
+    assert signal.verdict.blocked_by == "funding"
+    assert signal.verdict.as_dict()["signal_type"] == "rsi_oversold"
+    assert signal.notes == (("filters", "funding"),)
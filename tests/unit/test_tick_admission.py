@@ -0,0 +1,82 @@
+import math
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.core.tick_admission import (
+    RollingVolatility,
+    TickAdmissionController,
+)
+
+
+def test_volatility_window_and_throttle_tiers() -> None:
+    volatility = RollingVolatility(window_sec=60.0)
+    assert volatility.update(0.0, 100.0) is None
+    assert math.isclose(volatility.update(30.0, 100.2), 0.2)
+    # Первая точка выпала из окна: изменение считается от 100.2
+    assert volatility.update(61.0, 100.2) == 0.0
+
+    controller = TickAdmissionController({"budget_ms_per_sec": 0})
+    decisions = [controller.admit("BTC-USDT", 100.0, now=i * 0.1) for i in range(1, 21)]
+    assert decisions[-1].state == "low"
+    assert sum(d.admitted for d in decisions) < 10
+
+    controller.admit("ETH-USDT", 100.0, now=0.0)
+    decision = controller.admit("ETH-USDT", 100.5, now=1.0)
+    assert decision.state == "high"
+    assert decision.admitted
+
+
+def test_pending_order_index_bypasses_throttle() -> None:
+    controller = TickAdmissionController({"budget_ms_per_sec": 0})
+    controller.on_order_update("SOL-USDT", "1", "live")
+    controller.on_order_update("SOL-USDT", "2", "partially_filled")
+    assert all(
+        controller.admit("SOL-USDT", 20.0, now=i).state == "bypass" for i in range(10)
+    )
+
+    controller.on_order_update("SOL-USDT", "1", "filled")
+    assert controller.has_pending_order("SOL-USDT")
+    controller.on_order_update("SOL-USDT", "2", "canceled")
+    assert not controller.has_pending_order("SOL-USDT")
+    assert controller.admit("SOL-USDT", 20.0, now=11.0).state != "bypass"
+
+
+def test_budget_sheds_work_and_engaged_symbols_get_more() -> None:
+    controller = TickAdmissionController(
+        {"budget_ms_per_sec": 10, "engaged_budget_multiplier": 3}
+    )
+
+    def run(symbol, has_position):
+        admitted = 0
+        for i in range(20):
+            # Высокая волатильность - тир не режет, работает только бюджет
+            price = 100.0 + i
+            if controller.admit(symbol, price, has_position, now=i * 0.01).admitted:
+                admitted += 1
+                controller.record_cost(symbol, 0.005)
+        return admitted
+
+    assert run("BTC-USDT", False) == 2
+    assert run("ETH-USDT", True) == 6
+
+    stats = controller.get_stats()
+    assert stats["symbols"]["BTC-USDT"]["dropped_budget"] == 18
+    assert stats["ticks"] == 40
+    assert stats["admitted"] == 8
+    assert stats["shed_ratio"] == 32 / 40
+
+
+def test_stale_symbol_is_forced_through() -> None:
+    controller = TickAdmissionController(
+        {"throttle": {"low": 1000}, "budget_ms_per_sec": 0, "force_after_sec": 45}
+    )
+    decisions = [controller.admit("XRP-USDT", 1.0, now=float(i)) for i in range(60)]
+    admitted = [i for i, d in enumerate(decisions) if d.admitted]
+    # Первый тикер проходит до оценки волатильности, дальше - тир low (1/1000),
+    # но через force_after_sec символ пропускается принудительно
+    assert admitted == [0, 46]
+    assert decisions[46].reason == "forced"
+    assert controller.get_symbol_stats("XRP-USDT")["forced"] == 1
@@ -0,0 +1,123 @@
+"""
+Тесты TrendStateService: совпадение с DirectionAnalyzer.analyze_direction
+на потоке свечей, кэш результата на бар и пересборка при переписанной истории.
+"""
+
+import random
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models import OHLCV
+from src.strategies.scalping.futures.analysis import (
+    DirectionAnalyzer,
+    TrendStateService,
+)
+
+
+def _candles(count, seed=11, symbol="BTC-USDT"):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(count):
+        close = price + rng.uniform(-1.0, 1.0)
+        candles.append(
+            OHLCV(
+                timestamp=1_700_000_000_000 + i * 60_000,
+                symbol=symbol,
+                open=price,
+                high=max(price, close) + rng.uniform(0, 0.5),
+                low=min(price, close) - rng.uniform(0, 0.5),
+                close=close,
+                volume=rng.uniform(500, 1500),
+            )
+        )
+        price = close
+    return candles
+
+
+def _indicators(candles, adx, di_plus, di_minus):
+    closes = [c.close for c in candles]
+    return {
+        "adx": adx,
+        "di_plus": di_plus,
+        "di_minus": di_minus,
+        "ema_12": sum(closes[-12:]) / 12,
+        "ema_26": sum(closes[-26:]) / 26,
+        "sma_20": sum(closes[-20:]) / 20,
+    }
+
+
+def test_stream_matches_full_analysis_on_every_tick() -> None:
+    analyzer = DirectionAnalyzer()
+    service = TrendStateService(analyzer)
+    history = _candles(120)
+    rng = random.Random(3)
+    regimes = (None, "trending", "ranging", "choppy")
+
+    for end in range(30, len(history)):
+        candles = history[: end - 1]
+        forming = history[end - 1]
+        # Несколько обновлений формирующейся свечи перед закрытием
+        for step in range(3):
+            tick = replace(
+                forming,
+                close=forming.close + rng.uniform(-0.3, 0.3),
+                volume=forming.volume * (step + 1) / 3,
+            )
+            stream = candles + [tick]
+            indicators = _indicators(
+                stream, rng.uniform(10, 40), rng.uniform(5, 35), rng.uniform(5, 35)
+            )
+            regime = regimes[(end + step) % len(regimes)]
+            expected = analyzer.analyze_direction(
+                stream, tick.close, indicators, regime
+            )
+            assert service.analyze(
+                "BTC-USDT", stream, tick.close, indicators, regime
+            ) == pytest.approx(expected)
+
+    vector = service.get_vector("BTC-USDT")
+    assert vector is not None
+    assert vector.direction == expected["direction"]
+    assert len(vector.components) == 5
+    stats = service.get_stats()["symbols"]["BTC-USDT"]
+    # Окно влито один раз, дальше по одной закрытой свече на бар
+    assert stats["rebuilds"] == 0
+    assert stats["bars"] == 19 + (len(history) - 31)
+
+
+def test_cache_hits_fallback_and_history_rewrite() -> None:
+    analyzer = DirectionAnalyzer()
+    service = TrendStateService(analyzer)
+    candles = _candles(60)
+    indicators = _indicators(candles, 30.0, 25.0, 10.0)
+    price = candles[-1].close
+
+    first = service.analyze("ETH-USDT", candles, price, indicators, "trending")
+    for _ in range(4):
+        assert service.analyze("ETH-USDT", candles, price, indicators, "trending") == (
+            first
+        )
+    assert service.stats["cached"] == 4
+
+    # Без индикаторов или на короткой истории - прежний путь DirectionAnalyzer
+    service.analyze("ETH-USDT", candles, price, None, "trending")
+    service.analyze("ETH-USDT", candles[:10], price, indicators, "trending")
+    assert service.stats["fallback"] == 2
+
+    # Другая история (переподключение) - окно пересобирается
+    other = _candles(60, seed=99)
+    result = service.analyze("ETH-USDT", other, other[-1].close, indicators, None)
+    assert result == pytest.approx(
+        analyzer.analyze_direction(other, other[-1].close, indicators, None)
+    )
+    assert service.get_stats()["symbols"]["ETH-USDT"]["rebuilds"] == 1
+
+    service.forget("ETH-USDT")
+    assert service.get_vector("ETH-USDT") is None
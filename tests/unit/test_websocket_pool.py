@@ -0,0 +1,177 @@
+"""
+Тесты PublicWebSocketPool: раскладка групп по шардам, перенос по частоте
+сообщений без дублей, reconnect отдельного шарда и метрики по шардам.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.scalping.futures.coordinators.websocket_coordinator import (
+    WebSocketCoordinator,
+)
+from src.strategies.scalping.futures.websocket_pool import (
+    PublicWebSocketPool,
+    plan_rebalance,
+)
+
+
+class FakeShard:
+    def __init__(self, url):
+        self.connected = False
+        self.callbacks = {}
+        self.subscribed_channels = {}
+        self.reconnects = []
+        self.reconnect_attempts = 0
+        self.last_heartbeat = time.time()
+
+    async def connect(self):
+        self.connected = True
+        return True
+
+    async def disconnect(self):
+        self.connected = False
+
+    async def subscribe(self, channel, inst_id, callback):
+        key = f"{channel}:{inst_id}"
+        self.callbacks[key] = callback
+        self.subscribed_channels[key] = {"channel": channel, "instId": inst_id}
+        return True
+
+    async def unsubscribe(self, channel, inst_id):
+        key = f"{channel}:{inst_id}"
+        self.callbacks.pop(key, None)
+        self.subscribed_channels.pop(key, None)
+        return True
+
+    async def force_reconnect(self, reason=""):
+        self.reconnects.append(reason)
+        return True
+
+    async def emit(self, channel, inst_id, n=1):
+        for _ in range(n):
+            await self.callbacks[f"{channel}:{inst_id}"](
+                {
+                    "arg": {"channel": channel, "instId": inst_id},
+                    "data": [{"instId": inst_id, "ts": str(time.time() * 1000)}],
+                }
+            )
+
+
+def test_plan_rebalance_moves_minimum_to_even_load() -> None:
+    assignment = {("market", "A"): 0, ("market", "B"): 0, ("market", "C"): 1}
+    loads = {("market", "A"): 50.0, ("market", "B"): 40.0, ("market", "C"): 10.0}
+
+    moves = plan_rebalance(loads, assignment, 2, threshold=0.2, max_moves=3)
+    # 90 vs 10: перенос B дает 50/50
+    assert moves == [(("market", "B"), 1)]
+    assert plan_rebalance(loads, {**assignment, ("market", "B"): 1}, 2) == []
+
+
+@pytest.mark.asyncio
+async def test_pool_shards_rebalances_without_duplicates_and_reconnects_one() -> None:
+    pool = PublicWebSocketPool(
+        "wss://test", {"connections": 2}, manager_factory=FakeShard
+    )
+    shard0, shard1 = pool.shards
+    assert await pool.connect()
+    received = []
+
+    async def on_data(data):
+        received.append(data["arg"]["instId"])
+
+    for inst in ("BTC-USDT-SWAP", "ETH-USDT-SWAP", "SOL-USDT-SWAP"):
+        await pool.subscribe("tickers", inst, on_data)
+        await pool.subscribe("mark-price", inst, on_data)
+    await pool.subscribe("trades", "BTC-USDT-SWAP", on_data)
+
+    # tickers и mark-price символа - на одном соединении, trades - своя полоса
+    assert set(shard0.subscribed_channels) == {
+        "tickers:BTC-USDT-SWAP",
+        "mark-price:BTC-USDT-SWAP",
+        "tickers:SOL-USDT-SWAP",
+        "mark-price:SOL-USDT-SWAP",
+    }
+    assert "trades:BTC-USDT-SWAP" in shard1.subscribed_channels
+    assert pool.shards_of("BTC-USDT") == [0, 1]
+    assert pool.shards_of("BTC-USDT", channel="tickers") == [0]
+
+    # shard0 перегружен BTC+SOL: SOL переезжает на shard1
+    await shard0.emit("tickers", "BTC-USDT-SWAP", 30)
+    await shard0.emit("tickers", "SOL-USDT-SWAP", 20)
+    await shard1.emit("tickers", "ETH-USDT-SWAP", 5)
+    assert await pool.rebalance() == 1
+    assert "tickers:SOL-USDT-SWAP" in shard1.callbacks
+
+    # До передачи владения данные идут со старого шарда, после - только с нового
+    received.clear()
+    await shard0.emit("tickers", "SOL-USDT-SWAP")
+    await shard1.emit("tickers", "SOL-USDT-SWAP")
+    old_callback = shard0.callbacks["tickers:SOL-USDT-SWAP"]
+    await asyncio.sleep(0)  # отписка на старом шарде
+    await old_callback(
+        {"arg": {"channel": "tickers", "instId": "SOL-USDT-SWAP"}, "data": [{}]}
+    )
+    assert received == ["SOL-USDT-SWAP", "SOL-USDT-SWAP"]
+    assert "tickers:SOL-USDT-SWAP" not in shard0.subscribed_channels
+    assert pool.stats["moves"] == 1
+    assert pool.stats["dropped_after_handoff"] == 1
+
+    # Watchdog по SOL переподключает только его шард
+    assert await pool.force_reconnect("stale", symbols=["SOL-USDT"], channel="tickers")
+    assert shard0.reconnects == [] and shard1.reconnects == ["stale"]
+
+    status = pool.get_status()
+    assert status["shards"][0]["msg_per_sec"] > 0
+    assert status["shards"][1]["lag_ms_p99"] is not None
+    assert status["subscribed_channels"] == 7
+    await pool.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_shard_watchdog_needs_min_symbols_and_consecutive_cycles() -> None:
+    pool = PublicWebSocketPool(
+        "wss://test", {"connections": 2}, manager_factory=FakeShard
+    )
+
+    async def on_data(data):
+        pass
+
+    for inst in ("BTC-USDT-SWAP", "ETH-USDT-SWAP", "SOL-USDT-SWAP"):
+        await pool.subscribe("tickers", inst, on_data)
+    symbols = ["BTC-USDT", "ETH-USDT", "SOL-USDT"]
+    coordinator = WebSocketCoordinator(
+        ws_manager=pool,
+        private_ws_manager=None,
+        scalping_config=SimpleNamespace(symbols=symbols),
+        active_positions_ref={},
+    )
+    coordinator._ws_watchdog_cooldown = 0.0
+    reconnects = []
+
+    async def force_reconnect(reason="", symbols=None):
+        reconnects.append(sorted(symbols))
+        return True
+
+    coordinator.force_reconnect = force_reconnect
+
+    # ETH один на shard1: тихий символ (1/1) не рвет соединение
+    for _ in range(5):
+        await coordinator._reconnect_stale_shards(["ETH-USDT"], symbols)
+    assert reconnects == []
+
+    # BTC и SOL на shard0: reconnect только на втором цикле подряд
+    await coordinator._reconnect_stale_shards(["BTC-USDT", "SOL-USDT"], symbols)
+    assert reconnects == []
+    await coordinator._reconnect_stale_shards([], symbols)  # восстановился
+    await coordinator._reconnect_stale_shards(["BTC-USDT", "SOL-USDT"], symbols)
+    assert reconnects == []
+    await coordinator._reconnect_stale_shards(["BTC-USDT", "SOL-USDT"], symbols)
+    assert reconnects == [["BTC-USDT", "SOL-USDT"]]
@@ -0,0 +1,103 @@
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.strategies.modules.trading_statistics import TradingStatistics
+from src.strategies.scalping.futures.metrics.alert_manager import AlertManager
+from src.strategies.scalping.futures.metrics.conversion_metrics import ConversionMetrics
+from src.strategies.scalping.futures.metrics.holding_time_metrics import (
+    HoldingTimeMetrics,
+)
+from src.strategies.scalping.futures.metrics.slo_monitor import SLOMonitor
+from src.utils.window_metrics import WindowedMetrics
+
+
+def test_window_query_expires_old_buckets_and_bounds_memory() -> None:
+    store = WindowedMetrics(bucket_seconds=60, retention_seconds=600)
+    now = time.time()
+    for i in range(100):
+        store.record("pnl", 1.0, ts=now - i * 5, symbol="BTC-USDT", regime="ranging")
+    store.record("pnl", -2.0, ts=now - 300, symbol="ETH-USDT", regime="trending")
+    assert not store.record("pnl", 5.0, ts=now - 3600, symbol="BTC-USDT")
+
+    total = store.query("pnl", 600, now=now)
+    assert total.count == 101
+    assert total.min == -2.0
+    assert store.query("pnl", 60, now=now, symbol="ETH-USDT").count == 0
+    assert store.query("pnl", 600, now=now, regime="trending").total == -2.0
+    assert set(store.group_by("pnl", "symbol", now=now)) == {"BTC-USDT", "ETH-USDT"}
+
+    # Через 20 минут все бакеты вне окна, ячеек не больше размера кольца
+    assert store.query("pnl", now=now + 1200).count == 0
+    assert store.get_stats()["cells"] <= 11 + 1
+
+    with pytest.raises(ValueError):
+        store.query("pnl", side="buy")
+
+
+def test_trading_statistics_keeps_public_api() -> None:
+    stats = TradingStatistics(lookback_hours=24)
+    assert stats.get_win_rate() == 0.5
+
+    now = datetime.now(timezone.utc)
+    for pnl in (2.0, 4.0, -1.0, 0.0):
+        stats.record_trade("BTC-USDT", "buy", "Ranging", pnl, 100.0, 101.0, now, now)
+    stats.record_trade(
+        "BTC-USDT", "buy", "ranging", 9.0, 1, 1, now - timedelta(hours=30), now
+    )
+    stats.record_signal("BTC-USDT", "buy", "ranging", 0.7, "rsi", was_executed=True)
+    stats.record_signal("BTC-USDT", "buy", "ranging", 0.4, "rsi")
+
+    assert stats.get_trade_count(regime="RANGING") == 4
+    assert stats.get_win_rate(symbol="BTC-USDT") == 0.5
+    assert stats.get_avg_pnl() == (3.0, -0.5)
+    assert stats.get_win_rate(regime="trending") == 0.5
+    assert stats.get_signal_execution_rate("ranging") == 0.5
+
+
+def test_conversion_holding_and_alerts_share_one_store() -> None:
+    store = WindowedMetrics()
+    conversion = ConversionMetrics(metrics_store=store)
+    holding = HoldingTimeMetrics(metrics_store=store)
+    alerts = AlertManager(conversion, holding, metrics_store=store)
+
+    for _ in range(20):
+        conversion.record_signal_generated("BTC-USDT", "rsi", "ranging", 0.8)
+    for _ in range(19):
+        conversion.record_signal_filtered("BTC-USDT", "adx_low", "rsi", "ranging")
+    conversion.record_signal_executed("BTC-USDT", "rsi", "ranging")
+
+    rate = conversion.get_conversion_rate()
+    assert (rate["generated"], rate["filtered"], rate["executed"]) == (20, 19, 1)
+    assert conversion.get_filter_reasons()[0] == {
+        "reason": "adx_low",
+        "count": 19,
+        "percentage": 100.0,
+    }
+    assert conversion.get_regime_stats()["ranging"]["conversion_rate"] == 5.0
+
+    for seconds, reason in ((10, "tp"), (20, "tp"), (40, "sl")):
+        holding.record_holding_time("BTC-USDT", reason, seconds)
+    stats = holding.get_holding_time_stats()
+    assert stats["count"] == 3
+    assert stats["min"] == pytest.approx(10, abs=0.5)
+    assert stats["median"] == pytest.approx(20, rel=0.05)
+    assert set(holding.get_exit_reason_stats()) == {"tp", "sl"}
+
+    fired = {a["type"] for a in alerts.check_alerts()}
+    assert fired == {"high_filter_rate"}
+    summary = alerts.get_alert_summary()
+    assert summary["by_type"] == {"high_filter_rate": 1}
+    assert summary["by_severity"] == {"warning": 1}
+
+    monitor = SLOMonitor(metrics_store=store)
+    assert monitor.get_snapshot()["windowed"]["conversion.generated"]["count"] == 20
+    text = monitor.to_prometheus()
+    assert 'scalping_conversion_filtered_count{symbol="BTC-USDT"' in text
+    assert "scalping_slo_stale_ratio 0" in text